@@ -0,0 +1,13 @@
+"""
+성능 벤치마크 패키지 - 암호화폐 자동매매 봇
+
+재현 가능한 합성 OHLCV 데이터로 지표, 전략 신호 생성, 백테스터, 파라미터 최적화,
+데이터베이스 조회 시간을 데이터 크기별로 측정하고 JSON 기준선과 비교합니다.
+실행 방법은 benchmarks/__main__.py 를 참고하세요.
+"""
+
+from benchmarks.synthetic import synthetic_ohlcv
+from benchmarks.suites import BENCHMARKS, Benchmark, BenchmarkSkipped, DEFAULT_SIZES, select_benchmarks
+from benchmarks.runner import (
+    run_benchmarks, save_results, load_results, compare_results, format_comparison, format_results
+)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 벤치마크 명령행 도구
+
+"""
+사용법:
+    # 벤치마크 실행 후 기준선 저장
+    python -m benchmarks run --sizes 10000,100000 --output benchmarks/baselines/local.json
+
+    # 실행 결과를 기준선과 바로 비교 (성능 저하가 있으면 종료 코드 1)
+    python -m benchmarks run --groups indicators,db --compare benchmarks/baselines/local.json
+
+    # 저장된 두 결과 비교
+    python -m benchmarks compare benchmarks/baselines/local.json current.json --threshold 0.2
+
+    # 벤치마크 목록
+    python -m benchmarks list
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.runner import (
+    run_benchmarks, save_results, load_results, compare_results, format_comparison, format_results
+)
+from benchmarks.suites import DEFAULT_SIZES, benchmark_groups
+
+
+def _split(value):
+    return [item.strip() for item in value.split(',') if item.strip()] if value else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='암호화폐 자동 매매 봇 성능 벤치마크')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='벤치마크 실행')
+    run_parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                            help='데이터 크기(행 수) 목록, 쉼표 구분')
+    run_parser.add_argument('--groups', help='그룹 목록 (indicators, strategies, backtester, db)')
+    run_parser.add_argument('--names', help='이름 필터 (부분 일치, 쉼표 구분)')
+    run_parser.add_argument('--repeat', type=int, default=3, help='반복 측정 횟수')
+    run_parser.add_argument('--seed', type=int, default=42, help='합성 데이터 시드')
+    run_parser.add_argument('--output', help='결과 JSON 저장 경로')
+    run_parser.add_argument('--compare', help='비교할 기준선 JSON 경로')
+    run_parser.add_argument('--threshold', type=float, default=0.2, help='성능 저하 판정 비율')
+
+    compare_parser = subparsers.add_parser('compare', help='기준선과 결과 비교')
+    compare_parser.add_argument('baseline', help='기준선 JSON 경로')
+    compare_parser.add_argument('current', help='비교할 결과 JSON 경로')
+    compare_parser.add_argument('--threshold', type=float, default=0.2, help='성능 저하 판정 비율')
+
+    subparsers.add_parser('list', help='벤치마크 목록')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'list':
+        for group, names in benchmark_groups().items():
+            print(f"[{group}]")
+            for name in names:
+                print(f"  {name}")
+        return 0
+
+    if args.command == 'compare':
+        rows = compare_results(load_results(args.baseline), load_results(args.current), args.threshold)
+        print(format_comparison(rows))
+        return 1 if any(row['status'] == 'regression' for row in rows) else 0
+
+    results = run_benchmarks(sizes=[int(size) for size in _split(args.sizes)], groups=_split(args.groups),
+                             names=_split(args.names), repeat=args.repeat, seed=args.seed)
+    print(format_results(results))
+    if args.output:
+        save_results(results, args.output)
+        print(f"결과 저장: {args.output}")
+    if args.compare:
+        rows = compare_results(load_results(args.compare), results, args.threshold)
+        print(format_comparison(rows))
+        return 1 if any(row['status'] == 'regression' for row in rows) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
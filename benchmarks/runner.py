@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 벤치마크 실행 및 기준선 비교
+
+"""
+벤치마크 실행, JSON 기준선 저장/로드, 기준선 대비 성능 저하 판정
+"""
+
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterable, Callable
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_ohlcv
+from benchmarks.suites import Benchmark, BenchmarkSkipped, DEFAULT_SIZES, select_benchmarks
+from src.logging_config import get_logger
+
+logger = get_logger('crypto_bot.benchmarks')
+
+STATUS_OK = 'ok'
+STATUS_SKIPPED = 'skipped'
+STATUS_ERROR = 'error'
+
+RESULT_VERSION = 1
+
+# 이 크기 이상은 1회만 측정
+_SINGLE_RUN_SIZE = 1_000_000
+
+
+def result_key(name: str, size: int) -> str:
+    """결과 키 ('이름[크기]')"""
+    return f"{name}[{size}]"
+
+
+def environment_info() -> Dict[str, str]:
+    """측정 환경 정보"""
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': str(os.cpu_count()),
+    }
+
+
+def _measure(func: Callable, repeat: int, max_seconds: float) -> List[float]:
+    times = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+        if time.perf_counter() - started > max_seconds:
+            break
+    return times
+
+
+def run_benchmarks(sizes: Iterable[int] = DEFAULT_SIZES, groups: Optional[List[str]] = None,
+                   names: Optional[List[str]] = None, repeat: int = 3, max_seconds: float = 60.0,
+                   seed: int = 42, workdir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    벤치마크 실행
+
+    Args:
+        sizes: 데이터 크기(행 수) 목록
+        groups: 실행할 그룹 (None이면 전체)
+        names: 이름 필터 (부분 일치)
+        repeat: 반복 측정 횟수 (100만 행 이상은 1회)
+        max_seconds: 벤치마크 하나의 반복 측정 시간 한도 (초과 시 남은 반복 생략)
+        seed: 합성 데이터 난수 시드
+        workdir: 임시 파일(DB 등) 디렉토리 (None이면 임시 디렉토리 생성 후 삭제)
+
+    Returns:
+        dict: 결과 문서 (version, created_at, environment, sizes, results)
+    """
+    benchmarks = select_benchmarks(groups, names)
+    own_workdir = workdir is None
+    workdir = tempfile.mkdtemp(prefix='crypto_bot_bench_') if own_workdir else workdir
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        for size in sorted(sizes):
+            targets = [b for b in benchmarks if b.max_size is None or size <= b.max_size]
+            if not targets:
+                continue
+            df = synthetic_ohlcv(size, seed=seed)
+            for benchmark in targets:
+                results[result_key(benchmark.name, size)] = _run_one(
+                    benchmark, df, size, workdir, 1 if size >= _SINGLE_RUN_SIZE else repeat, max_seconds)
+            del df
+    finally:
+        if own_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'version': RESULT_VERSION,
+        'created_at': datetime.now().isoformat(),
+        'environment': environment_info(),
+        'sizes': sorted(sizes),
+        'seed': seed,
+        'results': results,
+    }
+
+
+def _run_one(benchmark: Benchmark, df: pd.DataFrame, size: int, workdir: str, repeat: int,
+             max_seconds: float) -> Dict[str, Any]:
+    entry: Dict[str, Any] = {'name': benchmark.name, 'group': benchmark.group, 'size': size}
+    try:
+        func = benchmark.setup(df, workdir)
+        if isinstance(func, tuple):
+            func, metrics = func
+            entry['metrics'] = metrics
+        times = _measure(func, repeat, max_seconds)
+        entry.update(status=STATUS_OK, times=times, min=min(times), median=statistics.median(times))
+        logger.info(f"{result_key(benchmark.name, size)}: {entry['min'] * 1000:.2f} ms")
+    except BenchmarkSkipped as e:
+        entry.update(status=STATUS_SKIPPED, reason=str(e))
+        logger.info(f"{result_key(benchmark.name, size)}: 건너뜀 - {e}")
+    except Exception as e:
+        entry.update(status=STATUS_ERROR, reason=f"{type(e).__name__}: {e}")
+        logger.error(f"{result_key(benchmark.name, size)} 실행 중 오류 발생: {e}")
+    return entry
+
+
+def save_results(results: Dict[str, Any], path: str) -> None:
+    """결과 문서를 JSON 기준선 파일로 저장"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    """JSON 기준선 파일 로드"""
+    with open(path, 'r', encoding='utf-8') as f:
+        results = json.load(f)
+    if results.get('version') != RESULT_VERSION:
+        raise ValueError(f"지원하지 않는 벤치마크 결과 버전입니다: {results.get('version')}")
+    return results
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.2,
+                    min_delta: float = 0.001) -> List[Dict[str, Any]]:
+    """
+    기준선 대비 비교
+
+    두 결과 모두 성공한 항목의 최소 실행 시간을 비교하며, 비율이 1 + threshold 를
+    넘고 차이가 min_delta 초 이상이면 성능 저하로 판정합니다. 메모리 지표(metrics.bytes)가
+    있는 항목은 메모리가 1 + threshold 배를 넘게 늘어나도 성능 저하로 판정합니다.
+
+    Args:
+        baseline: 기준선 결과 문서
+        current: 현재 결과 문서
+        threshold: 허용 비율 (0.2 = 20% 느려질 때까지 허용)
+        min_delta: 잡음으로 간주할 최소 차이 (초)
+
+    Returns:
+        list: 항목별 비교 (key, baseline, current, ratio, status: regression/improvement/ok/missing,
+              메모리 지표가 있으면 baseline_bytes, current_bytes)
+    """
+    rows = []
+    for key, entry in current['results'].items():
+        base = baseline['results'].get(key)
+        if base is None or base.get('status') != STATUS_OK or entry.get('status') != STATUS_OK:
+            rows.append({'key': key, 'baseline': base.get('min') if base else None,
+                         'current': entry.get('min'), 'ratio': None, 'status': 'missing'})
+            continue
+        ratio = entry['min'] / base['min'] if base['min'] > 0 else float('inf')
+        delta = entry['min'] - base['min']
+        if ratio > 1 + threshold and delta >= min_delta:
+            status = 'regression'
+        elif ratio < 1 / (1 + threshold) and -delta >= min_delta:
+            status = 'improvement'
+        else:
+            status = 'ok'
+        row = {'key': key, 'baseline': base['min'], 'current': entry['min'], 'ratio': ratio, 'status': status}
+        base_bytes = (base.get('metrics') or {}).get('bytes')
+        current_bytes = (entry.get('metrics') or {}).get('bytes')
+        if base_bytes and current_bytes is not None:
+            row.update(baseline_bytes=base_bytes, current_bytes=current_bytes)
+            if current_bytes > base_bytes * (1 + threshold):
+                row['status'] = 'regression'
+        rows.append(row)
+    return rows
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    """비교 결과 표 문자열"""
+    def ms(value):
+        return f"{value * 1000:10.2f}" if value is not None else f"{'-':>10}"
+
+    width = max([len(row['key']) for row in rows] + [10])
+    lines = [f"{'benchmark':<{width}}  {'base(ms)':>10}  {'now(ms)':>10}  {'ratio':>7}  status"]
+    for row in rows:
+        ratio = f"{row['ratio']:7.2f}" if row['ratio'] is not None else f"{'-':>7}"
+        marker = ' <<<' if row['status'] == 'regression' else ''
+        lines.append(f"{row['key']:<{width}}  {ms(row['baseline'])}  {ms(row['current'])}  {ratio}  "
+                     f"{row['status']}{marker}")
+    regressions = sum(1 for row in rows if row['status'] == 'regression')
+    lines.append(f"성능 저하 {regressions}건 / 비교 {len(rows)}건")
+    return '\n'.join(lines)
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    """실행 결과 표 문자열"""
+    lines = []
+    for key, entry in results['results'].items():
+        if entry['status'] == STATUS_OK:
+            line = f"{key:<60} {entry['min'] * 1000:12.2f} ms (median {entry['median'] * 1000:.2f} ms)"
+            metrics = entry.get('metrics') or {}
+            if 'bytes' in metrics and 'bytes_before' in metrics:
+                line += (f" [메모리 {metrics['bytes_before'] / 1024:.0f} KB -> {metrics['bytes'] / 1024:.0f} KB, "
+                         f"{metrics.get('saved_ratio', 0):.0%} 절감]")
+            lines.append(line)
+        else:
+            lines.append(f"{key:<60} {entry['status']}: {entry.get('reason', '')}")
+    return '\n'.join(lines)
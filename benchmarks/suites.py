@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 벤치마크 정의
+
+"""
+벤치마크 정의 모음
+
+각 벤치마크의 setup(df, workdir) 은 합성 데이터로 준비 작업(측정 제외)을 한 뒤
+측정할 함수(인자 없음)를 돌려줍니다. 메모리 사용량 같은 부가 지표가 있으면
+(함수, 지표 dict) 튜플을 돌려줍니다. 필요한 모듈을 가져올 수 없는 환경에서는
+BenchmarkSkipped 를 발생시켜 결과에 건너뜀 사유를 남깁니다.
+
+그룹:
+- indicators: src/indicators.py 지표 함수
+- strategies: 각 전략의 generate_signals
+- backtester: Backtester.run_backtest, Backtester.optimize_strategy
+- db: DatabaseManager 자주 쓰는 조회
+- frames: OHLCV 데이터프레임 자료형 압축 (압축 전후 메모리 기록)
+"""
+
+import importlib
+import json
+import os
+import sqlite3
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+GROUP_INDICATORS = 'indicators'
+GROUP_STRATEGIES = 'strategies'
+GROUP_BACKTESTER = 'backtester'
+GROUP_DB = 'db'
+GROUP_FRAMES = 'frames'
+
+# 기본 데이터 크기 (행 수)
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000, 5_000_000)
+
+_DB_SYMBOLS = [f"COIN{i}/USDT" for i in range(20)]
+
+
+class BenchmarkSkipped(Exception):
+    """현재 환경에서 실행할 수 없는 벤치마크"""
+
+
+class Benchmark:
+    """벤치마크 하나의 정의"""
+
+    def __init__(self, name: str, group: str, setup: Callable, max_size: Optional[int] = None,
+                 description: str = ''):
+        """
+        Args:
+            name: 벤치마크 이름 (결과 키)
+            group: 그룹 이름
+            setup: setup(df, workdir) -> 측정할 함수
+            max_size: 실행할 최대 데이터 크기 (None이면 제한 없음)
+            description: 설명
+        """
+        self.name = name
+        self.group = group
+        self.setup = setup
+        self.max_size = max_size
+        self.description = description
+
+
+def _import(module_name: str):
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        raise BenchmarkSkipped(f"{module_name} 모듈을 가져올 수 없습니다: {e}")
+
+
+def _indicator(func_name: str, **kwargs) -> Callable:
+    def setup(df, workdir):
+        func = getattr(_import('src.indicators'), func_name)
+        return lambda: func(df, **kwargs)
+    return setup
+
+
+def _strategy(class_name: str) -> Callable:
+    def setup(df, workdir):
+        strategies = _import('src.strategies')
+        strategy = getattr(strategies, class_name)()
+        return lambda: strategy.generate_signals(df)
+    return setup
+
+
+def _backtester(df, strategy_class_name='MovingAverageCrossover'):
+    backtesting = _import('src.backtesting')
+    strategies = _import('src.strategies')
+    from src.timeframe_store import TimeframeStore
+    backtester = backtesting.Backtester(symbol='BTC/USDT', timeframe='1m',
+                                        timeframe_store=TimeframeStore.from_ohlcv(df))
+    return backtester, getattr(strategies, strategy_class_name)
+
+
+def _run_backtest_setup(df, workdir):
+    backtester, strategy_class = _backtester(df)
+    strategy = strategy_class()
+    start, end = df.index[0], df.index[-1]
+
+    def run():
+        if backtester.run_backtest(strategy, start, end) is None:
+            raise RuntimeError("run_backtest 가 결과를 반환하지 않았습니다")
+    return run
+
+
+def _optimize_setup(df, workdir):
+    backtester, strategy_class = _backtester(df)
+    param_grid = {'short_period': [9, 12], 'long_period': [26, 50]}
+    start, end = df.index[0], df.index[-1]
+
+    def run():
+        best_params, _ = backtester.optimize_strategy(strategy_class, param_grid, start, end)
+        if best_params is None:
+            raise RuntimeError("optimize_strategy 가 결과를 반환하지 않았습니다")
+    return run
+
+
+def populate_database(db_path: str, n_trades: int, seed: int = 7) -> None:
+    """
+    DatabaseManager 스키마로 벤치마크용 거래/포지션 기록 생성
+
+    Args:
+        db_path: 데이터베이스 파일 경로
+        n_trades: 거래 기록 수 (포지션은 1/10, 그중 1% 미청산)
+        seed: 난수 시드
+    """
+    from src.db_manager import DatabaseManager
+    db = DatabaseManager(db_path=db_path)
+
+    rng = np.random.default_rng(seed)
+    n_positions = max(n_trades // 10, 1)
+    start = pd.Timestamp('2020-01-01')
+    symbols = rng.integers(0, len(_DB_SYMBOLS), n_positions)
+    opened = start + pd.to_timedelta(np.sort(rng.integers(0, 10**8, n_positions)), unit='s')
+    status = np.where(rng.random(n_positions) < 0.01, 'open', 'closed')
+    positions = [
+        (_DB_SYMBOLS[symbols[i]], 'long' if i % 2 else 'short', float(rng.uniform(0.01, 2)),
+         float(rng.uniform(100, 50000)), 3, opened[i].isoformat(),
+         None if status[i] == 'open' else (opened[i] + pd.Timedelta(hours=1)).isoformat(),
+         float(rng.normal(0, 50)), status[i])
+        for i in range(n_positions)
+    ]
+    position_ids = rng.integers(1, n_positions + 1, n_trades)
+    profits = rng.normal(0, 20, n_trades)
+    trades = [
+        (positions[position_ids[i] - 1][0], 'buy' if i % 2 else 'sell', 'market', 0.1, 30000.0, 3000.0, 1.2,
+         (start + pd.Timedelta(seconds=int(i) * 60)).isoformat(), int(position_ids[i]),
+         json.dumps({'profit': round(float(profits[i]), 4)}))
+        for i in range(n_trades)
+    ]
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executemany(
+            "INSERT INTO positions (symbol, side, contracts, entry_price, leverage, opened_at, closed_at, pnl, status) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", positions)
+        conn.executemany(
+            "INSERT INTO trades (symbol, side, order_type, amount, price, cost, fee, timestamp, position_id, "
+            "additional_info) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", trades)
+        conn.commit()
+    finally:
+        conn.close()
+    # 직접 INSERT 는 증분 갱신을 거치지 않으므로 성과 집계를 한 번 다시 계산
+    db.rebuild_performance_stats()
+
+
+def _db(query: Callable) -> Callable:
+    def setup(df, workdir):
+        db_module = _import('src.db_manager')
+        db_path = os.path.join(workdir, f"bench_{len(df)}.db")
+        if not os.path.exists(db_path):
+            populate_database(db_path, len(df))
+        db = db_module.DatabaseManager(db_path=db_path)
+        return lambda: query(db)
+    return setup
+
+
+def _compact_setup(df, workdir):
+    """
+    get_ohlcv 가 예전에 만들던 형태(행마다 market_type/leverage, 거래량 소수 3자리)의
+    프레임을 압축하고, 값이 그대로인지 확인한 뒤 압축 전후 메모리를 지표로 남김
+    """
+    schema = _import('src.ohlcv_schema')
+    raw = df.reset_index()
+    raw['volume'] = raw['volume'].round(3)
+    raw['market_type'] = 'futures'
+    raw['leverage'] = 10
+
+    compacted = schema.compact_ohlcv(raw)
+    for column in ('open', 'high', 'low', 'close'):
+        if not np.array_equal(compacted[column].to_numpy(), raw[column].to_numpy()):
+            raise ValueError(f"가격 열 값이 바뀌었습니다: {column}")
+    decimals = compacted.attrs['float32_decimals']['volume']
+    if not np.array_equal(np.round(compacted['volume'].to_numpy(np.float64), decimals), raw['volume'].to_numpy()):
+        raise ValueError("거래량 값을 복원할 수 없습니다")
+
+    before, after = schema.frame_nbytes(raw), schema.frame_nbytes(compacted)
+    metrics = {'bytes_before': before, 'bytes': after, 'saved_ratio': 1 - after / before}
+    return (lambda: schema.compact_ohlcv(raw)), metrics
+
+
+BENCHMARKS: List[Benchmark] = [
+    # 지표
+    Benchmark('indicators.simple_moving_average', GROUP_INDICATORS, _indicator('simple_moving_average', period=20)),
+    Benchmark('indicators.exponential_moving_average', GROUP_INDICATORS,
+              _indicator('exponential_moving_average', period=20)),
+    Benchmark('indicators.moving_average_convergence_divergence', GROUP_INDICATORS,
+              _indicator('moving_average_convergence_divergence')),
+    Benchmark('indicators.relative_strength_index', GROUP_INDICATORS, _indicator('relative_strength_index')),
+    Benchmark('indicators.bollinger_bands', GROUP_INDICATORS, _indicator('bollinger_bands')),
+    Benchmark('indicators.stochastic_oscillator', GROUP_INDICATORS, _indicator('stochastic_oscillator')),
+    Benchmark('indicators.average_directional_index', GROUP_INDICATORS, _indicator('average_directional_index')),
+    Benchmark('indicators.ichimoku_cloud', GROUP_INDICATORS, _indicator('ichimoku_cloud')),
+    Benchmark('indicators.volume_weighted_average_price', GROUP_INDICATORS,
+              _indicator('volume_weighted_average_price')),
+    # 전략 신호
+    Benchmark('strategies.MovingAverageCrossover', GROUP_STRATEGIES, _strategy('MovingAverageCrossover')),
+    Benchmark('strategies.RSIStrategy', GROUP_STRATEGIES, _strategy('RSIStrategy')),
+    Benchmark('strategies.MACDStrategy', GROUP_STRATEGIES, _strategy('MACDStrategy')),
+    Benchmark('strategies.BollingerBandsStrategy', GROUP_STRATEGIES, _strategy('BollingerBandsStrategy')),
+    Benchmark('strategies.StochasticStrategy', GROUP_STRATEGIES, _strategy('StochasticStrategy')),
+    Benchmark('strategies.BollingerBandFuturesStrategy', GROUP_STRATEGIES, _strategy('BollingerBandFuturesStrategy')),
+    # 백테스터
+    Benchmark('backtester.run_backtest', GROUP_BACKTESTER, _run_backtest_setup,
+              description='MovingAverageCrossover 기본값, 1분봉'),
+    Benchmark('backtester.optimize_strategy', GROUP_BACKTESTER, _optimize_setup, max_size=1_000_000,
+              description='MovingAverageCrossover 2x2 그리드'),
+    # 데이터베이스 (데이터 크기 = 거래 기록 수)
+    Benchmark('db.get_trades', GROUP_DB, _db(lambda db: db.get_trades(limit=50)), max_size=1_000_000),
+    Benchmark('db.get_trades_by_symbol', GROUP_DB, _db(lambda db: db.get_trades(symbol=_DB_SYMBOLS[3], limit=500)),
+              max_size=1_000_000),
+    Benchmark('db.get_open_positions', GROUP_DB, _db(lambda db: db.get_open_positions()), max_size=1_000_000),
+    Benchmark('db.get_closed_positions', GROUP_DB, _db(lambda db: db.get_closed_positions(symbol=_DB_SYMBOLS[5])),
+              max_size=1_000_000),
+    Benchmark('db.load_performance_stats', GROUP_DB, _db(lambda db: db.load_performance_stats()),
+              max_size=1_000_000),
+    # 데이터프레임 (지표: 압축 전후 바이트)
+    Benchmark('frames.compact_ohlcv', GROUP_FRAMES, _compact_setup,
+              description='market_type/leverage 열이 있는 원시 OHLCV 프레임 압축'),
+]
+
+
+def select_benchmarks(groups: Optional[List[str]] = None, names: Optional[List[str]] = None) -> List[Benchmark]:
+    """
+    그룹/이름(부분 일치)으로 벤치마크 선택
+
+    Args:
+        groups: 그룹 목록 (None이면 전체)
+        names: 이름에 포함될 문자열 목록 (None이면 전체)
+
+    Returns:
+        list: 선택된 벤치마크
+    """
+    selected = []
+    for benchmark in BENCHMARKS:
+        if groups and benchmark.group not in groups:
+            continue
+        if names and not any(name in benchmark.name for name in names):
+            continue
+        selected.append(benchmark)
+    return selected
+
+
+def benchmark_groups() -> Dict[str, List[str]]:
+    """그룹별 벤치마크 이름"""
+    groups: Dict[str, List[str]] = {}
+    for benchmark in BENCHMARKS:
+        groups.setdefault(benchmark.group, []).append(benchmark.name)
+    return groups
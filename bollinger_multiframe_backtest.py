@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from datetime import datetime, timedelta
 from src.backtesting import Backtester
+from src.timeframe_store import build_timeframe_store
 from src.strategies import BollingerBandFuturesStrategy
 import logging
 
@@ -21,7 +22,7 @@ logging.basicConfig(
 )
 logger = logging.getLogger('bollinger_multiframe_backtest')
 
-def run_bollinger_backtest(timeframe):
+def run_bollinger_backtest(timeframe, timeframe_store=None):
     """BollingerBandFutures 전략 백테스트"""
     
     logger.info(f"{'=' * 80}")
@@ -34,7 +35,8 @@ def run_bollinger_backtest(timeframe):
         symbol='BTC/USDT',
         timeframe=timeframe,
         market_type='futures',  # 선물 거래 모드
-        leverage=3  # 3배 레버리지
+        leverage=3,  # 3배 레버리지
+        timeframe_store=timeframe_store  # 1분봉에서 집계한 캔들 공유
     )
     
     # 백테스트 기간 설정 (최근 6개월)
@@ -136,9 +138,14 @@ def main():
     timeframes = ['15m', '1h', '4h']
     results = {}
     
+    # 1분봉을 한 번만 내려받아 모든 타임프레임을 집계
+    end_date = datetime.now()
+    timeframe_store = build_timeframe_store('binance', 'BTC/USDT', end_date - timedelta(days=180), end_date,
+                                            timeframes=timeframes)
+    
     for timeframe in timeframes:
         try:
-            result = run_bollinger_backtest(timeframe)
+            result = run_bollinger_backtest(timeframe, timeframe_store)
             results[timeframe] = result
         except Exception as e:
             logger.error(f"{timeframe} 백테스트 중 오류 발생: {e}")
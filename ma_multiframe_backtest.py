@@ -14,6 +14,7 @@ from datetime import datetime, timedelta
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src.backtesting import Backtester
+from src.timeframe_store import build_timeframe_store
 from src.strategies import MovingAverageCrossover
 
 # 로깅 설정
@@ -26,7 +27,7 @@ logging.basicConfig(
 )
 logger = logging.getLogger('ma_multiframe_backtest')
 
-def run_ma_backtest(timeframe):
+def run_ma_backtest(timeframe, timeframe_store=None):
     """Moving Average Crossover 백테스트 실행"""
     logger.info(f"\nMoving Average Crossover 백테스트 시작 ({timeframe})")
     
@@ -36,7 +37,8 @@ def run_ma_backtest(timeframe):
         symbol='BTC/USDT',
         timeframe=timeframe,
         market_type='futures',  # futures 모드
-        leverage=3  # 3배 레버리지
+        leverage=3,  # 3배 레버리지
+        timeframe_store=timeframe_store  # 1분봉에서 집계한 캔들 공유
     )
     
     # Moving Average Crossover 전략 생성
@@ -114,9 +116,14 @@ def main():
     timeframes = ['1h', '4h']  # 1시간봉과 4시간봉
     results = {}
     
+    # 1분봉을 한 번만 내려받아 모든 타임프레임을 집계
+    end_date = datetime.now()
+    timeframe_store = build_timeframe_store('binance', 'BTC/USDT', end_date - timedelta(days=180), end_date,
+                                            timeframes=timeframes)
+    
     for timeframe in timeframes:
         try:
-            result = run_ma_backtest(timeframe)
+            result = run_ma_backtest(timeframe, timeframe_store)
             results[timeframe] = result
         except Exception as e:
             logger.error(f"{timeframe} 백테스트 중 오류 발생: {e}")
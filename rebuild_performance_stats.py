@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+성과 집계(performance_stats) 재계산/검증 스크립트
+
+사용법:
+    python rebuild_performance_stats.py            # 거래/포지션 기록으로 집계 재계산
+    python rebuild_performance_stats.py --check    # 재계산 없이 집계 일치 여부만 확인
+    python rebuild_performance_stats.py --db PATH  # 다른 DB 파일 사용
+"""
+
+import argparse
+import os
+import sys
+
+from src.db_manager import DatabaseManager
+
+
+def main():
+    """성과 집계 재계산 또는 검증"""
+    parser = argparse.ArgumentParser(description='성과 집계 재계산/검증')
+    parser.add_argument('--db', default=os.path.join(os.path.dirname(__file__), 'data', 'db', 'trading_bot.db'),
+                        help='데이터베이스 파일 경로')
+    parser.add_argument('--check', action='store_true', help='재계산 없이 검증만 수행')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"DB 파일을 찾을 수 없습니다: {args.db}")
+        return 1
+
+    db = DatabaseManager(db_path=args.db)
+
+    if not args.check:
+        count = db.rebuild_performance_stats()
+        if count is None:
+            print("❌ 성과 집계 재계산 실패")
+            return 1
+        print(f"✅ 성과 집계 재계산 완료: {count}행")
+
+    mismatches = db.verify_performance_stats()
+    if mismatches is None:
+        print("❌ 성과 집계 검증 실패")
+        return 1
+    if mismatches:
+        print(f"❌ 성과 집계 불일치 {len(mismatches)}건")
+        for item in mismatches[:20]:
+            print(f"  {item['source']}/{item['scope']}/{item['scope_key'] or '-'} {item['column']}: "
+                  f"저장값 {item['stored']} / 재계산 {item['expected']}")
+        return 1
+    print("✅ 성과 집계가 거래/포지션 기록과 일치합니다")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
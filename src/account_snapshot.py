@@ -0,0 +1,433 @@
+"""
+계정 스냅샷 서비스 모듈 - 암호화폐 자동매매 봇
+
+거래소의 포지션과 잔고를 하나의 일정으로 조회해 메모리에 버전 번호와 함께
+보관하고, 포트폴리오 관리자/자동 포지션 관리자/웹 API 등 모든 소비자가 같은
+스냅샷을 공유하도록 합니다.
+
+조회 결과는 DB에 저장된 상태와 비교하여 바뀐 행만 기록하며, 변경이 있을 때만
+POSITION_UPDATED / BALANCE_CHANGED 이벤트를 발행합니다.
+"""
+
+import hashlib
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+from src.event_manager import EventType, get_event_manager
+from src.logging_config import get_logger
+
+logger = get_logger('crypto_bot.account_snapshot')
+
+# 잔고 계정 유형 (DB balances.balance_type 값과 동일)
+ACCOUNT_SPOT = 'spot'
+ACCOUNT_FUTURE = 'future'
+
+# 포지션 변경 비교에 사용하는 필드 (구조적 변경만, 시세에 따라 매번 바뀌는 평가 가격/손익은 제외)
+POSITION_FIELDS = ('contracts', 'side', 'entry_price', 'leverage')
+
+
+def position_key(position: Dict[str, Any]) -> Tuple[str, str]:
+    """포지션 식별 키 (심볼, 방향)"""
+    return position.get('symbol') or '', (position.get('side') or '').lower()
+
+
+def standardize_position(position: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    거래소 포지션(ccxt 형식)을 표준 포지션 형식으로 변환
+
+    Args:
+        position: 거래소 포지션 데이터
+
+    Returns:
+        dict: utils.api.get_positions 와 같은 필드의 포지션 (raw_data 제외)
+    """
+    return {
+        'symbol': position.get('symbol'),
+        'side': position.get('side'),
+        'notional': float(position.get('notional') or 0),
+        'contracts': float(position.get('contracts') or 0),
+        'entry_price': float(position.get('entryPrice', position.get('entry_price')) or 0),
+        'mark_price': float(position.get('markPrice', position.get('mark_price')) or 0),
+        'liquidation_price': float(position.get('liquidationPrice', position.get('liquidation_price')) or 0),
+        'unrealized_pnl': float(position.get('unrealizedPnl', position.get('unrealized_pnl')) or 0),
+        'margin_mode': position.get('marginMode', position.get('margin_mode')) or 'cross',
+        'leverage': int(float(position.get('leverage'))) if position.get('leverage') is not None else 1,
+    }
+
+
+def _position_signature(position: Dict[str, Any]) -> tuple:
+    """변경 비교용 포지션 값"""
+    values = []
+    for field in POSITION_FIELDS:
+        value = position.get(field)
+        if isinstance(value, float):
+            value = round(value, 10)
+        values.append(value)
+    return tuple(values)
+
+
+def _balance_rows(balances: Dict[str, Dict[str, Any]]) -> Dict[Tuple[str, str], Tuple[float, float]]:
+    """계정별 잔고를 DB 행 단위 {(계정, 통화): (총액, 가용액)} 로 변환 (0 잔고 제외)"""
+    rows = {}
+    for account, balance in balances.items():
+        if not balance:
+            continue
+        free = balance.get('free') or {}
+        for currency, total in (balance.get('total') or {}).items():
+            if total and total > 0:
+                rows[(account, currency)] = (float(total), float(free.get(currency) or 0))
+    return rows
+
+
+class AccountSnapshotService:
+    """
+    계정 스냅샷 서비스 클래스
+
+    refresh()는 한 번에 하나의 조회만 수행하며(single-flight), 최근 조회 후
+    min_refresh_interval 이내의 요청은 거래소를 다시 호출하지 않고 기존
+    스냅샷을 반환합니다.
+    """
+
+    def __init__(self, exchange_api, db_manager=None, event_manager=None,
+                 accounts: Optional[List[str]] = None, refresh_interval: float = 15.0,
+                 min_refresh_interval: float = 2.0):
+        """
+        계정 스냅샷 서비스 초기화
+
+        Args:
+            exchange_api: 거래소 API 인스턴스
+            db_manager: 데이터베이스 관리자 (None이면 DB에 기록하지 않음)
+            event_manager: 이벤트 관리자 (None이면 전역 인스턴스 사용)
+            accounts: 조회할 잔고 계정 목록 (None이면 거래소 시장 유형의 계정만)
+            refresh_interval: 외부 스케줄러의 refresh() 호출 간격 (초, 스냅샷 허용 나이 기준)
+            min_refresh_interval: 연속 조회 요청을 합치는 최소 간격 (초)
+        """
+        self.exchange_api = exchange_api
+        self.db = db_manager
+        self.event_manager = event_manager or get_event_manager()
+        self.accounts = list(accounts) if accounts else [self._native_account()]
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+
+        self._refresh_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._version = 0
+        self._updated_at = 0.0
+        self._positions: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._balances: Dict[str, Dict[str, Any]] = {}
+        self._stored_positions: Optional[Dict[Tuple[str, str], tuple]] = None
+        self._stored_balances: Optional[Dict[Tuple[str, str], Tuple[float, float]]] = None
+        self._stats = {'refreshes': 0, 'coalesced': 0, 'errors': 0,
+                       'position_writes': 0, 'balance_writes': 0}
+
+    def _native_account(self) -> str:
+        market_type = (getattr(self.exchange_api, 'market_type', 'spot') or 'spot').lower()
+        return ACCOUNT_FUTURE if market_type in ('future', 'futures') else ACCOUNT_SPOT
+
+    @property
+    def version(self) -> int:
+        """스냅샷 버전 (포지션 또는 잔고가 바뀔 때마다 증가)"""
+        return self._version
+
+    def add_account(self, account: str) -> None:
+        """조회할 잔고 계정 추가 (예: 웹 대시보드의 현물+선물 잔고)"""
+        if account not in self.accounts:
+            self.accounts.append(account)
+            self._updated_at = 0.0
+
+    def invalidate(self) -> None:
+        """다음 조회 요청 시 거래소에서 새로 가져오도록 스냅샷을 만료"""
+        self._updated_at = 0.0
+
+    def age(self) -> float:
+        """마지막 조회 이후 경과 시간 (초)"""
+        return time.time() - self._updated_at if self._updated_at else float('inf')
+
+    def refresh(self, force: bool = False) -> Dict[str, Any]:
+        """
+        거래소에서 계정 상태를 조회하여 스냅샷 갱신
+
+        Args:
+            force: True이면 최소 조회 간격과 관계없이 조회
+
+        Returns:
+            dict: 최신 스냅샷
+        """
+        if not force and self.age() < self.min_refresh_interval:
+            self._stats['coalesced'] += 1
+            return self.get_snapshot(max_age=None)
+
+        started = time.time()
+        with self._refresh_lock:
+            # 잠금을 기다리는 동안 다른 스레드가 조회를 마쳤으면 그 결과를 사용
+            if self._updated_at >= started:
+                self._stats['coalesced'] += 1
+                return self.get_snapshot(max_age=None)
+
+            try:
+                balances = self._fetch_balances()
+                positions = self._fetch_positions()
+            except Exception as e:
+                self._stats['errors'] += 1
+                logger.error(f"계정 스냅샷 조회 중 오류: {e}")
+                return self.get_snapshot(max_age=None)
+
+            self._apply(positions, balances)
+            self._stats['refreshes'] += 1
+            return self.get_snapshot(max_age=None)
+
+    def _fetch_balances(self) -> Dict[str, Dict[str, Any]]:
+        """계정별 잔고 조회 (실패한 계정은 이전 값 유지)"""
+        balances = {}
+        for account in self.accounts:
+            try:
+                balance = self.exchange_api.get_balance(balance_type=account)
+            except Exception as e:
+                logger.warning(f"{account} 잔고 조회 실패: {e}")
+                balance = None
+            if isinstance(balance, dict):
+                balances[account] = balance
+            elif account in self._balances:
+                balances[account] = self._balances[account]
+        return balances
+
+    def _fetch_positions(self) -> Optional[Dict[Tuple[str, str], Dict[str, Any]]]:
+        """선물 포지션 조회 (현물 거래소이면 None)"""
+        market_type = (getattr(self.exchange_api, 'market_type', 'spot') or 'spot').lower()
+        if market_type not in ('future', 'futures'):
+            return None
+        raw_positions = self.exchange_api.get_positions()
+        if not isinstance(raw_positions, list):
+            raise ValueError(f"포지션 조회 결과가 리스트가 아닙니다: {type(raw_positions)}")
+        positions = {}
+        for raw in raw_positions:
+            if not isinstance(raw, dict) or abs(float(raw.get('contracts') or 0)) <= 0:
+                continue
+            position = standardize_position(raw)
+            positions[position_key(position)] = position
+        return positions
+
+    def _apply(self, positions: Optional[Dict[Tuple[str, str], Dict[str, Any]]],
+               balances: Dict[str, Dict[str, Any]]) -> None:
+        """조회 결과를 스냅샷에 반영하고 바뀐 행만 DB에 기록"""
+        self._load_stored_state()
+
+        positions_changed = False
+        if positions is not None:
+            new_signatures = {key: _position_signature(p) for key, p in positions.items()}
+            upserts = [positions[key] for key, sig in new_signatures.items()
+                       if self._stored_positions.get(key) != sig]
+            closed = [key for key in self._stored_positions if key not in new_signatures]
+            positions_changed = bool(upserts or closed) or set(positions) != set(self._positions)
+            if (upserts or closed) and self._persist_positions(upserts, closed):
+                self._stored_positions = new_signatures
+
+        new_rows = _balance_rows(balances)
+        changed_rows = {key: value for key, value in new_rows.items() if self._stored_balances.get(key) != value}
+        removed_rows = [key for key in self._stored_balances if key not in new_rows]
+        balances_changed = bool(changed_rows or removed_rows)
+        if balances_changed and self._persist_balances(changed_rows, removed_rows):
+            self._stored_balances = new_rows
+
+        with self._state_lock:
+            if positions is not None:
+                self._positions = positions
+            self._balances = balances
+            if positions_changed or balances_changed or not self._version:
+                self._version += 1
+            self._updated_at = time.time()
+            version = self._version
+
+        if positions_changed:
+            self.event_manager.publish(EventType.POSITION_UPDATED, {
+                'positions': list(positions.values()), 'version': version
+            })
+        if balances_changed:
+            self.event_manager.publish(EventType.BALANCE_CHANGED, {
+                'balance': self.balance_summary(), 'version': version
+            })
+
+    def _load_stored_state(self) -> None:
+        """최초 조회 시 DB에 저장된 열린 포지션/잔고를 비교 기준으로 로드"""
+        if self._stored_positions is not None:
+            return
+        self._stored_positions = {}
+        self._stored_balances = {}
+        if not self.db:
+            return
+        try:
+            for row in self.db.get_open_positions():
+                self._stored_positions[position_key(row)] = _position_signature(row)
+            self._stored_balances = self.db.load_balance_rows()
+        except Exception as e:
+            logger.warning(f"DB 계정 상태 로드 실패, 전체를 새로 기록합니다: {e}")
+
+    def _persist_positions(self, upserts: List[Dict[str, Any]], closed: List[Tuple[str, str]]) -> bool:
+        """바뀐 포지션 행만 DB에 기록"""
+        if not self.db:
+            return True
+        try:
+            for position in upserts:
+                if self.db.save_position(dict(position, status='open')) is None:
+                    return False
+            if closed and self.db.close_positions(closed) is False:
+                return False
+            self._stats['position_writes'] += len(upserts) + len(closed)
+            logger.debug("포지션 변경분 저장: 갱신 %d개, 종료 %d개", len(upserts), len(closed))
+            return True
+        except Exception as e:
+            logger.error(f"포지션 변경분 저장 중 오류: {e}")
+            return False
+
+    def _persist_balances(self, changed: Dict[Tuple[str, str], Tuple[float, float]],
+                          removed: List[Tuple[str, str]]) -> bool:
+        """바뀐 잔고 행만 DB에 기록"""
+        if not self.db:
+            return True
+        try:
+            if not self.db.apply_balance_changes(changed, removed):
+                return False
+            self._stats['balance_writes'] += len(changed) + len(removed)
+            logger.debug("잔고 변경분 저장: 갱신 %d개, 삭제 %d개", len(changed), len(removed))
+            return True
+        except Exception as e:
+            logger.error(f"잔고 변경분 저장 중 오류: {e}")
+            return False
+
+    def get_snapshot(self, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """
+        현재 스냅샷 반환
+
+        Args:
+            max_age: 스냅샷이 이보다 오래되었으면 먼저 갱신 (초, None이면 갱신하지 않음)
+
+        Returns:
+            dict: version, updated_at, positions, balances 키를 가진 스냅샷
+        """
+        if max_age is not None and self.age() > max_age:
+            return self.refresh()
+        with self._state_lock:
+            return {
+                'version': self._version,
+                'updated_at': datetime.fromtimestamp(self._updated_at).isoformat() if self._updated_at else None,
+                'positions': [dict(p) for p in self._positions.values()],
+                'balances': dict(self._balances),
+            }
+
+    def get_positions(self, max_age: Optional[float] = None) -> List[Dict[str, Any]]:
+        """표준 형식의 열린 포지션 목록"""
+        return self.get_snapshot(max_age)['positions']
+
+    def get_balance(self, account: Optional[str] = None, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        계정 잔고 (ccxt fetch_balance 형식: free/used/total/info)
+
+        Args:
+            account: 계정 유형 (None이면 거래소 시장 유형의 계정)
+            max_age: 최대 허용 스냅샷 나이 (초)
+
+        Returns:
+            dict: 잔고 정보 (조회된 적 없으면 None)
+        """
+        return self.get_snapshot(max_age)['balances'].get(account or self._native_account())
+
+    def get_account_info(self, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """
+        마진 계산용 선물 계정 정보 (거래소 원본 응답의 info 필드)
+
+        Returns:
+            dict: totalWalletBalance, totalUnrealizedProfit, totalMaintMargin 등을 포함한 정보
+        """
+        balance = self.get_balance(ACCOUNT_FUTURE, max_age) or {}
+        info = dict(balance.get('info') or {})
+        if 'totalMaintMargin' in info and 'totalMaintenanceMargin' not in info:
+            info['totalMaintenanceMargin'] = info['totalMaintMargin']
+        return info
+
+    def balance_summary(self) -> Dict[str, Any]:
+        """
+        대시보드용 잔액 요약 (utils.api.get_formatted_balances()['balance'] 와 같은 형식)
+
+        Returns:
+            dict: spot/future 계정별 USDT 잔액과 total_usdt
+        """
+        with self._state_lock:
+            balances = dict(self._balances)
+        summary = {}
+        for account in (ACCOUNT_SPOT, ACCOUNT_FUTURE):
+            balance = balances.get(account)
+            totals = (balance or {}).get('total') or {}
+            summary[account] = {
+                'success': balance is not None,
+                'balance': float(totals.get('USDT') or 0),
+                'error': None if balance is not None or account not in self.accounts else '잔고 조회 실패'
+            }
+        summary['total_usdt'] = summary[ACCOUNT_SPOT]['balance'] + summary[ACCOUNT_FUTURE]['balance']
+        return summary
+
+    def get_stats(self) -> Dict[str, Any]:
+        """조회/기록 통계"""
+        return dict(self._stats, version=self._version, age=self.age(), accounts=list(self.accounts))
+
+
+# 거래소 계정별 공유 인스턴스
+_services: Dict[Tuple[str, str, str], AccountSnapshotService] = {}
+_services_lock = threading.Lock()
+
+
+def account_fingerprint(exchange_api) -> str:
+    """
+    거래소 계정 식별값 (API 키와 접속 주소의 해시)
+
+    API 키가 다르거나 테스트넷/실거래처럼 접속 주소가 다르면 값이 달라집니다.
+    API 키를 알 수 없으면 인스턴스 자체를 식별값으로 사용합니다.
+
+    Args:
+        exchange_api: 거래소 API 인스턴스
+
+    Returns:
+        str: 식별값 (키 원문은 포함하지 않음)
+    """
+    exchange = getattr(exchange_api, 'exchange', None)
+    api_key = getattr(exchange, 'apiKey', None) or getattr(exchange_api, 'api_key', None)
+    if not api_key:
+        return f"instance:{id(exchange_api)}"
+    urls = getattr(exchange, 'urls', None) or {}
+    endpoint = repr(urls.get('api')) if isinstance(urls, dict) else ''
+    sandbox = getattr(exchange, 'isSandboxModeEnabled', False)
+    digest = hashlib.sha256(f"{api_key}|{endpoint}|{sandbox}".encode('utf-8')).hexdigest()
+    return digest[:16]
+
+
+def get_account_snapshot_service(exchange_api, db_manager=None, accounts: Optional[List[str]] = None) -> AccountSnapshotService:
+    """
+    거래소 계정(거래소/시장 유형/API 키와 접속 주소)별 공유 계정 스냅샷 서비스 반환
+
+    같은 거래소 계정을 사용하는 모든 소비자가 하나의 스냅샷을 공유합니다.
+    API 키나 테스트넷 여부가 다른 인스턴스는 서로 다른 서비스를 받습니다.
+    이미 생성된 서비스에 새 계정 유형이 요청되면 조회 대상에 추가합니다.
+
+    Args:
+        exchange_api: 거래소 API 인스턴스
+        db_manager: 데이터베이스 관리자
+        accounts: 필요한 잔고 계정 목록
+
+    Returns:
+        AccountSnapshotService: 계정 스냅샷 서비스
+    """
+    key = (getattr(exchange_api, 'exchange_id', 'default'),
+           (getattr(exchange_api, 'market_type', 'spot') or 'spot').lower(),
+           account_fingerprint(exchange_api))
+    with _services_lock:
+        service = _services.get(key)
+        if service is None:
+            service = AccountSnapshotService(exchange_api, db_manager=db_manager, accounts=accounts)
+            _services[key] = service
+        else:
+            if service.db is None and db_manager is not None:
+                service.db = db_manager
+            for account in accounts or []:
+                service.add_account(account)
+        return service
@@ -21,6 +21,10 @@ from src.error_handlers import (
 
 # 개선된 로깅 설정 사용
 from src.logging_config import get_logger
+from src.trigger_index import TriggerIndex
+from src.account_snapshot import get_account_snapshot_service
+from src.scheduler import get_scheduler
+from src.event_manager import get_event_manager, EventType, DISPATCH_SYNC
 
 # 로거 가져오기
 logger = get_logger('crypto_bot.auto_position_manager')
@@ -39,7 +43,10 @@ class AutoPositionManager:
         self.trading_algorithm = trading_algorithm
         self.monitor_interval = monitor_interval
         self.monitoring_active = False
-        self.monitor_thread = None
+        self.monitor_job = None
+        self.consecutive_errors = 0
+        self.max_consecutive_errors = 5
+        self.last_success_time = time.time()
         
         # 설정값
         self.auto_sl_tp_enabled = False  # 자동 손절매/이익실현 활성화 여부
@@ -50,10 +57,32 @@ class AutoPositionManager:
         self.sl_percentage = 0.05  # 기본 손절매 비율 (5%)
         self.tp_percentage = 0.1   # 기본 이익실현 비율 (10%)
         
+        # 트레일링 스탑 설정
+        self.trailing_stop_enabled = False
+        self.trailing_activation_pct = 0.01  # 활성화 수익률 (1%)
+        self.trailing_pct = 0.02             # 고점 대비 트레일링 간격 (2%)
+        
+        # 심볼별 가격 정렬 트리거 인덱스 (가격이 지나친 손절/이익실현/트레일링 트리거만 평가)
+        self.exit_evaluator = TriggerIndex(
+            sl_pct=self.sl_percentage,
+            tp_pct=self.tp_percentage,
+            trailing_activation_pct=self.trailing_activation_pct,
+            trailing_pct=self.trailing_pct
+        )
+        
+        # 이벤트로 받은 포지션 변경분 (포지션 ID -> 포지션, None이면 종료) 과 전체 재동기화 상태
+        self._position_deltas = {}
+        self._delta_lock = threading.Lock()
+        self._reconcile_needed = True
+        self.reconcile_interval = 300  # 이벤트 누락 대비 전체 재동기화 간격(초)
+        self._last_reconcile_time = 0
+        self.event_manager = get_event_manager()
+        
         # 마진 안전장치 관련 상태 변수
         self.last_margin_check_time = 0
         self.margin_check_interval = 60  # 마진 레벨 검사 간격(초)
         self.emergency_actions_taken = False  # 비상 조치 수행 여부
+        self.emergency_order_deadline = 5.0  # 비상 청산 주문 전체 마감 시간(초)
         
         logger.info("자동 포지션 관리자가 초기화되었습니다.")
         logger.info("마진 안전장치 기능이 활성화되었습니다.")
@@ -71,9 +100,14 @@ class AutoPositionManager:
             raise ValueError("트레이딩 알고리즘이 초기화되지 않음")
         
         self.monitoring_active = True
-        self.monitor_thread = threading.Thread(target=self._monitor_positions_loop)
-        self.monitor_thread.daemon = True
-        self.monitor_thread.start()
+        self.consecutive_errors = 0
+        self.last_success_time = time.time()
+        # 첫 검사에서 전체 동기화 후에는 포지션 이벤트의 변경분만 트리거 인덱스에 반영
+        self._request_reconcile()
+        self._subscribe_position_events()
+        # 손절/익절 감시는 백업/네트워크 점검 등 오래 막히는 작업에 밀리지 않도록 전용 작업자에서 실행
+        self.monitor_job = get_scheduler().add_job('auto_position_manager.monitor', self._monitor_positions_tick,
+                                                   self.monitor_interval, dedicated=True)
         
         logger.info(f"포지션 모니터링을 시작합니다. 모니터링 간격: {self.monitor_interval}초")
         return True
@@ -85,18 +119,19 @@ class AutoPositionManager:
             logger.warning("포지션 모니터링이 이미 비활성화되어 있습니다.")
             return False
         
-        # 먼저 monitoring_active를 False로 설정하여 스레드가 자연스럽게 종료되도록 함
+        # 먼저 monitoring_active를 False로 설정하고 예약된 작업 취소
         self.monitoring_active = False
-        logger.info("모니터링 플래그를 비활성화했습니다. 스레드 종료 대기 중...")
+        self._unsubscribe_position_events()
+        logger.info("모니터링 플래그를 비활성화했습니다. 실행 중인 검사 종료 대기 중...")
         
-        # 스레드가 있으면 안전하게 종료 대기
-        if self.monitor_thread and self.monitor_thread.is_alive():
+        # 작업이 실행 중이면 안전하게 종료 대기
+        if self.monitor_job:
             try:
-                self.monitor_thread.join(timeout=2.0)
-                if self.monitor_thread.is_alive():
-                    logger.warning("모니터링 스레드가 시간 내에 종료되지 않았지만, 비활성화 플래그는 설정되었습니다.")
+                if not self.monitor_job.cancel(wait=2.0):
+                    logger.warning("모니터링 작업이 시간 내에 종료되지 않았지만, 비활성화 플래그는 설정되었습니다.")
             except Exception as e:
-                logger.error(f"스레드 종료 중 오류: {e}")
+                logger.error(f"모니터링 작업 취소 중 오류: {e}")
+            self.monitor_job = None
             
         logger.info("포지션 모니터링을 중지했습니다.")
         return True
@@ -147,80 +182,82 @@ class AutoPositionManager:
             logger.error(f"자동 손절매/이익실현 기능 설정 중 오류: {e}")
             return False
     
-    def _monitor_positions_loop(self):
-        """포지션 모니터링 루프"""
-        consecutive_errors = 0
-        max_consecutive_errors = 5
-        last_success_time = time.time()
+    def _monitor_positions_tick(self):
+        """
+        포지션 모니터링 1회 실행 (공용 스케줄러에서 주기 실행)
         
-        while self.monitoring_active:
-            try:
-                current_time = time.time()
-                
-                # 자동 손절매/이익실현 활성화 확인
-                has_open_positions = False
-                if self.auto_sl_tp_enabled:
-                    # 열린 포지션이 있는지 확인 - 네트워크 오류에 대해 더 강화된 오류 처리 필요
-                    try:
-                        has_open_positions = self._check_and_manage_positions()
-                        # 성공적인 검사이면 오류 카운터 초기화
-                        consecutive_errors = 0
-                        last_success_time = current_time
-                    except NetworkError as e:
-                        consecutive_errors += 1
-                        logger.warning(f"포지션 검사 중 네트워크 오류 ({consecutive_errors}/{max_consecutive_errors}): {e}")
-                        # 네트워크 오류 발생 시 기다리는 시간 조정
-                        sleep_interval = min(30, consecutive_errors * 5)  # 최대 30초, 오류 발생마다 5초씩 증가
-                        time.sleep(sleep_interval)
-                        continue
-                    except Exception as e:
-                        consecutive_errors += 1
-                        logger.error(f"포지션 검사 중 예상치 못한 오류 ({consecutive_errors}/{max_consecutive_errors}): {e}")
-                
-                # 마진 안전장치 검사 (설정된 간격으로 실행)
-                if self.margin_safety_enabled and (current_time - self.last_margin_check_time >= self.margin_check_interval):
-                    try:
-                        self._check_margin_safety()
-                        self.last_margin_check_time = current_time
-                    except Exception as e:
-                        logger.error(f"마진 안전성 검사 오류: {e}")
-                        # 오류가 발생해도 마지막 검사 시간은 업데이트
-                        self.last_margin_check_time = current_time - (self.margin_check_interval // 2)  # 다음 검사 시간을 좀 빨리 설정
-                
-                # 열린 포지션이 없으면 모니터링 간격을 늘림
-                sleep_interval = self.monitor_interval
-                if not has_open_positions:
-                    sleep_interval = self.monitor_interval * 2
-                # 비상 상태에서는 모니터링 간격을 줄임
-                elif self.emergency_actions_taken:
-                    sleep_interval = max(5, self.monitor_interval // 3)  # 최소 5초, 또는 기본 간격의 1/3
-                
-                # 지속적인 오류 또는 오랜 시간 성공적인 검사가 없을 때 환인 메시지 생성
-                if consecutive_errors >= max_consecutive_errors:
-                    logger.critical(f"연속 {consecutive_errors}회 오류 발생: 모니터링 시스템을 재시작하는 것이 좋을 수 있습니다.")
-                    # 최대 연속 오류 횟수 초과 시 오류 카운터 초기화 (로그 스팸 방지)
-                    consecutive_errors = 0
-                
-                # 오랜 시간 성공적인 검사가 없을 때 (1시간 이상)
-                if (current_time - last_success_time) > 3600:
-                    logger.warning(f"마지막 성공 검사로부터 {(current_time - last_success_time) // 60:.0f}분 경과: 시스템 상태를 확인하세요.")
-                    last_success_time = current_time  # 로그 스팸 방지를 위해 시간 업데이트
-                
-                time.sleep(sleep_interval)
-                
-            except Exception as e:
-                logger.error(f"포지션 모니터링 중 예상치 못한 오류 발생: {e}")
-                logger.error(traceback.format_exc())  # 자세한 스택 트레이스 추가
-                # 오류 발생 시 안전한 재시도를 위해 짠시 대기
-                time.sleep(max(self.monitor_interval, 10))  # 최소 10초 이상 대기
+        포지션 유무, 비상 상태, 네트워크 오류에 따라 다음 실행 간격(monitor_job.interval)을 조정합니다.
+        """
+        job = self.monitor_job
+        try:
+            current_time = time.time()
+            
+            # 자동 손절매/이익실현 활성화 확인
+            has_open_positions = False
+            if self.auto_sl_tp_enabled:
+                # 열린 포지션이 있는지 확인 - 네트워크 오류에 대해 더 강화된 오류 처리 필요
+                try:
+                    has_open_positions = self._check_and_manage_positions()
+                    # 성공적인 검사이면 오류 카운터 초기화
+                    self.consecutive_errors = 0
+                    self.last_success_time = current_time
+                except NetworkError as e:
+                    self.consecutive_errors += 1
+                    logger.warning(f"포지션 검사 중 네트워크 오류 ({self.consecutive_errors}/{self.max_consecutive_errors}): {e}")
+                    # 네트워크 오류 발생 시 기다리는 시간 조정
+                    if job:
+                        job.interval = min(30, self.consecutive_errors * 5)  # 최대 30초, 오류 발생마다 5초씩 증가
+                    return
+                except Exception as e:
+                    self.consecutive_errors += 1
+                    logger.error(f"포지션 검사 중 예상치 못한 오류 ({self.consecutive_errors}/{self.max_consecutive_errors}): {e}")
+            
+            # 마진 안전장치 검사 (설정된 간격으로 실행)
+            if self.margin_safety_enabled and (current_time - self.last_margin_check_time >= self.margin_check_interval):
+                try:
+                    self._check_margin_safety()
+                    self.last_margin_check_time = current_time
+                except Exception as e:
+                    logger.error(f"마진 안전성 검사 오류: {e}")
+                    # 오류가 발생해도 마지막 검사 시간은 업데이트
+                    self.last_margin_check_time = current_time - (self.margin_check_interval // 2)  # 다음 검사 시간을 좀 빨리 설정
+            
+            # 열린 포지션이 없으면 모니터링 간격을 늘림
+            interval = self.monitor_interval
+            if not has_open_positions:
+                interval = self.monitor_interval * 2
+            # 비상 상태에서는 모니터링 간격을 줄임
+            elif self.emergency_actions_taken:
+                interval = max(5, self.monitor_interval // 3)  # 최소 5초, 또는 기본 간격의 1/3
+            if job:
+                job.interval = interval
+            
+            # 지속적인 오류 또는 오랜 시간 성공적인 검사가 없을 때 환인 메시지 생성
+            if self.consecutive_errors >= self.max_consecutive_errors:
+                logger.critical(f"연속 {self.consecutive_errors}회 오류 발생: 모니터링 시스템을 재시작하는 것이 좋을 수 있습니다.")
+                # 최대 연속 오류 횟수 초과 시 오류 카운터 초기화 (로그 스팸 방지)
+                self.consecutive_errors = 0
+            
+            # 오랜 시간 성공적인 검사가 없을 때 (1시간 이상)
+            if (current_time - self.last_success_time) > 3600:
+                logger.warning(f"마지막 성공 검사로부터 {(current_time - self.last_success_time) // 60:.0f}분 경과: 시스템 상태를 확인하세요.")
+                self.last_success_time = current_time  # 로그 스팸 방지를 위해 시간 업데이트
+            
+        except Exception as e:
+            logger.error(f"포지션 모니터링 중 예상치 못한 오류 발생: {e}")
+            logger.error(traceback.format_exc())  # 자세한 스택 트레이스 추가
+            # 오류 발생 시 안전한 재시도를 위해 대기 간격을 늘림
+            if job:
+                job.interval = max(self.monitor_interval, 10)  # 최소 10초 이상 대기
     
     @network_error_handler(retry_count=3, max_delay=30)
     def _check_and_manage_positions(self):
         """포지션 확인 및 관리"""
         try:
-            # 현재 포지션 가져오기 - API 호출 실패 가능
-            positions = self.trading_algorithm.get_positions(status='open')
-            if not positions:
+            # 포지션 변경분을 트리거 인덱스에 반영 (재동기화가 필요할 때만 전체 포지션 조회)
+            self._sync_exit_evaluator()
+            self._apply_position_deltas()
+            if not len(self.exit_evaluator):
                 logger.debug("열린 포지션이 없습니다.")
                 return False
             
@@ -232,18 +269,25 @@ class AutoPositionManager:
                 
             # 로그에 현재 설정 표시
             if self.auto_sl_tp_enabled:
-                logger.debug(f"자동 손절매/이익실현 활성화됨: 손절={self.sl_percentage:.1%}, 이익실현={self.tp_percentage:.1%}, 부분 이익실현: {self.partial_tp_enabled}")
+                logger.debug("자동 손절매/이익실현 활성화됨: 손절=%.1f%%, 이익실현=%.1f%%, 부분 이익실현: %s",
+                             self.sl_percentage * 100, self.tp_percentage * 100, self.partial_tp_enabled)
             
             # 성공적으로 정보 수집 완료 - 로그 추가
-            position_count = len(positions)
-            logger.debug(f"현재 {position_count}개의 포지션 처리 중, 현재가: {current_price}")
+            logger.debug("현재 %d개의 포지션 처리 중, 현재가: %s", len(self.exit_evaluator), current_price)
+            
+            if self.trading_algorithm.market_type.lower() == 'futures':
+                for warning in self.exit_evaluator.liquidation_warnings(current_price):
+                    logger.critical(f"⚠️⚠️⚠️ 포지션 {warning['position_id']} 청산 경고! 현재가={warning['current_price']}, "
+                                    f"청산가={warning['liquidation_price']} (이격: {warning['distance_pct']:.2f}%)")
             
-            # 각 포지션에 대해 손절매/이익실현 조건 확인
-            for i, position in enumerate(positions):
+            for signal in self.exit_evaluator.evaluate(current_price):
+                position_id = signal['position_id']
                 try:
-                    position_id = position.get('id', f"unknown_position_{i}")
-                    logger.debug(f"포지션 {i+1}/{position_count} 검사 중: ID={position_id}")
-                    self._check_position_exit_conditions(position, current_price)
+                    logger.info(f"포지션 {position_id}: {signal['exit_type']} 시그널 발생, 이유: {signal['exit_reason']}, "
+                                f"비율: {signal['exit_percentage']:.1%}")
+                    if self._execute_position_exit(signal['position'], signal['current_price'], signal['exit_type'],
+                                                   signal['exit_reason'], signal['exit_percentage']):
+                        self._after_position_exit(position_id, signal['exit_percentage'])
                 except Exception as e:
                     # 개별 포지션 처리 오류가 전체 과정을 중단하지 않도록 처리
                     logger.error(f"포지션 {position_id} 처리 중 오류: {e} - 다음 포지션으로 진행합니다.")
@@ -264,154 +308,153 @@ class AutoPositionManager:
             logger.error(traceback.format_exc())
             return False  # 예상치 못한 오류는 False 반환
     
-    @trade_error_handler(retry_count=1)
-    def _check_position_exit_conditions(self, position, current_price):
-        """개별 포지션의 종료 조건 확인"""
-        # 포지션 ID 확인
-        position_id = position.get('id')
-        if not position_id:
-            logger.warning("포지션 ID가 없어 자동 관리할 수 없습니다.")
-            raise PositionError("포지션 ID가 없어 처리할 수 없음")
-        
-        # 포지션 정보 확인
-        side = position.get('side')
-        entry_price = position.get('entry_price')
-        if not side or not entry_price or entry_price <= 0:
-            logger.warning(f"포지션 {position_id}: 유효하지 않은 포지션 정보 side={side}, entry_price={entry_price}")
-            raise PositionError(f"유효하지 않은 포지션 정보: side={side}, entry_price={entry_price}")
+    @safe_execution
+    def set_trailing_stop(self, enabled=True, activation_pct=None, trail_pct=None):
+        """
+        트레일링 스탑 기능 설정
         
-        try:
-            # 위험 관리 구성 가져오기
-            risk_config = self.trading_algorithm.risk_management
-            if not risk_config:
-                logger.warning(f"포지션 {position_id}: 위험 관리 구성이 없습니다. 기본값 사용")
-                # 기본 값 설정 (자체 설정 사용)
-                risk_config = {'stop_loss_pct': self.sl_percentage, 'take_profit_pct': self.tp_percentage}
-            
-            # RiskManager를 사용하여 손절매/이익실현 가격 계산
-            try:
-                risk_manager = self.trading_algorithm.exchange_api.risk_manager
-                
-                # 위험 관리자 설정 업데이트
-                risk_manager.partial_tp_enabled = self.partial_tp_enabled
-                risk_manager.auto_exit_enabled = self.auto_sl_tp_enabled
-                
-                # 현재 설정으로 위험 관리자 업데이트
-                if not hasattr(risk_manager, 'risk_config'):
-                    risk_manager.risk_config = {}
-                    
-                risk_manager.risk_config['stop_loss_pct'] = self.sl_percentage
-                risk_manager.risk_config['take_profit_pct'] = self.tp_percentage
-                
-                # RiskManager의 중앙화된 계산 메서드 사용
-                stop_loss_price = risk_manager.calculate_stop_loss_price(
-                    entry_price=entry_price,
-                    side=side,
-                    custom_pct=risk_config.get('stop_loss_pct')
-                )
-                
-                take_profit_price = risk_manager.calculate_take_profit_price(
-                    entry_price=entry_price,
-                    side=side,
-                    custom_pct=risk_config.get('take_profit_pct')
-                )
-                
-                if stop_loss_price is None or take_profit_price is None:
-                    logger.error(f"포지션 {position_id}: 손절매/이익실현 가격 계산 실패")
-                    raise ValueError("손절매/이익실현 가격 계산 실패")
-                    
-            except Exception as e:
-                logger.error(f"RiskManager를 통한 가격 계산 중 오류: {e}")
-                # 폴백: 기본 RiskManager 인스턴스 생성하여 계산
-                logger.warning(f"폴백 모드로 새 RiskManager 인스턴스 생성")
-                try:
-                    from src.risk_manager import RiskManager
-                    fallback_risk_manager = RiskManager(self.config)
-                    fallback_risk_manager.risk_config = {
-                        'stop_loss_pct': risk_config.get('stop_loss_pct', self.sl_percentage),
-                        'take_profit_pct': risk_config.get('take_profit_pct', self.tp_percentage)
-                    }
-                    
-                    stop_loss_price = fallback_risk_manager.calculate_stop_loss_price(
-                        entry_price=entry_price,
-                        side=side
-                    )
-                    
-                    take_profit_price = fallback_risk_manager.calculate_take_profit_price(
-                        entry_price=entry_price,
-                        side=side
-                    )
-                except:
-                    # RiskManager가 완전히 실패한 경우에만 None 반환
-                    logger.critical(f"포지션 {position_id}: RiskManager 완전 실패")
-                    stop_loss_price = None
-                    take_profit_price = None
-        except Exception as main_error:
-            logger.error(f"포지션 {position_id} 처리 중 일반 오류: {main_error}")
-            # 기본값으로 RiskManager 호출
-            try:
-                stop_loss_price = risk_manager.calculate_stop_loss_price(
-                    entry_price=entry_price,
-                    side=side,
-                    custom_pct=self.sl_percentage
-                )
-                take_profit_price = risk_manager.calculate_take_profit_price(
-                    entry_price=entry_price,
-                    side=side,
-                    custom_pct=self.tp_percentage
-                )
-            except:
-                logger.critical(f"포지션 {position_id}: 모든 가격 계산 실패")
-                stop_loss_price = None
-                take_profit_price = None
-        
-        # 선물거래인 경우 청산 가격 확인
-        if self.trading_algorithm.market_type.lower() == 'futures':
-            leverage = position.get('leverage', 10)  # 기본 레버리지 10
-            liquidation_price = risk_manager.calculate_liquidation_price(
-                entry_price=entry_price,
-                side=side,
-                leverage=leverage
-            )
-            
-            if liquidation_price:
-                # 현재 가격과 청산 가격의 거리 계산
-                if side.lower() == 'long':
-                    liq_distance_pct = (current_price - liquidation_price) / current_price * 100
-                    if liq_distance_pct < 5:  # 청산 가격과 5% 이내 근접
-                        logger.critical(f"⚠️⚠️⚠️ 포지션 {position_id} 청산 경고! 현재가={current_price}, 청산가={liquidation_price} (이격: {liq_distance_pct:.2f}%)")
-                else:  # short
-                    liq_distance_pct = (liquidation_price - current_price) / current_price * 100
-                    if liq_distance_pct < 5:  # 청산 가격과 5% 이내 근접
-                        logger.critical(f"⚠️⚠️⚠️ 포지션 {position_id} 청산 경고! 현재가={current_price}, 청산가={liquidation_price} (이격: {liq_distance_pct:.2f}%)")
-                
-                logger.debug(f"포지션 {position_id} (유형: {side}) 검사: 현재가={current_price}, 손절가={stop_loss_price:.2f}, 이익실현가={take_profit_price:.2f}, 청산가={liquidation_price:.2f}")
+        Args:
+            enabled (bool): 트레일링 스탑 활성화 여부
+            activation_pct (float): 트레일링 스탑 활성화 수익률 (None이면 현재 설정 유지)
+            trail_pct (float): 고점(숏은 저점) 대비 트레일링 간격 비율 (None이면 현재 설정 유지)
+        
+        Returns:
+            bool: 성공 여부
+        """
+        self.trailing_stop_enabled = enabled
+        if activation_pct is not None and 0 <= activation_pct < 1.0:
+            self.trailing_activation_pct = activation_pct
+        if trail_pct is not None and 0 < trail_pct < 1.0:
+            self.trailing_pct = trail_pct
+        
+        if enabled:
+            logger.info(f"트레일링 스탑 활성화됨. 활성화 수익률={self.trailing_activation_pct:.1%}, 간격={self.trailing_pct:.1%}")
         else:
-            logger.debug(f"포지션 {position_id} (유형: {side}) 검사: 현재가={current_price}, 손절가={stop_loss_price:.2f}, 이익실현가={take_profit_price:.2f}")
+            logger.info("트레일링 스탑 비활성화됨")
+        return True
+    
+    def _sync_exit_evaluator(self):
+        """현재 설정과 위험 관리 구성을 청산 평가기에 반영"""
+        risk_config = getattr(self.trading_algorithm, 'risk_management', None) or {}
         
-        # 종료 조건 확인 - API 오류 발생 가능
-        try:
-            exit_type, exit_reason, exit_percentage = risk_manager.check_exit_conditions(
-                current_price=current_price,
-                position_type=side,
-                entry_price=entry_price,
-                stop_loss_price=stop_loss_price,
-                take_profit_price=take_profit_price,
-                position_id=position_id,
-                check_partial=self.partial_tp_enabled
-            )
-        except Exception as e:
-            logger.error(f"포지션 {position_id}: 종료 조건 검사 중 오류: {e}")
-            raise APIError(f"종료 조건 검사 실패: {e}")
+        tp_levels = tp_percentages = None
+        risk_manager = getattr(getattr(self.trading_algorithm, 'exchange_api', None), 'risk_manager', None)
+        if risk_manager is not None:
+            tp_levels = getattr(risk_manager, 'tp_levels', None)
+            tp_percentages = getattr(risk_manager, 'tp_percentages', None)
         
-        # 청산 조건 충족 시 처리
-        if exit_type:
-            logger.info(f"포지션 {position_id}: {exit_type} 시그널 발생, 이유: {exit_reason}, 비율: {exit_percentage:.1%}")
-            self._execute_position_exit(position, current_price, exit_type, exit_reason, exit_percentage)
-            return True
-            
-        return False
-            
+        self.exit_evaluator.configure(
+            sl_pct=risk_config.get('stop_loss_pct', self.sl_percentage),
+            tp_pct=risk_config.get('take_profit_pct', self.tp_percentage),
+            partial_tp_enabled=self.partial_tp_enabled,
+            tp_levels=tp_levels,
+            tp_percentages=tp_percentages,
+            trailing_enabled=self.trailing_stop_enabled,
+            trailing_activation_pct=self.trailing_activation_pct,
+            trailing_pct=self.trailing_pct
+        )
+    
+    def _subscribe_position_events(self):
+        """포지션 변경 이벤트 구독 (핸들러는 변경분만 기록하므로 동기로 등록)"""
+        self.event_manager.subscribe(EventType.POSITION_OPENED, self._on_position_opened, dispatch=DISPATCH_SYNC)
+        self.event_manager.subscribe(EventType.POSITION_UPDATED, self._on_position_updated, dispatch=DISPATCH_SYNC)
+        self.event_manager.subscribe(EventType.POSITION_CLOSED, self._on_position_closed, dispatch=DISPATCH_SYNC)
+        self.event_manager.subscribe(EventType.TRADE_EXECUTED, self._on_trade_executed, dispatch=DISPATCH_SYNC)
+        self.event_manager.subscribe(EventType.ORDER_FILLED, self._on_trade_executed, dispatch=DISPATCH_SYNC)
+    
+    def _unsubscribe_position_events(self):
+        """포지션 변경 이벤트 구독 해제"""
+        self.event_manager.unsubscribe(EventType.POSITION_OPENED, self._on_position_opened)
+        self.event_manager.unsubscribe(EventType.POSITION_UPDATED, self._on_position_updated)
+        self.event_manager.unsubscribe(EventType.POSITION_CLOSED, self._on_position_closed)
+        self.event_manager.unsubscribe(EventType.TRADE_EXECUTED, self._on_trade_executed)
+        self.event_manager.unsubscribe(EventType.ORDER_FILLED, self._on_trade_executed)
+    
+    def _on_position_opened(self, data):
+        self._queue_position_delta(data, closed=False)
+    
+    def _on_position_updated(self, data):
+        self._queue_position_delta(data, closed=False)
+    
+    def _on_position_closed(self, data):
+        self._queue_position_delta(data, closed=True)
+    
+    def _on_trade_executed(self, data):
+        # 체결로 새로 생기거나 바뀐 DB 포지션은 ID를 알 수 없으므로 다음 검사에서 전체 재동기화
+        self._request_reconcile()
+    
+    def _request_reconcile(self):
+        """다음 검사에서 DB 포지션 전체로 트리거 인덱스를 재동기화하도록 표시"""
+        with self._delta_lock:
+            self._reconcile_needed = True
+    
+    def _queue_position_delta(self, data, closed):
+        """
+        포지션 이벤트를 변경분으로 기록
+        
+        DB 포지션 ID(position_id)가 있는 이벤트만 변경분으로 반영합니다. 추가/변경은 DB 행
+        (id == position_id)을 담은 경우에만 반영하고, 포지션 목록
+        전체를 담은 계좌 스냅샷 이벤트나 ID를 대조할 수 없는 이벤트는 전체 재동기화로 처리합니다.
+        
+        Args:
+            data (dict): 이벤트 데이터 (position_id, position)
+            closed (bool): 포지션 종료 이벤트 여부
+        """
+        data = data or {}
+        position = data.get('position') if isinstance(data.get('position'), dict) else None
+        position_id = data.get('position_id')
+        symbol = getattr(self.trading_algorithm, 'symbol', None)
+        with self._delta_lock:
+            if position_id is None or 'positions' in data:
+                self._reconcile_needed = True
+            elif closed or (position is not None and position.get('status') == 'closed'):
+                self._position_deltas[position_id] = None
+            elif position is not None and position.get('id') == position_id:
+                # 다른 심볼 포지션은 이 관리자가 감시하지 않으므로 무시
+                if symbol is None or position.get('symbol') == symbol:
+                    self._position_deltas[position_id] = position
+            else:
+                self._reconcile_needed = True
+    
+    def _apply_position_deltas(self):
+        """
+        기록된 포지션 변경분을 트리거 인덱스에 반영
+        
+        재동기화가 필요하거나(첫 검사, ID 없는 이벤트, 주문 체결) 재동기화 간격이 지나면
+        DB의 열린 포지션 전체로 sync() 하고, 그 외에는 변경분만 upsert()/remove() 합니다.
+        """
+        now = time.time()
+        with self._delta_lock:
+            reconcile = self._reconcile_needed or now - self._last_reconcile_time >= self.reconcile_interval
+            deltas = self._position_deltas
+            self._position_deltas = {}
+            self._reconcile_needed = False
+        
+        if reconcile:
+            try:
+                # 현재 포지션 가져오기 - API 호출 실패 가능
+                positions = self.trading_algorithm.get_positions(status='open') or []
+            except Exception:
+                self._request_reconcile()
+                raise
+            self.exit_evaluator.sync(positions)
+            self._last_reconcile_time = now
+            logger.debug("트리거 인덱스 전체 재동기화: %d개 포지션", len(self.exit_evaluator))
+            return
+        
+        for position_id, position in deltas.items():
+            if position is None:
+                self.exit_evaluator.remove(position_id)
+            else:
+                self.exit_evaluator.upsert(position)
+    
+    def _after_position_exit(self, position_id, exit_percentage):
+        """청산 실행 후 트리거 인덱스 반영 (전체 청산은 제거, 부분 청산은 남은 수량 재조회)"""
+        if exit_percentage >= 1.0:
+            self.exit_evaluator.remove(position_id)
+        else:
+            self._request_reconcile()
+    
     @trade_error_handler(retry_count=3, max_delay=20)
     def _execute_position_exit(self, position, current_price, exit_type, exit_reason, exit_percentage):
         """
@@ -577,8 +620,9 @@ class AutoPositionManager:
             if not self.margin_safety_enabled or self.trading_algorithm.market_type.lower() != 'futures':
                 return
             
-            # 계정 정보 가져오기
-            account_info = self.trading_algorithm.exchange_api.get_account_info()
+            # 계정 정보 가져오기 (공유 계정 스냅샷의 선물 계정 정보)
+            account_snapshot = get_account_snapshot_service(self.trading_algorithm.exchange_api)
+            account_info = account_snapshot.get_account_info(max_age=account_snapshot.refresh_interval)
             if not account_info:
                 logger.warning("계정 정보를 가져오지 못했습니다. 마진 안전성 검사를 건너끻니다.")
                 return
@@ -702,8 +746,8 @@ class AutoPositionManager:
                 'timestamp': datetime.now().isoformat()
             }
             
-            # 각 포지션에 대해 청산 실행
-            successful_exits = 0
+            # 청산 대상 포지션 검증
+            targets = []
             for position in positions:
                 # 포지션 정보 확인
                 position_id = position.get('id')
@@ -724,39 +768,26 @@ class AutoPositionManager:
                     continue
                 
                 logger.warning(f"마진 안전장치: 포지션 {position_id} 의 {reduction_percentage:.0%} 강제 청산 시도")
-                
-                try:
-                    # 롱 포지션 청산 (매도)
-                    if side.lower() == 'long':
-                        result = self.trading_algorithm.execute_sell(
-                            price=current_price,
-                            quantity=exit_size,
-                            additional_exit_info=exit_info,
-                            percentage=reduction_percentage,
-                            position_id=position_id
-                        )
-                    
-                    # 숏 포지션 청산 (매수)
-                    elif side.lower() == 'short':
-                        result = self.trading_algorithm.execute_buy(
-                            price=current_price,
-                            quantity=exit_size,
-                            additional_info=exit_info,
-                            close_position=True,
-                            position_id=position_id
-                        )
-                    
-                    if result:
-                        successful_exits += 1
-                        logger.info(f"포지션 {position_id} 청산 성공: {exit_size} {side}")
-                    else:
-                        logger.error(f"포지션 {position_id} 청산 실패")
-                        
-                except Exception as e:
-                    logger.error(f"포지션 {position_id} 청산 중 오류: {e}")
-                    logger.error(traceback.format_exc())
+                targets.append(position)
+            
+            # 모든 청산 주문을 동시에 전송 (포지션마다 순차 재시도하지 않음)
+            result = self.trading_algorithm.close_positions_bulk(
+                targets,
+                percentage=reduction_percentage,
+                exit_info=exit_info,
+                price=current_price,
+                deadline=self.emergency_order_deadline
+            )
+            for item in result['results']:
+                position_id = item['ref'].get('id')
+                if item['status'] == 'ok':
+                    logger.info(f"포지션 {position_id} 청산 성공: {item['amount']} {item['ref'].get('side')}")
+                else:
+                    logger.error(f"포지션 {position_id} 청산 실패 ({item['status']}): {item['error']}")
+            successful_exits = result['succeeded']
             
-            logger.warning(f"마진 안전장치: 비상 청산 처리가 완료되었습니다. {len(positions)}개 포지션 중 {successful_exits}개 청산 성공")
+            logger.warning(f"마진 안전장치: 비상 청산 처리가 완료되었습니다. {len(positions)}개 포지션 중 {successful_exits}개 청산 성공 "
+                           f"({result['elapsed']:.2f}초)")
             
         except Exception as e:
             logger.error(f"비상 포지션 감소 조치 중 오류: {e}")
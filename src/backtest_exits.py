@@ -0,0 +1,251 @@
+"""
+백테스트 봉 내부 청산 모듈 - 암호화폐 자동매매 봇
+
+실거래의 RiskManager / AutoPositionManager 와 같은 손절매, 이익실현, 트레일링
+스탑, 강제 청산을 백테스트에서 각 캔들의 고가/저가로 판정합니다.
+
+- 캔들 단위 Python 반복 없이 거래 단위로 진입 이후 구간을 배열 연산으로 검사하며,
+  긴 보유 구간은 점점 커지는 청크로 나누어 일찍 청산되는 거래의 계산을 줄입니다.
+- 한 캔들에서 손절 쪽과 이익실현 쪽 가격이 모두 닿으면 tie_break 설정으로
+  먼저 닿은 쪽을 정합니다.
+- 시가가 청산 가격을 이미 넘어선 갭은 시가로 체결합니다.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.exit_evaluator import (
+    EXIT_STOP_LOSS, EXIT_TRAILING_STOP, EXIT_TAKE_PROFIT,
+    stop_loss_prices, take_profit_prices, liquidation_prices
+)
+from src.logging_config import get_logger
+
+logger = get_logger('crypto_bot.backtest_exits')
+
+EXIT_LIQUIDATION = 'liquidation'
+EXIT_SIGNAL = 'signal'
+
+# 한 캔들에서 손절/이익실현이 모두 닿았을 때의 처리
+TIE_STOP_FIRST = 'stop_first'        # 손실 쪽 먼저 (보수적, 기본값)
+TIE_TARGET_FIRST = 'target_first'    # 이익 쪽 먼저
+TIE_NEAREST_OPEN = 'nearest_open'    # 시가에 더 가까운 가격 먼저
+
+TIE_BREAKS = (TIE_STOP_FIRST, TIE_TARGET_FIRST, TIE_NEAREST_OPEN)
+
+# 손실 쪽 청산 가격 종류 (배열 열 순서)
+_ADVERSE_TYPES = (EXIT_STOP_LOSS, EXIT_TRAILING_STOP, EXIT_LIQUIDATION)
+
+_FIRST_CHUNK = 256
+
+
+class IntrabarExitConfig:
+    """봉 내부 청산 설정 (비율은 소수: 0.05 = 5%)"""
+
+    def __init__(self, stop_loss_pct: Optional[float] = None, take_profit_pct: Optional[float] = None,
+                 trailing_activation_pct: Optional[float] = None, trailing_pct: Optional[float] = None,
+                 liquidation: bool = True, margin_ratio: float = 0.004, tie_break: str = TIE_STOP_FIRST):
+        """
+        Args:
+            stop_loss_pct: 손절매 비율 (None이면 사용 안 함)
+            take_profit_pct: 이익실현 비율 (None이면 사용 안 함)
+            trailing_activation_pct: 트레일링 스탑 활성화 수익률 (None이면 트레일링 사용 안 함)
+            trailing_pct: 고점 대비 트레일링 간격
+            liquidation: 레버리지 1 초과일 때 강제 청산 판정 여부
+            margin_ratio: 유지 마진 비율 (청산 가격 계산용)
+            tie_break: 같은 캔들에서 양쪽이 모두 닿았을 때의 처리
+        """
+        if tie_break not in TIE_BREAKS:
+            raise ValueError(f"지원하지 않는 tie_break 입니다: {tie_break} (가능: {', '.join(TIE_BREAKS)})")
+        self.stop_loss_pct = stop_loss_pct
+        self.take_profit_pct = take_profit_pct
+        self.trailing_activation_pct = trailing_activation_pct
+        self.trailing_pct = trailing_pct
+        self.liquidation = liquidation
+        self.margin_ratio = margin_ratio
+        self.tie_break = tie_break
+
+    @property
+    def trailing_enabled(self) -> bool:
+        return self.trailing_activation_pct is not None and bool(self.trailing_pct)
+
+
+def find_intrabar_exit(open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                       entry_index: int, entry_price: float, sign: int, end_index: int,
+                       config: IntrabarExitConfig, leverage: float = 1,
+                       signal_exit: bool = True) -> Tuple[Optional[int], float, str]:
+    """
+    진입 다음 캔들부터 end_index 까지 처음 발생하는 청산 찾기
+
+    Args:
+        open_, high, low, close: 캔들 가격 배열
+        entry_index: 진입 캔들 위치 (종가 진입)
+        entry_price: 진입가
+        sign: 방향 (+1 롱, -1 숏)
+        end_index: 검사할 마지막 캔들 위치 (포함)
+        config: 청산 설정
+        leverage: 레버리지
+        signal_exit: end_index 캔들 종가에 신호 청산이 있는지 여부
+
+    Returns:
+        tuple: (청산 캔들 위치, 청산 가격, 청산 유형). 봉 내부 청산도 신호 청산도
+               없으면 (None, end_index 종가, EXIT_SIGNAL)
+    """
+    entry = np.array([entry_price])
+    signs = np.array([sign])
+
+    # 숏은 가격 부호를 뒤집어 롱과 같은 규칙으로 판정 (고가/저가 역할도 교환)
+    adverse_levels = np.full(3, -np.inf)
+    if config.stop_loss_pct is not None:
+        adverse_levels[0] = sign * stop_loss_prices(entry, signs, config.stop_loss_pct)[0]
+    if config.liquidation and leverage > 1:
+        adverse_levels[2] = sign * liquidation_prices(entry, signs, np.array([float(leverage)]),
+                                                      config.margin_ratio)[0]
+    target = np.inf
+    if config.take_profit_pct is not None:
+        target = sign * take_profit_prices(entry, signs, config.take_profit_pct)[0]
+    entry_t = sign * entry_price
+    activation = entry_t * (1 + sign * config.trailing_activation_pct) if config.trailing_enabled else np.inf
+    trail_factor = 1 - sign * config.trailing_pct if config.trailing_enabled else 0.0
+
+    high_water = entry_t
+    start = entry_index + 1
+    chunk = _FIRST_CHUNK
+    while start <= end_index:
+        stop = min(end_index + 1, start + chunk)
+        o = sign * open_[start:stop]
+        h = sign * (high if sign > 0 else low)[start:stop]
+        l = sign * (low if sign > 0 else high)[start:stop]
+
+        adverse = np.broadcast_to(adverse_levels, (len(o), 3)).copy()
+        if config.trailing_enabled:
+            # 직전 캔들까지의 고점으로 트레일링 가격 결정 (같은 캔들 안의 순서는 알 수 없음)
+            running = np.maximum.accumulate(np.concatenate(([high_water], h)))
+            prev_high = running[:-1]
+            adverse[:, 1] = np.where(prev_high >= activation, prev_high * trail_factor, -np.inf)
+            high_water = running[-1]
+
+        adverse_type = np.argmax(adverse, axis=1)
+        adverse_level = adverse[np.arange(len(o)), adverse_type]
+        hit_adverse = l <= adverse_level
+        hit_target = h >= target
+
+        hits = np.flatnonzero(hit_adverse | hit_target)
+        if len(hits):
+            i = hits[0]
+            take_target = hit_target[i]
+            if hit_adverse[i] and hit_target[i]:
+                if config.tie_break == TIE_STOP_FIRST:
+                    take_target = False
+                elif config.tie_break == TIE_NEAREST_OPEN:
+                    take_target = (target - o[i]) < (o[i] - adverse_level[i])
+            if take_target:
+                price_t, exit_type = max(o[i], target), EXIT_TAKE_PROFIT
+            else:
+                price_t, exit_type = min(o[i], adverse_level[i]), _ADVERSE_TYPES[adverse_type[i]]
+            return start + int(i), float(sign * price_t), exit_type
+
+        start = stop
+        chunk *= 2
+
+    return (end_index if signal_exit else None), float(close[end_index]), EXIT_SIGNAL
+
+
+def simulate_with_exits(df: pd.DataFrame, position_change: np.ndarray, initial_balance: float,
+                        commission: float, leverage: float, config: IntrabarExitConfig) -> Dict[str, Any]:
+    """
+    신호 진입 + 봉 내부 청산 백테스트 (Backtester.run_backtest 와 같은 롱 전용, 전액 진입 규칙)
+
+    자산은 run_backtest(kernels.position_state_machine)와 같이 증거금 + 레버리지 포지션의
+    평가 손익으로 계산하고, 선물에서는 강제 청산 시 증거금이 모두 사라집니다.
+
+    Args:
+        df: OHLCV 데이터
+        position_change: 포지션 변화 배열 (>0 매수, <0 매도)
+        initial_balance: 초기 자산
+        commission: 수수료율
+        leverage: 레버리지
+        config: 청산 설정
+
+    Returns:
+        dict: equity/cash/quantity 배열과 trades 목록
+    """
+    open_ = df['open'].to_numpy(np.float64)
+    high = df['high'].to_numpy(np.float64)
+    low = df['low'].to_numpy(np.float64)
+    close = df['close'].to_numpy(np.float64)
+    n = len(close)
+    index = df.index
+
+    position_change = np.asarray(position_change, dtype=np.float64)
+    entry_bars = np.flatnonzero(position_change > 0)
+    exit_bars = np.flatnonzero(position_change < 0)
+
+    equity = np.full(n, float(initial_balance))
+    cash = np.full(n, float(initial_balance))
+    quantity = np.zeros(n)
+    trades: List[Dict[str, Any]] = []
+
+    balance = float(initial_balance)
+    search_from = 1  # run_backtest 는 두 번째 캔들부터 신호 처리
+    while balance > 0:
+        k = np.searchsorted(entry_bars, search_from, side='left')
+        if k >= len(entry_bars):
+            break
+        a = int(entry_bars[k])
+        j = np.searchsorted(exit_bars, a, side='right')
+        has_signal_exit = j < len(exit_bars)
+        end = int(exit_bars[j]) if has_signal_exit else n - 1
+        x, exit_price, exit_type = find_intrabar_exit(open_, high, low, close, a, close[a], 1, end,
+                                                      config, leverage, signal_exit=has_signal_exit)
+
+        entry_price = close[a]
+        fee_in = balance * leverage * commission
+        qty = (balance * leverage - fee_in) / entry_price
+        margin = balance - fee_in
+        last = x if x is not None else n - 1
+
+        held = slice(a, last + 1)
+        equity[held] = np.maximum(margin + qty * (close[held] - entry_price), 0.0)
+        cash[held] = 0.0
+        quantity[held] = qty
+
+        if x is None:
+            break
+
+        exit_value = max(margin + qty * (exit_price - entry_price), 0.0)
+        fee_out = min(qty * exit_price * commission, exit_value)
+        balance_after = exit_value - fee_out
+        if exit_type == EXIT_LIQUIDATION:
+            balance_after = 0.0
+        equity[x:] = balance_after
+        cash[x:] = balance_after
+        quantity[x:] = 0.0
+
+        trades.append({
+            'entry_time': index[a].isoformat(),
+            'entry_price': entry_price,
+            'quantity': qty,
+            'entry_amount': balance * leverage,
+            'side': 'long',
+            'status': 'closed',
+            'entry_balance': balance,
+            'exit_time': index[x].isoformat(),
+            'exit_price': exit_price,
+            'exit_reason': exit_type,
+            'exit_balance': balance_after,
+            'leverage': leverage,
+            'market_type': 'futures' if leverage > 1 else 'spot',
+            # run_backtest 와 같이 손익과 수익률 모두 진입 전 자산 기준
+            'profit_percent': (balance_after / balance - 1) * 100,
+            'profit': balance_after - balance,
+        })
+
+        balance = balance_after
+        # 신호 청산 캔들에서는 재진입하지 않고, 봉 내부 청산 뒤에는 같은 캔들 종가 재진입 허용
+        search_from = x + 1 if exit_type == EXIT_SIGNAL else x
+
+    if balance <= 0:
+        logger.warning("백테스트 중 자산이 모두 소진되어 이후 거래를 중단합니다.")
+    return {'equity': equity, 'cash': cash, 'quantity': quantity, 'trades': trades}
@@ -13,7 +13,6 @@ import logging
 import os
 import json
 from datetime import datetime, timedelta
-from tqdm import tqdm
 
 from src.data_manager import DataManager
 from src.data_collector import DataCollector
@@ -22,6 +21,10 @@ from src.strategies import (
     BollingerBandsStrategy, StochasticStrategy, BollingerBandFuturesStrategy
 )
 from src.config import DATA_DIR, BACKTEST_PARAMS
+from src.walk_forward import WalkForwardOptimizer
+from src.param_search import ParamSpace, SearchBudget, SearchEvaluator, get_search_strategy
+from src.backtest_exits import simulate_with_exits
+from src.kernels import position_state_machine
 
 # 로깅 설정
 logging.basicConfig(
@@ -485,7 +488,8 @@ class BacktestResult:
 class Backtester:
     """거래 전략 백테스팅을 위한 클래스"""
     
-    def __init__(self, exchange_id='binance', symbol='BTC/USDT', timeframe='1h', market_type='spot', leverage=1):
+    def __init__(self, exchange_id='binance', symbol='BTC/USDT', timeframe='1h', market_type='spot', leverage=1,
+                 timeframe_store=None):
         """
         백테스터 초기화
         
@@ -495,17 +499,23 @@ class Backtester:
             timeframe (str): 타임프레임
             market_type (str): 시장 유형 ('spot' 또는 'futures')
             leverage (int): 레버리지 배수 (선물 거래에만 적용)
+            timeframe_store (TimeframeStore, optional): 1분봉 기반 멀티 타임프레임 저장소
+                (지정하면 거래소 조회 없이 이 저장소에서 캔들을 가져옴)
         """
         self.exchange_id = exchange_id
         self.symbol = symbol
         self.timeframe = timeframe
         self.market_type = market_type
         self.leverage = leverage if market_type == 'futures' else 1
+        self.timeframe_store = timeframe_store
         
         # 데이터 관련 객체 초기화
         self.data_manager = DataManager(exchange_id=exchange_id, symbol=symbol)
         self.data_collector = DataCollector(exchange_id=exchange_id, symbol=symbol, timeframe=timeframe)
         
+        # 파라미터 탐색 평가 캐시 (같은 전략/기간의 탐색끼리 공유)
+        self._search_evaluators = {}
+        
         logger.info(f"{exchange_id} 거래소의 {symbol} 백테스터가 초기화되었습니다. 시장 유형: {market_type}{', 레버리지: ' + str(leverage) + '배' if market_type == 'futures' else ''}")
     
     def prepare_data(self, start_date, end_date):
@@ -529,6 +539,15 @@ class Backtester:
             
             logger.info(f"백테스트 기간: {start_date} ~ {end_date}")
             
+            # 멀티 타임프레임 저장소가 있으면 1분봉에서 집계된 캔들 사용
+            if self.timeframe_store is not None:
+                df = self.timeframe_store.get(self.timeframe, start=start_date_dt, end=end_date_dt)
+                if df.empty:
+                    logger.warning(f"타임프레임 저장소에 {self.timeframe} 데이터가 없습니다.")
+                    return None
+                logger.info(f"백테스트용 데이터 준비 완료 (타임프레임 저장소): {len(df)}개의 데이터")
+                return df
+            
             df = self.data_manager.load_ohlcv_data(timeframe=self.timeframe)
             
             if df is None or df.empty:
@@ -559,7 +578,8 @@ class Backtester:
             logger.error(f"백테스트용 데이터 준비 중 오류 발생: {e}")
             return None
     
-    def run_backtest(self, strategy, start_date, end_date, initial_balance=10000, commission=0.001, market_type=None, leverage=None):
+    def run_backtest(self, strategy, start_date, end_date, initial_balance=10000, commission=0.001, market_type=None, leverage=None,
+                     exit_config=None):
         """
         백테스트 실행
         
@@ -571,6 +591,8 @@ class Backtester:
             commission (float): 수수료율
             market_type (str): 시장 유형 ('spot' 또는 'futures'), None이면 백테스터 초기화 값 사용
             leverage (int): 레버리지 배수, None이면 백테스터 초기화 값 사용
+            exit_config (IntrabarExitConfig): 봉 내부 손절/이익실현/트레일링/강제 청산 설정,
+                None이면 신호 청산만 사용
         
         Returns:
             BacktestResult: 백테스트 결과
@@ -607,160 +629,75 @@ class Backtester:
             if hasattr(strategy, 'calculate_positions'):
                 df_with_signals = strategy.calculate_positions(df_with_signals)
             
-            # 백테스트 변수 초기화
-            balance = initial_balance  # 현금 잔고
-            position = 0  # 보유 수량
-            position_value = 0  # 포지션 가치
-            total_balance = initial_balance  # 총 자산
-            
-            # 거래 기록
-            trades = []
-            
-            # 포트폴리오 기록
-            portfolio_history = []
-            
-            # 현재 열린 거래
-            current_trade = None
-            
-            # 각 캔들에 대해 백테스트 실행
-            for i in tqdm(range(1, len(df_with_signals)), desc="백테스팅 진행 중"):
-                # 현재 캔들
-                current_candle = df_with_signals.iloc[i]
-                prev_candle = df_with_signals.iloc[i-1]
-                
-                # 현재 가격
-                current_price = current_candle['close']
-                
-                # 포지션 변경 확인
-                position_change = current_candle['position']
-                
-                # 시장 유형과 레버리지 확인
-                is_futures = actual_market_type == 'futures'
-                leverage_multiplier = actual_leverage if is_futures else 1
-                
-                # 매수 신호
-                if position_change > 0:
-                    # 이미 포지션이 있는 경우 무시
-                    if position > 0:
-                        pass
-                    else:
-                        # 매수 가능한 수량 계산 (선물일 경우 레버리지 고려)
-                        if is_futures:
-                            # 선물일 경우 레버리지를 적용하여 더 큰 포지션 가능
-                            buy_amount = (balance * leverage_multiplier) / current_price
-                        else:
-                            buy_amount = balance / current_price
-                            
-                        buy_value = buy_amount * current_price
-                        fee = buy_value * commission
-                        
-                        # 수수료를 고려한 실제 매수 수량
-                        actual_buy_amount = (balance - fee) / current_price
-                        
-                        # 포지션 업데이트
-                        position = actual_buy_amount
-                        position_value = position * current_price
-                        balance = 0  # 모든 현금을 사용
-                        
-                        # 거래 기록
-                        current_trade = {
-                            'entry_time': current_candle.name.isoformat(),
-                            'entry_price': current_price,
-                            'quantity': position,
-                            'entry_amount': buy_value,  # 매수 금액 추가 (수익률 계산에 필요)
-                            'side': 'long',
-                            'status': 'open',
-                            'entry_balance': total_balance
-                        }
-                
-                # 매도 신호
-                elif position_change < 0:
-                    # 포지션이 없는 경우 무시
-                    if position == 0:
-                        pass
-                    else:
-                        # 매도 가치 계산
-                        sell_value = position * current_price
-                        fee = sell_value * commission
-                        
-                        # 수수료를 고려한 실제 매도 가치
-                        actual_sell_value = sell_value - fee
-                        
-                        # 포지션 업데이트
-                        balance = actual_sell_value
-                        position_value = 0
-                        
-                        # 거래 기록 업데이트
-                        if current_trade:
-                            current_trade['exit_time'] = current_candle.name.isoformat()
-                            current_trade['exit_price'] = current_price
-                            current_trade['status'] = 'closed'
-                            current_trade['exit_balance'] = balance
-                            
-                            # 가격 차이에 기반한 수익률 계산 (가격 변동 비율)
-                            price_change_pct = (current_price / current_trade['entry_price'] - 1) * 100
-                            
-                            # 선물 거래의 경우 레버리지 적용
-                            if is_futures:
-                                current_trade['leverage'] = leverage_multiplier
-                                current_trade['market_type'] = 'futures'
-                                # 레버리지를 고려한 수익률 (수수료 제외)
-                                leveraged_pct = price_change_pct * leverage_multiplier
-                                # 수수료 비용 반영 (왕복 수수료)
-                                fee_impact = commission * 2 * leverage_multiplier * 100  # 퍼센트로 변환
-                                profit_percent = leveraged_pct - fee_impact
-                            else:
-                                current_trade['market_type'] = 'spot'
-                                # 현물 거래 수익률 (수수료 제외)
-                                profit_percent = price_change_pct
-                                # 수수료 비용 반영 (왕복 수수료)
-                                fee_impact = commission * 2 * 100  # 퍼센트로 변환
-                                profit_percent = profit_percent - fee_impact
-                            
-                            # 손익 계산 (초기 투자 금액에 대한 수익/손실)
-                            current_trade['profit_percent'] = profit_percent
-                            
-                            # 절대적 손익 금액 계산
-                            trade_initial_value = current_trade['entry_amount']
-                            current_trade['profit'] = trade_initial_value * (profit_percent / 100)
-                            
-                            trades.append(current_trade)
-                            result.add_trade(current_trade)
-                            
-                            current_trade = None
-                        
-                        position = 0
-                
-                # 포트폴리오 가치 업데이트 (NumPy 배열 기반으로 계산)
-                # 변수들이 pandas 시리즈인 경우를 대비하여 NumPy 값으로 변환
-                position_float = float(position) if hasattr(position, '__iter__') else position
-                current_price_float = float(current_price) if hasattr(current_price, '__iter__') else current_price
-                balance_float = float(balance) if hasattr(balance, '__iter__') else balance
-                
-                position_value = position_float * current_price_float
-                total_balance = balance_float + position_value
-                
-                # 포트폴리오 스냅샷 저장
-                portfolio_snapshot = {
-                    'timestamp': current_candle.name.isoformat(),
-                    'open': current_candle['open'],
-                    'high': current_candle['high'],
-                    'low': current_candle['low'],
-                    'close': current_price,  # 'close'로 정확히 저장
-                    'volume': current_candle['volume'] if 'volume' in current_candle else 0,
-                    'price': current_price,  # 후방 호환성을 위해 'price'도 유지
-                    'balance': balance,
-                    'position': position,
-                    'position_value': position_value,
-                    'total_balance': total_balance,
-                    'signal': current_candle['signal'] if 'signal' in current_candle else 0,
-                    'position_change': position_change,
-                    'market_type': actual_market_type,
-                    'leverage': leverage_multiplier
+            # 봉 내부 청산이 설정되면 거래 단위 배열 연산으로 실행
+            if exit_config is not None:
+                self._run_with_exits(result, df_with_signals, initial_balance, commission,
+                                     actual_market_type, actual_leverage, exit_config)
+                result.calculate_metrics()
+                logger.info(f"{strategy.name} 전략의 백테스트가 완료되었습니다. (봉 내부 청산 {len(result.trades)}건 거래)")
+                return result
+            
+            # 시장 유형과 레버리지 확인
+            is_futures = actual_market_type == 'futures'
+            leverage_multiplier = actual_leverage if is_futures else 1
+            
+            # 포지션 상태 전이 (두 번째 캔들부터, 포지션 없을 때만 매수 / 보유 중일 때만 매도)
+            position_change = df_with_signals['position'].to_numpy(np.float64)
+            close = df_with_signals['close'].to_numpy(np.float64)
+            state = position_state_machine(close, position_change, initial_balance, commission, leverage_multiplier)
+            cash = state['cash']
+            quantity = state['quantity']
+            total = state['equity']  # 증거금 + 레버리지 포지션 평가 손익 (봉 내부 청산 경로와 같은 모델)
+            timestamps = [ts.isoformat() for ts in df_with_signals.index]
+            
+            # 거래 기록 (청산된 거래만)
+            for entry, exit_, entry_amount, entry_balance in zip(state['entries'], state['exits'],
+                                                                 state['entry_amounts'], state['entry_balances']):
+                if exit_ < 0:
+                    continue
+                trade = {
+                    'entry_time': timestamps[entry],
+                    'entry_price': close[entry],
+                    'quantity': quantity[entry],
+                    'entry_amount': entry_amount,  # 레버리지를 반영한 명목 매수 금액
+                    'side': 'long',
+                    'status': 'closed',
+                    'entry_balance': entry_balance,
+                    'exit_time': timestamps[exit_],
+                    'exit_price': close[exit_],
+                    'exit_balance': cash[exit_]
                 }
                 
-                portfolio_history.append(portfolio_snapshot)
-                result.add_portfolio_snapshot(portfolio_snapshot)
+                if is_futures:
+                    trade['leverage'] = leverage_multiplier
+                    trade['market_type'] = 'futures'
+                else:
+                    trade['market_type'] = 'spot'
+                # 손익과 수익률 모두 진입 전 자산 기준 (레버리지 손익과 왕복 수수료 반영)
+                trade['profit'] = cash[exit_] - entry_balance
+                trade['profit_percent'] = trade['profit'] / entry_balance * 100
+                result.add_trade(trade)
+            
+            # 포트폴리오 스냅샷 저장 (두 번째 캔들부터)
+            history = pd.DataFrame({
+                'timestamp': timestamps[1:],
+                'open': df_with_signals['open'].to_numpy()[1:],
+                'high': df_with_signals['high'].to_numpy()[1:],
+                'low': df_with_signals['low'].to_numpy()[1:],
+                'close': close[1:],
+                'volume': df_with_signals['volume'].to_numpy()[1:] if 'volume' in df_with_signals.columns else 0,
+                'price': close[1:],  # 후방 호환성을 위해 'price'도 유지
+                'balance': cash[1:],
+                'position': quantity[1:],
+                'position_value': (total - cash)[1:],
+                'total_balance': total[1:],
+                'signal': df_with_signals['signal'].to_numpy()[1:] if 'signal' in df_with_signals.columns else 0,
+                'position_change': position_change[1:],
+                'market_type': actual_market_type,
+                'leverage': leverage_multiplier
+            })
+            for snapshot in history.to_dict('records'):
+                result.add_portfolio_snapshot(snapshot)
             
             # 백테스트 결과 계산
             result.calculate_metrics()
@@ -772,7 +709,52 @@ class Backtester:
             logger.error(f"백테스트 실행 중 오류 발생: {e}")
             return None
     
-    def optimize_strategy(self, strategy_class, param_grid, start_date, end_date, initial_balance=10000, commission=0.001):
+    def _run_with_exits(self, result, df, initial_balance, commission, market_type, leverage, exit_config):
+        """
+        봉 내부 청산 백테스트 결과를 BacktestResult 에 기록
+        
+        Args:
+            result (BacktestResult): 결과 객체
+            df (DataFrame): 신호가 포함된 데이터
+            initial_balance (float): 초기 자산
+            commission (float): 수수료율
+            market_type (str): 시장 유형
+            leverage (int): 레버리지 배수
+            exit_config (IntrabarExitConfig): 청산 설정
+        """
+        leverage_multiplier = leverage if market_type == 'futures' else 1
+        position_change = df['position'].fillna(0).to_numpy(np.float64)
+        sim = simulate_with_exits(df, position_change, initial_balance, commission,
+                                  leverage_multiplier, exit_config)
+        
+        for trade in sim['trades']:
+            trade['market_type'] = market_type
+            result.add_trade(trade)
+        
+        # run_backtest 와 같은 형식의 포트폴리오 기록 (두 번째 캔들부터)
+        close = df['close'].to_numpy(np.float64)
+        history = pd.DataFrame({
+            'timestamp': [ts.isoformat() for ts in df.index[1:]],
+            'open': df['open'].to_numpy()[1:],
+            'high': df['high'].to_numpy()[1:],
+            'low': df['low'].to_numpy()[1:],
+            'close': close[1:],
+            'volume': df['volume'].to_numpy()[1:] if 'volume' in df.columns else 0,
+            'price': close[1:],
+            'balance': sim['cash'][1:],
+            'position': sim['quantity'][1:],
+            'position_value': sim['equity'][1:] - sim['cash'][1:],
+            'total_balance': sim['equity'][1:],
+            'signal': df['signal'].to_numpy()[1:] if 'signal' in df.columns else 0,
+            'position_change': position_change[1:],
+            'market_type': market_type,
+            'leverage': leverage_multiplier
+        })
+        for snapshot in history.to_dict('records'):
+            result.add_portfolio_snapshot(snapshot)
+    
+    def optimize_strategy(self, strategy_class, param_grid, start_date, end_date, initial_balance=10000, commission=0.001,
+                          search='grid', max_evals=None, max_seconds=None, **search_options):
         """
         전략 파라미터 최적화
         
@@ -783,6 +765,10 @@ class Backtester:
             end_date (str): 종료 날짜 (YYYY-MM-DD 형식)
             initial_balance (float): 초기 자산
             commission (float): 수수료율
+            search (str): 탐색 전략 ('grid', 'random', 'halving', 'tpe')
+            max_evals (float): 최대 평가 비용 (전체 구간 백테스트 1회 = 1)
+            max_seconds (float): 최대 탐색 시간 (초)
+            **search_options: 탐색 전략 생성 인자 (seed, n_candidates 등)
         
         Returns:
             tuple: (최적 파라미터, 최적 결과)
@@ -797,6 +783,13 @@ class Backtester:
                 logger.warning("최적화를 실행할 데이터가 없습니다.")
                 return None, None
             
+            # 예산이나 적응형 탐색이 지정되면 공유 평가 캐시로 탐색 후 최적 파라미터만 전체 백테스트
+            if search != 'grid' or max_evals is not None or max_seconds is not None:
+                return self._search_strategy_params(
+                    strategy_class, param_grid, df, start_date, end_date, initial_balance, commission,
+                    search, SearchBudget(max_evals=max_evals, max_seconds=max_seconds), search_options
+                )
+            
             # 파라미터 조합 생성
             import itertools
             param_names = list(param_grid.keys())
@@ -850,6 +843,75 @@ class Backtester:
             logger.error(f"전략 최적화 중 오류 발생: {e}")
             return None, None
     
+    def _search_strategy_params(self, strategy_class, param_grid, df, start_date, end_date, initial_balance,
+                                commission, search, budget, search_options):
+        """
+        탐색 전략으로 파라미터 최적화
+        
+        Returns:
+            tuple: (최적 파라미터, 최적 파라미터의 백테스트 결과)
+        """
+        leverage = self.leverage if self.market_type == 'futures' else 1
+        key = (strategy_class, start_date, end_date, initial_balance, commission, leverage)
+        evaluator = self._search_evaluators.get(key)
+        if evaluator is None:
+            evaluator = SearchEvaluator(strategy_class, df, initial_balance=initial_balance,
+                                        commission=commission, leverage=leverage)
+            self._search_evaluators[key] = evaluator
+        
+        searcher = get_search_strategy(search, **search_options)
+        result = searcher.search(ParamSpace(param_grid), evaluator, budget)
+        
+        if result.best_params is None:
+            logger.warning("최적화에 실패했습니다.")
+            return None, None
+        
+        best_result = self.run_backtest(
+            strategy=strategy_class(**result.best_params),
+            start_date=start_date,
+            end_date=end_date,
+            initial_balance=initial_balance,
+            commission=commission
+        )
+        logger.info(f"최적 파라미터: {result.best_params}, 샤프 비율: {result.best_score:.4f} "
+                    f"(평가 {result.evaluations}회, 캐시 적중 {result.cache_hits}회)")
+        return result.best_params, best_result
+    
+    def walk_forward(self, strategy_class, param_grid, start_date, end_date, train_size, test_size,
+                     anchored=False, metric='sharpe_ratio', initial_balance=10000, commission=0.001, max_workers=None):
+        """
+        워크포워드 최적화 (학습 구간 최적화 → 다음 검증 구간 적용을 반복)
+        
+        Args:
+            strategy_class: 전략 클래스
+            param_grid (dict): 파라미터 그리드
+            start_date (str): 시작 날짜 (YYYY-MM-DD 형식)
+            end_date (str): 종료 날짜 (YYYY-MM-DD 형식)
+            train_size (int or str): 학습 구간 길이 (캔들 수 또는 '180D' 같은 기간)
+            test_size (int or str): 검증 구간 길이 (캔들 수 또는 기간)
+            anchored (bool): True이면 학습 구간 시작을 고정 (False이면 rolling)
+            metric (str): 최대화할 성과 지표
+            initial_balance (float): 초기 자산
+            commission (float): 수수료율
+            max_workers (int): 병렬 프로세스 수 (None이면 CPU 코어 수)
+        
+        Returns:
+            WalkForwardResult: 구간별 최적 파라미터와 검증 구간 자산 곡선
+        """
+        logger.info(f"{strategy_class.__name__} 전략의 워크포워드 최적화를 시작합니다.")
+        
+        df = self.prepare_data(start_date, end_date)
+        if df is None or df.empty:
+            logger.warning("워크포워드 최적화를 실행할 데이터가 없습니다.")
+            return None
+        
+        optimizer = WalkForwardOptimizer(
+            strategy_class, param_grid, train_size, test_size, anchored=anchored, metric=metric,
+            initial_balance=initial_balance, commission=commission,
+            leverage=self.leverage if self.market_type == 'futures' else 1, max_workers=max_workers
+        )
+        return optimizer.run(df)
+    
     def compare_strategies(self, strategies, start_date, end_date, initial_balance=10000, commission=0.001):
         """
         여러 전략 비교
@@ -15,7 +15,10 @@ from pathlib import Path
 
 from src.logging_config import get_logger
 from src.config import DATA_DIR
-from src.event_manager import get_event_manager, EventType
+from src.event_manager import get_event_manager, EventType, DISPATCH_ASYNC, DISPATCH_SYNC
+from src.backup_store import IncrementalBackupStore
+from src.db_backup import SQLiteOnlineBackup
+from src.scheduler import get_scheduler
 
 class BackupManager:
     """
@@ -30,13 +33,18 @@ class BackupManager:
     BACKUP_TYPE_STATE = 'state'     # 거래 상태만 백업
     BACKUP_TYPE_CONFIG = 'config'   # 설정만 백업
     BACKUP_TYPE_TRADES = 'trades'   # 거래 내역만 백업
+    BACKUP_TYPE_DATABASE = 'database'  # 거래 DB 페이지 단위 백업
     
     def __init__(
         self, 
         backup_dir: Optional[str] = None,
         backup_interval: int = 3600,  # 기본값: 1시간 간격
         max_backups: int = 24,        # 기본값: 최대 24개 백업 유지
-        enable_auto_backup: bool = True
+        enable_auto_backup: bool = True,
+        snapshot_interval: int = 12,  # 기본값: 변경분 12개마다 전체 스냅샷
+        compression: Optional[str] = None,
+        db_path: Optional[str] = None,
+        enable_database_backup: bool = True
     ):
         """
         BackupManager 초기화
@@ -46,6 +54,10 @@ class BackupManager:
             backup_interval: 자동 백업 간격 (초)
             max_backups: 각 유형별 최대 백업 수
             enable_auto_backup: 자동 백업 활성화 여부
+            snapshot_interval: 전체 스냅샷 사이에 기록할 최대 변경분(delta) 수
+            compression: 백업 압축 방식 ('gzip' 또는 'zstd', None인 경우 사용 가능한 최선)
+            db_path: 페이지 단위 백업 대상 거래 DB 경로 (None인 경우 기본 DB 경로)
+            enable_database_backup: SQLite 온라인 백업 API 기반 DB 백업 사용 여부
         """
         self.logger = get_logger('backup_manager')
         
@@ -63,14 +75,34 @@ class BackupManager:
         self.max_backups = max_backups
         self.enable_auto_backup = enable_auto_backup
         
+        # 유형별 증분 백업 저장소 (매니페스트로 최신 백업을 O(1) 조회)
+        self.stores = {
+            backup_type: IncrementalBackupStore(
+                os.path.join(self.backup_dir, backup_type), backup_type,
+                max_backups=max_backups, snapshot_interval=snapshot_interval,
+                compression=compression
+            )
+            for backup_type in [self.BACKUP_TYPE_FULL, self.BACKUP_TYPE_STATE,
+                                self.BACKUP_TYPE_CONFIG, self.BACKUP_TYPE_TRADES]
+        }
+        
+        # 거래 DB 페이지 단위 백업 (포지션/거래 행을 JSON으로 내보내지 않음)
+        self.enable_database_backup = enable_database_backup
+        self.db_path = db_path or os.path.join(DATA_DIR, 'db', 'trading_bot.db')
+        self.database_backup = SQLiteOnlineBackup(
+            self.db_path, os.path.join(self.backup_dir, self.BACKUP_TYPE_DATABASE),
+            max_generations=max_backups * 2
+        )
+        
         # 백업 스케줄러 상태
         self.scheduler_active = False
-        self.scheduler_thread = None
+        self.backup_job = None
         self.last_backup_time = {
             self.BACKUP_TYPE_FULL: None,
             self.BACKUP_TYPE_STATE: None,
             self.BACKUP_TYPE_CONFIG: None,
-            self.BACKUP_TYPE_TRADES: None
+            self.BACKUP_TYPE_TRADES: None,
+            self.BACKUP_TYPE_DATABASE: None
         }
         
         # 백업 잠금
@@ -105,20 +137,30 @@ class BackupManager:
     def _register_event_handlers(self):
         """
         이벤트 관리자에 백업 관련 이벤트 핸들러 등록
+        
+        백업 핸들러는 디스크 I/O를 수행하므로 비동기 디스패치로 등록하여
+        이벤트를 발행하는 주문/포지션 처리 경로가 파일 쓰기를 기다리지 않도록 합니다.
+        종료 백업은 프로세스가 끝나기 전에 완료되어야 하므로 동기로 등록합니다.
         """
         # 포트폴리오 업데이트 이벤트 -> 상태 백업 생성
-        self.event_manager.subscribe(EventType.PORTFOLIO_UPDATED, self._handle_portfolio_update)
+        self.event_manager.subscribe(EventType.PORTFOLIO_UPDATED, self._handle_portfolio_update,
+                                     dispatch=DISPATCH_ASYNC)
         
         # 포지션 관련 이벤트 -> 상태 백업 생성
-        self.event_manager.subscribe(EventType.POSITION_OPENED, self._handle_position_update)
-        self.event_manager.subscribe(EventType.POSITION_CLOSED, self._handle_position_update)
-        self.event_manager.subscribe(EventType.POSITION_UPDATED, self._handle_position_update)
+        self.event_manager.subscribe(EventType.POSITION_OPENED, self._handle_position_update,
+                                     dispatch=DISPATCH_ASYNC)
+        self.event_manager.subscribe(EventType.POSITION_CLOSED, self._handle_position_update,
+                                     dispatch=DISPATCH_ASYNC)
+        self.event_manager.subscribe(EventType.POSITION_UPDATED, self._handle_position_update,
+                                     dispatch=DISPATCH_ASYNC)
         
         # 주문 관련 이벤트 -> 거래 백업 생성
-        self.event_manager.subscribe(EventType.TRADE_EXECUTED, self._handle_trade_executed)
+        self.event_manager.subscribe(EventType.TRADE_EXECUTED, self._handle_trade_executed,
+                                     dispatch=DISPATCH_ASYNC)
         
-        # 시스템 이벤트 -> 전체 백업 생성
-        self.event_manager.subscribe(EventType.SYSTEM_SHUTDOWN, self._handle_system_shutdown)
+        # 시스템 이벤트 -> 전체 백업 생성 (종료 직전이므로 발행 스레드에서 끝까지 수행)
+        self.event_manager.subscribe(EventType.SYSTEM_SHUTDOWN, self._handle_system_shutdown,
+                                     dispatch=DISPATCH_SYNC)
         
     def _handle_portfolio_update(self, event_data: Dict[str, Any]):
         """
@@ -236,9 +278,8 @@ class BackupManager:
             return
         
         self.scheduler_active = True
-        self.scheduler_thread = threading.Thread(target=self._backup_scheduler_loop)
-        self.scheduler_thread.daemon = True
-        self.scheduler_thread.start()
+        self.backup_job = get_scheduler().add_job('backup_manager.backup', self._run_scheduled_backup,
+                                                  self.backup_interval)
         
         self.logger.info(f"자동 백업 스케줄러 시작 (간격: {self.backup_interval}초)")
     
@@ -248,33 +289,33 @@ class BackupManager:
             return
         
         self.scheduler_active = False
-        if self.scheduler_thread and self.scheduler_thread.is_alive():
-            self.scheduler_thread.join(timeout=2.0)
+        if self.backup_job:
+            self.backup_job.cancel(wait=2.0)
+            self.backup_job = None
         
         self.logger.info("자동 백업 스케줄러 중지됨")
     
-    def _backup_scheduler_loop(self):
-        """자동 백업 스케줄러 메인 루프"""
-        while self.scheduler_active:
-            try:
-                # 상태 백업 (매 간격마다)
-                self.create_backup(self.BACKUP_TYPE_STATE)
-                
-                # 설정 백업 (매 3번째 간격마다)
-                if (int(time.time()) // self.backup_interval) % 3 == 0:
-                    self.create_backup(self.BACKUP_TYPE_CONFIG)
-                
-                # 전체 백업 (매 24번째 간격마다 - 하루에 한 번)
-                if (int(time.time()) // self.backup_interval) % 24 == 0:
-                    self.create_backup(self.BACKUP_TYPE_FULL)
-                
-                # 다음 백업까지 대기
-                time.sleep(self.backup_interval)
-                
-            except Exception as e:
-                self.logger.error(f"백업 스케줄러 오류: {e}")
-                self.logger.debug(traceback.format_exc())
-                time.sleep(60)  # 오류 발생 시 1분 대기
+    def _run_scheduled_backup(self):
+        """자동 백업 (공용 스케줄러에서 backup_interval 마다 실행)"""
+        try:
+            # 상태 백업 (매 간격마다)
+            self.create_backup(self.BACKUP_TYPE_STATE)
+            
+            # 거래 DB 페이지 단위 백업 (매 간격마다)
+            if self.enable_database_backup:
+                self.create_database_backup()
+            
+            # 설정 백업 (매 3번째 간격마다)
+            if (int(time.time()) // self.backup_interval) % 3 == 0:
+                self.create_backup(self.BACKUP_TYPE_CONFIG)
+            
+            # 전체 백업 (매 24번째 간격마다 - 하루에 한 번)
+            if (int(time.time()) // self.backup_interval) % 24 == 0:
+                self.create_backup(self.BACKUP_TYPE_FULL)
+            
+        except Exception as e:
+            self.logger.error(f"백업 스케줄러 오류: {e}")
+            self.logger.debug(traceback.format_exc())
     
     def create_backup(self, backup_type: str, data: Optional[Dict[str, Any]] = None) -> Optional[str]:
         """
@@ -297,39 +338,37 @@ class BackupManager:
                 
                 # 타임스탬프 생성
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"{backup_type}_{timestamp}.json"
-                backup_path = os.path.join(self.backup_dir, backup_type, filename)
                 
                 # 백업 데이터 수집
                 backup_data = data
                 if backup_data is None:
                     backup_data = self._collect_data_for_backup(backup_type)
+                backup_data.pop('_metadata', None)
                 
-                # 메타데이터 추가
-                backup_data['_metadata'] = {
+                # 메타데이터 (내용 해시에서는 제외)
+                metadata = {
                     'backup_type': backup_type,
                     'timestamp': timestamp,
-                    'version': '1.0',
+                    'version': '2.0',
                     'created_at': datetime.now().isoformat()
                 }
                 
-                # 백업 저장
-                with open(backup_path, 'w', encoding='utf-8') as f:
-                    json.dump(backup_data, f, indent=2, ensure_ascii=False)
+                # 증분 저장 (압축 스냅샷 또는 마지막 스냅샷 대비 변경분)
+                store = self.stores[backup_type]
+                entry = store.write(backup_data, metadata)
+                backup_path = store.path_of(entry)
                 
                 # 백업 시간 기록
                 self.last_backup_time[backup_type] = datetime.now()
                 
-                # 백업 파일 수 관리 (오래된 백업 제거)
-                self._cleanup_old_backups(backup_type)
-                
-                self.logger.info(f"{backup_type} 백업 생성 완료: {backup_path}")
+                self.logger.info(f"{backup_type} 백업 생성 완료 ({entry['kind']}): {backup_path}")
                 
                 # 백업 생성 이벤트 발행
                 self.event_manager.publish(EventType.BACKUP_CREATED, {
                     'backup_type': backup_type,
                     'backup_path': backup_path,
-                    'backup_size': os.path.getsize(backup_path)
+                    'backup_kind': entry['kind'],
+                    'backup_size': entry['size']
                 })
                 
                 return backup_path
@@ -380,19 +419,28 @@ class BackupManager:
         # 백업 유형별 데이터 수집
         if backup_type == self.BACKUP_TYPE_FULL:
             # 전체 데이터 백업
-            from src.db_manager import DatabaseManager
-            db = DatabaseManager()
-            
             data.update({
                 'portfolio': last_portfolio.get('portfolio', {}),
                 'positions': {
-                    'open': db.get_open_positions(),
                     'recent_updates': positions_data[-10:] if positions_data else []  # 최근 10개
                 },
-                'trades': db.get_trades(limit=50),  # 최근 50개 거래
                 'settings': self._get_app_settings(),
                 'system_state': self._get_system_state()
             })
+            
+            # 포지션/거래 행은 DB 페이지 단위 백업 세대로 참조 (실패 시 JSON 내보내기)
+            generation = self.create_database_backup() if self.enable_database_backup else None
+            if generation is not None:
+                data['database_snapshot'] = {
+                    'seq': generation['seq'],
+                    'created_at': generation['created_at'],
+                    'sha256': generation['sha256']
+                }
+            else:
+                from src.db_manager import DatabaseManager
+                db = DatabaseManager()
+                data['positions']['open'] = db.get_open_positions()
+                data['trades'] = db.get_trades(limit=50)  # 최근 50개 거래
         
         elif backup_type == self.BACKUP_TYPE_STATE:
             # 거래 상태 백업
@@ -441,6 +489,62 @@ class BackupManager:
         
         return data
         
+    def create_database_backup(self) -> Optional[Dict[str, Any]]:
+        """
+        SQLite 온라인 백업 API로 거래 DB 백업 세대 생성
+        
+        페이지 단위로 나누어 복사하므로 백업 중에도 거래가 계속되며,
+        이전 세대 대비 변경된 페이지만 저장됩니다. 복사와 비교는 매번 DB 전체에
+        대해 수행되므로 실행 시간은 DB 크기에 비례합니다.
+        
+        Returns:
+            Optional[Dict[str, Any]]: 생성된 세대 정보 또는 None (실패 시)
+        """
+        try:
+            generation = self.database_backup.create_backup()
+            self.last_backup_time[self.BACKUP_TYPE_DATABASE] = datetime.now()
+            
+            self.event_manager.publish(EventType.BACKUP_CREATED, {
+                'backup_type': self.BACKUP_TYPE_DATABASE,
+                'backup_path': os.path.join(self.database_backup.backup_dir, generation['pack']),
+                'backup_kind': 'pages',
+                'backup_size': generation['pack_size'],
+                'generation': generation['seq']
+            })
+            return generation
+            
+        except Exception as e:
+            self.logger.error(f"DB 백업 생성 중 오류 발생: {e}")
+            self.logger.debug(traceback.format_exc())
+            return None
+    
+    def restore_database_backup(self, seq: Optional[int] = None,
+                                at: Optional[datetime] = None) -> Tuple[bool, Dict[str, Any]]:
+        """
+        거래 DB를 특정 백업 세대(또는 특정 시점)로 복원
+        
+        Args:
+            seq: 세대 번호 (None인 경우 at 또는 최신 세대)
+            at: 이 시각 이전의 마지막 세대로 복원
+        
+        Returns:
+            Tuple[bool, Dict[str, Any]]: 성공 여부와 복원된 세대 정보 또는 오류 정보
+        """
+        try:
+            generation = self.database_backup.restore(seq=seq, at=at)
+            
+            self.event_manager.publish(EventType.BACKUP_RESTORED, {
+                'backup_type': self.BACKUP_TYPE_DATABASE,
+                'generation': generation['seq'],
+                'created_at': generation['created_at']
+            })
+            return True, {'generation': generation}
+            
+        except Exception as e:
+            self.logger.error(f"DB 백업 복원 중 오류: {e}")
+            self.logger.debug(traceback.format_exc())
+            return False, {'error': str(e)}
+    
     def _get_system_info(self) -> Dict[str, Any]:
         """
         시스템 정보 수집
@@ -527,39 +631,19 @@ class BackupManager:
             backup_type: 백업 유형
         """
         try:
-            backup_dir = os.path.join(self.backup_dir, backup_type)
-            backup_files = []
-            
-            # 백업 파일 목록 수집
-            for f in os.listdir(backup_dir):
-                if f.startswith(f"{backup_type}_") and f.endswith(".json"):
-                    file_path = os.path.join(backup_dir, f)
-                    backup_files.append((file_path, os.path.getmtime(file_path)))
-            
-            # 날짜순 정렬 (오래된 것부터)
-            backup_files.sort(key=lambda x: x[1])
-            
-            # 최대 백업 수를 초과하는 경우 오래된 백업 제거
-            while len(backup_files) > self.max_backups:
-                oldest_file = backup_files.pop(0)
-                try:
-                    os.remove(oldest_file[0])
-                    self.logger.debug(f"오래된 백업 제거: {oldest_file[0]}")
-                except Exception as e:
-                    self.logger.error(f"백업 제거 중 오류: {e}")
-                    
+            self.stores[backup_type].prune()
         except Exception as e:
             self.logger.error(f"오래된 백업 정리 중 오류: {e}")
     
     def list_backups(self, backup_type: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
         """
-        사용 가능한 백업 목록 반환
+        사용 가능한 백업 목록 반환 (매니페스트 기반, 백업 파일을 읽지 않음)
         
         Args:
             backup_type: 특정 백업 유형 (None인 경우 모든 유형)
         
         Returns:
-            Dict[str, List[Dict[str, Any]]]: 백업 유형별 목록
+            Dict[str, List[Dict[str, Any]]]: 백업 유형별 목록 (최신순)
         """
         result = {}
         
@@ -570,39 +654,21 @@ class BackupManager:
                 self.BACKUP_TYPE_CONFIG, self.BACKUP_TYPE_TRADES
             ]
             
-            # 백업 유형별 파일 목록 수집
             for btype in backup_types:
-                backup_dir = os.path.join(self.backup_dir, btype)
-                if not os.path.exists(backup_dir):
+                store = self.stores.get(btype)
+                if store is None:
                     result[btype] = []
                     continue
                 
-                backups = []
-                for f in os.listdir(backup_dir):
-                    if f.startswith(f"{btype}_") and f.endswith(".json"):
-                        file_path = os.path.join(backup_dir, f)
-                        
-                        # 백업 메타데이터 추출
-                        try:
-                            with open(file_path, 'r') as bf:
-                                data = json.load(bf)
-                                metadata = data.get('_metadata', {})
-                        except:
-                            metadata = {}
-                        
-                        file_info = {
-                            'file_name': f,
-                            'file_path': file_path,
-                            'timestamp': metadata.get('timestamp', ''),
-                            'created_at': metadata.get('created_at', ''),
-                            'version': metadata.get('version', ''),
-                            'size_kb': round(os.path.getsize(file_path) / 1024, 2)
-                        }
-                        backups.append(file_info)
-                
-                # 최신 순으로 정렬
-                backups.sort(key=lambda x: x['created_at'] if x['created_at'] else '', reverse=True)
-                result[btype] = backups
+                result[btype] = [{
+                    'file_name': entry['file'],
+                    'file_path': store.path_of(entry),
+                    'timestamp': entry.get('timestamp', ''),
+                    'created_at': entry.get('created_at', ''),
+                    'version': entry.get('version', ''),
+                    'kind': entry.get('kind', ''),
+                    'size_kb': round(entry.get('size', 0) / 1024, 2)
+                } for entry in store.entries()]
             
             return result
             
@@ -611,6 +677,30 @@ class BackupManager:
             self.logger.debug(traceback.format_exc())
             return {}
     
+    def load_backup(self, backup_path: str, verify: bool = True) -> Dict[str, Any]:
+        """
+        백업 파일 경로로 백업 데이터 로드
+        
+        증분 백업은 기준 스냅샷에 변경분을 적용해 재구성하고 내용 해시를 검증합니다.
+        매니페스트에 없는 이전 형식의 JSON 파일도 읽을 수 있습니다.
+        
+        Args:
+            backup_path: 백업 파일 경로
+            verify: 내용 해시 검증 여부
+        
+        Returns:
+            Dict[str, Any]: '_metadata'가 포함된 백업 데이터
+        """
+        backup_type = os.path.basename(os.path.dirname(os.path.abspath(backup_path)))
+        store = self.stores.get(backup_type)
+        if store is not None:
+            entry = store.find_entry_by_path(backup_path)
+            if entry is not None:
+                return store.read(entry['id'], verify=verify)
+        
+        with open(backup_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
     def restore_from_backup(self, backup_path: str) -> Tuple[bool, Dict[str, Any]]:
         """
         백업에서 상태 복원
@@ -626,8 +716,7 @@ class BackupManager:
                 return False, {'error': f"백업 파일이 존재하지 않음: {backup_path}"}
             
             # 백업 파일 읽기
-            with open(backup_path, 'r') as f:
-                backup_data = json.load(f)
+            backup_data = self.load_backup(backup_path)
             
             # 메타데이터 검증
             metadata = backup_data.get('_metadata', {})
@@ -663,7 +752,7 @@ class BackupManager:
     
     def get_latest_backup(self, backup_type: str) -> Optional[str]:
         """
-        특정 유형의 최신 백업 파일 경로 반환
+        특정 유형의 최신 백업 파일 경로 반환 (매니페스트에서 O(1) 조회)
         
         Args:
             backup_type: 백업 유형
@@ -672,22 +761,14 @@ class BackupManager:
             Optional[str]: 최신 백업 파일 경로
         """
         try:
-            backup_dir = os.path.join(self.backup_dir, backup_type)
-            if not os.path.exists(backup_dir):
+            store = self.stores.get(backup_type)
+            if store is None:
                 return None
             
-            backup_files = []
-            for f in os.listdir(backup_dir):
-                if f.startswith(f"{backup_type}_") and f.endswith(".json"):
-                    file_path = os.path.join(backup_dir, f)
-                    backup_files.append((file_path, os.path.getmtime(file_path)))
-            
-            if not backup_files:
+            entry = store.latest_entry()
+            if entry is None:
                 return None
-            
-            # 최신 파일 선택 (수정 시간 기준)
-            backup_files.sort(key=lambda x: x[1], reverse=True)
-            return backup_files[0][0]
+            return store.path_of(entry)
             
         except Exception as e:
             self.logger.error(f"최신 백업 조회 중 오류: {e}")
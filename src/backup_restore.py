@@ -153,9 +153,8 @@ class BackupRestoreManager:
             return False, {"error": f"Backup file not found: {backup_file}"}
         
         try:
-            # 백업 파일 읽기
-            with open(backup_file, 'r', encoding='utf-8') as f:
-                backup_data = json.load(f)
+            # 백업 파일 읽기 (증분 백업은 스냅샷 + 변경분으로 재구성)
+            backup_data = self.backup_manager.load_backup(backup_file)
             
             # 메타데이터 검증
             metadata = backup_data.get('_metadata', {})
@@ -218,8 +217,13 @@ class BackupRestoreManager:
             if not portfolio_restored:
                 return False, {"error": "Failed to restore portfolio data"}
             
-            # 3. 포지션 데이터 복원
-            positions_restored = self._restore_positions_data(positions_data)
+            # 3. 포지션 데이터 복원 (DB 페이지 단위 백업 세대가 있으면 DB 자체를 복원)
+            database_snapshot = backup_data.get('database_snapshot')
+            if database_snapshot:
+                positions_restored, _ = self.backup_manager.restore_database_backup(
+                    seq=database_snapshot.get('seq'))
+            else:
+                positions_restored = self._restore_positions_data(positions_data)
             
             # 4. 거래 상태 복원
             state_restored = self._restore_bot_state(state_data)
@@ -472,42 +476,37 @@ class BackupRestoreManager:
         """
         복원 전략에 따라 최적의 백업 파일 선택
         
+        백업 관리자의 매니페스트에서 유형별 최신 항목만 조회하므로 백업 파일을 읽지 않습니다.
+        
         Returns:
             Optional[str]: 선택된 백업 파일 경로 또는 None
         """
         try:
-            # 전체 백업 목록 가져오기
-            backups = self.backup_manager.list_backups()
-            
-            if not backups:
-                return None
+            bm = self.backup_manager
             
             if self.restore_strategy == 'latest_first':
                 # 전체 > 상태 > 설정 순으로 최신 백업 선택
-                for backup_type in [self.backup_manager.BACKUP_TYPE_FULL, 
-                                   self.backup_manager.BACKUP_TYPE_STATE,
-                                   self.backup_manager.BACKUP_TYPE_CONFIG]:
-                    if backup_type in backups and backups[backup_type]:
-                        return backups[backup_type][0]['file_path']  # 최신 백업 선택
-                
+                candidates = [bm.BACKUP_TYPE_FULL, bm.BACKUP_TYPE_STATE, bm.BACKUP_TYPE_CONFIG]
             elif self.restore_strategy == 'full_preferred':
-                # 전체 백업 중 최신 것 선택
-                if self.backup_manager.BACKUP_TYPE_FULL in backups and backups[self.backup_manager.BACKUP_TYPE_FULL]:
-                    return backups[self.backup_manager.BACKUP_TYPE_FULL][0]['file_path']
-                
-                # 없으면 상태 백업 중 최신 것 선택
-                if self.backup_manager.BACKUP_TYPE_STATE in backups and backups[self.backup_manager.BACKUP_TYPE_STATE]:
-                    return backups[self.backup_manager.BACKUP_TYPE_STATE][0]['file_path']
-            
+                # 전체 백업 중 최신 것, 없으면 상태 백업 중 최신 것 선택
+                candidates = [bm.BACKUP_TYPE_FULL, bm.BACKUP_TYPE_STATE]
             elif self.restore_strategy == 'state_only':
                 # 상태 백업만 고려
-                if self.backup_manager.BACKUP_TYPE_STATE in backups and backups[self.backup_manager.BACKUP_TYPE_STATE]:
-                    return backups[self.backup_manager.BACKUP_TYPE_STATE][0]['file_path']
+                candidates = [bm.BACKUP_TYPE_STATE]
+            else:
+                candidates = []
+            
+            for backup_type in candidates:
+                latest = bm.get_latest_backup(backup_type)
+                if latest:
+                    return latest
             
             # 기본적으로 어떤 백업이든 최신 것 선택
-            for backup_type in backups:
-                if backups[backup_type]:
-                    return backups[backup_type][0]['file_path']
+            for backup_type in [bm.BACKUP_TYPE_FULL, bm.BACKUP_TYPE_STATE,
+                                bm.BACKUP_TYPE_CONFIG, bm.BACKUP_TYPE_TRADES]:
+                latest = bm.get_latest_backup(backup_type)
+                if latest:
+                    return latest
             
             return None
             
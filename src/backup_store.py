@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 증분 백업 저장소 모듈
+
+import os
+import gzip
+import json
+import hashlib
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple
+
+from src.logging_config import get_logger
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# 압축 방식
+COMPRESSION_GZIP = 'gzip'
+COMPRESSION_ZSTD = 'zstd'
+
+# 항목 종류
+KIND_SNAPSHOT = 'snapshot'  # 전체 스냅샷
+KIND_DELTA = 'delta'        # 마지막 스냅샷 대비 변경분
+KIND_LEGACY = 'legacy'      # 이전 버전의 비압축 JSON 백업
+
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_VERSION = 1
+
+_EXTENSIONS = {
+    COMPRESSION_GZIP: '.json.gz',
+    COMPRESSION_ZSTD: '.json.zst'
+}
+
+
+def canonical_json(data: Any) -> str:
+    """
+    해시 계산용 정규화 JSON 문자열 생성
+
+    Args:
+        data: 직렬화할 데이터
+
+    Returns:
+        str: 키 정렬, 공백 없는 JSON 문자열
+    """
+    return json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+
+
+def compute_delta(base: Dict[str, Any], target: Dict[str, Any]) -> Dict[str, List]:
+    """
+    두 딕셔너리의 차이 계산
+
+    중첩 딕셔너리는 재귀적으로 비교하고, 리스트와 스칼라 값은 통째로 비교합니다.
+
+    Args:
+        base: 기준 데이터
+        target: 대상 데이터
+
+    Returns:
+        Dict[str, List]: {'set': [[경로, 값], ...], 'unset': [경로, ...]}
+    """
+    changes = {'set': [], 'unset': []}
+
+    def _walk(b: Dict[str, Any], t: Dict[str, Any], path: List[str]):
+        for key, value in t.items():
+            if key not in b:
+                changes['set'].append([path + [key], value])
+            elif isinstance(value, dict) and isinstance(b[key], dict):
+                _walk(b[key], value, path + [key])
+            elif b[key] != value:
+                changes['set'].append([path + [key], value])
+        for key in b:
+            if key not in t:
+                changes['unset'].append(path + [key])
+
+    _walk(base, target, [])
+    return changes
+
+
+def apply_delta(base: Dict[str, Any], delta: Dict[str, List]) -> Dict[str, Any]:
+    """
+    기준 데이터에 변경분 적용
+
+    Args:
+        base: 기준 데이터 (변경되지 않음)
+        delta: compute_delta 결과
+
+    Returns:
+        Dict[str, Any]: 변경분이 적용된 새 데이터
+    """
+    result = json.loads(json.dumps(base))
+
+    for path in delta.get('unset', []):
+        node = result
+        for key in path[:-1]:
+            node = node.get(key, {})
+        node.pop(path[-1], None)
+
+    for path, value in delta.get('set', []):
+        node = result
+        for key in path[:-1]:
+            if not isinstance(node.get(key), dict):
+                node[key] = {}
+            node = node[key]
+        node[path[-1]] = value
+
+    return result
+
+
+class IncrementalBackupStore:
+    """
+    백업 유형 하나에 대한 증분 백업 저장소
+
+    각 백업은 압축된 전체 스냅샷 또는 마지막 스냅샷 대비 변경분(delta)으로 저장되며,
+    내용 해시(SHA-256)로 식별되어 동일한 내용은 다시 기록하지 않습니다.
+    매니페스트 파일이 모든 항목의 메타데이터를 보관하므로 최신 백업 조회와 목록 조회에
+    백업 파일을 읽을 필요가 없습니다.
+    """
+
+    def __init__(self, type_dir: str, backup_type: str, max_backups: int = 24,
+                 snapshot_interval: int = 12, compression: Optional[str] = None):
+        """
+        증분 백업 저장소 초기화
+
+        Args:
+            type_dir: 백업 유형 디렉토리
+            backup_type: 백업 유형 이름
+            max_backups: 유지할 최대 백업 수
+            snapshot_interval: 전체 스냅샷 사이의 최대 변경분 수
+            compression: 압축 방식 ('gzip' 또는 'zstd', None인 경우 사용 가능한 최선)
+        """
+        self.logger = get_logger('backup_store')
+        self.type_dir = type_dir
+        self.backup_type = backup_type
+        self.max_backups = max_backups
+        self.snapshot_interval = max(1, snapshot_interval)
+
+        if compression is None:
+            compression = COMPRESSION_ZSTD if zstandard is not None else COMPRESSION_GZIP
+        if compression == COMPRESSION_ZSTD and zstandard is None:
+            self.logger.warning("zstandard 모듈이 없어 gzip 압축을 사용합니다.")
+            compression = COMPRESSION_GZIP
+        self.compression = compression
+
+        self.manifest_path = os.path.join(type_dir, MANIFEST_FILE)
+        self._lock = threading.RLock()
+        self._snapshot_cache: Tuple[Optional[str], Optional[Dict[str, Any]]] = (None, None)
+
+        os.makedirs(type_dir, exist_ok=True)
+        self.manifest = self._load_manifest()
+        self._index = {e['id']: e for e in self.manifest['entries']}
+
+    # ------------------------------------------------------------------
+    # 매니페스트
+    # ------------------------------------------------------------------
+    def _load_manifest(self) -> Dict[str, Any]:
+        """매니페스트 로드 (없으면 기존 JSON 백업을 파일 이름/수정 시간으로 색인)"""
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+                if manifest.get('version') == MANIFEST_VERSION:
+                    return manifest
+            except Exception as e:
+                self.logger.error(f"백업 매니페스트 로드 실패, 재색인합니다: {e}")
+
+        entries = []
+        for f in os.listdir(self.type_dir):
+            if f.startswith(f"{self.backup_type}_") and f.endswith(".json"):
+                file_path = os.path.join(self.type_dir, f)
+                mtime = os.path.getmtime(file_path)
+                entries.append({
+                    'id': f[:-len('.json')],
+                    'file': f,
+                    'kind': KIND_LEGACY,
+                    'base': None,
+                    'digest': None,
+                    'timestamp': f[len(self.backup_type) + 1:-len('.json')],
+                    'created_at': datetime.fromtimestamp(mtime).isoformat(),
+                    'version': '',
+                    'size': os.path.getsize(file_path),
+                    '_mtime': mtime
+                })
+        entries.sort(key=lambda e: e.pop('_mtime'))
+
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'backup_type': self.backup_type,
+            'latest': entries[-1]['id'] if entries else None,
+            'latest_snapshot': None,
+            'deltas_since_snapshot': 0,
+            'sequence': len(entries),
+            'entries': entries
+        }
+        if entries:
+            self._write_manifest(manifest)
+        return manifest
+
+    def _write_manifest(self, manifest: Optional[Dict[str, Any]] = None):
+        """매니페스트 원자적 저장"""
+        manifest = manifest if manifest is not None else self.manifest
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.manifest_path)
+
+    # ------------------------------------------------------------------
+    # 파일 입출력
+    # ------------------------------------------------------------------
+    def _compress(self, raw: bytes) -> bytes:
+        if self.compression == COMPRESSION_ZSTD:
+            return zstandard.ZstdCompressor(level=3).compress(raw)
+        return gzip.compress(raw, compresslevel=6)
+
+    @staticmethod
+    def _decompress(file_name: str, payload: bytes) -> bytes:
+        if file_name.endswith(_EXTENSIONS[COMPRESSION_ZSTD]):
+            if zstandard is None:
+                raise RuntimeError("zstd 압축 백업을 읽으려면 zstandard 모듈이 필요합니다")
+            return zstandard.ZstdDecompressor().decompress(payload)
+        if file_name.endswith(_EXTENSIONS[COMPRESSION_GZIP]):
+            return gzip.decompress(payload)
+        return payload
+
+    def _write_object(self, file_name: str, obj: Dict[str, Any]) -> int:
+        """압축 객체 파일 원자적 저장 후 크기 반환"""
+        raw = json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+        payload = self._compress(raw)
+        path = os.path.join(self.type_dir, file_name)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        return len(payload)
+
+    def _read_object(self, file_name: str) -> Dict[str, Any]:
+        path = os.path.join(self.type_dir, file_name)
+        with open(path, 'rb') as f:
+            payload = f.read()
+        return json.loads(self._decompress(file_name, payload).decode('utf-8'))
+
+    # ------------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------------
+    def write(self, data: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        백업 기록
+
+        마지막 항목과 내용이 같으면 새 파일을 만들지 않고 기존 항목을 반환합니다.
+        변경분이 스냅샷 크기의 절반을 넘거나 snapshot_interval에 도달하면 전체 스냅샷을 기록합니다.
+
+        Args:
+            data: 백업 데이터 (메타데이터 제외)
+            metadata: 백업 메타데이터 (해시 계산에서 제외)
+
+        Returns:
+            Dict[str, Any]: 매니페스트 항목
+        """
+        metadata = metadata or {}
+        canonical = canonical_json(data)
+        digest = hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+        normalized = json.loads(canonical)
+
+        with self._lock:
+            latest = self._index.get(self.manifest.get('latest'))
+            if latest is not None and latest.get('digest') == digest:
+                self.logger.debug(f"{self.backup_type} 백업 내용 변경 없음, 기존 항목 재사용: {latest['id']}")
+                return latest
+
+            timestamp = metadata.get('timestamp') or datetime.now().strftime("%Y%m%d_%H%M%S")
+            entry_id = self._next_entry_id(timestamp, digest)
+
+            kind = KIND_SNAPSHOT
+            obj = {'kind': KIND_SNAPSHOT, 'data': normalized, '_metadata': metadata}
+            base_id = self.manifest.get('latest_snapshot')
+            if base_id in self._index and self.manifest.get('deltas_since_snapshot', 0) < self.snapshot_interval:
+                base_data = self._get_snapshot_data(base_id)
+                if base_data is not None:
+                    delta = compute_delta(base_data, normalized)
+                    if len(canonical_json(delta)) * 2 < len(canonical):
+                        kind = KIND_DELTA
+                        obj = {'kind': KIND_DELTA, 'base': base_id, 'delta': delta, '_metadata': metadata}
+
+            file_name = f"{entry_id}.{kind}{_EXTENSIONS[self.compression]}"
+            size = self._write_object(file_name, obj)
+
+            entry = {
+                'id': entry_id,
+                'file': file_name,
+                'kind': kind,
+                'base': obj.get('base'),
+                'digest': digest,
+                'timestamp': timestamp,
+                'created_at': metadata.get('created_at') or datetime.now().isoformat(),
+                'version': metadata.get('version', ''),
+                'size': size
+            }
+
+            self.manifest['entries'].append(entry)
+            self._index[entry_id] = entry
+            self.manifest['latest'] = entry_id
+            if kind == KIND_SNAPSHOT:
+                self.manifest['latest_snapshot'] = entry_id
+                self.manifest['deltas_since_snapshot'] = 0
+                self._snapshot_cache = (entry_id, normalized)
+            else:
+                self.manifest['deltas_since_snapshot'] = self.manifest.get('deltas_since_snapshot', 0) + 1
+
+            self._prune()
+            self._write_manifest()
+            return entry
+
+    def _next_entry_id(self, timestamp: str, digest: str) -> str:
+        """
+        새 항목 ID 생성
+
+        타임스탬프는 초 단위라 같은 초에 같은 내용이 다시 기록될 수 있으므로
+        매니페스트에 보관하는 일련번호를 붙여 ID가 겹치지 않게 합니다.
+        """
+        sequence = self.manifest.get('sequence', len(self.manifest['entries']))
+        while True:
+            sequence += 1
+            entry_id = f"{self.backup_type}_{timestamp}_{sequence:06d}_{digest[:12]}"
+            if entry_id not in self._index:
+                break
+        self.manifest['sequence'] = sequence
+        return entry_id
+
+    def _get_snapshot_data(self, snapshot_id: str) -> Optional[Dict[str, Any]]:
+        """스냅샷 데이터 조회 (최근 스냅샷은 메모리 캐시 사용)"""
+        cached_id, cached_data = self._snapshot_cache
+        if cached_id == snapshot_id:
+            return cached_data
+        entry = self._index.get(snapshot_id)
+        if entry is None:
+            return None
+        data = self._read_object(entry['file']).get('data')
+        self._snapshot_cache = (snapshot_id, data)
+        return data
+
+    def _prune(self):
+        """최대 백업 수를 초과한 오래된 항목 제거 (변경분이 참조하는 스냅샷은 유지)"""
+        entries = self.manifest['entries']
+        while len(entries) > self.max_backups:
+            referenced = {e['base'] for e in entries if e.get('base')}
+            removable = None
+            for e in entries[:-1]:
+                if e['id'] not in referenced:
+                    removable = e
+                    break
+            if removable is None:
+                break
+
+            entries.remove(removable)
+            self._index.pop(removable['id'], None)
+            if self.manifest.get('latest_snapshot') == removable['id']:
+                self.manifest['latest_snapshot'] = None
+            try:
+                os.remove(os.path.join(self.type_dir, removable['file']))
+                self.logger.debug(f"오래된 백업 제거: {removable['file']}")
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                self.logger.error(f"백업 제거 중 오류: {e}")
+
+    def prune(self) -> int:
+        """
+        최대 백업 수를 초과한 오래된 항목 제거 후 매니페스트 저장
+
+        Returns:
+            int: 제거한 항목 수
+        """
+        with self._lock:
+            before = len(self.manifest['entries'])
+            self._prune()
+            removed = before - len(self.manifest['entries'])
+            if removed:
+                self._write_manifest()
+            return removed
+
+    def read(self, entry_id: str, verify: bool = True) -> Dict[str, Any]:
+        """
+        백업 항목 복원
+
+        Args:
+            entry_id: 항목 ID
+            verify: 내용 해시 검증 여부
+
+        Returns:
+            Dict[str, Any]: '_metadata'가 포함된 백업 데이터
+        """
+        with self._lock:
+            entry = self._index.get(entry_id)
+            if entry is None:
+                raise KeyError(f"백업 항목을 찾을 수 없음: {entry_id}")
+
+            if entry['kind'] == KIND_LEGACY:
+                with open(os.path.join(self.type_dir, entry['file']), 'r', encoding='utf-8') as f:
+                    return json.load(f)
+
+            obj = self._read_object(entry['file'])
+            if obj['kind'] == KIND_DELTA:
+                base_data = self._get_snapshot_data(obj['base'])
+                if base_data is None:
+                    raise ValueError(f"기준 스냅샷이 없음: {obj['base']}")
+                data = apply_delta(base_data, obj['delta'])
+            else:
+                data = obj['data']
+
+        if verify and entry.get('digest'):
+            actual = hashlib.sha256(canonical_json(data).encode('utf-8')).hexdigest()
+            if actual != entry['digest']:
+                raise ValueError(f"백업 무결성 검증 실패: {entry_id}")
+
+        data['_metadata'] = obj.get('_metadata', {})
+        return data
+
+    def find_entry_by_path(self, path: str) -> Optional[Dict[str, Any]]:
+        """파일 경로에 해당하는 매니페스트 항목 반환"""
+        file_name = os.path.basename(path)
+        for suffix in ('.snapshot', '.delta'):
+            if suffix in file_name:
+                return self._index.get(file_name.split(suffix)[0])
+        if file_name.endswith('.json'):
+            return self._index.get(file_name[:-len('.json')])
+        return None
+
+    def latest_entry(self) -> Optional[Dict[str, Any]]:
+        """최신 항목 반환 (O(1))"""
+        return self._index.get(self.manifest.get('latest'))
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """모든 항목을 최신순으로 반환"""
+        return list(reversed(self.manifest['entries']))
+
+    def path_of(self, entry: Dict[str, Any]) -> str:
+        """항목의 파일 경로 반환"""
+        return os.path.join(self.type_dir, entry['file'])
@@ -0,0 +1,268 @@
+"""
+캔들 버퍼 모듈 - 암호화폐 자동매매 봇
+
+(심볼, 타임프레임)별로 최근 캔들을 고정 크기 NumPy 링 버퍼에 보관합니다.
+처음 한 번만 capacity 개를 내려받고, 이후에는 마지막 캔들 시각(since)부터의
+캔들만 조회해 진행 중인 캔들은 덮어쓰고 새 캔들만 추가합니다. 매 사이클의
+조회 가중치와 메모리 할당이 새 캔들 수에 비례합니다.
+
+버퍼는 각 행을 두 번(i, i + capacity) 기록하므로 최근 n 개 캔들이 항상 연속된
+구간에 있어 복사 없이 뷰로 꺼낼 수 있습니다.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.logging_config import get_logger
+
+logger = get_logger('crypto_bot.candle_buffer')
+
+OHLCV_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+# 증분 조회 한 번에 요청할 최대 캔들 수
+DEFAULT_FETCH_LIMIT = 500
+
+
+class CandleRingBuffer:
+    """
+    고정 크기 OHLCV 링 버퍼
+
+    각 행을 두 위치에 기록하는 미러 방식이라 최근 n 개 행은 항상 연속 구간이며,
+    window() 는 복사 없는 읽기 전용 뷰를 반환합니다.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity: 보관할 최대 캔들 수
+        """
+        self.capacity = max(1, int(capacity))
+        self._timestamps = np.zeros(self.capacity * 2, dtype='datetime64[ms]')
+        self._fields = {field: np.zeros(self.capacity * 2, dtype=np.float64) for field in OHLCV_FIELDS}
+        self._head = 0   # 다음에 기록할 위치 (0 ~ capacity-1)
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        """마지막 캔들 시작 시각 (ms)"""
+        if not self.count:
+            return None
+        return int(self._timestamps[(self._head - 1) % self.capacity].astype(np.int64))
+
+    def clear(self):
+        self._head = 0
+        self.count = 0
+
+    def _write(self, position: int, row: Sequence[float]):
+        for offset in (position, position + self.capacity):
+            self._timestamps[offset] = np.datetime64(int(row[0]), 'ms')
+            for field, value in zip(OHLCV_FIELDS, row[1:6]):
+                self._fields[field][offset] = value
+
+    def append(self, row: Sequence[float]):
+        """새 캔들 추가 ([시작 시각(ms), 시가, 고가, 저가, 종가, 거래량])"""
+        self._write(self._head, row)
+        self._head = (self._head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def replace_last(self, row: Sequence[float]):
+        """마지막 캔들 갱신 (진행 중인 캔들)"""
+        self._write((self._head - 1) % self.capacity, row)
+
+    def window(self, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        최근 n 개 캔들의 열별 읽기 전용 뷰
+
+        뷰는 버퍼 메모리를 공유하므로 다음 갱신 전까지만 유효합니다.
+
+        Args:
+            n: 캔들 수 (None 또는 보관 수보다 크면 전체)
+
+        Returns:
+            dict: timestamp(datetime64[ms]) 와 open/high/low/close/volume 배열
+        """
+        n = self.count if n is None else min(max(0, int(n)), self.count)
+        end = self._head + self.capacity
+        views = {'timestamp': self._timestamps[end - n:end]}
+        views.update((field, array[end - n:end]) for field, array in self._fields.items())
+        for view in views.values():
+            view.flags.writeable = False
+        return views
+
+
+class CandleBuffer:
+    """
+    거래소에서 증분 조회한 캔들을 링 버퍼에 유지하는 버퍼
+
+    update() 는 비어 있으면 capacity 개를 한 번에 조회하고, 그 뒤로는 마지막 캔들
+    시각부터만 조회합니다. 응답의 첫 캔들은 보통 진행 중이던 마지막 캔들이라 덮어쓰고,
+    더 새로운 캔들만 추가합니다. 밀린 캔들이 버퍼 크기를 넘으면 처음처럼 다시 채웁니다.
+    """
+
+    def __init__(self, exchange_api, symbol: str, timeframe: str, capacity: int = 1000,
+                 fetch_limit: int = DEFAULT_FETCH_LIMIT):
+        """
+        Args:
+            exchange_api: 거래소 API 인스턴스 (exchange 속성에 ccxt 객체 보유)
+            symbol: 거래 심볼
+            timeframe: 타임프레임 (1m, 1h 등)
+            capacity: 보관할 최대 캔들 수
+            fetch_limit: 증분 조회 한 번에 요청할 최대 캔들 수
+        """
+        self.exchange_api = exchange_api
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.fetch_limit = max(2, int(fetch_limit))
+        self.buffer = CandleRingBuffer(capacity)
+        self.last_update: Optional[float] = None
+        self.stats = {'requests': 0, 'candles_received': 0, 'appended': 0, 'patched': 0, 'refills': 0}
+        self._lock = threading.RLock()
+
+    @property
+    def capacity(self) -> int:
+        return self.buffer.capacity
+
+    @property
+    def exchange(self):
+        return getattr(self.exchange_api, 'exchange', None) or self.exchange_api
+
+    def _fetch(self, since: Optional[int], limit: int) -> List[list]:
+        formatter = getattr(self.exchange_api, 'format_symbol', None)
+        symbol = formatter(self.symbol) if formatter else self.symbol
+        rows = self.exchange.fetch_ohlcv(symbol, self.timeframe, since, limit) or []
+        self.stats['requests'] += 1
+        self.stats['candles_received'] += len(rows)
+        return rows
+
+    def resize(self, capacity: int):
+        """버퍼 크기 변경 (기존 캔들은 버리고 다음 update() 에서 다시 채움)"""
+        with self._lock:
+            if capacity != self.buffer.capacity:
+                self.buffer = CandleRingBuffer(capacity)
+
+    def update(self) -> int:
+        """
+        새 캔들 반영
+
+        Returns:
+            int: 추가된 캔들 수 (진행 중인 캔들 갱신은 제외, 실패 시 -1)
+        """
+        with self._lock:
+            try:
+                last = self.buffer.last_timestamp
+                appended = 0
+                if last is not None:
+                    # 버퍼를 다 채울 만큼 밀렸으면 증분 조회를 멈추고 다시 채움
+                    max_pages = -(-self.buffer.capacity // self.fetch_limit) + 1
+                    for _ in range(max_pages):
+                        rows = self._fetch(last, self.fetch_limit)
+                        for row in rows:
+                            ts = int(row[0])
+                            if ts == last:
+                                self.buffer.replace_last(row)
+                                self.stats['patched'] += 1
+                            elif ts > last:
+                                self.buffer.append(row)
+                                last = ts
+                                appended += 1
+                        if len(rows) < self.fetch_limit:
+                            break
+                    else:
+                        self.stats['refills'] += 1
+                        last = None
+                
+                if last is None:
+                    rows = self._fetch(None, self.buffer.capacity)
+                    self.buffer.clear()
+                    for row in rows:
+                        self.buffer.append(row)
+                    appended = len(rows)
+                
+                self.stats['appended'] += appended
+                self.last_update = time.time()
+                return appended
+
+            except Exception as e:
+                logger.error(f"{self.symbol} {self.timeframe} 캔들 갱신 중 오류: {e}")
+                return -1
+
+    def window(self, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """최근 n 개 캔들의 열별 읽기 전용 뷰 (CandleRingBuffer.window 참고)"""
+        with self._lock:
+            return self.buffer.window(n)
+
+    def frame(self, n: Optional[int] = None, copy: bool = False) -> pd.DataFrame:
+        """
+        최근 n 개 캔들을 get_ohlcv 와 같은 열 구성의 데이터프레임으로 반환
+
+        copy=False 이면 열 데이터가 버퍼를 공유하므로 다음 update() 전까지만 유효하고
+        읽기 전용입니다. 다른 스레드와 공유하는 버퍼에서 꺼내 오래 쓰거나 수정할 때는
+        copy=True 로 잠금 안에서 복사한 프레임을 받으세요 (비용은 O(n)).
+
+        Args:
+            n: 캔들 수 (None이면 전체)
+            copy: 버퍼와 분리된 쓰기 가능한 사본 반환 여부
+
+        Returns:
+            pd.DataFrame: timestamp, open, high, low, close, volume 열
+        """
+        with self._lock:
+            columns = self.buffer.window(n)
+            if copy:
+                columns = {name: array.copy() for name, array in columns.items()}
+        df = pd.DataFrame(columns, copy=False)
+        df.attrs['market_type'] = getattr(self.exchange_api, 'market_type', 'spot')
+        if df.attrs['market_type'] == 'futures' and getattr(self.exchange_api, 'leverage', None) is not None:
+            df.attrs['leverage'] = self.exchange_api.leverage
+        return df
+
+
+_buffers: Dict[tuple, CandleBuffer] = {}
+_buffers_lock = threading.Lock()
+
+
+def _endpoint_key(exchange_api) -> tuple:
+    """
+    캔들을 받아오는 접속 주소 식별값 (테스트넷/실거래 구분)
+
+    캔들은 공개 데이터이므로 API 키와 무관하게 같은 접속 주소면 같은 값을 돌려줍니다.
+    """
+    exchange = getattr(exchange_api, 'exchange', None)
+    urls = getattr(exchange, 'urls', None)
+    endpoint = repr(urls.get('api')) if isinstance(urls, dict) else ''
+    return endpoint, bool(getattr(exchange, 'isSandboxModeEnabled', False))
+
+
+def get_candle_buffer(exchange_api, symbol: str, timeframe: str, capacity: int = 1000) -> CandleBuffer:
+    """
+    거래소/접속 주소/시장 유형/심볼/타임프레임별 공유 캔들 버퍼 반환
+
+    테스트넷과 실거래는 같은 거래소 ID 여도 캔들이 다르므로 접속 주소와 샌드박스 여부를
+    키에 포함합니다.
+
+    Args:
+        exchange_api: 거래소 API 인스턴스
+        symbol: 거래 심볼
+        timeframe: 타임프레임
+        capacity: 최소 보관 캔들 수 (기존 버퍼가 작으면 늘림)
+
+    Returns:
+        CandleBuffer: 캔들 버퍼
+    """
+    key = (getattr(exchange_api, 'exchange_id', 'default'), _endpoint_key(exchange_api),
+           (getattr(exchange_api, 'market_type', 'spot') or 'spot').lower(), symbol, timeframe)
+    with _buffers_lock:
+        buffer = _buffers.get(key)
+        if buffer is None:
+            buffer = CandleBuffer(exchange_api, symbol, timeframe, capacity=capacity)
+            _buffers[key] = buffer
+        elif buffer.capacity < capacity:
+            buffer.resize(capacity)
+        return buffer
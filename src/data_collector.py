@@ -13,6 +13,8 @@ import os
 from datetime import datetime, timedelta
 from src.exchange_api import ExchangeAPI
 from src.data_manager import DataManager
+from src.ohlcv_schema import compact_ohlcv
+from src.candle_buffer import get_candle_buffer
 from src.config import DEFAULT_EXCHANGE, DEFAULT_SYMBOL, DEFAULT_TIMEFRAME
 
 # 로깅 설정
@@ -42,12 +44,18 @@ class DataCollector:
         self.exchange_api = ExchangeAPI(exchange_id=exchange_id, symbol=symbol, timeframe=timeframe)
         self.data_manager = DataManager(exchange_id=exchange_id, symbol=symbol)
         
+        # 최근 캔들 버퍼 최소 크기 (fetch_recent_data 의 limit 이 더 크면 늘어남)
+        self.candle_buffer_capacity = 500
+        
         logger.info(f"{exchange_id} 거래소의 {symbol} 데이터 수집기가 초기화되었습니다.")
     
     def fetch_recent_data(self, limit=100):
         """
         최근 OHLCV 데이터 가져오기
         
+        심볼/타임프레임별 캔들 버퍼를 갱신해 마지막 캔들 이후의 캔들만 조회합니다.
+        버퍼는 여러 스레드가 공유하므로 반환되는 데이터프레임은 버퍼와 분리된 사본입니다.
+        
         Args:
             limit (int): 가져올 데이터 개수
         
@@ -55,6 +63,12 @@ class DataCollector:
             DataFrame: OHLCV 데이터
         """
         try:
+            buffer = get_candle_buffer(self.exchange_api, self.symbol, self.timeframe,
+                                       capacity=max(limit, self.candle_buffer_capacity))
+            if buffer.update() >= 0 and len(buffer.buffer) >= min(limit, buffer.capacity):
+                logger.debug(f"{self.symbol}의 최근 {limit}개 OHLCV 데이터를 캔들 버퍼에서 가져옵니다.")
+                return buffer.frame(limit, copy=True)
+            
             logger.info(f"{self.symbol}의 최근 {limit}개 OHLCV 데이터를 가져오는 중...")
             df = self.exchange_api.get_ohlcv(limit=limit)
             
@@ -190,6 +204,9 @@ class DataCollector:
                         # 타임프레임에 맞게 다시 폴링
                         result_df = self.resample_data(result_df, self.timeframe)
                 
+                # 값 손실 없는 자료형 압축
+                result_df = compact_ohlcv(result_df, copy=False)
+                
                 logger.info(f"총 {len(result_df)}개의 과거 데이터를 성공적으로 가져왔습니다.")
                 
                 # 데이터 저장
@@ -12,6 +12,7 @@ import pickle
 from datetime import datetime
 import logging
 from src.config import DATA_DIR, LOG_DIR
+from src.ohlcv_schema import compact_ohlcv
 
 # 로깅 설정
 logging.basicConfig(
@@ -89,7 +90,7 @@ class DataManager:
                 df['timestamp'] = pd.to_datetime(df['timestamp'])
             
             logger.info(f"OHLCV 데이터 로드 완료: {filepath}")
-            return df
+            return compact_ohlcv(df, copy=False)
         
         except Exception as e:
             logger.error(f"OHLCV 데이터 로드 중 오류 발생: {e}")
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - SQLite 온라인 백업 모듈
+
+import os
+import gzip
+import json
+import time
+import struct
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional, List
+
+from src.logging_config import get_logger
+
+INDEX_FILE = 'index.json'
+MIRROR_FILE = 'mirror.sqlite'
+INDEX_VERSION = 1
+
+# 페이지 팩 레코드 헤더: 페이지 번호(uint32)
+_PAGE_HEADER = struct.Struct('>I')
+
+
+class DatabaseBackupError(Exception):
+    """데이터베이스 백업/복원 실패"""
+    pass
+
+
+class SQLiteOnlineBackup:
+    """
+    SQLite 온라인 백업 API 기반 데이터베이스 백업 관리자
+
+    sqlite3.Connection.backup으로 거래 DB를 페이지 단위로 나누어 복사하므로
+    단계 사이에 잠금이 풀려 봇이 거래를 계속할 수 있습니다. 복사본은 무결성 검사 후
+    이전 세대와 비교하여 변경된 페이지만 압축 페이지 팩으로 저장하므로 세대당
+    디스크 사용량은 변경된 페이지 수에 비례합니다. 각 세대는 생성 시각으로 조회하여
+    특정 시점으로 복원할 수 있습니다.
+
+    제한: 변경 페이지를 추적하지 않으므로 매 백업마다 DB 전체를 복사하고,
+    무결성 검사와 페이지 해시 계산도 전체 페이지에 대해 수행합니다. 즉 백업 시간과
+    읽기 I/O는 변경량이 아니라 DB 크기에 비례(O(DB 크기))하며, 줄어드는 것은 저장 공간뿐입니다.
+    """
+
+    def __init__(self, db_path: str, backup_dir: str, max_generations: int = 48,
+                 pages_per_step: int = 256, step_sleep: float = 0.0):
+        """
+        SQLite 온라인 백업 관리자 초기화
+
+        Args:
+            db_path: 백업할 데이터베이스 파일 경로
+            backup_dir: 페이지 팩과 인덱스를 저장할 디렉토리
+            max_generations: 유지할 최대 세대 수 (초과 시 오래된 세대를 기준 팩으로 병합)
+            pages_per_step: backup 단계당 복사할 페이지 수
+            step_sleep: backup 단계 사이 대기 시간 (초)
+        """
+        self.logger = get_logger('db_backup')
+        self.db_path = db_path
+        self.backup_dir = backup_dir
+        self.max_generations = max(1, max_generations)
+        self.pages_per_step = pages_per_step
+        self.step_sleep = step_sleep
+
+        self.index_path = os.path.join(backup_dir, INDEX_FILE)
+        self.mirror_path = os.path.join(backup_dir, MIRROR_FILE)
+        self._lock = threading.Lock()
+
+        os.makedirs(backup_dir, exist_ok=True)
+        self.index = self._load_index()
+
+    # ------------------------------------------------------------------
+    # 인덱스
+    # ------------------------------------------------------------------
+    def _load_index(self) -> Dict[str, Any]:
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+                if index.get('version') == INDEX_VERSION:
+                    return index
+            except Exception as e:
+                self.logger.error(f"DB 백업 인덱스 로드 실패: {e}")
+        return {'version': INDEX_VERSION, 'next_seq': 1, 'page_hashes': [], 'generations': []}
+
+    def _write_index(self):
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, separators=(',', ':'))
+        os.replace(tmp_path, self.index_path)
+
+    # ------------------------------------------------------------------
+    # 백업
+    # ------------------------------------------------------------------
+    def _copy_online(self, source_path: str, dest_path: str, single_file: bool = False):
+        """
+        온라인 백업 API로 페이지 단위 복사
+
+        Args:
+            source_path: 원본 DB 경로
+            dest_path: 대상 DB 경로
+            single_file: 대상 DB를 WAL 없는 단일 파일로 유지할지 여부 (미러 파일용)
+        """
+        src = sqlite3.connect(source_path, timeout=30.0)
+        dst = sqlite3.connect(dest_path, timeout=30.0)
+        try:
+            src.backup(dst, pages=self.pages_per_step, sleep=self.step_sleep)
+            if single_file:
+                dst.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            dst.close()
+            src.close()
+
+    @staticmethod
+    def _integrity_check(path: str) -> bool:
+        conn = sqlite3.connect(path)
+        try:
+            result = conn.execute("PRAGMA integrity_check").fetchone()
+            return bool(result) and result[0] == 'ok'
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _page_size(path: str) -> int:
+        conn = sqlite3.connect(path)
+        try:
+            return conn.execute("PRAGMA page_size").fetchone()[0]
+        finally:
+            conn.close()
+
+    def create_backup(self) -> Dict[str, Any]:
+        """
+        데이터베이스 백업 세대 생성
+
+        DB 전체를 미러 파일로 복사하고 모든 페이지를 해시하므로 실행 비용은 DB 크기에
+        비례합니다. 팩 파일에는 이전 세대와 다른 페이지만 기록됩니다.
+
+        Returns:
+            Dict[str, Any]: 세대 정보 (seq, created_at, page_count, changed_pages, ...)
+        """
+        with self._lock:
+            start = time.time()
+            if not os.path.exists(self.db_path):
+                raise DatabaseBackupError(f"데이터베이스 파일이 없음: {self.db_path}")
+
+            self._copy_online(self.db_path, self.mirror_path, single_file=True)
+            if not self._integrity_check(self.mirror_path):
+                raise DatabaseBackupError("백업 복사본 무결성 검사 실패")
+
+            page_size = self._page_size(self.mirror_path)
+            previous_hashes = self.index['page_hashes']
+            if self.index['generations'] and self.index['generations'][-1]['page_size'] != page_size:
+                previous_hashes = []
+
+            seq = self.index['next_seq']
+            pack_file = f"pack_{seq:08d}.bin.gz"
+            new_hashes = []
+            changed = 0
+            file_hash = hashlib.sha256()
+
+            with open(self.mirror_path, 'rb') as src, \
+                    gzip.open(os.path.join(self.backup_dir, pack_file + '.tmp'), 'wb', compresslevel=6) as pack:
+                page_no = 0
+                while True:
+                    page = src.read(page_size)
+                    if not page:
+                        break
+                    file_hash.update(page)
+                    digest = hashlib.sha1(page).hexdigest()
+                    new_hashes.append(digest)
+                    if page_no >= len(previous_hashes) or previous_hashes[page_no] != digest:
+                        pack.write(_PAGE_HEADER.pack(page_no))
+                        pack.write(page)
+                        changed += 1
+                    page_no += 1
+            os.replace(os.path.join(self.backup_dir, pack_file + '.tmp'),
+                       os.path.join(self.backup_dir, pack_file))
+
+            generation = {
+                'seq': seq,
+                'created_at': datetime.now().isoformat(),
+                'pack': pack_file,
+                'page_size': page_size,
+                'page_count': len(new_hashes),
+                'changed_pages': changed,
+                'sha256': file_hash.hexdigest(),
+                'pack_size': os.path.getsize(os.path.join(self.backup_dir, pack_file))
+            }
+            self.index['generations'].append(generation)
+            self.index['page_hashes'] = new_hashes
+            self.index['next_seq'] = seq + 1
+            self._compact()
+            self._write_index()
+
+            self.logger.info(f"DB 백업 세대 {seq} 생성: 변경 페이지 {changed}/{len(new_hashes)}, "
+                             f"소요 {time.time() - start:.2f}초")
+            return generation
+
+    def _compact(self):
+        """최대 세대 수 초과 시 가장 오래된 두 세대를 하나의 기준 팩으로 병합"""
+        generations = self.index['generations']
+        while len(generations) > self.max_generations:
+            oldest, second = generations[0], generations[1]
+            merged_file = f"pack_{second['seq']:08d}.base.bin.gz"
+            self._materialize(second['seq'], None, pack_out=merged_file)
+
+            for gen in (oldest, second):
+                try:
+                    os.remove(os.path.join(self.backup_dir, gen['pack']))
+                except FileNotFoundError:
+                    pass
+            second['pack'] = merged_file
+            second['pack_size'] = os.path.getsize(os.path.join(self.backup_dir, merged_file))
+            generations.pop(0)
+
+    # ------------------------------------------------------------------
+    # 복원
+    # ------------------------------------------------------------------
+    def list_generations(self) -> List[Dict[str, Any]]:
+        """모든 세대를 최신순으로 반환"""
+        return list(reversed(self.index['generations']))
+
+    def find_generation(self, seq: Optional[int] = None, at: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """
+        세대 조회
+
+        Args:
+            seq: 세대 번호 (None인 경우 at 또는 최신)
+            at: 이 시각 이전의 마지막 세대 (특정 시점 복원용)
+
+        Returns:
+            Optional[Dict[str, Any]]: 세대 정보
+        """
+        generations = self.index['generations']
+        if seq is not None:
+            return next((g for g in generations if g['seq'] == seq), None)
+        if at is not None:
+            at_iso = at.isoformat()
+            candidates = [g for g in generations if g['created_at'] <= at_iso]
+            return candidates[-1] if candidates else None
+        return generations[-1] if generations else None
+
+    def _materialize(self, seq: int, out_path: Optional[str], pack_out: Optional[str] = None) -> Dict[str, Any]:
+        """
+        세대 seq 시점의 데이터베이스 파일 재구성
+
+        Args:
+            seq: 세대 번호
+            out_path: 재구성한 DB를 기록할 경로 (None이면 기록하지 않음)
+            pack_out: 모든 페이지를 담은 기준 팩으로 기록할 파일 이름
+        """
+        target = self.find_generation(seq=seq)
+        if target is None:
+            raise DatabaseBackupError(f"백업 세대를 찾을 수 없음: {seq}")
+
+        page_size = target['page_size']
+        pages: Dict[int, bytes] = {}
+        for gen in self.index['generations']:
+            if gen['seq'] > seq:
+                break
+            with gzip.open(os.path.join(self.backup_dir, gen['pack']), 'rb') as pack:
+                while True:
+                    header = pack.read(_PAGE_HEADER.size)
+                    if not header:
+                        break
+                    (page_no,) = _PAGE_HEADER.unpack(header)
+                    pages[page_no] = pack.read(page_size)
+
+        file_hash = hashlib.sha256()
+        ordered = []
+        for page_no in range(target['page_count']):
+            page = pages.get(page_no)
+            if page is None or len(page) != page_size:
+                raise DatabaseBackupError(f"세대 {seq} 재구성 실패: 페이지 {page_no} 누락")
+            file_hash.update(page)
+            ordered.append(page)
+        if file_hash.hexdigest() != target['sha256']:
+            raise DatabaseBackupError(f"세대 {seq} 재구성 결과 해시 불일치")
+
+        if out_path is not None:
+            with open(out_path, 'wb') as f:
+                for page in ordered:
+                    f.write(page)
+        if pack_out is not None:
+            tmp_path = os.path.join(self.backup_dir, pack_out + '.tmp')
+            with gzip.open(tmp_path, 'wb', compresslevel=6) as pack:
+                for page_no, page in enumerate(ordered):
+                    pack.write(_PAGE_HEADER.pack(page_no))
+                    pack.write(page)
+            os.replace(tmp_path, os.path.join(self.backup_dir, pack_out))
+        return target
+
+    def export_generation(self, out_path: str, seq: Optional[int] = None,
+                          at: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        세대를 독립된 SQLite 파일로 내보내기 (무결성 검사 포함)
+
+        Args:
+            out_path: 출력 파일 경로
+            seq: 세대 번호
+            at: 이 시각 이전의 마지막 세대
+
+        Returns:
+            Dict[str, Any]: 내보낸 세대 정보
+        """
+        generation = self.find_generation(seq=seq, at=at)
+        if generation is None:
+            raise DatabaseBackupError("복원할 백업 세대가 없습니다")
+        self._materialize(generation['seq'], out_path)
+        if not self._integrity_check(out_path):
+            raise DatabaseBackupError(f"세대 {generation['seq']} 무결성 검사 실패")
+        return generation
+
+    def restore(self, seq: Optional[int] = None, at: Optional[datetime] = None,
+                target_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        세대를 운영 중인 데이터베이스로 복원
+
+        재구성한 파일을 검증한 뒤 온라인 백업 API로 대상 DB에 페이지 단위로 덮어씁니다.
+
+        Args:
+            seq: 세대 번호
+            at: 이 시각 이전의 마지막 세대 (특정 시점 복원)
+            target_path: 복원 대상 DB 경로 (None인 경우 원본 DB)
+
+        Returns:
+            Dict[str, Any]: 복원된 세대 정보
+        """
+        with self._lock:
+            target_path = target_path or self.db_path
+            staging = os.path.join(self.backup_dir, 'restore_staging.sqlite')
+            try:
+                generation = self.export_generation(staging, seq=seq, at=at)
+                self._copy_online(staging, target_path)
+            finally:
+                if os.path.exists(staging):
+                    os.remove(staging)
+
+            self.logger.info(f"DB 백업 세대 {generation['seq']} 복원 완료 ({generation['created_at']})")
+            return generation
@@ -16,6 +16,7 @@ from pathlib import Path
 from src.db_connection_manager import get_db_connection
 from contextlib import contextmanager
 from src.models.position import Position
+from src import performance_stats
 
 
 class DatabaseManager:
@@ -180,6 +181,15 @@ class DatabaseManager:
             )
             ''')
             
+            # 거래소에서 동기화한 거래의 거래소 거래 ID (중복 저장 방지)
+            cursor.execute("PRAGMA table_info(trades)")
+            if 'exchange_trade_id' not in [column[1] for column in cursor.fetchall()]:
+                cursor.execute('ALTER TABLE trades ADD COLUMN exchange_trade_id TEXT')
+                self.logger.info("trades 테이블에 exchange_trade_id 컬럼 추가")
+            cursor.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_trades_exchange_trade_id ON trades (exchange_trade_id)
+            ''')
+            
             # 설정 저장 테이블
             cursor.execute('''
             CREATE TABLE IF NOT EXISTS settings (
@@ -272,6 +282,14 @@ class DatabaseManager:
             )
             ''')
             
+            # 성과 통계 집계 테이블 (거래/청산 기록 시 증분 갱신)
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'performance_stats'")
+            stats_exists = cursor.fetchone() is not None
+            cursor.execute(performance_stats.CREATE_TABLE_SQL)
+            if not stats_exists:
+                # 기존 데이터베이스에 처음 추가되는 경우 기존 기록으로 채움
+                performance_stats.rebuild(cursor)
+            
             conn.commit()
             self.logger.debug("데이터베이스 테이블 생성 완료")
         except sqlite3.Error as e:
@@ -583,8 +601,9 @@ class DatabaseManager:
                 converted_position[new_key] = value
             
             # 필수 필드 추가 및 변환
-            # opened_at 필드가 없으면 현재 시간 추가
-            if 'opened_at' not in converted_position:
+            # opened_at 필드가 없으면 현재 시간 추가 (기존 포지션 갱신 시에는 저장된 값 유지)
+            opened_at_defaulted = 'opened_at' not in converted_position
+            if opened_at_defaulted:
                 converted_position['opened_at'] = datetime.now().isoformat()
             
             # status 필드가 없으면 'open' 추가
@@ -649,13 +668,16 @@ class DatabaseManager:
             existing = cursor.fetchone()
             
             if existing:
-                # 기존 포지션 업데이트 (id 필드 제외)
-                update_data = {k: v for k, v in converted_position.items() if k != 'id'}
+                # 기존 포지션 업데이트 (id 필드와 기본값으로 채운 opened_at 제외)
+                update_data = {k: v for k, v in converted_position.items()
+                               if k != 'id' and not (k == 'opened_at' and opened_at_defaulted)}
                 update_fields = [f"{k} = ?" for k in update_data.keys()]
                 query = f"UPDATE positions SET {', '.join(update_fields)} WHERE id = ?"
                 values = list(update_data.values()) + [existing[0]]
                 cursor.execute(query, values)
                 position_id = existing[0]
+                if converted_position.get('status') == 'closed':
+                    performance_stats.apply_closed_position(cursor, position_id)
             else:
                 # 새 포지션 삽입 (id 필드 제외)
                 # SQLite의 INTEGER PRIMARY KEY는 자동 생성되므로 id 필드 제거
@@ -666,6 +688,8 @@ class DatabaseManager:
                 values = [insert_data[k] for k in fields]
                 cursor.execute(query, values)
                 position_id = cursor.lastrowid
+                if converted_position.get('status') == 'closed':
+                    performance_stats.apply_closed_position(cursor, position_id)
         
             conn.commit()
             return position_id
@@ -771,6 +795,9 @@ class DatabaseManager:
                 values = [converted_position[k] for k in fields]
                 cursor.execute(query, values)
             
+            # 포지션 전체를 교체했으므로 청산 포지션 집계도 다시 계산
+            performance_stats.rebuild(cursor, [performance_stats.SOURCE_POSITION])
+            
             conn.commit()
             self.logger.info(f"{len(positions)}개의 포지션을 저장했습니다.")
             return True
@@ -803,6 +830,13 @@ class DatabaseManager:
             if 'additional_info' in update_data and isinstance(update_data['additional_info'], dict):
                 update_data['additional_info'] = json.dumps(update_data['additional_info'])
             
+            # 청산으로 바뀌는지 확인 (성과 통계는 청산 시 한 번만 반영)
+            closing = False
+            if update_data.get('status') == 'closed':
+                cursor.execute("SELECT status FROM positions WHERE id = ?", (position_id,))
+                row = cursor.fetchone()
+                closing = row is not None and row[0] != 'closed'
+            
             # 업데이트 쿼리 구성
             set_clause = ', '.join([f"{key} = ?" for key in update_data.keys()])
             values = list(update_data.values())
@@ -810,9 +844,11 @@ class DatabaseManager:
             
             query = f"UPDATE positions SET {set_clause} WHERE id = ?"
             cursor.execute(query, values)
+            affected_rows = cursor.rowcount
+            if closing and affected_rows > 0:
+                performance_stats.apply_closed_position(cursor, position_id)
             conn.commit()
             
-            affected_rows = cursor.rowcount
             if affected_rows > 0:
                 self.logger.info(f"포지션 업데이트 완료 (ID: {position_id})")
                 return True
@@ -826,6 +862,42 @@ class DatabaseManager:
             conn.rollback()
             return False
     
+    def reduce_position(self, position_id, amount, price=None, closed_at=None):
+        """
+        청산 체결 수량만큼 열린 포지션 축소 (남는 수량이 없으면 종료)
+
+        Args:
+            position_id (int): 포지션 ID
+            amount (float): 청산된 수량
+            price (float, optional): 청산 체결가 (전체 청산 시 실현 손익 계산용)
+            closed_at (str, optional): 청산 시각 (None이면 현재 시각)
+
+        Returns:
+            bool: 반영 성공 여부 (열린 포지션이 없으면 False)
+        """
+        try:
+            conn, cursor = self._get_connection()
+            cursor.execute("SELECT contracts, entry_price, side FROM positions WHERE id = ? AND status = 'open'",
+                           (position_id,))
+            row = cursor.fetchone()
+        except sqlite3.Error as e:
+            self.logger.error(f"포지션 조회 오류: {e}")
+            return False
+        if row is None:
+            self.logger.warning(f"청산 반영 실패 - 열린 포지션 없음: {position_id}")
+            return False
+
+        contracts, entry_price, side = float(row[0] or 0), float(row[1] or 0), (row[2] or '').lower()
+        remaining = contracts - float(amount)
+        if remaining > contracts * 1e-9:
+            return self.update_position(position_id, {'contracts': remaining})
+
+        update = {'status': 'closed', 'closed_at': closed_at or datetime.now().isoformat()}
+        if price:
+            direction = -1 if side in ('short', 'sell') else 1
+            update['pnl'] = (float(price) - entry_price) * contracts * direction
+        return self.update_position(position_id, update)
+
     def get_open_positions(self, symbol=None):
         """
         열린 포지션 가져오기
@@ -1046,9 +1118,12 @@ class DatabaseManager:
 
             query = f"INSERT INTO trades ({columns}) VALUES ({placeholders})"
             cursor.execute(query, values)
+            trade_id = cursor.lastrowid
+
+            # 같은 트랜잭션에서 성과 통계 갱신
+            performance_stats.apply_trade(cursor, trade_data)
             conn.commit()
 
-            trade_id = cursor.lastrowid
             self.logger.info(f"거래 내역 저장 완료 (ID: {trade_id})")
             return trade_id
             
@@ -1058,6 +1133,58 @@ class DatabaseManager:
                 conn.rollback()
             return None
     
+    def save_exchange_trade(self, trade):
+        """
+        거래소에서 조회한 거래 저장 (거래소 거래 ID가 이미 있으면 저장하지 않음)
+
+        Args:
+            trade (dict): ExchangeAPI.get_my_trades 형식의 거래 (id, order_id, side, price, amount, fee 등)
+
+        Returns:
+            int: 새로 저장한 거래 ID (이미 저장된 거래이거나 오류 시 None)
+        """
+        trade_id = trade.get('id')
+        if trade_id is None:
+            trade_id = (trade.get('order_id'), trade.get('timestamp'), trade.get('price'), trade.get('amount'))
+        price = float(trade.get('price') or 0)
+        amount = float(trade.get('amount') or 0)
+        fee = trade.get('fee')
+        timestamp = trade.get('datetime') or trade.get('timestamp') or datetime.now().isoformat()
+        row = {
+            'symbol': trade.get('symbol'),
+            'side': trade.get('side'),
+            'order_type': trade.get('type') or 'market',
+            'amount': amount,
+            'price': price,
+            'cost': float(trade.get('cost') or price * amount),
+            'fee': float((fee.get('cost') if isinstance(fee, dict) else fee) or 0),
+            'timestamp': timestamp,
+            'exchange_trade_id': str(trade_id),
+            'additional_info': json.dumps({
+                'order_id': trade.get('order_id'), 'market_type': trade.get('market_type'),
+                'fee_currency': fee.get('currency') if isinstance(fee, dict) else None, 'source': 'exchange'
+            })
+        }
+        conn = None
+        try:
+            conn, cursor = self._get_connection()
+            columns = ', '.join(row.keys())
+            placeholders = ', '.join(['?'] * len(row))
+            cursor.execute(f"INSERT OR IGNORE INTO trades ({columns}) VALUES ({placeholders})", list(row.values()))
+            if cursor.rowcount == 0:
+                conn.commit()
+                return None
+            saved_id = cursor.lastrowid
+            performance_stats.apply_trade(cursor, row)
+            conn.commit()
+            self.logger.info(f"거래소 거래 저장 완료 (ID: {saved_id}, 거래소 거래 ID: {row['exchange_trade_id']})")
+            return saved_id
+        except sqlite3.Error as e:
+            self.logger.error(f"거래소 거래 저장 오류: {e}")
+            if conn:
+                conn.rollback()
+            return None
+    
     def get_trades(self, symbol=None, limit=50, offset=0):
         """
         거래 내역 가져오기
@@ -1215,6 +1342,9 @@ class DatabaseManager:
         """
         거래 성과 통계 로드 (API용)
         
+        거래 기록 시 갱신되는 performance_stats 집계 행만 읽으므로
+        거래 수와 관계없이 일정한 비용으로 조회됩니다.
+        
         Returns:
             dict: 성과 통계 정보
         """
@@ -1222,41 +1352,13 @@ class DatabaseManager:
             # 스레드 안전 연결 가져오기
             conn, cursor = self._get_connection()
             
-            # 모든 거래 내역 가져오기
-            cursor.execute("SELECT * FROM trades")
-            trades = cursor.fetchall()
-            
-            # 통계 계산
-            total_profit = 0
-            win_count = 0
-            loss_count = 0
-            total_count = len(trades)
-            
-            for trade in trades:
-                # trades 테이블에서 수익 계산
-                # 거래 내역에서 side에 따라 매수/매도 구분
-                side = trade['side']
-                price = trade['price']
-                amount = trade['amount']
-                cost = trade['cost']
-                
-                # 추가 정보에서 수익 정보 확인 시도
-                additional_info = {}
-                if trade['additional_info']:
-                    try:
-                        additional_info = json.loads(trade['additional_info'])
-                    except:
-                        pass
-                
-                # 직접 제공된 수익 정보가 있으면 사용
-                profit = additional_info.get('profit', 0)
-                
-                if profit > 0:
-                    win_count += 1
-                    total_profit += profit
-                elif profit < 0:
-                    loss_count += 1
-                    total_profit += profit
+            rows = performance_stats.fetch(cursor, performance_stats.SOURCE_TRADE,
+                                           performance_stats.SCOPE_ALL, '')
+            stats = rows[0] if rows else None
+            total_count = stats['trade_count'] if stats else 0
+            win_count = stats['win_count'] if stats else 0
+            loss_count = stats['loss_count'] if stats else 0
+            total_profit = stats['net_profit'] if stats else 0
             
             # 승률 계산
             win_rate = (win_count / total_count * 100) if total_count > 0 else 0
@@ -1282,6 +1384,63 @@ class DatabaseManager:
                 'loss_trades': 0
             }
     
+    def get_performance_stats(self, source=performance_stats.SOURCE_TRADE, scope=performance_stats.SCOPE_ALL):
+        """
+        심볼/전략/일별 성과 집계 조회
+        
+        Args:
+            source (str): 'trade' (거래 기록) 또는 'position' (청산 포지션)
+            scope (str): 'all', 'symbol', 'strategy', 'day'
+        
+        Returns:
+            list: 집계 행 목록 (건수, 승/패, 총이익/손실, 누적 손익, 최대 낙폭, 승률 등)
+        """
+        try:
+            conn, cursor = self._get_connection()
+            try:
+                return performance_stats.fetch(cursor, source, scope)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            self.logger.error(f"성과 집계 조회 오류 (source={source}, scope={scope}): {e}")
+            return []
+    
+    def rebuild_performance_stats(self):
+        """
+        성과 집계 테이블을 거래/포지션 기록으로 다시 계산
+        
+        Returns:
+            int: 기록한 집계 행 수 (오류 시 None)
+        """
+        conn, cursor = self._get_connection()
+        try:
+            count = performance_stats.rebuild(cursor)
+            conn.commit()
+            self.logger.info(f"성과 집계 재계산 완료: {count}행")
+            return count
+        except sqlite3.Error as e:
+            self.logger.error(f"성과 집계 재계산 오류: {e}")
+            conn.rollback()
+            return None
+        finally:
+            conn.close()
+    
+    def verify_performance_stats(self):
+        """
+        성과 집계 테이블과 원본 기록으로 다시 계산한 값 비교
+        
+        Returns:
+            list: 어긋난 항목 목록 (일치하면 빈 리스트, 오류 시 None)
+        """
+        conn, cursor = self._get_connection()
+        try:
+            return performance_stats.verify(cursor)
+        except sqlite3.Error as e:
+            self.logger.error(f"성과 집계 검증 오류: {e}")
+            return None
+        finally:
+            conn.close()
+    
     def save_setting(self, key, value):
         """
         설정 저장
@@ -1426,7 +1585,39 @@ class DatabaseManager:
             self.logger.error(f"주문 데이터 저장 오류: {str(e)}")
             conn.rollback()
             return False
-    
+
+    def upsert_order(self, order):
+        """
+        주문 하나의 상태 변경 저장 (없으면 추가, 있으면 상태/수량/정보 갱신)
+
+        Args:
+            order (dict): 주문 데이터 (id, symbol, side, price, amount, status, type, datetime, additional_info)
+
+        Returns:
+            bool: 성공 여부
+        """
+        conn, cursor = self._get_connection()
+        try:
+            cursor.execute("""
+                INSERT INTO orders
+                (order_id, symbol, side, price, amount, status, type, timestamp, additional_info)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(order_id) DO UPDATE SET
+                    price = excluded.price, amount = excluded.amount, status = excluded.status,
+                    type = excluded.type, timestamp = excluded.timestamp, additional_info = excluded.additional_info
+            """, (
+                str(order.get('id', '')), order.get('symbol', ''), order.get('side', ''),
+                order.get('price') or 0, order.get('amount') or 0, order.get('status', 'open'),
+                order.get('type', 'limit'), order.get('datetime') or datetime.now().isoformat(),
+                json.dumps(order.get('additional_info', {}))
+            ))
+            conn.commit()
+            return True
+        except Exception as e:
+            self.logger.error(f"주문 상태 저장 오류: {str(e)}")
+            conn.rollback()
+            return False
+
     def save_balances(self, balance_data):
         """
         전체 계좌 잔액 정보 저장
@@ -1485,6 +1676,99 @@ class DatabaseManager:
             conn.rollback()
             return False
     
+    def load_balance_rows(self):
+        """
+        저장된 계좌 잔액 행 조회 (변경분 비교용)
+        
+        Returns:
+            dict: {(balance_type, currency): (amount, free)}
+        """
+        try:
+            conn, cursor = self._get_connection()
+            cursor.execute("SELECT currency, amount, balance_type, additional_info FROM balances")
+            rows = {}
+            for row in cursor.fetchall():
+                try:
+                    info = json.loads(row['additional_info']) if row['additional_info'] else {}
+                except json.JSONDecodeError:
+                    info = {}
+                rows[(row['balance_type'], row['currency'])] = (float(row['amount']), float(info.get('free') or 0))
+            conn.close()
+            return rows
+        except sqlite3.Error as e:
+            self.logger.error(f"계좌 잔액 행 조회 오류: {e}")
+            return {}
+    
+    def apply_balance_changes(self, changed, removed=None):
+        """
+        바뀐 계좌 잔액 행만 갱신
+        
+        Args:
+            changed (dict): {(balance_type, currency): (amount, free)} 갱신할 행
+            removed (list, optional): [(balance_type, currency)] 삭제할 행
+        
+        Returns:
+            bool: 저장 성공 여부
+        """
+        conn, cursor = self._get_connection()
+        try:
+            now = datetime.now().isoformat()
+            for (balance_type, currency), (amount, free) in changed.items():
+                cursor.execute("""
+                    INSERT INTO balances (currency, amount, balance_type, timestamp, additional_info)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(currency, balance_type) DO UPDATE SET
+                        amount = excluded.amount,
+                        timestamp = excluded.timestamp,
+                        additional_info = excluded.additional_info
+                """, (currency, amount, balance_type, now, json.dumps({"free": free})))
+            for balance_type, currency in removed or []:
+                cursor.execute("DELETE FROM balances WHERE currency = ? AND balance_type = ?",
+                               (currency, balance_type))
+            conn.commit()
+            return True
+        except Exception as e:
+            self.logger.error(f"계좌 잔액 변경분 저장 오류: {str(e)}")
+            conn.rollback()
+            return False
+        finally:
+            conn.close()
+    
+    def close_positions(self, keys):
+        """
+        거래소에서 사라진 열린 포지션을 종료 상태로 변경
+        
+        Args:
+            keys (list): [(symbol, side)] 종료할 포지션 목록
+        
+        Returns:
+            int: 종료 처리된 행 수 (오류 시 False)
+        """
+        conn, cursor = self._get_connection()
+        try:
+            now = datetime.now().isoformat()
+            count = 0
+            for symbol, side in keys:
+                cursor.execute("""
+                    SELECT id FROM positions WHERE symbol = ? AND LOWER(side) = ? AND status = 'open'
+                """, (symbol, side))
+                position_ids = [row[0] for row in cursor.fetchall()]
+                cursor.execute("""
+                    UPDATE positions SET status = 'closed', closed_at = ?
+                    WHERE symbol = ? AND LOWER(side) = ? AND status = 'open'
+                """, (now, symbol, side))
+                count += cursor.rowcount
+                for position_id in position_ids:
+                    performance_stats.apply_closed_position(cursor, position_id)
+            conn.commit()
+            return count
+        except Exception as e:
+            self.logger.error(f"포지션 종료 처리 오류: {str(e)}")
+            conn.rollback()
+            return False
+        finally:
+            conn.close()
+    
     def save_balance(self, currency, amount, additional_info=None):
         """
         잔액 정보 저장
@@ -1931,6 +2215,9 @@ class DatabaseManager:
                 values = [converted_position[k] for k in fields]
                 cursor.execute(query, values)
             
+            # 포지션 전체를 교체했으므로 청산 포지션 집계도 다시 계산
+            performance_stats.rebuild(cursor, [performance_stats.SOURCE_POSITION])
+            
             conn.commit()
             self.logger.info(f"{len(positions)}개의 포지션을 저장했습니다.")
             return True
@@ -15,6 +15,7 @@ from collections import deque, defaultdict
 
 # 로거는 지연 가져오기로 순환 참조 방지
 from src.logging_config import get_logger, error_logger
+from src.journal import open_journal
 
 # 레이트 리미트 관리 클래스
 class RateLimitManager:
@@ -142,7 +143,16 @@ rate_limit_manager = RateLimitManager()
 
 # 오류 로깅 및 분석 클래스
 class ErrorAnalyzer:
-    """오류 로깅 및 분석 클래스"""
+    """
+    오류 로깅 및 분석 클래스
+    
+    오류 1건마다 error_journal.jsonl 에 한 줄을 덧붙이고, 분석에 쓰는 집계(유형별 횟수,
+    반복 오류의 최근 발생 간격)는 메모리에서 증분 갱신합니다. 시작 시 저널을 재생해
+    집계를 복원하므로 로테이션으로 밀려난 기록은 집계에서 빠집니다.
+    """
+    
+    # 반복 오류별로 보관할 최근 발생 간격 수 (_analyze_error 는 최근 5개만 사용)
+    RECENT_INTERVALS = 5
     
     def __init__(self, log_dir=None):
         """
@@ -153,25 +163,26 @@ class ErrorAnalyzer:
         """
         self.logger = get_logger('error_analyzer')
         self.error_counts = {}
-        self.error_history = []
+        self.error_history = deque(maxlen=1000)
         self.recurring_errors = {}
         self.critical_errors = set()
         
         # 로그 디렉토리 설정
         if log_dir is None:
-            import os
             from src.config import DATA_DIR
             log_dir = os.path.join(DATA_DIR, 'error_logs')
         
         os.makedirs(log_dir, exist_ok=True)
         self.log_dir = log_dir
+        # 이전 버전의 전체 통계 파일 (읽기 전용, 집계 기준값)
         self.error_log_path = os.path.join(log_dir, 'error_analysis.json')
+        self.journal = open_journal(log_dir, 'error_journal', max_bytes=2 * 1024 * 1024)
         
         # 기존 로그 로드
         self._load_error_log()
     
     def _load_error_log(self):
-        """기존 오류 로그 파일 로드"""
+        """이전 통계 파일을 기준값으로 읽은 뒤 오류 저널을 재생해 집계 복원"""
         try:
             if os.path.exists(self.error_log_path):
                 with open(self.error_log_path, 'r') as f:
@@ -179,79 +190,88 @@ class ErrorAnalyzer:
                     self.error_counts = data.get('error_counts', {})
                     self.recurring_errors = data.get('recurring_errors', {})
                     self.critical_errors = set(data.get('critical_errors', []))
+                for error_data in self.recurring_errors.values():
+                    error_data['intervals'] = deque(error_data.get('intervals', []), maxlen=self.RECENT_INTERVALS)
         except Exception as e:
             self.logger.error(f"오류 로그 로드 실패: {e}")
-    
-    def _save_error_log(self):
-        """현재 오류 통계 저장"""
+        
         try:
-            data = {
-                'error_counts': self.error_counts,
-                'recurring_errors': self.recurring_errors,
-                'critical_errors': list(self.critical_errors),
-                'last_updated': datetime.now().isoformat()
-            }
-            
-            with open(self.error_log_path, 'w') as f:
-                json.dump(data, f, indent=2)
+            for error_info in self.journal.replay():
+                self._apply_error(error_info)
         except Exception as e:
-            self.logger.error(f"오류 로그 저장 실패: {e}")
+            self.logger.error(f"오류 저널 재생 실패: {e}")
     
-    def log_error(self, error_type, error_message, context=None, is_critical=False):
+    def _save_error_log(self):
+        """버퍼에 쌓인 오류 기록을 저널에 씀 (평소에는 공용 flush 작업이 처리)"""
+        self.journal.flush()
+    
+    def _apply_error(self, error_info):
         """
-        오류 로깅 및 분석
+        오류 1건을 집계에 반영
         
         Args:
-            error_type (str): 오류 유형
-            error_message (str): 오류 메시지
-            context (dict, optional): 오류 발생 컨텍스트 정보
-            is_critical (bool): 치명적 오류 여부
+            error_info (dict): type, message, timestamp, context, critical
             
         Returns:
-            dict: 오류 분석 결과
+            str: 반복 오류 키
         """
-        current_time = datetime.now()
-        
-        # 오류 정보 구성
-        error_info = {
-            'type': error_type,
-            'message': error_message,
-            'timestamp': current_time.isoformat(),
-            'context': context or {}
-        }
+        error_type = error_info['type']
+        current_time = datetime.fromisoformat(error_info['timestamp'])
         
         # 오류 기록
         self.error_history.append(error_info)
         
         # 오류 발생 횟수 증가
-        if error_type not in self.error_counts:
-            self.error_counts[error_type] = 0
-        self.error_counts[error_type] += 1
+        self.error_counts[error_type] = self.error_counts.get(error_type, 0) + 1
         
         # 반복 오류 탐지
-        error_key = f"{error_type}:{error_message}"
-        if error_key not in self.recurring_errors:
-            self.recurring_errors[error_key] = {
+        error_key = f"{error_type}:{error_info['message']}"
+        error_data = self.recurring_errors.get(error_key)
+        if error_data is None:
+            error_data = self.recurring_errors[error_key] = {
                 'count': 0,
-                'first_seen': current_time.isoformat(),
-                'last_seen': current_time.isoformat(),
-                'intervals': []
+                'first_seen': error_info['timestamp'],
+                'last_seen': error_info['timestamp'],
+                'intervals': deque(maxlen=self.RECENT_INTERVALS)
             }
         else:
-            last_seen = datetime.fromisoformat(self.recurring_errors[error_key]['last_seen'])
-            interval = (current_time - last_seen).total_seconds()
-            self.recurring_errors[error_key]['intervals'].append(interval)
-            self.recurring_errors[error_key]['last_seen'] = current_time.isoformat()
+            last_seen = datetime.fromisoformat(error_data['last_seen'])
+            error_data['intervals'].append((current_time - last_seen).total_seconds())
+            error_data['last_seen'] = error_info['timestamp']
         
-        self.recurring_errors[error_key]['count'] += 1
+        error_data['count'] += 1
         
         # 치명적 오류 기록
-        if is_critical:
+        if error_info.get('critical'):
             self.critical_errors.add(error_key)
         
-        # 주기적 저장 (10번째 오류마다)
-        if sum(self.error_counts.values()) % 10 == 0:
-            self._save_error_log()
+        return error_key
+    
+    def log_error(self, error_type, error_message, context=None, is_critical=False):
+        """
+        오류 로깅 및 분석
+        
+        Args:
+            error_type (str): 오류 유형
+            error_message (str): 오류 메시지
+            context (dict, optional): 오류 발생 컨텍스트 정보
+            is_critical (bool): 치명적 오류 여부
+            
+        Returns:
+            dict: 오류 분석 결과
+        """
+        # 오류 정보 구성
+        error_info = {
+            'type': error_type,
+            'message': error_message,
+            'timestamp': datetime.now().isoformat(),
+            'context': context or {},
+            'critical': bool(is_critical)
+        }
+        
+        # 집계 갱신 후 저널에 추가 (파일 쓰기는 버퍼링)
+        error_key = self._apply_error(error_info)
+        self.journal.append(error_info)
         
         # 오류 분석
         analysis_result = self._analyze_error(error_key)
@@ -275,7 +295,7 @@ class ErrorAnalyzer:
         
         # 반복 오류 분석
         count = error_data['count']
-        intervals = error_data.get('intervals', [])
+        intervals = list(error_data.get('intervals', []))
         
         # 오류 패턴 분석
         is_recurring = count >= 3
@@ -2,9 +2,13 @@
 # 암호화폐 자동 매매 봇 - 이벤트 관리자 모듈
 
 import time
+import queue
+import atexit
+import itertools
 import threading
 import logging
-from typing import Dict, Any, List, Callable, Optional
+from collections import deque
+from typing import Dict, Any, Iterable, List, Callable, Optional
 from enum import Enum, auto
 
 from src.logging_config import get_logger
@@ -37,17 +41,43 @@ class EventType(Enum):
     NETWORK_ERROR = auto()
     DATABASE_ERROR = auto()
     TRADING_ERROR = auto()  # 거래 오류 이벤트 추가
+    BOT_STATUS_CHANGED = auto()  # 봇 실행 상태 변경
     
     # 백업 이벤트
     BACKUP_CREATED = auto()
     BACKUP_RESTORED = auto()
 
+# 구독자 디스패치 모드
+DISPATCH_SYNC = 'sync'    # 발행 스레드에서 즉시 호출
+DISPATCH_ASYNC = 'async'  # 워커 풀에서 비동기 호출
+
+# 프로세스 종료 시 비동기 큐에 남은 이벤트를 처리할 최대 대기 시간 (초)
+EXIT_FLUSH_TIMEOUT = 10.0
+
+# 비동기 큐가 가득 찼을 때의 처리 정책
+BACKPRESSURE_BLOCK = 'block'              # 큐에 자리가 날 때까지 대기 (타임아웃 후 드롭)
+BACKPRESSURE_DROP_NEWEST = 'drop_newest'  # 새 이벤트를 버림
+BACKPRESSURE_DROP_OLDEST = 'drop_oldest'  # 가장 오래된 이벤트를 버리고 새 이벤트 추가
+BACKPRESSURE_CALLER_RUNS = 'caller_runs'  # 발행 스레드에서 직접 처리
+
+# 잃으면 안 되는 이벤트 (드롭 정책이어도 'block' 으로 대기하고, drop_oldest 로 밀려나면 발행 스레드에서 처리)
+CRITICAL_EVENT_TYPES = frozenset({
+    EventType.TRADE_EXECUTED, EventType.ORDER_CREATED, EventType.ORDER_FILLED, EventType.ORDER_CANCELED,
+    EventType.POSITION_OPENED, EventType.POSITION_CLOSED,
+    EventType.STOP_LOSS_TRIGGERED, EventType.TAKE_PROFIT_TRIGGERED,
+    EventType.SYSTEM_SHUTDOWN,
+})
+
 class EventManager:
     """
     이벤트 관리 시스템
     
     거래 알고리즘 내 다양한 컴포넌트 간의 이벤트 기반 통신을 관리합니다.
     구독자 패턴(Observer Pattern)을 구현하여 느슨한 결합(Loose Coupling)을 유지합니다.
+    
+    비동기 모드로 등록된 구독자는 제한된 크기의 큐와 워커 풀을 통해 호출되므로
+    발행 스레드(주문 경로 등)는 디스크 I/O 같은 느린 핸들러를 기다리지 않습니다.
+    각 구독자는 항상 같은 워커에 배정되어 구독자별 이벤트 순서가 보장됩니다.
     """
     
     _instance = None
@@ -68,25 +98,97 @@ class EventManager:
             
         self.logger = get_logger('event_manager')
         self.subscribers = {}  # event_type -> [callbacks]
-        self.event_history = []  # 최근 이벤트 기록
+        self.dispatch_modes = {}  # (event_type, callback) -> 디스패치 모드
         self.max_history = 100  # 최대 이벤트 기록 수
+        self.event_history = deque(maxlen=self.max_history)  # 최근 이벤트 기록 (링 버퍼)
+        self._history_lock = threading.Lock()
+        
+        # 비동기 디스패치 설정
+        self.default_dispatch = DISPATCH_SYNC
+        self.async_workers = 2
+        self.async_queue_size = 1000
+        self.backpressure_policy = BACKPRESSURE_DROP_OLDEST
+        self.block_timeout = 1.0
+        self.critical_event_types = set(CRITICAL_EVENT_TYPES)
+        self._worker_queues: List[queue.Queue] = []
+        self._worker_threads: List[threading.Thread] = []
+        self._worker_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._dispatch_stats = {
+            'dispatched': 0,
+            'processed': 0,
+            'dropped': 0,
+            'caller_runs': 0,
+            'errors': 0
+        }
+        self._dropped_by_type: Dict[str, int] = {}
+        
+        # 워커는 데몬 스레드이므로 종료 시 대기 중인 이벤트(백업 등)를 먼저 처리
+        atexit.register(self._flush_at_exit)
+        
         self._initialized = True
         self.logger.info("이벤트 관리자 초기화 완료")
     
-    def subscribe(self, event_type: EventType, callback: Callable) -> None:
+    def configure_async(self, workers: int = 2, queue_size: int = 1000,
+                        backpressure: str = BACKPRESSURE_DROP_OLDEST,
+                        block_timeout: float = 1.0,
+                        default_dispatch: Optional[str] = None,
+                        critical_event_types: Optional[Iterable[EventType]] = None) -> None:
+        """
+        비동기 디스패치 설정
+        
+        워커가 이미 실행 중이면 남은 이벤트를 처리한 뒤 새 설정으로 재시작합니다.
+        
+        Args:
+            workers: 워커 스레드 수
+            queue_size: 워커별 큐 최대 크기
+            backpressure: 큐가 가득 찼을 때의 정책 (BACKPRESSURE_* 상수)
+            block_timeout: 'block' 정책에서 최대 대기 시간 (초)
+            default_dispatch: 모드를 지정하지 않은 구독자의 기본 디스패치 모드
+            critical_event_types: 드롭 정책에서도 'block' 으로 처리할 이벤트 유형
+                (None인 경우 현재 설정 유지, 기본값은 CRITICAL_EVENT_TYPES)
+        """
+        if backpressure not in (BACKPRESSURE_BLOCK, BACKPRESSURE_DROP_NEWEST,
+                                BACKPRESSURE_DROP_OLDEST, BACKPRESSURE_CALLER_RUNS):
+            raise ValueError(f"알 수 없는 백프레셔 정책: {backpressure}")
+        if default_dispatch not in (None, DISPATCH_SYNC, DISPATCH_ASYNC):
+            raise ValueError(f"알 수 없는 디스패치 모드: {default_dispatch}")
+        
+        self.shutdown_async()
+        self.async_workers = max(1, int(workers))
+        self.async_queue_size = max(1, int(queue_size))
+        self.backpressure_policy = backpressure
+        self.block_timeout = block_timeout
+        if default_dispatch is not None:
+            self.default_dispatch = default_dispatch
+        if critical_event_types is not None:
+            self.critical_event_types = set(critical_event_types)
+        self.logger.info(f"비동기 디스패치 설정: 워커 {self.async_workers}개, 큐 {self.async_queue_size}, "
+                         f"정책 {self.backpressure_policy}")
+    
+    def subscribe(self, event_type: EventType, callback: Callable, dispatch: Optional[str] = None) -> None:
         """
         특정 이벤트 유형에 콜백 함수 등록
         
         Args:
             event_type: 구독할 이벤트 유형
             callback: 이벤트 발생 시 호출할 콜백 함수
+            dispatch: 디스패치 모드 ('sync' 또는 'async', None인 경우 기본 모드)
         """
+        if dispatch not in (None, DISPATCH_SYNC, DISPATCH_ASYNC):
+            raise ValueError(f"알 수 없는 디스패치 모드: {dispatch}")
+        
         if event_type not in self.subscribers:
             self.subscribers[event_type] = []
         
         if callback not in self.subscribers[event_type]:
             self.subscribers[event_type].append(callback)
             self.logger.debug(f"{event_type.name} 이벤트에 콜백 등록됨")
+        
+        if dispatch is None:
+            self.dispatch_modes.pop((event_type, callback), None)
+        else:
+            self.dispatch_modes[(event_type, callback)] = dispatch
     
     def unsubscribe(self, event_type: EventType, callback: Callable) -> None:
         """
@@ -98,6 +200,7 @@ class EventManager:
         """
         if event_type in self.subscribers and callback in self.subscribers[event_type]:
             self.subscribers[event_type].remove(callback)
+            self.dispatch_modes.pop((event_type, callback), None)
             self.logger.debug(f"{event_type.name} 이벤트에서 콜백 제거됨")
     
     def publish(self, event_type: EventType, data: Optional[Dict[str, Any]] = None) -> None:
@@ -119,14 +222,197 @@ class EventManager:
         self._add_to_history(event_type, data)
         
         # 구독자들에게 알림
-        if event_type in self.subscribers:
-            for callback in self.subscribers[event_type]:
+        for callback in list(self.subscribers.get(event_type, ())):
+            mode = self.dispatch_modes.get((event_type, callback), self.default_dispatch)
+            if mode == DISPATCH_ASYNC:
+                self._enqueue(event_type, callback, data)
+            else:
+                self._invoke(event_type, callback, data)
+        
+        self.logger.debug("%s 이벤트 발행됨", event_type.name)
+    
+    def _invoke(self, event_type: EventType, callback: Callable, data: Dict[str, Any]) -> None:
+        """
+        콜백 호출 (예외는 기록만 하고 전파하지 않음)
+        
+        Args:
+            event_type: 이벤트 유형
+            callback: 호출할 콜백 함수
+            data: 이벤트 데이터
+        """
+        try:
+            callback(data)
+        except Exception as e:
+            self._count('errors')
+            self.logger.error(f"{event_type.name} 이벤트 처리 중 오류: {e}")
+    
+    def _count(self, key: str) -> None:
+        """디스패치 통계 증가 (여러 워커/발행 스레드에서 호출)"""
+        with self._stats_lock:
+            self._dispatch_stats[key] += 1
+    
+    def _drop(self, event_type: EventType, reason: str) -> None:
+        """드롭된 이벤트를 유형별로 집계하고 경고 로그 기록"""
+        with self._stats_lock:
+            self._dispatch_stats['dropped'] += 1
+            self._dropped_by_type[event_type.name] = self._dropped_by_type.get(event_type.name, 0) + 1
+        self.logger.warning(f"{event_type.name} 이벤트 드롭됨 ({reason})")
+    
+    def _ensure_workers(self) -> None:
+        """비동기 워커 풀이 실행 중이 아니면 시작"""
+        if self._worker_threads:
+            return
+        with self._worker_lock:
+            if self._worker_threads:
+                return
+            queues = [queue.Queue(maxsize=self.async_queue_size) for _ in range(self.async_workers)]
+            threads = []
+            for i, q in enumerate(queues):
+                t = threading.Thread(target=self._worker_loop, args=(q,),
+                                     name=f"EventWorker-{i}", daemon=True)
+                t.start()
+                threads.append(t)
+            self._worker_queues = queues
+            self._worker_threads = threads
+            self.logger.debug(f"이벤트 워커 {len(threads)}개 시작")
+    
+    def _enqueue(self, event_type: EventType, callback: Callable, data: Dict[str, Any]) -> None:
+        """
+        비동기 구독자의 이벤트를 워커 큐에 추가
+        
+        같은 콜백은 항상 같은 워커 큐로 배정되므로 구독자별 순서가 유지됩니다.
+        중요 이벤트(critical_event_types)는 드롭 정책이어도 'block' 으로 대기합니다.
+        
+        Args:
+            event_type: 이벤트 유형
+            callback: 호출할 콜백 함수
+            data: 이벤트 데이터
+        """
+        self._ensure_workers()
+        queues = self._worker_queues
+        if not queues:
+            # 종료 중인 경우 발행 스레드에서 처리
+            self._invoke(event_type, callback, data)
+            return
+        
+        q = queues[hash(callback) % len(queues)]
+        item = (event_type, callback, data)
+        self._count('dispatched')
+        
+        try:
+            q.put_nowait(item)
+            return
+        except queue.Full:
+            pass
+        
+        policy = self.backpressure_policy
+        if event_type in self.critical_event_types and policy in (BACKPRESSURE_DROP_NEWEST,
+                                                                  BACKPRESSURE_DROP_OLDEST):
+            policy = BACKPRESSURE_BLOCK
+        if policy == BACKPRESSURE_BLOCK:
+            try:
+                q.put(item, timeout=self.block_timeout)
+                return
+            except queue.Full:
+                self._drop(event_type, "큐 대기 시간 초과")
+        elif policy == BACKPRESSURE_DROP_OLDEST:
+            while True:
+                try:
+                    oldest = q.get_nowait()
+                    q.task_done()
+                except queue.Empty:
+                    oldest = None
+                if oldest is not None:
+                    if oldest[0] in self.critical_event_types:
+                        # 대기 중이던 중요 이벤트는 버리지 않고 발행 스레드에서 처리
+                        self._count('caller_runs')
+                        self._invoke(*oldest)
+                    else:
+                        self._drop(oldest[0], "큐 가득 참, 가장 오래된 이벤트")
                 try:
-                    callback(data)
-                except Exception as e:
-                    self.logger.error(f"{event_type.name} 이벤트 처리 중 오류: {e}")
+                    q.put_nowait(item)
+                    return
+                except queue.Full:
+                    continue
+        elif policy == BACKPRESSURE_CALLER_RUNS:
+            self._count('caller_runs')
+            self._invoke(event_type, callback, data)
+        else:
+            self._drop(event_type, "큐 가득 참")
+    
+    def _worker_loop(self, q: queue.Queue) -> None:
+        """
+        비동기 워커 메인 루프
+        
+        Args:
+            q: 이 워커가 처리할 큐
+        """
+        while True:
+            item = q.get()
+            try:
+                if item is None:
+                    return
+                event_type, callback, data = item
+                self._invoke(event_type, callback, data)
+                self._count('processed')
+            finally:
+                q.task_done()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        비동기 큐에 남은 이벤트가 모두 처리될 때까지 대기
+        
+        Args:
+            timeout: 최대 대기 시간 (초, None인 경우 무제한)
+            
+        Returns:
+            bool: 시간 내 모든 이벤트 처리 여부
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        for q in list(self._worker_queues):
+            while q.unfinished_tasks:
+                if deadline is not None and time.time() >= deadline:
+                    return False
+                time.sleep(0.005)
+        return True
+    
+    def _flush_at_exit(self) -> None:
+        """프로세스 종료 시 비동기 큐에 남은 이벤트 처리"""
+        if self._worker_queues and not self.flush(timeout=EXIT_FLUSH_TIMEOUT):
+            self.logger.warning(f"종료 시 비동기 이벤트를 {EXIT_FLUSH_TIMEOUT}초 안에 모두 처리하지 못했습니다.")
+    
+    def shutdown_async(self, timeout: float = 5.0) -> None:
+        """
+        비동기 워커 풀 종료 (남은 이벤트는 처리 후 종료)
         
-        self.logger.debug(f"{event_type.name} 이벤트 발행됨")
+        Args:
+            timeout: 워커별 최대 대기 시간 (초)
+        """
+        with self._worker_lock:
+            queues, threads = self._worker_queues, self._worker_threads
+            self._worker_queues, self._worker_threads = [], []
+        
+        for q in queues:
+            q.put(None)
+        for t in threads:
+            t.join(timeout=timeout)
+        if threads:
+            self.logger.debug("이벤트 워커 종료")
+    
+    def get_dispatch_stats(self) -> Dict[str, Any]:
+        """
+        비동기 디스패치 통계 조회
+        
+        Returns:
+            Dict[str, Any]: 처리/드롭 건수, 유형별 드롭 건수와 워커별 큐 길이
+        """
+        with self._stats_lock:
+            stats = dict(self._dispatch_stats)
+            stats['dropped_by_type'] = dict(self._dropped_by_type)
+        stats['queue_depths'] = [q.qsize() for q in self._worker_queues]
+        stats['workers'] = len(self._worker_threads)
+        stats['backpressure'] = self.backpressure_policy
+        return stats
     
     def _add_to_history(self, event_type: EventType, data: Dict[str, Any]) -> None:
         """
@@ -142,11 +428,11 @@ class EventManager:
             'data': data
         }
         
-        self.event_history.append(event_record)
-        
-        # 최대 기록 수 유지
-        if len(self.event_history) > self.max_history:
-            self.event_history.pop(0)
+        with self._history_lock:
+            # 최대 기록 수가 변경된 경우 링 버퍼 재생성
+            if self.event_history.maxlen != self.max_history:
+                self.event_history = deque(self.event_history, maxlen=self.max_history)
+            self.event_history.append(event_record)
     
     def get_recent_events(self, count: int = 10, event_type: Optional[EventType] = None) -> List[Dict[str, Any]]:
         """
@@ -159,16 +445,28 @@ class EventManager:
         Returns:
             List[Dict[str, Any]]: 최근 이벤트 목록
         """
-        if event_type is None:
-            return self.event_history[-count:]
+        if count <= 0:
+            return []
         
-        # 특정 유형 이벤트만 필터링
-        filtered = [e for e in self.event_history if e['type'] == event_type.name]
-        return filtered[-count:]
+        with self._history_lock:
+            if event_type is None:
+                start = max(0, len(self.event_history) - count)
+                return list(itertools.islice(self.event_history, start, None))
+            
+            # 특정 유형 이벤트만 최신부터 역순으로 필터링
+            filtered = []
+            for e in reversed(self.event_history):
+                if e['type'] == event_type.name:
+                    filtered.append(e)
+                    if len(filtered) >= count:
+                        break
+        filtered.reverse()
+        return filtered
     
     def clear_history(self) -> None:
         """이벤트 기록 초기화"""
-        self.event_history = []
+        with self._history_lock:
+            self.event_history.clear()
         self.logger.debug("이벤트 기록이 초기화됨")
 
 # 싱글톤 인스턴스 접근 함수
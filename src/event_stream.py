@@ -0,0 +1,422 @@
+"""
+이벤트 스트림 브로커 모듈 - 암호화폐 자동매매 봇
+
+EventManager에서 발행되는 포지션/거래/잔액/봇 상태 이벤트를 받아 주제별
+최신 상태를 메모리에 유지하고, 변경분(delta)만 Server-Sent Events(SSE)
+형식으로 연결된 모든 대시보드 클라이언트에 전달합니다.
+
+클라이언트 수가 늘어나도 거래소 API나 DB 조회는 늘어나지 않으며,
+새로 연결한 클라이언트는 메모리의 스냅샷을 즉시 받습니다.
+"""
+
+import json
+import queue
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+from src.event_manager import EventType, get_event_manager, DISPATCH_SYNC
+from src.logging_config import get_logger
+
+logger = get_logger('crypto_bot.event_stream')
+
+# 스트림 주제
+TOPIC_POSITIONS = 'positions'
+TOPIC_TRADES = 'trades'
+TOPIC_BALANCE = 'balance'
+TOPIC_STATUS = 'status'
+
+# 주제별 구독 이벤트
+TOPIC_EVENTS = {
+    TOPIC_POSITIONS: (EventType.POSITION_OPENED, EventType.POSITION_UPDATED, EventType.POSITION_CLOSED),
+    TOPIC_TRADES: (EventType.TRADE_EXECUTED,),
+    TOPIC_BALANCE: (EventType.BALANCE_CHANGED,),
+    TOPIC_STATUS: (EventType.BOT_STATUS_CHANGED,),
+}
+
+# 이벤트 데이터에 EventManager가 추가하는 메타 필드 (변경 비교에서 제외)
+_META_KEYS = ('timestamp', 'event_type')
+
+
+def format_sse(data: Any, event: Optional[str] = None, event_id: Optional[int] = None,
+               retry: Optional[int] = None) -> str:
+    """
+    SSE 메시지 문자열 생성
+
+    Args:
+        data: JSON으로 직렬화할 데이터
+        event: 이벤트 이름
+        event_id: 이벤트 ID (클라이언트 재연결 시 Last-Event-ID로 전달됨)
+        retry: 클라이언트 재연결 대기 시간 (밀리초)
+
+    Returns:
+        str: SSE 메시지
+    """
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    if retry is not None:
+        lines.append(f"retry: {retry}")
+    payload = json.dumps(data, ensure_ascii=False, default=str, separators=(',', ':'))
+    lines.extend(f"data: {line}" for line in payload.splitlines() or [''])
+    return '\n'.join(lines) + '\n\n'
+
+
+def _strip_meta(data: Dict[str, Any]) -> Dict[str, Any]:
+    """EventManager 메타 필드를 제외한 사본"""
+    return {k: v for k, v in data.items() if k not in _META_KEYS}
+
+
+def _position_key(position: Dict[str, Any]) -> str:
+    """포지션 식별 키 (ID가 없으면 심볼과 방향 사용)"""
+    position_id = position.get('id') or position.get('position_id')
+    if position_id:
+        return str(position_id)
+    return f"{position.get('symbol', '')}:{position.get('side') or position.get('type', '')}"
+
+
+def _canonical(value: Any) -> str:
+    """변경 비교용 직렬화 문자열"""
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+class StreamClient:
+    """SSE 클라이언트 연결 (클라이언트별 제한 크기 큐)"""
+
+    def __init__(self, client_id: int, queue_size: int):
+        self.client_id = client_id
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.connected_at = time.time()
+        self.lagging = False
+
+
+class EventStreamBroker:
+    """
+    이벤트 스트림 브로커 클래스
+
+    EventManager 이벤트를 주제별 상태에 반영하고, 실제로 바뀐 부분만
+    SSE 메시지로 팬아웃합니다. 처리 속도가 느린 클라이언트는 큐가 가득 차면
+    연결을 끊어 재연결 시 스냅샷으로 다시 동기화되도록 합니다.
+    """
+
+    def __init__(self, event_manager=None, history_size: int = 500,
+                 client_queue_size: int = 256, heartbeat_interval: float = 15.0,
+                 max_trades: int = 20):
+        """
+        이벤트 스트림 브로커 초기화
+
+        Args:
+            event_manager: 이벤트 관리자 (None이면 전역 인스턴스 사용)
+            history_size: 재연결 시 재전송할 최근 메시지 수
+            client_queue_size: 클라이언트별 대기 메시지 최대 수
+            heartbeat_interval: 연결 유지용 하트비트 간격 (초)
+            max_trades: 스냅샷에 유지할 최근 거래 수
+        """
+        self.event_manager = event_manager or get_event_manager()
+        self.client_queue_size = client_queue_size
+        self.heartbeat_interval = heartbeat_interval
+        self.max_trades = max_trades
+
+        self._lock = threading.Lock()
+        self._next_event_id = 1
+        self._history = deque(maxlen=history_size)  # (event_id, message)
+        self._clients: Dict[int, StreamClient] = {}
+        self._next_client_id = 1
+
+        # 주제별 현재 상태
+        self._positions: Dict[str, Dict[str, Any]] = {}
+        self._position_digests: Dict[str, str] = {}
+        self._trades = deque(maxlen=max_trades)
+        self._balance: Dict[str, Any] = {}
+        self._status: Dict[str, Any] = {}
+        self._versions = {topic: 0 for topic in TOPIC_EVENTS}
+
+        self._handlers = {}
+        self._started = False
+
+    def start(self) -> None:
+        """이벤트 구독 시작"""
+        if self._started:
+            return
+        for topic, event_types in TOPIC_EVENTS.items():
+            for event_type in event_types:
+                handler = self._make_handler(topic, event_type)
+                self._handlers[event_type] = handler
+                # 상태 반영과 큐 삽입만 수행하므로 발행 스레드에서 바로 처리
+                self.event_manager.subscribe(event_type, handler, dispatch=DISPATCH_SYNC)
+        self._started = True
+        logger.info("이벤트 스트림 브로커 시작")
+
+    def stop(self) -> None:
+        """이벤트 구독 해제 및 모든 클라이언트 연결 종료"""
+        for event_type, handler in self._handlers.items():
+            self.event_manager.unsubscribe(event_type, handler)
+        self._handlers = {}
+        self._started = False
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            self._close_queue(client)
+        logger.info("이벤트 스트림 브로커 중지")
+
+    def _make_handler(self, topic: str, event_type: EventType):
+        def handler(data):
+            self.handle_event(topic, event_type, data)
+        return handler
+
+    def handle_event(self, topic: str, event_type: EventType, data: Dict[str, Any]) -> Optional[int]:
+        """
+        이벤트를 주제 상태에 반영하고 변경분이 있으면 전파
+
+        Args:
+            topic: 스트림 주제
+            event_type: 이벤트 유형
+            data: 이벤트 데이터
+
+        Returns:
+            Optional[int]: 전파된 메시지 ID (변경 없음이면 None)
+        """
+        try:
+            with self._lock:
+                if topic == TOPIC_POSITIONS:
+                    delta = self._apply_positions(event_type, data)
+                elif topic == TOPIC_TRADES:
+                    delta = self._apply_trade(data)
+                elif topic == TOPIC_BALANCE:
+                    delta = self._apply_mapping(self._balance, data.get('balance', _strip_meta(data)))
+                else:
+                    delta = self._apply_mapping(self._status, data.get('status', _strip_meta(data)))
+                if not delta:
+                    return None
+                self._versions[topic] += 1
+                delta['version'] = self._versions[topic]
+                return self._broadcast_locked(topic, delta)
+        except Exception as e:
+            logger.error(f"{topic} 스트림 이벤트 처리 중 오류: {e}")
+            return None
+
+    def publish_trade(self, trade: Dict[str, Any]) -> Optional[int]:
+        """
+        거래를 대시보드 스트림에만 전달 (TRADE_EXECUTED 이벤트를 발행하지 않음)
+
+        거래소 동기화로 확인한 거래처럼 백업 등 다른 TRADE_EXECUTED 구독자를
+        깨우면 안 되는 알림에 사용합니다.
+
+        Args:
+            trade: API 응답 형식의 거래 데이터
+
+        Returns:
+            Optional[int]: 전파된 메시지 ID
+        """
+        return self.handle_event(TOPIC_TRADES, EventType.TRADE_EXECUTED, {'trade': trade})
+
+    def _apply_positions(self, event_type: EventType, data: Dict[str, Any]) -> Dict[str, Any]:
+        """포지션 상태 반영 후 변경분 반환 ({'upsert': [...], 'remove': [...]})"""
+        upsert, remove = [], []
+
+        if isinstance(data.get('positions'), list):
+            # 전체 목록: 새 목록과 비교해 추가/변경/삭제 계산
+            incoming = {}
+            for position in data['positions']:
+                if isinstance(position, dict):
+                    incoming[_position_key(position)] = position
+            for key in list(self._positions):
+                if key not in incoming:
+                    del self._positions[key]
+                    self._position_digests.pop(key, None)
+                    remove.append(key)
+            for key, position in incoming.items():
+                if self._upsert_position(key, position):
+                    upsert.append(dict(position, key=key))
+        else:
+            position = data.get('position')
+            if not isinstance(position, dict):
+                position = _strip_meta(data)
+            key = _position_key(position)
+            closed = event_type == EventType.POSITION_CLOSED or position.get('status') == 'closed'
+            if closed:
+                if key in self._positions:
+                    del self._positions[key]
+                    self._position_digests.pop(key, None)
+                    remove.append(key)
+            elif self._upsert_position(key, position):
+                upsert.append(dict(position, key=key))
+
+        if not upsert and not remove:
+            return {}
+        return {'upsert': upsert, 'remove': remove}
+
+    def _upsert_position(self, key: str, position: Dict[str, Any]) -> bool:
+        """포지션 저장 (내용이 바뀐 경우에만 True)"""
+        digest = _canonical(position)
+        if self._position_digests.get(key) == digest:
+            return False
+        self._positions[key] = position
+        self._position_digests[key] = digest
+        return True
+
+    def _apply_trade(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """거래 추가 후 변경분 반환 ({'trade': {...}})"""
+        trade = data.get('trade')
+        if not isinstance(trade, dict):
+            trade = _strip_meta(data)
+        self._trades.appendleft(trade)
+        return {'trade': trade}
+
+    @staticmethod
+    def _apply_mapping(state: Dict[str, Any], incoming: Any) -> Dict[str, Any]:
+        """딕셔너리 상태 반영 후 바뀐 최상위 키만 반환 ({'set': {...}, 'unset': [...]})"""
+        if not isinstance(incoming, dict):
+            return {}
+        changed = {k: v for k, v in incoming.items() if k not in state or _canonical(state[k]) != _canonical(v)}
+        removed = [k for k in state if k not in incoming]
+        if not changed and not removed:
+            return {}
+        for k in removed:
+            del state[k]
+        state.update(changed)
+        delta = {'set': changed}
+        if removed:
+            delta['unset'] = removed
+        return delta
+
+    def _broadcast_locked(self, topic: str, payload: Dict[str, Any]) -> int:
+        """메시지 ID 부여, 기록, 모든 클라이언트 큐에 전달 (잠금 보유 상태에서 호출)"""
+        event_id = self._next_event_id
+        self._next_event_id += 1
+        message = format_sse(payload, event=topic, event_id=event_id)
+        self._history.append((event_id, message))
+
+        for client in list(self._clients.values()):
+            try:
+                client.queue.put_nowait(message)
+            except queue.Full:
+                # 느린 클라이언트는 연결을 끊고 재연결 시 스냅샷으로 복구
+                client.lagging = True
+                del self._clients[client.client_id]
+                self._close_queue(client)
+                logger.warning(f"스트림 클라이언트 {client.client_id} 처리 지연으로 연결 종료")
+        return event_id
+
+    @staticmethod
+    def _close_queue(client: StreamClient) -> None:
+        """클라이언트 스트림 종료 신호 전달"""
+        try:
+            client.queue.put_nowait(None)
+        except queue.Full:
+            try:
+                client.queue.get_nowait()
+                client.queue.put_nowait(None)
+            except (queue.Empty, queue.Full):
+                pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 주제별 전체 상태"""
+        with self._lock:
+            return self._snapshot_locked()
+
+    def _snapshot_locked(self) -> Dict[str, Any]:
+        return {
+            TOPIC_POSITIONS: [dict(p, key=k) for k, p in self._positions.items()],
+            TOPIC_TRADES: list(self._trades),
+            TOPIC_BALANCE: dict(self._balance),
+            TOPIC_STATUS: dict(self._status),
+            'versions': dict(self._versions),
+        }
+
+    def connect(self, last_event_id: Optional[Any] = None) -> Tuple[StreamClient, List[str]]:
+        """
+        클라이언트 연결 등록
+
+        Last-Event-ID가 최근 기록 범위 안에 있으면 놓친 메시지만 재전송하고,
+        그렇지 않으면 전체 스냅샷을 먼저 보냅니다.
+
+        Args:
+            last_event_id: 클라이언트가 마지막으로 받은 메시지 ID
+
+        Returns:
+            tuple: (클라이언트, 처음에 보낼 메시지 목록)
+        """
+        try:
+            last_event_id = int(last_event_id) if last_event_id not in (None, '') else None
+        except (TypeError, ValueError):
+            last_event_id = None
+
+        with self._lock:
+            client = StreamClient(self._next_client_id, self.client_queue_size)
+            self._next_client_id += 1
+            self._clients[client.client_id] = client
+
+            oldest = self._history[0][0] if self._history else self._next_event_id
+            if last_event_id is not None and oldest - 1 <= last_event_id < self._next_event_id:
+                initial = [message for event_id, message in self._history if event_id > last_event_id]
+            else:
+                initial = [format_sse(self._snapshot_locked(), event='snapshot',
+                                      event_id=self._next_event_id - 1, retry=3000)]
+        logger.debug("스트림 클라이언트 %d 연결 (현재 %d개)", client.client_id, len(self._clients))
+        return client, initial
+
+    def disconnect(self, client: StreamClient) -> None:
+        """클라이언트 연결 해제"""
+        with self._lock:
+            self._clients.pop(client.client_id, None)
+        logger.debug("스트림 클라이언트 %d 연결 해제", client.client_id)
+
+    def stream(self, last_event_id: Optional[Any] = None) -> Iterator[str]:
+        """
+        SSE 응답 본문 생성기
+
+        Args:
+            last_event_id: 클라이언트가 마지막으로 받은 메시지 ID
+
+        Yields:
+            str: SSE 메시지 (메시지가 없으면 주기적으로 하트비트 주석)
+        """
+        client, initial = self.connect(last_event_id)
+        try:
+            for message in initial:
+                yield message
+            while True:
+                try:
+                    message = client.queue.get(timeout=self.heartbeat_interval)
+                except queue.Empty:
+                    yield ': keepalive\n\n'
+                    continue
+                if message is None:
+                    break
+                yield message
+        finally:
+            self.disconnect(client)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """브로커 상태 통계"""
+        with self._lock:
+            return {
+                'clients': len(self._clients),
+                'last_event_id': self._next_event_id - 1,
+                'history': len(self._history),
+                'versions': dict(self._versions),
+                'positions': len(self._positions),
+            }
+
+
+# 싱글톤 인스턴스
+_event_stream_broker = None
+
+
+def get_event_stream_broker() -> EventStreamBroker:
+    """
+    이벤트 스트림 브로커 인스턴스 반환 (최초 호출 시 구독 시작)
+
+    Returns:
+        EventStreamBroker: 이벤트 스트림 브로커 인스턴스
+    """
+    global _event_stream_broker
+    if _event_stream_broker is None:
+        _event_stream_broker = EventStreamBroker()
+        _event_stream_broker.start()
+    return _event_stream_broker
@@ -37,6 +37,7 @@ from src.exceptions import (
 )
 from src.error_handlers import api_error_handler
 from src.utils.symbol_utils import normalize_symbol, convert_symbol_format, validate_symbol_format
+from src.ohlcv_schema import compact_ohlcv
 
 # 로거 설정
 logger = get_logger('crypto_bot.exchange')
@@ -204,6 +205,9 @@ class ExchangeAPI:
         self.logger = get_logger(f'crypto_bot.exchange.{self.exchange_id}')
         self.exchange = self._initialize_exchange()
         
+        # 사용자 데이터 스트림 주문 추적기 (연결되어 있으면 주문 조회를 메모리에서 처리)
+        self.order_tracker = None
+        
         # 네트워크 복구 관리자 초기화
         self.network_recovery = self._initialize_network_recovery()
         
@@ -708,15 +712,7 @@ class ExchangeAPI:
                 self.logger.warning(f"fetch_ohlcv 호출 결과가 비어있습니다: {symbol}, {timeframe}")
                 return pd.DataFrame(columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
                 
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            
-            # 시장 유형 정보 추가
-            df['market_type'] = self.market_type
-            if self.market_type == 'futures':
-                df['leverage'] = self.leverage
-                
-            return df
+            return self._ohlcv_frame(ohlcv)
             
         except Exception as e:
             self.logger.error(f"OHLCV 데이터 가져오기 실패: {str(e)}")
@@ -727,19 +723,27 @@ class ExchangeAPI:
                 since = None
                 ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, since, params=params)
                 
-                df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                
-                # 시장 유형 정보 추가
-                df['market_type'] = self.market_type
-                if self.market_type == 'futures':
-                    df['leverage'] = self.leverage
-                    
-                return df
+                return self._ohlcv_frame(ohlcv)
             except Exception as fallback_e:
                 self.logger.error(f"폴백 방식으로도 OHLCV 데이터 가져오기 실패: {str(fallback_e)}")
                 return pd.DataFrame(columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
     
+    def _ohlcv_frame(self, ohlcv):
+        """
+        OHLCV 응답을 압축된 데이터프레임으로 변환
+        
+        시장 유형과 레버리지는 행마다 반복하지 않고 df.attrs 메타데이터로 보관합니다.
+        """
+        df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        
+        # 시장 유형 정보 추가
+        df.attrs['market_type'] = self.market_type
+        if self.market_type == 'futures':
+            df.attrs['leverage'] = self.leverage
+        
+        return compact_ohlcv(df, copy=False)
+    
     @api_error_handler
     def create_market_buy_order(self, symbol=None, amount=None, use_retry=True):
         """시장가 매수 주문
@@ -1414,12 +1418,13 @@ class ExchangeAPI:
             raise APIError(error_msg, original_exception=e)
     
     @api_error_handler
-    def get_order_status(self, order_id, symbol=None):
+    def get_order_status(self, order_id, symbol=None, use_tracker=True):
         """주문 상태 조회
         
         Args:
             order_id (str): 조회할 주문 ID
             symbol (str, optional): 거래 심볼. 기본값은 인스턴스의 symbol
+            use_tracker (bool): 주문 추적기가 연결되어 있고 주문을 알고 있으면 REST 대신 메모리 상태 사용
             
         Returns:
             dict: 주문 상태 정보 (성공 시)
@@ -1434,6 +1439,14 @@ class ExchangeAPI:
             if not order_id:
                 raise ValueError("조회할 주문 ID를 지정해야 합니다.")
                 
+            # 주문 추적기 상태 사용 (사용자 데이터 스트림 연결 중)
+            if use_tracker and self.order_tracker is not None and self.order_tracker.connected:
+                tracked = self.order_tracker.get_order(order_id)
+                if tracked is not None:
+                    return {key: tracked.get(key) for key in (
+                        'id', 'symbol', 'timestamp', 'datetime', 'type', 'side', 'amount', 'price', 'cost',
+                        'filled', 'remaining', 'status', 'fee')}
+            
             # 심볼 처리
             symbol = self.format_symbol(symbol)
             
@@ -1526,9 +1539,18 @@ class ExchangeAPI:
             AuthenticationError: 인증 오류 발생 시
         """
         try:
-            # 심볼 처리
+            # 심볼 처리 (주문 추적기는 통합 심볼 기준, REST 조회는 거래소 형식)
+            unified_symbol = symbol or self.symbol
             symbol = self.format_symbol(symbol)
             
+            # 주문 추적기 상태 사용 (스트림 연결 중이고 정합성 확인이 끝난 심볼만)
+            tracker = self.order_tracker
+            if tracker is not None and tracker.covers(unified_symbol):
+                return [dict({key: order.get(key) for key in (
+                    'id', 'symbol', 'timestamp', 'datetime', 'type', 'side', 'amount', 'price', 'cost',
+                    'filled', 'remaining', 'status', 'fee')}, market_type=self.market_type)
+                    for order in tracker.get_open_orders(unified_symbol)]
+            
             # API 호출 로깅
             request_data = {
                 "symbol": symbol,
@@ -1571,6 +1593,10 @@ class ExchangeAPI:
             market_type_str = "선물" if self.market_type == 'futures' else "현물"
             self.logger.info(f"{market_type_str} 미체결 주문 조회: {symbol or '모든 심볼'}, 개수: {len(orders)}")
             
+            # 스트림 연결 중 처음 조회한 심볼은 추적기에 반영해 이후 메모리에서 응답
+            if tracker is not None:
+                tracker.adopt(unified_symbol, orders)
+            
             # 결과 가공 - 표준화된 형태로 변환
             standardized_orders = []
             for order in orders:
@@ -0,0 +1,430 @@
+"""
+벡터화 청산 조건 평가 모듈 - 암호화폐 자동매매 봇
+
+열린 포지션을 진입가/손절가/이익실현가/트레일링 고점(저점)/방향 배열로 보관하고,
+가격 벡터에 대해 한 번의 NumPy 연산으로 손절매, 트레일링 스탑, 부분 이익실현,
+이익실현 조건을 평가합니다. 포지션마다 딕셔너리 조회와 RiskManager 호출을
+반복하던 방식을 대체합니다.
+"""
+
+import numpy as np
+from typing import Dict, List, Any, Optional, Sequence, Union
+
+from src.logging_config import get_logger
+
+logger = get_logger('crypto_bot.exit_evaluator')
+
+# 청산 유형 (RiskManager.check_exit_conditions 와 동일한 이름 사용)
+EXIT_STOP_LOSS = 'stop_loss'
+EXIT_TRAILING_STOP = 'trailing_stop'
+EXIT_PARTIAL_TP = 'partial_tp'
+EXIT_TAKE_PROFIT = 'take_profit'
+
+# 결과 코드 배열에서 사용하는 값
+_CODE_NONE = 0
+_CODE_STOP_LOSS = 1
+_CODE_TRAILING_STOP = 2
+_CODE_PARTIAL_TP = 3
+_CODE_TAKE_PROFIT = 4
+
+_CODE_NAMES = {
+    _CODE_STOP_LOSS: EXIT_STOP_LOSS,
+    _CODE_TRAILING_STOP: EXIT_TRAILING_STOP,
+    _CODE_PARTIAL_TP: EXIT_PARTIAL_TP,
+    _CODE_TAKE_PROFIT: EXIT_TAKE_PROFIT,
+}
+
+
+def side_to_sign(side: Any) -> int:
+    """포지션 방향을 부호로 변환 (long=+1, short=-1, 그 외 0)"""
+    if not isinstance(side, str):
+        return 0
+    side = side.lower()
+    if side in ('long', 'buy'):
+        return 1
+    if side in ('short', 'sell'):
+        return -1
+    return 0
+
+
+def stop_loss_prices(entry: np.ndarray, sign: np.ndarray, sl_pct: Union[float, np.ndarray]) -> np.ndarray:
+    """
+    손절매 가격 배열 계산 (RiskManager.calculate_stop_loss_price 와 동일하게 소수점 2자리 반올림)
+
+    Args:
+        entry: 진입가 배열
+        sign: 방향 부호 배열 (+1/-1)
+        sl_pct: 손절매 비율 (스칼라 또는 배열)
+
+    Returns:
+        np.ndarray: 손절매 가격
+    """
+    return np.round(entry * (1.0 - sign * sl_pct), 2)
+
+
+def take_profit_prices(entry: np.ndarray, sign: np.ndarray, tp_pct: Union[float, np.ndarray]) -> np.ndarray:
+    """
+    이익실현 가격 배열 계산 (RiskManager.calculate_take_profit_price 와 동일하게 소수점 2자리 반올림)
+
+    Args:
+        entry: 진입가 배열
+        sign: 방향 부호 배열 (+1/-1)
+        tp_pct: 이익실현 비율 (스칼라 또는 배열)
+
+    Returns:
+        np.ndarray: 이익실현 가격
+    """
+    return np.round(entry * (1.0 + sign * tp_pct), 2)
+
+
+def liquidation_prices(entry: np.ndarray, sign: np.ndarray, leverage: np.ndarray,
+                       margin_ratio: float = 0.004) -> np.ndarray:
+    """
+    선물 청산 가격 배열 계산 (RiskManager.calculate_liquidation_price 와 동일한 공식)
+
+    Args:
+        entry: 진입가 배열
+        sign: 방향 부호 배열 (+1/-1)
+        leverage: 레버리지 배열
+        margin_ratio: 유지 마진 비율
+
+    Returns:
+        np.ndarray: 청산 가격
+    """
+    return np.round(entry * (1.0 - sign * (1.0 / leverage - margin_ratio)), 2)
+
+
+class VectorizedExitEvaluator:
+    """
+    열린 포지션의 청산 조건을 배열 단위로 평가하는 클래스
+
+    포지션 목록은 sync()로 배열에 반영하고, evaluate()로 현재 가격에 대한
+    청산 신호를 한 번에 계산합니다. 트레일링 고점(저점)과 부분 이익실현 실행
+    이력은 포지션 ID 기준으로 sync() 사이에도 유지됩니다.
+    """
+
+    def __init__(self, sl_pct: float = 0.05, tp_pct: float = 0.1,
+                 partial_tp_enabled: bool = False,
+                 tp_levels: Optional[Sequence[float]] = None,
+                 tp_percentages: Optional[Sequence[float]] = None,
+                 trailing_enabled: bool = False,
+                 trailing_activation_pct: float = 0.01,
+                 trailing_pct: float = 0.02,
+                 liquidation_warning_pct: float = 5.0):
+        """
+        벡터화 청산 평가기 초기화
+
+        Args:
+            sl_pct: 손절매 비율
+            tp_pct: 이익실현 비율
+            partial_tp_enabled: 부분 이익실현 활성화 여부
+            tp_levels: 부분 이익실현 수익률 단계 (예: [0.05, 0.1, 0.2])
+            tp_percentages: 각 단계에서 청산할 비율 (예: [0.3, 0.3, 0.4])
+            trailing_enabled: 트레일링 스탑 활성화 여부
+            trailing_activation_pct: 트레일링 스탑 활성화 수익률
+            trailing_pct: 고점(저점) 대비 트레일링 간격 비율
+            liquidation_warning_pct: 청산가 근접 경고 기준 (%)
+        """
+        self.sl_pct = sl_pct
+        self.tp_pct = tp_pct
+        self.partial_tp_enabled = partial_tp_enabled
+        self.tp_levels = np.asarray(tp_levels if tp_levels else [0.05, 0.1, 0.2], dtype=np.float64)
+        self.tp_percentages = np.asarray(tp_percentages if tp_percentages else [0.3, 0.3, 0.4], dtype=np.float64)
+        self.trailing_enabled = trailing_enabled
+        self.trailing_activation_pct = trailing_activation_pct
+        self.trailing_pct = trailing_pct
+        self.liquidation_warning_pct = liquidation_warning_pct
+
+        # 포지션 배열
+        self.ids: List[Any] = []
+        self.positions: List[Dict[str, Any]] = []
+        self.symbols: List[str] = []
+        self.symbol_codes = np.zeros(0, dtype=np.int64)
+        self.entry = np.zeros(0, dtype=np.float64)
+        self.sign = np.zeros(0, dtype=np.float64)
+        self.leverage = np.ones(0, dtype=np.float64)
+        self.sl_price = np.zeros(0, dtype=np.float64)
+        self.tp_price = np.zeros(0, dtype=np.float64)
+        self.high_water = np.zeros(0, dtype=np.float64)
+        self.trailing_active = np.zeros(0, dtype=bool)
+        self.tp_executed = np.zeros((0, len(self.tp_levels)), dtype=bool)
+
+        self._index: Dict[Any, int] = {}
+        self._unique_symbols: List[str] = []
+        self._signature = None
+
+    def configure(self, sl_pct: Optional[float] = None, tp_pct: Optional[float] = None,
+                  partial_tp_enabled: Optional[bool] = None,
+                  tp_levels: Optional[Sequence[float]] = None,
+                  tp_percentages: Optional[Sequence[float]] = None,
+                  trailing_enabled: Optional[bool] = None,
+                  trailing_activation_pct: Optional[float] = None,
+                  trailing_pct: Optional[float] = None):
+        """
+        평가 설정 변경 (None 인자는 현재 설정 유지)
+
+        손절/이익실현 비율이 바뀌면 가격 배열을 다시 계산하고, 부분 이익실현
+        단계가 바뀌면 실행 이력을 초기화합니다.
+        """
+        if partial_tp_enabled is not None:
+            self.partial_tp_enabled = partial_tp_enabled
+        if trailing_enabled is not None:
+            self.trailing_enabled = trailing_enabled
+        if trailing_activation_pct is not None:
+            self.trailing_activation_pct = trailing_activation_pct
+        if trailing_pct is not None:
+            self.trailing_pct = trailing_pct
+
+        if tp_levels is not None and tp_percentages is not None:
+            levels = np.asarray(tp_levels, dtype=np.float64)
+            percentages = np.asarray(tp_percentages, dtype=np.float64)
+            size = min(len(levels), len(percentages))
+            levels, percentages = levels[:size], percentages[:size]
+            if not (np.array_equal(levels, self.tp_levels) and np.array_equal(percentages, self.tp_percentages)):
+                self.tp_levels = levels
+                self.tp_percentages = percentages
+                self.tp_executed = np.zeros((len(self.ids), size), dtype=bool)
+
+        prices_changed = False
+        if sl_pct is not None and sl_pct != self.sl_pct:
+            self.sl_pct = sl_pct
+            prices_changed = True
+        if tp_pct is not None and tp_pct != self.tp_pct:
+            self.tp_pct = tp_pct
+            prices_changed = True
+        if prices_changed and len(self.ids):
+            self.sl_price = stop_loss_prices(self.entry, self.sign, self.sl_pct)
+            self.tp_price = take_profit_prices(self.entry, self.sign, self.tp_pct)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def sync(self, positions: List[Dict[str, Any]]) -> int:
+        """
+        포지션 목록을 배열에 반영
+
+        포지션 ID/진입가/방향이 이전과 같으면 배열을 다시 만들지 않고 포지션
+        딕셔너리 참조만 교체합니다. 기존 포지션의 트레일링 고점과 부분 이익실현
+        이력은 유지되며, 목록에서 사라진 포지션의 상태는 제거됩니다.
+
+        Args:
+            positions: 포지션 딕셔너리 목록 (id, symbol, side, entry_price, leverage)
+
+        Returns:
+            int: 유효한 포지션 수
+        """
+        valid = []
+        for i, position in enumerate(positions):
+            position_id = position.get('id')
+            entry_price = position.get('entry_price')
+            sign = side_to_sign(position.get('side'))
+            if not position_id or sign == 0 or not entry_price or entry_price <= 0:
+                logger.warning("유효하지 않은 포지션 정보로 평가에서 제외: id=%s, side=%s, entry_price=%s",
+                               position_id, position.get('side'), entry_price)
+                continue
+            valid.append((position_id, float(entry_price), sign, position))
+
+        signature = tuple((pid, entry, sign) for pid, entry, sign, _ in valid)
+        if signature == self._signature:
+            self.positions = [p for _, _, _, p in valid]
+            return len(valid)
+
+        n = len(valid)
+        levels = len(self.tp_levels)
+        old_index = self._index
+        old_high_water = self.high_water
+        old_trailing = self.trailing_active
+        old_executed = self.tp_executed
+        old_entry = self.entry
+
+        self.ids = [pid for pid, _, _, _ in valid]
+        self.positions = [p for _, _, _, p in valid]
+        self.symbols = [p.get('symbol') or '' for p in self.positions]
+        self._unique_symbols = sorted(set(self.symbols))
+        symbol_lookup = {s: k for k, s in enumerate(self._unique_symbols)}
+        self.symbol_codes = np.fromiter((symbol_lookup[s] for s in self.symbols), dtype=np.int64, count=n)
+        self.entry = np.fromiter((e for _, e, _, _ in valid), dtype=np.float64, count=n)
+        self.sign = np.fromiter((s for _, _, s, _ in valid), dtype=np.float64, count=n)
+        self.leverage = np.fromiter((float(p.get('leverage') or 10) for p in self.positions),
+                                    dtype=np.float64, count=n)
+        self.sl_price = stop_loss_prices(self.entry, self.sign, self.sl_pct)
+        self.tp_price = take_profit_prices(self.entry, self.sign, self.tp_pct)
+
+        # 기존 포지션 상태 이어받기 (진입가가 바뀐 경우는 새 포지션으로 취급)
+        self.high_water = self.entry.copy()
+        self.trailing_active = np.zeros(n, dtype=bool)
+        self.tp_executed = np.zeros((n, levels), dtype=bool)
+        self._index = {}
+        for new_i, pid in enumerate(self.ids):
+            self._index[pid] = new_i
+            old_i = old_index.get(pid)
+            if old_i is None or old_entry[old_i] != self.entry[new_i]:
+                continue
+            self.high_water[new_i] = old_high_water[old_i]
+            self.trailing_active[new_i] = old_trailing[old_i]
+            if old_executed.shape[1] == levels:
+                self.tp_executed[new_i] = old_executed[old_i]
+
+        self._signature = signature
+        return n
+
+    def price_vector(self, prices: Union[float, Dict[str, float], np.ndarray]) -> np.ndarray:
+        """
+        현재 가격을 포지션별 가격 배열로 변환
+
+        Args:
+            prices: 단일 가격, 심볼별 가격 딕셔너리, 또는 포지션 수와 같은 길이의 배열
+
+        Returns:
+            np.ndarray: 포지션별 가격 (가격이 없는 심볼은 NaN)
+        """
+        n = len(self.ids)
+        if isinstance(prices, dict):
+            by_symbol = np.array([prices.get(s, np.nan) for s in self._unique_symbols], dtype=np.float64)
+            if not len(by_symbol):
+                return np.zeros(0, dtype=np.float64)
+            return by_symbol[self.symbol_codes]
+        if np.isscalar(prices):
+            return np.full(n, float(prices), dtype=np.float64)
+        price = np.asarray(prices, dtype=np.float64)
+        if price.shape != (n,):
+            raise ValueError(f"가격 배열 길이가 포지션 수와 다릅니다: {price.shape} != ({n},)")
+        return price
+
+    def evaluate_arrays(self, price: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        가격 배열에 대한 청산 조건 평가 (상태 갱신 포함)
+
+        우선순위는 손절매 > 트레일링 스탑 > 부분 이익실현 > 이익실현 입니다.
+        부분 이익실현이 활성화된 경우 RiskManager와 동일하게 전체 이익실현은
+        발생하지 않고, 도달한 가장 높은 미실행 단계 하나가 신호로 선택됩니다.
+
+        Args:
+            price: 포지션별 가격 배열
+
+        Returns:
+            dict: code(청산 코드), fraction(청산 비율), level(부분 이익실현 단계, 없으면 -1),
+                  stop(트레일링 스탑 가격, 비활성 시 NaN)
+        """
+        n = len(self.ids)
+        codes = np.zeros(n, dtype=np.int8)
+        fraction = np.zeros(n, dtype=np.float64)
+        level = np.full(n, -1, dtype=np.int64)
+        stop = np.full(n, np.nan, dtype=np.float64)
+        if n == 0:
+            return {'code': codes, 'fraction': fraction, 'level': level, 'stop': stop}
+
+        valid = np.isfinite(price) & (price > 0)
+        sign = self.sign
+        # 방향을 곱해 롱/숏을 같은 부등식으로 비교 (값이 클수록 유리)
+        signed_price = sign * price
+
+        # 손절매
+        stop_hit = valid & (signed_price <= sign * self.sl_price)
+        codes[stop_hit] = _CODE_STOP_LOSS
+        fraction[stop_hit] = 1.0
+        pending = valid & ~stop_hit
+
+        # 트레일링 스탑: 고점(숏은 저점) 갱신 후 활성화/발동 판정
+        if self.trailing_enabled:
+            improved = pending & (signed_price > sign * self.high_water)
+            self.high_water[improved] = price[improved]
+            activation = self.entry * (1.0 + sign * self.trailing_activation_pct)
+            self.trailing_active |= pending & (signed_price >= sign * activation)
+            trail_stop = self.high_water * (1.0 - sign * self.trailing_pct)
+            stop[self.trailing_active] = trail_stop[self.trailing_active]
+            trail_hit = pending & self.trailing_active & (signed_price <= sign * trail_stop)
+            codes[trail_hit] = _CODE_TRAILING_STOP
+            fraction[trail_hit] = 1.0
+            pending &= ~trail_hit
+
+        if self.partial_tp_enabled and len(self.tp_levels):
+            # 부분 이익실현: 도달했지만 아직 실행하지 않은 가장 높은 단계
+            profit = sign * (price - self.entry) / self.entry
+            reached = (profit[:, None] >= self.tp_levels[None, :]) & ~self.tp_executed
+            reached &= pending[:, None]
+            rows = np.flatnonzero(reached.any(axis=1))
+            if len(rows):
+                last = reached.shape[1] - 1
+                idx = last - np.argmax(reached[rows, ::-1], axis=1)
+                self.tp_executed[rows, idx] = True
+                codes[rows] = _CODE_PARTIAL_TP
+                fraction[rows] = self.tp_percentages[idx]
+                level[rows] = idx
+        else:
+            tp_hit = pending & (signed_price >= sign * self.tp_price)
+            codes[tp_hit] = _CODE_TAKE_PROFIT
+            fraction[tp_hit] = 1.0
+
+        return {'code': codes, 'fraction': fraction, 'level': level, 'stop': stop}
+
+    def evaluate(self, prices: Union[float, Dict[str, float], np.ndarray]) -> List[Dict[str, Any]]:
+        """
+        현재 가격에 대한 청산 신호 목록 계산
+
+        Args:
+            prices: 단일 가격, 심볼별 가격 딕셔너리, 또는 포지션별 가격 배열
+
+        Returns:
+            list: 청산 신호 목록. 각 항목은 position, position_id, current_price,
+                  exit_type, exit_reason, exit_percentage 키를 가짐
+        """
+        price = self.price_vector(prices)
+        result = self.evaluate_arrays(price)
+        rows = np.flatnonzero(result['code'])
+
+        signals = []
+        for i in rows:
+            code = int(result['code'][i])
+            current_price = float(price[i])
+            signals.append({
+                'position': self.positions[i],
+                'position_id': self.ids[i],
+                'current_price': current_price,
+                'exit_type': _CODE_NAMES[code],
+                'exit_reason': self._describe(i, code, current_price, result),
+                'exit_percentage': float(result['fraction'][i]),
+            })
+        return signals
+
+    def liquidation_warnings(self, prices: Union[float, Dict[str, float], np.ndarray],
+                             margin_ratio: float = 0.004) -> List[Dict[str, Any]]:
+        """
+        청산 가격에 근접한 포지션 목록 (선물 전용)
+
+        Args:
+            prices: 단일 가격, 심볼별 가격 딕셔너리, 또는 포지션별 가격 배열
+            margin_ratio: 유지 마진 비율
+
+        Returns:
+            list: position_id, current_price, liquidation_price, distance_pct 키를 가진 항목 목록
+        """
+        if not len(self.ids):
+            return []
+        price = self.price_vector(prices)
+        liq = liquidation_prices(self.entry, self.sign, self.leverage, margin_ratio)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            distance_pct = self.sign * (price - liq) / price * 100
+        rows = np.flatnonzero(np.isfinite(distance_pct) & (distance_pct < self.liquidation_warning_pct))
+        return [{
+            'position_id': self.ids[i],
+            'current_price': float(price[i]),
+            'liquidation_price': float(liq[i]),
+            'distance_pct': float(distance_pct[i]),
+        } for i in rows]
+
+    def _describe(self, i: int, code: int, current_price: float, result: Dict[str, np.ndarray]) -> str:
+        """청산 신호 설명 문자열 생성 (신호가 발생한 포지션에 대해서만 호출)"""
+        is_long = self.sign[i] > 0
+        if code == _CODE_STOP_LOSS:
+            direction = '이하로 하락' if is_long else '이상으로 상승'
+            return f'현재 가격({current_price})이 손절매 가격({self.sl_price[i]}) {direction}'
+        if code == _CODE_TRAILING_STOP:
+            direction = '이하로 하락' if is_long else '이상으로 상승'
+            return f'현재 가격({current_price})이 트레일링 스탑 가격({result["stop"][i]:.2f}) {direction}'
+        if code == _CODE_PARTIAL_TP:
+            profit = self.sign[i] * (current_price - self.entry[i]) / self.entry[i]
+            target = self.tp_levels[result['level'][i]]
+            return f"부분 이익실현: 현재 수익률({profit:.2%})이 목표 수준({target:.2%})에 도달"
+        direction = '이상으로 상승' if is_long else '이하로 하락'
+        return f'현재 가격({current_price})이 이익실현 가격({self.tp_price[i]}) {direction}'
@@ -0,0 +1,13 @@
+"""
+가상 거래소 패키지 - 암호화폐 자동매매 봇
+
+네트워크 없이 부하/지연 테스트와 시나리오 재생을 하기 위한 로컬 바이낸스 대역입니다.
+ccxt 가 사용하는 현물/USDT-M 선물 REST 엔드포인트와 웹소켓 스트림, 설정 가능한
+응답 지연/지터/429 응답, 간단한 체결 엔진을 제공합니다.
+FAKE_EXCHANGE_URL 환경 변수를 설정하면 utils.api.create_binance_client 가 이 서버로 연결합니다.
+실행 방법은 src/fake_exchange/__main__.py 를 참고하세요.
+"""
+
+from src.fake_exchange.market import SimulatedClock, MarketDataFeed
+from src.fake_exchange.engine import MatchingEngine, ExchangeError
+from src.fake_exchange.server import FakeExchangeServer, WebSocketClient
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 가상 거래소 실행
+
+"""
+사용법:
+    # 합성 시세로 100배속 실행
+    python -m src.fake_exchange --port 8900 --speed 100 --symbols BTCUSDT,ETHUSDT
+
+    # 1분봉 CSV 재생 (디렉토리 안의 <심볼>.csv), 응답 지연 50±20ms
+    python -m src.fake_exchange --data data/replay --speed 100 --latency 50 --jitter 20
+
+    # 봇 연결
+    FAKE_EXCHANGE_URL=http://127.0.0.1:8900 python main.py
+"""
+
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.fake_exchange.market import SimulatedClock, MarketDataFeed
+from src.fake_exchange.engine import MatchingEngine
+from src.fake_exchange.server import FakeExchangeServer
+
+
+def _load_candles(path):
+    files = [os.path.join(path, name) for name in sorted(os.listdir(path))] if os.path.isdir(path) else [path]
+    candles = {}
+    for file in files:
+        if file.endswith('.csv'):
+            symbol = os.path.splitext(os.path.basename(file))[0].upper().replace('/', '').replace('_', '')
+            candles[symbol] = pd.read_csv(file, index_col=0, parse_dates=True)
+    return candles
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m src.fake_exchange', description='로컬 가상 거래소 서버')
+    parser.add_argument('--host', default='127.0.0.1', help='바인딩 주소')
+    parser.add_argument('--port', type=int, default=8900, help='포트')
+    parser.add_argument('--speed', type=float, default=1.0, help='시계 배속')
+    parser.add_argument('--latency', type=float, default=0.0, help='응답 지연 (ms)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='응답 지연 편차 (±ms)')
+    parser.add_argument('--weight-limit', type=int, default=6000, help='분당 요청 가중치 한도')
+    parser.add_argument('--rate-limit-probability', type=float, default=0.0, help='임의 429 응답 확률')
+    parser.add_argument('--data', help='재생할 1분봉 CSV 파일 또는 디렉토리 (<심볼>.csv)')
+    parser.add_argument('--symbols', default='BTCUSDT,ETHUSDT', help='합성 데이터 종목 (쉼표 구분)')
+    parser.add_argument('--spot-usdt', type=float, default=10000.0, help='현물 초기 USDT')
+    parser.add_argument('--futures-usdt', type=float, default=10000.0, help='선물 초기 USDT')
+    parser.add_argument('--seed', type=int, default=7, help='합성 데이터/지터 난수 시드')
+    args = parser.parse_args(argv)
+
+    if args.data:
+        candles = _load_candles(args.data)
+        if not candles:
+            parser.error(f"CSV 데이터를 찾을 수 없습니다: {args.data}")
+        start = min(int(df.index[0].value // 1_000_000) for df in candles.values())
+        feed = MarketDataFeed(SimulatedClock(start_ms=start, speed=args.speed), candles=candles)
+    else:
+        feed = MarketDataFeed(SimulatedClock(speed=args.speed),
+                              symbols=[s.strip().upper() for s in args.symbols.split(',') if s.strip()],
+                              seed=args.seed)
+    engine = MatchingEngine(feed, spot_balances={'USDT': args.spot_usdt}, futures_balance=args.futures_usdt)
+    server = FakeExchangeServer(args.host, args.port, feed=feed, engine=engine, latency_ms=args.latency,
+                                jitter_ms=args.jitter, weight_limit=args.weight_limit,
+                                rate_limit_probability=args.rate_limit_probability, seed=args.seed)
+    print(f"가상 거래소 실행 중: {server.url} (웹소켓 {server.ws_url}/ws/<스트림>)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,665 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 가상 거래소 체결 엔진
+
+"""
+가상 거래소 체결 엔진 (현물 + USDT-M 선물 단방향 포지션)
+
+- 시장가 주문: 현재가(± 슬리피지)로 즉시 체결
+- 지정가 주문: 즉시 체결 가능하면 현재가로, 아니면 대기 후 가격 경로가 지정가에
+  닿을 때 지정가로 체결 (IOC/FOK 는 즉시 체결 불가 시 만료, GTX 는 즉시 체결 가능 시 만료)
+- 스탑/이익실현 주문: 가격 경로가 발동가에 닿으면 시장가(발동가) 또는 지정가로 전환
+- 선물: 진입가 평균, 실현 손익, 레버리지별 증거금 확인, 강제 청산
+- 주문/잔고 변경은 바이낸스 사용자 데이터 스트림 형식 이벤트로 리스너에 전달
+"""
+
+import itertools
+import threading
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+import numpy as np
+
+from src.exit_evaluator import liquidation_prices
+from src.fake_exchange.market import MarketDataFeed
+
+MARKET_SPOT = 'spot'
+MARKET_FUTURE = 'future'
+
+_QUOTE_ASSETS = ('USDT', 'BUSD', 'USDC', 'FDUSD', 'BTC', 'ETH', 'BNB')
+
+# 발동가가 필요한 주문 유형 -> (매수 발동 방향, 발동 후 유형)
+# 'up' 이면 가격이 발동가 이상일 때, 'down' 이면 이하일 때 매수 주문 발동 (매도는 반대)
+_TRIGGER_TYPES = {
+    'STOP_MARKET': ('up', 'MARKET'),
+    'STOP': ('up', 'LIMIT'),
+    'TAKE_PROFIT_MARKET': ('down', 'MARKET'),
+    'TAKE_PROFIT': ('down', 'LIMIT'),
+    'STOP_LOSS': ('up', 'MARKET'),
+    'STOP_LOSS_LIMIT': ('up', 'LIMIT'),
+    'TAKE_PROFIT_LIMIT': ('down', 'LIMIT'),
+}
+# 현물 TAKE_PROFIT 은 발동 후 시장가 (선물 TAKE_PROFIT 은 지정가)
+_SPOT_TRIGGER_OVERRIDES = {'TAKE_PROFIT': 'MARKET'}
+
+
+class ExchangeError(Exception):
+    """바이낸스 형식 오류 응답 ({"code": ..., "msg": ...})"""
+
+    def __init__(self, code: int, msg: str, status: int = 400):
+        super().__init__(msg)
+        self.code = code
+        self.msg = msg
+        self.status = status
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'code': self.code, 'msg': self.msg}
+
+
+def split_symbol(symbol: str) -> Tuple[str, str]:
+    """거래소 심볼을 (기준 자산, 견적 자산)으로 분리 (BTCUSDT -> BTC, USDT)"""
+    for quote in _QUOTE_ASSETS:
+        if symbol.endswith(quote) and len(symbol) > len(quote):
+            return symbol[:-len(quote)], quote
+    raise ExchangeError(-1121, 'Invalid symbol.')
+
+
+def _fmt(value: float) -> str:
+    return f"{value:.8f}".rstrip('0').rstrip('.') if value else '0'
+
+
+class MatchingEngine:
+    """가상 거래소 계정/주문/체결 상태"""
+
+    def __init__(self, feed: MarketDataFeed, spot_balances: Optional[Dict[str, float]] = None,
+                 futures_balance: float = 10000.0, spot_fee: float = 0.001, futures_fee: float = 0.0004,
+                 slippage: float = 0.0, default_leverage: int = 20, maintenance_margin_ratio: float = 0.004):
+        """
+        Args:
+            feed: 시세 데이터
+            spot_balances: 현물 초기 잔고 {자산: 수량} (None이면 USDT 10000)
+            futures_balance: 선물 지갑 초기 USDT
+            spot_fee: 현물 수수료율
+            futures_fee: 선물 수수료율
+            slippage: 시장가/스탑 체결 슬리피지 비율
+            default_leverage: 선물 기본 레버리지
+            maintenance_margin_ratio: 유지 증거금 비율 (강제 청산 가격 계산용)
+        """
+        self.feed = feed
+        self.clock = feed.clock
+        self.fees = {MARKET_SPOT: spot_fee, MARKET_FUTURE: futures_fee}
+        self.slippage = slippage
+        self.default_leverage = default_leverage
+        self.maintenance_margin_ratio = maintenance_margin_ratio
+
+        self.spot_balances: Dict[str, Dict[str, float]] = {
+            asset: {'free': float(amount), 'locked': 0.0}
+            for asset, amount in (spot_balances or {'USDT': 10000.0}).items()
+        }
+        self.futures_wallet = float(futures_balance)
+        self.positions: Dict[str, Dict[str, Any]] = {}
+        self.orders: Dict[int, Dict[str, Any]] = {}
+        self.trades: List[Dict[str, Any]] = []
+        self.listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+        self.stats = {'orders': 0, 'fills': 0, 'liquidations': 0}
+
+        self._ids = itertools.count(1)
+        self._trade_ids = itertools.count(1)
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # 주문
+    # ------------------------------------------------------------------
+
+    def place_order(self, market: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        주문 접수 (바이낸스 POST order 파라미터)
+
+        Args:
+            market: 'spot' 또는 'future'
+            params: symbol, side, type, quantity, price, stopPrice, timeInForce,
+                    reduceOnly, closePosition, newClientOrderId, quoteOrderQty
+
+        Returns:
+            dict: 바이낸스 형식 주문 응답
+        """
+        with self._lock:
+            self.sync()
+            symbol = params.get('symbol', '')
+            if not self.feed.has_symbol(symbol):
+                raise ExchangeError(-1121, 'Invalid symbol.')
+            side = str(params.get('side', '')).upper()
+            if side not in ('BUY', 'SELL'):
+                raise ExchangeError(-1102, "Mandatory parameter 'side' was not sent, was empty/null, or malformed.")
+            order_type = str(params.get('type', '')).upper()
+            if order_type not in ('MARKET', 'LIMIT') and order_type not in _TRIGGER_TYPES:
+                raise ExchangeError(-1116, 'Invalid orderType.')
+
+            now = self.clock.now_ms()
+            price = float(params.get('price') or 0)
+            stop_price = float(params.get('stopPrice') or 0)
+            close_position = str(params.get('closePosition', 'false')).lower() == 'true'
+            reduce_only = str(params.get('reduceOnly', 'false')).lower() == 'true' or close_position
+            quantity = float(params.get('quantity') or 0)
+            if quantity <= 0 and params.get('quoteOrderQty') and order_type == 'MARKET':
+                quantity = float(params['quoteOrderQty']) / self.feed.price(symbol, now)
+            if quantity <= 0 and not close_position:
+                raise ExchangeError(-1013, 'Invalid quantity.')
+            if order_type in ('LIMIT', 'STOP', 'STOP_LOSS_LIMIT', 'TAKE_PROFIT_LIMIT') or \
+                    (market == MARKET_FUTURE and order_type == 'TAKE_PROFIT'):
+                if price <= 0:
+                    raise ExchangeError(-1102, "Mandatory parameter 'price' was not sent, was empty/null, or malformed.")
+            if order_type in _TRIGGER_TYPES and stop_price <= 0:
+                raise ExchangeError(-1102, "Mandatory parameter 'stopPrice' was not sent, was empty/null, or malformed.")
+            if market == MARKET_SPOT and reduce_only:
+                raise ExchangeError(-1106, "Parameter 'reduceOnly' sent when not required.")
+
+            order = {
+                'orderId': next(self._ids), 'market': market, 'symbol': symbol, 'side': side,
+                'type': order_type, 'origType': order_type, 'origQty': quantity, 'price': price,
+                'stopPrice': stop_price, 'timeInForce': str(params.get('timeInForce') or 'GTC').upper(),
+                'reduceOnly': reduce_only, 'closePosition': close_position,
+                'clientOrderId': params.get('newClientOrderId') or f"fake_{now}_{len(self.orders) + 1}",
+                'status': 'NEW', 'executedQty': 0.0, 'cumQuote': 0.0, 'time': now, 'updateTime': now,
+                'checkedAt': now, 'realizedProfit': 0.0, 'triggered': False,
+            }
+            self.stats['orders'] += 1
+
+            if market == MARKET_SPOT and order_type == 'LIMIT':
+                self._lock_spot_funds(order)
+            self.orders[order['orderId']] = order
+            self._emit_order(order, 'NEW')
+            self._process_new(order, now)
+            return self.order_view(order)
+
+    def _process_new(self, order: Dict[str, Any], now: int) -> None:
+        current = self.feed.price(order['symbol'], now)
+        if order['type'] == 'MARKET':
+            self._fill(order, self._slipped(order['side'], current), now, maker=False)
+        elif order['type'] == 'LIMIT':
+            marketable = current <= order['price'] if order['side'] == 'BUY' else current >= order['price']
+            tif = order['timeInForce']
+            if tif == 'GTX' and marketable:
+                self._finish(order, 'EXPIRED', now)
+            elif marketable:
+                self._fill(order, current, now, maker=False)
+            elif tif in ('IOC', 'FOK'):
+                self._finish(order, 'EXPIRED', now)
+        elif order['type'] in _TRIGGER_TYPES:
+            if self._trigger_hit(order, current, current):
+                self._trigger(order, current, now)
+
+    def _slipped(self, side: str, price: float) -> float:
+        return price * (1 + self.slippage) if side == 'BUY' else price * (1 - self.slippage)
+
+    def _trigger_hit(self, order: Dict[str, Any], low: float, high: float) -> bool:
+        direction, _ = _TRIGGER_TYPES[order['type']]
+        if order['side'] == 'SELL':
+            direction = 'down' if direction == 'up' else 'up'
+        return high >= order['stopPrice'] if direction == 'up' else low <= order['stopPrice']
+
+    def _trigger(self, order: Dict[str, Any], current: float, now: int) -> None:
+        _, next_type = _TRIGGER_TYPES[order['type']]
+        if order['market'] == MARKET_SPOT:
+            next_type = _SPOT_TRIGGER_OVERRIDES.get(order['type'], next_type)
+        order['triggered'] = True
+        order['type'] = next_type
+        if next_type == 'MARKET':
+            self._fill(order, self._slipped(order['side'], order['stopPrice']), now, maker=False)
+        else:
+            if order['market'] == MARKET_SPOT:
+                self._lock_spot_funds(order)
+            order['checkedAt'] = now
+            limit_hit = current <= order['price'] if order['side'] == 'BUY' else current >= order['price']
+            if limit_hit:
+                self._fill(order, order['price'], now, maker=True)
+
+    def sync(self) -> None:
+        """마지막 확인 이후 가격 경로로 대기 주문 체결과 강제 청산 처리"""
+        with self._lock:
+            now = self.clock.now_ms()
+            for order in sorted(self.orders.values(), key=lambda o: o['orderId']):
+                if order['status'] not in ('NEW', 'PARTIALLY_FILLED') or order['checkedAt'] >= now:
+                    continue
+                low, high = self.feed.price_range(order['symbol'], order['checkedAt'], now)
+                order['checkedAt'] = now
+                try:
+                    if order['type'] in _TRIGGER_TYPES:
+                        if self._trigger_hit(order, low, high):
+                            self._trigger(order, self.feed.price(order['symbol'], now), now)
+                    elif order['type'] == 'LIMIT':
+                        hit = low <= order['price'] if order['side'] == 'BUY' else high >= order['price']
+                        if hit:
+                            self._fill(order, order['price'], now, maker=True)
+                except ExchangeError:
+                    # 체결 시점의 잔고/증거금 부족 등으로 만료된 주문
+                    continue
+            self._check_liquidations(now)
+
+    def cancel_order(self, market: str, symbol: str, order_id: Optional[int] = None,
+                     client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        """주문 취소"""
+        with self._lock:
+            self.sync()
+            order = self._find(market, symbol, order_id, client_order_id, unknown_code=-2011,
+                               unknown_msg='Unknown order sent.')
+            if order['status'] not in ('NEW', 'PARTIALLY_FILLED'):
+                raise ExchangeError(-2011, 'Unknown order sent.')
+            self._finish(order, 'CANCELED', self.clock.now_ms())
+            return self.order_view(order)
+
+    def cancel_all(self, market: str, symbol: str) -> List[Dict[str, Any]]:
+        """종목의 대기 주문 전체 취소"""
+        with self._lock:
+            return [self.cancel_order(market, symbol, order['orderId']) for order in self.open_orders(market, symbol,
+                                                                                                      raw=True)]
+
+    def get_order(self, market: str, symbol: str, order_id: Optional[int] = None,
+                  client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        """주문 조회"""
+        with self._lock:
+            self.sync()
+            return self.order_view(self._find(market, symbol, order_id, client_order_id))
+
+    def open_orders(self, market: str, symbol: Optional[str] = None, raw: bool = False) -> List[Dict[str, Any]]:
+        """대기 주문 목록"""
+        with self._lock:
+            self.sync()
+            orders = [o for o in self.orders.values()
+                      if o['market'] == market and o['status'] in ('NEW', 'PARTIALLY_FILLED')
+                      and (symbol is None or o['symbol'] == symbol)]
+            return orders if raw else [self.order_view(o) for o in orders]
+
+    def all_orders(self, market: str, symbol: str, limit: int = 500) -> List[Dict[str, Any]]:
+        """종목의 전체 주문 목록 (오래된 순)"""
+        with self._lock:
+            self.sync()
+            orders = [o for o in self.orders.values() if o['market'] == market and o['symbol'] == symbol]
+            return [self.order_view(o) for o in orders[-limit:]]
+
+    def account_trades(self, market: str, symbol: str, limit: int = 500) -> List[Dict[str, Any]]:
+        """종목의 체결 내역"""
+        with self._lock:
+            self.sync()
+            trades = [t for t in self.trades if t['market'] == market and t['symbol'] == symbol]
+            return [self._trade_view(t) for t in trades[-limit:]]
+
+    def _find(self, market, symbol, order_id, client_order_id, unknown_code=-2013,
+              unknown_msg='Order does not exist.') -> Dict[str, Any]:
+        for order in self.orders.values():
+            if order['market'] != market or order['symbol'] != symbol:
+                continue
+            if order_id is not None and order['orderId'] == int(order_id):
+                return order
+            if client_order_id is not None and order['clientOrderId'] == client_order_id:
+                return order
+        raise ExchangeError(unknown_code, unknown_msg)
+
+    # ------------------------------------------------------------------
+    # 체결
+    # ------------------------------------------------------------------
+
+    def _fill(self, order: Dict[str, Any], price: float, now: int, maker: bool) -> None:
+        try:
+            if order['market'] == MARKET_SPOT:
+                quantity, fee, fee_asset, realized = self._apply_spot_fill(order, price)
+            else:
+                quantity, fee, fee_asset, realized = self._apply_futures_fill(order, price)
+        except ExchangeError:
+            self._finish(order, 'EXPIRED', now)
+            raise
+        order['executedQty'] += quantity
+        order['cumQuote'] += quantity * price
+        order['realizedProfit'] += realized
+        order['status'] = 'FILLED'
+        order['updateTime'] = now
+        trade = {'id': next(self._trade_ids), 'market': order['market'], 'symbol': order['symbol'],
+                 'orderId': order['orderId'], 'side': order['side'], 'price': price, 'qty': quantity,
+                 'quoteQty': quantity * price, 'commission': fee, 'commissionAsset': fee_asset,
+                 'realizedPnl': realized, 'time': now, 'maker': maker}
+        self.trades.append(trade)
+        self.stats['fills'] += 1
+        self._emit_order(order, 'TRADE', trade)
+        self._emit_account(order['market'], order['symbol'])
+
+    def _finish(self, order: Dict[str, Any], status: str, now: int) -> None:
+        if order['market'] == MARKET_SPOT and order.get('locked'):
+            self._unlock_spot_funds(order)
+        order['status'] = status
+        order['updateTime'] = now
+        self._emit_order(order, 'CANCELED' if status == 'CANCELED' else 'EXPIRED')
+
+    # 현물 -------------------------------------------------------------
+
+    def _balance(self, asset: str) -> Dict[str, float]:
+        return self.spot_balances.setdefault(asset, {'free': 0.0, 'locked': 0.0})
+
+    def _lock_spot_funds(self, order: Dict[str, Any]) -> None:
+        base, quote = split_symbol(order['symbol'])
+        fee = self.fees[MARKET_SPOT]
+        if order['side'] == 'BUY':
+            asset, amount = quote, order['origQty'] * order['price'] * (1 + fee)
+        else:
+            asset, amount = base, order['origQty']
+        balance = self._balance(asset)
+        if balance['free'] + 1e-12 < amount:
+            order['status'] = 'REJECTED'
+            raise ExchangeError(-2010, 'Account has insufficient balance for requested action.')
+        balance['free'] -= amount
+        balance['locked'] += amount
+        order['locked'] = (asset, amount)
+
+    def _unlock_spot_funds(self, order: Dict[str, Any]) -> None:
+        asset, amount = order.pop('locked')
+        balance = self._balance(asset)
+        balance['locked'] -= amount
+        balance['free'] += amount
+
+    def _apply_spot_fill(self, order: Dict[str, Any], price: float) -> Tuple[float, float, str, float]:
+        base, quote = split_symbol(order['symbol'])
+        if order.get('locked'):
+            self._unlock_spot_funds(order)
+        quantity = order['origQty']
+        cost = quantity * price
+        fee = cost * self.fees[MARKET_SPOT]
+        base_balance, quote_balance = self._balance(base), self._balance(quote)
+        if order['side'] == 'BUY':
+            if quote_balance['free'] + 1e-9 < cost + fee:
+                raise ExchangeError(-2010, 'Account has insufficient balance for requested action.')
+            quote_balance['free'] -= cost + fee
+            base_balance['free'] += quantity
+        else:
+            if base_balance['free'] + 1e-12 < quantity:
+                raise ExchangeError(-2010, 'Account has insufficient balance for requested action.')
+            base_balance['free'] -= quantity
+            quote_balance['free'] += cost - fee
+        return quantity, fee, quote, 0.0
+
+    # 선물 -------------------------------------------------------------
+
+    def position(self, symbol: str) -> Dict[str, Any]:
+        """종목 포지션 (없으면 0 수량으로 생성)"""
+        return self.positions.setdefault(symbol, {'amount': 0.0, 'entryPrice': 0.0,
+                                                  'leverage': self.default_leverage, 'marginType': 'cross',
+                                                  'updateTime': 0})
+
+    def _used_margin(self) -> float:
+        total = 0.0
+        for symbol, position in self.positions.items():
+            if position['amount']:
+                total += abs(position['amount']) * position['entryPrice'] / position['leverage']
+        return total
+
+    def _unrealized(self) -> float:
+        total = 0.0
+        for symbol, position in self.positions.items():
+            if position['amount']:
+                total += position['amount'] * (self.feed.price(symbol) - position['entryPrice'])
+        return total
+
+    def available_balance(self) -> float:
+        """신규 포지션에 쓸 수 있는 선물 증거금"""
+        return self.futures_wallet + min(self._unrealized(), 0.0) - self._used_margin()
+
+    def _apply_futures_fill(self, order: Dict[str, Any], price: float) -> Tuple[float, float, str, float]:
+        position = self.position(order['symbol'])
+        amount = position['amount']
+        sign = 1.0 if order['side'] == 'BUY' else -1.0
+        quantity = abs(amount) if order['closePosition'] else order['origQty']
+        if order['reduceOnly']:
+            if amount == 0 or np.sign(amount) == sign:
+                raise ExchangeError(-2022, 'ReduceOnly Order is rejected.')
+            quantity = min(quantity, abs(amount))
+
+        closing = min(quantity, abs(amount)) if amount and np.sign(amount) != sign else 0.0
+        opening = quantity - closing
+        if opening > 0:
+            required = opening * price / position['leverage']
+            if required > self.available_balance() + 1e-9:
+                raise ExchangeError(-2019, 'Margin is insufficient.')
+
+        realized = closing * (price - position['entryPrice']) * np.sign(amount) if closing else 0.0
+        new_amount = amount + sign * quantity
+        if abs(new_amount) < 1e-12:
+            new_amount, entry = 0.0, 0.0
+        elif opening > 0 and closing == 0:
+            entry = (abs(amount) * position['entryPrice'] + opening * price) / abs(new_amount)
+        elif opening > 0:
+            entry = price  # 방향 전환
+        else:
+            entry = position['entryPrice']
+        fee = quantity * price * self.fees[MARKET_FUTURE]
+        self.futures_wallet += realized - fee
+        position.update(amount=new_amount, entryPrice=entry, updateTime=self.clock.now_ms())
+        return quantity, fee, 'USDT', float(realized)
+
+    def liquidation_price(self, symbol: str) -> float:
+        """포지션 강제 청산 가격 (포지션이 없으면 0)"""
+        position = self.position(symbol)
+        if not position['amount']:
+            return 0.0
+        return float(liquidation_prices(np.array([position['entryPrice']]), np.array([np.sign(position['amount'])]),
+                                        np.array([float(position['leverage'])]),
+                                        self.maintenance_margin_ratio)[0])
+
+    def _check_liquidations(self, now: int) -> None:
+        for symbol, position in self.positions.items():
+            if not position['amount'] or not position.get('checkedAt'):
+                position['checkedAt'] = now
+                continue
+            low, high = self.feed.price_range(symbol, position['checkedAt'], now)
+            position['checkedAt'] = now
+            liquidation = self.liquidation_price(symbol)
+            hit = low <= liquidation if position['amount'] > 0 else high >= liquidation
+            if not hit:
+                continue
+            order = {
+                'orderId': next(self._ids), 'market': MARKET_FUTURE, 'symbol': symbol,
+                'side': 'SELL' if position['amount'] > 0 else 'BUY', 'type': 'MARKET', 'origType': 'LIQUIDATION',
+                'origQty': abs(position['amount']), 'price': 0.0, 'stopPrice': 0.0, 'timeInForce': 'IOC',
+                'reduceOnly': True, 'closePosition': False, 'clientOrderId': f"autoclose-{now}",
+                'status': 'NEW', 'executedQty': 0.0, 'cumQuote': 0.0, 'time': now, 'updateTime': now,
+                'checkedAt': now, 'realizedProfit': 0.0, 'triggered': True,
+            }
+            self.orders[order['orderId']] = order
+            self.stats['liquidations'] += 1
+            self._fill(order, liquidation, now, maker=False)
+
+    def set_leverage(self, symbol: str, leverage: int) -> Dict[str, Any]:
+        """선물 레버리지 설정"""
+        if not self.feed.has_symbol(symbol):
+            raise ExchangeError(-1121, 'Invalid symbol.')
+        if not 1 <= int(leverage) <= 125:
+            raise ExchangeError(-4028, 'Leverage is not valid.')
+        with self._lock:
+            self.position(symbol)['leverage'] = int(leverage)
+        return {'leverage': int(leverage), 'maxNotionalValue': '1000000', 'symbol': symbol}
+
+    def set_margin_type(self, symbol: str, margin_type: str) -> Dict[str, Any]:
+        """선물 마진 유형 설정 (같은 유형이면 바이낸스와 같은 -4046 오류)"""
+        margin_type = margin_type.lower().replace('crossed', 'cross')
+        with self._lock:
+            position = self.position(symbol)
+            if position['marginType'] == margin_type:
+                raise ExchangeError(-4046, 'No need to change margin type.')
+            position['marginType'] = margin_type
+        return {'code': 200, 'msg': 'success'}
+
+    # ------------------------------------------------------------------
+    # 조회 응답 (바이낸스 형식)
+    # ------------------------------------------------------------------
+
+    def order_view(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        executed = order['executedQty']
+        avg = order['cumQuote'] / executed if executed else 0.0
+        common = {
+            'symbol': order['symbol'], 'orderId': order['orderId'], 'clientOrderId': order['clientOrderId'],
+            'price': _fmt(order['price']), 'origQty': _fmt(order['origQty']), 'executedQty': _fmt(executed),
+            'status': order['status'], 'timeInForce': order['timeInForce'], 'type': order['origType'],
+            'side': order['side'], 'stopPrice': _fmt(order['stopPrice']), 'time': order['time'],
+            'updateTime': order['updateTime'],
+        }
+        if order['market'] == MARKET_SPOT:
+            common.update(orderListId=-1, cummulativeQuoteQty=_fmt(order['cumQuote']), icebergQty='0',
+                          isWorking=order['status'] == 'NEW', origQuoteOrderQty='0',
+                          transactTime=order['updateTime'], workingTime=order['time'],
+                          selfTradePreventionMode='NONE')
+            common['fills'] = [{'price': _fmt(t['price']), 'qty': _fmt(t['qty']),
+                                'commission': _fmt(t['commission']), 'commissionAsset': t['commissionAsset'],
+                                'tradeId': t['id']}
+                               for t in self.trades if t['orderId'] == order['orderId']]
+        else:
+            common.update(avgPrice=_fmt(avg), cumQty=_fmt(executed), cumQuote=_fmt(order['cumQuote']),
+                          reduceOnly=order['reduceOnly'], closePosition=order['closePosition'],
+                          positionSide='BOTH', workingType='CONTRACT_PRICE', priceProtect=False,
+                          origType=order['origType'], priceMatch='NONE', selfTradePreventionMode='NONE',
+                          goodTillDate=0)
+        return common
+
+    def _trade_view(self, trade: Dict[str, Any]) -> Dict[str, Any]:
+        view = {'symbol': trade['symbol'], 'id': trade['id'], 'orderId': trade['orderId'],
+                'price': _fmt(trade['price']), 'qty': _fmt(trade['qty']), 'quoteQty': _fmt(trade['quoteQty']),
+                'commission': _fmt(trade['commission']), 'commissionAsset': trade['commissionAsset'],
+                'time': trade['time'], 'isBuyer': trade['side'] == 'BUY', 'isMaker': trade['maker']}
+        if trade['market'] == MARKET_FUTURE:
+            view.update(side=trade['side'], realizedPnl=_fmt(trade['realizedPnl']), positionSide='BOTH',
+                        buyer=trade['side'] == 'BUY', maker=trade['maker'], marginAsset='USDT')
+        else:
+            view.update(orderListId=-1, isBestMatch=True)
+        return view
+
+    def spot_account(self) -> Dict[str, Any]:
+        """현물 계정 정보 (GET /api/v3/account)"""
+        with self._lock:
+            self.sync()
+            balances = [{'asset': asset, 'free': _fmt(b['free']), 'locked': _fmt(b['locked'])}
+                        for asset, b in self.spot_balances.items()]
+        return {'makerCommission': 10, 'takerCommission': 10, 'buyerCommission': 0, 'sellerCommission': 0,
+                'canTrade': True, 'canWithdraw': True, 'canDeposit': True, 'brokered': False,
+                'requireSelfTradePrevention': False, 'updateTime': self.clock.now_ms(), 'accountType': 'SPOT',
+                'balances': balances, 'permissions': ['SPOT']}
+
+    def position_risk(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """선물 포지션 정보 (GET /fapi/v2/positionRisk)"""
+        with self._lock:
+            self.sync()
+            symbols = [symbol] if symbol else self.feed.symbols
+            result = []
+            for s in symbols:
+                position = self.position(s)
+                mark = self.feed.price(s)
+                unrealized = position['amount'] * (mark - position['entryPrice']) if position['amount'] else 0.0
+                notional = position['amount'] * mark
+                result.append({
+                    'symbol': s, 'positionAmt': _fmt(position['amount']), 'entryPrice': _fmt(position['entryPrice']),
+                    'breakEvenPrice': _fmt(position['entryPrice']), 'markPrice': _fmt(mark),
+                    'unRealizedProfit': _fmt(unrealized), 'liquidationPrice': _fmt(self.liquidation_price(s)),
+                    'leverage': str(position['leverage']), 'maxNotionalValue': '1000000',
+                    'marginType': position['marginType'],
+                    'isolatedMargin': _fmt(abs(notional) / position['leverage']
+                                           if position['marginType'] == 'isolated' else 0.0),
+                    'isAutoAddMargin': 'false', 'positionSide': 'BOTH', 'notional': _fmt(notional),
+                    'isolatedWallet': '0', 'updateTime': position['updateTime'],
+                })
+            return result
+
+    def futures_account(self) -> Dict[str, Any]:
+        """선물 계정 정보 (GET /fapi/v2/account, /fapi/v3/account)"""
+        with self._lock:
+            self.sync()
+            unrealized = self._unrealized()
+            used = self._used_margin()
+            maintenance = sum(abs(p['amount']) * self.feed.price(s) * self.maintenance_margin_ratio
+                              for s, p in self.positions.items() if p['amount'])
+            available = self.available_balance()
+            now = self.clock.now_ms()
+            asset = {'asset': 'USDT', 'walletBalance': _fmt(self.futures_wallet),
+                     'unrealizedProfit': _fmt(unrealized), 'marginBalance': _fmt(self.futures_wallet + unrealized),
+                     'maintMargin': _fmt(maintenance), 'initialMargin': _fmt(used),
+                     'positionInitialMargin': _fmt(used), 'openOrderInitialMargin': '0',
+                     'crossWalletBalance': _fmt(self.futures_wallet), 'crossUnPnl': _fmt(unrealized),
+                     'availableBalance': _fmt(available), 'maxWithdrawAmount': _fmt(max(available, 0.0)),
+                     'marginAvailable': True, 'updateTime': now}
+            positions = [{'symbol': p['symbol'], 'positionAmt': p['positionAmt'], 'entryPrice': p['entryPrice'],
+                          'unrealizedProfit': p['unRealizedProfit'], 'leverage': p['leverage'],
+                          'isolated': p['marginType'] == 'isolated', 'positionSide': 'BOTH',
+                          'notional': p['notional'], 'initialMargin': '0', 'maintMargin': '0',
+                          'updateTime': p['updateTime']}
+                         for p in self.position_risk()]
+        return {'feeTier': 0, 'canTrade': True, 'canDeposit': True, 'canWithdraw': True, 'updateTime': now,
+                'totalInitialMargin': _fmt(used), 'totalMaintMargin': _fmt(maintenance),
+                'totalWalletBalance': _fmt(self.futures_wallet), 'totalUnrealizedProfit': _fmt(unrealized),
+                'totalMarginBalance': _fmt(self.futures_wallet + unrealized),
+                'totalPositionInitialMargin': _fmt(used), 'totalOpenOrderInitialMargin': '0',
+                'totalCrossWalletBalance': _fmt(self.futures_wallet), 'totalCrossUnPnl': _fmt(unrealized),
+                'availableBalance': _fmt(available), 'maxWithdrawAmount': _fmt(max(available, 0.0)),
+                'assets': [asset], 'positions': positions}
+
+    def futures_balance(self) -> List[Dict[str, Any]]:
+        """선물 잔고 (GET /fapi/v2/balance)"""
+        account = self.futures_account()
+        asset = account['assets'][0]
+        return [{'accountAlias': 'fake', 'asset': 'USDT', 'balance': asset['walletBalance'],
+                 'crossWalletBalance': asset['crossWalletBalance'], 'crossUnPnl': asset['crossUnPnl'],
+                 'availableBalance': asset['availableBalance'], 'maxWithdrawAmount': asset['maxWithdrawAmount'],
+                 'marginAvailable': True, 'updateTime': asset['updateTime']}]
+
+    # ------------------------------------------------------------------
+    # 사용자 데이터 이벤트
+    # ------------------------------------------------------------------
+
+    def _emit(self, market: str, payload: Dict[str, Any]) -> None:
+        for listener in list(self.listeners):
+            try:
+                listener(market, payload)
+            except Exception:
+                pass
+
+    def _emit_order(self, order: Dict[str, Any], execution_type: str,
+                    trade: Optional[Dict[str, Any]] = None) -> None:
+        if not self.listeners:
+            return
+        now = self.clock.now_ms()
+        last_qty = trade['qty'] if trade else 0.0
+        last_price = trade['price'] if trade else 0.0
+        commission = trade['commission'] if trade else 0.0
+        if order['market'] == MARKET_SPOT:
+            payload = {'e': 'executionReport', 'E': now, 's': order['symbol'], 'c': order['clientOrderId'],
+                       'S': order['side'], 'o': order['origType'], 'f': order['timeInForce'],
+                       'q': _fmt(order['origQty']), 'p': _fmt(order['price']), 'P': _fmt(order['stopPrice']),
+                       'F': '0', 'g': -1, 'C': '', 'x': execution_type, 'X': order['status'], 'r': 'NONE',
+                       'i': order['orderId'], 'l': _fmt(last_qty), 'z': _fmt(order['executedQty']),
+                       'L': _fmt(last_price), 'n': _fmt(commission), 'N': trade['commissionAsset'] if trade else None,
+                       'T': now, 't': trade['id'] if trade else -1, 'I': 0, 'w': order['status'] == 'NEW',
+                       'm': bool(trade and trade['maker']), 'M': False, 'O': order['time'],
+                       'Z': _fmt(order['cumQuote']), 'Y': _fmt(last_qty * last_price), 'Q': '0'}
+        else:
+            executed = order['executedQty']
+            payload = {'e': 'ORDER_TRADE_UPDATE', 'E': now, 'T': now, 'o': {
+                's': order['symbol'], 'c': order['clientOrderId'], 'S': order['side'], 'o': order['type'],
+                'f': order['timeInForce'], 'q': _fmt(order['origQty']), 'p': _fmt(order['price']),
+                'ap': _fmt(order['cumQuote'] / executed if executed else 0.0), 'sp': _fmt(order['stopPrice']),
+                'x': execution_type, 'X': order['status'], 'i': order['orderId'], 'l': _fmt(last_qty),
+                'z': _fmt(executed), 'L': _fmt(last_price), 'N': 'USDT', 'n': _fmt(commission), 'T': now,
+                't': trade['id'] if trade else 0, 'b': '0', 'a': '0', 'm': bool(trade and trade['maker']),
+                'R': order['reduceOnly'], 'wt': 'CONTRACT_PRICE', 'ot': order['origType'], 'ps': 'BOTH',
+                'cp': order['closePosition'], 'rp': _fmt(trade['realizedPnl'] if trade else 0.0)}}
+        self._emit(order['market'], payload)
+
+    def _emit_account(self, market: str, symbol: str) -> None:
+        if not self.listeners:
+            return
+        now = self.clock.now_ms()
+        if market == MARKET_SPOT:
+            assets = split_symbol(symbol)
+            payload = {'e': 'outboundAccountPosition', 'E': now, 'u': now,
+                       'B': [{'a': asset, 'f': _fmt(self._balance(asset)['free']),
+                              'l': _fmt(self._balance(asset)['locked'])} for asset in assets]}
+        else:
+            position = self.position(symbol)
+            unrealized = position['amount'] * (self.feed.price(symbol) - position['entryPrice'])
+            payload = {'e': 'ACCOUNT_UPDATE', 'E': now, 'T': now, 'a': {
+                'm': 'ORDER',
+                'B': [{'a': 'USDT', 'wb': _fmt(self.futures_wallet), 'cw': _fmt(self.futures_wallet), 'bc': '0'}],
+                'P': [{'s': symbol, 'pa': _fmt(position['amount']), 'ep': _fmt(position['entryPrice']),
+                       'cr': '0', 'up': _fmt(unrealized), 'mt': position['marginType'], 'iw': '0',
+                       'ps': 'BOTH'}]}}
+        self._emit(market, payload)
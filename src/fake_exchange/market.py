@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 가상 거래소 시세 데이터
+
+"""
+가상 거래소의 시계와 시세 데이터
+
+- SimulatedClock: 실제 시간보다 빠르게(예: 100배) 흐르는 시계
+- MarketDataFeed: 종목별 1분봉(재생 데이터 또는 재현 가능한 합성 데이터)과
+  분봉 안의 가격 경로. 각 분봉은 시가 → (시가에 가까운 극값) → 반대 극값 → 종가를
+  20초 간격으로 잇는 선형 경로로 보고, 임의 시각의 가격과 구간 최고/최저가를
+  계산합니다. 체결 엔진은 이 경로로 지정가/스탑 주문의 발동 여부를 판정합니다.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.timeframe_store import aggregate_ohlcv
+
+MINUTE_MS = 60_000
+
+# 합성 데이터를 한 번에 늘리는 분봉 수 (7일)
+_EXTEND_MINUTES = 7 * 24 * 60
+
+# 분봉 안 경로 꼭짓점 시각 (분 시작 기준 ms)
+_VERTEX_OFFSETS = np.array([0, 20_000, 40_000, MINUTE_MS - 1])
+
+
+class SimulatedClock:
+    """배속 조절이 가능한 시뮬레이션 시계 (밀리초)"""
+
+    def __init__(self, start_ms: Optional[int] = None, speed: float = 1.0):
+        """
+        Args:
+            start_ms: 시작 시각 (None이면 현재 시각)
+            speed: 배속 (100이면 실제 1초에 100초 진행)
+        """
+        self.start_ms = int(start_ms if start_ms is not None else time.time() * 1000)
+        self.speed = float(speed)
+        self._started = time.monotonic()
+        self._offset_ms = 0.0
+        self._lock = threading.Lock()
+
+    def now_ms(self) -> int:
+        """현재 시뮬레이션 시각"""
+        with self._lock:
+            elapsed = (time.monotonic() - self._started) * 1000 * self.speed
+            return int(self.start_ms + elapsed + self._offset_ms)
+
+    def advance(self, ms: float) -> int:
+        """시각을 즉시 앞으로 이동 (시나리오 재생/테스트용)"""
+        with self._lock:
+            self._offset_ms += ms
+        return self.now_ms()
+
+    def set_speed(self, speed: float) -> None:
+        """배속 변경 (현재 시각은 유지)"""
+        now = self.now_ms()
+        with self._lock:
+            self.start_ms = now
+            self._offset_ms = 0.0
+            self._started = time.monotonic()
+            self.speed = float(speed)
+
+
+class _SymbolSeries:
+    """한 종목의 1분봉 배열과 분봉 안 가격 경로"""
+
+    def __init__(self, times: np.ndarray, ohlcv: np.ndarray):
+        self.times = times
+        self.ohlcv = ohlcv
+        self._build_path()
+
+    def _build_path(self):
+        o, h, l, c = (self.ohlcv[:, i] for i in range(4))
+        low_first = (o - l) <= (h - o)
+        first = np.where(low_first, l, h)
+        second = np.where(low_first, h, l)
+        self.vertex_times = (self.times[:, None] + _VERTEX_OFFSETS[None, :]).ravel()
+        self.vertex_prices = np.column_stack((o, first, second, c)).ravel()
+
+    def append(self, times: np.ndarray, ohlcv: np.ndarray):
+        self.times = np.concatenate((self.times, times))
+        self.ohlcv = np.vstack((self.ohlcv, ohlcv))
+        self._build_path()
+
+
+class MarketDataFeed:
+    """종목별 1분봉 시세와 가격 경로"""
+
+    def __init__(self, clock: SimulatedClock, candles: Optional[Dict[str, pd.DataFrame]] = None,
+                 symbols: Optional[List[str]] = None, start_prices: Optional[Dict[str, float]] = None,
+                 history_minutes: int = 30 * 24 * 60, volatility: float = 0.001, seed: int = 7):
+        """
+        Args:
+            clock: 시뮬레이션 시계
+            candles: 재생할 종목별 1분봉 {거래소 심볼(BTCUSDT): OHLCV DataFrame}
+            symbols: 합성 데이터를 만들 종목 목록 (candles 가 없을 때)
+            start_prices: 합성 데이터 시작 가격
+            history_minutes: 시계 시작 이전에 만들어 둘 합성 과거 분봉 수
+            volatility: 합성 데이터 분봉 수익률 표준편차
+            seed: 합성 데이터 난수 시드
+        """
+        self.clock = clock
+        self.volatility = volatility
+        self._series: Dict[str, _SymbolSeries] = {}
+        self._replay = candles is not None
+        self._rngs: Dict[str, np.random.Generator] = {}
+        self._lock = threading.RLock()
+
+        if candles is not None:
+            for symbol, df in candles.items():
+                self._series[symbol] = self._from_frame(df)
+        else:
+            symbols = symbols or ['BTCUSDT', 'ETHUSDT']
+            start_prices = start_prices or {}
+            first_minute = clock.now_ms() // MINUTE_MS * MINUTE_MS - history_minutes * MINUTE_MS
+            for k, symbol in enumerate(symbols):
+                self._rngs[symbol] = np.random.default_rng(seed + k)
+                price = start_prices.get(symbol, 30000.0 / (10 ** k))
+                times, ohlcv = self._generate(symbol, first_minute, price, history_minutes + _EXTEND_MINUTES)
+                self._series[symbol] = _SymbolSeries(times, ohlcv)
+
+    @staticmethod
+    def _from_frame(df: pd.DataFrame) -> _SymbolSeries:
+        if 'timestamp' in df.columns:
+            df = df.set_index(pd.to_datetime(df['timestamp']))
+        times = df.index.values.astype('datetime64[ms]').astype(np.int64)
+        ohlcv = df[['open', 'high', 'low', 'close', 'volume']].to_numpy(np.float64)
+        return _SymbolSeries(times, ohlcv)
+
+    def _generate(self, symbol: str, first_minute: int, price: float, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        rng = self._rngs[symbol]
+        close = price * np.exp(np.cumsum(rng.normal(0, self.volatility, n)))
+        open_ = np.concatenate(([price], close[:-1]))
+        wick = np.abs(rng.normal(0, self.volatility * 0.5, (2, n)))
+        ohlcv = np.column_stack((open_, np.maximum(open_, close) * (1 + wick[0]),
+                                 np.minimum(open_, close) * (1 - wick[1]), close,
+                                 rng.lognormal(2.0, 0.5, n)))
+        return first_minute + np.arange(n, dtype=np.int64) * MINUTE_MS, ohlcv
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._series)
+
+    def has_symbol(self, symbol: str) -> bool:
+        return symbol in self._series
+
+    def _series_for(self, symbol: str, until_ms: int) -> _SymbolSeries:
+        series = self._series[symbol]
+        if not self._replay:
+            with self._lock:
+                while series.times[-1] < until_ms:
+                    times, ohlcv = self._generate(symbol, int(series.times[-1]) + MINUTE_MS,
+                                                  float(series.ohlcv[-1, 3]), _EXTEND_MINUTES)
+                    series.append(times, ohlcv)
+        return series
+
+    def price(self, symbol: str, at_ms: Optional[int] = None) -> float:
+        """
+        시각별 가격 (분봉 안 경로 보간, 재생 데이터 범위 밖이면 양 끝 가격)
+
+        Args:
+            symbol: 거래소 심볼 (BTCUSDT)
+            at_ms: 시각 (None이면 현재)
+        """
+        at_ms = self.clock.now_ms() if at_ms is None else at_ms
+        series = self._series_for(symbol, at_ms)
+        return float(np.interp(at_ms, series.vertex_times, series.vertex_prices))
+
+    def price_range(self, symbol: str, start_ms: int, end_ms: int) -> Tuple[float, float]:
+        """
+        (start_ms, end_ms] 구간 가격 경로의 최저/최고가
+
+        Returns:
+            tuple: (최저가, 최고가)
+        """
+        series = self._series_for(symbol, end_ms)
+        lo = np.searchsorted(series.vertex_times, start_ms, side='right')
+        hi = np.searchsorted(series.vertex_times, end_ms, side='right')
+        values = np.concatenate((series.vertex_prices[lo:hi],
+                                 [self.price(symbol, start_ms), self.price(symbol, end_ms)]))
+        return float(values.min()), float(values.max())
+
+    def klines(self, symbol: str, interval_ms: int, interval: str, limit: int = 500,
+               start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> List[list]:
+        """
+        현재 시각까지의 캔들 (진행 중인 캔들은 현재가까지 반영)
+
+        Args:
+            symbol: 거래소 심볼
+            interval_ms: 캔들 간격 (ms)
+            interval: 캔들 간격 문자열 (1m, 1h 등)
+            limit: 최대 캔들 수
+            start_ms, end_ms: 조회 구간 (캔들 시작 시각 기준)
+
+        Returns:
+            list: [시작 시각, 시가, 고가, 저가, 종가, 거래량, 종료 시각] 목록
+        """
+        now = self.clock.now_ms()
+        series = self._series_for(symbol, now)
+        upper = now if end_ms is None else min(now, end_ms + interval_ms - 1)
+        last = np.searchsorted(series.times, upper, side='right')
+        if start_ms is not None:
+            first = np.searchsorted(series.times, start_ms // interval_ms * interval_ms, side='left')
+        else:
+            first = max(0, last - (limit + 1) * (interval_ms // MINUTE_MS))
+        if last <= first:
+            return []
+
+        times = series.times[first:last]
+        ohlcv = series.ohlcv[first:last].copy()
+        current_start = int(times[-1])
+        if now < current_start + MINUTE_MS:
+            # 진행 중인 분봉은 현재가까지의 경로만 반영
+            low, high = self.price_range(symbol, current_start, now)
+            fraction = (now - current_start) / MINUTE_MS
+            ohlcv[-1, 1] = max(high, ohlcv[-1, 0])
+            ohlcv[-1, 2] = min(low, ohlcv[-1, 0])
+            ohlcv[-1, 3] = self.price(symbol, now)
+            ohlcv[-1, 4] *= fraction
+
+        starts, bars = aggregate_ohlcv(times * 1_000_000, ohlcv, interval)
+        starts = starts // 1_000_000
+        if start_ms is not None:
+            keep = starts >= start_ms // interval_ms * interval_ms
+            starts, bars = starts[keep][:limit], bars[keep][:limit]
+        else:
+            starts, bars = starts[-limit:], bars[-limit:]
+        return [[int(t), *row.tolist(), int(t) + interval_ms - 1] for t, row in zip(starts, bars)]
+
+    def ticker_24h(self, symbol: str) -> Dict[str, float]:
+        """최근 24시간 시가/고가/저가/현재가/거래량"""
+        now = self.clock.now_ms()
+        rows = np.array(self.klines(symbol, MINUTE_MS, '1m', limit=24 * 60), dtype=np.float64)
+        return {'open': float(rows[0, 1]), 'high': float(rows[:, 2].max()), 'low': float(rows[:, 3].min()),
+                'last': self.price(symbol, now), 'volume': float(rows[:, 5].sum()),
+                'quote_volume': float((rows[:, 5] * rows[:, 4]).sum()), 'open_time': int(rows[0, 0]),
+                'close_time': now}
+
+    def order_book(self, symbol: str, limit: int = 100, spread: float = 0.0001) -> Dict[str, list]:
+        """
+        현재가 중심의 합성 호가창
+
+        Args:
+            symbol: 거래소 심볼
+            limit: 호가 단계 수
+            spread: 호가 단계 간격 비율
+
+        Returns:
+            dict: bids, asks ([가격, 수량] 목록)
+        """
+        mid = self.price(symbol)
+        steps = np.arange(limit) + 0.5
+        sizes = 0.5 + (np.arange(limit) % 5) * 0.25 + steps * 0.01
+        bids = mid * (1 - spread * steps)
+        asks = mid * (1 + spread * steps)
+        return {'bids': [[float(p), float(q)] for p, q in zip(bids, sizes)],
+                'asks': [[float(p), float(q)] for p, q in zip(asks, sizes)]}
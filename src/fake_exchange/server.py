@@ -0,0 +1,749 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 가상 거래소 HTTP/웹소켓 서버
+
+"""
+로컬 가상 거래소 서버
+
+ccxt 바이낸스 클라이언트가 사용하는 현물(/api/v3)과 USDT-M 선물(/fapi) 엔드포인트 일부와
+바이낸스 형식 웹소켓 스트림(/ws/<스트림>, /stream?streams=)을 제공합니다.
+응답 지연/지터, 분당 가중치 한도 초과 시 429 응답, 임의 429 주입을 설정할 수 있어
+여러 봇을 동시에 붙이는 부하 테스트나 배속 시나리오 재생에 사용합니다.
+서명은 검증하지 않으며 계정은 하나입니다.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import random
+import select
+import socket
+import struct
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+from src.fake_exchange.engine import MatchingEngine, ExchangeError, MARKET_SPOT, MARKET_FUTURE, split_symbol
+from src.fake_exchange.market import MarketDataFeed, SimulatedClock
+from src.logging_config import get_logger
+from src.timeframe_store import timeframe_to_ns
+
+logger = get_logger('crypto_bot.fake_exchange')
+
+_WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+_SPOT_ORDER_TYPES = ['LIMIT', 'LIMIT_MAKER', 'MARKET', 'STOP_LOSS', 'STOP_LOSS_LIMIT', 'TAKE_PROFIT',
+                     'TAKE_PROFIT_LIMIT']
+_FUTURE_ORDER_TYPES = ['LIMIT', 'MARKET', 'STOP', 'STOP_MARKET', 'TAKE_PROFIT', 'TAKE_PROFIT_MARKET',
+                       'TRAILING_STOP_MARKET']
+
+
+def _interval_ms(interval: str) -> int:
+    try:
+        return timeframe_to_ns(interval) // 1_000_000
+    except ValueError:
+        raise ExchangeError(-1120, 'Invalid interval.')
+
+
+def _precision(price: float) -> Tuple[int, int]:
+    """가격 크기에 맞춘 (가격 소수 자릿수, 수량 소수 자릿수)"""
+    magnitude = len(str(int(max(price, 1.0))))
+    return max(0, 6 - magnitude), min(6, max(0, magnitude - 2))
+
+
+class FakeExchangeServer:
+    """가상 거래소 HTTP/웹소켓 서버"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, feed: Optional[MarketDataFeed] = None,
+                 engine: Optional[MatchingEngine] = None, speed: float = 1.0, latency_ms: float = 0.0,
+                 jitter_ms: float = 0.0, weight_limit: int = 6000, rate_limit_probability: float = 0.0,
+                 stream_interval: float = 1.0, seed: int = 0):
+        """
+        Args:
+            host: 바인딩 주소
+            port: 포트 (0이면 임의 포트)
+            feed: 시세 데이터 (None이면 합성 데이터)
+            engine: 체결 엔진 (None이면 feed 로 생성)
+            speed: feed 를 만들 때 사용할 시계 배속
+            latency_ms: 응답 지연 (ms)
+            jitter_ms: 응답 지연 편차 (±ms, 균등 분포)
+            weight_limit: 분당 요청 가중치 한도 (초과 시 429)
+            rate_limit_probability: 요청마다 429 를 임의로 반환할 확률
+            stream_interval: 웹소켓 시세 스트림 전송 간격 (실제 초)
+            seed: 지터/429 주입 난수 시드
+        """
+        self.feed = feed or MarketDataFeed(SimulatedClock(speed=speed))
+        self.clock = self.feed.clock
+        self.engine = engine or MatchingEngine(self.feed)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.weight_limit = weight_limit
+        self.rate_limit_probability = rate_limit_probability
+        self.stream_interval = stream_interval
+        self.stats: Dict[str, Any] = {'requests': 0, 'rate_limited': 0, 'errors': 0, 'ws_connections': 0,
+                                      'routes': {}}
+        self.listen_keys: Dict[str, str] = {}
+        self.dual_side_position = False
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._weight_window = 0
+        self._weight_used = 0
+        self._sessions: List['_WebSocketSession'] = []
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._routes = self._build_routes()
+        self.engine.listeners.append(self._dispatch_user_event)
+
+        handler = type('FakeExchangeHandler', (_RequestHandler,), {'app': self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+
+    # ------------------------------------------------------------------
+    # 수명 주기
+    # ------------------------------------------------------------------
+
+    @property
+    def url(self) -> str:
+        """서버 기본 URL (http://host:port)"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def ws_url(self) -> str:
+        """웹소켓 기본 URL (ws://host:port)"""
+        return self.url.replace('http://', 'ws://')
+
+    def start(self) -> str:
+        """백그라운드 스레드에서 서버 시작 후 기본 URL 반환"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='fake-exchange', daemon=True)
+        self._thread.start()
+        logger.info(f"가상 거래소 서버 시작: {self.url} (배속 {self.clock.speed}x)")
+        return self.url
+
+    def serve_forever(self) -> None:
+        """현재 스레드에서 서버 실행"""
+        logger.info(f"가상 거래소 서버 시작: {self.url} (배속 {self.clock.speed}x)")
+        self.httpd.serve_forever()
+
+    def stop(self) -> None:
+        """서버 중지"""
+        self._stopping.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+        logger.info("가상 거래소 서버 중지")
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # 요청 처리
+    # ------------------------------------------------------------------
+
+    def _build_routes(self) -> Dict[Tuple[str, str], Tuple[Callable, int]]:
+        routes: Dict[Tuple[str, str], Tuple[Callable, int]] = {}
+        for market, prefix in ((MARKET_SPOT, '/api/v3'), (MARKET_FUTURE, '/fapi/v1')):
+            def bind(func, m=market):
+                return lambda params: func(m, params)
+
+            routes.update({
+                ('GET', f'{prefix}/ping'): (lambda params: {}, 1),
+                ('GET', f'{prefix}/time'): (lambda params: {'serverTime': self.clock.now_ms()}, 1),
+                ('GET', f'{prefix}/exchangeInfo'): (bind(self._exchange_info), 20),
+                ('GET', f'{prefix}/klines'): (bind(self._klines), 2),
+                ('GET', f'{prefix}/ticker/24hr'): (bind(self._ticker_24h), 2),
+                ('GET', f'{prefix}/ticker/price'): (bind(self._ticker_price), 2),
+                ('GET', f'{prefix}/ticker/bookTicker'): (bind(self._book_ticker), 2),
+                ('GET', f'{prefix}/depth'): (bind(self._depth), 5),
+                ('POST', f'{prefix}/order'): (bind(self._create_order), 1),
+                ('GET', f'{prefix}/order'): (bind(self._get_order), 4),
+                ('DELETE', f'{prefix}/order'): (bind(self._cancel_order), 1),
+                ('GET', f'{prefix}/openOrders'): (bind(self._open_orders), 6),
+                ('GET', f'{prefix}/allOrders'): (bind(self._all_orders), 20),
+            })
+        routes.update({
+            ('GET', '/api/v3/uiKlines'): (lambda params: self._klines(MARKET_SPOT, params), 2),
+            ('DELETE', '/api/v3/openOrders'): (lambda params: self._cancel_all(MARKET_SPOT, params), 1),
+            ('GET', '/api/v3/account'): (lambda params: self.engine.spot_account(), 20),
+            ('GET', '/api/v3/myTrades'): (lambda params: self._my_trades(MARKET_SPOT, params), 20),
+            ('POST', '/api/v3/userDataStream'): (lambda params: self._new_listen_key(MARKET_SPOT), 2),
+            ('PUT', '/api/v3/userDataStream'): (lambda params: {}, 2),
+            ('DELETE', '/api/v3/userDataStream'): (self._delete_listen_key, 2),
+            ('GET', '/fapi/v1/premiumIndex'): (self._premium_index, 1),
+            ('DELETE', '/fapi/v1/allOpenOrders'): (lambda params: self._cancel_all(MARKET_FUTURE, params), 1),
+            ('POST', '/fapi/v1/batchOrders'): (self._batch_orders, 5),
+            ('GET', '/fapi/v1/userTrades'): (lambda params: self._my_trades(MARKET_FUTURE, params), 5),
+            ('POST', '/fapi/v1/leverage'): (lambda params: self.engine.set_leverage(
+                params.get('symbol', ''), int(params.get('leverage', 0))), 1),
+            ('POST', '/fapi/v1/marginType'): (lambda params: self.engine.set_margin_type(
+                params.get('symbol', ''), params.get('marginType', '')), 1),
+            ('GET', '/fapi/v1/positionSide/dual'): (lambda params: {'dualSidePosition': self.dual_side_position}, 30),
+            ('POST', '/fapi/v1/positionSide/dual'): (self._set_position_mode, 1),
+            ('GET', '/fapi/v1/leverageBracket'): (self._leverage_brackets, 1),
+            ('POST', '/fapi/v1/listenKey'): (lambda params: self._new_listen_key(MARKET_FUTURE), 1),
+            ('PUT', '/fapi/v1/listenKey'): (lambda params: {}, 1),
+            ('DELETE', '/fapi/v1/listenKey'): (self._delete_listen_key, 1),
+        })
+        for version in ('v1', 'v2', 'v3'):
+            routes.update({
+                ('GET', f'/fapi/{version}/positionRisk'): (
+                    lambda params: self.engine.position_risk(params.get('symbol')), 5),
+                ('GET', f'/fapi/{version}/account'): (lambda params: self.engine.futures_account(), 5),
+                ('GET', f'/fapi/{version}/balance'): (lambda params: self.engine.futures_balance(), 5),
+            })
+        return routes
+
+    def handle(self, method: str, path: str, params: Dict[str, str]) -> Tuple[int, Any, Dict[str, str]]:
+        """
+        HTTP 요청 하나 처리
+
+        Returns:
+            tuple: (상태 코드, JSON 본문, 추가 헤더)
+        """
+        route = self._routes.get((method, path))
+        if route is None:
+            return 404, {'code': -1, 'msg': f'Unknown endpoint {method} {path}'}, {}
+        func, weight = route
+
+        delay = self.latency_ms
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['routes'][path] = self.stats['routes'].get(path, 0) + 1
+            if self.jitter_ms:
+                delay += self._random.uniform(-self.jitter_ms, self.jitter_ms)
+            window = int(time.monotonic() // 60)
+            if window != self._weight_window:
+                self._weight_window, self._weight_used = window, 0
+            self._weight_used += weight
+            used = self._weight_used
+            injected = self.rate_limit_probability and self._random.random() < self.rate_limit_probability
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        headers = {'x-mbx-used-weight-1m': str(used), 'x-mbx-used-weight': str(used)}
+        if used > self.weight_limit or injected:
+            with self._lock:
+                self.stats['rate_limited'] += 1
+            headers['Retry-After'] = str(max(1, 60 - int(time.monotonic() % 60)))
+            return 429, {'code': -1003, 'msg': f'Too much request weight used; current limit is '
+                                               f'{self.weight_limit} request weight per 1 MINUTE.'}, headers
+        try:
+            return 200, func(params), headers
+        except ExchangeError as e:
+            with self._lock:
+                self.stats['errors'] += 1
+            return e.status, e.to_dict(), headers
+        except (ValueError, KeyError) as e:
+            with self._lock:
+                self.stats['errors'] += 1
+            return 400, {'code': -1100, 'msg': f'Illegal characters found in parameter: {e}'}, headers
+
+    # 시세 -------------------------------------------------------------
+
+    def _check_symbol(self, symbol: Optional[str]) -> str:
+        if not symbol or not self.feed.has_symbol(symbol):
+            raise ExchangeError(-1121, 'Invalid symbol.')
+        return symbol
+
+    def _exchange_info(self, market: str, params: Dict[str, str]) -> Dict[str, Any]:
+        symbols = []
+        for symbol in self.feed.symbols:
+            base, quote = split_symbol(symbol)
+            price_digits, qty_digits = _precision(self.feed.price(symbol))
+            tick, step = f"{10 ** -price_digits:.8f}", f"{10 ** -qty_digits:.8f}"
+            filters = [
+                {'filterType': 'PRICE_FILTER', 'minPrice': tick, 'maxPrice': '10000000', 'tickSize': tick},
+                {'filterType': 'LOT_SIZE', 'minQty': step, 'maxQty': '100000', 'stepSize': step},
+                {'filterType': 'MARKET_LOT_SIZE', 'minQty': step, 'maxQty': '100000', 'stepSize': step},
+            ]
+            entry = {'symbol': symbol, 'status': 'TRADING', 'baseAsset': base, 'quoteAsset': quote,
+                     'baseAssetPrecision': 8, 'quotePrecision': 8, 'quoteAssetPrecision': 8}
+            if market == MARKET_SPOT:
+                filters.append({'filterType': 'NOTIONAL', 'minNotional': '5', 'applyMinToMarket': True,
+                                'maxNotional': '9000000', 'applyMaxToMarket': False, 'avgPriceMins': 5})
+                entry.update(orderTypes=_SPOT_ORDER_TYPES, icebergAllowed=False, ocoAllowed=False,
+                             isSpotTradingAllowed=True, isMarginTradingAllowed=False, permissions=['SPOT'],
+                             permissionSets=[['SPOT']], baseCommissionPrecision=8, quoteCommissionPrecision=8)
+            else:
+                filters.append({'filterType': 'MIN_NOTIONAL', 'notional': '5'})
+                entry.update(pair=symbol, contractType='PERPETUAL', deliveryDate=4133404800000,
+                             onboardDate=1569398400000, marginAsset=quote, pricePrecision=price_digits,
+                             quantityPrecision=qty_digits, underlyingType='COIN', settlePlan=0,
+                             triggerProtect='0.0500', liquidationFee='0.012500', marketTakeBound='0.05',
+                             maintMarginPercent='2.5000', requiredMarginPercent='5.0000',
+                             orderTypes=_FUTURE_ORDER_TYPES, timeInForce=['GTC', 'IOC', 'FOK', 'GTX'])
+            entry['filters'] = filters
+            symbols.append(entry)
+        info = {'timezone': 'UTC', 'serverTime': self.clock.now_ms(), 'exchangeFilters': [],
+                'rateLimits': [{'rateLimitType': 'REQUEST_WEIGHT', 'interval': 'MINUTE', 'intervalNum': 1,
+                                'limit': self.weight_limit}],
+                'symbols': symbols}
+        if market == MARKET_FUTURE:
+            info['assets'] = [{'asset': 'USDT', 'marginAvailable': True, 'autoAssetExchange': '0'}]
+        return info
+
+    def _klines(self, market: str, params: Dict[str, str]) -> List[list]:
+        symbol = self._check_symbol(params.get('symbol'))
+        interval = params.get('interval', '')
+        limit = min(int(params.get('limit', 500)), 1500 if market == MARKET_FUTURE else 1000)
+        start = int(params['startTime']) if params.get('startTime') else None
+        end = int(params['endTime']) if params.get('endTime') else None
+        rows = self.feed.klines(symbol, _interval_ms(interval), interval, limit, start, end)
+        # 바이낸스 형식: [시작, 시가, 고가, 저가, 종가, 거래량, 종료, 거래대금, 체결 수, 매수 거래량, 매수 거래대금, 0]
+        return [[t, str(o), str(h), str(l), str(c), str(v), close_time, str(v * c), 0, str(v / 2), str(v * c / 2),
+                 '0'] for t, o, h, l, c, v, close_time in rows]
+
+    def _ticker_one(self, market: str, symbol: str) -> Dict[str, Any]:
+        ticker = self.feed.ticker_24h(symbol)
+        book = self.feed.order_book(symbol, 1)
+        change = ticker['last'] - ticker['open']
+        result = {'symbol': symbol, 'priceChange': str(change),
+                  'priceChangePercent': f"{change / ticker['open'] * 100:.3f}",
+                  'weightedAvgPrice': str(ticker['quote_volume'] / ticker['volume'] if ticker['volume'] else 0),
+                  'lastPrice': str(ticker['last']), 'lastQty': '0', 'openPrice': str(ticker['open']),
+                  'highPrice': str(ticker['high']), 'lowPrice': str(ticker['low']),
+                  'volume': str(ticker['volume']), 'quoteVolume': str(ticker['quote_volume']),
+                  'openTime': ticker['open_time'], 'closeTime': ticker['close_time'],
+                  'firstId': 0, 'lastId': 0, 'count': 0}
+        if market == MARKET_SPOT:
+            result.update(prevClosePrice=str(ticker['open']), bidPrice=str(book['bids'][0][0]),
+                          bidQty=str(book['bids'][0][1]), askPrice=str(book['asks'][0][0]),
+                          askQty=str(book['asks'][0][1]))
+        return result
+
+    def _ticker_24h(self, market: str, params: Dict[str, str]):
+        if params.get('symbol'):
+            return self._ticker_one(market, self._check_symbol(params['symbol']))
+        return [self._ticker_one(market, symbol) for symbol in self.feed.symbols]
+
+    def _ticker_price(self, market: str, params: Dict[str, str]):
+        def one(symbol):
+            return {'symbol': symbol, 'price': str(self.feed.price(symbol)), 'time': self.clock.now_ms()}
+
+        if params.get('symbol'):
+            return one(self._check_symbol(params['symbol']))
+        return [one(symbol) for symbol in self.feed.symbols]
+
+    def _book_ticker(self, market: str, params: Dict[str, str]):
+        def one(symbol):
+            book = self.feed.order_book(symbol, 1)
+            return {'symbol': symbol, 'bidPrice': str(book['bids'][0][0]), 'bidQty': str(book['bids'][0][1]),
+                    'askPrice': str(book['asks'][0][0]), 'askQty': str(book['asks'][0][1]),
+                    'time': self.clock.now_ms()}
+
+        if params.get('symbol'):
+            return one(self._check_symbol(params['symbol']))
+        return [one(symbol) for symbol in self.feed.symbols]
+
+    def _depth(self, market: str, params: Dict[str, str]) -> Dict[str, Any]:
+        symbol = self._check_symbol(params.get('symbol'))
+        book = self.feed.order_book(symbol, min(int(params.get('limit', 100)), 1000))
+        now = self.clock.now_ms()
+        result = {'lastUpdateId': now,
+                  'bids': [[str(p), str(q)] for p, q in book['bids']],
+                  'asks': [[str(p), str(q)] for p, q in book['asks']]}
+        if market == MARKET_FUTURE:
+            result.update(E=now, T=now)
+        return result
+
+    def _premium_index(self, params: Dict[str, str]):
+        def one(symbol):
+            price = str(self.feed.price(symbol))
+            return {'symbol': symbol, 'markPrice': price, 'indexPrice': price, 'estimatedSettlePrice': price,
+                    'lastFundingRate': '0.00010000', 'interestRate': '0.00010000',
+                    'nextFundingTime': (self.clock.now_ms() // 28_800_000 + 1) * 28_800_000,
+                    'time': self.clock.now_ms()}
+
+        if params.get('symbol'):
+            return one(self._check_symbol(params['symbol']))
+        return [one(symbol) for symbol in self.feed.symbols]
+
+    def _leverage_brackets(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        brackets = [{'bracket': 1, 'initialLeverage': 125, 'notionalCap': 50000, 'notionalFloor': 0,
+                     'maintMarginRatio': self.engine.maintenance_margin_ratio, 'cum': 0.0},
+                    {'bracket': 2, 'initialLeverage': 20, 'notionalCap': 10_000_000, 'notionalFloor': 50000,
+                     'maintMarginRatio': 0.025, 'cum': 50000 * (0.025 - self.engine.maintenance_margin_ratio)}]
+        symbols = [params['symbol']] if params.get('symbol') else self.feed.symbols
+        return [{'symbol': symbol, 'brackets': brackets} for symbol in symbols]
+
+    # 주문/계정 ---------------------------------------------------------
+
+    def _create_order(self, market: str, params: Dict[str, str]) -> Dict[str, Any]:
+        if params.get('type') == 'LIMIT_MAKER':
+            params = dict(params, type='LIMIT', timeInForce='GTX')
+        return self.engine.place_order(market, params)
+
+    def _batch_orders(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        """선물 일괄 주문 (최대 5건, 주문별 결과 또는 오류를 같은 순서로 반환)"""
+        orders = json.loads(params.get('batchOrders') or '[]')
+        if not isinstance(orders, list) or not 0 < len(orders) <= 5:
+            raise ExchangeError(-1130, "Data sent for parameter 'batchOrders' is not valid.")
+        results = []
+        for order in orders:
+            try:
+                results.append(self._create_order(MARKET_FUTURE, {k: str(v) for k, v in order.items()}))
+            except ExchangeError as e:
+                results.append(e.to_dict())
+        return results
+
+    def _get_order(self, market: str, params: Dict[str, str]) -> Dict[str, Any]:
+        return self.engine.get_order(market, self._check_symbol(params.get('symbol')), params.get('orderId'),
+                                     params.get('origClientOrderId'))
+
+    def _cancel_order(self, market: str, params: Dict[str, str]) -> Dict[str, Any]:
+        return self.engine.cancel_order(market, self._check_symbol(params.get('symbol')), params.get('orderId'),
+                                        params.get('origClientOrderId'))
+
+    def _cancel_all(self, market: str, params: Dict[str, str]):
+        canceled = self.engine.cancel_all(market, self._check_symbol(params.get('symbol')))
+        return canceled if market == MARKET_SPOT else {'code': 200,
+                                                       'msg': 'The operation of cancel all open order is done.'}
+
+    def _open_orders(self, market: str, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        return self.engine.open_orders(market, params.get('symbol'))
+
+    def _all_orders(self, market: str, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        return self.engine.all_orders(market, self._check_symbol(params.get('symbol')),
+                                      int(params.get('limit', 500)))
+
+    def _my_trades(self, market: str, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        return self.engine.account_trades(market, self._check_symbol(params.get('symbol')),
+                                          int(params.get('limit', 500)))
+
+    def _set_position_mode(self, params: Dict[str, str]) -> Dict[str, Any]:
+        dual = str(params.get('dualSidePosition', 'false')).lower() == 'true'
+        if dual:
+            raise ExchangeError(-4059, 'Hedge mode is not supported by the fake exchange.')
+        if dual == self.dual_side_position:
+            raise ExchangeError(-4059, 'No need to change position side.')
+        self.dual_side_position = dual
+        return {'code': 200, 'msg': 'success'}
+
+    def _new_listen_key(self, market: str) -> Dict[str, str]:
+        key = uuid.uuid4().hex + uuid.uuid4().hex
+        with self._lock:
+            self.listen_keys[key] = market
+        return {'listenKey': key}
+
+    def _delete_listen_key(self, params: Dict[str, str]) -> Dict[str, Any]:
+        with self._lock:
+            self.listen_keys.pop(params.get('listenKey', ''), None)
+        return {}
+
+    # ------------------------------------------------------------------
+    # 웹소켓 스트림
+    # ------------------------------------------------------------------
+
+    def _dispatch_user_event(self, market: str, payload: Dict[str, Any]) -> None:
+        with self._lock:
+            keys = {key for key, key_market in self.listen_keys.items() if key_market == market}
+            sessions = list(self._sessions)
+        for session in sessions:
+            for key in keys & session.streams:
+                session.queue_message(key, payload)
+
+    def stream_message(self, stream: str, state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        시세 스트림 메시지 생성
+
+        Args:
+            stream: 스트림 이름 (btcusdt@kline_1m, btcusdt@ticker, btcusdt@trade, btcusdt@depth5 등)
+            state: 스트림별 상태 (직전 캔들 시작 시각, 체결 번호)
+
+        Returns:
+            list: 전송할 메시지 목록 (알 수 없는 스트림이면 빈 목록)
+        """
+        name, _, kind = stream.partition('@')
+        symbol = name.upper()
+        if not self.feed.has_symbol(symbol):
+            return []
+        now = self.clock.now_ms()
+        if kind.startswith('kline_'):
+            interval = kind[len('kline_'):]
+            rows = self.feed.klines(symbol, _interval_ms(interval), interval, limit=2)
+            messages = []
+            if state.get('start') is not None and rows[-1][0] != state['start'] and len(rows) > 1:
+                messages.append(self._kline_event(symbol, interval, rows[-2], True, now))
+            state['start'] = rows[-1][0]
+            messages.append(self._kline_event(symbol, interval, rows[-1], False, now))
+            return messages
+        if kind == 'ticker':
+            ticker = self._ticker_one(MARKET_SPOT, symbol)
+            return [{'e': '24hrTicker', 'E': now, 's': symbol, 'p': ticker['priceChange'],
+                     'P': ticker['priceChangePercent'], 'w': ticker['weightedAvgPrice'],
+                     'x': ticker['prevClosePrice'], 'c': ticker['lastPrice'], 'Q': '0',
+                     'b': ticker['bidPrice'], 'B': ticker['bidQty'], 'a': ticker['askPrice'],
+                     'A': ticker['askQty'], 'o': ticker['openPrice'], 'h': ticker['highPrice'],
+                     'l': ticker['lowPrice'], 'v': ticker['volume'], 'q': ticker['quoteVolume'],
+                     'O': ticker['openTime'], 'C': ticker['closeTime'], 'F': 0, 'L': 0, 'n': 0}]
+        if kind in ('trade', 'aggTrade'):
+            state['trade_id'] = state.get('trade_id', 0) + 1
+            return [{'e': kind, 'E': now, 's': symbol, 't' if kind == 'trade' else 'a': state['trade_id'],
+                     'p': str(self.feed.price(symbol, now)), 'q': '0.01', 'T': now,
+                     'm': state['trade_id'] % 2 == 0, 'M': True}]
+        if kind.startswith('depth'):
+            levels = ''.join(filter(str.isdigit, kind.split('@')[0])) or '20'
+            book = self.feed.order_book(symbol, int(levels))
+            return [{'lastUpdateId': now, 'bids': [[str(p), str(q)] for p, q in book['bids']],
+                     'asks': [[str(p), str(q)] for p, q in book['asks']]}]
+        return []
+
+    @staticmethod
+    def _kline_event(symbol: str, interval: str, row: list, closed: bool, now: int) -> Dict[str, Any]:
+        t, o, h, l, c, v, close_time = row
+        return {'e': 'kline', 'E': now, 's': symbol, 'k': {
+            't': t, 'T': close_time, 's': symbol, 'i': interval, 'f': 0, 'L': 0, 'o': str(o), 'c': str(c),
+            'h': str(h), 'l': str(l), 'v': str(v), 'n': 0, 'x': closed, 'q': str(v * c), 'V': str(v / 2),
+            'Q': str(v * c / 2), 'B': '0'}}
+
+    def register_session(self, session: '_WebSocketSession') -> None:
+        with self._lock:
+            self._sessions.append(session)
+            self.stats['ws_connections'] += 1
+
+    def unregister_session(self, session: '_WebSocketSession') -> None:
+        with self._lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+
+
+# ----------------------------------------------------------------------
+# 웹소켓 프레임 (RFC 6455)
+# ----------------------------------------------------------------------
+
+OP_TEXT = 0x1
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    data = b''
+    while len(data) < n:
+        chunk = sock.recv(n - len(data))
+        if not chunk:
+            raise ConnectionError('웹소켓 연결이 끊어졌습니다.')
+        data += chunk
+    return data
+
+
+def write_frame(sock: socket.socket, payload: bytes, opcode: int = OP_TEXT, mask: bool = False) -> None:
+    """웹소켓 프레임 전송 (클라이언트는 mask=True)"""
+    header = bytes([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    length = len(payload)
+    if length < 126:
+        header += bytes([mask_bit | length])
+    elif length < 1 << 16:
+        header += bytes([mask_bit | 126]) + struct.pack('!H', length)
+    else:
+        header += bytes([mask_bit | 127]) + struct.pack('!Q', length)
+    if mask:
+        key = os.urandom(4)
+        payload = bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+        header += key
+    sock.sendall(header + payload)
+
+
+def read_frame(sock: socket.socket) -> Tuple[int, bytes]:
+    """웹소켓 프레임 수신 (조각난 프레임은 이어 붙임)"""
+    chunks = []
+    while True:
+        first, second = _recv_exact(sock, 2)
+        opcode = first & 0x0F
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack('!H', _recv_exact(sock, 2))[0]
+        elif length == 127:
+            length = struct.unpack('!Q', _recv_exact(sock, 8))[0]
+        key = _recv_exact(sock, 4) if second & 0x80 else None
+        payload = _recv_exact(sock, length)
+        if key:
+            payload = bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+        if opcode >= OP_CLOSE:
+            return opcode, payload
+        chunks.append((opcode, payload))
+        if first & 0x80:
+            return chunks[0][0], b''.join(chunk for _, chunk in chunks)
+
+
+class _WebSocketSession:
+    """웹소켓 연결 하나의 구독 스트림과 전송 루프"""
+
+    def __init__(self, app: FakeExchangeServer, sock: socket.socket, streams: List[str], combined: bool):
+        self.app = app
+        self.sock = sock
+        self.streams = set(streams)
+        self.combined = combined
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._pending: List[Tuple[str, Dict[str, Any]]] = []
+        self._send_lock = threading.Lock()
+
+    def queue_message(self, stream: str, payload: Dict[str, Any]) -> None:
+        with self._send_lock:
+            self._pending.append((stream, payload))
+
+    def _send(self, stream: str, payload: Dict[str, Any]) -> None:
+        message = {'stream': stream, 'data': payload} if self.combined else payload
+        write_frame(self.sock, json.dumps(message).encode('utf-8'))
+
+    def _handle_request(self, text: str) -> None:
+        try:
+            request = json.loads(text)
+        except ValueError:
+            return
+        method = request.get('method')
+        params = [str(p) for p in request.get('params') or []]
+        result = None
+        if method == 'SUBSCRIBE':
+            self.streams.update(params)
+        elif method == 'UNSUBSCRIBE':
+            self.streams.difference_update(params)
+        elif method == 'LIST_SUBSCRIPTIONS':
+            result = sorted(self.streams)
+        write_frame(self.sock, json.dumps({'result': result, 'id': request.get('id')}).encode('utf-8'))
+
+    def run(self) -> None:
+        self.app.register_session(self)
+        next_push = 0.0
+        try:
+            while not self.app._stopping.is_set():
+                readable, _, _ = select.select([self.sock], [], [], 0.02)
+                if readable:
+                    opcode, payload = read_frame(self.sock)
+                    if opcode == OP_CLOSE:
+                        write_frame(self.sock, payload[:2], OP_CLOSE)
+                        break
+                    if opcode == OP_PING:
+                        write_frame(self.sock, payload, OP_PONG)
+                    elif opcode == OP_TEXT:
+                        self._handle_request(payload.decode('utf-8'))
+                with self._send_lock:
+                    pending, self._pending = self._pending, []
+                for stream, payload in pending:
+                    self._send(stream, payload)
+                if time.monotonic() >= next_push:
+                    next_push = time.monotonic() + self.app.stream_interval
+                    for stream in sorted(self.streams):
+                        if stream in self.app.listen_keys:
+                            continue
+                        for message in self.app.stream_message(stream, self._state.setdefault(stream, {})):
+                            self._send(stream, message)
+        except (ConnectionError, OSError, ExchangeError) as e:
+            logger.debug(f"웹소켓 연결 종료: {e}")
+        finally:
+            self.app.unregister_session(self)
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """HTTP 요청을 FakeExchangeServer 로 전달"""
+
+    app: FakeExchangeServer = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def _params(self) -> Tuple[str, Dict[str, str]]:
+        parsed = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            body = self.rfile.read(length).decode('utf-8')
+            if body.lstrip().startswith('{'):
+                params.update({k: str(v) for k, v in json.loads(body).items()})
+            else:
+                params.update({k: v[-1] for k, v in parse_qs(body).items()})
+        return parsed.path, params
+
+    def _respond(self) -> None:
+        path, params = self._params()
+        if self.headers.get('Upgrade', '').lower() == 'websocket':
+            self._upgrade(path, params)
+            return
+        status, body, headers = self.app.handle(self.command, path, params)
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json;charset=UTF-8')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _respond
+
+    def _upgrade(self, path: str, params: Dict[str, str]) -> None:
+        if path.startswith('/ws'):
+            streams, combined = [s for s in path[len('/ws'):].split('/') if s], False
+        elif path == '/stream':
+            streams, combined = [s for s in params.get('streams', '').split('/') if s], True
+        else:
+            self.send_error(404)
+            return
+        accept = base64.b64encode(hashlib.sha1(
+            (self.headers['Sec-WebSocket-Key'] + _WS_GUID).encode('ascii')).digest()).decode('ascii')
+        self.send_response(101, 'Switching Protocols')
+        self.send_header('Upgrade', 'websocket')
+        self.send_header('Connection', 'Upgrade')
+        self.send_header('Sec-WebSocket-Accept', accept)
+        self.end_headers()
+        self.wfile.flush()
+        _WebSocketSession(self.app, self.connection, streams, combined).run()
+        self.close_connection = True
+
+
+class WebSocketClient:
+    """테스트/부하 스크립트용 최소 웹소켓 클라이언트"""
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        """
+        Args:
+            url: ws://host:port/ws/<스트림> 또는 ws://host:port/stream?streams=a/b
+            timeout: 연결/수신 제한 시간 (초)
+        """
+        parsed = urlparse(url)
+        self.sock = socket.create_connection((parsed.hostname, parsed.port), timeout=timeout)
+        key = base64.b64encode(os.urandom(16)).decode('ascii')
+        path = parsed.path + (f'?{parsed.query}' if parsed.query else '')
+        request = (f"GET {path} HTTP/1.1\r\nHost: {parsed.hostname}:{parsed.port}\r\nUpgrade: websocket\r\n"
+                   f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n")
+        self.sock.sendall(request.encode('ascii'))
+        response = b''
+        while b'\r\n\r\n' not in response:
+            chunk = self.sock.recv(1024)
+            if not chunk:
+                raise ConnectionError('웹소켓 핸드셰이크 실패')
+            response += chunk
+        if b' 101 ' not in response.split(b'\r\n', 1)[0]:
+            raise ConnectionError(f"웹소켓 핸드셰이크 실패: {response.splitlines()[0]!r}")
+
+    def send_json(self, message: Dict[str, Any]) -> None:
+        write_frame(self.sock, json.dumps(message).encode('utf-8'), mask=True)
+
+    def recv_json(self) -> Any:
+        """다음 텍스트 메시지 (ping 은 자동 응답)"""
+        while True:
+            opcode, payload = read_frame(self.sock)
+            if opcode == OP_TEXT:
+                return json.loads(payload.decode('utf-8'))
+            if opcode == OP_PING:
+                write_frame(self.sock, payload, OP_PONG, mask=True)
+            elif opcode == OP_CLOSE:
+                raise ConnectionError('웹소켓 연결이 닫혔습니다.')
+
+    def close(self) -> None:
+        try:
+            write_frame(self.sock, struct.pack('!H', 1000), OP_CLOSE, mask=True)
+        except OSError:
+            pass
+        self.sock.close()
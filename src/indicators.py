@@ -3,6 +3,8 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import logging
 
+from src.kernels import ema, wilder_smooth
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -78,23 +80,10 @@ def exponential_moving_average(df, period=20, column='close'):
         
         # NumPy 배열 사용하여 EMA 직접 계산 (다차원 인덱싱 방지)
         values = df_copy[column].values  # NumPy 배열로 변환
-        n = len(values)
-        result = np.full(n, np.nan)
         
-        # SMA로 첫 번째 값 초기화
-        if period <= n:
-            initial_sma = np.nanmean(values[:period])
-            result[period-1] = initial_sma
-            
-            # EMA 계산 공식: EMA_today = (Value_today * k) + (EMA_yesterday * (1-k)) where k = 2/(period+1)
-            k = 2 / (period + 1)
-            
-            # 루프 기반의 명시적 계산 (내부적 다차원 인덱싱 회피)
-            for i in range(period, n):
-                if np.isnan(values[i]) or np.isnan(result[i-1]):
-                    result[i] = np.nan
-                else:
-                    result[i] = (values[i] * k) + (result[i-1] * (1 - k))
+        # SMA로 첫 번째 값을 초기화한 뒤 EMA_today = (Value_today * k) + (EMA_yesterday * (1-k)),
+        # k = 2/(period+1) 재귀 계산 (src.kernels 커널 사용)
+        result = ema(values, period)
         
         # 결과를 시리즈로 변환 (원본 인덱스 유지)
         return pd.Series(result, index=df.index)
@@ -169,15 +158,9 @@ def relative_strength_index(df, period=14, column='close'):
         gain = delta.where(delta > 0, 0)
         loss = -delta.where(delta < 0, 0)
         
-        # 첫 번째 평균 계산 (SMA)
-        avg_gain = gain.rolling(window=period).mean()
-        avg_loss = loss.rolling(window=period).mean()
-        
-        # Wilder's smoothing 적용
-        for i in range(period, len(df)):
-            if pd.notna(avg_gain.iloc[i-1]) and pd.notna(avg_loss.iloc[i-1]):
-                avg_gain.iloc[i] = (avg_gain.iloc[i-1] * (period-1) + gain.iloc[i]) / period
-                avg_loss.iloc[i] = (avg_loss.iloc[i-1] * (period-1) + loss.iloc[i]) / period
+        # 첫 번째 평균(SMA) 이후 Wilder's smoothing 적용 (src.kernels 커널 사용)
+        avg_gain = pd.Series(wilder_smooth(gain.values, period), index=df.index)
+        avg_loss = pd.Series(wilder_smooth(loss.values, period), index=df.index)
         
         # 0으로 나누기 방지
         avg_loss = avg_loss.replace(0, 0.001)
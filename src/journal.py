@@ -0,0 +1,197 @@
+"""
+추가 전용 JSON Lines 저널 모듈 - 암호화폐 자동매매 봇
+
+오류/네트워크/복구/상태/메모리 기록을 전체 JSON 파일로 다시 쓰는 대신
+한 줄에 한 건씩 파일 끝에 덧붙입니다.
+
+- 버퍼링: append() 는 직렬화한 줄을 메모리 버퍼에 넣기만 하고, 버퍼가 차거나
+  공용 스케줄러의 flush 작업(FLUSH_INTERVAL 초마다)이 돌 때 한 번에 씁니다.
+  flush 작업은 처음 append() 할 때 등록하므로 저널을 만들거나 모듈을 import 하는
+  것만으로는 스케줄러 스레드가 시작되지 않습니다.
+- 크기 기반 로테이션: 파일이 max_bytes 를 넘으면 name.jsonl.1, .2 ... 로 밀어냄
+- replay(): 보관 중인 파일을 오래된 순서로 읽어 집계를 다시 만들 때 사용
+  (중단으로 잘린 마지막 줄은 건너뜀)
+
+기록 1건의 비용은 기존 기록 수와 관계없이 O(1) 입니다.
+"""
+
+import atexit
+import json
+import os
+import threading
+import weakref
+from typing import Any, Dict, Iterator, List
+
+from src.logging_config import get_logger
+from src.scheduler import get_scheduler
+
+logger = get_logger('crypto_bot.journal')
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024   # 파일당 최대 크기
+DEFAULT_BACKUP_COUNT = 5              # 보관할 이전 파일 수
+DEFAULT_BUFFER_SIZE = 100             # 이 개수만큼 쌓이면 바로 기록
+FLUSH_INTERVAL = 1.0                  # 공용 flush 작업 간격 (초)
+
+
+class JsonlJournal:
+    """
+    크기 기반 로테이션을 하는 추가 전용 JSON Lines 저널
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES, backup_count: int = DEFAULT_BACKUP_COUNT,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE):
+        """
+        Args:
+            path: 저널 파일 경로 (.jsonl)
+            max_bytes: 로테이션 기준 크기 (바이트)
+            backup_count: 보관할 이전 파일 수
+            buffer_size: 버퍼에 이 개수가 쌓이면 즉시 기록
+        """
+        self.path = path
+        self.max_bytes = max(1, int(max_bytes))
+        self.backup_count = max(0, int(backup_count))
+        self.buffer_size = max(1, int(buffer_size))
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+        self.stats = {'appended': 0, 'written': 0, 'flushes': 0, 'rotations': 0, 'errors': 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._size = os.path.getsize(path) if os.path.exists(path) else 0
+        _register(self)
+
+    def append(self, record: Dict[str, Any]):
+        """
+        기록 1건 추가 (호출 시점의 내용으로 직렬화)
+
+        Args:
+            record: JSON 으로 직렬화할 수 있는 딕셔너리 (datetime 등은 문자열로 변환)
+        """
+        try:
+            line = json.dumps(record, ensure_ascii=False, default=str)
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"저널 기록 직렬화 실패 ({self.path}): {e}")
+            return
+        with self._lock:
+            self._buffer.append(line)
+            self.stats['appended'] += 1
+            if len(self._buffer) >= self.buffer_size:
+                self._flush_locked()
+        if _flush_job is None:
+            _start_flush_job()
+
+    def flush(self) -> int:
+        """
+        버퍼의 기록을 파일에 씀
+
+        Returns:
+            int: 기록한 줄 수
+        """
+        with self._lock:
+            return self._flush_locked()
+
+    def _flush_locked(self) -> int:
+        if not self._buffer:
+            return 0
+        lines, self._buffer = self._buffer, []
+        data = ('\n'.join(lines) + '\n').encode('utf-8')
+        try:
+            if self._size and self._size + len(data) > self.max_bytes:
+                self._rotate()
+            with open(self.path, 'ab') as f:
+                f.write(data)
+            self._size += len(data)
+            self.stats['written'] += len(lines)
+            self.stats['flushes'] += 1
+            return len(lines)
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"저널 기록 실패 ({self.path}): {e}")
+            return 0
+
+    def _rotate(self):
+        """name.jsonl -> name.jsonl.1 -> ... -> name.jsonl.{backup_count} (가장 오래된 파일은 삭제)"""
+        if self.backup_count == 0:
+            os.remove(self.path)
+        else:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        self._size = 0
+        self.stats['rotations'] += 1
+
+    def files(self) -> List[str]:
+        """보관 중인 저널 파일 (오래된 순서)"""
+        candidates = [f"{self.path}.{index}" for index in range(self.backup_count, 0, -1)] + [self.path]
+        return [path for path in candidates if os.path.exists(path)]
+
+    def replay(self) -> Iterator[Dict[str, Any]]:
+        """
+        보관 중인 모든 기록을 오래된 순서로 반환 (버퍼는 먼저 기록)
+
+        Returns:
+            Iterator[Dict[str, Any]]: 기록 딕셔너리
+        """
+        self.flush()
+        for path in self.files():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            yield json.loads(line)
+                        except ValueError:
+                            continue  # 중단으로 잘린 줄
+            except OSError as e:
+                logger.error(f"저널 읽기 실패 ({path}): {e}")
+
+
+# 열려 있는 저널 (공용 flush 작업과 종료 시 flush 대상)
+_journals: 'weakref.WeakSet[JsonlJournal]' = weakref.WeakSet()
+_journals_lock = threading.Lock()
+_flush_job = None
+
+
+def _register(journal: JsonlJournal):
+    with _journals_lock:
+        _journals.add(journal)
+
+
+def _start_flush_job():
+    """공용 flush 작업 등록 (처음 기록이 들어올 때 한 번)"""
+    global _flush_job
+    with _journals_lock:
+        if _flush_job is None:
+            _flush_job = get_scheduler().add_job('journal.flush', flush_all, FLUSH_INTERVAL, delay=FLUSH_INTERVAL)
+
+
+def flush_all():
+    """열려 있는 모든 저널의 버퍼 기록"""
+    with _journals_lock:
+        journals = list(_journals)
+    for journal in journals:
+        journal.flush()
+
+
+atexit.register(flush_all)
+
+
+def open_journal(directory: str, name: str, **kwargs) -> JsonlJournal:
+    """
+    directory/name.jsonl 저널 생성
+
+    Args:
+        directory: 저널 디렉토리
+        name: 저널 이름 (확장자 제외)
+        **kwargs: JsonlJournal 옵션 (max_bytes, backup_count, buffer_size)
+
+    Returns:
+        JsonlJournal: 저널
+    """
+    return JsonlJournal(os.path.join(directory, f"{name}.jsonl"), **kwargs)
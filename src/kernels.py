@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 순차 계산 커널 모듈
+
+"""
+벡터화하기 어려운 순차 계산(EMA 재귀, Wilder 평활, 백테스트 포지션 상태 전이)을
+모아 둔 커널 모듈
+
+- numba 백엔드: 아래 반복문 구현을 numba.njit 로 컴파일해 실행 (numba 설치 시 기본값)
+- numpy 백엔드: numba 가 없을 때 쓰는 NumPy/pandas 구현. 반복문 대신 pandas ewm,
+  거래 단위 구간 채우기로 같은 결과를 계산합니다.
+
+두 백엔드는 같은 입력에 같은 결과를 돌려주며 set_backend() 또는 각 함수의
+backend 인자로 선택합니다.
+"""
+
+import threading
+from typing import Dict, Any, Callable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.logging_config import get_logger
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+logger = get_logger('crypto_bot.kernels')
+
+BACKEND_NUMPY = 'numpy'
+BACKEND_NUMBA = 'numba'
+BACKENDS = (BACKEND_NUMPY, BACKEND_NUMBA)
+
+_backend = BACKEND_NUMBA if numba is not None else BACKEND_NUMPY
+_compiled: Dict[str, Callable] = {}
+_compile_lock = threading.Lock()
+
+
+def available_backends() -> Tuple[str, ...]:
+    """현재 환경에서 사용할 수 있는 백엔드 목록"""
+    return BACKENDS if numba is not None else (BACKEND_NUMPY,)
+
+
+def get_backend() -> str:
+    """기본 백엔드 이름"""
+    return _backend
+
+
+def set_backend(name: str) -> str:
+    """
+    기본 백엔드 설정
+
+    Args:
+        name: 'numba' 또는 'numpy'
+
+    Returns:
+        str: 실제 적용된 백엔드 (numba 가 없으면 numpy)
+    """
+    global _backend
+    _backend = _resolve_backend(name)
+    return _backend
+
+
+def _resolve_backend(name: Optional[str]) -> str:
+    if name is None:
+        return _backend
+    if name not in BACKENDS:
+        raise ValueError(f"지원하지 않는 커널 백엔드입니다: {name} (가능: {', '.join(BACKENDS)})")
+    if name == BACKEND_NUMBA and numba is None:
+        logger.warning("numba 모듈이 없어 numpy 커널을 사용합니다.")
+        return BACKEND_NUMPY
+    return name
+
+
+def _jit(func: Callable) -> Callable:
+    """반복문 구현을 처음 호출할 때 한 번만 컴파일"""
+    compiled = _compiled.get(func.__name__)
+    if compiled is None:
+        with _compile_lock:
+            compiled = _compiled.get(func.__name__)
+            if compiled is None:
+                compiled = numba.njit(cache=True)(func)
+                _compiled[func.__name__] = compiled
+    return compiled
+
+
+# ---------------------------------------------------------------------------
+# 반복문 구현 (numba 로 컴파일되는 원본)
+# ---------------------------------------------------------------------------
+
+def _ema_loop(values, period):
+    n = len(values)
+    result = np.full(n, np.nan)
+    if period > n:
+        return result
+    total = 0.0
+    count = 0
+    for i in range(period):
+        if not np.isnan(values[i]):
+            total += values[i]
+            count += 1
+    if count == 0:
+        return result
+    result[period - 1] = total / count
+    k = 2 / (period + 1)
+    for i in range(period, n):
+        if np.isnan(values[i]) or np.isnan(result[i - 1]):
+            result[i] = np.nan
+        else:
+            result[i] = (values[i] * k) + (result[i - 1] * (1 - k))
+    return result
+
+
+def _wilder_loop(values, period):
+    n = len(values)
+    result = np.full(n, np.nan)
+    if period > n:
+        return result
+    result[period - 1] = np.mean(values[:period])
+    for i in range(period, n):
+        if not np.isnan(result[i - 1]):
+            result[i] = (result[i - 1] * (period - 1) + values[i]) / period
+    return result
+
+
+def _positions_loop(close, position_change, initial_balance, commission, leverage):
+    n = len(close)
+    cash = np.full(n, initial_balance)
+    quantity = np.zeros(n)
+    equity = np.full(n, initial_balance)
+    entries = np.zeros(n, dtype=np.int64)
+    exits = np.full(n, -1, dtype=np.int64)
+    entry_amounts = np.zeros(n)
+    entry_balances = np.zeros(n)
+    balance = initial_balance
+    qty = 0.0
+    margin = 0.0
+    entry_price = 0.0
+    n_trades = 0
+    for i in range(1, n):
+        change = position_change[i]
+        price = close[i]
+        if change > 0:
+            if not qty > 0 and balance > 0:
+                notional = balance * leverage
+                fee = notional * commission
+                qty = (notional - fee) / price
+                margin = balance - fee
+                entry_price = price
+                entries[n_trades] = i
+                entry_amounts[n_trades] = notional
+                entry_balances[n_trades] = balance
+                balance = 0.0
+                n_trades += 1
+        elif change < 0:
+            if qty != 0:
+                value = max(margin + qty * (price - entry_price), 0.0)
+                balance = value - min(qty * price * commission, value)
+                qty = 0.0
+                exits[n_trades - 1] = i
+        cash[i] = balance
+        quantity[i] = qty
+        if qty != 0:
+            equity[i] = max(margin + qty * (price - entry_price), 0.0)
+        else:
+            equity[i] = balance
+    return (cash, quantity, equity, entries[:n_trades], exits[:n_trades], entry_amounts[:n_trades],
+            entry_balances[:n_trades])
+
+
+# ---------------------------------------------------------------------------
+# NumPy 구현 (numba 가 없을 때)
+# ---------------------------------------------------------------------------
+
+def _recursive_numpy(values, period, alpha, seed):
+    n = len(values)
+    result = np.full(n, np.nan)
+    if period > n or np.isnan(seed):
+        return result
+    tail = values[period:]
+    nan_positions = np.flatnonzero(np.isnan(tail))
+    stop = nan_positions[0] if len(nan_positions) else len(tail)
+    # 직전 값이 NaN 이면 이후도 NaN 이므로 첫 NaN 이전 구간만 재귀 계산
+    series = pd.Series(np.concatenate(([seed], tail[:stop])))
+    result[period - 1:period + stop] = series.ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return result
+
+
+def _ema_numpy(values, period):
+    if period > len(values) or np.all(np.isnan(values[:period])):
+        return np.full(len(values), np.nan)
+    return _recursive_numpy(values, period, 2 / (period + 1), np.nanmean(values[:period]))
+
+
+def _wilder_numpy(values, period):
+    if period > len(values):
+        return np.full(len(values), np.nan)
+    result = _recursive_numpy(np.nan_to_num(values, nan=0.0), period, 1 / period, np.mean(values[:period]))
+    # 반복문 구현과 같이 NaN 입력은 재귀를 끊지 않고 NaN 을 전파
+    nan_after = np.flatnonzero(np.isnan(values[period:]))
+    if len(nan_after):
+        result[period + nan_after[0]:] = np.nan
+    return result
+
+
+def _positions_numpy(close, position_change, initial_balance, commission, leverage):
+    n = len(close)
+    idx = np.flatnonzero(position_change[1:] != 0) + 1
+    idx = idx[~np.isnan(position_change[idx])]
+    signs = np.sign(position_change[idx])
+    # 포지션 없을 때의 매수, 보유 중 매도만 유효하므로 유효 신호는 번갈아 나옴
+    keep = signs != np.concatenate(([-1.0], signs[:-1]))
+    idx = idx[keep]
+    entries = idx[0::2]
+    exits = idx[1::2]
+
+    n_trades = len(entries)
+    entry_amounts = np.zeros(n_trades)
+    entry_balances = np.zeros(n_trades)
+    bounds = [0]
+    cash_values = [initial_balance]
+    qty_values = [0.0]
+    margin_values = [0.0]
+    entry_prices = [0.0]
+    balance = initial_balance
+    for k in range(n_trades):
+        if not balance > 0:
+            # 자산이 모두 사라지면 이후 매수 신호는 진입하지 않음
+            entries, exits, n_trades = entries[:k], exits[:k], k
+            entry_amounts, entry_balances = entry_amounts[:k], entry_balances[:k]
+            break
+        price = close[entries[k]]
+        notional = balance * leverage
+        fee = notional * commission
+        qty = (notional - fee) / price
+        margin = balance - fee
+        entry_amounts[k] = notional
+        entry_balances[k] = balance
+        bounds.append(entries[k])
+        cash_values.append(0.0)
+        qty_values.append(qty)
+        margin_values.append(margin)
+        entry_prices.append(price)
+        if k < len(exits):
+            exit_price = close[exits[k]]
+            value = max(margin + qty * (exit_price - price), 0.0)
+            balance = value - min(qty * exit_price * commission, value)
+            bounds.append(exits[k])
+            cash_values.append(balance)
+            qty_values.append(0.0)
+            margin_values.append(0.0)
+            entry_prices.append(0.0)
+
+    segment = np.searchsorted(np.asarray(bounds), np.arange(n), side='right') - 1
+    cash = np.asarray(cash_values)[segment]
+    quantity = np.asarray(qty_values)[segment]
+    # 보유 구간은 증거금 + 레버리지 포지션 평가 손익 (0 미만이면 0)
+    held = quantity != 0
+    equity = cash.copy()
+    equity[held] = np.maximum(np.asarray(margin_values)[segment][held]
+                              + quantity[held] * (close[held] - np.asarray(entry_prices)[segment][held]), 0.0)
+    exit_bars = np.full(n_trades, -1, dtype=np.int64)
+    exit_bars[:min(len(exits), n_trades)] = exits[:n_trades]
+    return (cash, quantity, equity, entries.astype(np.int64), exit_bars, entry_amounts, entry_balances)
+
+
+_IMPLEMENTATIONS = {
+    'ema': (_ema_loop, _ema_numpy),
+    'wilder': (_wilder_loop, _wilder_numpy),
+    'positions': (_positions_loop, _positions_numpy),
+}
+
+
+def _kernel(name: str, backend: Optional[str]) -> Callable:
+    loop, numpy_impl = _IMPLEMENTATIONS[name]
+    if _resolve_backend(backend) == BACKEND_NUMBA:
+        return _jit(loop)
+    return numpy_impl
+
+
+# ---------------------------------------------------------------------------
+# 공개 함수
+# ---------------------------------------------------------------------------
+
+def ema(values: np.ndarray, period: int, backend: Optional[str] = None) -> np.ndarray:
+    """
+    지수 이동평균 (처음 period 개 평균으로 시작, NaN 이후는 NaN)
+
+    Args:
+        values: 입력 배열
+        period: 기간
+        backend: 커널 백엔드 (None이면 기본값)
+
+    Returns:
+        np.ndarray: EMA 배열
+    """
+    return _kernel('ema', backend)(np.asarray(values, dtype=np.float64), int(period))
+
+
+def wilder_smooth(values: np.ndarray, period: int, backend: Optional[str] = None) -> np.ndarray:
+    """
+    Wilder 평활 (RSI/ATR 의 평균 방식): avg = (이전 avg * (period-1) + 값) / period
+
+    Args:
+        values: 입력 배열 (상승폭/하락폭 등)
+        period: 기간
+        backend: 커널 백엔드 (None이면 기본값)
+
+    Returns:
+        np.ndarray: 평활 배열 (period-1 번째부터 값 존재)
+    """
+    return _kernel('wilder', backend)(np.asarray(values, dtype=np.float64), int(period))
+
+
+def position_state_machine(close: np.ndarray, position_change: np.ndarray, initial_balance: float,
+                           commission: float = 0.001, leverage: float = 1,
+                           backend: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Backtester.run_backtest 의 포지션 상태 전이 (롱 전용, 전액 진입, 두 번째 캔들부터)
+
+    진입 시 자산 전부를 증거금으로 레버리지만큼의 명목 금액을 매수하고(진입 수수료는
+    명목 금액 기준), 보유 중 자산은 증거금 + 평가 손익으로 계산합니다. 레버리지 1이면
+    현물 매매와 같습니다. 자산이 0이 되면 이후 매수 신호는 무시합니다.
+
+    Args:
+        close: 종가 배열
+        position_change: 포지션 변화 배열 (>0 매수, <0 매도)
+        initial_balance: 초기 자산
+        commission: 수수료율
+        leverage: 레버리지 (현물은 1)
+        backend: 커널 백엔드 (None이면 기본값)
+
+    Returns:
+        dict: cash/quantity/equity 캔들별 배열, 거래별 entries/exits(미청산은 -1)/entry_amounts
+              (명목 금액)/entry_balances(진입 전 자산), 청산된 거래별 trade_returns(자산 대비 %)
+    """
+    cash, quantity, equity, entries, exits, entry_amounts, entry_balances = _kernel('positions', backend)(
+        np.asarray(close, dtype=np.float64), np.asarray(position_change, dtype=np.float64),
+        float(initial_balance), float(commission), float(leverage)
+    )
+    closed = exits >= 0
+    trade_returns = (cash[exits[closed]] / entry_balances[closed] - 1) * 100
+    return {'cash': cash, 'quantity': quantity, 'equity': equity, 'entries': entries, 'exits': exits,
+            'entry_amounts': entry_amounts, 'entry_balances': entry_balances, 'trade_returns': trade_returns}
@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 # 암호화폐 자동 매매 봇 - 로깅 설정 모듈
 import os
+import queue
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+import threading
+from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler, QueueHandler, QueueListener
 import json
 from datetime import datetime
 
@@ -50,6 +53,133 @@ class JSONFormatter(logging.Formatter):
             
         return json.dumps(log_record)
 
+class CompactJSONFormatter(logging.Formatter):
+    """
+    한 줄 JSON(JSON-lines) 형식의 간결한 로그 포맷터
+    
+    키를 짧게 유지하고 공백 없는 구분자를 사용하여 로그 크기와 직렬화 비용을 줄입니다.
+    """
+    def format(self, record):
+        log_record = {
+            "t": int(record.created * 1000),
+            "l": record.levelname,
+            "n": record.name,
+            "m": record.getMessage()
+        }
+        
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            log_record["x"] = record.exc_text
+        
+        if hasattr(record, 'data'):
+            log_record["d"] = record.data
+        
+        suppressed = getattr(record, 'suppressed', 0)
+        if suppressed:
+            log_record["s"] = suppressed
+            
+        return json.dumps(log_record, ensure_ascii=False, separators=(',', ':'), default=str)
+
+class LogSamplingFilter(logging.Filter):
+    """
+    반복 로그 메시지 샘플링(속도 제한) 필터
+    
+    같은 로거/레벨/메시지 템플릿 조합은 interval 초마다 burst 건까지만 통과시키고,
+    나머지는 버린 뒤 다음 창에서 통과하는 레코드에 생략 건수를 기록합니다.
+    max_level 이상(기본: WARNING)의 레코드는 항상 통과합니다.
+    """
+    
+    def __init__(self, interval=60.0, burst=5, max_level=logging.WARNING, max_keys=10000):
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self.max_level = max_level
+        self.max_keys = max_keys
+        self._windows = {}  # key -> [창 시작 시각, 통과 건수, 생략 건수]
+        self._lock = threading.Lock()
+    
+    def filter(self, record):
+        if record.levelno >= self.max_level:
+            return True
+        
+        key = (record.name, record.levelno, record.msg if isinstance(record.msg, str) else id(record.msg))
+        now = record.created
+        
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None:
+                if len(self._windows) >= self.max_keys:
+                    self._windows.clear()
+                self._windows[key] = [now, 1, 0]
+                return True
+            
+            if now - window[0] >= self.interval:
+                suppressed = window[2]
+                window[0], window[1], window[2] = now, 1, 0
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            
+            if window[1] < self.burst:
+                window[1] += 1
+                return True
+            
+            window[2] += 1
+            return False
+
+class LazyQueueHandler(QueueHandler):
+    """
+    메시지 포맷팅을 백그라운드 리스너 스레드로 미루는 QueueHandler
+    
+    기본 QueueHandler는 호출 스레드에서 메시지를 포맷합니다. 이 핸들러는 인자가
+    변경 불가능한 스칼라 값인 경우 포맷팅을 리스너로 미루고, 변경 가능한 객체가
+    포함된 경우에만 호출 시점 값을 보존하기 위해 즉시 포맷합니다.
+    """
+    
+    _IMMUTABLE_TYPES = (str, int, float, bool, bytes, type(None))
+    
+    def __init__(self, log_queue, route):
+        super().__init__(log_queue)
+        self.route = route
+        self.dropped = 0
+    
+    def prepare(self, record):
+        args = record.args
+        if args and not (isinstance(args, tuple) and all(isinstance(a, self._IMMUTABLE_TYPES) for a in args)):
+            record.msg = record.getMessage()
+            record.args = None
+        
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        
+        record._log_route = self.route
+        return record
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class _RoutingQueueListener(QueueListener):
+    """단일 백그라운드 스레드에서 로거별 원래 핸들러로 레코드를 전달하는 리스너"""
+    
+    def __init__(self, log_queue):
+        super().__init__(log_queue, respect_handler_level=True)
+        self.routes = {}  # route -> [handlers]
+    
+    def handle(self, record):
+        for handler in self.routes.get(getattr(record, '_log_route', None), ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+# 비동기 로깅 상태
+_async_listener = None
+_async_lock = threading.Lock()
+
 def setup_logger(name, log_file, level=logging.INFO, use_json=False, max_size=10*1024*1024, backup_count=5):
     """로거 셋업 유틸리티 함수"""
     logger = logging.getLogger(name)
@@ -98,6 +228,9 @@ error_logger = setup_logger("crypto_bot.error", ERROR_LOG_FILE, level=logging.ER
 # 디버그 로거 (개발용, 매우 상세)
 debug_logger = setup_logger("crypto_bot.debug", DEBUG_LOG_FILE, level=logging.DEBUG)
 
+# 샘플링에서 제외하는 로거 (거래/API 호출 감사 기록은 모두 남김)
+SAMPLING_EXEMPT_LOGGERS = (trade_logger.name, api_logger.name)
+
 def get_logger(name=None):
     """적절한 로거 인스턴스 반환"""
     if name is None:
@@ -149,3 +282,91 @@ def log_api_call(endpoint, method, request_data=None, response_data=None, error=
             "response": response_data
         }
         api_logger.handle(record)
+
+def setup_async_logging(logger_names=None, use_json_lines=None, sample_interval=None,
+                        sample_burst=None, queue_size=10000, sample_exempt=None):
+    """
+    비동기 로깅 파이프라인 설정
+    
+    대상 로거의 기존 핸들러(파일/콘솔)를 하나의 백그라운드 QueueListener 스레드로 옮기고,
+    로거에는 LazyQueueHandler만 남겨 호출 스레드의 로그 비용을 큐 삽입 수준으로 줄입니다.
+    반복 메시지는 호출 스레드에서 샘플링 필터로 걸러져 큐에 들어가지 않습니다.
+    거래/API 감사 로그처럼 한 건도 빠지면 안 되는 로거는 샘플링하지 않습니다.
+    
+    Args:
+        logger_names: 대상 로거 이름 목록 (None인 경우 루트 로거와 crypto_bot 로거들)
+        use_json_lines: 파일 핸들러에 CompactJSONFormatter 적용 여부 (None인 경우 LOG_FORMAT 환경 변수)
+        sample_interval: 샘플링 창 길이 (초, None인 경우 LOG_SAMPLE_INTERVAL 환경 변수, 0이면 비활성)
+        sample_burst: 창당 허용 건수 (None인 경우 LOG_SAMPLE_BURST 환경 변수)
+        queue_size: 로그 큐 최대 크기 (가득 차면 새 레코드는 버림)
+        sample_exempt: 샘플링하지 않을 로거 이름 목록 (None인 경우 SAMPLING_EXEMPT_LOGGERS)
+        
+    Returns:
+        QueueListener: 실행 중인 리스너
+    """
+    global _async_listener
+    
+    with _async_lock:
+        if _async_listener is not None:
+            return _async_listener
+        
+        if logger_names is None:
+            logger_names = ['', main_logger.name, trade_logger.name, api_logger.name,
+                            error_logger.name, debug_logger.name]
+        if use_json_lines is None:
+            use_json_lines = os.getenv('LOG_FORMAT', 'text').lower() == 'jsonl'
+        if sample_interval is None:
+            sample_interval = float(os.getenv('LOG_SAMPLE_INTERVAL', '60'))
+        if sample_burst is None:
+            sample_burst = int(os.getenv('LOG_SAMPLE_BURST', '5'))
+        if sample_exempt is None:
+            sample_exempt = SAMPLING_EXEMPT_LOGGERS
+        
+        log_queue = queue.Queue(maxsize=queue_size)
+        listener = _RoutingQueueListener(log_queue)
+        sampling_filter = LogSamplingFilter(sample_interval, sample_burst) if sample_interval > 0 else None
+        
+        for name in logger_names:
+            target = logging.getLogger(name)
+            handlers = [h for h in target.handlers if not isinstance(h, QueueHandler)]
+            if not handlers:
+                continue
+            
+            for handler in handlers:
+                target.removeHandler(handler)
+                if use_json_lines and isinstance(handler, logging.FileHandler):
+                    handler.setFormatter(CompactJSONFormatter())
+            
+            listener.routes[name] = handlers
+            queue_handler = LazyQueueHandler(log_queue, name)
+            if sampling_filter is not None and name not in sample_exempt:
+                queue_handler.addFilter(sampling_filter)
+            target.addHandler(queue_handler)
+        
+        listener.start()
+        _async_listener = listener
+        atexit.register(stop_async_logging)
+        return listener
+
+def stop_async_logging():
+    """
+    비동기 로깅 중지
+    
+    큐에 남은 레코드를 모두 기록한 뒤 원래 핸들러를 각 로거에 되돌립니다.
+    """
+    global _async_listener
+    
+    with _async_lock:
+        listener = _async_listener
+        if listener is None:
+            return
+        _async_listener = None
+        
+        listener.stop()
+        for name, handlers in listener.routes.items():
+            target = logging.getLogger(name)
+            for handler in target.handlers[:]:
+                if isinstance(handler, LazyQueueHandler):
+                    target.removeHandler(handler)
+            for handler in handlers:
+                target.addHandler(handler)
@@ -10,11 +10,47 @@ import logging
 import threading
 import traceback
 import json
+import tracemalloc
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List, Callable, Tuple
 
 from src.logging_config import get_logger
 from src.config import DATA_DIR
+from src.scheduler import get_scheduler
+from src.journal import open_journal
+
+# 할당 위치를 하위 시스템(모듈)으로 분류할 때 기준이 되는 프로젝트 루트
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 할당 추적에서 제외할 파일 (추적기 자체와 임포트 시스템)
+_TRACE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+def _frame_module(filename: str) -> Optional[str]:
+    """
+    프레임 파일 경로를 모듈 이름으로 변환
+
+    프로젝트 파일은 'src.event_manager' 같은 점 표기 모듈명, site-packages 아래 파일은
+    최상위 패키지명(예: 'pandas'), 그 외는 None 을 반환합니다.
+    """
+    path = os.path.abspath(filename)
+    parts = path.replace('\\', '/').split('/')
+    for marker in ('site-packages', 'dist-packages'):
+        if marker in parts:
+            index = parts.index(marker)
+            if index + 1 < len(parts):
+                return os.path.splitext(parts[index + 1])[0]
+            return None
+    if path.startswith(PROJECT_ROOT + os.sep):
+        relative = os.path.splitext(os.path.relpath(path, PROJECT_ROOT))[0]
+        return relative.replace(os.sep, '.')
+    return None
 
 class MemoryMonitor:
     """
@@ -48,7 +84,7 @@ class MemoryMonitor:
         
         # 모니터링 상태
         self.monitoring = False
-        self.monitor_thread = None
+        self.monitor_job = None
         
         # 메모리 사용 기록
         self.memory_history = []
@@ -57,7 +93,7 @@ class MemoryMonitor:
         # 로그 디렉토리
         self.log_dir = os.path.join(DATA_DIR, 'memory_logs')
         os.makedirs(self.log_dir, exist_ok=True)
-        self.log_file = os.path.join(self.log_dir, f'memory_log_{datetime.now().strftime("%Y%m%d")}.json')
+        self.journal = open_journal(self.log_dir, 'memory_journal')
         
         # 현재 프로세스
         self.process = psutil.Process(os.getpid())
@@ -65,6 +101,17 @@ class MemoryMonitor:
         # 청소 콜백 함수 (외부에서 등록 가능)
         self.cleanup_callbacks = []
         
+        # 할당 프로파일링 (tracemalloc 스냅샷 비교)
+        self.profiling = False
+        self.profile_interval = 600  # 스냅샷 간격 (초)
+        self.profile_top_n = 20
+        self._baseline_snapshot = None
+        self._last_snapshot = None
+        self._last_profile_time = 0.0
+        self._started_tracemalloc = False
+        self._profile_lock = threading.Lock()
+        self.allocation_reports = deque(maxlen=48)
+        
         # 시스템 정보 기록
         self.system_info = self._get_system_info()
         
@@ -93,9 +140,8 @@ class MemoryMonitor:
             return
         
         self.monitoring = True
-        self.monitor_thread = threading.Thread(target=self._monitoring_loop)
-        self.monitor_thread.daemon = True
-        self.monitor_thread.start()
+        self.monitor_job = get_scheduler().add_job('memory_monitor.check', self._check_memory, self.check_interval,
+                                                   jitter=min(5.0, self.check_interval * 0.1))
         
         self.logger.info(f"메모리 모니터링 시작 (간격: {self.check_interval}초)")
     
@@ -105,38 +151,37 @@ class MemoryMonitor:
             return
         
         self.monitoring = False
-        if self.monitor_thread and self.monitor_thread.is_alive():
-            self.monitor_thread.join(timeout=2.0)
+        if self.monitor_job:
+            self.monitor_job.cancel(wait=2.0)
+            self.monitor_job = None
         
         # 로그 저장
         self._save_memory_log()
         
+        if self.profiling:
+            self.stop_allocation_profiling()
+        
         self.logger.info("메모리 모니터링 중지")
     
-    def _monitoring_loop(self):
-        """메모리 모니터링 메인 루프"""
-        while self.monitoring:
-            try:
-                # 현재 메모리 사용량 확인
-                memory_info = self._get_memory_info()
-                
-                # 메모리 사용량 기록
-                self._record_memory_usage(memory_info)
-                
-                # 임계값 확인
-                self._check_thresholds(memory_info)
-                
-                # 로그 주기적 저장 (매 10분)
-                if datetime.now().minute % 10 == 0 and datetime.now().second < 10:
-                    self._save_memory_log()
-                
-                # 다음 확인까지 대기
-                time.sleep(self.check_interval)
-                
-            except Exception as e:
-                self.logger.error(f"메모리 모니터링 중 오류: {e}")
-                self.logger.debug(traceback.format_exc())
-                time.sleep(5)  # 오류 발생 시 짧게 대기
+    def _check_memory(self):
+        """메모리 사용량 확인 (공용 스케줄러에서 주기 실행)"""
+        try:
+            # 현재 메모리 사용량 확인
+            memory_info = self._get_memory_info()
+            
+            # 메모리 사용량 기록
+            self._record_memory_usage(memory_info)
+            
+            # 임계값 확인
+            self._check_thresholds(memory_info)
+            
+            # 할당 프로파일링 주기 스냅샷
+            if self.profiling and time.time() - self._last_profile_time >= self.profile_interval:
+                self.take_allocation_snapshot()
+            
+        except Exception as e:
+            self.logger.error(f"메모리 모니터링 중 오류: {e}")
+            self.logger.debug(traceback.format_exc())
     
     def _get_memory_info(self) -> Dict[str, Any]:
         """
@@ -174,6 +219,7 @@ class MemoryMonitor:
             memory_info: 메모리 사용량 정보
         """
         self.memory_history.append(memory_info)
+        self.journal.append(memory_info)
         
         # 최대 기록 크기 제한
         if len(self.memory_history) > self.max_history_size:
@@ -279,43 +325,10 @@ class MemoryMonitor:
             self.logger.info(f"메모리 정리 콜백 등록 해제: {callback.__name__}")
     
     def _save_memory_log(self):
-        """메모리 사용 기록 저장"""
+        """버퍼에 쌓인 메모리 사용 기록을 저널에 씀 (기록은 측정할 때마다 추가)"""
         try:
-            # 로그 파일명 (날짜별)
-            current_date = datetime.now().strftime("%Y%m%d")
-            self.log_file = os.path.join(self.log_dir, f'memory_log_{current_date}.json')
-            
-            # 이전 로그 불러오기
-            previous_logs = []
-            if os.path.exists(self.log_file):
-                try:
-                    with open(self.log_file, 'r') as f:
-                        previous_logs = json.load(f)
-                except:
-                    # 파일이 손상되었을 경우 새로 시작
-                    pass
-            
-            # 로그 데이터 준비 (중복 방지)
-            existing_timestamps = {log.get('timestamp') for log in previous_logs}
-            new_logs = [
-                log for log in self.memory_history 
-                if log.get('timestamp') not in existing_timestamps
-            ]
-            
-            # 저장할 로그 (이전 + 새로운 로그)
-            all_logs = previous_logs + new_logs
-            
-            # 최대 크기 제한
-            max_logs = 10000  # 최대 10000개 로그 저장
-            if len(all_logs) > max_logs:
-                all_logs = all_logs[-max_logs:]
-            
-            # 저장
-            with open(self.log_file, 'w') as f:
-                json.dump(all_logs, f)
-            
-            self.logger.debug(f"메모리 로그 저장 완료: {len(new_logs)}개 항목 추가")
-            
+            written = self.journal.flush()
+            self.logger.debug(f"메모리 로그 저장 완료: {written}개 항목 추가")
         except Exception as e:
             self.logger.error(f"메모리 로그 저장 중 오류: {e}")
     
@@ -385,6 +398,176 @@ class MemoryMonitor:
             'trend': trend
         }
     
+    def start_allocation_profiling(self, frames: int = 10, interval: Optional[int] = None,
+                                   top_n: Optional[int] = None) -> bool:
+        """
+        tracemalloc 기반 할당 프로파일링 시작
+        
+        시작 시점 스냅샷을 기준으로 삼고, 모니터링 루프가 interval 마다 스냅샷을 찍어
+        직전 스냅샷/기준 스냅샷 대비 증가분을 하위 시스템별로 집계합니다.
+        
+        Args:
+            frames: 할당마다 보관할 호출 스택 깊이 (깊을수록 분류가 정확하지만 오버헤드 증가)
+            interval: 스냅샷 간격 (초, None이면 현재 설정 유지)
+            top_n: 보고서에 포함할 상위 항목 수 (None이면 현재 설정 유지)
+            
+        Returns:
+            bool: 성공 여부
+        """
+        with self._profile_lock:
+            if self.profiling:
+                self.logger.warning("할당 프로파일링이 이미 실행 중입니다.")
+                return True
+            try:
+                if interval is not None:
+                    self.profile_interval = interval
+                if top_n is not None:
+                    self.profile_top_n = top_n
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start(frames)
+                    self._started_tracemalloc = True
+                self._baseline_snapshot = self._last_snapshot = self._take_snapshot()
+                self._last_profile_time = time.time()
+                self.profiling = True
+                self.logger.info(f"할당 프로파일링 시작 (스택 깊이: {tracemalloc.get_traceback_limit()}, "
+                                 f"간격: {self.profile_interval}초)")
+                return True
+            except Exception as e:
+                self.logger.error(f"할당 프로파일링 시작 중 오류: {e}")
+                return False
+    
+    def stop_allocation_profiling(self) -> Optional[Dict[str, Any]]:
+        """
+        할당 프로파일링 중지 (마지막 보고서를 만든 뒤 스냅샷 해제)
+        
+        Returns:
+            Optional[Dict[str, Any]]: 마지막 할당 보고서, 실행 중이 아니면 None
+        """
+        if not self.profiling:
+            return None
+        report = self.take_allocation_snapshot()
+        with self._profile_lock:
+            self.profiling = False
+            self._baseline_snapshot = self._last_snapshot = None
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+        self.logger.info("할당 프로파일링 중지")
+        return report
+    
+    def take_allocation_snapshot(self) -> Optional[Dict[str, Any]]:
+        """
+        스냅샷을 찍어 할당 증가 보고서 생성 및 로그 출력
+        
+        Returns:
+            Optional[Dict[str, Any]]: 할당 보고서 (프로파일링 중이 아니거나 오류 시 None)
+        """
+        with self._profile_lock:
+            if not self.profiling or not tracemalloc.is_tracing():
+                return None
+            try:
+                snapshot = self._take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+                report = {
+                    'timestamp': datetime.now().isoformat(),
+                    'traced_current_mb': current / (1024 * 1024),
+                    'traced_peak_mb': peak / (1024 * 1024),
+                    'interval': self._diff_snapshots(snapshot, self._last_snapshot),
+                    'cumulative': self._diff_snapshots(snapshot, self._baseline_snapshot),
+                }
+                self._last_snapshot = snapshot
+                self._last_profile_time = time.time()
+                self.allocation_reports.append(report)
+            except Exception as e:
+                self.logger.error(f"할당 스냅샷 생성 중 오류: {e}")
+                return None
+        self._log_allocation_report(report)
+        return report
+    
+    def get_allocation_report(self, top_n: Optional[int] = None) -> Dict[str, Any]:
+        """
+        최근 할당 보고서 반환 (API 응답용)
+        
+        Args:
+            top_n: 하위 시스템/할당 위치 목록을 자를 개수 (None이면 보고서 그대로)
+            
+        Returns:
+            Dict[str, Any]: profiling(실행 여부), interval(스냅샷 간격), report(최근 보고서 또는 None)
+        """
+        report = self.allocation_reports[-1] if self.allocation_reports else None
+        if report is not None and top_n is not None:
+            report = dict(report)
+            for key in ('interval', 'cumulative'):
+                report[key] = dict(report[key], subsystems=report[key]['subsystems'][:top_n],
+                                   top_sites=report[key]['top_sites'][:top_n])
+        return {'profiling': self.profiling, 'interval': self.profile_interval, 'report': report}
+    
+    def _take_snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+    
+    def _diff_snapshots(self, snapshot: tracemalloc.Snapshot, previous: tracemalloc.Snapshot) -> Dict[str, Any]:
+        """
+        두 스냅샷의 할당 증가분을 하위 시스템과 할당 위치별로 집계
+        
+        하위 시스템은 호출 스택에서 할당 지점에 가장 가까운 프로젝트 모듈
+        (예: src.event_manager), 할당 지점은 스택의 가장 안쪽 프레임(파일:줄)입니다.
+        프로젝트 프레임이 없으면 라이브러리 패키지명(예: pandas)으로 분류합니다.
+        """
+        stats = snapshot.compare_to(previous, 'traceback')
+        subsystems: Dict[str, Dict[str, Any]] = {}
+        sites: Dict[str, Dict[str, Any]] = {}
+        growth = 0
+        for stat in stats:
+            if not stat.size_diff and not stat.count_diff:
+                continue
+            growth += stat.size_diff
+            frames = list(stat.traceback)  # 오래된 프레임 -> 최근 프레임 순
+            innermost = frames[-1]
+            library = _frame_module(innermost.filename)
+            owner = None
+            for frame in reversed(frames):
+                module = _frame_module(frame.filename)
+                if module and module.split('.')[0] in ('src', 'web_app', 'utils', 'benchmarks', 'tests'):
+                    owner = module
+                    break
+            name = owner or library or 'other'
+            
+            entry = subsystems.setdefault(name, {'name': name, 'size_diff_kb': 0.0, 'count_diff': 0, 'size_kb': 0.0})
+            entry['size_diff_kb'] += stat.size_diff / 1024
+            entry['count_diff'] += stat.count_diff
+            entry['size_kb'] += stat.size / 1024
+            
+            location = f"{innermost.filename}:{innermost.lineno}"
+            site = sites.setdefault(location, {'site': location, 'subsystem': name, 'library': library,
+                                               'size_diff_kb': 0.0, 'count_diff': 0, 'size_kb': 0.0})
+            site['size_diff_kb'] += stat.size_diff / 1024
+            site['count_diff'] += stat.count_diff
+            site['size_kb'] += stat.size / 1024
+        
+        top_n = self.profile_top_n
+        return {
+            'growth_kb': growth / 1024,
+            'subsystems': sorted(subsystems.values(), key=lambda e: e['size_diff_kb'], reverse=True)[:top_n],
+            'top_sites': sorted(sites.values(), key=lambda e: e['size_diff_kb'], reverse=True)[:top_n],
+        }
+    
+    def _log_allocation_report(self, report: Dict[str, Any]):
+        """할당 보고서 로그 출력 (누적 증가 상위 하위 시스템과 구간 증가 상위 위치)"""
+        cumulative = report['cumulative']
+        interval = report['interval']
+        self.logger.info(f"할당 프로파일: 추적 메모리 {report['traced_current_mb']:.1f}MB "
+                         f"(최대 {report['traced_peak_mb']:.1f}MB), 구간 증가 {interval['growth_kb']:+.1f}KB, "
+                         f"누적 증가 {cumulative['growth_kb']:+.1f}KB")
+        for entry in cumulative['subsystems'][:5]:
+            if entry['size_diff_kb'] <= 0:
+                break
+            self.logger.info(f"  누적 증가 {entry['name']}: {entry['size_diff_kb']:+.1f}KB "
+                             f"({entry['count_diff']:+d}개 블록)")
+        for site in interval['top_sites'][:5]:
+            if site['size_diff_kb'] <= 0:
+                break
+            self.logger.info(f"  구간 증가 위치 {site['site']} [{site['subsystem']}]: {site['size_diff_kb']:+.1f}KB")
+    
     def force_cleanup(self):
         """
         강제 메모리 정리 수행
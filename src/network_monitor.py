@@ -14,6 +14,8 @@ from collections import defaultdict, deque
 
 from src.logging_config import get_logger
 from src.error_handlers import error_analyzer
+from src.scheduler import get_scheduler
+from src.journal import open_journal
 
 class NetworkMonitor:
     """
@@ -36,7 +38,8 @@ class NetworkMonitor:
         self.logger = get_logger('network_monitor')
         self.check_interval = check_interval
         self.running = False
-        self.monitor_thread = None
+        self.monitor_job = None
+        self.save_job = None
         
         # 연결 대상 목록 (거래소 및 중요 서비스)
         self.targets = {
@@ -55,7 +58,7 @@ class NetworkMonitor:
         # 성능 통계
         self.stats = {
             'outages': defaultdict(int),
-            'outage_durations': defaultdict(list),
+            'outage_durations': defaultdict(lambda: deque(maxlen=100)),
             'last_outage': {},
             'current_outage_start': {},
             'total_checks': defaultdict(int)
@@ -65,54 +68,50 @@ class NetworkMonitor:
         from src.config import DATA_DIR
         self.log_dir = os.path.join(DATA_DIR, 'network_logs')
         os.makedirs(self.log_dir, exist_ok=True)
-        self.log_path = os.path.join(self.log_dir, f'network_log_{datetime.now().strftime("%Y%m%d")}.json')
+        self.journal = open_journal(self.log_dir, 'network_journal')
         
         # 로그 로드
         self._load_logs()
     
     def _load_logs(self):
-        """이전 네트워크 로그 로드"""
+        """네트워크 저널을 재생해 중단 통계 복원"""
         try:
-            if os.path.exists(self.log_path):
-                with open(self.log_path, 'r') as f:
-                    log_data = json.load(f)
-                    
-                    # 관련 데이터 복원
-                    if 'outages' in log_data:
-                        for target, count in log_data['outages'].items():
-                            self.stats['outages'][target] = count
-                    
-                    if 'outage_durations' in log_data:
-                        for target, durations in log_data['outage_durations'].items():
-                            self.stats['outage_durations'][target] = durations
-                    
-                    if 'last_outage' in log_data:
-                        self.stats['last_outage'] = log_data['last_outage']
-                    
-                    self.logger.info(f"네트워크 로그를 로드했습니다: {self.log_path}")
+            restored = 0
+            for record in self.journal.replay():
+                self._apply_record(record)
+                restored += 1
+            
+            if restored:
+                self.logger.info(f"네트워크 로그를 로드했습니다: {self.journal.path} ({restored}건)")
             else:
                 self.logger.info("기존 네트워크 로그가 없습니다. 새로 생성합니다.")
         except Exception as e:
             self.logger.error(f"네트워크 로그 로드 중 오류: {e}")
     
+    def _apply_record(self, record):
+        """저널 기록 1건을 중단 통계에 반영"""
+        target = record.get('target')
+        event = record.get('event')
+        if event == 'outage_start':
+            self.stats['outages'][target] += 1
+        elif event == 'outage_end':
+            self.stats['outage_durations'][target].append(record['duration'])
+            self.stats['last_outage'][target] = {
+                'start': record['start'],
+                'end': record['end'],
+                'duration': record['duration']
+            }
+    
     def _save_logs(self):
-        """현재 네트워크 상태 및 통계 저장"""
+        """현재 네트워크 상태를 저널에 추가 (중단/복구는 발생 시점에 기록)"""
         try:
-            log_data = {
+            self.journal.append({
+                'event': 'status',
                 'timestamp': datetime.now().isoformat(),
                 'status': self.status,
                 'latency': self.latency,
-                'stats': {
-                    'outages': dict(self.stats['outages']),
-                    'outage_durations': dict(self.stats['outage_durations']),
-                    'last_outage': self.stats['last_outage'],
-                    'total_checks': dict(self.stats['total_checks'])
-                }
-            }
-            
-            # JSON 파일로 저장
-            with open(self.log_path, 'w') as f:
-                json.dump(log_data, f, indent=2)
+                'total_checks': dict(self.stats['total_checks'])
+            })
         except Exception as e:
             self.logger.error(f"네트워크 로그 저장 중 오류: {e}")
     
@@ -123,9 +122,11 @@ class NetworkMonitor:
             return
         
         self.running = True
-        self.monitor_thread = threading.Thread(target=self._monitoring_loop)
-        self.monitor_thread.daemon = True
-        self.monitor_thread.start()
+        scheduler = get_scheduler()
+        self.monitor_job = scheduler.add_job('network_monitor.check', self._check_all_targets, self.check_interval,
+                                             jitter=min(5.0, self.check_interval * 0.1))
+        # 로그 저장 (10분마다)
+        self.save_job = scheduler.add_job('network_monitor.save_logs', self._save_logs, 600, delay=600)
         
         self.logger.info(f"네트워크 모니터링을 시작합니다 (확인 간격: {self.check_interval}초)")
     
@@ -136,30 +137,22 @@ class NetworkMonitor:
             return
         
         self.running = False
-        if self.monitor_thread and self.monitor_thread.is_alive():
-            self.monitor_thread.join(timeout=2.0)
+        for job in (self.monitor_job, self.save_job):
+            if job:
+                job.cancel(wait=2.0)
+        self.monitor_job = self.save_job = None
         
         self._save_logs()
         self.logger.info("네트워크 모니터링을 중지했습니다.")
     
-    def _monitoring_loop(self):
-        """네트워크 모니터링 루프"""
-        while self.running:
-            try:
-                for target, url in self.targets.items():
-                    self._check_target(target, url)
-                
-                # 로그 저장 (주기적으로)
-                if datetime.now().minute % 10 == 0:  # 10분마다 저장
-                    self._save_logs()
-                
-                # 다음 확인까지 대기
-                time.sleep(self.check_interval)
-                
-            except Exception as e:
-                self.logger.error(f"네트워크 모니터링 루프 오류: {e}")
-                self.logger.debug(traceback.format_exc())
-                time.sleep(5)  # 오류 발생 시 짧게 대기
+    def _check_all_targets(self):
+        """모든 대상 연결 확인 (공용 스케줄러에서 주기 실행)"""
+        try:
+            for target, url in self.targets.items():
+                self._check_target(target, url)
+        except Exception as e:
+            self.logger.error(f"네트워크 모니터링 루프 오류: {e}")
+            self.logger.debug(traceback.format_exc())
     
     def _check_target(self, target, url):
         """
@@ -191,6 +184,11 @@ class NetworkMonitor:
                 # 새로운 중단 발생
                 self.stats['outages'][target] += 1
                 self.stats['current_outage_start'][target] = datetime.now()
+                self.journal.append({
+                    'event': 'outage_start',
+                    'target': target,
+                    'timestamp': self.stats['current_outage_start'][target].isoformat()
+                })
                 self.logger.warning(f"네트워크 중단 감지: {target}")
                 
                 # 오류 분석기에 기록
@@ -209,12 +207,16 @@ class NetworkMonitor:
                 
                 if start_time:
                     duration = (end_time - start_time).total_seconds()
-                    self.stats['outage_durations'][target].append(duration)
-                    self.stats['last_outage'][target] = {
+                    record = {
+                        'event': 'outage_end',
+                        'target': target,
+                        'timestamp': end_time.isoformat(),
                         'start': start_time.isoformat(),
                         'end': end_time.isoformat(),
                         'duration': duration
                     }
+                    self._apply_record(record)
+                    self.journal.append(record)
                     self.logger.info(f"네트워크 복구: {target} (중단 시간: {duration:.2f}초)")
         
         except Exception as e:
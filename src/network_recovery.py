@@ -10,12 +10,15 @@ import threading
 import traceback
 import requests
 import random
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional, Callable, Any, Union
 
 from src.logging_config import get_logger
 from src.error_handlers import error_analyzer
 from src.config import DATA_DIR
+from src.scheduler import get_scheduler
+from src.journal import open_journal
 
 class NetworkRecoveryManager:
     """
@@ -25,6 +28,9 @@ class NetworkRecoveryManager:
     자동으로 연결을 복구하는 기능을 제공합니다.
     """
     
+    # 서비스별로 보관할 최근 오류 수
+    MAX_ERROR_HISTORY = 100
+    
     def __init__(self, check_interval: int = 30, max_recovery_attempts: int = 5):
         """
         NetworkRecoveryManager 초기화
@@ -52,7 +58,8 @@ class NetworkRecoveryManager:
         
         # 네트워크 모니터링 상태
         self.monitoring = False
-        self.monitor_thread = None
+        self.monitor_job = None
+        self.save_job = None
         
         # 복구 전략 등록
         self.recovery_strategies = {
@@ -67,7 +74,7 @@ class NetworkRecoveryManager:
         # 복구 로그 디렉토리
         self.log_dir = os.path.join(DATA_DIR, 'network_recovery')
         os.makedirs(self.log_dir, exist_ok=True)
-        self.recovery_log_file = os.path.join(self.log_dir, 'recovery_log.json')
+        self.journal = open_journal(self.log_dir, 'recovery_journal')
         
         # 복구 기록 로드
         self._load_recovery_logs()
@@ -75,30 +82,33 @@ class NetworkRecoveryManager:
         self.logger.info("네트워크 복구 관리자 초기화 완료")
     
     def _load_recovery_logs(self):
-        """기존 복구 로그 로드"""
+        """복구 저널을 재생해 마지막 상태와 최근 오류 기록 복원"""
         try:
-            if os.path.exists(self.recovery_log_file):
-                with open(self.recovery_log_file, 'r') as f:
-                    recovery_data = json.load(f)
-                
-                self.recovery_attempts = recovery_data.get('recovery_attempts', {})
-                self.connection_status = recovery_data.get('connection_status', {})
-                self.error_history = recovery_data.get('error_history', {})
-                
-                # 시간 형식 변환
-                for key, value in recovery_data.get('last_successful_connection', {}).items():
-                    if value:
+            restored = 0
+            for record in self.journal.replay():
+                restored += 1
+                if record.get('event') == 'error':
+                    self.error_history.setdefault(
+                        record['service'], deque(maxlen=self.MAX_ERROR_HISTORY)
+                    ).append({key: record[key] for key in ('timestamp', 'message', 'type')})
+                elif record.get('event') == 'state':
+                    self.recovery_attempts.update(record.get('recovery_attempts', {}))
+                    self.connection_status.update(record.get('connection_status', {}))
+                    
+                    # 시간 형식 변환
+                    for key, value in record.get('last_successful_connection', {}).items():
                         try:
-                            self.last_successful_connection[key] = datetime.fromisoformat(value)
+                            self.last_successful_connection[key] = datetime.fromisoformat(value) if value else None
                         except ValueError:
                             self.last_successful_connection[key] = None
-                
+            
+            if restored:
                 self.logger.info("복구 로그 로드 완료")
         except Exception as e:
             self.logger.error(f"복구 로그 로드 중 오류: {e}")
     
     def _save_recovery_logs(self):
-        """현재 복구 로그 저장"""
+        """현재 연결/복구 상태를 저널에 추가 (오류는 발생 시점에 기록)"""
         try:
             # 저장을 위한 시간 형식 변환
             last_connections = {}
@@ -108,16 +118,13 @@ class NetworkRecoveryManager:
                 else:
                     last_connections[key] = None
             
-            recovery_data = {
-                'last_updated': datetime.now().isoformat(),
+            self.journal.append({
+                'event': 'state',
+                'timestamp': datetime.now().isoformat(),
                 'recovery_attempts': self.recovery_attempts,
                 'connection_status': self.connection_status,
-                'error_history': self.error_history,
                 'last_successful_connection': last_connections
-            }
-            
-            with open(self.recovery_log_file, 'w') as f:
-                json.dump(recovery_data, f, indent=2)
+            })
         except Exception as e:
             self.logger.error(f"복구 로그 저장 중 오류: {e}")
     
@@ -134,7 +141,7 @@ class NetworkRecoveryManager:
         self.connection_status[service_name] = 'unknown'
         self.recovery_attempts[service_name] = 0
         self.last_successful_connection[service_name] = None
-        self.error_history[service_name] = []  # 오류 기록 초기화
+        self.error_history[service_name] = deque(maxlen=self.MAX_ERROR_HISTORY)  # 오류 기록 초기화
         
         # 대체 엔드포인트 설정
         self.alternative_endpoints[service_name] = {
@@ -211,9 +218,11 @@ class NetworkRecoveryManager:
             return
         
         self.monitoring = True
-        self.monitor_thread = threading.Thread(target=self._monitoring_loop)
-        self.monitor_thread.daemon = True
-        self.monitor_thread.start()
+        scheduler = get_scheduler()
+        self.monitor_job = scheduler.add_job('network_recovery.check', self._check_services, self.check_interval,
+                                             jitter=min(5.0, self.check_interval * 0.1))
+        # 복구 로그 저장 (30분마다)
+        self.save_job = scheduler.add_job('network_recovery.save_logs', self._save_recovery_logs, 1800, delay=1800)
         
         self.logger.info(f"네트워크 연결 모니터링 시작 (간격: {self.check_interval}초)")
     
@@ -223,40 +232,30 @@ class NetworkRecoveryManager:
             return
         
         self.monitoring = False
-        if self.monitor_thread and self.monitor_thread.is_alive():
-            self.monitor_thread.join(timeout=2.0)
+        for job in (self.monitor_job, self.save_job):
+            if job:
+                job.cancel(wait=2.0)
+        self.monitor_job = self.save_job = None
         
         self._save_recovery_logs()
         self.logger.info("네트워크 연결 모니터링 중지")
     
-    def _monitoring_loop(self):
-        """네트워크 모니터링 메인 루프"""
-        while self.monitoring:
-            try:
-                # 모든 서비스 연결 확인
-                for service_name in self.alternative_endpoints:
-                    # 연결 상태 확인
-                    connected = self.check_connection(service_name)
-                    
-                    # 연결 실패 시 복구 시도
-                    if not connected:
-                        self.recovery_attempts[service_name] += 1
-                        
-                        # 복구 필요 여부
-                        if self.recovery_attempts[service_name] <= self.max_recovery_attempts:
-                            self._attempt_recovery(service_name)
-                
-                # 복구 로그 저장 (30분마다)
-                current_time = datetime.now()
-                if current_time.minute % 30 == 0 and current_time.second < 10:
-                    self._save_recovery_logs()
-                
-                # 다음 확인까지 대기
-                time.sleep(self.check_interval)
+    def _check_services(self):
+        """모든 서비스 연결 확인 및 필요 시 복구 시도 (공용 스케줄러에서 주기 실행)"""
+        try:
+            for service_name in self.alternative_endpoints:
+                # 연결 상태 확인
+                connected = self.check_connection(service_name)
                 
-            except Exception as e:
-                self.logger.error(f"모니터링 루프 오류: {e}")
-                time.sleep(5)  # 오류 발생 시 짧게 대기
+                # 연결 실패 시 복구 시도
+                if not connected:
+                    self.recovery_attempts[service_name] += 1
+                    
+                    # 복구 필요 여부
+                    if self.recovery_attempts[service_name] <= self.max_recovery_attempts:
+                        self._attempt_recovery(service_name)
+        except Exception as e:
+            self.logger.error(f"모니터링 루프 오류: {e}")
     
     def _attempt_recovery(self, service_name: str) -> bool:
         """
@@ -484,8 +483,10 @@ class NetworkRecoveryManager:
             service_name: 서비스 이름
             error: 발생한 오류
         """
-        if service_name not in self.error_history:
-            self.error_history[service_name] = []
+        # 최대 MAX_ERROR_HISTORY 개의 오류만 유지
+        history = self.error_history.get(service_name)
+        if not isinstance(history, deque):
+            history = self.error_history[service_name] = deque(history or [], maxlen=self.MAX_ERROR_HISTORY)
         
         error_record = {
             'timestamp': datetime.now().isoformat(),
@@ -493,11 +494,8 @@ class NetworkRecoveryManager:
             'type': type(error).__name__
         }
         
-        self.error_history[service_name].append(error_record)
-        
-        # 최대 100개의 오류만 유지
-        if len(self.error_history[service_name]) > 100:
-            self.error_history[service_name] = self.error_history[service_name][-100:]
+        history.append(error_record)
+        self.journal.append({'event': 'error', 'service': service_name, **error_record})
     
     def _recover_from_dns_failure(self, service_name: str) -> bool:
         """
@@ -0,0 +1,124 @@
+"""
+OHLCV 데이터프레임 자료형 압축 모듈 - 암호화폐 자동매매 봇
+
+거래소에서 받은 OHLCV 프레임을 값 손실 없이 작은 자료형으로 바꿉니다.
+get_ohlcv, DataCollector, DataManager 가 데이터를 들여올 때 적용합니다.
+
+규칙:
+- 가격(open/high/low/close): float64 유지 (BTC 가격은 float32 로 표현하면 틀어짐)
+- 타임스탬프: datetime64 (int64 와 같은 8바이트, 문자열/밀리초 정수는 변환)
+- 그 외 실수(거래량 등): 소수 자릿수로 반올림해 원래 값을 되살릴 수 있을 때만 float32
+- 정수: 값 범위에 맞는 가장 작은 정수형
+- 모든 행이 같은 market_type, leverage 같은 열: 열을 지우고 df.attrs 메타데이터로 이동
+- 반복되는 문자열: category
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.logging_config import get_logger
+
+logger = get_logger('crypto_bot.ohlcv_schema')
+
+PRICE_COLUMNS = ('open', 'high', 'low', 'close')
+
+# 모든 행이 같은 값이면 열 대신 df.attrs 에 보관하는 열
+METADATA_COLUMNS = ('market_type', 'leverage', 'symbol', 'timeframe', 'exchange')
+
+# float32 변환 시 확인할 최대 소수 자릿수
+MAX_FLOAT32_DECIMALS = 8
+
+# |값| * 10^자릿수 가 이 값보다 작아야 float32 의 반 ulp 가 반올림 단위보다 작음
+_FLOAT32_EXACT_LIMIT = 2 ** 23
+
+
+def float32_safe_decimals(values: np.ndarray) -> Optional[int]:
+    """
+    float32 로 저장해도 반올림으로 원래 값을 되살릴 수 있는 소수 자릿수
+
+    Args:
+        values: float64 배열
+
+    Returns:
+        Optional[int]: 값들이 가진 소수 자릿수 (float32 로 안전하지 않으면 None)
+    """
+    finite = values[np.isfinite(values)]
+    if finite.size == 0:
+        return 0
+    peak = float(np.abs(finite).max())
+    for decimals in range(MAX_FLOAT32_DECIMALS + 1):
+        if peak * 10.0 ** decimals >= _FLOAT32_EXACT_LIMIT:
+            return None
+        if np.array_equal(np.round(finite, decimals), finite):
+            restored = np.round(finite.astype(np.float32).astype(np.float64), decimals)
+            return decimals if np.array_equal(restored, finite) else None
+    return None
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """인덱스와 문자열 내용을 포함한 데이터프레임 메모리 사용량 (바이트)"""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def compact_ohlcv(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
+    """
+    OHLCV 데이터프레임 자료형 압축 (값 손실 없음)
+
+    float32 로 바꾼 열은 df.attrs['float32_decimals'] 에 소수 자릿수를 기록하므로
+    np.round(df[col].astype(np.float64), 자릿수) 로 원래 값을 정확히 복원할 수 있습니다.
+
+    Args:
+        df: OHLCV 데이터프레임 (timestamp 열 또는 DatetimeIndex)
+        copy: False 이면 전달한 프레임을 직접 수정
+
+    Returns:
+        pd.DataFrame: 압축된 데이터프레임 (실패 시 입력 그대로)
+    """
+    if df is None or df.empty:
+        return df
+
+    try:
+        result = df.copy(deep=False) if copy else df
+        attrs = dict(result.attrs)
+
+        # 상수 열은 메타데이터로 이동
+        for column in METADATA_COLUMNS:
+            if column in result.columns and result[column].nunique(dropna=False) <= 1:
+                value = result[column].iloc[0]
+                attrs[column] = value.item() if isinstance(value, np.generic) else value
+                result.drop(columns=column, inplace=True)
+
+        if 'timestamp' in result.columns and not pd.api.types.is_datetime64_any_dtype(result['timestamp']):
+            if pd.api.types.is_numeric_dtype(result['timestamp']):
+                result['timestamp'] = pd.to_datetime(result['timestamp'], unit='ms')
+            else:
+                result['timestamp'] = pd.to_datetime(result['timestamp'])
+
+        float32_decimals = dict(attrs.get('float32_decimals') or {})
+        for column in result.columns:
+            series = result[column]
+            if column in PRICE_COLUMNS:
+                if series.dtype != np.float64:
+                    result[column] = pd.to_numeric(series).astype(np.float64)
+            elif pd.api.types.is_float_dtype(series) and series.dtype != np.float32:
+                decimals = float32_safe_decimals(series.to_numpy(dtype=np.float64))
+                if decimals is not None:
+                    result[column] = series.astype(np.float32)
+                    float32_decimals[column] = decimals
+            elif pd.api.types.is_integer_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                result[column] = pd.to_numeric(series, downcast='integer')
+            elif (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)) \
+                    and not isinstance(series.dtype, pd.CategoricalDtype):
+                if series.nunique(dropna=False) <= len(series) // 2:
+                    result[column] = series.astype('category')
+
+        if float32_decimals:
+            attrs['float32_decimals'] = float32_decimals
+        result.attrs = attrs
+        return result
+
+    except Exception as e:
+        logger.error(f"OHLCV 자료형 압축 중 오류: {e}")
+        return df
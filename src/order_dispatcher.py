@@ -0,0 +1,247 @@
+"""
+일괄 주문 디스패처 모듈 - 암호화폐 자동매매 봇
+
+비상 포지션 감소나 일괄 청산처럼 여러 주문을 한 번에 내야 할 때 사용합니다.
+주문은 심볼별 제출 순서를 지키는 라운드로 나누고, 각 라운드는 거래소의 일괄 주문
+엔드포인트(바이낸스 선물 batchOrders 등)로 묶어 제한된 동시성으로 전송합니다.
+전체 마감 시간이 지나면 남은 주문은 보내지 않고 결과에 표시합니다.
+
+ExchangeAPI._retry_order 와 달리 재시도 대기가 없으므로, 심볼마다 주문이 하나인
+일반적인 비상 청산은 왕복 시간 한 번 안에 끝납니다.
+"""
+
+import time
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Any, Optional
+
+import ccxt
+
+from src.logging_config import get_logger
+
+logger = get_logger('crypto_bot.order_dispatcher')
+
+# 주문별 결과 상태
+DISPATCH_OK = 'ok'              # 거래소가 주문을 접수함
+DISPATCH_FAILED = 'failed'      # 거래소가 거부했거나 요청 오류
+DISPATCH_UNKNOWN = 'unknown'    # 마감 시간까지 응답이 없어 접수 여부를 알 수 없음
+DISPATCH_SKIPPED = 'skipped'    # 마감 시간이 지나 전송하지 않음
+
+# 바이낸스 batchOrders 한 번에 보낼 수 있는 최대 주문 수
+DEFAULT_BATCH_SIZE = 5
+
+
+class BulkOrderDispatcher:
+    """
+    여러 주문을 동시에 전송하는 디스패처
+
+    같은 심볼의 주문은 요청 순서대로 서로 다른 라운드에 배치되고, 한 라운드가 끝나야
+    다음 라운드를 보냅니다. 라운드 안의 주문은 일괄 주문 단위(batch_size)로 묶여
+    최대 max_workers 개 요청이 동시에 전송됩니다. 일괄 주문을 지원하지 않는 시장
+    (예: 바이낸스 현물)에서는 주문별 요청으로 자동 전환합니다.
+    """
+
+    def __init__(self, exchange_api, max_workers: int = 8, deadline: float = 10.0,
+                 batch_size: int = DEFAULT_BATCH_SIZE, use_batch: bool = True):
+        """
+        일괄 주문 디스패처 초기화
+
+        Args:
+            exchange_api: 거래소 API 인스턴스 (exchange 속성에 ccxt 객체 보유)
+            max_workers: 동시에 보낼 최대 요청 수
+            deadline: 기본 전체 마감 시간 (초)
+            batch_size: 일괄 주문 요청 하나에 담을 최대 주문 수
+            use_batch: 일괄 주문 엔드포인트 사용 여부
+        """
+        self.exchange_api = exchange_api
+        self.max_workers = max(1, int(max_workers))
+        self.deadline = deadline
+        self.batch_size = max(1, int(batch_size))
+        self.use_batch = use_batch
+        self._batch_supported: Dict[bool, bool] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def exchange(self):
+        return getattr(self.exchange_api, 'exchange', None) or self.exchange_api
+
+    def dispatch(self, orders: List[Dict[str, Any]], deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        주문 목록을 동시에 전송하고 집계 결과 반환
+
+        Args:
+            orders: 주문 목록. 각 항목은 symbol, side, amount 필수이며 type(기본 market),
+                    price, params, ref(호출자 식별용, 예: 포지션 ID)를 가질 수 있음
+            deadline: 전체 마감 시간 (초, None이면 기본값)
+
+        Returns:
+            dict: success(전부 접수 여부), total, succeeded, failed, unknown, skipped,
+                  requests(전송한 요청 단위 수), elapsed(초), results(입력 순서의 주문별 결과)
+        """
+        started = time.monotonic()
+        limit = started + (self.deadline if deadline is None else deadline)
+        results = [self._result(order, DISPATCH_SKIPPED) for order in orders]
+        requests = 0
+
+        rounds = self._plan_rounds(orders)
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='order-dispatch')
+        try:
+            for round_indexes in rounds:
+                remaining = limit - time.monotonic()
+                if remaining <= 0:
+                    break
+                futures = {}
+                for chunk in self._chunk(round_indexes, orders):
+                    future = executor.submit(self._send, [orders[i] for i in chunk])
+                    futures[future] = chunk
+                    requests += 1
+                done, pending = wait(futures, timeout=remaining)
+                for future in done:
+                    for i, outcome in zip(futures[future], future.result()):
+                        results[i].update(outcome)
+                for future in pending:
+                    if future.cancel():
+                        # 작업자를 기다리느라 아직 전송하지 않은 요청은 보내지 않음
+                        requests -= 1
+                        for i in futures[future]:
+                            results[i].update(status=DISPATCH_SKIPPED, error='마감 시간 초과로 전송하지 않음')
+                    else:
+                        for i in futures[future]:
+                            results[i].update(status=DISPATCH_UNKNOWN, error='마감 시간 내 응답 없음')
+                if pending:
+                    break
+        finally:
+            # 대기 중인 요청은 취소하고, 이미 전송 중인 요청은 기다리지 않고 반환
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        counts = {status: 0 for status in (DISPATCH_OK, DISPATCH_FAILED, DISPATCH_UNKNOWN, DISPATCH_SKIPPED)}
+        for result in results:
+            counts[result['status']] += 1
+        summary = {
+            'success': counts[DISPATCH_OK] == len(orders),
+            'total': len(orders),
+            'succeeded': counts[DISPATCH_OK],
+            'failed': counts[DISPATCH_FAILED],
+            'unknown': counts[DISPATCH_UNKNOWN],
+            'skipped': counts[DISPATCH_SKIPPED],
+            'requests': requests,
+            'elapsed': time.monotonic() - started,
+            'results': results,
+        }
+        log = logger.info if summary['success'] else logger.warning
+        log(f"일괄 주문 완료: {summary['succeeded']}/{summary['total']} 접수, 실패 {summary['failed']}, "
+            f"미확인 {summary['unknown']}, 미전송 {summary['skipped']} "
+            f"(요청 {requests}회, {summary['elapsed']:.3f}초)")
+        return summary
+
+    # ------------------------------------------------------------------
+    # 내부 구현
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _result(order: Dict[str, Any], status: str) -> Dict[str, Any]:
+        return {'ref': order.get('ref'), 'symbol': order.get('symbol'), 'side': order.get('side'),
+                'amount': order.get('amount'), 'status': status, 'order': None, 'error': None}
+
+    @staticmethod
+    def _plan_rounds(orders: List[Dict[str, Any]]) -> List[List[int]]:
+        """심볼별 n번째 주문끼리 같은 라운드로 묶음 (심볼 내 순서 보장)"""
+        rounds: List[List[int]] = []
+        seen: Dict[str, int] = {}
+        for i, order in enumerate(orders):
+            k = seen.get(order.get('symbol'), 0)
+            seen[order.get('symbol')] = k + 1
+            if k == len(rounds):
+                rounds.append([])
+            rounds[k].append(i)
+        return rounds
+
+    def _chunk(self, indexes: List[int], orders: List[Dict[str, Any]]) -> List[List[int]]:
+        """라운드를 요청 단위로 분할 (일괄 주문 가능한 주문은 시장 유형별로 batch_size 개씩)"""
+        groups: Dict[bool, List[int]] = {}
+        chunks = []
+        for i in indexes:
+            is_contract = self._is_contract(orders[i])
+            if self.use_batch and self.batch_size > 1 and self._batch_allowed(is_contract):
+                groups.setdefault(is_contract, []).append(i)
+            else:
+                chunks.append([i])
+        for group in groups.values():
+            chunks.extend(group[j:j + self.batch_size] for j in range(0, len(group), self.batch_size))
+        return chunks
+
+    def _is_contract(self, order: Dict[str, Any]) -> bool:
+        """선물(계약) 주문 여부 (ccxt 통합 심볼의 ':' 또는 거래소 API 시장 유형 기준)"""
+        if ':' in (order.get('symbol') or ''):
+            return True
+        return (getattr(self.exchange_api, 'market_type', 'spot') or 'spot').lower() == 'futures'
+
+    def _batch_allowed(self, is_contract: bool) -> bool:
+        """거래소가 해당 시장 유형의 주문을 일괄 엔드포인트로 받을 수 있는지"""
+        if not getattr(self.exchange, 'has', {}).get('createOrders'):
+            return False
+        with self._lock:
+            return self._batch_supported.get(is_contract, True)
+
+    def _format_symbol(self, symbol: Optional[str]) -> Optional[str]:
+        formatter = getattr(self.exchange_api, 'format_symbol', None)
+        return formatter(symbol) if formatter and symbol else symbol
+
+    def _request(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        return {'symbol': self._format_symbol(order.get('symbol')), 'type': order.get('type') or 'market',
+                'side': order.get('side'), 'amount': order.get('amount'), 'price': order.get('price'),
+                'params': dict(order.get('params') or {})}
+
+    def _send(self, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """요청 하나 전송 (주문 1개는 create_order, 여러 개는 create_orders)"""
+        requests = [self._request(order) for order in chunk]
+        if len(requests) > 1:
+            try:
+                for request in requests:
+                    request['params'].setdefault('clientOrderId', f"bulk-{uuid.uuid4().hex[:24]}")
+                placed = self.exchange.create_orders(requests)
+                return self._match_batch(requests, placed)
+            except ccxt.NotSupported as e:
+                with self._lock:
+                    self._batch_supported[self._is_contract(chunk[0])] = False
+                logger.info(f"일괄 주문 미지원으로 개별 주문 전환: {e}")
+                return [self._send_one(request) for request in requests]
+            except Exception as e:
+                logger.error(f"일괄 주문 요청 실패 ({len(requests)}건): {e}")
+                return [{'status': DISPATCH_FAILED, 'error': str(e)} for _ in requests]
+        return [self._send_one(requests[0])]
+
+    def _match_batch(self, requests: List[Dict[str, Any]],
+                     placed: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        일괄 응답을 요청 순서에 맞춤
+
+        ccxt 는 응답을 시간순으로 정렬하므로 접수된 주문은 clientOrderId 로 찾고,
+        거부 항목(주문 ID 없음)은 남은 요청에 응답 순서대로 대응시킵니다.
+        """
+        by_client_id = {order.get('clientOrderId'): order for order in placed if order.get('id')}
+        rejected = iter([order for order in placed if not order.get('id')])
+        outcomes = []
+        for request in requests:
+            order = by_client_id.get(request['params'].get('clientOrderId'))
+            outcomes.append(self._outcome(order if order is not None else next(rejected, None)))
+        return outcomes
+
+    def _send_one(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return self._outcome(self.exchange.create_order(
+                request['symbol'], request['type'], request['side'], request['amount'],
+                request['price'], request['params']))
+        except Exception as e:
+            logger.error(f"주문 요청 실패: {request['symbol']} {request['side']} {request['amount']} - {e}")
+            return {'status': DISPATCH_FAILED, 'error': str(e)}
+
+    @staticmethod
+    def _outcome(order: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """ccxt 주문 구조를 결과로 변환 (일괄 응답의 거부 항목은 id 없이 info 에 오류 포함)"""
+        if order and order.get('id'):
+            return {'status': DISPATCH_OK, 'order': order, 'error': None}
+        info = (order or {}).get('info') or {}
+        return {'status': DISPATCH_FAILED, 'order': order,
+                'error': info.get('msg') or '주문 ID 없음'}
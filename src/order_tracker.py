@@ -0,0 +1,599 @@
+"""
+주문 상태 추적 모듈 - 암호화폐 자동매매 봇
+
+거래소 사용자 데이터 스트림(listenKey 웹소켓)의 체결 보고를 받아 우리 계정 주문의
+상태를 메모리에 유지하고, 상태가 바뀔 때만 DB(orders, stop_loss_orders)에 기록하고
+ORDER_* 이벤트를 발행합니다.
+
+REST 조회(미체결 주문 + 개별 주문 조회)는 스트림에 (재)연결할 때 놓친 변경을
+맞추는 용도로만 사용합니다. 스트림이 연결되어 있는 동안 ExchangeAPI 의
+get_order_status / get_open_orders 는 메모리 상태를 반환합니다.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable
+
+from src.account_snapshot import account_fingerprint
+from src.event_manager import EventType, get_event_manager
+from src.logging_config import get_logger
+
+# 웹소켓 클라이언트 (선택 의존성)
+try:
+    import websocket
+except ImportError:
+    websocket = None
+
+logger = get_logger('crypto_bot.order_tracker')
+
+# 바이낸스 주문 상태 -> ccxt 주문 상태
+ORDER_STATUS_MAP = {
+    'NEW': 'open',
+    'PARTIALLY_FILLED': 'open',
+    'NEW_INSURANCE': 'open',
+    'NEW_ADL': 'open',
+    'FILLED': 'closed',
+    'CANCELED': 'canceled',
+    'PENDING_CANCEL': 'canceling',
+    'EXPIRED': 'expired',
+    'EXPIRED_IN_MATCH': 'expired',
+    'REJECTED': 'rejected',
+}
+
+TERMINAL_STATUSES = ('closed', 'canceled', 'expired', 'rejected')
+
+# 사용자 데이터 스트림 웹소켓 주소
+STREAM_URLS = {
+    ('spot', False): 'wss://stream.binance.com:9443/ws',
+    ('spot', True): 'wss://testnet.binance.vision/ws',
+    ('futures', False): 'wss://fstream.binance.com/ws',
+    ('futures', True): 'wss://stream.binancefuture.com/ws',
+}
+
+# 손절/익절 주문으로 보는 주문 유형 (stop_loss_orders 상태 갱신 대상)
+_STOP_ORDER_TYPES = ('stop', 'stop_market', 'stop_loss', 'stop_loss_limit', 'take_profit',
+                     'take_profit_market', 'take_profit_limit', 'trailing_stop_market')
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_order_event(payload: Dict[str, Any], symbol_resolver: Optional[Callable[[str], str]] = None) -> Optional[Dict[str, Any]]:
+    """
+    사용자 데이터 스트림 주문 이벤트를 ccxt 형식 주문으로 변환
+
+    Args:
+        payload: 현물 executionReport 또는 선물 ORDER_TRADE_UPDATE 메시지
+        symbol_resolver: 거래소 심볼(BTCUSDT)을 통합 심볼로 바꾸는 함수
+
+    Returns:
+        dict: 주문 (주문 이벤트가 아니면 None)
+    """
+    event_type = payload.get('e')
+    if event_type == 'executionReport':
+        data = payload
+    elif event_type == 'ORDER_TRADE_UPDATE':
+        data = payload.get('o') or {}
+    else:
+        return None
+
+    market_id = data.get('s', '')
+    amount = _to_float(data.get('q')) or 0.0
+    filled = _to_float(data.get('z')) or 0.0
+    if event_type == 'executionReport':
+        quote_filled = _to_float(data.get('Z')) or 0.0
+        average = quote_filled / filled if filled else None
+    else:
+        average = _to_float(data.get('ap')) or None
+        quote_filled = average * filled if average else 0.0
+    timestamp = int(data.get('T') or payload.get('E') or 0)
+    last_qty = _to_float(data.get('l')) or 0.0
+    commission = _to_float(data.get('n'))
+
+    return {
+        'id': str(data.get('i')),
+        'clientOrderId': data.get('c'),
+        'symbol': symbol_resolver(market_id) if symbol_resolver else market_id,
+        'timestamp': timestamp,
+        'datetime': datetime.fromtimestamp(timestamp / 1000).isoformat() if timestamp else None,
+        'type': str(data.get('o', '')).lower(),
+        'side': str(data.get('S', '')).lower(),
+        'amount': amount,
+        'price': _to_float(data.get('p')) or None,
+        'stopPrice': _to_float(data.get('P') if event_type == 'executionReport' else data.get('sp')) or None,
+        'average': average,
+        'cost': quote_filled or None,
+        'filled': filled,
+        'remaining': max(amount - filled, 0.0),
+        'status': ORDER_STATUS_MAP.get(data.get('X'), 'open'),
+        'reduceOnly': bool(data.get('R', False)),
+        'fee': {'cost': commission, 'currency': data.get('N')} if commission else None,
+        'execution_type': data.get('x'),
+        'last_fill': {'amount': last_qty, 'price': _to_float(data.get('L'))} if last_qty else None,
+        'info': payload,
+    }
+
+
+def stream_available() -> bool:
+    """기본 웹소켓 연결에 필요한 websocket-client 패키지 설치 여부"""
+    return websocket is not None
+
+
+class WebSocketConnection:
+    """websocket-client 연결 래퍼 (recv_json / close 인터페이스)"""
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        if websocket is None:
+            raise ImportError("websocket-client 패키지가 설치되어 있지 않습니다.")
+        self._ws = websocket.create_connection(url, timeout=timeout)
+
+    def recv_json(self) -> Any:
+        """다음 메시지 (수신 제한 시간 초과 시 TimeoutError)"""
+        try:
+            return json.loads(self._ws.recv())
+        except websocket.WebSocketTimeoutException as e:
+            raise TimeoutError(str(e))
+
+    def close(self) -> None:
+        self._ws.close()
+
+
+class UserDataStream:
+    """listenKey 발급/연장/해지와 사용자 데이터 스트림 연결"""
+
+    def __init__(self, exchange_api, connector: Optional[Callable[[str], Any]] = None,
+                 stream_url: Optional[str] = None):
+        """
+        Args:
+            exchange_api: 거래소 API 인스턴스 (exchange 속성의 ccxt 바이낸스 객체 사용)
+            connector: 웹소켓 URL을 받아 recv_json()/close() 를 제공하는 연결을 반환하는 함수
+                       (None이면 websocket-client 사용)
+            stream_url: 웹소켓 기본 주소 (None이면 시장 유형/테스트넷/가상 거래소 설정으로 결정)
+        """
+        self.exchange_api = exchange_api
+        self.custom_connector = connector is not None
+        self.connector = connector or WebSocketConnection
+        self.futures = (getattr(exchange_api, 'market_type', 'spot') or 'spot').lower() in ('future', 'futures')
+        self.stream_url = stream_url or self._default_stream_url()
+        self.listen_key: Optional[str] = None
+
+    def _default_stream_url(self) -> str:
+        from utils.config import get_fake_exchange_url, is_testnet_enabled
+
+        fake_url = get_fake_exchange_url()
+        if fake_url:
+            return fake_url.replace('https://', 'wss://').replace('http://', 'ws://') + '/ws'
+        return STREAM_URLS[('futures' if self.futures else 'spot', is_testnet_enabled())]
+
+    def create_listen_key(self) -> str:
+        """listenKey 발급"""
+        exchange = self.exchange_api.exchange
+        if self.futures:
+            response = exchange.fapiPrivatePostListenKey()
+        else:
+            response = exchange.publicPostUserDataStream()
+        self.listen_key = response['listenKey']
+        return self.listen_key
+
+    def keepalive(self) -> bool:
+        """listenKey 유효 기간 연장 (60분 만료, 30분마다 호출)"""
+        if not self.listen_key:
+            return False
+        try:
+            exchange = self.exchange_api.exchange
+            if self.futures:
+                exchange.fapiPrivatePutListenKey({'listenKey': self.listen_key})
+            else:
+                exchange.publicPutUserDataStream({'listenKey': self.listen_key})
+            return True
+        except Exception as e:
+            logger.error(f"listenKey 연장 중 오류 발생: {e}")
+            return False
+
+    def close_listen_key(self) -> None:
+        """listenKey 해지"""
+        if not self.listen_key:
+            return
+        try:
+            exchange = self.exchange_api.exchange
+            if self.futures:
+                exchange.fapiPrivateDeleteListenKey({'listenKey': self.listen_key})
+            else:
+                exchange.publicDeleteUserDataStream({'listenKey': self.listen_key})
+        except Exception as e:
+            logger.warning(f"listenKey 해지 중 오류: {e}")
+        self.listen_key = None
+
+    def connect(self):
+        """새 listenKey 로 스트림 연결"""
+        return self.connector(f"{self.stream_url}/{self.create_listen_key()}")
+
+
+class OrderTracker:
+    """
+    사용자 데이터 스트림 기반 주문 상태 추적기
+
+    스트림 연결 스레드는 연결이 끊어지면 지수 백오프로 재연결하고,
+    연결될 때마다 reconcile()로 끊겨 있던 동안의 변경을 REST로 맞춥니다.
+    """
+
+    def __init__(self, exchange_api, db_manager=None, event_manager=None,
+                 connector: Optional[Callable[[str], Any]] = None, stream_url: Optional[str] = None,
+                 keepalive_interval: float = 1800.0, reconnect_delay: float = 1.0,
+                 max_reconnect_delay: float = 60.0, max_closed_orders: int = 1000):
+        """
+        Args:
+            exchange_api: 거래소 API 인스턴스
+            db_manager: 데이터베이스 관리자 (None이면 DB에 기록하지 않음)
+            event_manager: 이벤트 관리자 (None이면 전역 인스턴스 사용)
+            connector: 웹소켓 연결 함수 (UserDataStream 참고)
+            stream_url: 웹소켓 기본 주소
+            keepalive_interval: listenKey 연장 주기 (초)
+            reconnect_delay: 첫 재연결 대기 시간 (초, 실패할 때마다 두 배)
+            max_reconnect_delay: 최대 재연결 대기 시간 (초)
+            max_closed_orders: 메모리에 보관할 종료 주문 수
+        """
+        self.exchange_api = exchange_api
+        self.db = db_manager
+        self.event_manager = event_manager or get_event_manager()
+        self.stream = UserDataStream(exchange_api, connector=connector, stream_url=stream_url)
+        self.keepalive_interval = keepalive_interval
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.max_closed_orders = max_closed_orders
+
+        self._orders: Dict[str, Dict[str, Any]] = {}
+        self._reconciled: set = set()
+        self._lock = threading.RLock()
+        self._connection = None
+        self._connected = threading.Event()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {'events': 0, 'transitions': 0, 'stale_events': 0, 'connects': 0,
+                       'reconciled': 0, 'keepalives': 0, 'errors': 0}
+
+    # ------------------------------------------------------------------
+    # 주문 상태
+    # ------------------------------------------------------------------
+
+    def _count(self, key: str, n: int = 1) -> None:
+        """통계 증가 (스트림/REST 호출 스레드에서 호출)"""
+        with self._lock:
+            self._stats[key] += n
+
+    @property
+    def connected(self) -> bool:
+        """스트림 연결 및 재연결 후 정합성 확인 완료 여부"""
+        return self._connected.is_set()
+
+    def _resolve_symbol(self, market_id: str) -> str:
+        exchange = getattr(self.exchange_api, 'exchange', None)
+        if exchange is None or not getattr(exchange, 'markets', None):
+            return market_id
+        try:
+            return exchange.safe_symbol(market_id, None, None, 'swap' if self.stream.futures else 'spot')
+        except Exception:
+            return market_id
+
+    def _base(self, symbol: Any) -> str:
+        """종목 비교용 키 (거래소 형식 BTCUSDT 는 통합 심볼로 바꾸고, BTC/USDT:USDT 는 BTC/USDT 로 취급)"""
+        symbol = str(symbol or '')
+        if symbol and '/' not in symbol:
+            symbol = self._resolve_symbol(symbol)
+        return symbol.split(':')[0]
+
+    def track(self, order: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        직접 낸 주문(REST 응답)을 추적 대상에 추가
+
+        Args:
+            order: ccxt 형식 주문
+
+        Returns:
+            dict: 상태가 바뀌었으면 갱신된 주문, 아니면 None
+        """
+        if not order or order.get('id') is None:
+            return None
+        return self._apply(dict(order, id=str(order['id'])), source='rest')
+
+    def apply_event(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        스트림 메시지 하나 반영
+
+        Args:
+            payload: 사용자 데이터 스트림 메시지
+
+        Returns:
+            dict: 주문 상태가 바뀌었으면 갱신된 주문, 아니면 None
+        """
+        self._count('events')
+        order = parse_order_event(payload, self._resolve_symbol)
+        if order is None:
+            return None
+        return self._apply(order, source='stream')
+
+    def _apply(self, order: Dict[str, Any], source: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            current = self._orders.get(order['id'])
+            if current is not None and self._is_stale(current, order):
+                self._count('stale_events')
+                return None
+            merged = dict(current or {}, **{k: v for k, v in order.items() if v is not None})
+            merged['source'] = source
+            changed = current is None or any(current.get(k) != merged.get(k)
+                                             for k in ('status', 'filled', 'price', 'amount', 'stopPrice'))
+            self._orders[order['id']] = merged
+            if not changed:
+                return None
+            self._count('transitions')
+            self._prune_closed()
+        self._persist(current, merged)
+        return merged
+
+    @staticmethod
+    def _is_stale(current: Dict[str, Any], incoming: Dict[str, Any]) -> bool:
+        """뒤늦게 도착한 이전 상태인지 판단 (종료 상태와 체결 수량은 되돌아가지 않음)"""
+        if current.get('status') in TERMINAL_STATUSES and incoming.get('status') not in TERMINAL_STATUSES:
+            return True
+        return (incoming.get('filled') or 0.0) < (current.get('filled') or 0.0)
+
+    def _prune_closed(self) -> None:
+        closed = [order_id for order_id, order in self._orders.items() if order.get('status') in TERMINAL_STATUSES]
+        for order_id in closed[:max(0, len(closed) - self.max_closed_orders)]:
+            del self._orders[order_id]
+
+    def _persist(self, previous: Optional[Dict[str, Any]], order: Dict[str, Any]) -> None:
+        status = order.get('status')
+        if self.db is not None:
+            try:
+                self.db.upsert_order(dict(order, additional_info={
+                    'client_order_id': order.get('clientOrderId'), 'filled': order.get('filled'),
+                    'average': order.get('average'), 'stop_price': order.get('stopPrice'),
+                    'reduce_only': order.get('reduceOnly'), 'source': order.get('source')}))
+                if status in TERMINAL_STATUSES and order.get('type') in _STOP_ORDER_TYPES:
+                    self.db.update_stop_loss_order_status(order['id'],
+                                                          'triggered' if status == 'closed' else 'cancelled')
+            except Exception as e:
+                self._count('errors')
+                logger.error(f"주문 상태 저장 중 오류 발생: {e}")
+
+        event = {'order_id': order['id'], 'symbol': order.get('symbol'), 'side': order.get('side'),
+                 'type': order.get('type'), 'status': status, 'amount': order.get('amount'),
+                 'filled': order.get('filled'), 'price': order.get('price'), 'average': order.get('average')}
+        if previous is None and status == 'open':
+            self.event_manager.publish(EventType.ORDER_CREATED, event)
+        elif status == 'closed':
+            self.event_manager.publish(EventType.ORDER_FILLED, event)
+        elif status in ('canceled', 'expired', 'rejected'):
+            self.event_manager.publish(EventType.ORDER_CANCELED, event)
+
+    def get_order(self, order_id: Any) -> Optional[Dict[str, Any]]:
+        """메모리의 주문 상태 (모르는 주문이면 None)"""
+        with self._lock:
+            order = self._orders.get(str(order_id))
+            return dict(order) if order else None
+
+    def get_open_orders(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """메모리의 미체결 주문 (symbol 은 BTC/USDT 와 BTC/USDT:USDT 를 같은 종목으로 취급)"""
+        base = self._base(symbol) if symbol else None
+        with self._lock:
+            return [dict(order) for order in self._orders.values()
+                    if order.get('status') == 'open'
+                    and (base is None or self._base(order.get('symbol')) == base)]
+
+    def covers(self, symbol: Optional[str]) -> bool:
+        """
+        메모리 상태만으로 해당 심볼의 미체결 주문을 답할 수 있는지
+
+        스트림이 연결되어 있고 정합성 확인(또는 adopt)으로 연결 이전 주문까지 반영된
+        심볼만 해당합니다. 그 외 심볼은 REST 로 조회해야 합니다.
+        """
+        if not symbol or not self.connected:
+            return False
+        with self._lock:
+            return self._base(symbol) in self._reconciled
+
+    def adopt(self, symbol: str, orders: List[Dict[str, Any]]) -> None:
+        """
+        연결 중 REST 로 조회한 심볼의 미체결 주문을 반영하고 이후 메모리 조회 대상으로 등록
+
+        Args:
+            symbol: 조회한 심볼
+            orders: 해당 심볼의 거래소 미체결 주문 (ccxt 형식)
+        """
+        if not symbol or not self.connected:
+            return
+        for order in orders:
+            self.track(order)
+        with self._lock:
+            self._reconciled.add(self._base(symbol))
+
+    # ------------------------------------------------------------------
+    # REST 정합성 확인 (연결 시에만)
+    # ------------------------------------------------------------------
+
+    def _reconcile_symbols(self) -> List[str]:
+        """정합성 확인 대상 심볼 (기본 심볼 + 메모리에 미체결 주문이 있는 심볼, 같은 종목은 한 번만)"""
+        symbols = {}
+        default = getattr(self.exchange_api, 'symbol', None)
+        for symbol in [default] + [order.get('symbol') for order in self.get_open_orders()]:
+            if symbol:
+                symbols.setdefault(self._base(symbol), symbol)
+        return list(symbols.values())
+
+    def reconcile(self) -> int:
+        """
+        REST 조회로 메모리 상태 맞추기
+
+        추적 중인 심볼마다 거래소 미체결 주문을 반영하고, 메모리에서 미체결이지만
+        거래소 목록에 없는 주문은 개별 조회로 최종 상태를 확인합니다.
+        미체결 목록 조회에 실패한 심볼의 주문은 다음 정합성 확인으로 미룹니다.
+
+        Returns:
+            int: 상태가 바뀐 주문 수
+        """
+        changed = 0
+        remote_count = 0
+        remote_ids = set()
+        checked_bases = set()
+        for symbol in self._reconcile_symbols():
+            try:
+                remote = self.exchange_api.get_open_orders(symbol) or []
+            except Exception as e:
+                self._count('errors')
+                logger.error(f"{symbol} 미체결 주문 정합성 확인 중 오류 발생: {e}")
+                continue
+            checked_bases.add(self._base(symbol))
+            remote_count += len(remote)
+            for order in remote:
+                remote_ids.add(str(order.get('id')))
+                if self.track(order):
+                    changed += 1
+
+        for order in self.get_open_orders():
+            if order['id'] in remote_ids or self._base(order.get('symbol')) not in checked_bases:
+                continue
+            try:
+                latest = self.exchange_api.get_order_status(order['id'], order.get('symbol'), use_tracker=False)
+            except Exception as e:
+                self._count('errors')
+                logger.warning(f"주문 {order['id']} 상태 확인 실패: {e}")
+                continue
+            if latest and self.track(latest):
+                changed += 1
+        with self._lock:
+            self._reconciled = checked_bases
+        self._count('reconciled', changed)
+        logger.info(f"주문 상태 정합성 확인 완료: 심볼 {len(checked_bases)}개, 거래소 미체결 {remote_count}건, "
+                    f"변경 {changed}건")
+        return changed
+
+    # ------------------------------------------------------------------
+    # 스트림 스레드
+    # ------------------------------------------------------------------
+
+    def start(self) -> bool:
+        """
+        스트림 수신 스레드 시작
+
+        Returns:
+            bool: 시작 여부 (websocket-client 가 없으면 시작하지 않고 REST 조회를 사용)
+        """
+        if self._thread and self._thread.is_alive():
+            return True
+        if not self.stream.custom_connector and not stream_available():
+            logger.warning("websocket-client 패키지가 없어 주문 상태 추적을 시작하지 않습니다 (REST 조회 사용).")
+            return False
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='OrderTracker', daemon=True)
+        self._thread.start()
+        logger.info(f"주문 상태 추적 시작: {self.stream.stream_url}")
+        return True
+
+    def stop(self) -> None:
+        """스트림 수신 스레드 중지 및 listenKey 해지"""
+        self._running = False
+        self._connected.clear()
+        connection = self._connection
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=10)
+        self._thread = None
+        self.stream.close_listen_key()
+
+    def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        """연결 및 정합성 확인이 끝날 때까지 대기"""
+        return self._connected.wait(timeout)
+
+    def _run(self) -> None:
+        delay = self.reconnect_delay
+        while self._running:
+            try:
+                self._connection = self.stream.connect()
+                self._count('connects')
+                self.reconcile()
+                self._connected.set()
+                delay = self.reconnect_delay
+                self._receive_loop(self._connection)
+            except Exception as e:
+                if self._running:
+                    self._count('errors')
+                    logger.warning(f"사용자 데이터 스트림 연결 끊김, {delay:.0f}초 후 재연결: {e}")
+            finally:
+                self._connected.clear()
+                if self._connection is not None:
+                    try:
+                        self._connection.close()
+                    except Exception:
+                        pass
+                    self._connection = None
+            if self._running:
+                time.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _receive_loop(self, connection) -> None:
+        last_keepalive = time.time()
+        while self._running:
+            if time.time() - last_keepalive >= self.keepalive_interval:
+                if self.stream.keepalive():
+                    self._count('keepalives')
+                last_keepalive = time.time()
+            try:
+                payload = connection.recv_json()
+            except TimeoutError:
+                continue
+            if isinstance(payload, dict) and 'stream' in payload and 'data' in payload:
+                payload = payload['data']
+            if not isinstance(payload, dict):
+                continue
+            if payload.get('e') == 'listenKeyExpired':
+                raise ConnectionError('listenKey 가 만료되었습니다.')
+            self.apply_event(payload)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """수신/상태 변경 통계"""
+        with self._lock:
+            open_orders = sum(1 for order in self._orders.values() if order.get('status') == 'open')
+            return dict(self._stats, connected=self.connected, tracked=len(self._orders), open=open_orders)
+
+
+# 거래소 계정(거래소/시장 유형/API 키와 접속 주소)별 공유 인스턴스
+_trackers: Dict[tuple, OrderTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def get_order_tracker(exchange_api, db_manager=None) -> OrderTracker:
+    """
+    거래소 계정별 공유 주문 상태 추적기 반환
+
+    listenKey 는 API 키마다 발급되므로 API 키나 테스트넷 여부가 다른 인스턴스는
+    서로 다른 추적기를 받습니다.
+
+    Args:
+        exchange_api: 거래소 API 인스턴스
+        db_manager: 데이터베이스 관리자
+
+    Returns:
+        OrderTracker: 주문 상태 추적기
+    """
+    key = (getattr(exchange_api, 'exchange_id', 'default'),
+           (getattr(exchange_api, 'market_type', 'spot') or 'spot').lower(),
+           account_fingerprint(exchange_api))
+    with _trackers_lock:
+        tracker = _trackers.get(key)
+        if tracker is None:
+            tracker = OrderTracker(exchange_api, db_manager=db_manager)
+            _trackers[key] = tracker
+        elif tracker.db is None and db_manager is not None:
+            tracker.db = db_manager
+        return tracker
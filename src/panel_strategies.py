@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 다종목 패널 전략 모듈
+
+"""
+여러 종목을 한 번에 평가하는 패널(시간 × 종목) 전략 모듈
+
+Strategy.generate_signals 는 종목 하나의 DataFrame 을 받으므로 200개 USDT 페어를
+스캔하면 DataFrame 복사와 지표 계산을 200번 반복합니다. 여기서는 종가/거래량을
+2차원 배열로 정렬해 두고 지표와 신호를 모든 종목에 대해 한 번의 배열 연산으로
+계산합니다.
+
+- Panel: 시각 인덱스와 종목 목록, (시간 × 종목) OHLCV 배열
+- PanelStrategy: generate_panel_signals(panel) -> PanelSignals
+- backtest_panel: 종목별 백테스트 (Backtester.run_backtest 와 같은 매매 규칙)
+- PanelScanner: 거래소에서 최근 캔들을 받아 최신 신호를 스캔
+
+종목마다 상장 시점이 다르면 첫 캔들 이전은 NaN 이며, 지표는 각 종목의 첫 캔들부터
+단일 종목 지표와 같은 방식으로 계산합니다. 중간에 빠진 캔들은 직전 종가로 채웁니다.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.kernels import position_state_machine
+from src.walk_forward import equity_metrics
+from src.logging_config import get_logger
+
+logger = get_logger('crypto_bot.panel_strategies')
+
+_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class Panel:
+    """(시간 × 종목) OHLCV 배열 묶음"""
+
+    def __init__(self, index: pd.DatetimeIndex, symbols: List[str], close: np.ndarray,
+                 volume: Optional[np.ndarray] = None, open_: Optional[np.ndarray] = None,
+                 high: Optional[np.ndarray] = None, low: Optional[np.ndarray] = None):
+        """
+        Args:
+            index: 캔들 시각 인덱스 (길이 T)
+            symbols: 종목 목록 (길이 N)
+            close: 종가 배열 (T × N)
+            volume: 거래량 배열 (T × N, None이면 0)
+            open_, high, low: 시가/고가/저가 배열 (None이면 종가)
+        """
+        self.index = pd.DatetimeIndex(index)
+        self.symbols = list(symbols)
+        self.close = np.asarray(close, dtype=np.float64)
+        if self.close.shape != (len(self.index), len(self.symbols)):
+            raise ValueError(f"종가 배열 크기가 맞지 않습니다: {self.close.shape}, "
+                             f"기대값: {(len(self.index), len(self.symbols))}")
+        self.volume = np.zeros_like(self.close) if volume is None else np.asarray(volume, dtype=np.float64)
+        self.open = self.close if open_ is None else np.asarray(open_, dtype=np.float64)
+        self.high = self.close if high is None else np.asarray(high, dtype=np.float64)
+        self.low = self.close if low is None else np.asarray(low, dtype=np.float64)
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame]) -> 'Panel':
+        """
+        종목별 OHLCV DataFrame 으로 패널 생성 (시각 합집합으로 정렬)
+
+        Args:
+            frames: {종목: OHLCV DataFrame} (DatetimeIndex 또는 timestamp 열)
+
+        Returns:
+            Panel: 패널
+        """
+        aligned = {}
+        for symbol, df in frames.items():
+            if df is None or df.empty:
+                logger.warning(f"{symbol} 데이터가 비어 있어 패널에서 제외합니다.")
+                continue
+            if 'timestamp' in df.columns:
+                df = df.set_index(pd.to_datetime(df['timestamp']))
+            df = df[~df.index.duplicated(keep='last')].sort_index()
+            aligned[symbol] = df
+        if not aligned:
+            raise ValueError("패널을 만들 데이터가 없습니다")
+
+        index = aligned[next(iter(aligned))].index
+        for df in aligned.values():
+            index = index.union(df.index)
+        symbols = list(aligned)
+
+        arrays = {}
+        for field in _FIELDS:
+            table = pd.DataFrame({symbol: df[field] for symbol, df in aligned.items() if field in df.columns},
+                                 index=index, columns=symbols).astype(np.float64)
+            arrays[field] = table
+        close = arrays['close']
+        listed = close.notna().cumsum().to_numpy() > 0
+        # 상장 이후 빠진 캔들은 직전 종가로 채우고 거래량은 0
+        close = close.ffill()
+        filled = {'close': close.to_numpy(copy=True)}
+        for field in ('open', 'high', 'low'):
+            filled[field] = arrays[field].fillna(close).to_numpy(copy=True)
+        filled['volume'] = arrays['volume'].fillna(0.0).to_numpy(copy=True)
+        for field in filled:
+            filled[field][~listed] = np.nan
+        return cls(index, symbols, filled['close'], filled['volume'], filled['open'],
+                   filled['high'], filled['low'])
+
+    @property
+    def shape(self):
+        return self.close.shape
+
+    def first_valid(self) -> np.ndarray:
+        """종목별 첫 캔들 위치 (데이터가 없으면 T)"""
+        valid = ~np.isnan(self.close)
+        return np.where(valid.any(axis=0), valid.argmax(axis=0), len(self.index))
+
+    def tail(self, n: int) -> 'Panel':
+        """마지막 n개 캔들만 남긴 패널"""
+        return Panel(self.index[-n:], self.symbols, self.close[-n:], self.volume[-n:],
+                     self.open[-n:], self.high[-n:], self.low[-n:])
+
+    def symbol_frame(self, symbol: str) -> pd.DataFrame:
+        """
+        한 종목의 OHLCV DataFrame (상장 이후 구간)
+
+        Args:
+            symbol: 종목
+
+        Returns:
+            DataFrame: OHLCV 데이터
+        """
+        column = self.symbols.index(symbol)
+        start = self.first_valid()[column]
+        return pd.DataFrame({'open': self.open[start:, column], 'high': self.high[start:, column],
+                             'low': self.low[start:, column], 'close': self.close[start:, column],
+                             'volume': self.volume[start:, column]}, index=self.index[start:])
+
+
+class PanelSignals:
+    """패널 전략 결과 (신호와 포지션 변화, 보조 지표)"""
+
+    def __init__(self, panel: Panel, signal: np.ndarray, position: np.ndarray,
+                 indicators: Optional[Dict[str, np.ndarray]] = None):
+        self.panel = panel
+        self.signal = signal
+        self.position = position
+        self.indicators = indicators or {}
+
+    def for_symbol(self, symbol: str) -> Dict[str, np.ndarray]:
+        """
+        종목별 신호 배열
+
+        Args:
+            symbol: 종목
+
+        Returns:
+            dict: signal, position 과 보조 지표 배열 (패널 전체 길이)
+        """
+        column = self.panel.symbols.index(symbol)
+        result = {'signal': self.signal[:, column], 'position': self.position[:, column]}
+        for name, values in self.indicators.items():
+            result[name] = values[:, column]
+        return result
+
+    def symbol_frame(self, symbol: str) -> pd.DataFrame:
+        """한 종목의 OHLCV + signal/position DataFrame (Backtester/단일 종목 코드 호환 형식)"""
+        column = self.panel.symbols.index(symbol)
+        start = self.panel.first_valid()[column]
+        df = self.panel.symbol_frame(symbol)
+        df['signal'] = self.signal[start:, column]
+        df['position'] = self.position[start:, column]
+        for name, values in self.indicators.items():
+            df[name] = values[start:, column]
+        return df
+
+    def latest(self) -> pd.DataFrame:
+        """
+        종목별 마지막 캔들의 신호 요약
+
+        Returns:
+            DataFrame: 종목별 close, signal, position, 보조 지표 (종목 인덱스)
+        """
+        data = {'close': self.panel.close[-1], 'signal': self.signal[-1], 'position': self.position[-1]}
+        for name, values in self.indicators.items():
+            data[name] = values[-1]
+        return pd.DataFrame(data, index=pd.Index(self.panel.symbols, name='symbol'))
+
+
+# ---------------------------------------------------------------------------
+# 2차원 지표 (열 = 종목)
+# ---------------------------------------------------------------------------
+
+def rolling_mean_2d(values: np.ndarray, period: int) -> np.ndarray:
+    """종목별 단순 이동평균 (창 안에 NaN 이 있으면 NaN)"""
+    return pd.DataFrame(values).rolling(window=period).mean().to_numpy()
+
+
+def _seeded_recursive_2d(values: np.ndarray, period: int, alpha: float) -> np.ndarray:
+    """
+    종목별 첫 period 개 평균으로 시작하는 재귀 평활 (EMA/Wilder 공통)
+
+    각 종목의 첫 유효값부터 period 개 평균을 시작값으로 두고 이후는
+    avg = alpha * 값 + (1 - alpha) * 이전 avg 로 계산합니다.
+    """
+    seeds = rolling_mean_2d(values, period)
+    t = len(values)
+    valid = ~np.isnan(values)
+    first = np.where(valid.any(axis=0), valid.argmax(axis=0), t)
+    seed_row = first + period - 1
+
+    rows = np.arange(t)[:, None]
+    recursive = np.where(rows > seed_row, values, np.nan)
+    has_seed = seed_row < t
+    columns = np.flatnonzero(has_seed)
+    recursive[seed_row[columns], columns] = seeds[seed_row[columns], columns]
+    # 시작값 이전은 NaN 이므로 ewm 이 종목별 시작값부터 재귀 계산
+    return pd.DataFrame(recursive).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+
+
+def ema_2d(values: np.ndarray, period: int) -> np.ndarray:
+    """종목별 지수 이동평균 (indicators.exponential_moving_average 와 같은 방식)"""
+    return _seeded_recursive_2d(values, period, 2 / (period + 1))
+
+
+def rsi_2d(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    종목별 RSI (indicators.relative_strength_index 와 같은 방식)
+
+    Args:
+        close: 종가 배열 (T × N)
+        period: RSI 기간
+
+    Returns:
+        np.ndarray: RSI 배열 (T × N)
+    """
+    listed = ~np.isnan(close)
+    delta = np.full_like(close, np.nan)
+    delta[1:] = close[1:] - close[:-1]
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    # 상장 전 구간은 NaN (상장 첫 캔들의 변화량은 0)
+    gain[~listed] = np.nan
+    loss[~listed] = np.nan
+
+    avg_gain = _seeded_recursive_2d(gain, period, 1 / period)
+    avg_loss = _seeded_recursive_2d(loss, period, 1 / period)
+    avg_loss = np.where(avg_loss == 0, 0.001, avg_loss)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+    rsi[~np.isfinite(rsi)] = np.nan
+    return rsi
+
+
+def _hold_events(events: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    사건 위치의 값(1, -1, 0)을 다음 사건까지 유지 (사건이 없는 위치는 NaN 입력)
+
+    Returns:
+        tuple: (signal, position) 배열
+    """
+    signal = pd.DataFrame(events).ffill().fillna(0.0).to_numpy()
+    position = np.zeros_like(signal)
+    position[1:] = signal[1:] - signal[:-1]
+    return signal, position
+
+
+# ---------------------------------------------------------------------------
+# 패널 전략
+# ---------------------------------------------------------------------------
+
+class PanelStrategy:
+    """패널 전략의 기본 클래스"""
+
+    def __init__(self, name: str = "PanelStrategy"):
+        self.name = name
+        self.required_data_points = 30
+
+    def generate_panel_signals(self, panel: Panel) -> PanelSignals:
+        """
+        모든 종목의 신호를 한 번에 계산
+
+        Args:
+            panel: OHLCV 패널
+
+        Returns:
+            PanelSignals: 종목별 signal (1 매수 유지, -1 매도, 0 중립) / position (signal 변화량)
+        """
+        raise NotImplementedError("이 메서드는 하위 클래스에서 구현해야 합니다")
+
+
+class PanelMovingAverageCrossover(PanelStrategy):
+    """이동평균 교차 패널 전략 (MovingAverageCrossover 의 RSI/거래량 필터 포함 신호 규칙)"""
+
+    def __init__(self, short_period: int = 12, long_period: int = 26, ma_type: str = 'sma',
+                 rsi_period: int = 14, volume_period: int = 20):
+        if ma_type.lower() not in ('sma', 'ema'):
+            raise ValueError(f"지원하지 않는 이동평균 유형입니다: {ma_type}")
+        super().__init__(name=f"PanelMACrossover_{short_period}_{long_period}_{ma_type}")
+        self.short_period = short_period
+        self.long_period = long_period
+        self.ma_type = ma_type.lower()
+        self.rsi_period = rsi_period
+        self.volume_period = volume_period
+        self.required_data_points = max(long_period, rsi_period, volume_period) + 1
+
+    def generate_panel_signals(self, panel: Panel) -> PanelSignals:
+        average = rolling_mean_2d if self.ma_type == 'sma' else ema_2d
+        short_ma = average(panel.close, self.short_period)
+        long_ma = average(panel.close, self.long_period)
+        rsi = rsi_2d(panel.close, self.rsi_period)
+        volume_ma = rolling_mean_2d(panel.volume, self.volume_period)
+
+        diff = short_ma - long_ma
+        prev_diff = np.full_like(diff, np.nan)
+        prev_diff[1:] = diff[:-1]
+        volume_ok = panel.volume > volume_ma * 0.5
+        cross_up = (prev_diff <= 0) & (diff > 0)
+        cross_down = (prev_diff >= 0) & (diff < 0)
+
+        # 교차 캔들: 필터 통과 시 1/-1, 아니면 0(중립), 교차가 없으면 직전 신호 유지
+        events = np.full_like(diff, np.nan)
+        events[cross_up] = np.where((rsi < 70) & volume_ok, 1.0, 0.0)[cross_up]
+        events[cross_down] = np.where((rsi > 30) & volume_ok, -1.0, 0.0)[cross_down]
+        events[0] = 0.0
+        signal, position = _hold_events(events)
+        return PanelSignals(panel, signal, position,
+                            {'short_ma': short_ma, 'long_ma': long_ma, 'rsi': rsi})
+
+
+class PanelRSIStrategy(PanelStrategy):
+    """RSI 패널 전략 (RSIStrategy 의 과매수/과매도 진입 신호 규칙)"""
+
+    def __init__(self, period: int = 14, overbought: float = 70, oversold: float = 30):
+        super().__init__(name=f"PanelRSI_{period}_{overbought}_{oversold}")
+        self.period = period
+        self.overbought = overbought
+        self.oversold = oversold
+        self.required_data_points = period + 1
+
+    def generate_panel_signals(self, panel: Panel) -> PanelSignals:
+        rsi = rsi_2d(panel.close, self.period)
+        prev_rsi = np.full_like(rsi, np.nan)
+        prev_rsi[1:] = rsi[:-1]
+
+        events = np.full_like(rsi, np.nan)
+        events[(rsi > self.overbought) & (prev_rsi <= self.overbought)] = -1.0
+        events[(rsi < self.oversold) & (prev_rsi >= self.oversold)] = 1.0
+        events[0] = 0.0
+        signal, position = _hold_events(events)
+        return PanelSignals(panel, signal, position, {'rsi': rsi})
+
+
+# ---------------------------------------------------------------------------
+# 백테스트 / 실시간 스캔
+# ---------------------------------------------------------------------------
+
+def backtest_panel(signals: PanelSignals, initial_balance: float = 10000, commission: float = 0.001,
+                   leverage: float = 1) -> pd.DataFrame:
+    """
+    패널 신호로 종목별 백테스트 (종목마다 Backtester.run_backtest 와 같은 롱 전용 규칙)
+
+    Args:
+        signals: 패널 전략 결과
+        initial_balance: 종목별 초기 자산
+        commission: 수수료율
+        leverage: 레버리지 (현물은 1)
+
+    Returns:
+        DataFrame: 종목별 성과 지표 (종목 인덱스, percent_return 내림차순)
+    """
+    panel = signals.panel
+    rows = {}
+    for column, symbol in enumerate(panel.symbols):
+        start = panel.first_valid()[column]
+        if len(panel.index) - start < 2:
+            continue
+        close = panel.close[start:, column]
+        state = position_state_machine(close, signals.position[start:, column], initial_balance,
+                                       commission, leverage)
+        rows[symbol] = equity_metrics(state['equity'], panel.index[start:], state['trade_returns'])
+    result = pd.DataFrame.from_dict(rows, orient='index')
+    result.index.name = 'symbol'
+    return result.sort_values('percent_return', ascending=False) if not result.empty else result
+
+
+class PanelScanner:
+    """거래소 최근 캔들로 여러 종목의 최신 신호를 한 번에 계산하는 스캐너"""
+
+    def __init__(self, exchange_api, symbols: List[str], strategy: PanelStrategy,
+                 timeframe: Optional[str] = None, limit: int = 200):
+        """
+        Args:
+            exchange_api: get_ohlcv(symbol, timeframe, limit) 를 제공하는 거래소 API 객체
+            symbols: 스캔할 종목 목록
+            strategy: 패널 전략
+            timeframe: 타임프레임 (None이면 거래소 API 기본값)
+            limit: 종목별 조회 캔들 수
+        """
+        self.exchange_api = exchange_api
+        self.symbols = list(symbols)
+        self.strategy = strategy
+        self.timeframe = timeframe
+        self.limit = max(limit, strategy.required_data_points)
+        self.last_signals: Optional[PanelSignals] = None
+
+    def fetch_panel(self) -> Optional[Panel]:
+        """종목별 최근 캔들을 조회해 패널 생성 (실패한 종목은 제외)"""
+        frames = {}
+        for symbol in self.symbols:
+            try:
+                df = self.exchange_api.get_ohlcv(symbol=symbol, timeframe=self.timeframe, limit=self.limit)
+                if df is not None and not df.empty:
+                    frames[symbol] = df
+            except Exception as e:
+                logger.error(f"{symbol} 캔들 조회 중 오류 발생: {e}")
+        if not frames:
+            logger.warning("스캔할 캔들 데이터가 없습니다.")
+            return None
+        return Panel.from_frames(frames)
+
+    def scan(self, panel: Optional[Panel] = None) -> pd.DataFrame:
+        """
+        최신 캔들 기준 종목별 신호 계산
+
+        Args:
+            panel: 이미 조회한 패널 (None이면 거래소에서 조회)
+
+        Returns:
+            DataFrame: 종목별 최신 close/signal/position/보조 지표. 새 진입 신호(position > 0)
+                       종목이 먼저 오도록 정렬
+        """
+        try:
+            panel = panel if panel is not None else self.fetch_panel()
+            if panel is None:
+                return pd.DataFrame()
+            self.last_signals = self.strategy.generate_panel_signals(panel)
+            latest = self.last_signals.latest()
+            return latest.sort_values(['position', 'signal'], ascending=False)
+        except Exception as e:
+            logger.error(f"패널 스캔 중 오류 발생: {e}")
+            return pd.DataFrame()
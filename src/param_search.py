@@ -0,0 +1,417 @@
+"""
+전략 파라미터 탐색 모듈 - 암호화폐 자동매매 봇
+
+Backtester.optimize_strategy 의 전체 그리드 탐색을 대신할 수 있는 탐색 전략을
+제공합니다. 모든 탐색 전략은 하나의 평가 캐시(SearchEvaluator)와 예산
+(SearchBudget: 평가 횟수 또는 초)을 공유합니다.
+
+- grid: 전체 조합을 순서대로 평가 (예산 안에서)
+- random: 조합을 중복 없이 무작위 추출
+- halving: 짧은 데이터 구간에서 여러 후보를 평가한 뒤 상위 후보만 더 긴 구간으로
+  올려 최종적으로 전체 구간에서 비교 (successive halving)
+- tpe: 좋은/나쁜 관측의 파라미터 분포 비율로 다음 후보를 고르는 Bayesian 탐색
+
+평가 비용은 전체 구간 백테스트 1회를 1로 보고, 짧은 구간 평가는 길이 비율만큼만
+계산합니다.
+"""
+
+import math
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.logging_config import get_logger
+from src.walk_forward import simulate_equity, equity_metrics
+
+logger = get_logger('crypto_bot.param_search')
+
+
+class ParamSpace:
+    """파라미터 그리드 (전체 조합을 만들지 않고 인덱스로 접근)"""
+
+    def __init__(self, param_grid: Dict[str, List[Any]]):
+        if not param_grid or any(len(values) == 0 for values in param_grid.values()):
+            raise ValueError("파라미터 그리드의 각 항목에는 하나 이상의 값이 필요합니다")
+        self.names = list(param_grid.keys())
+        self.values = [list(v) for v in param_grid.values()]
+        self.sizes = [len(v) for v in self.values]
+        self.size = int(np.prod(self.sizes, dtype=object))
+
+    def decode(self, flat_index: int) -> Tuple[int, ...]:
+        """전체 조합 번호 → 파라미터별 값 인덱스"""
+        indices = []
+        for size in reversed(self.sizes):
+            flat_index, rem = divmod(flat_index, size)
+            indices.append(rem)
+        return tuple(reversed(indices))
+
+    def params(self, indices: Tuple[int, ...]) -> Dict[str, Any]:
+        """값 인덱스 → 파라미터 딕셔너리"""
+        return {name: values[i] for name, values, i in zip(self.names, self.values, indices)}
+
+    def sample(self, rng: np.random.Generator, count: int, exclude=None) -> List[Tuple[int, ...]]:
+        """중복 없이 무작위 조합 추출"""
+        exclude = exclude or set()
+        available = self.size - len(exclude)
+        count = min(count, available)
+        if count <= 0:
+            return []
+        if self.size <= 1_000_000:
+            flat = rng.permutation(self.size)
+            picked = []
+            for f in flat:
+                indices = self.decode(int(f))
+                if indices not in exclude:
+                    picked.append(indices)
+                    if len(picked) == count:
+                        break
+            return picked
+        picked = set()
+        while len(picked) < count:
+            indices = tuple(int(rng.integers(size)) for size in self.sizes)
+            if indices not in exclude:
+                picked.add(indices)
+        return list(picked)
+
+
+class SearchBudget:
+    """탐색 예산 (전체 구간 기준 평가 횟수 및/또는 경과 시간)"""
+
+    def __init__(self, max_evals: Optional[float] = None, max_seconds: Optional[float] = None):
+        """
+        Args:
+            max_evals: 최대 평가 비용 (전체 구간 백테스트 1회 = 1)
+            max_seconds: 최대 탐색 시간 (초)
+        """
+        self.max_evals = max_evals
+        self.max_seconds = max_seconds
+        self._started = None
+        self._start_cost = 0.0
+
+    def start(self, evaluator: 'SearchEvaluator') -> None:
+        self._started = time.time()
+        self._start_cost = evaluator.cost
+
+    def exhausted(self, evaluator: 'SearchEvaluator') -> bool:
+        if self.max_evals is not None and evaluator.cost - self._start_cost >= self.max_evals:
+            return True
+        if self.max_seconds is not None and self._started is not None:
+            return time.time() - self._started >= self.max_seconds
+        return False
+
+
+class SearchEvaluator:
+    """
+    파라미터 평가기 (탐색 전략들이 공유하는 결과 캐시)
+
+    같은 파라미터와 데이터 길이의 평가는 한 번만 계산합니다.
+    """
+
+    def __init__(self, strategy_class, df: pd.DataFrame, metric: str = 'sharpe_ratio',
+                 initial_balance: float = 10000, commission: float = 0.001, leverage: float = 1,
+                 min_bars: int = 200):
+        """
+        Args:
+            strategy_class: 전략 클래스
+            df: OHLCV 데이터
+            metric: 최대화할 성과 지표
+            initial_balance: 초기 자산
+            commission: 수수료율
+            leverage: 레버리지
+            min_bars: 짧은 구간 평가의 최소 캔들 수
+        """
+        self.strategy_class = strategy_class
+        self.df = df
+        self.close = df['close'].to_numpy(np.float64)
+        self.metric = metric
+        self.initial_balance = initial_balance
+        self.commission = commission
+        self.leverage = leverage
+        self.min_bars = min_bars
+        self.cache: Dict[Tuple[tuple, int], float] = {}
+        self.evaluations = 0
+        self.cache_hits = 0
+        self.cost = 0.0
+
+    def bars_for(self, fraction: float) -> int:
+        """데이터 비율 → 앞부분 캔들 수"""
+        n = len(self.df)
+        return n if fraction >= 1 else min(n, max(self.min_bars, int(n * fraction)))
+
+    def evaluate(self, params: Dict[str, Any], fraction: float = 1.0) -> float:
+        """
+        데이터 앞부분(fraction)으로 파라미터 평가
+
+        Returns:
+            float: 성과 지표 값 (전략 오류나 계산 불가 시 -inf)
+        """
+        n_bars = self.bars_for(fraction)
+        key = (tuple(sorted(params.items())), n_bars)
+        if key in self.cache:
+            self.cache_hits += 1
+            return self.cache[key]
+
+        score = -np.inf
+        try:
+            data = self.df.iloc[:n_bars]
+            strategy = self.strategy_class(**params)
+            signals = strategy.generate_signals(data)
+            if hasattr(strategy, 'calculate_positions'):
+                signals = strategy.calculate_positions(signals)
+            position_change = np.nan_to_num(signals['position'].to_numpy(np.float64))
+            equity, trade_returns = simulate_equity(self.close[:n_bars], position_change, self.initial_balance,
+                                                    self.commission, self.leverage)
+            value = equity_metrics(equity, data.index, trade_returns).get(self.metric, 0.0)
+            if np.isfinite(value):
+                score = float(value)
+        except Exception as e:
+            logger.debug(f"파라미터 {params} 평가 실패: {e}")
+
+        self.cache[key] = score
+        self.evaluations += 1
+        self.cost += n_bars / len(self.df)
+        return score
+
+
+class SearchResult:
+    """탐색 결과"""
+
+    def __init__(self, best_params: Optional[Dict[str, Any]], best_score: float,
+                 history: List[Dict[str, Any]], evaluator: SearchEvaluator, elapsed: float):
+        self.best_params = best_params
+        self.best_score = best_score
+        self.history = history
+        self.evaluations = evaluator.evaluations
+        self.cache_hits = evaluator.cache_hits
+        self.cost = evaluator.cost
+        self.elapsed = elapsed
+
+    def to_dataframe(self) -> pd.DataFrame:
+        return pd.DataFrame(self.history)
+
+
+class SearchStrategy:
+    """탐색 전략 기본 클래스"""
+
+    name = 'base'
+
+    def __init__(self, seed: Optional[int] = None):
+        self.rng = np.random.default_rng(seed)
+
+    def search(self, space: ParamSpace, evaluator: SearchEvaluator,
+               budget: Optional[SearchBudget] = None) -> SearchResult:
+        """
+        파라미터 탐색 실행
+
+        Args:
+            space: 파라미터 공간
+            evaluator: 공유 평가기
+            budget: 탐색 예산 (None이면 탐색 전략 자체의 종료 조건까지)
+
+        Returns:
+            SearchResult: 최적 파라미터와 평가 기록
+        """
+        budget = budget or SearchBudget()
+        budget.start(evaluator)
+        started = time.time()
+        self._history = []
+        self._run(space, evaluator, budget)
+
+        full = [h for h in self._history if h['fraction'] >= 1]
+        candidates = full or self._history
+        if candidates:
+            best = max(candidates, key=lambda h: h['score'])
+            best_params, best_score = best['params'], best['score']
+        else:
+            best_params, best_score = None, -np.inf
+        elapsed = time.time() - started
+        logger.info(f"{self.name} 탐색 완료: 최적 {best_params}, {evaluator.metric}={best_score:.4f}, "
+                    f"평가 {len(self._history)}회, 비용 {evaluator.cost:.1f}, {elapsed:.1f}초")
+        return SearchResult(best_params, best_score, self._history, evaluator, elapsed)
+
+    def _evaluate(self, space: ParamSpace, evaluator: SearchEvaluator,
+                  indices: Tuple[int, ...], fraction: float = 1.0) -> float:
+        params = space.params(indices)
+        score = evaluator.evaluate(params, fraction)
+        self._history.append({'params': params, 'fraction': fraction, 'score': score})
+        return score
+
+    def _run(self, space: ParamSpace, evaluator: SearchEvaluator, budget: SearchBudget) -> None:
+        raise NotImplementedError
+
+
+class GridSearch(SearchStrategy):
+    """전체 조합 순차 탐색"""
+
+    name = 'grid'
+
+    def _run(self, space, evaluator, budget):
+        for flat in range(space.size):
+            if budget.exhausted(evaluator):
+                break
+            self._evaluate(space, evaluator, space.decode(flat))
+
+
+class RandomSearch(SearchStrategy):
+    """중복 없는 무작위 탐색"""
+
+    name = 'random'
+
+    def __init__(self, n_candidates: Optional[int] = None, seed: Optional[int] = None):
+        """
+        Args:
+            n_candidates: 평가할 조합 수 (None이면 예산이 다할 때까지)
+            seed: 난수 시드
+        """
+        super().__init__(seed)
+        self.n_candidates = n_candidates
+
+    def _run(self, space, evaluator, budget):
+        count = self.n_candidates or space.size
+        for indices in space.sample(self.rng, min(count, 100_000)):
+            if budget.exhausted(evaluator):
+                break
+            self._evaluate(space, evaluator, indices)
+
+
+class SuccessiveHalving(SearchStrategy):
+    """짧은 구간에서 후보를 걸러 내는 successive halving 탐색"""
+
+    name = 'halving'
+
+    def __init__(self, n_candidates: int = 81, eta: int = 3, min_fraction: float = 1 / 9,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            n_candidates: 첫 단계 후보 수
+            eta: 단계마다 남기는 비율의 역수 (3이면 상위 1/3)
+            min_fraction: 첫 단계에서 사용하는 데이터 비율
+            seed: 난수 시드
+        """
+        super().__init__(seed)
+        if eta < 2:
+            raise ValueError("eta는 2 이상이어야 합니다")
+        self.n_candidates = n_candidates
+        self.eta = eta
+        self.min_fraction = min_fraction
+
+    def _run(self, space, evaluator, budget):
+        survivors = space.sample(self.rng, self.n_candidates)
+        fraction = self.min_fraction
+        while survivors:
+            fraction = min(1.0, fraction)
+            scored = []
+            for indices in survivors:
+                if budget.exhausted(evaluator):
+                    return
+                scored.append((self._evaluate(space, evaluator, indices, fraction), indices))
+            if fraction >= 1:
+                return
+            scored.sort(key=lambda item: item[0], reverse=True)
+            keep = max(1, len(scored) // self.eta)
+            survivors = [indices for score, indices in scored[:keep] if np.isfinite(score)] or [scored[0][1]]
+            fraction *= self.eta
+
+
+class TPESearch(SearchStrategy):
+    """Tree-structured Parzen Estimator 방식의 Bayesian 탐색"""
+
+    name = 'tpe'
+
+    def __init__(self, n_trials: Optional[int] = None, n_startup: int = 10, gamma: float = 0.25,
+                 n_samples: int = 24, seed: Optional[int] = None):
+        """
+        Args:
+            n_trials: 평가할 조합 수 (None이면 예산이 다할 때까지)
+            n_startup: 모델 사용 전 무작위 평가 수
+            gamma: 좋은 관측으로 분류할 상위 비율
+            n_samples: 매 단계 좋은 분포에서 뽑아 비교할 후보 수
+            seed: 난수 시드
+        """
+        super().__init__(seed)
+        self.n_trials = n_trials
+        self.n_startup = n_startup
+        self.gamma = gamma
+        self.n_samples = n_samples
+
+    @staticmethod
+    def _density(values: List[Any], observed: List[int]) -> np.ndarray:
+        """관측 인덱스에 대한 값별 확률 (숫자 값은 이웃 값에도 가중치 분배)"""
+        k = len(values)
+        positions = np.arange(k)
+        weights = np.full(k, 1.0 / k)  # 균등 사전 분포
+        if observed:
+            numeric = all(isinstance(v, (int, float, np.number)) and not isinstance(v, bool) for v in values)
+            bandwidth = max(0.5, k / 8) if numeric else 1e-3
+            obs = np.asarray(observed)[:, None]
+            weights = weights + np.exp(-0.5 * ((positions[None, :] - obs) / bandwidth) ** 2).sum(axis=0)
+        return weights / weights.sum()
+
+    def _suggest(self, space: ParamSpace, observations: List[Tuple[Tuple[int, ...], float]],
+                 seen: set) -> Optional[Tuple[int, ...]]:
+        ranked = sorted(observations, key=lambda item: item[1], reverse=True)
+        n_good = max(1, int(math.ceil(self.gamma * len(ranked))))
+        good, bad = ranked[:n_good], ranked[n_good:]
+
+        good_density, bad_density = [], []
+        for j, values in enumerate(space.values):
+            good_density.append(self._density(values, [idx[j] for idx, _ in good]))
+            bad_density.append(self._density(values, [idx[j] for idx, _ in bad]))
+
+        best, best_ratio = None, -np.inf
+        for _ in range(self.n_samples):
+            candidate = tuple(int(self.rng.choice(len(p), p=p)) for p in good_density)
+            if candidate in seen:
+                continue
+            ratio = sum(np.log(good_density[j][i]) - np.log(bad_density[j][i]) for j, i in enumerate(candidate))
+            if ratio > best_ratio:
+                best, best_ratio = candidate, ratio
+        if best is None:
+            remaining = space.sample(self.rng, 1, exclude=seen)
+            best = remaining[0] if remaining else None
+        return best
+
+    def _run(self, space, evaluator, budget):
+        observations = []
+        seen = set()
+        limit = min(self.n_trials or space.size, space.size)
+        startup = space.sample(self.rng, min(self.n_startup, limit))
+        while len(seen) < limit and not budget.exhausted(evaluator):
+            if startup:
+                indices = startup.pop()
+            else:
+                indices = self._suggest(space, observations, seen)
+                if indices is None:
+                    break
+            seen.add(indices)
+            score = self._evaluate(space, evaluator, indices)
+            # 실패한 조합은 가장 나쁜 관측으로 취급
+            observations.append((indices, score if np.isfinite(score) else -1e12))
+
+
+SEARCH_STRATEGIES = {
+    'grid': GridSearch,
+    'random': RandomSearch,
+    'halving': SuccessiveHalving,
+    'tpe': TPESearch,
+}
+
+
+def get_search_strategy(search, **kwargs) -> SearchStrategy:
+    """
+    탐색 전략 객체 반환
+
+    Args:
+        search: 탐색 전략 이름('grid', 'random', 'halving', 'tpe') 또는 SearchStrategy 객체
+        **kwargs: 탐색 전략 생성 인자
+
+    Returns:
+        SearchStrategy: 탐색 전략
+    """
+    if isinstance(search, SearchStrategy):
+        return search
+    if search not in SEARCH_STRATEGIES:
+        raise ValueError(f"지원하지 않는 탐색 전략입니다: {search} (가능: {', '.join(SEARCH_STRATEGIES)})")
+    return SEARCH_STRATEGIES[search](**kwargs)
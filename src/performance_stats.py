@@ -0,0 +1,275 @@
+"""
+성과 통계 집계 모듈 - 암호화폐 자동매매 봇
+
+거래(trades)와 청산된 포지션(positions)을 기록할 때 같은 트랜잭션에서
+performance_stats 테이블의 집계 행을 갱신합니다. 대시보드 성과 통계는 전체 거래를
+다시 읽지 않고 집계 행만 읽으므로 거래 기록 수와 관계없이 O(1) 입니다.
+
+- 출처(source): trade (거래 additional_info 의 profit), position (청산 포지션의 pnl)
+- 범위(scope): all (전체), symbol (심볼별), strategy (전략별), day (일별)
+- 항목: 건수, 승/패 수, 총이익, 총손실(양수), 누적 손익(equity), 최고 누적 손익, 최대 낙폭
+
+rebuild() 는 원본 행으로 처음부터 다시 계산하고, verify() 는 다시 계산한 값과
+테이블을 비교해 어긋난 행을 돌려줍니다 (rebuild_performance_stats.py 참고).
+"""
+
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from src.logging_config import get_logger
+
+logger = get_logger('crypto_bot.performance_stats')
+
+SOURCE_TRADE = 'trade'
+SOURCE_POSITION = 'position'
+SOURCES = (SOURCE_TRADE, SOURCE_POSITION)
+
+SCOPE_ALL = 'all'
+SCOPE_SYMBOL = 'symbol'
+SCOPE_STRATEGY = 'strategy'
+SCOPE_DAY = 'day'
+
+STATS_COLUMNS = ('trade_count', 'win_count', 'loss_count', 'gross_profit', 'gross_loss',
+                 'equity', 'peak_equity', 'max_drawdown')
+
+# 검증 시 실수 비교 허용 오차
+TOLERANCE = 1e-6
+
+CREATE_TABLE_SQL = '''
+CREATE TABLE IF NOT EXISTS performance_stats (
+    source TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    scope_key TEXT NOT NULL,
+    trade_count INTEGER NOT NULL DEFAULT 0,
+    win_count INTEGER NOT NULL DEFAULT 0,
+    loss_count INTEGER NOT NULL DEFAULT 0,
+    gross_profit REAL NOT NULL DEFAULT 0,
+    gross_loss REAL NOT NULL DEFAULT 0,
+    equity REAL NOT NULL DEFAULT 0,
+    peak_equity REAL NOT NULL DEFAULT 0,
+    max_drawdown REAL NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP,
+    PRIMARY KEY (source, scope, scope_key)
+)
+'''
+
+# SET 의 오른쪽 열 참조는 모두 갱신 전 값이므로 equity + excluded.equity 가 새 누적 손익
+_UPSERT_SQL = '''
+INSERT INTO performance_stats (source, scope, scope_key, trade_count, win_count, loss_count,
+                               gross_profit, gross_loss, equity, peak_equity, max_drawdown, updated_at)
+VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?, MAX(0, ?), MAX(0, -?), ?)
+ON CONFLICT (source, scope, scope_key) DO UPDATE SET
+    trade_count = trade_count + 1,
+    win_count = win_count + excluded.win_count,
+    loss_count = loss_count + excluded.loss_count,
+    gross_profit = gross_profit + excluded.gross_profit,
+    gross_loss = gross_loss + excluded.gross_loss,
+    equity = equity + excluded.equity,
+    peak_equity = MAX(peak_equity, equity + excluded.equity),
+    max_drawdown = MAX(max_drawdown, MAX(peak_equity, equity + excluded.equity) - (equity + excluded.equity)),
+    updated_at = excluded.updated_at
+'''
+
+
+def _parse_info(value) -> Dict[str, Any]:
+    if isinstance(value, dict):
+        return value
+    if value:
+        try:
+            parsed = json.loads(value)
+            return parsed if isinstance(parsed, dict) else {}
+        except (TypeError, ValueError):
+            pass
+    return {}
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value) if value is not None else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def stats_day(timestamp) -> str:
+    """
+    타임스탬프의 날짜 (YYYY-MM-DD)
+
+    Args:
+        timestamp: ISO 문자열, 또는 초/밀리초 단위 숫자
+
+    Returns:
+        str: 날짜 (알 수 없으면 'unknown')
+    """
+    if timestamp is None or timestamp == '':
+        return 'unknown'
+    if isinstance(timestamp, (int, float)) or (isinstance(timestamp, str) and timestamp.isdigit()):
+        seconds = float(timestamp)
+        if seconds > 1e11:
+            seconds /= 1000
+        return datetime.fromtimestamp(seconds, tz=timezone.utc).strftime('%Y-%m-%d')
+    return str(timestamp)[:10]
+
+
+def trade_outcome(trade: Mapping) -> Tuple[str, str, str, float]:
+    """거래 행의 (심볼, 전략, 날짜, 손익) - load_performance_stats 와 같이 additional_info 의 profit 사용"""
+    info = _parse_info(trade.get('additional_info'))
+    return (str(trade.get('symbol') or 'unknown'), str(info.get('strategy') or 'unknown'),
+            stats_day(trade.get('timestamp')), _to_float(info.get('profit', 0)))
+
+
+def position_outcome(position: Mapping) -> Tuple[str, str, str, float]:
+    """청산 포지션 행의 (심볼, 전략, 날짜, 손익)"""
+    info = _parse_info(position.get('additional_info'))
+    return (str(position.get('symbol') or 'unknown'), str(info.get('strategy') or 'unknown'),
+            stats_day(position.get('closed_at') or position.get('opened_at')), _to_float(position.get('pnl')))
+
+
+def _scopes(symbol: str, strategy: str, day: str) -> List[Tuple[str, str]]:
+    return [(SCOPE_ALL, ''), (SCOPE_SYMBOL, symbol), (SCOPE_STRATEGY, strategy), (SCOPE_DAY, day)]
+
+
+def apply_outcome(cursor, source: str, outcome: Tuple[str, str, str, float]):
+    """
+    거래/청산 1건을 집계 행에 반영 (호출한 쪽의 트랜잭션 안에서 실행)
+
+    Args:
+        cursor: sqlite3 커서
+        source: SOURCE_TRADE 또는 SOURCE_POSITION
+        outcome: trade_outcome()/position_outcome() 결과
+    """
+    symbol, strategy, day, pnl = outcome
+    now = datetime.now().isoformat()
+    cursor.executemany(_UPSERT_SQL, [
+        (source, scope, key, int(pnl > 0), int(pnl < 0), max(pnl, 0.0), max(-pnl, 0.0), pnl, pnl, pnl, now)
+        for scope, key in _scopes(symbol, strategy, day)
+    ])
+
+
+def apply_trade(cursor, trade: Mapping):
+    apply_outcome(cursor, SOURCE_TRADE, trade_outcome(trade))
+
+
+def apply_closed_position(cursor, position_id: int):
+    """청산으로 바뀐 포지션 행을 읽어 집계에 반영"""
+    cursor.execute("SELECT symbol, additional_info, closed_at, opened_at, pnl FROM positions WHERE id = ?",
+                   (position_id,))
+    row = cursor.fetchone()
+    if row is not None:
+        apply_outcome(cursor, SOURCE_POSITION, position_outcome(dict(zip(
+            ('symbol', 'additional_info', 'closed_at', 'opened_at', 'pnl'), row))))
+
+
+def _source_rows(cursor, source: str) -> Iterable[Tuple[str, str, str, float]]:
+    """증분 갱신과 같은 순서(거래는 기록 순, 포지션은 청산 순)로 원본 행 반환"""
+    if source == SOURCE_TRADE:
+        cursor.execute("SELECT symbol, additional_info, timestamp FROM trades ORDER BY id")
+        for symbol, info, timestamp in cursor.fetchall():
+            yield trade_outcome({'symbol': symbol, 'additional_info': info, 'timestamp': timestamp})
+    else:
+        cursor.execute("SELECT symbol, additional_info, closed_at, opened_at, pnl FROM positions "
+                       "WHERE status = 'closed' ORDER BY closed_at, id")
+        for symbol, info, closed_at, opened_at, pnl in cursor.fetchall():
+            yield position_outcome({'symbol': symbol, 'additional_info': info, 'closed_at': closed_at,
+                                    'opened_at': opened_at, 'pnl': pnl})
+
+
+def compute(cursor, sources: Iterable[str] = SOURCES) -> Dict[Tuple[str, str, str], Dict[str, float]]:
+    """
+    원본 행으로 집계를 처음부터 계산 (테이블은 건드리지 않음)
+
+    Returns:
+        dict: (source, scope, scope_key) -> 집계 항목
+    """
+    stats: Dict[Tuple[str, str, str], Dict[str, float]] = {}
+    for source in sources:
+        for symbol, strategy, day, pnl in list(_source_rows(cursor, source)):
+            for scope, key in _scopes(symbol, strategy, day):
+                row = stats.setdefault((source, scope, key), dict.fromkeys(STATS_COLUMNS, 0))
+                row['trade_count'] += 1
+                row['win_count'] += int(pnl > 0)
+                row['loss_count'] += int(pnl < 0)
+                row['gross_profit'] += max(pnl, 0.0)
+                row['gross_loss'] += max(-pnl, 0.0)
+                row['equity'] += pnl
+                row['peak_equity'] = max(row['peak_equity'], row['equity'])
+                row['max_drawdown'] = max(row['max_drawdown'], row['peak_equity'] - row['equity'])
+    return stats
+
+
+def rebuild(cursor, sources: Iterable[str] = SOURCES) -> int:
+    """
+    집계 테이블을 원본 행으로 다시 만듦 (호출한 쪽에서 커밋)
+
+    Args:
+        cursor: sqlite3 커서
+        sources: 다시 만들 출처
+
+    Returns:
+        int: 기록한 집계 행 수
+    """
+    sources = tuple(sources)
+    stats = compute(cursor, sources)
+    cursor.executemany("DELETE FROM performance_stats WHERE source = ?", [(source,) for source in sources])
+    now = datetime.now().isoformat()
+    cursor.executemany(
+        f"INSERT INTO performance_stats (source, scope, scope_key, {', '.join(STATS_COLUMNS)}, updated_at) "
+        f"VALUES (?, ?, ?, {', '.join('?' for _ in STATS_COLUMNS)}, ?)",
+        [(*key, *(row[column] for column in STATS_COLUMNS), now) for key, row in stats.items()])
+    return len(stats)
+
+
+def verify(cursor) -> List[Dict[str, Any]]:
+    """
+    집계 테이블과 원본 행으로 다시 계산한 값 비교
+
+    Returns:
+        list: 어긋난 행 (source, scope, scope_key, column, stored, expected)
+    """
+    expected = compute(cursor)
+    cursor.execute(f"SELECT source, scope, scope_key, {', '.join(STATS_COLUMNS)} FROM performance_stats")
+    stored = {tuple(row[:3]): dict(zip(STATS_COLUMNS, row[3:])) for row in cursor.fetchall()}
+    empty = dict.fromkeys(STATS_COLUMNS, 0)
+
+    mismatches = []
+    for key in sorted(set(expected) | set(stored)):
+        for column in STATS_COLUMNS:
+            stored_value = stored.get(key, empty)[column]
+            expected_value = expected.get(key, empty)[column]
+            if abs(stored_value - expected_value) > TOLERANCE:
+                mismatches.append({'source': key[0], 'scope': key[1], 'scope_key': key[2], 'column': column,
+                                   'stored': stored_value, 'expected': expected_value})
+    return mismatches
+
+
+def fetch(cursor, source: str = SOURCE_TRADE, scope: str = SCOPE_ALL,
+          scope_key: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    집계 행 조회 (승률/순손익/평균 손익 포함)
+
+    Args:
+        cursor: sqlite3 커서
+        source: 출처
+        scope: 범위
+        scope_key: 특정 키만 조회 (None이면 범위 전체)
+
+    Returns:
+        list: 집계 행 딕셔너리 목록
+    """
+    query = (f"SELECT scope_key, {', '.join(STATS_COLUMNS)}, updated_at FROM performance_stats "
+             "WHERE source = ? AND scope = ?")
+    params: List[Any] = [source, scope]
+    if scope_key is not None:
+        query += " AND scope_key = ?"
+        params.append(scope_key)
+    cursor.execute(query + " ORDER BY scope_key", params)
+
+    results = []
+    for row in cursor.fetchall():
+        stats = dict(zip(('scope_key',) + STATS_COLUMNS + ('updated_at',), row))
+        count = stats['trade_count']
+        stats['net_profit'] = stats['gross_profit'] - stats['gross_loss']
+        stats['win_rate'] = stats['win_count'] / count * 100 if count else 0.0
+        stats['avg_profit'] = stats['net_profit'] / count if count else 0.0
+        results.append(stats)
+    return results
@@ -15,6 +15,7 @@ from src.error_handlers import (
     network_error_handler, db_error_handler, trade_error_handler
 )
 from src.event_manager import get_event_manager, EventType
+from src.account_snapshot import get_account_snapshot_service
 
 # 로거 설정
 logger = logging.getLogger('portfolio_manager')
@@ -55,14 +56,20 @@ class PortfolioManager:
         # 이벤트 관리자 참조
         self.event_manager = get_event_manager()
         
+        # 계정 스냅샷 서비스 (잔고 조회 및 DB 저장을 다른 소비자와 공유)
+        self.account_snapshot = get_account_snapshot_service(exchange_api, db_manager)
+        
         # 초기 포트폴리오 상태 업데이트
         self.update_portfolio()
     
     @simple_error_handler(default_return=False)
-    def update_portfolio(self):
+    def update_portfolio(self, force_refresh=False):
         """
         포트폴리오 정보 업데이트
         
+        Args:
+            force_refresh (bool): True이면 공유 스냅샷을 거래소에서 즉시 새로 조회 (거래 직후 등)
+        
         Returns:
             bool: 성공 여부
         """
@@ -71,8 +78,10 @@ class PortfolioManager:
                 # 테스트 모드에서는 포트폴리오 정보를 시뮬레이션
                 return True
             
-            # 실제 거래소에서 잔고 정보 가져오기
-            balance = self.exchange_api.get_balance()
+            # 공유 계정 스냅샷에서 잔고 정보 가져오기 (오래된 경우에만 거래소 조회)
+            if force_refresh:
+                self.account_snapshot.refresh(force=True)
+            balance = self.account_snapshot.get_balance(max_age=self.account_snapshot.refresh_interval)
             
             if balance:
                 base_currency = self.portfolio['base_currency']
@@ -86,14 +95,10 @@ class PortfolioManager:
                 if quote_currency in balance['free']:
                     self.portfolio['quote_balance'] = float(balance['free'][quote_currency])
                 
-                logger.info(f"포트폴리오 업데이트: {base_currency}={self.portfolio['base_balance']}, {quote_currency}={self.portfolio['quote_balance']}")
+                self.portfolio['snapshot_version'] = self.account_snapshot.version
                 
-                # 데이터베이스에 잔액 정보 저장
-                try:
-                    self.db.save_balances(balance)
-                    logger.info("데이터베이스에 잔액 정보 저장 완료")
-                except Exception as db_error:
-                    logger.error(f"데이터베이스 잔액 저장 중 오류: {db_error}")
+                # 잔액 DB 저장은 계정 스냅샷 서비스가 변경분만 기록
+                logger.info(f"포트폴리오 업데이트: {base_currency}={self.portfolio['base_balance']}, {quote_currency}={self.portfolio['quote_balance']}")
             
             # 포트폴리오 업데이트 이벤트 발행
             self.event_manager.publish(EventType.PORTFOLIO_UPDATED, {
@@ -142,7 +147,7 @@ class PortfolioManager:
         
         # 실제 모드인 경우 실제 잔고 업데이트 시도
         if not test_mode:
-            self.update_portfolio()
+            self.update_portfolio(force_refresh=True)
         
         # 데이터베이스에 잔고 정보 저장
         self.db.save_balance(self.portfolio['base_currency'], self.portfolio['base_balance'])
@@ -10,12 +10,14 @@ import logging
 import subprocess
 import traceback
 import psutil
+from collections import deque
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple, Callable, Union
 
 from src.logging_config import get_logger
 from src.config import DATA_DIR
+from src.journal import open_journal
 
 class RecoveryManager:
     """
@@ -43,14 +45,15 @@ class RecoveryManager:
         self.recovery_dir = os.path.join(DATA_DIR, 'recovery')
         os.makedirs(self.recovery_dir, exist_ok=True)
         
-        # 복구 기록 파일
+        # 복구 기록 파일 (recovery_log.json 은 이전 형식, 처음 한 번 저널로 옮김)
         self.recovery_log_file = os.path.join(self.recovery_dir, 'recovery_log.json')
+        self.journal = open_journal(self.recovery_dir, 'recovery_journal')
         self.state_file = os.path.join(self.recovery_dir, 'bot_state.json')
         
         # 복구 상태 데이터
         self.recovery_attempts = 0
         self.last_recovery_time = None
-        self.recovery_history = []
+        self.recovery_history = deque(maxlen=1000)
         
         # 기존 복구 로그 로드
         self._load_recovery_log()
@@ -58,43 +61,39 @@ class RecoveryManager:
         self.logger.info("복구 관리자 초기화 완료")
     
     def _load_recovery_log(self):
-        """기존 복구 로그 로드"""
+        """복구 저널을 재생해 최근 복구 시도 횟수 복원"""
         try:
-            if os.path.exists(self.recovery_log_file):
+            # 이전 형식 로그는 저널이 없을 때 한 번만 옮김
+            if not self.journal.files() and os.path.exists(self.recovery_log_file):
                 with open(self.recovery_log_file, 'r') as f:
                     recovery_data = json.load(f)
-                
-                # 최근 복구 시도 횟수 계산
-                current_time = datetime.now()
-                recent_attempts = [
-                    attempt for attempt in recovery_data.get('history', [])
-                    if current_time - datetime.fromisoformat(attempt['timestamp']) < timedelta(seconds=self.cooldown_period)
-                ]
-                
-                self.recovery_attempts = len(recent_attempts)
-                if recent_attempts:
-                    self.last_recovery_time = datetime.fromisoformat(recent_attempts[-1]['timestamp'])
-                
-                self.recovery_history = recovery_data.get('history', [])
-                
+                for attempt in recovery_data.get('history', []):
+                    self.journal.append(attempt)
+                self.journal.flush()
+            
+            self.recovery_history.extend(self.journal.replay())
+            
+            # 최근 복구 시도 횟수 계산
+            current_time = datetime.now()
+            recent_attempts = [
+                attempt for attempt in self.recovery_history
+                if current_time - datetime.fromisoformat(attempt['timestamp']) < timedelta(seconds=self.cooldown_period)
+            ]
+            
+            self.recovery_attempts = len(recent_attempts)
+            if recent_attempts:
+                self.last_recovery_time = datetime.fromisoformat(recent_attempts[-1]['timestamp'])
+            
+            if self.recovery_history:
                 self.logger.info(f"복구 로그 로드 완료: 최근 시도 {self.recovery_attempts}회")
         except Exception as e:
             self.logger.error(f"복구 로그 로드 중 오류: {e}")
             self.logger.debug(traceback.format_exc())
     
     def _save_recovery_log(self):
-        """현재 복구 로그 저장"""
+        """버퍼에 쌓인 복구 기록을 바로 저널에 씀 (복구 직후 재시작될 수 있으므로)"""
         try:
-            recovery_data = {
-                'last_updated': datetime.now().isoformat(),
-                'total_attempts': len(self.recovery_history),
-                'recent_attempts': self.recovery_attempts,
-                'history': self.recovery_history
-            }
-            
-            with open(self.recovery_log_file, 'w') as f:
-                json.dump(recovery_data, f, indent=2)
-                
+            self.journal.flush()
             self.logger.debug("복구 로그 저장 완료")
         except Exception as e:
             self.logger.error(f"복구 로그 저장 중 오류: {e}")
@@ -186,6 +185,7 @@ class RecoveryManager:
         }
         
         self.recovery_history.append(recovery_entry)
+        self.journal.append(recovery_entry)
         self.recovery_attempts += 1
         self.last_recovery_time = current_time
         
@@ -8,6 +8,7 @@ import gc
 import logging
 import threading
 import traceback
+from collections import OrderedDict
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -16,6 +17,27 @@ from typing import Dict, Any, Optional, List, Callable, Tuple
 from src.logging_config import get_logger
 from src.memory_monitor import get_memory_monitor
 from src.config import DATA_DIR
+from src.ohlcv_schema import compact_ohlcv
+from src.scheduler import get_scheduler
+
+
+def _copy_on_write_enabled() -> bool:
+    """pandas Copy-on-Write 활성 여부 (pandas 3 이상은 항상 활성)"""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    try:
+        return bool(pd.get_option('mode.copy_on_write'))
+    except Exception:
+        return False
+
+
+def _freeze_dataframe(df: pd.DataFrame):
+    """데이터프레임 내부 배열을 읽기 전용으로 표시 (제자리 수정 시 오류 발생)"""
+    for values in df._mgr.arrays:
+        array = values if isinstance(values, np.ndarray) else getattr(values, '_ndarray', None)
+        if isinstance(array, np.ndarray):
+            array.flags.writeable = False
+
 
 class ResourceManager:
     """
@@ -29,7 +51,8 @@ class ResourceManager:
         self, 
         cleanup_interval: int = 3600,  # 1시간마다 정리
         max_dataframe_cache_size: int = 100,
-        max_memory_usage_percent: float = 70.0
+        max_memory_usage_percent: float = 70.0,
+        max_dataframe_cache_bytes: int = 256 * 1024 * 1024
     ):
         """
         ResourceManager 초기화
@@ -38,15 +61,24 @@ class ResourceManager:
             cleanup_interval: 자원 정리 간격 (초)
             max_dataframe_cache_size: 데이터프레임 캐시 최대 크기
             max_memory_usage_percent: 허용 최대 메모리 사용률 (%)
+            max_dataframe_cache_bytes: 데이터프레임 캐시 최대 메모리 (바이트, memory_usage(deep=True) 기준)
         """
         self.logger = get_logger('resource_manager')
         self.cleanup_interval = cleanup_interval
         self.max_dataframe_cache_size = max_dataframe_cache_size
         self.max_memory_usage_percent = max_memory_usage_percent
-        
-        # 데이터프레임 캐시
-        self.dataframe_cache = {}
-        self.dataframe_cache_access = {}
+        self.max_dataframe_cache_bytes = max_dataframe_cache_bytes
+        
+        # 데이터프레임 캐시 (LRU 순서: 앞쪽이 가장 오래 전에 접근한 항목)
+        # 저장된 프레임은 공유되므로 꺼낼 때 복사하지 않고 뷰를 반환합니다.
+        self.dataframe_cache: 'OrderedDict[str, pd.DataFrame]' = OrderedDict()
+        self.dataframe_cache_bytes: Dict[str, int] = {}
+        self.cache_bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
+        self._cache_lock = threading.RLock()
+        self._copy_on_write = _copy_on_write_enabled()
         
         # 임시 파일 디렉토리
         self.temp_dir = os.path.join(DATA_DIR, 'temp')
@@ -54,7 +86,7 @@ class ResourceManager:
         
         # 자원 정리 스레드
         self.cleanup_active = False
-        self.cleanup_thread = None
+        self.cleanup_job = None
         
         # 메모리 모니터 연동
         self.memory_monitor = get_memory_monitor()
@@ -71,9 +103,8 @@ class ResourceManager:
             return
         
         self.cleanup_active = True
-        self.cleanup_thread = threading.Thread(target=self._cleanup_loop)
-        self.cleanup_thread.daemon = True
-        self.cleanup_thread.start()
+        self.cleanup_job = get_scheduler().add_job('resource_manager.cleanup', self._scheduled_cleanup,
+                                                   self.cleanup_interval, jitter=min(60.0, self.cleanup_interval * 0.05))
         
         self.logger.info(f"자원 정리 스케줄러 시작 (간격: {self.cleanup_interval}초)")
     
@@ -83,31 +114,26 @@ class ResourceManager:
             return
         
         self.cleanup_active = False
-        if self.cleanup_thread and self.cleanup_thread.is_alive():
-            self.cleanup_thread.join(timeout=2.0)
+        if self.cleanup_job:
+            self.cleanup_job.cancel(wait=2.0)
+            self.cleanup_job = None
         
         self.logger.info("자원 정리 스케줄러 중지")
     
-    def _cleanup_loop(self):
-        """자원 정리 메인 루프"""
-        while self.cleanup_active:
-            try:
-                # 메모리 사용량 확인
-                memory_info = self.memory_monitor.get_memory_usage_summary()
-                if memory_info['current']:
-                    current_usage = memory_info['current']['process_percent']
-                    self.logger.debug(f"현재 메모리 사용률: {current_usage:.1f}%")
-                
-                # 실행 조건: 1) 일정 시간마다 2) 메모리 임계치 초과 시
-                self.cleanup_resources()
-                
-                # 다음 실행까지 대기
-                time.sleep(self.cleanup_interval)
-                
-            except Exception as e:
-                self.logger.error(f"자원 정리 중 오류: {e}")
-                self.logger.debug(traceback.format_exc())
-                time.sleep(60)  # 오류 발생 시 1분 대기
+    def _scheduled_cleanup(self):
+        """주기 자원 정리 (공용 스케줄러에서 실행)"""
+        try:
+            # 메모리 사용량 확인
+            memory_info = self.memory_monitor.get_memory_usage_summary()
+            if memory_info['current']:
+                current_usage = memory_info['current']['process_percent']
+                self.logger.debug(f"현재 메모리 사용률: {current_usage:.1f}%")
+            
+            self.cleanup_resources()
+            
+        except Exception as e:
+            self.logger.error(f"자원 정리 중 오류: {e}")
+            self.logger.debug(traceback.format_exc())
     
     def cleanup_resources(self):
         """모든 자원 정리 작업 수행"""
@@ -127,31 +153,26 @@ class ResourceManager:
     def _cleanup_dataframe_cache(self):
         """
         데이터프레임 캐시 정리
-        - 오래된 접근 순으로 캐시에서 제거
+        - 항목 수와 메모리 예산을 모두 만족할 때까지 가장 오래 전에 접근한 항목부터 제거
         """
-        if not self.dataframe_cache:
-            return
-        
-        initial_size = len(self.dataframe_cache)
-        self.logger.debug(f"데이터프레임 캐시 정리 시작 (현재 {initial_size}개)")
-        
-        # 캐시 크기가 최대 크기보다 클 경우
-        if len(self.dataframe_cache) > self.max_dataframe_cache_size:
-            # 접근 시간 기준으로 정렬
-            sorted_keys = sorted(
-                self.dataframe_cache_access.keys(),
-                key=lambda k: self.dataframe_cache_access.get(k, 0)
-            )
+        with self._cache_lock:
+            if not self.dataframe_cache:
+                return
+            
+            self.logger.debug(f"데이터프레임 캐시 정리 시작 (현재 {len(self.dataframe_cache)}개, "
+                              f"{self.cache_bytes / (1024 * 1024):.1f}MB)")
             
-            # 오래된 항목부터 제거
-            items_to_remove = len(self.dataframe_cache) - self.max_dataframe_cache_size
-            for key in sorted_keys[:items_to_remove]:
-                if key in self.dataframe_cache:
-                    del self.dataframe_cache[key]
-                if key in self.dataframe_cache_access:
-                    del self.dataframe_cache_access[key]
+            items_removed = 0
+            while self.dataframe_cache and (len(self.dataframe_cache) > self.max_dataframe_cache_size or
+                                            self.cache_bytes > self.max_dataframe_cache_bytes):
+                key, _ = self.dataframe_cache.popitem(last=False)
+                self.cache_bytes -= self.dataframe_cache_bytes.pop(key, 0)
+                items_removed += 1
             
-            self.logger.info(f"데이터프레임 캐시 정리: {items_to_remove}개 항목 제거")
+            if items_removed:
+                self.cache_evictions += items_removed
+                self.logger.info(f"데이터프레임 캐시 정리: {items_removed}개 항목 제거 "
+                                 f"(남은 용량 {self.cache_bytes / (1024 * 1024):.1f}MB)")
     
     def _cleanup_temp_files(self):
         """
@@ -196,27 +217,43 @@ class ResourceManager:
         """
         데이터프레임을 캐시에 저장
         
+        Copy-on-Write 가 켜진 pandas 에서는 얕은 복사로 저장하고(호출자가 원본을 수정하면
+        그때 복사됨), 그 외에는 한 번 복사한 뒤 내부 배열을 읽기 전용으로 표시합니다.
+        
         Args:
             key: 캐시 키
             df: 저장할 데이터프레임
         
         Returns:
-            bool: 저장 성공 여부
+            bool: 저장 성공 여부 (메모리 예산보다 큰 프레임은 저장하지 않음)
         """
         try:
-            # 기존 항목 제거
-            if key in self.dataframe_cache:
-                del self.dataframe_cache[key]
-            
-            # 새 항목 저장
-            self.dataframe_cache[key] = df.copy()
+            size = int(df.memory_usage(deep=True).sum())
+            if size > self.max_dataframe_cache_bytes:
+                self.logger.warning(f"데이터프레임 캐시 저장 생략 ({key}): {size / (1024 * 1024):.1f}MB 가 "
+                                    f"예산 {self.max_dataframe_cache_bytes / (1024 * 1024):.1f}MB 초과")
+                self.remove_from_cache(key)
+                return False
             
-            # 접근 시간 갱신
-            self.dataframe_cache_access[key] = time.time()
+            if self._copy_on_write:
+                cached = df.copy(deep=False)
+            else:
+                cached = df.copy()
+                _freeze_dataframe(cached)
             
-            # 캐시 크기 확인 및 정리
-            if len(self.dataframe_cache) > self.max_dataframe_cache_size:
-                self._cleanup_dataframe_cache()
+            with self._cache_lock:
+                # 기존 항목 교체
+                self.cache_bytes -= self.dataframe_cache_bytes.pop(key, 0)
+                self.dataframe_cache.pop(key, None)
+                
+                self.dataframe_cache[key] = cached
+                self.dataframe_cache_bytes[key] = size
+                self.cache_bytes += size
+                
+                # 캐시 크기 확인 및 정리
+                if (len(self.dataframe_cache) > self.max_dataframe_cache_size or
+                        self.cache_bytes > self.max_dataframe_cache_bytes):
+                    self._cleanup_dataframe_cache()
             
             return True
         
@@ -224,22 +261,32 @@ class ResourceManager:
             self.logger.error(f"데이터프레임 캐시 저장 오류 ({key}): {e}")
             return False
     
-    def get_cached_dataframe(self, key: str) -> Optional[pd.DataFrame]:
+    def get_cached_dataframe(self, key: str, copy: bool = False) -> Optional[pd.DataFrame]:
         """
         캐시에서 데이터프레임 조회
         
+        기본적으로 데이터를 복사하지 않은 뷰를 반환합니다. Copy-on-Write 환경에서는 뷰를
+        수정하면 그 시점에 복사되고, 그 외 환경에서는 제자리 수정이 오류를 내므로
+        반환된 프레임을 직접 수정하려면 copy=True 를 사용하세요.
+        
         Args:
             key: 캐시 키
+            copy: 독립적인 복사본 반환 여부
         
         Returns:
             Optional[pd.DataFrame]: 캐시된 데이터프레임 또는 None
         """
-        if key in self.dataframe_cache:
-            # 접근 시간 갱신
-            self.dataframe_cache_access[key] = time.time()
-            return self.dataframe_cache[key].copy()
+        with self._cache_lock:
+            cached = self.dataframe_cache.get(key)
+            if cached is None:
+                self.cache_misses += 1
+                return None
+            
+            # 최근 접근 항목으로 이동
+            self.dataframe_cache.move_to_end(key)
+            self.cache_hits += 1
         
-        return None
+        return cached.copy() if copy else cached.copy(deep=False)
     
     def remove_from_cache(self, key: str) -> bool:
         """
@@ -251,13 +298,11 @@ class ResourceManager:
         Returns:
             bool: 제거 성공 여부
         """
-        if key in self.dataframe_cache:
-            del self.dataframe_cache[key]
-            
-            if key in self.dataframe_cache_access:
-                del self.dataframe_cache_access[key]
-            
-            return True
+        with self._cache_lock:
+            if key in self.dataframe_cache:
+                del self.dataframe_cache[key]
+                self.cache_bytes -= self.dataframe_cache_bytes.pop(key, 0)
+                return True
         
         return False
     
@@ -268,9 +313,11 @@ class ResourceManager:
         Returns:
             int: 제거된 항목 수
         """
-        cache_size = len(self.dataframe_cache)
-        self.dataframe_cache.clear()
-        self.dataframe_cache_access.clear()
+        with self._cache_lock:
+            cache_size = len(self.dataframe_cache)
+            self.dataframe_cache.clear()
+            self.dataframe_cache_bytes.clear()
+            self.cache_bytes = 0
         
         self.logger.info(f"데이터프레임 캐시 초기화: {cache_size}개 항목 제거")
         return cache_size
@@ -289,7 +336,10 @@ class ResourceManager:
     
     def optimize_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        데이터프레임 메모리 사용량 최적화
+        데이터프레임 메모리 사용량 최적화 (값 손실 없음)
+        
+        가격 열은 float64 를 유지하고, 그 외 열은 값을 되살릴 수 있을 때만 작은
+        자료형으로 바꿉니다. 규칙은 src.ohlcv_schema.compact_ohlcv 를 따릅니다.
         
         Args:
             df: 최적화할 데이터프레임
@@ -301,35 +351,7 @@ class ResourceManager:
             return df
         
         try:
-            result = df.copy()
-            
-            # 데이터 타입 최적화
-            for col in result.select_dtypes(include=['int']).columns:
-                # 값의 범위에 따라 적절한 정수 타입 선택
-                c_min = result[col].min()
-                c_max = result[col].max()
-                
-                if c_min >= 0:
-                    if c_max < 255:
-                        result[col] = result[col].astype(np.uint8)
-                    elif c_max < 65535:
-                        result[col] = result[col].astype(np.uint16)
-                    elif c_max < 4294967295:
-                        result[col] = result[col].astype(np.uint32)
-                else:
-                    if c_min > -128 and c_max < 127:
-                        result[col] = result[col].astype(np.int8)
-                    elif c_min > -32768 and c_max < 32767:
-                        result[col] = result[col].astype(np.int16)
-                    elif c_min > -2147483648 and c_max < 2147483647:
-                        result[col] = result[col].astype(np.int32)
-            
-            # 부동 소수점 최적화
-            for col in result.select_dtypes(include=['float']).columns:
-                # 정밀도가 낮아도 되는 경우 float32 사용
-                result[col] = result[col].astype(np.float32)
-            
-            return result
+            return compact_ohlcv(df)
         
         except Exception as e:
             self.logger.error(f"데이터프레임 최적화 중 오류: {e}")
@@ -342,12 +364,22 @@ class ResourceManager:
         Returns:
             Dict[str, Any]: 자원 사용 통계
         """
-        return {
-            'dataframe_cache': {
+        with self._cache_lock:
+            lookups = self.cache_hits + self.cache_misses
+            cache_stats = {
                 'count': len(self.dataframe_cache),
                 'max_size': self.max_dataframe_cache_size,
+                'bytes': self.cache_bytes,
+                'max_bytes': self.max_dataframe_cache_bytes,
+                'hits': self.cache_hits,
+                'misses': self.cache_misses,
+                'hit_rate': self.cache_hits / lookups if lookups else 0.0,
+                'evictions': self.cache_evictions,
                 'keys': list(self.dataframe_cache.keys())
-            },
+            }
+        
+        return {
+            'dataframe_cache': cache_stats,
             'temp_files': {
                 'count': len(os.listdir(self.temp_dir)),
                 'path': self.temp_dir
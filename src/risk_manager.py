@@ -18,6 +18,7 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from src.notification_service import NotificationService
 from src.error_handlers import simple_error_handler
+from src.exit_evaluator import side_to_sign, stop_loss_prices, take_profit_prices
 
 from src.config import (
     RISK_MANAGEMENT, DATA_DIR, 
@@ -463,50 +464,34 @@ class RiskManager:
             stop_loss_positions = []
             take_profit_positions = []
             
-            for position in positions:
-                # 이미 종료된 포지션은 무시
-                if position['status'] != 'open':
-                    continue
-                
-                # 손절매 가격 계산
-                stop_loss_price = self.calculate_stop_loss_price(
-                    entry_price=position['entry_price'],
-                    side=position['side']
-                )
-                
-                # 이익실현 가격 계산
-                take_profit_price = self.calculate_take_profit_price(
-                    entry_price=position['entry_price'],
-                    side=position['side']
-                )
-                
-                # 롱 포지션
-                if position['side'].lower() == 'long':
-                    # 손절매 조건 확인
-                    if current_price <= stop_loss_price:
-                        position['exit_reason'] = 'stop_loss'
-                        stop_loss_positions.append(position)
-                        logger.info(f"롱 포지션 손절매 조건 충족: 진입가={position['entry_price']}, 현재가={current_price}, 손절가={stop_loss_price}")
-                    
-                    # 이익실현 조건 확인
-                    elif current_price >= take_profit_price:
-                        position['exit_reason'] = 'take_profit'
-                        take_profit_positions.append(position)
-                        logger.info(f"롱 포지션 이익실현 조건 충족: 진입가={position['entry_price']}, 현재가={current_price}, 이익실현가={take_profit_price}")
-                
-                # 숏 포지션
-                elif position['side'].lower() == 'short':
-                    # 손절매 조건 확인
-                    if current_price >= stop_loss_price:
-                        position['exit_reason'] = 'stop_loss'
-                        stop_loss_positions.append(position)
-                        logger.info(f"숏 포지션 손절매 조건 충족: 진입가={position['entry_price']}, 현재가={current_price}, 손절가={stop_loss_price}")
-                    
-                    # 이익실현 조건 확인
-                    elif current_price <= take_profit_price:
-                        position['exit_reason'] = 'take_profit'
-                        take_profit_positions.append(position)
-                        logger.info(f"숏 포지션 이익실현 조건 충족: 진입가={position['entry_price']}, 현재가={current_price}, 이익실현가={take_profit_price}")
+            # 열린 포지션만 배열로 모아 한 번에 비교
+            open_positions = [p for p in positions
+                              if p['status'] == 'open' and side_to_sign(p['side']) != 0]
+            if not open_positions:
+                return stop_loss_positions, take_profit_positions
+            
+            count = len(open_positions)
+            entry = np.fromiter((p['entry_price'] for p in open_positions), dtype=np.float64, count=count)
+            sign = np.fromiter((side_to_sign(p['side']) for p in open_positions), dtype=np.float64, count=count)
+            stop_loss = stop_loss_prices(entry, sign, self.risk_config['stop_loss_pct'])
+            take_profit = take_profit_prices(entry, sign, self.risk_config['take_profit_pct'])
+            
+            # 방향 부호를 곱해 롱/숏을 같은 부등식으로 비교
+            signed_price = sign * current_price
+            stop_hit = signed_price <= sign * stop_loss
+            take_hit = ~stop_hit & (signed_price >= sign * take_profit)
+            
+            for i in np.flatnonzero(stop_hit):
+                position = open_positions[i]
+                position['exit_reason'] = 'stop_loss'
+                stop_loss_positions.append(position)
+                logger.info(f"{position['side']} 포지션 손절매 조건 충족: 진입가={position['entry_price']}, 현재가={current_price}, 손절가={stop_loss[i]}")
+            
+            for i in np.flatnonzero(take_hit):
+                position = open_positions[i]
+                position['exit_reason'] = 'take_profit'
+                take_profit_positions.append(position)
+                logger.info(f"{position['side']} 포지션 이익실현 조건 충족: 진입가={position['entry_price']}, 현재가={current_price}, 이익실현가={take_profit[i]}")
             
             return stop_loss_positions, take_profit_positions
         
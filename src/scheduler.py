@@ -0,0 +1,328 @@
+"""
+주기 작업 스케줄러 모듈 - 암호화폐 자동매매 봇
+
+각 모니터(시스템 상태, 네트워크, 메모리, 자원 정리, 심박, 백업, 포지션 감시,
+웹 데이터 동기화)가 자기 스레드에서 sleep 루프를 돌리는 대신, 하나의 타이머
+스레드가 실행 시각 힙을 보고 작은 작업자 풀에 작업을 넘깁니다.
+
+- 지터: 같은 간격의 작업이 동시에 몰리지 않도록 실행 시각을 무작위로 늦춤
+- 중복 실행 방지: 같은 작업은 이전 실행이 끝나야 다음 실행을 예약
+- 밀린 실행 정책: 실행이 늦어 예정 시각을 놓쳤을 때 처리 방법 (MISSED_*)
+- 전용 작업자: 손절/익절 감시처럼 밀리면 안 되는 작업은 공용 풀과 분리된 자기 스레드에서 실행
+- 작업별 실행 횟수/실패/소요 시간/지연 통계
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from src.logging_config import get_logger
+
+logger = get_logger('crypto_bot.scheduler')
+
+# 밀린 실행 정책
+MISSED_SKIP = 'skip'            # 놓친 실행은 버리고 원래 주기 위상의 다음 시각에 실행
+MISSED_RUN_ONCE = 'run_once'    # 놓친 실행을 한 번으로 합쳐 즉시 실행한 뒤 그 시점부터 주기 재개
+MISSED_CATCH_UP = 'catch_up'    # 놓친 횟수만큼 연달아 실행
+
+DEFAULT_MAX_WORKERS = 4
+
+
+class ScheduledJob:
+    """스케줄러에 등록된 주기 작업 (add_job 이 반환하는 핸들)"""
+
+    def __init__(self, scheduler: 'PeriodicScheduler', name: str, func: Callable[[], Any], interval: float,
+                 jitter: float, missed: str, dedicated: bool = False):
+        self.scheduler = scheduler
+        self.name = name
+        self.func = func
+        # 작업 함수 안에서 바꾸면 다음 예약부터 적용 (적응형 간격)
+        self.interval = float(interval)
+        self.jitter = float(jitter)
+        self.missed = missed
+        self.dedicated = dedicated
+        self.executor: Optional[ThreadPoolExecutor] = None  # 전용 작업자 (dedicated 인 경우)
+        self.cancelled = False
+        self.running = False
+        self.scheduled_at = 0.0   # 주기 기준 시각 (monotonic, 지터 제외)
+        self.due_at = 0.0         # 실제 실행 예정 시각 (monotonic, 지터 포함)
+        self._done = threading.Event()
+        self._done.set()
+        self._stats_lock = threading.Lock()
+        self.stats = {'runs': 0, 'failures': 0, 'missed': 0, 'total_time': 0.0, 'max_time': 0.0,
+                      'last_time': None, 'last_lag': None, 'max_lag': 0.0, 'last_run': None, 'last_error': None}
+
+    def cancel(self, wait: Optional[float] = None) -> bool:
+        """
+        작업 취소
+
+        Args:
+            wait: 실행 중이면 끝날 때까지 기다릴 최대 시간 (초, None이면 기다리지 않음)
+
+        Returns:
+            bool: 실행 중인 작업이 없거나 시간 안에 끝났는지 여부
+        """
+        self.scheduler.remove_job(self)
+        if wait is None or threading.current_thread().name.startswith('scheduler-worker'):
+            return not self.running
+        return self._done.wait(wait)
+
+    def run_now(self):
+        """다음 실행을 지금으로 당김 (실행 중이면 끝난 직후)"""
+        self.scheduler.reschedule(self, delay=0.0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """작업 상태와 통계 (API/로그용)"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        runs = stats['runs']
+        stats['avg_time'] = stats['total_time'] / runs if runs else 0.0
+        return {
+            'name': self.name,
+            'interval': self.interval,
+            'jitter': self.jitter,
+            'missed_policy': self.missed,
+            'dedicated': self.dedicated,
+            'running': self.running,
+            'next_run_in': None if self.running or self.cancelled else max(0.0, self.due_at - time.monotonic()),
+            **stats,
+        }
+
+
+class PeriodicScheduler:
+    """
+    힙 기반 주기 작업 스케줄러
+
+    타이머 스레드 하나가 가장 이른 실행 예정 시각까지 대기하다가 때가 된 작업을
+    작업자 풀에 넘깁니다. 작업이 끝나면 밀린 실행 정책에 따라 다음 실행을 예약합니다.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
+        """
+        Args:
+            max_workers: 동시에 실행할 최대 작업 수
+        """
+        self.max_workers = max(1, int(max_workers))
+        self._heap: List[tuple] = []
+        self._jobs: List[ScheduledJob] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.wakeups = 0
+
+    # ------------------------------------------------------------------
+    # 작업 관리
+    # ------------------------------------------------------------------
+
+    def add_job(self, name: str, func: Callable[[], Any], interval: float, jitter: float = 0.0,
+                delay: float = 0.0, missed: str = MISSED_SKIP, dedicated: bool = False) -> ScheduledJob:
+        """
+        주기 작업 등록
+
+        Args:
+            name: 작업 이름 (통계 표시용, 중복 허용)
+            func: 실행할 함수 (인자 없음)
+            interval: 실행 간격 (초)
+            jitter: 실행 시각을 늦출 최대 무작위 시간 (초)
+            delay: 첫 실행까지 대기 시간 (초, 0이면 즉시)
+            missed: 밀린 실행 정책 (MISSED_SKIP, MISSED_RUN_ONCE, MISSED_CATCH_UP)
+            dedicated: 공용 풀 대신 전용 작업자 스레드에서 실행 (다른 작업이 오래 막혀도 지연되지 않음)
+
+        Returns:
+            ScheduledJob: 작업 핸들 (cancel() 로 취소)
+        """
+        if interval <= 0:
+            raise ValueError(f"작업 간격은 0보다 커야 합니다: {interval}")
+        if missed not in (MISSED_SKIP, MISSED_RUN_ONCE, MISSED_CATCH_UP):
+            raise ValueError(f"알 수 없는 밀린 실행 정책: {missed}")
+
+        job = ScheduledJob(self, name, func, interval, jitter, missed, dedicated)
+        if dedicated:
+            job.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'scheduler-worker-{name}')
+        with self._cond:
+            self._jobs.append(job)
+            job.scheduled_at = time.monotonic() + max(0.0, delay)
+            self._push(job)
+            self._ensure_started()
+            self._cond.notify()
+        logger.debug(f"주기 작업 등록: {name} (간격 {interval}초, 지터 {jitter}초)")
+        return job
+
+    def remove_job(self, job: ScheduledJob):
+        """작업 취소 (힙 항목은 꺼낼 때 버림)"""
+        with self._cond:
+            job.cancelled = True
+            if job in self._jobs:
+                self._jobs.remove(job)
+            self._cond.notify()
+        if job.executor is not None:
+            job.executor.shutdown(wait=False)  # 실행 중인 작업은 끝까지 실행
+
+    def reschedule(self, job: ScheduledJob, delay: float = 0.0):
+        """다음 실행 시각을 지금부터 delay 초 뒤로 변경 (실행 중이면 끝난 뒤 반영)"""
+        with self._cond:
+            if job.cancelled:
+                return
+            job.scheduled_at = time.monotonic() + max(0.0, delay)
+            if not job.running:
+                self._push(job)
+                self._cond.notify()
+
+    def get_jobs(self) -> List[ScheduledJob]:
+        with self._cond:
+            return list(self._jobs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        스케줄러 상태와 작업별 통계
+
+        Returns:
+            dict: running, workers, dedicated_workers, wakeups, jobs(작업별 snapshot 목록)
+        """
+        jobs = self.get_jobs()
+        return {
+            'running': self._running,
+            'workers': self.max_workers,
+            'dedicated_workers': sum(1 for job in jobs if job.dedicated),
+            'wakeups': self.wakeups,
+            'jobs': [job.snapshot() for job in jobs],
+        }
+
+    def shutdown(self, wait: bool = True):
+        """타이머 스레드와 작업자 풀 종료 (등록된 작업은 모두 취소)"""
+        with self._cond:
+            dedicated = [job.executor for job in self._jobs if job.executor is not None]
+            for job in self._jobs:
+                job.cancelled = True
+            self._jobs.clear()
+            self._heap.clear()
+            self._running = False
+            self._cond.notify()
+            thread, executor = self._thread, self._executor
+            self._thread = self._executor = None
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout=2.0)
+        for job_executor in dedicated:
+            job_executor.shutdown(wait=wait)
+        if executor:
+            executor.shutdown(wait=wait)
+
+    # ------------------------------------------------------------------
+    # 내부 구현
+    # ------------------------------------------------------------------
+
+    def _push(self, job: ScheduledJob):
+        job.due_at = job.scheduled_at + (random.uniform(0, job.jitter) if job.jitter > 0 else 0.0)
+        heapq.heappush(self._heap, (job.due_at, next(self._seq), job))
+
+    def _ensure_started(self):
+        if self._running:
+            return
+        self._running = True
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='scheduler-worker')
+        self._thread = threading.Thread(target=self._timer_loop, name='scheduler-timer', daemon=True)
+        self._thread.start()
+
+    def _timer_loop(self):
+        with self._cond:
+            while self._running:
+                now = time.monotonic()
+                while self._heap and (self._heap[0][2].cancelled or self._heap[0][2].running
+                                      or self._heap[0][0] != self._heap[0][2].due_at):
+                    heapq.heappop(self._heap)  # 취소되었거나 다시 예약된 작업의 이전 항목
+                if not self._heap:
+                    self._cond.wait()
+                    self.wakeups += 1
+                    continue
+                due_at, _, job = self._heap[0]
+                if due_at > now:
+                    self._cond.wait(due_at - now)
+                    self.wakeups += 1
+                    continue
+                heapq.heappop(self._heap)
+                job.running = True
+                job._done.clear()
+                try:
+                    (job.executor or self._executor).submit(self._run, job)
+                except RuntimeError:
+                    job.running = False
+                    job._done.set()
+                    if job.executor is None:
+                        return  # 작업자 풀 종료
+
+    def _run(self, job: ScheduledJob):
+        started = time.monotonic()
+        stats = job.stats
+        with job._stats_lock:
+            stats['last_lag'] = started - job.due_at
+            stats['max_lag'] = max(stats['max_lag'], stats['last_lag'])
+        error = None
+        try:
+            job.func()
+        except Exception as e:
+            error = e
+            logger.error(f"주기 작업 '{job.name}' 실행 중 오류: {e}")
+            logger.debug(traceback.format_exc())
+        finally:
+            elapsed = time.monotonic() - started
+            with job._stats_lock:
+                if error is not None:
+                    stats['failures'] += 1
+                    stats['last_error'] = str(error)
+                stats['runs'] += 1
+                stats['last_time'] = elapsed
+                stats['total_time'] += elapsed
+                stats['max_time'] = max(stats['max_time'], elapsed)
+                stats['last_run'] = time.time()
+            with self._cond:
+                job.running = False
+                if not job.cancelled:
+                    self._schedule_next(job, time.monotonic())
+                    self._cond.notify()
+            job._done.set()
+
+    def _schedule_next(self, job: ScheduledJob, now: float):
+        """밀린 실행 정책에 따라 다음 주기 기준 시각 계산 후 예약"""
+        interval = job.interval
+        if job.scheduled_at > now:
+            pass  # 실행 중에 reschedule() 로 지정된 시각
+        else:
+            next_at = job.scheduled_at + interval
+            if next_at <= now:
+                missed = int((now - next_at) // interval) + 1
+                if job.missed == MISSED_SKIP:
+                    with job._stats_lock:
+                        job.stats['missed'] += missed
+                    next_at += missed * interval
+                elif job.missed == MISSED_RUN_ONCE:
+                    with job._stats_lock:
+                        job.stats['missed'] += missed - 1
+                    next_at = now
+            job.scheduled_at = next_at
+        self._push(job)
+
+
+# 전역 스케줄러 인스턴스
+_scheduler: Optional[PeriodicScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> PeriodicScheduler:
+    """
+    전역 주기 작업 스케줄러 반환
+
+    Returns:
+        PeriodicScheduler: 스케줄러 인스턴스
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = PeriodicScheduler()
+        return _scheduler
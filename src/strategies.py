@@ -112,22 +112,22 @@ class Strategy:
             TradeSignal: 거래 신호 객체 또는 None
         """
         try:
-            logger.info(f"[{self.name}] 신호 생성 시작 - 현재가: {current_price}")
-            logger.debug(f"[{self.name}] 시장 데이터 크기: {len(market_data) if market_data is not None else 0}")
+            logger.debug("[%s] 신호 생성 시작 - 현재가: %s, 시장 데이터 크기: %d",
+                         self.name, current_price, len(market_data) if market_data is not None else 0)
             
             # OHLCV 데이터에 신호 추가
             df_with_signals = self.generate_signals(market_data)
-            logger.debug(f"[{self.name}] generate_signals 완료, 결과 데이터 크기: {len(df_with_signals)}")
+            logger.debug("[%s] generate_signals 완료, 결과 데이터 크기: %d", self.name, len(df_with_signals))
             
             # 마지막 신호 가져오기
             last_signal = df_with_signals['signal'].iloc[-1] if len(df_with_signals) > 0 else 0
             last_position = df_with_signals['position'].iloc[-1] if 'position' in df_with_signals.columns and len(df_with_signals) > 0 else 0
             
-            logger.info(f"[{self.name}] 마지막 신호: {last_signal}, 마지막 포지션: {last_position}")
+            logger.debug("[%s] 마지막 신호: %s, 마지막 포지션: %s", self.name, last_signal, last_position)
             
             # 신호가 없으면 None 반환
             if last_position == 0:
-                logger.info(f"[{self.name}] 포지션이 0이므로 거래 신호 없음 (HOLD)")
+                logger.info("[%s] 포지션이 0이므로 거래 신호 없음 (HOLD)", self.name)
                 return None
                 
             # 포지션 변화가 있으면 신호 생성
@@ -147,7 +147,7 @@ class Strategy:
                 from src.models import TradeSignal
                 confidence = abs(last_signal) if -1 <= last_signal <= 1 else 0.5
                 
-                logger.info(f"[{self.name}] 거래 신호 생성: {direction}, 신뢰도: {confidence:.2f}")
+                logger.info("[%s] 거래 신호 생성: %s, 신뢰도: %.2f", self.name, direction, confidence)
                 
                 # suggested_position_size가 있으면 사용
                 suggested_quantity = None
@@ -155,7 +155,7 @@ class Strategy:
                     last_suggested_size = df_with_signals['suggested_position_size'].iloc[-1]
                     if last_suggested_size > 0:
                         suggested_quantity = last_suggested_size
-                        logger.info(f"[{self.name}] 제안된 포지션 크기: {suggested_quantity:.8f}")
+                        logger.info("[%s] 제안된 포지션 크기: %.8f", self.name, suggested_quantity)
                 
                 return TradeSignal(
                     direction=direction,
@@ -168,7 +168,7 @@ class Strategy:
                     suggested_quantity=suggested_quantity  # 전략에서 계산한 포지션 크기 추가
                 )
             
-            logger.info(f"[{self.name}] 방향이 없으므로 거래 신호 없음")
+            logger.info("[%s] 방향이 없으므로 거래 신호 없음", self.name)
             return None
             
         except Exception as e:
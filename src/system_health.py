@@ -8,14 +8,21 @@ import traceback
 import os
 import psutil
 import json
+from collections import deque
 from datetime import datetime, timedelta
 
 from src.logging_config import get_logger
 from src.error_handlers import error_analyzer
+from src.scheduler import get_scheduler
+from src.journal import open_journal
 
 class SystemHealthMonitor:
     """시스템 상태 감시 및 복구 클래스"""
     
+    # 메모리에 보관할 최근 상태 변경/복구 이력 수
+    MAX_STATUS_CHANGES = 100
+    MAX_RECOVERIES = 500
+    
     def __init__(self, check_interval=60):
         """
         시스템 상태 감시자 초기화
@@ -26,7 +33,7 @@ class SystemHealthMonitor:
         self.logger = get_logger('system_health')
         self.check_interval = check_interval
         self.running = False
-        self.monitor_thread = None
+        self.monitor_jobs = {}  # 컴포넌트별 주기 작업 (공용 스케줄러)
         self.component_statuses = {}
         self.recovery_actions = {}
         self.last_check_time = {}
@@ -39,29 +46,71 @@ class SystemHealthMonitor:
         from src.config import DATA_DIR
         self.log_dir = os.path.join(DATA_DIR, 'system_health')
         os.makedirs(self.log_dir, exist_ok=True)
+        # status_history.json 은 이전 형식 (읽기 전용 기준값), 이후 기록은 저널에 추가
         self.status_history_path = os.path.join(self.log_dir, 'status_history.json')
+        self.journal = open_journal(self.log_dir, 'status_journal')
         self.status_history = self._load_status_history()
     
     def _load_status_history(self):
-        """상태 히스토리 로드"""
+        """이전 상태 히스토리를 기준값으로 읽은 뒤 상태 저널을 재생해 복원"""
+        self.status_history = {'components': {}, 'recoveries': deque(maxlen=self.MAX_RECOVERIES), 'last_updated': None}
         try:
             if os.path.exists(self.status_history_path):
                 with open(self.status_history_path, 'r') as f:
-                    return json.load(f)
-            return {'components': {}, 'recoveries': [], 'last_updated': None}
+                    legacy = json.load(f)
+                for component_name, history in legacy.get('components', {}).items():
+                    component_history = self._component_history(component_name)
+                    component_history['status_changes'].extend(history.get('status_changes', []))
+                    component_history['total_failures'] = history.get('total_failures', 0)
+                    component_history['total_recoveries'] = history.get('total_recoveries', 0)
+                self.status_history['recoveries'].extend(legacy.get('recoveries', []))
+                self.status_history['last_updated'] = legacy.get('last_updated')
+            
+            for record in self.journal.replay():
+                self._apply_history_record(record)
         except Exception as e:
             self.logger.error(f"상태 히스토리 로드 실패: {e}")
-            return {'components': {}, 'recoveries': [], 'last_updated': None}
+        return self.status_history
     
     def _save_status_history(self):
-        """상태 히스토리 저장"""
+        """버퍼에 쌓인 상태 기록을 저널에 씀 (평소에는 공용 flush 작업이 처리)"""
         try:
-            self.status_history['last_updated'] = datetime.now().isoformat()
-            with open(self.status_history_path, 'w') as f:
-                json.dump(self.status_history, f, indent=2)
+            self.journal.flush()
         except Exception as e:
             self.logger.error(f"상태 히스토리 저장 실패: {e}")
     
+    def _component_history(self, component_name):
+        """컴포넌트 상태 히스토리 (없으면 생성)"""
+        components = self.status_history['components']
+        if component_name not in components:
+            components[component_name] = {
+                'status_changes': deque(maxlen=self.MAX_STATUS_CHANGES),
+                'total_failures': 0,
+                'total_recoveries': 0
+            }
+        return components[component_name]
+    
+    def _apply_history_record(self, record):
+        """상태 기록 1건을 히스토리에 반영"""
+        component_history = self._component_history(record['component'])
+        event = record.get('event')
+        if event == 'status_change':
+            component_history['status_changes'].append(
+                {key: record[key] for key in ('timestamp', 'old_status', 'new_status')})
+        elif event == 'failure':
+            component_history['total_failures'] += 1
+        elif event == 'recovery':
+            self.status_history['recoveries'].append(
+                {key: value for key, value in record.items() if key != 'event'})
+            if record.get('success'):
+                component_history['total_recoveries'] += 1
+        self.status_history['last_updated'] = record.get('timestamp')
+    
+    def _record_history(self, record):
+        """상태 기록을 히스토리에 반영하고 저널에 추가"""
+        self._apply_history_record(record)
+        self.journal.append(record)
+    
     def register_component(self, component_name, check_function, recovery_function=None,
                           custom_interval=None, max_consecutive_failures=3):
         """
@@ -89,12 +138,11 @@ class SystemHealthMonitor:
         self.health_stats['recovery_attempts'][component_name] = 0
         
         # 상태 히스토리에 컴포넌트 추가
-        if component_name not in self.status_history['components']:
-            self.status_history['components'][component_name] = {
-                'status_changes': [],
-                'total_failures': 0,
-                'total_recoveries': 0
-            }
+        self._component_history(component_name)
+        
+        # 감시 중에 등록된 컴포넌트는 바로 예약
+        if self.running:
+            self._schedule_component(component_name)
         
         self.logger.info(f"컴포넌트 등록됨: {component_name}")
     
@@ -105,9 +153,13 @@ class SystemHealthMonitor:
             return
         
         self.running = True
-        self.monitor_thread = threading.Thread(target=self._monitoring_loop)
-        self.monitor_thread.daemon = True
-        self.monitor_thread.start()
+        for component_name in list(self.component_statuses):
+            self._schedule_component(component_name)
+        
+        # 시스템 자원 상태 기록
+        self.monitor_jobs['__resources__'] = get_scheduler().add_job(
+            'system_health.resources', self._check_system_resources, self.check_interval,
+            jitter=min(5.0, self.check_interval * 0.1))
         
         self.logger.info(f"시스템 상태 감시 시작 (확인 간격: {self.check_interval}초)")
     
@@ -118,37 +170,22 @@ class SystemHealthMonitor:
             return
         
         self.running = False
-        if self.monitor_thread and self.monitor_thread.is_alive():
-            self.monitor_thread.join(timeout=2.0)
+        for job in self.monitor_jobs.values():
+            job.cancel(wait=2.0)
+        self.monitor_jobs.clear()
+        self._save_status_history()
         
         self.logger.info("시스템 상태 감시 중지")
     
-    def _monitoring_loop(self):
-        """상태 감시 루프"""
-        while self.running:
-            try:
-                current_time = time.time()
-                
-                # 각 컴포넌트 확인
-                for component_name, component_info in self.component_statuses.items():
-                    # 확인 간격 설정
-                    interval = component_info['custom_interval'] or self.check_interval
-                    last_check = self.last_check_time.get(component_name, 0)
-                    
-                    # 확인 시간이 되었는지 확인
-                    if current_time - last_check >= interval:
-                        self._check_component(component_name)
-                
-                # 시스템 자원 상태 기록
-                self._check_system_resources()
-                
-                # 다음 확인까지 대기
-                time.sleep(1)
-                
-            except Exception as e:
-                self.logger.error(f"상태 감시 루프 오류: {e}")
-                self.logger.debug(traceback.format_exc())
-                time.sleep(5)  # 오류 발생 시 짧게 대기
+    def _schedule_component(self, component_name):
+        """컴포넌트 상태 확인을 공용 스케줄러에 등록 (컴포넌트별 확인 간격)"""
+        previous = self.monitor_jobs.pop(component_name, None)
+        if previous:
+            previous.cancel()
+        interval = self.component_statuses[component_name]['custom_interval'] or self.check_interval
+        self.monitor_jobs[component_name] = get_scheduler().add_job(
+            f"system_health.{component_name}", lambda: self._check_component(component_name), interval,
+            jitter=min(5.0, interval * 0.1))
     
     def _check_component(self, component_name):
         """
@@ -194,8 +231,11 @@ class SystemHealthMonitor:
                 consecutive_failures = self.health_stats['consecutive_failures'][component_name]
                 
                 # 상태 히스토리 업데이트
-                self.status_history['components'][component_name]['total_failures'] += 1
-                self._save_status_history()
+                self._record_history({
+                    'event': 'failure',
+                    'component': component_name,
+                    'timestamp': datetime.now().isoformat()
+                })
                 
                 # 상태가 불량한 경우 로그
                 if prev_status != 'unhealthy':
@@ -240,21 +280,15 @@ class SystemHealthMonitor:
             end_time = time.time()
             duration = end_time - start_time
             
-            # 복구 이력 기록
-            recovery_entry = {
+            # 복구 이력 기록 (성공 시 통계 업데이트)
+            self._record_history({
+                'event': 'recovery',
                 'component': component_name,
                 'timestamp': datetime.now().isoformat(),
                 'success': bool(recovery_result),
                 'duration': duration,
                 'attempt': attempts
-            }
-            self.status_history['recoveries'].append(recovery_entry)
-            
-            # 복구 성공 시 통계 업데이트
-            if recovery_result:
-                self.status_history['components'][component_name]['total_recoveries'] += 1
-            
-            self._save_status_history()
+            })
             
             # 복구 결과 로깅
             if recovery_result:
@@ -272,14 +306,13 @@ class SystemHealthMonitor:
     def _record_status_change(self, component_name, old_status, new_status):
         """상태 변경 기록"""
         try:
-            status_change = {
+            self._record_history({
+                'event': 'status_change',
+                'component': component_name,
                 'timestamp': datetime.now().isoformat(),
                 'old_status': old_status,
                 'new_status': new_status
-            }
-            
-            self.status_history['components'][component_name]['status_changes'].append(status_change)
-            self._save_status_history()
+            })
             
             # 상태 변경 로그
             self.logger.info(f"컴포넌트 '{component_name}' 상태 변경: {old_status} -> {new_status}")
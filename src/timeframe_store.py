@@ -0,0 +1,301 @@
+"""
+멀티 타임프레임 저장소 모듈 - 암호화폐 자동매매 봇
+
+저장된 1분봉 하나로 상위 타임프레임(5m, 15m, 1h, 4h, 1d 등)을 모두 만들어
+메모리에 보관합니다. 집계는 NumPy reduceat 으로 한 번에 수행하고, 새 1분봉이
+들어오면 영향을 받는 마지막 구간만 다시 집계합니다.
+
+멀티 타임프레임 백테스트는 1분봉을 한 번만 내려받은 뒤 Backtester 에
+timeframe_store 로 전달하면 타임프레임마다 거래소를 다시 호출하거나
+리샘플링하지 않습니다.
+"""
+
+import threading
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.logging_config import get_logger
+
+logger = get_logger('crypto_bot.timeframe_store')
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+_UNIT_NS = {'m': 60 * 10**9, 'h': 3600 * 10**9, 'd': 86400 * 10**9, 'w': 7 * 86400 * 10**9}
+
+# 주봉은 월요일 00:00 UTC 시작 (1970-01-01 은 목요일)
+_WEEK_OFFSET_NS = 4 * 86400 * 10**9
+
+
+def timeframe_to_ns(timeframe: str) -> int:
+    """
+    타임프레임 문자열을 나노초로 변환
+
+    Args:
+        timeframe: 타임프레임 (1m, 5m, 1h, 4h, 1d, 1w 등)
+
+    Returns:
+        int: 나노초 단위 길이
+    """
+    value = ''.join(filter(str.isdigit, timeframe))
+    unit = ''.join(filter(str.isalpha, timeframe))
+    if not value or unit not in _UNIT_NS:
+        raise ValueError(f"알 수 없는 타임프레임 형식: {timeframe}")
+    return int(value) * _UNIT_NS[unit]
+
+
+def _bucket_start(ts: np.ndarray, timeframe: str) -> np.ndarray:
+    """각 캔들이 속한 상위 타임프레임 구간의 시작 시각 (나노초)"""
+    period = timeframe_to_ns(timeframe)
+    offset = _WEEK_OFFSET_NS if timeframe.endswith('w') else 0
+    return (ts - offset) // period * period + offset
+
+
+def aggregate_ohlcv(ts: np.ndarray, ohlcv: np.ndarray, timeframe: str):
+    """
+    시간순 OHLCV 배열을 상위 타임프레임으로 집계
+
+    Args:
+        ts: 캔들 시작 시각 (int64 나노초, 오름차순)
+        ohlcv: (N, 5) 배열 - open, high, low, close, volume
+        timeframe: 대상 타임프레임
+
+    Returns:
+        tuple: (구간 시작 시각 배열, (M, 5) 집계 배열)
+    """
+    if len(ts) == 0:
+        return np.empty(0, dtype=np.int64), np.empty((0, 5))
+    buckets = _bucket_start(ts, timeframe)
+    starts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+    ends = np.concatenate((starts[1:], [len(ts)])) - 1
+
+    result = np.empty((len(starts), 5))
+    result[:, 0] = ohlcv[starts, 0]
+    result[:, 1] = np.maximum.reduceat(ohlcv[:, 1], starts)
+    result[:, 2] = np.minimum.reduceat(ohlcv[:, 2], starts)
+    result[:, 3] = ohlcv[ends, 3]
+    result[:, 4] = np.add.reduceat(ohlcv[:, 4], starts)
+    return buckets[starts], result
+
+
+class TimeframeStore:
+    """1분봉 기반 멀티 타임프레임 저장소"""
+
+    def __init__(self, base_timeframe: str = '1m', timeframes: Optional[Iterable[str]] = None):
+        """
+        멀티 타임프레임 저장소 초기화
+
+        Args:
+            base_timeframe: 기본 캔들 타임프레임
+            timeframes: 미리 만들어 둘 상위 타임프레임 목록
+        """
+        self.base_timeframe = base_timeframe
+        self.base_period = timeframe_to_ns(base_timeframe)
+        self._lock = threading.RLock()
+        self._ts = np.empty(0, dtype=np.int64)
+        self._data = np.empty((0, 5))
+        # 타임프레임별 (구간 시작 시각, 집계 배열)
+        self._derived: Dict[str, tuple] = {}
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._requested = list(timeframes or [])
+
+    @classmethod
+    def from_ohlcv(cls, df: pd.DataFrame, timeframes: Optional[Iterable[str]] = None,
+                   base_timeframe: str = '1m') -> 'TimeframeStore':
+        """
+        1분봉 데이터프레임으로 저장소 생성
+
+        Args:
+            df: DatetimeIndex 또는 timestamp 열을 가진 OHLCV 데이터
+            timeframes: 미리 만들어 둘 상위 타임프레임 목록
+            base_timeframe: 기본 캔들 타임프레임
+
+        Returns:
+            TimeframeStore: 저장소
+        """
+        store = cls(base_timeframe=base_timeframe, timeframes=timeframes)
+        store.append(df)
+        return store
+
+    @classmethod
+    def from_data_manager(cls, data_manager, timeframes: Optional[Iterable[str]] = None,
+                          base_timeframe: str = '1m') -> Optional['TimeframeStore']:
+        """
+        DataManager 에 저장된 기본 캔들로 저장소 생성
+
+        Returns:
+            TimeframeStore: 저장소 (저장된 데이터가 없으면 None)
+        """
+        df = data_manager.load_ohlcv_data(timeframe=base_timeframe)
+        if df is None or df.empty:
+            return None
+        return cls.from_ohlcv(df, timeframes, base_timeframe)
+
+    @staticmethod
+    def _to_arrays(df: pd.DataFrame):
+        if 'timestamp' in df.columns:
+            index = pd.DatetimeIndex(pd.to_datetime(df['timestamp']))
+        else:
+            index = pd.DatetimeIndex(df.index)
+        if index.tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+        ts = index.values.astype('datetime64[ns]').astype(np.int64)
+        data = df[OHLCV_COLUMNS].to_numpy(np.float64)
+        order = np.argsort(ts, kind='stable')
+        ts, data = ts[order], data[order]
+        # 같은 시각이 여러 번 있으면 마지막 값 사용
+        keep = np.concatenate((ts[1:] != ts[:-1], [True]))
+        return ts[keep], data[keep]
+
+    @property
+    def last_timestamp(self) -> Optional[pd.Timestamp]:
+        """마지막 기본 캔들 시각"""
+        with self._lock:
+            return pd.Timestamp(self._ts[-1]) if len(self._ts) else None
+
+    def __len__(self) -> int:
+        return len(self._ts)
+
+    def append(self, df: pd.DataFrame) -> int:
+        """
+        새 기본 캔들 추가 (마지막 캔들과 같은 시각이면 값 갱신)
+
+        마지막으로 저장된 캔들보다 오래된 캔들은 무시합니다. 만들어 둔 상위 타임프레임은
+        새 캔들이 영향을 주는 구간부터만 다시 집계합니다.
+
+        Args:
+            df: 추가할 OHLCV 데이터
+
+        Returns:
+            int: 추가되거나 갱신된 캔들 수
+        """
+        if df is None or len(df) == 0:
+            return 0
+        ts, data = self._to_arrays(df)
+        with self._lock:
+            if len(self._ts):
+                fresh = ts >= self._ts[-1]
+                ts, data = ts[fresh], data[fresh]
+                if len(ts) == 0:
+                    return 0
+                if ts[0] == self._ts[-1]:
+                    self._ts, self._data = self._ts[:-1], self._data[:-1]
+            first_changed = ts[0]
+            self._ts = np.concatenate((self._ts, ts))
+            self._data = np.concatenate((self._data, data))
+
+            for timeframe in list(self._derived) + [tf for tf in self._requested if tf not in self._derived]:
+                self._update_derived(timeframe, first_changed)
+            self._frames.clear()
+            return len(ts)
+
+    def _update_derived(self, timeframe: str, first_changed: int) -> None:
+        """first_changed 가 속한 구간부터 상위 타임프레임 다시 집계"""
+        if timeframe not in self._derived:
+            self._derived[timeframe] = aggregate_ohlcv(self._ts, self._data, timeframe)
+            return
+        bucket_ts, bucket_data = self._derived[timeframe]
+        redo_from = int(_bucket_start(np.array([first_changed], dtype=np.int64), timeframe)[0])
+        keep = np.searchsorted(bucket_ts, redo_from, side='left')
+        base_from = np.searchsorted(self._ts, redo_from, side='left')
+        new_ts, new_data = aggregate_ohlcv(self._ts[base_from:], self._data[base_from:], timeframe)
+        self._derived[timeframe] = (np.concatenate((bucket_ts[:keep], new_ts)),
+                                    np.concatenate((bucket_data[:keep], new_data)))
+
+    def get(self, timeframe: str, start=None, end=None, complete_only: bool = False) -> pd.DataFrame:
+        """
+        타임프레임 캔들 조회 (처음 요청 시 집계 후 캐시)
+
+        Args:
+            timeframe: 타임프레임
+            start: 시작 시각 (포함)
+            end: 종료 시각 (포함)
+            complete_only: True이면 아직 끝나지 않은 마지막 구간 제외
+
+        Returns:
+            DataFrame: DatetimeIndex(timestamp) 와 open/high/low/close/volume 열
+        """
+        with self._lock:
+            if timeframe == self.base_timeframe:
+                ts, data = self._ts, self._data
+            else:
+                if timeframe_to_ns(timeframe) < self.base_period:
+                    raise ValueError(f"{timeframe}은 기본 타임프레임 {self.base_timeframe}보다 짧습니다")
+                if timeframe not in self._derived:
+                    self._derived[timeframe] = aggregate_ohlcv(self._ts, self._data, timeframe)
+                    if timeframe not in self._requested:
+                        self._requested.append(timeframe)
+                ts, data = self._derived[timeframe]
+
+            frame = self._frames.get(timeframe)
+            if frame is None:
+                frame = pd.DataFrame(data, columns=OHLCV_COLUMNS,
+                                     index=pd.DatetimeIndex(ts.astype('datetime64[ns]'), name='timestamp'))
+                self._frames[timeframe] = frame
+
+            if complete_only and len(ts) and timeframe != self.base_timeframe:
+                bar_end = self._ts[-1] + self.base_period
+                if ts[-1] + timeframe_to_ns(timeframe) > bar_end:
+                    frame = frame.iloc[:-1]
+
+        if start is not None or end is not None:
+            frame = frame.loc[pd.to_datetime(start) if start is not None else None:
+                              pd.to_datetime(end) if end is not None else None]
+        return frame.copy()
+
+    def timeframes(self) -> list:
+        """만들어 둔 상위 타임프레임 목록"""
+        with self._lock:
+            return list(self._derived)
+
+    def save(self, data_manager, timeframes: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """
+        기본 캔들과 상위 타임프레임을 DataManager 형식(timestamp 열 포함 CSV)으로 저장
+
+        Returns:
+            dict: 타임프레임별 저장 경로
+        """
+        paths = {}
+        for timeframe in [self.base_timeframe] + list(timeframes or self.timeframes()):
+            paths[timeframe] = data_manager.save_ohlcv_data(self.get(timeframe).reset_index(), timeframe=timeframe)
+        return paths
+
+
+def build_timeframe_store(exchange_id: str, symbol: str, start_date, end_date=None,
+                          timeframes: Optional[Iterable[str]] = None, save: bool = True) -> Optional[TimeframeStore]:
+    """
+    거래소에서 1분봉을 한 번 내려받아 멀티 타임프레임 저장소 생성
+
+    이미 저장된 1분봉이 요청 기간을 모두 포함하면 거래소를 호출하지 않습니다.
+
+    Args:
+        exchange_id: 거래소 ID
+        symbol: 거래 심볼
+        start_date: 시작 날짜
+        end_date: 종료 날짜 (None이면 현재까지)
+        timeframes: 미리 만들어 둘 상위 타임프레임 목록
+        save: 내려받은 1분봉 저장 여부
+
+    Returns:
+        TimeframeStore: 저장소 (데이터를 가져오지 못하면 None)
+    """
+    from src.data_collector import DataCollector
+
+    collector = DataCollector(exchange_id=exchange_id, symbol=symbol, timeframe='1m')
+    store = TimeframeStore.from_data_manager(collector.data_manager, timeframes)
+    start_dt = pd.to_datetime(start_date)
+    end_dt = pd.to_datetime(end_date) if end_date is not None else pd.Timestamp.now()
+    if store is not None and len(store) and store.get('1m').index[0] <= start_dt and store.last_timestamp >= end_dt - pd.Timedelta(minutes=1):
+        logger.info(f"저장된 1분봉으로 타임프레임 저장소 생성: {len(store)}개")
+        return store
+
+    df = collector.fetch_historical_data(start_date=start_date, end_date=end_date, save=False)
+    if df is None or df.empty:
+        logger.warning("1분봉 데이터를 가져오지 못했습니다.")
+        return None
+    store = TimeframeStore.from_ohlcv(df, timeframes)
+    if save:
+        collector.data_manager.save_ohlcv_data(store.get('1m').reset_index(), timeframe='1m')
+    logger.info(f"1분봉 {len(store)}개로 타임프레임 저장소 생성: {', '.join(store.timeframes())}")
+    return store
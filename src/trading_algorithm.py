@@ -34,6 +34,7 @@ from src.auto_position_manager import AutoPositionManager
 from src.risk_manager import RiskManager
 from src.portfolio_manager import PortfolioManager
 from src.order_executor import OrderExecutor
+from src.order_dispatcher import BulkOrderDispatcher
 from src.models import Position, Order, Trade, TradeSignal
 from src.strategies import (
     MovingAverageCrossover, RSIStrategy, MACDStrategy, 
@@ -140,6 +141,9 @@ class TradingAlgorithm:
             test_mode=test_mode
         )
         
+        # 일괄 청산용 동시 주문 디스패처
+        self.order_dispatcher = BulkOrderDispatcher(self.exchange_api)
+        
         # 전략 설정
         if strategy is None:
             # 기본 전략: 이동평균 교차
@@ -827,63 +831,54 @@ class TradingAlgorithm:
         3. 리스크 평가 및 관리
         4. 신호가 있다면 주문 실행
         """
-        self.logger.info(f"=== 거래 사이클 실행 시작 ===")
-        self.logger.info(f"심볼: {self.symbol}")
-        self.logger.info(f"전략: {self.strategy.__class__.__name__}")
-        self.logger.info(f"테스트 모드: {self.test_mode}, 거래 활성화: {self.trading_active}")
+        self.logger.info("=== 거래 사이클 실행 시작 === 심볼: %s, 전략: %s, 테스트 모드: %s, 거래 활성화: %s",
+                         self.symbol, self.strategy.__class__.__name__, self.test_mode, self.trading_active)
         cycle_start_time = datetime.now()
         
         try:
             # 1. 현재 포트폴리오 상태 확인
-            self.logger.info("1단계: 포트폴리오 상태 확인 중...")
+            self.logger.debug("1단계: 포트폴리오 상태 확인 중...")
             portfolio_status = self.portfolio_manager.get_portfolio_status()
-            self.logger.info(f"포트폴리오 상태: 잔액={portfolio_status.get('quote_balance', 0):.4f}, 포지션 수={len(portfolio_status.get('positions', []))}")
+            self.logger.info("포트폴리오 상태: 잔액=%.4f, 포지션 수=%d",
+                             portfolio_status.get('quote_balance', 0), len(portfolio_status.get('positions', [])))
             
             # 2. 시장 데이터 가져오기 (OHLCV 데이터)
-            self.logger.info("2단계: 시장 데이터 수집 중...")
+            self.logger.debug("2단계: 시장 데이터 수집 중...")
             market_data = self.data_collector.fetch_recent_data(
                 limit=self.strategy.required_data_points
             )
             
             if market_data is None or len(market_data) < self.strategy.required_data_points:
-                self.logger.warning(f"충분한 시장 데이터를 가져올 수 없습니다. 가져온 데이터: {len(market_data) if market_data is not None else 0}/{self.strategy.required_data_points}")
+                self.logger.warning("충분한 시장 데이터를 가져올 수 없습니다. 가져온 데이터: %d/%d",
+                                    len(market_data) if market_data is not None else 0,
+                                    self.strategy.required_data_points)
                 return
             
-            self.logger.info(f"시장 데이터 수집 완료: {len(market_data)}개 캔들")
-            
-            # 시장 데이터 상세 로깅
-            if market_data is not None and len(market_data) > 0:
+            # 시장 데이터 상세 로깅 (DEBUG 레벨에서만 캔들 정보 계산)
+            if self.logger.isEnabledFor(logging.DEBUG) and len(market_data) > 0:
                 latest_candle = market_data.iloc[-1]
-                self.logger.info(f"최신 캔들 정보:")
-                self.logger.info(f"  - 시간: {latest_candle.name}")
-                self.logger.info(f"  - 시가: {latest_candle['open']:.2f}")
-                self.logger.info(f"  - 고가: {latest_candle['high']:.2f}")
-                self.logger.info(f"  - 저가: {latest_candle['low']:.2f}")
-                self.logger.info(f"  - 종가: {latest_candle['close']:.2f}")
-                self.logger.info(f"  - 거래량: {latest_candle['volume']:.2f}")
-                
-                # 가격 변동성 계산
                 price_change = latest_candle['close'] - latest_candle['open']
                 price_change_pct = (price_change / latest_candle['open']) * 100
-                self.logger.info(f"  - 가격 변동: {price_change:.2f} ({price_change_pct:+.2f}%)")
-                
-                # 최근 5개 캔들의 추세
+                trend = ''
                 if len(market_data) >= 5:
                     recent_closes = market_data['close'].tail(5)
                     trend = "상승" if recent_closes.iloc[-1] > recent_closes.iloc[0] else "하락"
-                    self.logger.info(f"  - 최근 5개 캔들 추세: {trend}")
+                self.logger.debug(
+                    "시장 데이터 %d개 캔들, 최신 캔들: 시간=%s O=%.2f H=%.2f L=%.2f C=%.2f V=%.2f 변동=%.2f (%+.2f%%) 5캔들 추세=%s",
+                    len(market_data), latest_candle.name, latest_candle['open'], latest_candle['high'],
+                    latest_candle['low'], latest_candle['close'], latest_candle['volume'],
+                    price_change, price_change_pct, trend
+                )
             
             # 3. 현재 가격 가져오기
-            self.logger.info("3단계: 현재 가격 조회 중...")
             current_price = self.get_current_price(self.symbol)
             if current_price is None:
                 self.logger.warning("현재 가격을 가져올 수 없습니다. 거래 사이클을 건너뜁니다.")
                 return
             
-            self.logger.info(f"현재 가격: {current_price}")
+            self.logger.debug("현재 가격: %s", current_price)
             
             # 4. 전략에 데이터 전달하여 거래 신호 생성
-            self.logger.info(f"4단계: 거래 신호 생성 중... (전략: {self.strategy.__class__.__name__})")
             signal = self.strategy.generate_signal(
                 market_data=market_data, 
                 current_price=current_price,
@@ -892,17 +887,13 @@ class TradingAlgorithm:
             
             # 5. 신호 로깅
             if signal:
-                self.logger.info(f"★ 거래 신호 발생! ★")
-                self.logger.info(f"  - 방향: {signal.direction}")
-                self.logger.info(f"  - 신뢰도: {signal.confidence:.2f}")
-                self.logger.info(f"  - 강도: {signal.strength}")
-                self.logger.info(f"  - 전략: {signal.strategy}")
+                self.logger.info("★ 거래 신호 발생! ★ 방향: %s, 신뢰도: %.2f, 강도: %s, 전략: %s",
+                                 signal.direction, signal.confidence, signal.strength, signal.strategy)
             else:
                 self.logger.info("거래 신호 없음 (HOLD)")
                 return
             
             # 6. 리스크 평가 및 관리
-            self.logger.info("5단계: 리스크 평가 중...")
             risk_assessment = self.risk_manager.assess_risk(
                 signal=signal,
                 portfolio_status=portfolio_status,
@@ -957,26 +948,20 @@ class TradingAlgorithm:
                 # 포지션 청산
                 self.logger.info(f"6단계: 포지션 청산 실행 중...")
                 # 현재 포지션 확인
-                open_positions = self.position_manager.get_open_positions(
-                    self.exchange_id, self.symbol
-                )
+                open_positions = self.get_open_positions(self.symbol)
                 if open_positions:
-                    for position in open_positions:
-                        # 롱 포지션은 매도 주문으로 청산, 숏 포지션은 매수 주문으로 청산
-                        if position['side'] == 'long':
-                            order_result = self.order_executor.execute_sell(
-                                price=current_price,
-                                quantity=position['quantity'],
-                                portfolio=portfolio_status,
-                                additional_info=additional_info
-                            )
-                        elif position['side'] == 'short':
-                            order_result = self.order_executor.execute_buy(
-                                price=current_price,
-                                quantity=position['quantity'],
-                                portfolio=portfolio_status,
-                                additional_info=additional_info
-                            )
+                    # 롱은 매도, 숏은 매수 주문으로 모든 포지션을 동시에 청산
+                    close_result = self.close_positions_bulk(
+                        open_positions,
+                        exit_info={'signal_direction': signal.direction, 'signal_strategy': signal.strategy},
+                        price=current_price
+                    )
+                    placed = [r['order'] for r in close_result['results'] if r['status'] == 'ok' and r['order']]
+                    order_result = {
+                        'success': close_result['success'],
+                        'order_id': placed[0].get('id') if placed else None,
+                        'orders': placed
+                    }
                 else:
                     self.logger.warning("청산할 포지션이 없습니다.")
                     return
@@ -1107,7 +1092,7 @@ class TradingAlgorithm:
             
             # 거래 사이클 완료 시간 로깅
             execution_time = (datetime.now() - cycle_start_time).total_seconds()
-            self.logger.info(f"거래 사이클 완료 - 실행 시간: {execution_time:.2f}초")
+            self.logger.info("거래 사이클 완료 - 실행 시간: %.2f초", execution_time)
             
         except Exception as e:
             self.logger.error(f"거래 사이클 실행 중 예외 발생: {e}")
@@ -1272,6 +1257,139 @@ class TradingAlgorithm:
             self.logger.error(f"Position 객체 조회 중 오류 발생: {e}")
             return []
     
+    def close_positions_bulk(self, positions, percentage=1.0, exit_info=None, price=None, deadline=None):
+        """
+        여러 포지션을 반대 방향 주문으로 동시에 청산합니다.
+        
+        실거래에서는 BulkOrderDispatcher 로 주문을 한 번에 전송하고(재시도 대기 없음),
+        접수된 주문만 거래 내역과 포지션 상태에 반영합니다. 테스트 모드에서는 기존
+        주문 실행자의 시뮬레이션을 순서대로 사용합니다.
+        
+        Args:
+            positions (list): 청산할 포지션 목록 (side, contracts/size/quantity, symbol, id)
+            percentage (float): 청산 비율 (0.0-1.0)
+            exit_info (dict): 거래 내역에 함께 저장할 청산 정보
+            price (float): 거래 내역 기록용 현재 가격 (None이면 체결가 또는 시세 사용)
+            deadline (float): 전체 마감 시간 (초, None이면 디스패처 기본값)
+            
+        Returns:
+            dict: 디스패처 집계 결과 (success, total, succeeded, failed, unknown, skipped, results)
+        """
+        orders = []
+        for position in positions:
+            side = (position.get('side') or '').lower()
+            size = abs(float(position.get('contracts') or position.get('size') or
+                             position.get('quantity') or position.get('amount') or 0))
+            amount = size * percentage
+            if side not in ('long', 'short') or amount <= 0:
+                self.logger.warning(f"청산 주문에서 제외된 포지션: ID={position.get('id')}, side={side}, size={size}")
+                continue
+            params = {'reduceOnly': True} if self.market_type.lower() == 'futures' else {}
+            orders.append({
+                'symbol': position.get('symbol') or self.symbol,
+                'side': 'sell' if side == 'long' else 'buy',
+                'amount': amount,
+                'params': params,
+                'ref': position,
+            })
+        
+        if self.test_mode:
+            return self._simulate_bulk_close(orders, percentage, exit_info, price)
+        
+        summary = self.order_dispatcher.dispatch(orders, deadline=deadline)
+        now = datetime.now().isoformat()
+        for result in summary['results']:
+            if result['status'] != 'ok':
+                self.logger.error(f"포지션 {result['ref'].get('id')} 청산 주문 실패({result['status']}): {result['error']}")
+                continue
+            order = result['order']
+            position = result['ref']
+            fill_price = order.get('average') or order.get('price') or price or 0
+            trade_info = {'order_id': order.get('id'), 'test_mode': False, 'percentage': percentage,
+                          'is_partial': percentage < 1.0, 'bulk': True}
+            trade_info.update(exit_info or {})
+            try:
+                self.db.save_trade({
+                    'symbol': result['symbol'],
+                    'side': result['side'],
+                    'order_type': 'market',
+                    'amount': result['amount'],
+                    'price': fill_price,
+                    'cost': fill_price * result['amount'],
+                    'fee': (order.get('fee') or {}).get('cost') or 0,
+                    'timestamp': now,
+                    'additional_info': trade_info
+                })
+                self._record_bulk_close(position, result['amount'], fill_price, now)
+            except Exception as e:
+                self.logger.error(f"일괄 청산 결과 기록 중 오류: {e}")
+        return summary
+    
+    def _record_bulk_close(self, position, amount, fill_price, closed_at, portfolio=None):
+        """
+        청산된 수량을 DB 포지션(과 포트폴리오의 같은 포지션)에 반영
+        
+        Returns:
+            bool: 반영 성공 여부
+        """
+        if not position.get('id'):
+            return False
+        if not self.db.reduce_position(position['id'], amount, price=fill_price, closed_at=closed_at):
+            self.logger.error(f"포지션 {position['id']} 청산 결과를 DB에 반영하지 못했습니다 (수량 {amount})")
+            return False
+        # 청산 평가 인덱스 등 구독자가 DB 포지션 ID 기준 변경분만 반영하도록 이벤트 발행
+        remaining = abs(float(position.get('contracts') or 0)) - amount
+        if remaining > abs(float(position.get('contracts') or 0)) * 1e-9:
+            self.event_manager.publish(EventType.POSITION_UPDATED, {
+                'position_id': position['id'],
+                'position': dict(position, contracts=remaining),
+                'timestamp': closed_at
+            })
+        else:
+            self.event_manager.publish(EventType.POSITION_CLOSED, {
+                'position_id': position['id'],
+                'position': dict(position, status='closed', closed_at=closed_at),
+                'timestamp': closed_at
+            })
+        for held in (portfolio or {}).get('positions') or []:
+            if position['id'] in (held.get('id'), held.get('position_id')):
+                size = abs(float(held.get('contracts') or held.get('amount') or 0))
+                if size - amount > size * 1e-9:
+                    held['contracts'] = size - amount
+                else:
+                    held.update(status='closed', closed_at=closed_at)
+                break
+        return True
+    
+    def _simulate_bulk_close(self, orders, percentage, exit_info, price):
+        """테스트 모드 일괄 청산 (주문 실행자 시뮬레이션을 순서대로 호출)"""
+        portfolio = self.portfolio_manager.get_portfolio_status()
+        trade_info = {'percentage': percentage, 'is_partial': percentage < 1.0, 'bulk': True}
+        trade_info.update(exit_info or {})
+        results = []
+        for order in orders:
+            position = order['ref']
+            current_price = price or self.get_current_price(order['symbol']) or 0
+            # 두 방향 모두 청산 수량 그대로 주문하고, 포지션 반영은 실거래와 같은 경로로 처리
+            if order['side'] == 'sell':
+                placed = self.order_executor.execute_sell(
+                    price=current_price, quantity=order['amount'], portfolio=portfolio,
+                    additional_exit_info=trade_info, percentage=1.0)
+            else:
+                placed = self.order_executor.execute_buy(
+                    price=current_price, quantity=order['amount'], portfolio=portfolio,
+                    additional_info=trade_info, close_position=True)
+            if placed:
+                self._record_bulk_close(position, order['amount'], current_price,
+                                        datetime.now().isoformat(), portfolio=portfolio)
+            results.append({'ref': position, 'symbol': order['symbol'], 'side': order['side'],
+                            'amount': order['amount'], 'status': 'ok' if placed else 'failed',
+                            'order': placed, 'error': None if placed else '시뮬레이션 주문 실패'})
+        succeeded = sum(1 for r in results if r['status'] == 'ok')
+        return {'success': succeeded == len(results), 'total': len(results), 'succeeded': succeeded,
+                'failed': len(results) - succeeded, 'unknown': 0, 'skipped': 0,
+                'requests': len(results), 'elapsed': 0.0, 'results': results}
+    
     def close_position(self, symbol=None, position_id=None, size=None):
         """
         특정 포지션을 청산합니다.
@@ -0,0 +1,534 @@
+"""
+가격 정렬 청산 트리거 인덱스 모듈 - 암호화폐 자동매매 봇
+
+심볼/방향별로 손절가, 이익실현가, 부분 이익실현 단계, 트레일링 활성화 가격,
+트레일링 고점(숏은 저점)을 정렬 리스트로 보관합니다. 가격이 갱신되면 이분 탐색으로
+조건을 만족하는 구간만 잘라내므로, 포지션 수 n 과 발동한 트리거 수 k 에 대해
+틱당 O(log n + k) 로 평가합니다.
+
+모든 가격은 방향 부호를 곱한 값(롱 +가격, 숏 -가격)으로 저장해 롱/숏을 같은
+부등식(값이 클수록 유리)으로 다룹니다. 평가 결과와 신호 형식은
+VectorizedExitEvaluator 와 동일하므로 AutoPositionManager 에서 그대로 교체해
+사용할 수 있습니다.
+"""
+
+import bisect
+import math
+from typing import Dict, List, Any, Optional, Sequence, Set, Tuple, Union
+
+from src.logging_config import get_logger
+from src.exit_evaluator import (
+    EXIT_STOP_LOSS, EXIT_TRAILING_STOP, EXIT_PARTIAL_TP, EXIT_TAKE_PROFIT,
+    side_to_sign, stop_loss_prices, take_profit_prices, liquidation_prices
+)
+
+logger = get_logger('crypto_bot.trigger_index')
+
+_INF = float('inf')
+
+
+class _PositionState:
+    """인덱스에 등록된 포지션 하나의 상태"""
+
+    __slots__ = ('seq', 'position_id', 'position', 'symbol', 'sign', 'entry', 'leverage',
+                 'sl_price', 'tp_price', 'high_water', 'trailing_active', 'tp_executed')
+
+    def __init__(self, seq: int, position_id: Any, position: Dict[str, Any], sign: int, entry: float):
+        self.seq = seq
+        self.position_id = position_id
+        self.position = position
+        self.symbol = position.get('symbol') or ''
+        self.sign = sign
+        self.entry = entry
+        self.leverage = float(position.get('leverage') or 10)
+        self.sl_price = 0.0
+        self.tp_price = 0.0
+        self.high_water = entry
+        self.trailing_active = False
+        self.tp_executed: Set[int] = set()
+
+
+class _SideBook:
+    """
+    한 심볼의 한 방향(롱 또는 숏) 트리거 정렬 구조
+
+    - stop_loss: (부호 손절가, seq) 오름차순. 부호 가격 이하로 내려오면 발동하므로 꼬리 구간
+    - take_profit: (부호 이익실현가, seq) 오름차순. 부호 가격 이상이면 발동하므로 앞 구간
+    - partial: (부호 단계 가격, seq, 단계) 오름차순. 미실행 단계만 보관
+    - activation: (-부호 활성화 가격, seq) 오름차순. 활성화 대상은 항상 리스트 끝에 위치
+    - trail_keys: (-부호 고점) 오름차순. 가장 낮은 고점이 끝에 오고, 각 고점의 포지션은
+      trail_buckets 에 묶어 보관. 새 고점이 나오면 그보다 낮은 버킷은 끝에서부터 하나로 병합
+    """
+
+    __slots__ = ('sign', 'stop_loss', 'take_profit', 'partial', 'activation',
+                 'trail_keys', 'trail_buckets')
+
+    def __init__(self, sign: int):
+        self.sign = sign
+        self.stop_loss: List[Tuple[float, int]] = []
+        self.take_profit: List[Tuple[float, int]] = []
+        self.partial: List[Tuple[float, int, int]] = []
+        self.activation: List[Tuple[float, int]] = []
+        self.trail_keys: List[float] = []
+        self.trail_buckets: Dict[float, Set[int]] = {}
+
+    def __len__(self):
+        return len(self.stop_loss)
+
+    def remove_trailing(self, signed_high: float, seq: int):
+        """트레일링 버킷에서 포지션 제거 (빈 버킷은 정리)"""
+        bucket = self.trail_buckets.get(signed_high)
+        if bucket is None:
+            return
+        bucket.discard(seq)
+        if not bucket:
+            del self.trail_buckets[signed_high]
+            i = bisect.bisect_left(self.trail_keys, -signed_high)
+            if i < len(self.trail_keys) and self.trail_keys[i] == -signed_high:
+                del self.trail_keys[i]
+
+
+def _remove_sorted(items: list, key: tuple):
+    """정렬 리스트에서 항목 하나 제거 (없으면 무시)"""
+    i = bisect.bisect_left(items, key)
+    if i < len(items) and items[i] == key:
+        del items[i]
+
+
+class TriggerIndex:
+    """
+    심볼별 가격 정렬 청산 트리거 인덱스
+
+    sync()로 포지션 목록의 추가/제거분만 인덱스에 반영하거나 upsert()/remove()로
+    포지션 한 건씩 반영하고, evaluate()로 현재 가격에 걸린 트리거만 찾아 청산 신호를 만듭니다. 판정 기준(우선순위, 부분 이익실현 단계 선택,
+    트레일링 고점 갱신)은 VectorizedExitEvaluator 와 같고, 트레일링 고점과 부분 이익실현
+    실행 이력은 포지션 ID 기준으로 sync() 사이에도 유지됩니다.
+    """
+
+    def __init__(self, sl_pct: float = 0.05, tp_pct: float = 0.1,
+                 partial_tp_enabled: bool = False,
+                 tp_levels: Optional[Sequence[float]] = None,
+                 tp_percentages: Optional[Sequence[float]] = None,
+                 trailing_enabled: bool = False,
+                 trailing_activation_pct: float = 0.01,
+                 trailing_pct: float = 0.02,
+                 liquidation_warning_pct: float = 5.0):
+        """
+        트리거 인덱스 초기화
+
+        Args:
+            sl_pct: 손절매 비율
+            tp_pct: 이익실현 비율
+            partial_tp_enabled: 부분 이익실현 활성화 여부
+            tp_levels: 부분 이익실현 수익률 단계 (예: [0.05, 0.1, 0.2])
+            tp_percentages: 각 단계에서 청산할 비율 (예: [0.3, 0.3, 0.4])
+            trailing_enabled: 트레일링 스탑 활성화 여부
+            trailing_activation_pct: 트레일링 스탑 활성화 수익률
+            trailing_pct: 고점(저점) 대비 트레일링 간격 비율
+            liquidation_warning_pct: 청산가 근접 경고 기준 (%)
+        """
+        self.sl_pct = sl_pct
+        self.tp_pct = tp_pct
+        self.partial_tp_enabled = partial_tp_enabled
+        self.tp_levels = [float(v) for v in (tp_levels if tp_levels else [0.05, 0.1, 0.2])]
+        self.tp_percentages = [float(v) for v in (tp_percentages if tp_percentages else [0.3, 0.3, 0.4])]
+        self.trailing_enabled = trailing_enabled
+        self.trailing_activation_pct = trailing_activation_pct
+        self.trailing_pct = trailing_pct
+        self.liquidation_warning_pct = liquidation_warning_pct
+
+        self._states: Dict[Any, _PositionState] = {}
+        self._by_seq: Dict[int, _PositionState] = {}
+        self._books: Dict[Tuple[str, int], _SideBook] = {}
+        self._next_seq = 0
+        self._liquidation_cache: Dict[Tuple[str, int], List[Tuple[float, int]]] = {}
+        self._liquidation_ratio = None
+
+    def __len__(self):
+        return len(self._states)
+
+    @property
+    def ids(self) -> List[Any]:
+        """등록된 포지션 ID 목록"""
+        return list(self._states)
+
+    def configure(self, sl_pct: Optional[float] = None, tp_pct: Optional[float] = None,
+                  partial_tp_enabled: Optional[bool] = None,
+                  tp_levels: Optional[Sequence[float]] = None,
+                  tp_percentages: Optional[Sequence[float]] = None,
+                  trailing_enabled: Optional[bool] = None,
+                  trailing_activation_pct: Optional[float] = None,
+                  trailing_pct: Optional[float] = None):
+        """
+        평가 설정 변경 (None 인자는 현재 설정 유지)
+
+        손절/이익실현 비율이나 활성화 수익률이 바뀌면 해당 정렬 리스트만 다시 만들고,
+        부분 이익실현 단계가 바뀌면 실행 이력을 초기화합니다. 트레일링 간격은 고점
+        기준으로 보관하므로 바뀌어도 인덱스를 다시 만들 필요가 없습니다.
+        """
+        if partial_tp_enabled is not None:
+            self.partial_tp_enabled = partial_tp_enabled
+        if trailing_enabled is not None:
+            self.trailing_enabled = trailing_enabled
+        if trailing_pct is not None:
+            self.trailing_pct = trailing_pct
+
+        rebuild = set()
+        if tp_levels is not None and tp_percentages is not None:
+            size = min(len(tp_levels), len(tp_percentages))
+            levels = [float(v) for v in tp_levels[:size]]
+            percentages = [float(v) for v in tp_percentages[:size]]
+            if levels != self.tp_levels or percentages != self.tp_percentages:
+                self.tp_levels = levels
+                self.tp_percentages = percentages
+                for state in self._states.values():
+                    state.tp_executed = set()
+                rebuild.add('partial')
+        if trailing_activation_pct is not None and trailing_activation_pct != self.trailing_activation_pct:
+            self.trailing_activation_pct = trailing_activation_pct
+            rebuild.add('activation')
+        if sl_pct is not None and sl_pct != self.sl_pct:
+            self.sl_pct = sl_pct
+            rebuild.add('stop_loss')
+        if tp_pct is not None and tp_pct != self.tp_pct:
+            self.tp_pct = tp_pct
+            rebuild.add('take_profit')
+
+        if rebuild and self._states:
+            self._rebuild(rebuild)
+
+    def sync(self, positions: List[Dict[str, Any]]) -> int:
+        """
+        포지션 목록을 인덱스에 반영
+
+        목록에서 사라진 포지션은 제거하고 새 포지션만 삽입합니다. 진입가나 방향,
+        심볼이 바뀐 포지션은 새 포지션으로 취급해 상태를 초기화합니다.
+
+        Args:
+            positions: 포지션 딕셔너리 목록 (id, symbol, side, entry_price, leverage)
+
+        Returns:
+            int: 유효한 포지션 수
+        """
+        seen = set()
+        for position in positions:
+            if self.upsert(position):
+                seen.add(position.get('id'))
+
+        for position_id in [pid for pid in self._states if pid not in seen]:
+            self._remove(self._states[position_id])
+        return len(self._states)
+
+    def upsert(self, position: Dict[str, Any]) -> bool:
+        """
+        포지션 한 건을 인덱스에 추가하거나 갱신
+
+        진입가, 방향, 심볼이 그대로면 포지션 정보만 바꾸고 트레일링/부분 이익실현 상태는
+        유지합니다. 하나라도 바뀌면 새 포지션으로 다시 삽입합니다.
+
+        Args:
+            position: 포지션 딕셔너리 (id, symbol, side, entry_price, leverage)
+
+        Returns:
+            bool: 인덱스에 반영되었는지 여부 (유효하지 않은 포지션이면 False)
+        """
+        position_id = position.get('id')
+        entry_price = position.get('entry_price')
+        sign = side_to_sign(position.get('side'))
+        if not position_id or sign == 0 or not entry_price or entry_price <= 0:
+            logger.warning("유효하지 않은 포지션 정보로 평가에서 제외: id=%s, side=%s, entry_price=%s",
+                           position_id, position.get('side'), entry_price)
+            return False
+
+        entry = float(entry_price)
+        state = self._states.get(position_id)
+        if state is not None:
+            if (state.entry == entry and state.sign == sign
+                    and state.symbol == (position.get('symbol') or '')):
+                state.position = position
+                return True
+            self._remove(state)
+        self._add(position_id, position, sign, entry)
+        return True
+
+    def remove(self, position_id: Any) -> bool:
+        """
+        포지션 한 건을 인덱스에서 제거
+
+        Returns:
+            bool: 등록되어 있던 포지션이면 True
+        """
+        state = self._states.get(position_id)
+        if state is None:
+            return False
+        self._remove(state)
+        return True
+
+    def evaluate(self, prices: Union[float, Dict[str, float]]) -> List[Dict[str, Any]]:
+        """
+        현재 가격에 대한 청산 신호 목록 계산 (트레일링/부분 이익실현 상태 갱신 포함)
+
+        우선순위는 손절매 > 트레일링 스탑 > 부분 이익실현 > 이익실현 입니다.
+
+        Args:
+            prices: 단일 가격(모든 심볼에 적용) 또는 심볼별 가격 딕셔너리
+
+        Returns:
+            list: 청산 신호 목록. 각 항목은 position, position_id, current_price,
+                  exit_type, exit_reason, exit_percentage 키를 가짐
+        """
+        signals = []
+        for (symbol, sign), book in self._books.items():
+            price = self._price_for(prices, symbol)
+            if price is None:
+                continue
+            signals.extend(self._evaluate_book(book, price))
+        return signals
+
+    def liquidation_warnings(self, prices: Union[float, Dict[str, float]],
+                             margin_ratio: float = 0.004) -> List[Dict[str, Any]]:
+        """
+        청산 가격에 근접한 포지션 목록 (선물 전용)
+
+        Args:
+            prices: 단일 가격 또는 심볼별 가격 딕셔너리
+            margin_ratio: 유지 마진 비율
+
+        Returns:
+            list: position_id, current_price, liquidation_price, distance_pct 키를 가진 항목 목록
+        """
+        if margin_ratio != self._liquidation_ratio:
+            self._liquidation_cache = {}
+            self._liquidation_ratio = margin_ratio
+
+        warnings = []
+        for key, book in self._books.items():
+            price = self._price_for(prices, key[0])
+            if price is None:
+                continue
+            levels = self._liquidation_cache.get(key)
+            if levels is None:
+                levels = self._liquidation_cache[key] = sorted(
+                    (book.sign * self._liquidation_price(self._by_seq[seq], margin_ratio), seq)
+                    for _, seq in book.stop_loss)
+
+            # 부호 청산가가 부호 가격*(1 - 경고비율)보다 크면 근접 (꼬리 구간)
+            signed_price = book.sign * price
+            threshold = signed_price * (1.0 - book.sign * self.liquidation_warning_pct / 100)
+            start = bisect.bisect_left(levels, (threshold, -1))
+            for signed_liq, seq in levels[start:]:
+                state = self._by_seq[seq]
+                liquidation = book.sign * signed_liq
+                distance_pct = book.sign * (price - liquidation) / price * 100
+                if distance_pct < self.liquidation_warning_pct:
+                    warnings.append({
+                        'position_id': state.position_id,
+                        'current_price': price,
+                        'liquidation_price': liquidation,
+                        'distance_pct': distance_pct,
+                    })
+        return warnings
+
+    # ------------------------------------------------------------------
+    # 내부 구현
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _price_for(prices: Union[float, Dict[str, float]], symbol: str) -> Optional[float]:
+        """심볼 가격 조회 (없거나 유효하지 않으면 None)"""
+        price = prices.get(symbol) if isinstance(prices, dict) else prices
+        if price is None:
+            return None
+        price = float(price)
+        if not math.isfinite(price) or price <= 0:
+            return None
+        return price
+
+    def _liquidation_price(self, state: _PositionState, margin_ratio: float) -> float:
+        """선물 청산 가격"""
+        return float(liquidation_prices(state.entry, state.sign, state.leverage, margin_ratio))
+
+    def _activation_key(self, state: _PositionState) -> Tuple[float, int]:
+        activation = state.entry * (1.0 + state.sign * self.trailing_activation_pct)
+        return (-state.sign * activation, state.seq)
+
+    def _partial_keys(self, state: _PositionState) -> List[Tuple[float, int, int]]:
+        return [(state.sign * state.entry + state.entry * level, state.seq, j)
+                for j, level in enumerate(self.tp_levels) if j not in state.tp_executed]
+
+    def _book(self, state: _PositionState) -> _SideBook:
+        key = (state.symbol, state.sign)
+        book = self._books.get(key)
+        if book is None:
+            book = self._books[key] = _SideBook(state.sign)
+        return book
+
+    def _add(self, position_id: Any, position: Dict[str, Any], sign: int, entry: float):
+        """새 포지션을 모든 정렬 리스트에 삽입"""
+        state = _PositionState(self._next_seq, position_id, position, sign, entry)
+        self._next_seq += 1
+        state.sl_price = float(stop_loss_prices(entry, sign, self.sl_pct))
+        state.tp_price = float(take_profit_prices(entry, sign, self.tp_pct))
+        self._states[position_id] = state
+        self._by_seq[state.seq] = state
+
+        book = self._book(state)
+        bisect.insort(book.stop_loss, (sign * state.sl_price, state.seq))
+        bisect.insort(book.take_profit, (sign * state.tp_price, state.seq))
+        for key in self._partial_keys(state):
+            bisect.insort(book.partial, key)
+        bisect.insort(book.activation, self._activation_key(state))
+        self._liquidation_cache.pop((state.symbol, sign), None)
+
+    def _remove(self, state: _PositionState):
+        """포지션을 모든 정렬 리스트에서 제거"""
+        key = (state.symbol, state.sign)
+        book = self._books[key]
+        _remove_sorted(book.stop_loss, (state.sign * state.sl_price, state.seq))
+        _remove_sorted(book.take_profit, (state.sign * state.tp_price, state.seq))
+        for partial_key in self._partial_keys(state):
+            _remove_sorted(book.partial, partial_key)
+        if state.trailing_active:
+            book.remove_trailing(state.sign * state.high_water, state.seq)
+        else:
+            _remove_sorted(book.activation, self._activation_key(state))
+        if not len(book):
+            del self._books[key]
+        self._liquidation_cache.pop(key, None)
+        del self._states[state.position_id]
+        del self._by_seq[state.seq]
+
+    def _rebuild(self, parts: Set[str]):
+        """설정 변경으로 영향받는 정렬 리스트 재생성"""
+        for book in self._books.values():
+            states = [self._by_seq[seq] for _, seq in book.stop_loss]
+            if 'stop_loss' in parts:
+                for state in states:
+                    state.sl_price = float(stop_loss_prices(state.entry, state.sign, self.sl_pct))
+                book.stop_loss = sorted((s.sign * s.sl_price, s.seq) for s in states)
+            if 'take_profit' in parts:
+                for state in states:
+                    state.tp_price = float(take_profit_prices(state.entry, state.sign, self.tp_pct))
+                book.take_profit = sorted((s.sign * s.tp_price, s.seq) for s in states)
+            if 'partial' in parts:
+                book.partial = sorted(key for s in states for key in self._partial_keys(s))
+            if 'activation' in parts:
+                book.activation = sorted(self._activation_key(s) for s in states if not s.trailing_active)
+
+    def _evaluate_book(self, book: _SideBook, price: float) -> List[Dict[str, Any]]:
+        """한 심볼/방향의 트리거를 현재 가격으로 평가"""
+        sign = book.sign
+        signed_price = sign * price
+        signals = []
+        fired = set()
+
+        # 손절매: 부호 손절가 >= 부호 가격 인 꼬리 구간
+        start = bisect.bisect_left(book.stop_loss, (signed_price, -1))
+        for signed_sl, seq in book.stop_loss[start:]:
+            state = self._by_seq[seq]
+            direction = '이하로 하락' if sign > 0 else '이상으로 상승'
+            signals.append(self._signal(state, price, EXIT_STOP_LOSS,
+                                        f'현재 가격({price})이 손절매 가격({state.sl_price}) {direction}', 1.0))
+            fired.add(seq)
+
+        if self.trailing_enabled:
+            signals.extend(self._evaluate_trailing(book, price, signed_price, fired))
+
+        if self.partial_tp_enabled and self.tp_levels:
+            # 부분 이익실현: 도달한 미실행 단계(앞 구간) 중 포지션별 가장 높은 단계 하나
+            end = bisect.bisect_right(book.partial, (signed_price, _INF))
+            highest: Dict[int, Tuple[float, int, int]] = {}
+            for key in book.partial[:end]:
+                seq = key[1]
+                if seq not in fired and (seq not in highest or key[2] > highest[seq][2]):
+                    highest[seq] = key
+            for seq in sorted(highest):
+                key = highest[seq]
+                _remove_sorted(book.partial, key)
+                state = self._by_seq[seq]
+                state.tp_executed.add(key[2])
+                profit = sign * (price - state.entry) / state.entry
+                target = self.tp_levels[key[2]]
+                signals.append(self._signal(state, price, EXIT_PARTIAL_TP,
+                                            f"부분 이익실현: 현재 수익률({profit:.2%})이 목표 수준({target:.2%})에 도달",
+                                            self.tp_percentages[key[2]]))
+        else:
+            # 이익실현: 부호 이익실현가 <= 부호 가격 인 앞 구간
+            end = bisect.bisect_right(book.take_profit, (signed_price, _INF))
+            for signed_tp, seq in book.take_profit[:end]:
+                if seq in fired:
+                    continue
+                state = self._by_seq[seq]
+                direction = '이상으로 상승' if sign > 0 else '이하로 하락'
+                signals.append(self._signal(state, price, EXIT_TAKE_PROFIT,
+                                            f'현재 가격({price})이 이익실현 가격({state.tp_price}) {direction}', 1.0))
+        return signals
+
+    def _evaluate_trailing(self, book: _SideBook, price: float, signed_price: float,
+                           fired: Set[int]) -> List[Dict[str, Any]]:
+        """
+        트레일링 고점 갱신과 트레일링 스탑 판정
+
+        새 고점보다 낮은 버킷은 모두 같은 고점(현재 가격)이 되므로 리스트 끝에서 꺼내
+        하나로 합치고, 활성화 가격에 도달한 포지션은 현재 가격 버킷에 바로 합류합니다
+        (활성화 전 고점은 항상 활성화 가격보다 낮으므로 활성화 시점 고점은 현재 가격).
+        """
+        merged: Optional[Set[int]] = None
+        while book.trail_keys and -book.trail_keys[-1] < signed_price:
+            bucket = book.trail_buckets.pop(-book.trail_keys.pop())
+            if merged is None or len(bucket) > len(merged):
+                bucket, merged = merged, bucket
+            if bucket:
+                merged |= bucket
+
+        skipped = []
+        while book.activation and -book.activation[-1][0] <= signed_price:
+            key = book.activation.pop()
+            if key[1] in fired:
+                skipped.append(key)
+                continue
+            self._by_seq[key[1]].trailing_active = True
+            if merged is None:
+                merged = set()
+            merged.add(key[1])
+        for key in skipped:
+            bisect.insort(book.activation, key)
+
+        if merged:
+            for seq in merged:
+                self._by_seq[seq].high_water = price
+            existing = book.trail_buckets.get(signed_price)
+            if existing is None:
+                book.trail_keys.append(-signed_price)
+                book.trail_buckets[signed_price] = merged
+            else:
+                existing |= merged
+
+        # 발동: 부호 트레일링 스탑(부호 고점 * 간격 계수) >= 부호 가격 인 앞 구간
+        factor = 1.0 - book.sign * self.trailing_pct
+        signals = []
+        for neg_high in book.trail_keys:
+            signed_stop = -neg_high * factor
+            if signed_price > signed_stop:
+                break
+            stop = book.sign * signed_stop
+            direction = '이하로 하락' if book.sign > 0 else '이상으로 상승'
+            for seq in sorted(book.trail_buckets[-neg_high]):
+                if seq in fired:
+                    continue
+                fired.add(seq)
+                signals.append(self._signal(self._by_seq[seq], price, EXIT_TRAILING_STOP,
+                                            f'현재 가격({price})이 트레일링 스탑 가격({stop:.2f}) {direction}', 1.0))
+        return signals
+
+    @staticmethod
+    def _signal(state: _PositionState, price: float, exit_type: str, reason: str,
+                fraction: float) -> Dict[str, Any]:
+        return {
+            'position': state.position,
+            'position_id': state.position_id,
+            'current_price': price,
+            'exit_type': exit_type,
+            'exit_reason': reason,
+            'exit_percentage': float(fraction),
+        }
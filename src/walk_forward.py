@@ -0,0 +1,341 @@
+"""
+워크포워드 최적화 모듈 - 암호화폐 자동매매 봇
+
+데이터를 학습(in-sample)/검증(out-of-sample) 구간으로 나누어 학습 구간마다
+파라미터를 최적화하고, 선택된 파라미터를 바로 다음 검증 구간에 적용하여
+검증 구간 자산 곡선을 이어 붙입니다.
+
+- 구간 방식: rolling(고정 길이 학습 구간 이동) 또는 anchored(학습 시작점 고정)
+- 파라미터 조합마다 전체 기간의 신호를 한 번만 계산하고 모든 구간이 잘라서
+  재사용합니다 (겹치는 구간의 지표 재계산 없음)
+- 파라미터 조합별 계산은 프로세스 풀로 병렬 실행합니다
+- 구간별 손익 계산은 Backtester.run_backtest 와 같은 포지션 상태 전이 커널
+  (롱 전용, 전액 진입, 진입/청산 수수료)로 수행합니다
+"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.kernels import position_state_machine
+from src.logging_config import get_logger
+
+logger = get_logger('crypto_bot.walk_forward')
+
+# 샤프 비율 계산 시 무위험 수익률 (BacktestResult.calculate_metrics 와 동일)
+RISK_FREE_RATE = 0.02
+
+
+def generate_windows(n_bars: int, train_bars: int, test_bars: int,
+                     anchored: bool = False) -> List[Tuple[int, int, int, int]]:
+    """
+    학습/검증 구간 생성
+
+    검증 구간은 서로 겹치지 않고 연속되며, 각 학습 구간은 검증 구간 직전에서 끝납니다.
+
+    Args:
+        n_bars: 전체 캔들 수
+        train_bars: 학습 구간 캔들 수 (anchored이면 첫 학습 구간 길이)
+        test_bars: 검증 구간 캔들 수
+        anchored: True이면 학습 구간 시작을 데이터 처음으로 고정
+
+    Returns:
+        list: (학습 시작, 학습 끝, 검증 시작, 검증 끝) 위치 목록 (끝은 미포함)
+    """
+    if train_bars <= 0 or test_bars <= 0:
+        raise ValueError(f"학습/검증 구간 길이는 양수여야 합니다: train={train_bars}, test={test_bars}")
+    if train_bars + test_bars > n_bars:
+        raise ValueError(f"데이터가 부족합니다: {n_bars}개 캔들 < 학습 {train_bars} + 검증 {test_bars}")
+
+    windows = []
+    test_start = train_bars
+    while test_start + test_bars <= n_bars:
+        train_start = 0 if anchored else test_start - train_bars
+        windows.append((train_start, test_start, test_start, test_start + test_bars))
+        test_start += test_bars
+    return windows
+
+
+def simulate_equity(close: np.ndarray, position_change: np.ndarray, initial_balance: float,
+                    commission: float = 0.001, leverage: float = 1,
+                    close_at_end: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    포지션 변화 신호로 자산 곡선 계산 (Backtester.run_backtest 의 매매 규칙)
+
+    포지션 상태 전이는 run_backtest 와 같은 kernels.position_state_machine 으로 계산합니다.
+    구간으로 잘라 호출하므로 구간 첫 캔들의 신호도 유효하게 처리합니다.
+
+    Args:
+        close: 종가 배열
+        position_change: 포지션 변화 배열 (>0 매수, <0 매도)
+        initial_balance: 초기 자산
+        commission: 수수료율
+        leverage: 레버리지 (현물은 1)
+        close_at_end: True이면 마지막 캔들에서 열린 포지션 청산
+
+    Returns:
+        tuple: (캔들별 총 자산 배열, 청산된 거래별 수익률(%) 배열)
+    """
+    close = np.asarray(close, dtype=np.float64)
+    n = len(close)
+    if n == 0:
+        return np.full(0, float(initial_balance)), np.empty(0)
+
+    position_change = np.asarray(position_change, dtype=np.float64)
+    if close_at_end:
+        position_change = position_change.copy()
+        position_change[-1] = -1.0
+    # 상태 전이 커널은 두 번째 캔들부터 신호를 처리하므로 앞에 신호 없는 캔들을 하나 붙임
+    state = position_state_machine(np.concatenate((close[:1], close)), np.concatenate(([0.0], position_change)),
+                                   initial_balance, commission, leverage)
+    # 거래별 수익률은 run_backtest 의 profit_percent 와 같은 진입 전 자산 대비 손익
+    return state['equity'][1:], state['trade_returns']
+
+
+def equity_metrics(equity: np.ndarray, index: pd.DatetimeIndex,
+                   trade_returns: Optional[np.ndarray] = None) -> Dict[str, float]:
+    """
+    자산 곡선 성과 지표 (BacktestResult.calculate_metrics 와 같은 계산식)
+
+    Args:
+        equity: 총 자산 배열
+        index: 캔들 시각 인덱스
+        trade_returns: 거래별 수익률(%) 배열
+
+    Returns:
+        dict: percent_return, annual_return, volatility, max_drawdown, sharpe_ratio,
+              calmar_ratio, total_trades, win_rate
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    metrics = {'percent_return': 0.0, 'annual_return': 0.0, 'volatility': 0.0, 'max_drawdown': 0.0,
+               'sharpe_ratio': 0.0, 'calmar_ratio': 0.0, 'total_trades': 0, 'win_rate': 0.0}
+    if len(equity) == 0 or equity[0] <= 0:
+        return metrics
+
+    metrics['final_balance'] = float(equity[-1])
+    metrics['percent_return'] = (equity[-1] / equity[0] - 1) * 100
+    days = (index[-1] - index[0]).days if len(index) > 1 else 0
+    if days > 0:
+        metrics['annual_return'] = ((1 + metrics['percent_return'] / 100) ** (365 / days) - 1) * 100
+
+    if len(equity) > 2:
+        returns = equity[1:] / equity[:-1] - 1
+        metrics['volatility'] = float(np.std(returns, ddof=1) * (252 ** 0.5) * 100)
+        peak = np.maximum.accumulate(equity)
+        metrics['max_drawdown'] = float(((peak - equity) / peak).max() * 100)
+        if metrics['volatility'] > 0:
+            metrics['sharpe_ratio'] = (metrics['annual_return'] - RISK_FREE_RATE) / metrics['volatility']
+        if metrics['max_drawdown'] > 0:
+            metrics['calmar_ratio'] = metrics['annual_return'] / metrics['max_drawdown']
+
+    if trade_returns is not None and len(trade_returns):
+        metrics['total_trades'] = int(len(trade_returns))
+        metrics['win_rate'] = float((trade_returns > 0).mean() * 100)
+    return metrics
+
+
+def _to_bars(size: Union[int, str, pd.Timedelta], index: pd.DatetimeIndex) -> int:
+    """구간 길이(캔들 수 또는 '90D' 같은 기간)를 캔들 수로 변환"""
+    if isinstance(size, (int, np.integer)):
+        return int(size)
+    duration = pd.Timedelta(size)
+    bar = pd.Series(index).diff().median()
+    if pd.isna(bar) or bar <= pd.Timedelta(0):
+        raise ValueError("캔들 간격을 알 수 없어 기간을 캔들 수로 변환할 수 없습니다")
+    return int(duration / bar)
+
+
+# 작업 프로세스 공유 데이터 (프로세스마다 한 번만 전달)
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(strategy_class, df: pd.DataFrame, windows, initial_balance, commission, leverage, metric):
+    _worker_state.update(strategy_class=strategy_class, df=df, close=df['close'].to_numpy(np.float64),
+                         windows=windows, initial_balance=initial_balance, commission=commission,
+                         leverage=leverage, metric=metric)
+
+
+def _evaluate_params(params: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    파라미터 조합 하나를 전체 기간에 대해 신호 계산 후 모든 학습 구간 점수 산출
+
+    Returns:
+        tuple: (학습 구간별 점수 배열, 전체 기간 포지션 변화 배열(int8))
+    """
+    state = _worker_state
+    df = state['df']
+    strategy = state['strategy_class'](**params)
+    signals = strategy.generate_signals(df)
+    if hasattr(strategy, 'calculate_positions'):
+        signals = strategy.calculate_positions(signals)
+    position_change = np.sign(np.nan_to_num(signals['position'].to_numpy(np.float64))).astype(np.int8)
+
+    close = state['close']
+    scores = np.full(len(state['windows']), -np.inf)
+    for w, (train_start, train_end, _, _) in enumerate(state['windows']):
+        equity, trade_returns = simulate_equity(
+            close[train_start:train_end], position_change[train_start:train_end],
+            state['initial_balance'], state['commission'], state['leverage'])
+        score = equity_metrics(equity, df.index[train_start:train_end], trade_returns).get(state['metric'], 0.0)
+        if np.isfinite(score):
+            scores[w] = score
+    return scores, position_change
+
+
+class WalkForwardResult:
+    """워크포워드 최적화 결과"""
+
+    def __init__(self, strategy_name: str, windows: List[Dict[str, Any]], equity: pd.Series,
+                 metrics: Dict[str, float], initial_balance: float):
+        self.strategy_name = strategy_name
+        self.windows = windows
+        self.equity = equity
+        self.metrics = metrics
+        self.initial_balance = initial_balance
+
+    @property
+    def equity_curve(self) -> pd.DataFrame:
+        """검증 구간을 이어 붙인 자산 곡선 (BacktestResult.equity_curve 와 같은 열 이름)"""
+        df = pd.DataFrame({'total_balance': self.equity})
+        df['equity_curve'] = df['total_balance'] / self.initial_balance - 1
+        return df
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """구간별 선택 파라미터와 학습/검증 성과 표"""
+        rows = []
+        for window in self.windows:
+            row = {k: v for k, v in window.items() if k not in ('params', 'test_metrics')}
+            row.update({f'param_{k}': v for k, v in window['params'].items()})
+            row.update({f'test_{k}': v for k, v in window['test_metrics'].items()})
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+
+class WalkForwardOptimizer:
+    """워크포워드 최적화 엔진"""
+
+    def __init__(self, strategy_class, param_grid: Dict[str, List[Any]],
+                 train_size: Union[int, str], test_size: Union[int, str], anchored: bool = False,
+                 metric: str = 'sharpe_ratio', initial_balance: float = 10000, commission: float = 0.001,
+                 leverage: float = 1, max_workers: Optional[int] = None):
+        """
+        워크포워드 최적화 엔진 초기화
+
+        Args:
+            strategy_class: 전략 클래스 (generate_signals(df) 가 'position' 열을 반환)
+            param_grid: 파라미터 그리드
+            train_size: 학습 구간 길이 (캔들 수 또는 '180D' 같은 기간)
+            test_size: 검증 구간 길이 (캔들 수 또는 기간)
+            anchored: True이면 학습 구간 시작을 데이터 처음으로 고정
+            metric: 최대화할 성과 지표 이름
+            initial_balance: 초기 자산
+            commission: 수수료율
+            leverage: 레버리지 (선물 거래)
+            max_workers: 병렬 프로세스 수 (None이면 CPU 코어 수, 1이면 현재 프로세스에서 실행)
+        """
+        self.strategy_class = strategy_class
+        self.param_grid = param_grid
+        self.train_size = train_size
+        self.test_size = test_size
+        self.anchored = anchored
+        self.metric = metric
+        self.initial_balance = initial_balance
+        self.commission = commission
+        self.leverage = leverage
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def param_combinations(self) -> List[Dict[str, Any]]:
+        """파라미터 그리드의 모든 조합"""
+        names = list(self.param_grid.keys())
+        return [dict(zip(names, values)) for values in itertools.product(*self.param_grid.values())]
+
+    def _evaluate_all(self, df: pd.DataFrame, windows, combos) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """모든 파라미터 조합 평가 (가능하면 병렬)"""
+        initargs = (self.strategy_class, df, windows, self.initial_balance, self.commission,
+                    self.leverage, self.metric)
+        workers = min(self.max_workers, len(combos))
+        if workers <= 1:
+            _init_worker(*initargs)
+            try:
+                return [_evaluate_params(params) for params in combos]
+            finally:
+                _worker_state.clear()
+
+        chunksize = max(1, len(combos) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as executor:
+            return list(executor.map(_evaluate_params, combos, chunksize=chunksize))
+
+    def run(self, df: pd.DataFrame) -> Optional[WalkForwardResult]:
+        """
+        워크포워드 최적화 실행
+
+        Args:
+            df: OHLCV 데이터 (DatetimeIndex)
+
+        Returns:
+            WalkForwardResult: 구간별 선택 파라미터와 검증 구간 자산 곡선 (실패 시 None)
+        """
+        try:
+            if df is None or df.empty:
+                logger.warning("워크포워드 최적화를 실행할 데이터가 없습니다.")
+                return None
+            if not isinstance(df.index, pd.DatetimeIndex):
+                df = df.copy()
+                df.index = pd.to_datetime(df.index)
+
+            train_bars = _to_bars(self.train_size, df.index)
+            test_bars = _to_bars(self.test_size, df.index)
+            windows = generate_windows(len(df), train_bars, test_bars, self.anchored)
+            combos = self.param_combinations()
+            logger.info(f"{self.strategy_class.__name__} 워크포워드 최적화 시작: 구간 {len(windows)}개, "
+                        f"파라미터 조합 {len(combos)}개, 프로세스 {min(self.max_workers, len(combos))}개")
+
+            evaluations = self._evaluate_all(df, windows, combos)
+            scores = np.vstack([scores for scores, _ in evaluations])  # (조합, 구간)
+
+            close = df['close'].to_numpy(np.float64)
+            balance = float(self.initial_balance)
+            segments = []
+            all_trade_returns = []
+            window_records = []
+            for w, (train_start, train_end, test_start, test_end) in enumerate(windows):
+                best = int(np.argmax(scores[:, w]))
+                position_change = evaluations[best][1]
+                equity, trade_returns = simulate_equity(
+                    close[test_start:test_end], position_change[test_start:test_end],
+                    balance, self.commission, self.leverage, close_at_end=True)
+                test_index = df.index[test_start:test_end]
+                segments.append(pd.Series(equity, index=test_index))
+                all_trade_returns.append(trade_returns)
+
+                window_records.append({
+                    'window': w,
+                    'train_start': df.index[train_start],
+                    'train_end': df.index[train_end - 1],
+                    'test_start': test_index[0],
+                    'test_end': test_index[-1],
+                    'params': combos[best],
+                    'train_score': float(scores[best, w]),
+                    'test_metrics': equity_metrics(equity, test_index, trade_returns),
+                })
+                balance = float(equity[-1])
+
+            stitched = pd.concat(segments)
+            stitched_values = np.concatenate(([self.initial_balance], stitched.to_numpy()))
+            stitched_index = df.index[windows[0][2]:windows[-1][3]]
+            metrics = equity_metrics(stitched_values, stitched_index.insert(0, stitched_index[0]),
+                                     np.concatenate(all_trade_returns))
+            metrics['windows'] = len(windows)
+
+            logger.info(f"워크포워드 최적화 완료: 검증 구간 수익률 {metrics['percent_return']:.2f}%, "
+                        f"샤프 비율 {metrics['sharpe_ratio']:.4f}")
+            return WalkForwardResult(self.strategy_class.__name__, window_records, stitched,
+                                     metrics, self.initial_balance)
+
+        except Exception as e:
+            logger.error(f"워크포워드 최적화 중 오류 발생: {e}")
+            return None
@@ -16,6 +16,7 @@ from typing import Dict, Any, Optional, List, Tuple, Callable
 
 from src.logging_config import get_logger
 from src.config import DATA_DIR
+from src.scheduler import get_scheduler
 
 class HeartbeatMonitor:
     """
@@ -37,7 +38,7 @@ class HeartbeatMonitor:
         self.heartbeat_interval = heartbeat_interval
         self.max_missed_beats = max_missed_beats
         self.monitoring = False
-        self.monitor_thread = None
+        self.monitor_job = None
         
         # 심박 파일 경로
         self.heartbeat_dir = os.path.join(DATA_DIR, 'system_health')
@@ -141,9 +142,7 @@ class HeartbeatMonitor:
             return
         
         self.monitoring = True
-        self.monitor_thread = threading.Thread(target=self._monitoring_loop)
-        self.monitor_thread.daemon = True
-        self.monitor_thread.start()
+        self.monitor_job = get_scheduler().add_job('heartbeat_monitor.check', self._check_beat, self.heartbeat_interval)
         
         self.logger.info(f"심박 모니터링 시작 (간격: {self.heartbeat_interval}초)")
     
@@ -153,36 +152,33 @@ class HeartbeatMonitor:
             return
         
         self.monitoring = False
-        if self.monitor_thread and self.monitor_thread.is_alive():
-            self.monitor_thread.join(timeout=2.0)
+        if self.monitor_job:
+            self.monitor_job.cancel(wait=2.0)
+            self.monitor_job = None
         
         self.logger.info("심박 모니터링 중지")
     
-    def _monitoring_loop(self):
-        """심박 모니터링 메인 루프"""
-        while self.monitoring:
-            try:
-                is_valid, timestamp = self.check_heartbeat()
+    def _check_beat(self):
+        """심박 확인 (공용 스케줄러에서 주기 실행)"""
+        try:
+            is_valid, timestamp = self.check_heartbeat()
+            
+            if is_valid:
+                # 정상 심박 감지
+                self.missed_beats = 0
+                self.last_heartbeat_time = timestamp
+            else:
+                # 심박 누락
+                self.missed_beats += 1
+                self.logger.warning(f"심박 누락 감지 ({self.missed_beats}/{self.max_missed_beats})")
                 
-                if is_valid:
-                    # 정상 심박 감지
+                if self.missed_beats >= self.max_missed_beats:
+                    self.logger.critical(f"연속 {self.missed_beats}회 심박 누락. 복구 조치 필요.")
+                    # 여기서 복구 조치를 호출할 예정 (다음 단계에서 구현)
                     self.missed_beats = 0
-                    self.last_heartbeat_time = timestamp
-                else:
-                    # 심박 누락
-                    self.missed_beats += 1
-                    self.logger.warning(f"심박 누락 감지 ({self.missed_beats}/{self.max_missed_beats})")
-                    
-                    if self.missed_beats >= self.max_missed_beats:
-                        self.logger.critical(f"연속 {self.missed_beats}회 심박 누락. 복구 조치 필요.")
-                        # 여기서 복구 조치를 호출할 예정 (다음 단계에서 구현)
-                        self.missed_beats = 0
-            
-            except Exception as e:
-                self.logger.error(f"모니터링 루프 오류: {e}")
-            
-            # 다음 확인까지 대기
-            time.sleep(self.heartbeat_interval)
+        
+        except Exception as e:
+            self.logger.error(f"모니터링 루프 오류: {e}")
 
 # 테스트 코드
 if __name__ == "__main__":
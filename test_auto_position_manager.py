@@ -24,7 +24,7 @@ def test_auto_position_manager():
             'set_auto_sl_tp',
             'set_sl_tp_percentages',
             'set_partial_tp',
-            '_check_position_exit_conditions',
+            '_sync_exit_evaluator',
             '_execute_position_exit',
             '_check_margin_safety',
             '_handle_margin_safety_actions'
@@ -39,7 +39,7 @@ def test_auto_position_manager():
         # 자동 손절매/이익실현 기능 구현 완료 여부 확인
         sl_tp_implemented = all(method in methods for method in [
             'set_auto_sl_tp',
-            '_check_position_exit_conditions',
+            '_sync_exit_evaluator',
             '_execute_position_exit'
         ])
         print(f"자동 손절매/이익실현 기능 구현됨: {sl_tp_implemented}")
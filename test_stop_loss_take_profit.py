@@ -190,12 +190,14 @@ def test_auto_position_manager_integration():
         position = positions[0]
         print(f"\n포지션 {position['id']} 확인 중...")
         
-        # _check_position_exit_conditions 메서드 직접 호출
-        exit_needed, exit_type, exit_params = auto_manager._check_position_exit_conditions(position)
+        # 청산 평가기로 현재 가격에서의 종료 조건 확인
+        auto_manager._sync_exit_evaluator()
+        auto_manager.exit_evaluator.sync([position])
+        signals = auto_manager.exit_evaluator.evaluate(trading_algo.get_current_price())
         
-        if exit_needed:
-            print(f"\n⚠️ Exit 조건 충족! 타입: {exit_type}")
-            print(f"Exit 파라미터: {exit_params}")
+        if signals:
+            print(f"\n⚠️ Exit 조건 충족! 타입: {signals[0]['exit_type']}")
+            print(f"Exit 파라미터: {signals[0]['exit_reason']}, 비율: {signals[0]['exit_percentage']:.1%}")
         else:
             print("\n✅ 현재 Exit 조건 없음")
     else:
@@ -121,8 +121,8 @@ class TestNetworkRecovery(unittest.TestCase):
         
         # 모니터링 스레드 확인
         self.assertTrue(self.network_recovery.monitoring, "모니터링이 활성화되어야 합니다")
-        self.assertIsNotNone(self.network_recovery.monitor_thread, "모니터링 스레드가 생성되어야 합니다")
-        self.assertTrue(self.network_recovery.monitor_thread.is_alive(), "모니터링 스레드가 실행 중이어야 합니다")
+        self.assertIsNotNone(self.network_recovery.monitor_job, "모니터링 작업이 등록되어야 합니다")
+        self.assertFalse(self.network_recovery.monitor_job.cancelled, "모니터링 작업이 예약 상태여야 합니다")
         
         logger.info("모니터링 스레드 동작 확인")
         
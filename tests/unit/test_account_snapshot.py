@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 계정 스냅샷 서비스 단위 테스트
+
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src import account_snapshot
+from src.account_snapshot import AccountSnapshotService, ACCOUNT_SPOT, ACCOUNT_FUTURE, get_account_snapshot_service
+from src.db_manager import DatabaseManager
+from src.event_manager import EventType, EventManager
+
+
+class FakeExchange:
+    """포지션/잔고를 고정 값으로 돌려주는 테스트용 거래소"""
+
+    def __init__(self, market_type='futures'):
+        self.exchange_id = 'fake'
+        self.market_type = market_type
+        self.positions = []
+        self.balances = {
+            ACCOUNT_SPOT: {'total': {'USDT': 100.0}, 'free': {'USDT': 100.0}},
+            ACCOUNT_FUTURE: {'total': {'USDT': 500.0}, 'free': {'USDT': 400.0},
+                             'info': {'totalWalletBalance': '500', 'totalMaintMargin': '5'}},
+        }
+        self.calls = 0
+        self.delay = 0
+
+    def get_balance(self, balance_type=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.balances[balance_type]
+
+    def get_positions(self):
+        return [dict(p) for p in self.positions]
+
+
+def _raw_position(symbol, side, contracts, mark_price=100.0):
+    return {'symbol': symbol, 'side': side, 'contracts': contracts, 'notional': contracts * mark_price,
+            'entryPrice': 100.0, 'markPrice': mark_price, 'liquidationPrice': 50.0,
+            'unrealizedPnl': (mark_price - 100.0) * contracts, 'marginMode': 'cross', 'leverage': 5}
+
+
+class TestAccountSnapshotService(unittest.TestCase):
+    """계정 스냅샷 서비스 테스트"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db = DatabaseManager(db_path=os.path.join(self.temp_dir, 'test.db'))
+        self.exchange = FakeExchange()
+        self.events = EventManager()
+        self.published = []
+        for event_type in (EventType.POSITION_UPDATED, EventType.BALANCE_CHANGED):
+            self.events.subscribe(event_type, lambda data: self.published.append(data['event_type']))
+        self.service = AccountSnapshotService(self.exchange, self.db, self.events,
+                                              accounts=[ACCOUNT_SPOT, ACCOUNT_FUTURE], min_refresh_interval=0)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_only_changed_rows_are_persisted(self):
+        """변경된 포지션/잔고 행만 DB에 기록하고 변경 시에만 버전 증가"""
+        self.exchange.positions = [_raw_position('BTC/USDT', 'long', 1.0),
+                                   _raw_position('ETH/USDT', 'short', 2.0),
+                                   dict(_raw_position('SOL/USDT', 'long', 0))]
+        first = self.service.refresh()
+        self.assertEqual(len(first['positions']), 2)
+        self.assertEqual(self.service.get_stats()['position_writes'], 2)
+        self.assertEqual(self.service.get_stats()['balance_writes'], 2)
+
+        # 변경 없음 → 기록/버전/이벤트 없음
+        published = len(self.published)
+        second = self.service.refresh()
+        self.assertEqual(second['version'], first['version'])
+        self.assertEqual(self.service.get_stats()['position_writes'], 2)
+        self.assertEqual(len(self.published), published)
+
+        # BTC 수량 변경, ETH 청산, 선물 잔고 변경
+        self.exchange.positions = [_raw_position('BTC/USDT', 'long', 1.5, mark_price=110.0)]
+        self.exchange.balances[ACCOUNT_FUTURE] = {'total': {'USDT': 510.0}, 'free': {'USDT': 410.0}}
+        third = self.service.refresh()
+        self.assertGreater(third['version'], second['version'])
+        stats = self.service.get_stats()
+        self.assertEqual(stats['position_writes'], 4)
+        self.assertEqual(stats['balance_writes'], 3)
+
+        open_positions = self.db.get_open_positions()
+        self.assertEqual([(p['symbol'], p['contracts'], p['mark_price']) for p in open_positions],
+                         [('BTC/USDT', 1.5, 110.0)])
+        self.assertEqual(self.db.load_balance_rows()[(ACCOUNT_FUTURE, 'USDT')], (510.0, 410.0))
+
+    def test_price_moves_do_not_rewrite_positions(self):
+        """평가 가격/손익만 바뀌면 DB를 다시 쓰지 않고, 수량이 바뀌어도 진입 시각은 유지"""
+        self.exchange.positions = [_raw_position('BTC/USDT', 'long', 1.0)]
+        self.service.refresh()
+        opened_at = self.db.get_open_positions()[0]['opened_at']
+
+        self.exchange.positions = [_raw_position('BTC/USDT', 'long', 1.0, mark_price=120.0)]
+        self.service.refresh()
+        self.assertEqual(self.service.get_stats()['position_writes'], 1)
+        self.assertEqual(self.service.get_positions()[0]['mark_price'], 120.0)
+
+        time.sleep(0.01)
+        self.exchange.positions = [_raw_position('BTC/USDT', 'long', 2.0, mark_price=120.0)]
+        self.service.refresh()
+        row = self.db.get_open_positions()[0]
+        self.assertEqual(self.service.get_stats()['position_writes'], 2)
+        self.assertEqual((row['contracts'], row['opened_at']), (2.0, opened_at))
+
+    def test_baseline_is_loaded_from_db(self):
+        """새 서비스 인스턴스는 DB 상태를 기준으로 비교하여 재기록하지 않음"""
+        self.exchange.positions = [_raw_position('BTC/USDT', 'long', 1.0)]
+        self.service.refresh()
+
+        restarted = AccountSnapshotService(self.exchange, self.db, self.events,
+                                           accounts=[ACCOUNT_SPOT, ACCOUNT_FUTURE], min_refresh_interval=0)
+        restarted.refresh()
+        stats = restarted.get_stats()
+        self.assertEqual((stats['position_writes'], stats['balance_writes']), (0, 0))
+
+    def test_concurrent_refreshes_are_coalesced(self):
+        """동시에 들어온 조회 요청은 한 번의 거래소 호출로 처리"""
+        self.exchange.delay = 0.05
+        threads = [threading.Thread(target=self.service.refresh) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.exchange.calls, 2)  # 현물 + 선물 1회씩
+        self.assertEqual(self.service.get_stats()['coalesced'], 4)
+
+    def test_consumers_read_from_memory(self):
+        """max_age 이내의 조회는 거래소를 다시 호출하지 않음"""
+        self.service.refresh()
+        calls = self.exchange.calls
+        self.assertEqual(self.service.get_balance(ACCOUNT_SPOT, max_age=60)['total']['USDT'], 100.0)
+        self.assertEqual(self.service.get_account_info(max_age=60)['totalMaintenanceMargin'], '5')
+        summary = self.service.balance_summary()
+        self.assertEqual(summary['total_usdt'], 600.0)
+        self.assertEqual(self.exchange.calls, calls)
+
+        self.service.invalidate()
+        self.service.get_positions(max_age=60)
+        self.assertGreater(self.exchange.calls, calls)
+
+    def test_spot_exchange_skips_positions(self):
+        """현물 거래소는 포지션을 조회하지 않고 자기 계정 잔고만 조회"""
+        service = AccountSnapshotService(FakeExchange(market_type='spot'), None, self.events)
+        snapshot = service.refresh()
+        self.assertEqual(snapshot['positions'], [])
+        self.assertEqual(list(snapshot['balances']), [ACCOUNT_SPOT])
+
+    def test_registry_separates_accounts(self):
+        """API 키나 테스트넷 여부가 다르면 서로 다른 스냅샷 서비스 사용"""
+        def api(key, url):
+            exchange = FakeExchange()
+            exchange.exchange = SimpleNamespace(apiKey=key, urls={'api': url})
+            return exchange
+
+        saved = dict(account_snapshot._services)
+        try:
+            live = get_account_snapshot_service(api('key-a', 'https://live'))
+            self.assertIs(get_account_snapshot_service(api('key-a', 'https://live')), live)
+            self.assertIsNot(get_account_snapshot_service(api('key-b', 'https://live')), live)
+            self.assertIsNot(get_account_snapshot_service(api('key-a', 'https://testnet')), live)
+        finally:
+            account_snapshot._services.clear()
+            account_snapshot._services.update(saved)
+
+
+if __name__ == '__main__':
+    unittest.main()
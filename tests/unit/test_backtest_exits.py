@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 백테스트 봉 내부 청산 단위 테스트
+
+import os
+import sys
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.backtest_exits import (
+    IntrabarExitConfig, find_intrabar_exit, simulate_with_exits,
+    EXIT_LIQUIDATION, EXIT_SIGNAL, TIE_STOP_FIRST, TIE_TARGET_FIRST, TIE_NEAREST_OPEN
+)
+from src.exit_evaluator import EXIT_STOP_LOSS, EXIT_TAKE_PROFIT, EXIT_TRAILING_STOP
+from src.walk_forward import simulate_equity
+
+
+def _bars(rows):
+    """(open, high, low, close) 목록으로 캔들 데이터 생성"""
+    arr = np.array(rows, dtype=np.float64)
+    index = pd.date_range('2024-01-01', periods=len(arr), freq='h')
+    return pd.DataFrame({'open': arr[:, 0], 'high': arr[:, 1], 'low': arr[:, 2],
+                         'close': arr[:, 3], 'volume': 1.0}, index=index)
+
+
+def _exit(df, config, sign=1, leverage=1, entry_index=0, end_index=None):
+    end = len(df) - 1 if end_index is None else end_index
+    return find_intrabar_exit(df['open'].to_numpy(), df['high'].to_numpy(), df['low'].to_numpy(),
+                              df['close'].to_numpy(), entry_index, df['close'].iloc[entry_index],
+                              sign, end, config, leverage, signal_exit=end_index is not None)
+
+
+class TestIntrabarExits(unittest.TestCase):
+    """봉 내부 청산 판정 테스트"""
+
+    def test_stop_loss_and_take_profit_use_high_low(self):
+        """종가가 아닌 고가/저가로 손절/이익실현 판정"""
+        df = _bars([(100, 100, 100, 100), (100, 101, 99, 100), (100, 100.5, 94, 99), (99, 99, 99, 99)])
+        self.assertEqual(_exit(df, IntrabarExitConfig(stop_loss_pct=0.05)), (2, 95.0, EXIT_STOP_LOSS))
+        df = _bars([(100, 100, 100, 100), (100, 103, 99, 100), (100, 111, 99, 101)])
+        self.assertEqual(_exit(df, IntrabarExitConfig(take_profit_pct=0.1)), (2, 110.0, EXIT_TAKE_PROFIT))
+        # 청산 없이 데이터가 끝나면 위치 None
+        self.assertEqual(_exit(df, IntrabarExitConfig(stop_loss_pct=0.5))[0], None)
+        self.assertEqual(_exit(df, IntrabarExitConfig(stop_loss_pct=0.5), end_index=1),
+                         (1, 100.0, EXIT_SIGNAL))
+
+    def test_tie_break(self):
+        """같은 캔들에서 양쪽이 모두 닿았을 때의 처리"""
+        df = _bars([(100, 100, 100, 100), (103, 112, 90, 100)])
+        base = dict(stop_loss_pct=0.05, take_profit_pct=0.1)
+        self.assertEqual(_exit(df, IntrabarExitConfig(**base, tie_break=TIE_STOP_FIRST))[2], EXIT_STOP_LOSS)
+        self.assertEqual(_exit(df, IntrabarExitConfig(**base, tie_break=TIE_TARGET_FIRST))[2], EXIT_TAKE_PROFIT)
+        # 시가 103은 손절(95)보다 이익실현(110)에 가까움
+        self.assertEqual(_exit(df, IntrabarExitConfig(**base, tie_break=TIE_NEAREST_OPEN))[2], EXIT_TAKE_PROFIT)
+        with self.assertRaises(ValueError):
+            IntrabarExitConfig(tie_break='random')
+
+    def test_gap_fills_at_open(self):
+        """시가가 청산 가격을 넘어선 갭은 시가로 체결"""
+        df = _bars([(100, 100, 100, 100), (90, 91, 88, 89)])
+        self.assertEqual(_exit(df, IntrabarExitConfig(stop_loss_pct=0.05)), (1, 90.0, EXIT_STOP_LOSS))
+        df = _bars([(100, 100, 100, 100), (115, 116, 114, 115)])
+        self.assertEqual(_exit(df, IntrabarExitConfig(take_profit_pct=0.1)), (1, 115.0, EXIT_TAKE_PROFIT))
+
+    def test_trailing_stop_uses_previous_high(self):
+        """활성화 이후 직전 캔들까지의 고점 기준 트레일링 스탑"""
+        config = IntrabarExitConfig(trailing_activation_pct=0.05, trailing_pct=0.02)
+        df = _bars([(100, 100, 100, 100), (100, 104, 99, 103), (103, 110, 103, 109),
+                    (109, 109.5, 108, 108.5), (108, 108.5, 107, 107)])
+        index, price, exit_type = _exit(df, config)
+        self.assertEqual((index, exit_type), (4, EXIT_TRAILING_STOP))
+        self.assertAlmostEqual(price, 110 * 0.98)
+        # 여러 청크에 걸친 긴 보유 구간에서도 같은 결과
+        long_df = pd.concat([df.iloc[:2]] + [df.iloc[[1]]] * 700 + [df.iloc[2:]])
+        long_df.index = pd.date_range('2024-01-01', periods=len(long_df), freq='h')
+        self.assertEqual(_exit(long_df, config)[0], len(long_df) - 1)
+
+    def test_short_side(self):
+        """숏 포지션은 고가로 손절, 저가로 이익실현"""
+        df = _bars([(100, 100, 100, 100), (100, 106, 99, 104)])
+        self.assertEqual(_exit(df, IntrabarExitConfig(stop_loss_pct=0.05), sign=-1),
+                         (1, 105.0, EXIT_STOP_LOSS))
+        df = _bars([(100, 100, 100, 100), (100, 101, 89, 92)])
+        self.assertEqual(_exit(df, IntrabarExitConfig(take_profit_pct=0.1), sign=-1),
+                         (1, 90.0, EXIT_TAKE_PROFIT))
+
+    def test_liquidation_with_leverage(self):
+        """레버리지 포지션은 손절 전에 청산 가격에 닿으면 강제 청산, 자산 0"""
+        df = _bars([(100, 100, 100, 100), (100, 100, 100, 100), (100, 100, 88, 90), (90, 95, 90, 95)])
+        config = IntrabarExitConfig(stop_loss_pct=0.2)
+        self.assertEqual(_exit(df, config, leverage=10, entry_index=1)[2], EXIT_LIQUIDATION)
+        position_change = np.array([0, 1, 0, 0])
+        sim = simulate_with_exits(df, position_change, 1000, 0.001, 10, config)
+        self.assertEqual(sim['trades'][0]['exit_reason'], EXIT_LIQUIDATION)
+        self.assertEqual(sim['equity'][-1], 0.0)
+        self.assertEqual(len(sim['trades']), 1)
+
+
+class TestSimulateWithExits(unittest.TestCase):
+    """봉 내부 청산 백테스트 테스트"""
+
+    @staticmethod
+    def _random_df(n, seed=5):
+        rng = np.random.default_rng(seed)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.003, n)))
+        open_ = np.concatenate(([close[0]], close[:-1]))
+        spread = np.abs(rng.normal(0, 0.002, n)) * close
+        index = pd.date_range('2023-01-01', periods=n, freq='min')
+        return pd.DataFrame({'open': open_, 'high': np.maximum(open_, close) + spread,
+                             'low': np.minimum(open_, close) - spread, 'close': close,
+                             'volume': 1.0}, index=index)
+
+    @staticmethod
+    def _signals(n, seed=6):
+        rng = np.random.default_rng(seed)
+        signal = (rng.random(n) < 0.5).astype(float)
+        signal = np.repeat(signal[: n // 50 + 1], 50)[:n]
+        position_change = np.diff(signal, prepend=signal[0])
+        position_change[0] = 0
+        return position_change
+
+    def test_without_exits_matches_signal_backtest(self):
+        """청산 설정이 없으면 레버리지와 무관하게 신호 백테스트와 같은 자산 곡선과 거래별 수익률"""
+        df = self._random_df(5000)
+        position_change = self._signals(5000)
+        for leverage in (1, 5):
+            sim = simulate_with_exits(df, position_change, 10000, 0.001, leverage,
+                                      IntrabarExitConfig(liquidation=False))
+            expected, trade_returns = simulate_equity(df['close'].to_numpy(), position_change, 10000, 0.001,
+                                                      leverage)
+            np.testing.assert_allclose(sim['equity'], expected)
+            np.testing.assert_allclose([t['profit_percent'] for t in sim['trades']], trade_returns)
+            self.assertTrue(all(t['exit_reason'] == EXIT_SIGNAL for t in sim['trades']))
+            for trade in sim['trades']:
+                self.assertAlmostEqual(trade['profit'], trade['entry_balance'] * trade['profit_percent'] / 100)
+
+    def test_stop_exit_allows_reentry_on_next_signal(self):
+        """손절 이후 포지션 없이 대기하다 다음 매수 신호에 진입"""
+        df = _bars([(100, 100, 100, 100), (100, 100, 100, 100), (100, 100, 90, 92),
+                    (92, 93, 91, 92), (92, 93, 91, 93), (93, 95, 93, 95)])
+        position_change = np.array([0, 1, 0, -1, 1, 0])
+        sim = simulate_with_exits(df, position_change, 1000, 0.0, 1, IntrabarExitConfig(stop_loss_pct=0.05))
+        self.assertEqual([t['exit_reason'] for t in sim['trades']], [EXIT_STOP_LOSS])
+        self.assertAlmostEqual(sim['cash'][3], 950.0)
+        self.assertAlmostEqual(sim['equity'][-1], 950.0 * 95 / 93)
+
+    def test_large_input_is_fast(self):
+        """50만 캔들, 위험 청산 포함 백테스트를 빠르게 처리"""
+        n = 500000
+        df = self._random_df(n, seed=8)
+        position_change = self._signals(n, seed=9)
+        config = IntrabarExitConfig(stop_loss_pct=0.01, take_profit_pct=0.02,
+                                    trailing_activation_pct=0.01, trailing_pct=0.005)
+        started = time.perf_counter()
+        sim = simulate_with_exits(df, position_change, 10000, 0.0004, 5, config)
+        self.assertLess(time.perf_counter() - started, 10)
+        self.assertGreater(len(sim['trades']), 1000)
+        self.assertTrue(np.all(sim['equity'] >= 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 증분 백업 저장소 단위 테스트
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.backup_store import (
+    IncrementalBackupStore, compute_delta, apply_delta,
+    KIND_SNAPSHOT, KIND_DELTA, KIND_LEGACY, COMPRESSION_GZIP
+)
+from src.backup_manager import BackupManager
+
+
+def _state(i, positions=50):
+    """테스트용 상태 데이터 생성"""
+    return {
+        'seq': i,
+        'portfolio': {'balance': 1000.0 + i, 'currency': 'USDT'},
+        'positions': [{'id': n, 'symbol': 'BTC/USDT', 'qty': 0.01 * n} for n in range(positions)]
+    }
+
+
+class TestIncrementalBackupStore(unittest.TestCase):
+    """증분 백업 저장소 테스트"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.type_dir = os.path.join(self.tmp_dir, 'state')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _store(self, **kwargs):
+        params = dict(max_backups=24, snapshot_interval=4, compression=COMPRESSION_GZIP)
+        params.update(kwargs)
+        return IncrementalBackupStore(self.type_dir, 'state', **params)
+
+    def test_delta_roundtrip(self):
+        """변경분 계산/적용 왕복"""
+        base = {'a': 1, 'b': {'c': 2, 'd': 3}, 'e': [1, 2]}
+        target = {'a': 1, 'b': {'c': 5}, 'e': [1, 2, 3], 'f': 'new'}
+        self.assertEqual(apply_delta(base, compute_delta(base, target)), target)
+
+    def test_snapshot_then_deltas(self):
+        """첫 백업은 스냅샷, 이후 작은 변경은 변경분으로 저장"""
+        store = self._store()
+        kinds = [store.write(_state(i), {'timestamp': f'2026010{i}_000000'})['kind'] for i in range(6)]
+        self.assertEqual(kinds, [KIND_SNAPSHOT, KIND_DELTA, KIND_DELTA, KIND_DELTA, KIND_DELTA, KIND_SNAPSHOT])
+
+        for entry in store.entries():
+            data = store.read(entry['id'])
+            data.pop('_metadata')
+            self.assertEqual(data['seq'], int(entry['timestamp'][7]))
+
+    def test_identical_content_is_deduplicated(self):
+        """같은 내용은 새 파일을 만들지 않음"""
+        store = self._store()
+        first = store.write(_state(1))
+        second = store.write(_state(1))
+        self.assertEqual(first['id'], second['id'])
+        self.assertEqual(len(store.entries()), 1)
+
+    def test_manifest_latest_survives_reload(self):
+        """매니페스트로 최신 항목을 재시작 후에도 조회"""
+        store = self._store()
+        for i in range(3):
+            store.write(_state(i), {'timestamp': f'2026010{i}_000000'})
+        latest_id = store.latest_entry()['id']
+
+        reloaded = self._store()
+        self.assertEqual(reloaded.latest_entry()['id'], latest_id)
+        self.assertEqual(reloaded.read(latest_id)['seq'], 2)
+
+    def test_prune_keeps_referenced_snapshots(self):
+        """오래된 항목 정리 시 변경분이 참조하는 스냅샷은 유지"""
+        store = self._store(max_backups=5, snapshot_interval=3)
+        for i in range(20):
+            store.write(_state(i), {'timestamp': f'20260101_{i:06d}'})
+
+        entries = store.entries()
+        self.assertLessEqual(len(entries), 5)
+        ids = {e['id'] for e in entries}
+        for e in entries:
+            if e['kind'] == KIND_DELTA:
+                self.assertIn(e['base'], ids)
+            self.assertTrue(os.path.exists(store.path_of(e)))
+        files = [f for f in os.listdir(self.type_dir) if f != 'manifest.json']
+        self.assertEqual(len(files), len(entries))
+
+    def test_same_second_generations_do_not_collide(self):
+        """같은 초에 같은 내용이 다시 기록되어도 항목 ID와 파일이 겹치지 않음"""
+        store = self._store(snapshot_interval=1)
+        written = [store.write(_state(i % 2), {'timestamp': '20260101_000000'}) for i in range(3)]
+        self.assertEqual(len({e['id'] for e in written}), 3)
+        self.assertEqual([store.read(e['id'])['seq'] for e in written], [0, 1, 0])
+
+        reloaded = self._store()
+        self.assertNotIn(reloaded.write(_state(1), {'timestamp': '20260101_000000'})['id'],
+                         {e['id'] for e in written})
+
+    def test_public_prune_applies_new_limit(self):
+        """prune()은 줄어든 최대 백업 수를 적용하고 매니페스트에 반영"""
+        store = self._store(snapshot_interval=1)
+        for i in range(6):
+            store.write(_state(i), {'timestamp': f'20260101_{i:06d}'})
+        store.max_backups = 2
+        self.assertEqual(store.prune(), 4)
+        self.assertEqual(len(self._store().entries()), 2)
+
+    def test_corruption_is_detected(self):
+        """변경분 재구성 결과의 해시 불일치 감지"""
+        store = self._store()
+        store.write(_state(0), {'timestamp': '20260101_000000'})
+        entry = store.write(_state(1), {'timestamp': '20260101_000001'})
+        entry['digest'] = '0' * 64
+        with self.assertRaises(ValueError):
+            store.read(entry['id'])
+
+    def test_legacy_json_files_are_indexed(self):
+        """이전 형식 JSON 백업을 매니페스트에 색인"""
+        os.makedirs(self.type_dir)
+        with open(os.path.join(self.type_dir, 'state_20250101_000000.json'), 'w') as f:
+            json.dump({'_metadata': {'backup_type': 'state'}, 'value': 1}, f)
+
+        store = self._store()
+        latest = store.latest_entry()
+        self.assertEqual(latest['kind'], KIND_LEGACY)
+        self.assertEqual(store.read(latest['id'])['value'], 1)
+
+
+class TestBackupManagerIncremental(unittest.TestCase):
+    """백업 관리자 증분 백업 통합 테스트"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.manager = BackupManager(backup_dir=self.tmp_dir, enable_auto_backup=False,
+                                     max_backups=10, snapshot_interval=5)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_create_list_and_restore(self):
+        """백업 생성, 목록, 최신 조회, 복원"""
+        paths = [self.manager.create_backup(BackupManager.BACKUP_TYPE_STATE, _state(i)) for i in range(3)]
+        self.assertTrue(all(paths))
+
+        latest = self.manager.get_latest_backup(BackupManager.BACKUP_TYPE_STATE)
+        self.assertEqual(latest, paths[-1])
+
+        listed = self.manager.list_backups(BackupManager.BACKUP_TYPE_STATE)[BackupManager.BACKUP_TYPE_STATE]
+        self.assertEqual([b['file_path'] for b in listed], list(reversed(paths)))
+        self.assertEqual(listed[0]['kind'], KIND_DELTA)
+
+        success, result = self.manager.restore_from_backup(latest)
+        self.assertTrue(success)
+        self.assertEqual(result['backup_data']['seq'], 2)
+        self.assertEqual(result['metadata']['backup_type'], BackupManager.BACKUP_TYPE_STATE)
+
+
+if __name__ == '__main__':
+    unittest.main()
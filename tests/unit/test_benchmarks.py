@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 벤치마크 패키지 단위 테스트
+
+import copy
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from benchmarks import synthetic_ohlcv, run_benchmarks, save_results, load_results, compare_results
+from benchmarks.__main__ import main
+from benchmarks.suites import Benchmark, BenchmarkSkipped, BENCHMARKS, select_benchmarks
+from benchmarks import suites
+
+
+class TestBenchmarks(unittest.TestCase):
+    """벤치마크 패키지 테스트"""
+
+    def test_synthetic_data_is_deterministic_and_valid(self):
+        """같은 시드는 같은 데이터, OHLC 관계 유지"""
+        df = synthetic_ohlcv(5000, timeframe='5m', seed=3)
+        self.assertTrue(df.equals(synthetic_ohlcv(5000, timeframe='5m', seed=3)))
+        self.assertFalse(df.equals(synthetic_ohlcv(5000, timeframe='5m', seed=4)))
+        self.assertTrue(np.all(df['high'] >= df[['open', 'close']].max(axis=1)))
+        self.assertTrue(np.all(df['low'] <= df[['open', 'close']].min(axis=1)))
+        self.assertEqual((df.index[1] - df.index[0]).total_seconds(), 300)
+        self.assertTrue(df.index.is_monotonic_increasing)
+
+    def test_run_records_ok_skipped_and_error(self):
+        """실행 결과에 성공/건너뜀/오류가 구분되어 기록되고 최대 크기 제한 적용"""
+        def skipped(df, workdir):
+            raise BenchmarkSkipped("missing module")
+
+        def broken(df, workdir):
+            def run():
+                raise RuntimeError("boom")
+            return run
+
+        fake = [Benchmark('fake.sum', 'fake', lambda df, workdir: lambda: df['close'].sum()),
+                Benchmark('fake.skip', 'fake', skipped),
+                Benchmark('fake.error', 'fake', broken, max_size=1000)]
+        original = suites.BENCHMARKS[:]
+        suites.BENCHMARKS[:] = fake
+        try:
+            results = run_benchmarks(sizes=[1000, 2000], groups=['fake'], repeat=2)
+        finally:
+            suites.BENCHMARKS[:] = original
+        entries = results['results']
+        self.assertEqual(entries['fake.sum[1000]']['status'], 'ok')
+        self.assertEqual(len(entries['fake.sum[2000]']['times']), 2)
+        self.assertEqual(entries['fake.skip[1000]']['status'], 'skipped')
+        self.assertEqual(entries['fake.error[1000]']['status'], 'error')
+        self.assertNotIn('fake.error[2000]', entries)
+
+    def test_db_benchmarks_run(self):
+        """DB 벤치마크는 합성 거래 기록으로 실행"""
+        results = run_benchmarks(sizes=[2000], groups=['db'], repeat=1)
+        statuses = {entry['status'] for entry in results['results'].values()}
+        self.assertEqual(statuses, {'ok'})
+        self.assertEqual(len(results['results']), len(select_benchmarks(groups=['db'])))
+
+    def test_frame_compaction_reports_memory_savings(self):
+        """압축 벤치마크는 값 손실 없이 줄어든 메모리를 지표로 남기고, 메모리 증가는 regression"""
+        results = run_benchmarks(sizes=[5000], groups=['frames'], repeat=1)
+        entry = results['results']['frames.compact_ohlcv[5000]']
+        self.assertEqual(entry['status'], 'ok')
+        self.assertGreater(entry['metrics']['saved_ratio'], 0.3)
+
+        grown = copy.deepcopy(results)
+        grown['results']['frames.compact_ohlcv[5000]']['metrics']['bytes'] *= 2
+        rows = compare_results(results, grown)
+        self.assertEqual(rows[0]['status'], 'regression')
+        self.assertEqual(rows[0]['current_bytes'], entry['metrics']['bytes'] * 2)
+
+    def test_compare_flags_regressions(self):
+        """기준선 대비 느려진 항목은 regression, 잡음 수준 차이는 무시"""
+        baseline = {'version': 1, 'results': {
+            'a[10]': {'status': 'ok', 'min': 1.0}, 'b[10]': {'status': 'ok', 'min': 1.0},
+            'c[10]': {'status': 'ok', 'min': 0.0001}, 'd[10]': {'status': 'ok', 'min': 1.0}}}
+        current = copy.deepcopy(baseline)
+        current['results']['a[10]']['min'] = 1.5
+        current['results']['b[10]']['min'] = 0.5
+        current['results']['c[10]']['min'] = 0.0005
+        current['results']['e[10]'] = {'status': 'ok', 'min': 1.0}
+        statuses = {row['key']: row['status'] for row in compare_results(baseline, current, threshold=0.2)}
+        self.assertEqual(statuses, {'a[10]': 'regression', 'b[10]': 'improvement', 'c[10]': 'ok',
+                                    'd[10]': 'ok', 'e[10]': 'missing'})
+
+    def test_cli_compare_exit_code(self):
+        """compare 명령은 성능 저하가 있으면 종료 코드 1"""
+        baseline = {'version': 1, 'results': {'a[10]': {'status': 'ok', 'min': 1.0}}}
+        current = {'version': 1, 'results': {'a[10]': {'status': 'ok', 'min': 2.0}}}
+        with tempfile.TemporaryDirectory() as tmp:
+            base_path = os.path.join(tmp, 'base.json')
+            current_path = os.path.join(tmp, 'current.json')
+            save_results(baseline, base_path)
+            save_results(current, current_path)
+            self.assertEqual(load_results(base_path), baseline)
+            self.assertEqual(main(['compare', base_path, current_path]), 1)
+            self.assertEqual(main(['compare', base_path, base_path]), 0)
+
+    def test_registry_covers_requested_targets(self):
+        """지표, 전략, 백테스터, DB, 데이터프레임 그룹이 모두 등록되어 있음"""
+        groups = {benchmark.group for benchmark in BENCHMARKS}
+        self.assertEqual(groups, {'indicators', 'strategies', 'backtester', 'db', 'frames'})
+        names = {benchmark.name for benchmark in BENCHMARKS}
+        self.assertIn('backtester.run_backtest', names)
+        self.assertIn('backtester.optimize_strategy', names)
+
+
+if __name__ == '__main__':
+    unittest.main()
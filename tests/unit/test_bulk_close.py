@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 일괄 청산 결과 기록 단위 테스트
+
+import os
+import sys
+import shutil
+import logging
+import tempfile
+import unittest
+from unittest import mock
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.db_manager import DatabaseManager
+
+try:
+    from src.trading_algorithm import TradingAlgorithm
+except ImportError:  # matplotlib 등 선택 의존성이 없는 환경
+    TradingAlgorithm = None
+
+
+class TestReducePosition(unittest.TestCase):
+    """실제 DB 에 청산 수량을 반영하는 테스트"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db = DatabaseManager(db_path=os.path.join(self.temp_dir, 'test.db'))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _open(self, side='long', contracts=2.0, entry_price=100.0):
+        return self.db.save_position({'symbol': 'BTC/USDT', 'side': side, 'contracts': contracts,
+                                      'entry_price': entry_price})
+
+    def _row(self, position_id):
+        return next(p for p in self.db.get_positions() if p['id'] == position_id)
+
+    def test_partial_then_full_close(self):
+        """부분 청산은 수량만 줄이고, 남은 수량을 청산하면 종료 상태와 실현 손익 기록"""
+        position_id = self._open()
+        self.assertTrue(self.db.reduce_position(position_id, 0.5, price=110))
+        row = self._row(position_id)
+        self.assertEqual(row['status'], 'open')
+        self.assertAlmostEqual(row['contracts'], 1.5)
+
+        self.assertTrue(self.db.reduce_position(position_id, 1.5, price=90, closed_at='2024-05-01T00:00:00'))
+        row = self._row(position_id)
+        self.assertEqual(row['status'], 'closed')
+        self.assertEqual(row['closed_at'], '2024-05-01T00:00:00')
+        self.assertAlmostEqual(row['pnl'], -15)
+
+    def test_short_pnl_and_closed_position_rejected(self):
+        """숏 손익 부호가 반대이고, 이미 종료된 포지션은 반영하지 않음"""
+        position_id = self._open(side='short', contracts=1.0)
+        self.assertTrue(self.db.reduce_position(position_id, 1.0, price=80))
+        self.assertAlmostEqual(self._row(position_id)['pnl'], 20)
+        self.assertFalse(self.db.reduce_position(position_id, 1.0, price=80))
+
+
+@unittest.skipIf(TradingAlgorithm is None, "trading_algorithm 의존성이 설치되어 있지 않음")
+class TestClosePositionsBulk(unittest.TestCase):
+    """close_positions_bulk 결과가 실제 DB 포지션에 반영되는지 테스트"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db = DatabaseManager(db_path=os.path.join(self.temp_dir, 'test.db'))
+        self.algo = TradingAlgorithm.__new__(TradingAlgorithm)
+        self.algo.logger = logging.getLogger('test_bulk_close')
+        self.algo.db = self.db
+        self.algo.symbol = 'BTC/USDT'
+        self.algo.market_type = 'futures'
+        self.algo.event_manager = mock.Mock()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _positions(self):
+        long_id = self.db.save_position({'symbol': 'BTC/USDT', 'side': 'long', 'contracts': 2.0,
+                                         'entry_price': 100.0})
+        short_id = self.db.save_position({'symbol': 'ETH/USDT', 'side': 'short', 'contracts': 4.0,
+                                          'entry_price': 50.0})
+        return [p for p in self.db.get_open_positions() if p['id'] in (long_id, short_id)]
+
+    def _status(self):
+        return {p['symbol']: (p['status'], p['contracts']) for p in self.db.get_positions()}
+
+    def test_live_full_and_partial_close(self):
+        """실거래 일괄 청산: 전체 청산은 종료, 부분 청산은 남은 수량으로 갱신"""
+        self.algo.test_mode = False
+
+        def dispatch(orders, deadline=None):
+            return {'results': [{'ref': o['ref'], 'symbol': o['symbol'], 'side': o['side'], 'amount': o['amount'],
+                                 'status': 'ok', 'order': {'id': 'x', 'average': 105.0}, 'error': None}
+                                for o in orders]}
+        self.algo.order_dispatcher = mock.Mock(dispatch=dispatch)
+
+        self.algo.close_positions_bulk(self._positions(), percentage=0.5)
+        self.assertEqual(self._status(), {'BTC/USDT': ('open', 1.0), 'ETH/USDT': ('open', 2.0)})
+
+        self.algo.close_positions_bulk(self.db.get_open_positions(), percentage=1.0)
+        self.assertEqual(self._status(), {'BTC/USDT': ('closed', 1.0), 'ETH/USDT': ('closed', 2.0)})
+        published = [call.args[0].name for call in self.algo.event_manager.publish.call_args_list]
+        self.assertEqual(published, ['POSITION_UPDATED'] * 2 + ['POSITION_CLOSED'] * 2)
+
+    def test_simulated_partial_close_uses_closed_amount(self):
+        """테스트 모드 부분 청산은 매수/매도 모두 청산 수량으로 주문"""
+        self.algo.test_mode = True
+        self.algo.portfolio_manager = mock.Mock(get_portfolio_status=lambda: {'positions': []})
+        self.algo.order_executor = mock.Mock()
+        self.algo.order_executor.execute_sell.return_value = {'id': 's'}
+        self.algo.order_executor.execute_buy.return_value = {'id': 'b'}
+
+        self.algo.close_positions_bulk(self._positions(), percentage=0.25, price=100.0)
+        self.assertAlmostEqual(self.algo.order_executor.execute_sell.call_args.kwargs['quantity'], 0.5)
+        self.assertAlmostEqual(self.algo.order_executor.execute_buy.call_args.kwargs['quantity'], 1.0)
+        self.assertEqual(self._status(), {'BTC/USDT': ('open', 1.5), 'ETH/USDT': ('open', 3.0)})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 캔들 링 버퍼 단위 테스트
+
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.candle_buffer import CandleBuffer, CandleRingBuffer, get_candle_buffer
+from src.fake_exchange import FakeExchangeServer
+from utils.api import create_binance_client
+
+SYMBOL = 'BTC/USDT:USDT'
+MINUTE_MS = 60_000
+
+
+class FakeExchangeAPI:
+    """가상 거래소에 연결된 ccxt 클라이언트를 감싼 테스트용 ExchangeAPI"""
+
+    def __init__(self, url):
+        self.exchange_id = 'binance'
+        self.market_type = 'futures'
+        self.leverage = 5
+        with mock.patch.dict(os.environ, {'FAKE_EXCHANGE_URL': url}):
+            self.exchange = create_binance_client('key', 'secret', is_future=True)
+        self.exchange.load_markets()
+
+
+class TestCandleRingBuffer(unittest.TestCase):
+    """링 버퍼 테스트"""
+
+    def test_window_is_contiguous_view_after_wrap(self):
+        """한 바퀴 돈 뒤에도 최근 n 개는 복사 없는 연속 뷰"""
+        ring = CandleRingBuffer(4)
+        for i in range(6):
+            ring.append([i * MINUTE_MS, i, i + 1, i - 1, i + 0.5, 10 * i])
+        ring.replace_last([5 * MINUTE_MS, 5, 7, 4, 6.5, 55])
+
+        window = ring.window(3)
+        self.assertEqual(window['close'].tolist(), [3.5, 4.5, 6.5])
+        self.assertEqual(window['timestamp'].astype(np.int64).tolist(), [3 * MINUTE_MS, 4 * MINUTE_MS, 5 * MINUTE_MS])
+        self.assertTrue(np.shares_memory(window['close'], ring._fields['close']))
+        self.assertFalse(window['close'].flags.writeable)
+        self.assertEqual(len(ring.window()['open']), 4)
+        self.assertEqual(ring.last_timestamp, 5 * MINUTE_MS)
+
+
+class TestCandleBuffer(unittest.TestCase):
+    """가상 거래소 증분 조회 테스트"""
+
+    def setUp(self):
+        self.server = FakeExchangeServer()
+        self.server.start()
+        self.api = FakeExchangeAPI(self.server.url)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_incremental_update_fetches_only_new_candles(self):
+        """처음만 전체 조회하고 이후에는 진행 중인 캔들 갱신과 새 캔들만 조회"""
+        buffer = CandleBuffer(self.api, SYMBOL, '1m', capacity=100)
+        self.assertEqual(buffer.update(), 100)
+
+        self.server.clock.advance(3 * MINUTE_MS)
+        self.assertEqual(buffer.update(), 3)
+        self.assertEqual(buffer.stats['requests'], 2)
+        self.assertLessEqual(buffer.stats['candles_received'], 105)
+        self.assertEqual(buffer.stats['patched'], 1)
+
+        expected = np.array(self.api.exchange.fetch_ohlcv(SYMBOL, '1m', limit=100))
+        df = buffer.frame(100)
+        self.assertEqual(df['timestamp'].astype('int64').tolist(), expected[:, 0].astype(np.int64).tolist())
+        np.testing.assert_array_equal(df['close'].to_numpy()[:-1], expected[:-1, 4])
+        self.assertTrue(np.shares_memory(df['close'].to_numpy(), buffer.buffer._fields['close']))
+        self.assertEqual(df.attrs, {'market_type': 'futures', 'leverage': 5})
+
+    def test_copied_frame_is_detached_from_buffer(self):
+        """copy=True 프레임은 이후 갱신에 바뀌지 않고 수정할 수 있음"""
+        buffer = CandleBuffer(self.api, SYMBOL, '1m', capacity=50)
+        buffer.update()
+        df = buffer.frame(10, copy=True)
+        before = df['close'].tolist()
+        self.assertFalse(np.shares_memory(df['close'].to_numpy(), buffer.buffer._fields['close']))
+
+        self.server.clock.advance(5 * MINUTE_MS)
+        buffer.update()
+        self.assertEqual(df['close'].tolist(), before)
+        df.loc[df.index[-1], 'close'] = 0.0
+        self.assertEqual(df['close'].iloc[-1], 0.0)
+
+    def test_refills_when_gap_exceeds_capacity(self):
+        """버퍼 크기보다 많이 밀리면 증분 조회 대신 다시 채움"""
+        buffer = CandleBuffer(self.api, SYMBOL, '1m', capacity=20, fetch_limit=10)
+        buffer.update()
+        self.server.clock.advance(60 * MINUTE_MS)
+        self.assertEqual(buffer.update(), 20)
+        self.assertEqual(buffer.stats['refills'], 1)
+        latest = self.api.exchange.fetch_ohlcv(SYMBOL, '1m', limit=1)[0][0]
+        self.assertEqual(buffer.buffer.last_timestamp, latest)
+
+
+class TestGetCandleBuffer(unittest.TestCase):
+    """공유 캔들 버퍼 키 테스트"""
+
+    @staticmethod
+    def _api(api_key, url, sandbox=False):
+        exchange = SimpleNamespace(apiKey=api_key, urls={'api': {'public': url}}, isSandboxModeEnabled=sandbox)
+        return SimpleNamespace(exchange_id='binance', market_type='futures', exchange=exchange)
+
+    def test_testnet_and_mainnet_do_not_share_buffer(self):
+        """같은 거래소 ID 라도 접속 주소/샌드박스가 다르면 다른 버퍼, API 키만 다르면 같은 버퍼"""
+        mainnet = get_candle_buffer(self._api('a', 'https://fapi.binance.com'), SYMBOL, '1m')
+        testnet = get_candle_buffer(self._api('a', 'https://testnet.binancefuture.com', sandbox=True), SYMBOL, '1m')
+        other_key = get_candle_buffer(self._api('b', 'https://fapi.binance.com'), SYMBOL, '1m')
+        self.assertIsNot(mainnet, testnet)
+        self.assertIs(mainnet, other_key)
+
+
+if __name__ == '__main__':
+    unittest.main()
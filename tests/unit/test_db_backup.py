@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - SQLite 온라인 백업 단위 테스트
+
+import os
+import sys
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.db_backup import SQLiteOnlineBackup, DatabaseBackupError
+from src.backup_manager import BackupManager
+
+
+class TestSQLiteOnlineBackup(unittest.TestCase):
+    """페이지 단위 DB 백업/복원 테스트"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, 'trading.db')
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE trades (id INTEGER PRIMARY KEY, symbol TEXT, price REAL)")
+        self.conn.executemany("INSERT INTO trades (symbol, price) VALUES (?, ?)",
+                              [('BTC/USDT', 50000.0 + i) for i in range(5000)])
+        self.conn.commit()
+        self.backup = SQLiteOnlineBackup(self.db_path, os.path.join(self.tmp_dir, 'database'),
+                                         max_generations=10, pages_per_step=16)
+
+    def tearDown(self):
+        self.conn.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _count(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_second_backup_stores_only_changed_pages(self):
+        """두 번째 세대는 변경된 페이지만 저장"""
+        first = self.backup.create_backup()
+        self.assertEqual(first['changed_pages'], first['page_count'])
+
+        self.conn.execute("UPDATE trades SET price = 1 WHERE id = 42")
+        self.conn.commit()
+        second = self.backup.create_backup()
+        self.assertLess(second['changed_pages'], 5)
+        self.assertLess(second['pack_size'], first['pack_size'])
+
+    def test_point_in_time_restore(self):
+        """세대 번호 또는 시각으로 특정 시점 복원"""
+        first = self.backup.create_backup()
+        self.conn.execute("DELETE FROM trades WHERE id > 1000")
+        self.conn.commit()
+        self.backup.create_backup()
+        self.assertEqual(self._count(), 1000)
+
+        self.backup.restore(at=datetime.fromisoformat(first['created_at']))
+        self.assertEqual(self._count(), 5000)
+
+        self.backup.restore(seq=2)
+        self.assertEqual(self._count(), 1000)
+
+    def test_compaction_keeps_generations_restorable(self):
+        """세대 병합 후에도 남은 세대 복원 가능"""
+        self.backup.max_generations = 3
+        for i in range(6):
+            self.conn.execute("INSERT INTO trades (symbol, price) VALUES ('ETH/USDT', ?)", (i,))
+            self.conn.commit()
+            self.backup.create_backup()
+
+        generations = self.backup.list_generations()
+        self.assertEqual(len(generations), 3)
+        out_path = os.path.join(self.tmp_dir, 'export.db')
+        self.backup.export_generation(out_path, seq=generations[-1]['seq'])
+        conn = sqlite3.connect(out_path)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0], 5004)
+        conn.close()
+
+    def test_missing_generation_raises(self):
+        """존재하지 않는 세대 복원 시 오류"""
+        with self.assertRaises(DatabaseBackupError):
+            self.backup.restore(seq=99)
+
+
+class TestBackupManagerDatabaseBackup(unittest.TestCase):
+    """백업 관리자의 DB 백업 모드 테스트"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, 'trading.db')
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE positions (id INTEGER PRIMARY KEY, symbol TEXT)")
+        conn.execute("INSERT INTO positions (symbol) VALUES ('BTC/USDT')")
+        conn.commit()
+        conn.close()
+        self.manager = BackupManager(backup_dir=os.path.join(self.tmp_dir, 'backups'),
+                                     enable_auto_backup=False, db_path=self.db_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_create_and_restore(self):
+        """DB 백업 세대 생성 후 복원"""
+        generation = self.manager.create_database_backup()
+        self.assertIsNotNone(generation)
+
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("DELETE FROM positions")
+        conn.commit()
+        conn.close()
+
+        success, result = self.manager.restore_database_backup(seq=generation['seq'])
+        self.assertTrue(success)
+        conn = sqlite3.connect(self.db_path)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM positions").fetchone()[0], 1)
+        conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
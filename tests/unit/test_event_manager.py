@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 이벤트 관리자 단위 테스트
+
+import os
+import sys
+import time
+import threading
+import unittest
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.event_manager import (
+    EventManager, EventType, DISPATCH_ASYNC, DISPATCH_SYNC,
+    BACKPRESSURE_DROP_NEWEST, BACKPRESSURE_DROP_OLDEST, BACKPRESSURE_CALLER_RUNS
+)
+
+
+class TestEventManager(unittest.TestCase):
+    """이벤트 관리자 동기/비동기 디스패치 테스트"""
+
+    def setUp(self):
+        """테스트마다 깨끗한 이벤트 관리자 상태 준비"""
+        self.em = EventManager()
+        self.em.shutdown_async()
+        self.em.subscribers = {}
+        self.em.dispatch_modes = {}
+        self.em.default_dispatch = DISPATCH_SYNC
+        self.em.max_history = 100
+        self.em.clear_history()
+        self.em.configure_async(workers=2, queue_size=1000, backpressure=BACKPRESSURE_DROP_OLDEST)
+
+    def tearDown(self):
+        """워커 정리"""
+        self.em.shutdown_async()
+        self.em.subscribers = {}
+        self.em.dispatch_modes = {}
+
+    def test_sync_dispatch_runs_on_publisher_thread(self):
+        """동기 구독자는 발행 스레드에서 호출"""
+        seen = []
+        self.em.subscribe(EventType.TRADE_EXECUTED, lambda d: seen.append(threading.get_ident()))
+        self.em.publish(EventType.TRADE_EXECUTED, {'trade_id': 1})
+        self.assertEqual(seen, [threading.get_ident()])
+
+    def test_async_dispatch_does_not_block_publisher(self):
+        """느린 비동기 구독자가 발행을 지연시키지 않음"""
+        done = threading.Event()
+
+        def slow_handler(data):
+            time.sleep(0.2)
+            done.set()
+
+        self.em.subscribe(EventType.TRADE_EXECUTED, slow_handler, dispatch=DISPATCH_ASYNC)
+        start = time.time()
+        self.em.publish(EventType.TRADE_EXECUTED, {'trade_id': 1})
+        self.assertLess(time.time() - start, 0.1)
+        self.assertTrue(done.wait(2.0))
+
+    def test_async_preserves_per_subscriber_order(self):
+        """구독자별 이벤트 순서 보장"""
+        received = []
+        self.em.subscribe(EventType.POSITION_UPDATED, lambda d: received.append(d['seq']),
+                          dispatch=DISPATCH_ASYNC)
+        for i in range(500):
+            self.em.publish(EventType.POSITION_UPDATED, {'seq': i})
+        self.assertTrue(self.em.flush(timeout=5.0))
+        self.assertEqual(received, list(range(500)))
+
+    def test_backpressure_drop_newest(self):
+        """큐가 가득 차면 새 이벤트를 버림"""
+        self.em.configure_async(workers=1, queue_size=2, backpressure=BACKPRESSURE_DROP_NEWEST)
+        gate = threading.Event()
+        received = []
+
+        def handler(data):
+            gate.wait(2.0)
+            received.append(data['seq'])
+
+        self.em.subscribe(EventType.POSITION_UPDATED, handler, dispatch=DISPATCH_ASYNC)
+        for i in range(10):
+            self.em.publish(EventType.POSITION_UPDATED, {'seq': i})
+        gate.set()
+        self.assertTrue(self.em.flush(timeout=5.0))
+        self.assertGreater(self.em.get_dispatch_stats()['dropped'], 0)
+        self.assertEqual(received, sorted(received))
+        self.assertEqual(received[0], 0)
+
+    def test_backpressure_drop_oldest_keeps_latest(self):
+        """drop_oldest 정책은 최신 이벤트를 유지"""
+        self.em.configure_async(workers=1, queue_size=2, backpressure=BACKPRESSURE_DROP_OLDEST)
+        gate = threading.Event()
+        received = []
+
+        def handler(data):
+            gate.wait(2.0)
+            received.append(data['seq'])
+
+        self.em.subscribe(EventType.POSITION_UPDATED, handler, dispatch=DISPATCH_ASYNC)
+        for i in range(10):
+            self.em.publish(EventType.POSITION_UPDATED, {'seq': i})
+        gate.set()
+        self.assertTrue(self.em.flush(timeout=5.0))
+        self.assertEqual(received[-1], 9)
+
+    def test_critical_events_block_instead_of_dropping(self):
+        """드롭 정책에서도 중요 이벤트는 대기 후 전달되고, 밀려난 이벤트는 발행 스레드에서 처리"""
+        self.em.configure_async(workers=1, queue_size=1, backpressure=BACKPRESSURE_DROP_OLDEST,
+                                block_timeout=5.0)
+        gate = threading.Event()
+        received = []
+
+        def handler(data):
+            if threading.current_thread().name.startswith('EventWorker'):
+                gate.wait(2.0)
+            received.append((data['event_type'], data['seq']))
+
+        self.em.subscribe(EventType.TRADE_EXECUTED, handler, dispatch=DISPATCH_ASYNC)
+        self.em.subscribe(EventType.POSITION_UPDATED, handler, dispatch=DISPATCH_ASYNC)
+        before = self.em.get_dispatch_stats()
+        threading.Timer(0.2, gate.set).start()
+        for i in range(3):
+            self.em.publish(EventType.TRADE_EXECUTED, {'seq': i})
+        self.assertEqual(self.em.get_dispatch_stats()['dropped'], before['dropped'])
+
+        # 큐에서 밀려난 중요 이벤트는 버리지 않고, 중요하지 않은 이벤트만 드롭 (유형별 경고 로그)
+        gate.clear()
+        threading.Timer(0.5, gate.set).start()
+        with self.assertLogs(self.em.logger, level='WARNING') as logs:
+            for i in range(3, 6):
+                self.em.publish(EventType.TRADE_EXECUTED if i == 4 else EventType.POSITION_UPDATED, {'seq': i})
+            self.em.publish(EventType.POSITION_UPDATED, {'seq': 6})
+        self.assertTrue(self.em.flush(timeout=5.0))
+        trades = [seq for event_type, seq in received if event_type == 'TRADE_EXECUTED']
+        self.assertEqual(sorted(trades), [0, 1, 2, 4])
+        self.assertEqual([seq for event_type, seq in received if event_type == 'POSITION_UPDATED'], [3, 6])
+        dropped = self.em.get_dispatch_stats()['dropped_by_type']
+        self.assertEqual(dropped.get('POSITION_UPDATED', 0) - before['dropped_by_type'].get('POSITION_UPDATED', 0), 1)
+        self.assertEqual(dropped.get('TRADE_EXECUTED', 0), before['dropped_by_type'].get('TRADE_EXECUTED', 0))
+        self.assertTrue(all('POSITION_UPDATED' in line for line in logs.output))
+
+    def test_backpressure_caller_runs(self):
+        """caller_runs 정책은 발행 스레드에서 직접 처리하여 이벤트를 잃지 않음"""
+        self.em.configure_async(workers=1, queue_size=1, backpressure=BACKPRESSURE_CALLER_RUNS)
+        gate = threading.Event()
+        received = []
+
+        def handler(data):
+            if threading.current_thread().name.startswith('EventWorker'):
+                gate.wait(2.0)
+            received.append(data['seq'])
+
+        self.em.subscribe(EventType.POSITION_UPDATED, handler, dispatch=DISPATCH_ASYNC)
+        for i in range(5):
+            self.em.publish(EventType.POSITION_UPDATED, {'seq': i})
+        gate.set()
+        self.assertTrue(self.em.flush(timeout=5.0))
+        self.assertEqual(sorted(received), list(range(5)))
+        self.assertGreater(self.em.get_dispatch_stats()['caller_runs'], 0)
+
+    def test_history_ring_buffer(self):
+        """이벤트 기록은 최대 개수만 유지"""
+        self.em.max_history = 10
+        for i in range(25):
+            self.em.publish(EventType.PORTFOLIO_UPDATED, {'seq': i})
+        self.em.publish(EventType.TRADE_EXECUTED, {'seq': 99})
+
+        recent = self.em.get_recent_events(100)
+        self.assertEqual(len(recent), 10)
+        self.assertEqual(recent[-1]['data']['seq'], 99)
+        self.assertEqual([e['data']['seq'] for e in self.em.get_recent_events(3)], [23, 24, 99])
+
+        trades = self.em.get_recent_events(5, EventType.TRADE_EXECUTED)
+        self.assertEqual(len(trades), 1)
+        portfolio = self.em.get_recent_events(2, EventType.PORTFOLIO_UPDATED)
+        self.assertEqual([e['data']['seq'] for e in portfolio], [23, 24])
+
+    def test_handler_error_is_isolated(self):
+        """핸들러 예외가 다른 구독자에 영향을 주지 않음"""
+        received = []
+        errors_before = self.em.get_dispatch_stats()['errors']
+
+        def broken(data):
+            raise RuntimeError("boom")
+
+        self.em.subscribe(EventType.ORDER_FILLED, broken, dispatch=DISPATCH_ASYNC)
+        self.em.subscribe(EventType.ORDER_FILLED, lambda d: received.append(d['id']), dispatch=DISPATCH_ASYNC)
+        self.em.publish(EventType.ORDER_FILLED, {'id': 7})
+        self.assertTrue(self.em.flush(timeout=5.0))
+        self.assertEqual(received, [7])
+        self.assertEqual(self.em.get_dispatch_stats()['errors'] - errors_before, 1)
+
+    def test_stats_consistent_under_concurrent_publishers(self):
+        """여러 스레드에서 발행해도 디스패치/처리 통계가 어긋나지 않음"""
+        before = self.em.get_dispatch_stats()
+        self.em.subscribe(EventType.POSITION_UPDATED, lambda d: None, dispatch=DISPATCH_ASYNC)
+
+        def publish_many():
+            for i in range(500):
+                self.em.publish(EventType.POSITION_UPDATED, {'seq': i})
+
+        threads = [threading.Thread(target=publish_many) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertTrue(self.em.flush(timeout=5.0))
+        stats = self.em.get_dispatch_stats()
+        self.assertEqual(stats['dispatched'] - before['dispatched'], 2000)
+        # drop_oldest 정책에서 밀려난 이벤트를 포함해 모든 이벤트가 처리 또는 드롭으로 집계됨
+        self.assertEqual(stats['processed'] - before['processed'] + stats['dropped'] - before['dropped'], 2000)
+        self.assertEqual(stats['dropped_by_type'].get('POSITION_UPDATED', 0)
+                         - before['dropped_by_type'].get('POSITION_UPDATED', 0),
+                         stats['dropped'] - before['dropped'])
+
+    def test_exit_flush_drains_queued_events(self):
+        """종료 시 flush 가 큐에 남은 비동기 이벤트를 처리"""
+        release = threading.Event()
+        received = []
+
+        def handler(data):
+            release.wait(2.0)
+            received.append(data['seq'])
+
+        self.em.subscribe(EventType.TRADE_EXECUTED, handler, dispatch=DISPATCH_ASYNC)
+        for i in range(3):
+            self.em.publish(EventType.TRADE_EXECUTED, {'seq': i})
+        threading.Timer(0.05, release.set).start()
+        self.em._flush_at_exit()
+        self.assertEqual(received, [0, 1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
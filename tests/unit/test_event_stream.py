@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 이벤트 스트림 브로커 단위 테스트
+
+import os
+import sys
+import json
+import threading
+import unittest
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.event_manager import EventType, get_event_manager
+from src.event_stream import EventStreamBroker, format_sse
+
+
+def _parse(message):
+    """SSE 메시지를 (id, event, data) 로 변환"""
+    fields = {}
+    data_lines = []
+    for line in message.strip().split('\n'):
+        key, _, value = line.partition(': ')
+        if key == 'data':
+            data_lines.append(value)
+        else:
+            fields[key] = value
+    return int(fields['id']), fields.get('event'), json.loads('\n'.join(data_lines))
+
+
+class TestEventStreamBroker(unittest.TestCase):
+    """이벤트 스트림 브로커 테스트"""
+
+    def setUp(self):
+        self.event_manager = get_event_manager()
+        self.broker = EventStreamBroker(self.event_manager, history_size=10, client_queue_size=4,
+                                        heartbeat_interval=0.05)
+        self.broker.start()
+
+    def tearDown(self):
+        self.broker.stop()
+
+    def _positions(self, *positions):
+        self.event_manager.publish(EventType.POSITION_UPDATED, {'positions': list(positions)})
+
+    def test_publish_trade_is_stream_only(self):
+        """publish_trade 는 스트림에만 전달하고 TRADE_EXECUTED 구독자는 호출하지 않음"""
+        calls = []
+        handler = lambda data: calls.append(data)
+        self.event_manager.subscribe(EventType.TRADE_EXECUTED, handler)
+        try:
+            client, _ = self.broker.connect()
+            self.assertIsNotNone(self.broker.publish_trade({'id': 't1', 'symbol': 'BTC/USDT'}))
+            _, event, delta = _parse(client.queue.get_nowait())
+            self.assertEqual(event, 'trades')
+            self.assertEqual(delta['trade']['id'], 't1')
+            self.assertEqual(calls, [])
+        finally:
+            self.event_manager.unsubscribe(EventType.TRADE_EXECUTED, handler)
+
+    def test_position_list_is_diffed(self):
+        """포지션 목록은 바뀐 항목과 삭제된 키만 전달"""
+        client, initial = self.broker.connect()
+        self.assertEqual(_parse(initial[0])[1], 'snapshot')
+
+        btc = {'symbol': 'BTC/USDT', 'side': 'long', 'contracts': 1.0}
+        eth = {'symbol': 'ETH/USDT', 'side': 'short', 'contracts': 2.0}
+        self._positions(btc, eth)
+        self._positions(btc, eth)  # 변경 없음 → 전송 없음
+        self._positions(dict(btc, contracts=1.5))
+
+        messages = [_parse(client.queue.get_nowait()) for _ in range(client.queue.qsize())]
+        self.assertEqual(len(messages), 2)
+        _, event, first = messages[0]
+        self.assertEqual(event, 'positions')
+        self.assertEqual(len(first['upsert']), 2)
+        _, _, second = messages[1]
+        self.assertEqual([p['contracts'] for p in second['upsert']], [1.5])
+        self.assertEqual(second['remove'], ['ETH/USDT:short'])
+        self.assertEqual(second['version'], 2)
+
+    def test_status_and_balance_send_changed_keys(self):
+        """상태/잔액은 바뀐 키만 전달"""
+        client, _ = self.broker.connect()
+        self.event_manager.publish(EventType.BOT_STATUS_CHANGED, {'status': {'is_running': False, 'symbol': 'BTC/USDT'}})
+        self.event_manager.publish(EventType.BOT_STATUS_CHANGED, {'status': {'is_running': True, 'symbol': 'BTC/USDT'}})
+        self.event_manager.publish(EventType.BALANCE_CHANGED, {'balance': {'spot': {'balance': 10}}})
+
+        messages = [_parse(client.queue.get_nowait()) for _ in range(3)]
+        self.assertEqual(messages[1][2]['set'], {'is_running': True})
+        self.assertEqual(messages[2][1], 'balance')
+        self.assertEqual(self.broker.snapshot()['status'], {'is_running': True, 'symbol': 'BTC/USDT'})
+
+    def test_reconnect_replays_missed_messages(self):
+        """Last-Event-ID가 기록 범위 안이면 놓친 메시지만 재전송, 범위 밖이면 스냅샷"""
+        self.event_manager.publish(EventType.TRADE_EXECUTED, {'trade': {'id': 1}})
+        last_id = self.broker.get_stats()['last_event_id']
+        self.event_manager.publish(EventType.TRADE_EXECUTED, {'trade': {'id': 2}})
+
+        _, initial = self.broker.connect(last_event_id=str(last_id))
+        self.assertEqual([_parse(m)[2]['trade']['id'] for m in initial], [2])
+
+        for i in range(20):
+            self.event_manager.publish(EventType.TRADE_EXECUTED, {'trade': {'id': 10 + i}})
+        _, initial = self.broker.connect(last_event_id=str(last_id))
+        self.assertEqual(_parse(initial[0])[1], 'snapshot')
+        self.assertEqual(len(_parse(initial[0])[2]['trades']), 20)
+
+    def test_slow_client_is_disconnected(self):
+        """큐가 가득 찬 클라이언트는 연결 종료"""
+        client, _ = self.broker.connect()
+        for i in range(10):
+            self.event_manager.publish(EventType.TRADE_EXECUTED, {'trade': {'id': i}})
+        self.assertTrue(client.lagging)
+        self.assertEqual(self.broker.get_stats()['clients'], 0)
+
+    def test_stream_generator_yields_updates_and_heartbeats(self):
+        """스트림 생성기는 스냅샷, 변경분, 하트비트를 순서대로 전달"""
+        stream = self.broker.stream()
+        self.assertIn('event: snapshot', next(stream))
+        self.assertEqual(next(stream), ': keepalive\n\n')
+
+        timer = threading.Timer(0.01, self.event_manager.publish,
+                                args=(EventType.BOT_STATUS_CHANGED, {'status': {'is_running': True}}))
+        timer.start()
+        message = next(stream)
+        while message.startswith(':'):
+            message = next(stream)
+        self.assertIn('event: status', message)
+        stream.close()
+        self.assertEqual(self.broker.get_stats()['clients'], 0)
+
+    def test_format_sse(self):
+        """SSE 메시지 형식"""
+        message = format_sse({'a': 1}, event='status', event_id=3, retry=1000)
+        self.assertEqual(message, 'id: 3\nevent: status\nretry: 1000\ndata: {"a":1}\n\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 벡터화 청산 조건 평가 단위 테스트
+
+import os
+import sys
+import time
+import unittest
+
+import numpy as np
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.exit_evaluator import (
+    VectorizedExitEvaluator, EXIT_STOP_LOSS, EXIT_TAKE_PROFIT,
+    EXIT_PARTIAL_TP, EXIT_TRAILING_STOP
+)
+from src.risk_manager import RiskManager
+
+
+def _position(pid, side, entry, symbol='BTC/USDT', leverage=10):
+    return {'id': pid, 'symbol': symbol, 'side': side, 'entry_price': entry,
+            'leverage': leverage, 'status': 'open', 'size': 1.0}
+
+
+class TestVectorizedExitEvaluator(unittest.TestCase):
+    """벡터화 청산 평가기 테스트"""
+
+    def setUp(self):
+        self.risk_manager = RiskManager(risk_config={'stop_loss_pct': 0.05, 'take_profit_pct': 0.1})
+
+    def test_matches_risk_manager_check_exit_conditions(self):
+        """손절/이익실현 판정이 기존 RiskManager 개별 판정과 일치"""
+        rng = np.random.default_rng(7)
+        positions = [_position(f'p{i}', 'long' if i % 2 else 'short', float(rng.uniform(90, 110)))
+                     for i in range(200)]
+        evaluator = VectorizedExitEvaluator(sl_pct=0.05, tp_pct=0.1)
+        evaluator.sync(positions)
+
+        for price in (85.0, 95.0, 100.0, 105.0, 118.0):
+            signals = {s['position_id']: s for s in evaluator.evaluate(price)}
+            for p in positions:
+                sl = self.risk_manager.calculate_stop_loss_price(p['entry_price'], p['side'], 0.05)
+                tp = self.risk_manager.calculate_take_profit_price(p['entry_price'], p['side'], 0.1)
+                expected, _, fraction = self.risk_manager.check_exit_conditions(
+                    price, p['side'], p['entry_price'], sl, tp, check_partial=False)
+                actual = signals.get(p['id'])
+                self.assertEqual(actual['exit_type'] if actual else None, expected)
+                if actual:
+                    self.assertEqual(actual['exit_percentage'], fraction)
+
+    def test_partial_take_profit_levels_fire_once(self):
+        """부분 이익실현은 도달한 최고 단계부터 한 번씩만 발생"""
+        evaluator = VectorizedExitEvaluator(sl_pct=0.2, partial_tp_enabled=True,
+                                            tp_levels=[0.05, 0.1, 0.2], tp_percentages=[0.3, 0.3, 0.4])
+        evaluator.sync([_position('a', 'long', 100.0), _position('b', 'short', 100.0)])
+
+        signals = evaluator.evaluate({'BTC/USDT': 111.0})
+        self.assertEqual([(s['position_id'], s['exit_type'], s['exit_percentage']) for s in signals],
+                         [('a', EXIT_PARTIAL_TP, 0.3)])
+        # 같은 가격에서는 아직 실행하지 않은 5% 단계 발생, 그 뒤로는 없음
+        self.assertEqual(evaluator.evaluate(111.0)[0]['exit_percentage'], 0.3)
+        self.assertEqual(evaluator.evaluate(111.0), [])
+
+        # 상태는 sync 이후에도 유지
+        evaluator.sync([_position('a', 'long', 100.0), _position('b', 'short', 100.0)])
+        self.assertEqual(evaluator.evaluate(111.0), [])
+        signals = evaluator.evaluate(89.0)
+        self.assertEqual([(s['position_id'], s['exit_percentage']) for s in signals], [('b', 0.3)])
+
+    def test_trailing_stop_tracks_high_water_mark(self):
+        """트레일링 스탑은 고점(숏은 저점) 대비 간격으로 발동"""
+        evaluator = VectorizedExitEvaluator(sl_pct=0.05, tp_pct=0.5, trailing_enabled=True,
+                                            trailing_activation_pct=0.01, trailing_pct=0.02)
+        evaluator.sync([_position('long', 'long', 100.0), _position('short', 'short', 100.0)])
+
+        self.assertEqual(evaluator.evaluate(np.array([110.0, 90.0])), [])
+        self.assertEqual(evaluator.evaluate(np.array([108.5, 91.5])), [])
+        signals = evaluator.evaluate(np.array([107.7, 91.9]))
+        self.assertEqual({s['position_id']: s['exit_type'] for s in signals},
+                         {'long': EXIT_TRAILING_STOP, 'short': EXIT_TRAILING_STOP})
+
+    def test_multi_symbol_prices_and_missing_prices(self):
+        """심볼별 가격 적용, 가격이 없는 심볼은 평가 제외"""
+        evaluator = VectorizedExitEvaluator(sl_pct=0.05, tp_pct=0.1)
+        evaluator.sync([_position('btc', 'long', 100.0, 'BTC/USDT'),
+                        _position('eth', 'long', 10.0, 'ETH/USDT'),
+                        _position('sol', 'short', 5.0, 'SOL/USDT')])
+        signals = evaluator.evaluate({'BTC/USDT': 94.0, 'ETH/USDT': 11.5})
+        self.assertEqual({s['position_id']: s['exit_type'] for s in signals},
+                         {'btc': EXIT_STOP_LOSS, 'eth': EXIT_TAKE_PROFIT})
+
+    def test_invalid_positions_are_skipped(self):
+        """ID/방향/진입가가 잘못된 포지션은 제외"""
+        evaluator = VectorizedExitEvaluator()
+        count = evaluator.sync([_position('ok', 'long', 100.0), _position(None, 'long', 100.0),
+                                _position('x', 'flat', 100.0), _position('y', 'short', 0)])
+        self.assertEqual(count, 1)
+
+    def test_liquidation_warnings(self):
+        """청산가 5% 이내 근접 포지션 경고"""
+        evaluator = VectorizedExitEvaluator()
+        evaluator.sync([_position('near', 'long', 100.0, leverage=20),
+                        _position('far', 'long', 100.0, leverage=2)])
+        warnings = evaluator.liquidation_warnings(97.0)
+        self.assertEqual([w['position_id'] for w in warnings], ['near'])
+
+    def test_risk_manager_batch_check(self):
+        """RiskManager.check_stop_loss_take_profit 일괄 판정"""
+        positions = [_position('l', 'long', 100.0), _position('s', 'short', 100.0),
+                     dict(_position('c', 'long', 100.0), status='closed')]
+        stop_loss, take_profit = self.risk_manager.check_stop_loss_take_profit(94.0, positions)
+        self.assertEqual([p['id'] for p in stop_loss], ['l'])
+        self.assertEqual(take_profit, [])
+        stop_loss, take_profit = self.risk_manager.check_stop_loss_take_profit(89.0, positions)
+        self.assertEqual([p['id'] for p in take_profit], ['s'])
+        self.assertEqual(take_profit[0]['exit_reason'], 'take_profit')
+
+    def test_thousands_of_positions(self):
+        """수천 개 포지션 평가가 한 번의 배열 연산으로 처리"""
+        positions = [_position(i + 1, 'long' if i % 2 else 'short', 100.0 + (i % 50)) for i in range(5000)]
+        evaluator = VectorizedExitEvaluator(trailing_enabled=True, partial_tp_enabled=True)
+        evaluator.sync(positions)
+        price = evaluator.price_vector(101.0)
+
+        start = time.perf_counter()
+        for _ in range(20):
+            evaluator.evaluate_arrays(price)
+        elapsed = (time.perf_counter() - start) / 20
+        self.assertLess(elapsed, 0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 가상 거래소 단위 테스트
+
+import json
+import os
+import sys
+import unittest
+import urllib.error
+import urllib.request
+from unittest import mock
+
+import ccxt
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.fake_exchange import SimulatedClock, MarketDataFeed, MatchingEngine, ExchangeError
+from src.fake_exchange import FakeExchangeServer, WebSocketClient
+from utils.api import create_binance_client
+
+MINUTE_MS = 60_000
+T0 = 1_700_000_040_000 // MINUTE_MS * MINUTE_MS
+
+
+def _replay_feed(dip_low=90.0):
+    """100 근처에서 움직이다 5번째 분봉에서 dip_low 까지 내려가는 재생 데이터 (시계 정지)"""
+    index = pd.date_range(pd.Timestamp(T0, unit='ms'), periods=10, freq='1min')
+    df = pd.DataFrame({'open': 100.0, 'high': 101.0, 'low': 99.0, 'close': 100.0, 'volume': 1.0}, index=index)
+    df.iloc[5, df.columns.get_loc('low')] = dip_low
+    clock = SimulatedClock(start_ms=T0 + 30_000, speed=0)
+    return MarketDataFeed(clock, candles={'BTCUSDT': df})
+
+
+class TestMatchingEngine(unittest.TestCase):
+    """체결 엔진 테스트"""
+
+    def test_stop_and_limit_orders_trigger_on_price_path(self):
+        """대기 주문은 시계가 진행해 가격 경로가 닿을 때 체결"""
+        feed = _replay_feed()
+        engine = MatchingEngine(feed, spot_balances={'USDT': 1000.0}, default_leverage=5)
+        engine.place_order('future', {'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'MARKET', 'quantity': '1'})
+        stop = engine.place_order('future', {'symbol': 'BTCUSDT', 'side': 'SELL', 'type': 'STOP_MARKET',
+                                             'stopPrice': '95', 'closePosition': 'true'})
+        limit = engine.place_order('spot', {'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'LIMIT',
+                                            'timeInForce': 'GTC', 'quantity': '2', 'price': '92'})
+        self.assertEqual(engine.spot_balances['USDT']['locked'], 2 * 92 * 1.001)
+
+        feed.clock.advance(2 * MINUTE_MS)
+        self.assertEqual(engine.get_order('future', 'BTCUSDT', stop['orderId'])['status'], 'NEW')
+
+        feed.clock.advance(4 * MINUTE_MS)
+        filled_stop = engine.get_order('future', 'BTCUSDT', stop['orderId'])
+        self.assertEqual(filled_stop['status'], 'FILLED')
+        self.assertAlmostEqual(float(filled_stop['avgPrice']), 95.0)
+        self.assertEqual(engine.position('BTCUSDT')['amount'], 0.0)
+        self.assertLess(engine.futures_wallet, 10000.0 - 4.9)
+
+        self.assertEqual(engine.get_order('spot', 'BTCUSDT', limit['orderId'])['status'], 'FILLED')
+        self.assertAlmostEqual(engine.spot_balances['BTC']['free'], 2.0)
+        self.assertAlmostEqual(engine.spot_balances['USDT']['free'], 1000.0 - 2 * 92 * 1.001)
+
+    def test_liquidation_and_balance_errors(self):
+        """고레버리지 포지션은 청산 가격에서 강제 청산, 잔고 부족은 바이낸스 오류 코드"""
+        feed = _replay_feed()
+        engine = MatchingEngine(feed, spot_balances={'USDT': 50.0}, futures_balance=100.0)
+        engine.set_leverage('BTCUSDT', 20)
+        engine.place_order('future', {'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'MARKET', 'quantity': '10'})
+        liquidation = engine.liquidation_price('BTCUSDT')
+        self.assertGreater(liquidation, 90.0)
+
+        feed.clock.advance(6 * MINUTE_MS)
+        engine.sync()
+        self.assertEqual(engine.position('BTCUSDT')['amount'], 0.0)
+        self.assertEqual(engine.stats['liquidations'], 1)
+
+        with self.assertRaises(ExchangeError) as ctx:
+            engine.place_order('spot', {'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'MARKET', 'quantity': '1'})
+        self.assertEqual(ctx.exception.code, -2010)
+        with self.assertRaises(ExchangeError) as ctx:
+            engine.place_order('future', {'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'MARKET', 'quantity': '1000'})
+        self.assertEqual(ctx.exception.code, -2019)
+
+
+class TestFakeExchangeServer(unittest.TestCase):
+    """가상 거래소 서버 + ccxt 연동 테스트"""
+
+    def setUp(self):
+        self.server = FakeExchangeServer(stream_interval=0.05)
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_ccxt_spot_and_futures_round_trip(self):
+        """FAKE_EXCHANGE_URL 로 만든 ccxt 클라이언트가 시세/주문/잔고/포지션 조회를 수행"""
+        with mock.patch.dict(os.environ, {'FAKE_EXCHANGE_URL': self.server.url}):
+            spot = create_binance_client('key', 'secret', is_future=False)
+            future = create_binance_client('key', 'secret', is_future=True)
+        spot.load_markets()
+        candles = spot.fetch_ohlcv('BTC/USDT', '1h', limit=5)
+        self.assertEqual(len(candles), 5)
+        self.assertEqual(candles[1][0] - candles[0][0], 3600_000)
+        ticker = spot.fetch_ticker('BTC/USDT')
+        book = spot.fetch_order_book('BTC/USDT', 5)
+        self.assertLess(book['bids'][0][0], book['asks'][0][0])
+
+        order = spot.create_order('BTC/USDT', 'market', 'buy', 0.01)
+        self.assertEqual(order['status'], 'closed')
+        self.assertAlmostEqual(order['average'], ticker['last'], delta=ticker['last'] * 0.01)
+        self.assertAlmostEqual(spot.fetch_balance()['BTC']['free'], 0.01)
+        resting = spot.create_order('BTC/USDT', 'limit', 'buy', 0.01, round(order['average'] * 0.5, 2))
+        self.assertEqual(len(spot.fetch_open_orders('BTC/USDT')), 1)
+        self.assertEqual(spot.cancel_order(resting['id'], 'BTC/USDT')['status'], 'canceled')
+
+        future.set_leverage(10, 'BTC/USDT:USDT')
+        future.create_order('BTC/USDT:USDT', 'market', 'sell', 0.02)
+        positions = future.fetch_positions(['BTC/USDT:USDT'])
+        self.assertEqual(positions[0]['side'], 'short')
+        self.assertAlmostEqual(positions[0]['contracts'], 0.02)
+        self.assertEqual(positions[0]['leverage'], 10)
+        self.assertLess(future.fetch_balance()['USDT']['free'], 10000.0)
+
+    def test_rate_limit_returns_429(self):
+        """가중치 한도 초과 시 429 + Retry-After, ccxt 는 DDoSProtection 계열 예외"""
+        self.server.weight_limit = 3
+        url = f"{self.server.url}/api/v3/ticker/price?symbol=BTCUSDT"
+        with urllib.request.urlopen(url) as response:
+            self.assertEqual(response.headers['x-mbx-used-weight-1m'], '2')
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            urllib.request.urlopen(url)
+        self.assertEqual(ctx.exception.code, 429)
+        self.assertIsNotNone(ctx.exception.headers['Retry-After'])
+        self.assertEqual(json.loads(ctx.exception.read())['code'], -1003)
+
+        client = ccxt.binance({'urls': {'api': {'public': f"{self.server.url}/api/v3"}}})
+        with self.assertRaises(ccxt.DDoSProtection):
+            client.publicGetTime()
+        self.assertEqual(self.server.stats['rate_limited'], 2)
+
+    def test_websocket_market_and_user_streams(self):
+        """시세 스트림과 listenKey 사용자 데이터 스트림 수신"""
+        client = WebSocketClient(f"{self.server.ws_url}/stream?streams=btcusdt@kline_1m/btcusdt@ticker")
+        try:
+            streams = {client.recv_json()['stream'] for _ in range(4)}
+        finally:
+            client.close()
+        self.assertEqual(streams, {'btcusdt@kline_1m', 'btcusdt@ticker'})
+
+        request = urllib.request.Request(f"{self.server.url}/fapi/v1/listenKey", method='POST')
+        with urllib.request.urlopen(request) as response:
+            listen_key = json.loads(response.read())['listenKey']
+        client = WebSocketClient(f"{self.server.ws_url}/ws/{listen_key}")
+        try:
+            client.send_json({'method': 'LIST_SUBSCRIPTIONS', 'id': 1})
+            self.assertEqual(client.recv_json(), {'result': [listen_key], 'id': 1})
+            self.server.engine.place_order('future', {'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'MARKET',
+                                                      'quantity': '0.01'})
+            events = [client.recv_json()['e'] for _ in range(3)]
+        finally:
+            client.close()
+        self.assertEqual(events, ['ORDER_TRADE_UPDATE', 'ORDER_TRADE_UPDATE', 'ACCOUNT_UPDATE'])
+
+
+if __name__ == '__main__':
+    unittest.main()
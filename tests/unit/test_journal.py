@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - JSON Lines 저널 단위 테스트
+
+import os
+import sys
+import subprocess
+import tempfile
+import unittest
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.error_handlers import ErrorAnalyzer
+from src.journal import JsonlJournal, open_journal
+
+
+class TestJsonlJournal(unittest.TestCase):
+    """추가 전용 저널 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'events.jsonl')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_append_is_buffered_until_flush_or_full_buffer(self):
+        """버퍼가 찰 때까지는 파일에 쓰지 않고, 찬 뒤에는 한 번에 씀"""
+        journal = JsonlJournal(self.path, buffer_size=3)
+        journal.append({'n': 1})
+        journal.append({'n': 2})
+        self.assertFalse(os.path.exists(self.path))
+
+        journal.append({'n': 3})
+        with open(self.path) as f:
+            self.assertEqual(len(f.readlines()), 3)
+        self.assertEqual(journal.stats['flushes'], 1)
+
+        journal.append({'n': 4})
+        self.assertEqual([record['n'] for record in journal.replay()], [1, 2, 3, 4])
+
+    def test_rotation_keeps_order_and_bounds_files(self):
+        """크기를 넘으면 로테이션하고, 재생은 오래된 파일부터"""
+        journal = JsonlJournal(self.path, max_bytes=200, backup_count=2, buffer_size=1)
+        for n in range(40):
+            journal.append({'n': n, 'pad': 'x' * 20})
+
+        files = journal.files()
+        self.assertEqual(files[-1], self.path)
+        self.assertLessEqual(len(files), 3)
+        self.assertGreater(journal.stats['rotations'], 2)
+        for path in files:
+            self.assertLessEqual(os.path.getsize(path), 200)
+
+        numbers = [record['n'] for record in journal.replay()]
+        self.assertEqual(numbers, list(range(numbers[0], 40)))
+
+    def test_import_does_not_start_scheduler(self):
+        """모듈 import 와 저널 생성만으로는 스케줄러를 만들지 않고, 첫 기록 때 flush 작업 등록"""
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+        code = ("import os, sys, threading; sys.path.insert(0, os.getcwd())\n"
+                "import src.error_handlers, src.journal as j, src.scheduler as s\n"
+                "journal = j.JsonlJournal(sys.argv[1])\n"
+                "assert s._scheduler is None and j._flush_job is None, 'started early'\n"
+                "assert 'scheduler-timer' not in [t.name for t in threading.enumerate()]\n"
+                "journal.append({'n': 1})\n"
+                "assert j._flush_job is not None\n")
+        result = subprocess.run([sys.executable, '-c', code, self.path], cwd=root, capture_output=True, text=True,
+                                timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_replay_skips_truncated_line(self):
+        """중단으로 잘린 마지막 줄은 건너뜀"""
+        journal = open_journal(self.tmp.name, 'events')
+        journal.append({'n': 1})
+        journal.flush()
+        with open(self.path, 'a') as f:
+            f.write('{"n": 2, "trunc')
+        self.assertEqual(list(JsonlJournal(self.path).replay()), [{'n': 1}])
+
+
+class TestErrorAnalyzerJournal(unittest.TestCase):
+    """오류 분석기 저널/집계 테스트"""
+
+    def test_aggregates_survive_restart(self):
+        """오류는 저널에 한 줄씩 추가되고, 재시작 시 재생으로 집계가 복원됨"""
+        with tempfile.TemporaryDirectory() as log_dir:
+            analyzer = ErrorAnalyzer(log_dir=log_dir)
+            for _ in range(8):
+                analyzer.log_error('network', 'timeout')
+            analyzer.log_error('order', 'rejected', is_critical=True)
+            self.assertFalse(os.path.exists(os.path.join(log_dir, 'error_analysis.json')))
+            analyzer._save_error_log()
+
+            restored = ErrorAnalyzer(log_dir=log_dir)
+            self.assertEqual(restored.error_counts, {'network': 8, 'order': 1})
+            recurring = restored.recurring_errors['network:timeout']
+            self.assertEqual(recurring['count'], 8)
+            self.assertEqual(len(recurring['intervals']), ErrorAnalyzer.RECENT_INTERVALS)
+            self.assertIn('order:rejected', restored.critical_errors)
+
+            analysis = restored.log_error('network', 'timeout')
+            self.assertTrue(analysis['is_frequent'])
+            self.assertEqual(analysis['count'], 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
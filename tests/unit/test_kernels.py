@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 순차 계산 커널 단위 테스트
+
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src import kernels
+from src.kernels import ema, wilder_smooth, position_state_machine
+
+
+def _prices(n=3000, seed=11):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+
+
+def _reference_ema(values, period):
+    """기존 indicators.exponential_moving_average 반복문"""
+    n = len(values)
+    result = np.full(n, np.nan)
+    if period <= n:
+        result[period - 1] = np.nanmean(values[:period])
+        k = 2 / (period + 1)
+        for i in range(period, n):
+            if np.isnan(values[i]) or np.isnan(result[i - 1]):
+                result[i] = np.nan
+            else:
+                result[i] = (values[i] * k) + (result[i - 1] * (1 - k))
+    return result
+
+
+def _reference_wilder(values, period):
+    """기존 indicators.relative_strength_index 의 Wilder 평활 반복문"""
+    avg = pd.Series(values).rolling(window=period).mean()
+    for i in range(period, len(values)):
+        if pd.notna(avg.iloc[i - 1]):
+            avg.iloc[i] = (avg.iloc[i - 1] * (period - 1) + values[i]) / period
+    return avg.to_numpy()
+
+
+def _reference_positions(close, position_change, balance, commission, leverage):
+    """Backtester.run_backtest 의 캔들 단위 반복 규칙 (증거금 + 레버리지 포지션 평가 손익)"""
+    position = margin = entry_price = 0.0
+    cash, quantity, equity = [balance], [0.0], [balance]
+    for price, change in zip(close[1:], position_change[1:]):
+        if change > 0 and not position > 0 and balance > 0:
+            fee = balance * leverage * commission
+            position = (balance * leverage - fee) / price
+            margin, entry_price = balance - fee, price
+            balance = 0.0
+        elif change < 0 and position != 0:
+            value = max(margin + position * (price - entry_price), 0.0)
+            balance = value - min(position * price * commission, value)
+            position = 0.0
+        cash.append(balance)
+        quantity.append(position)
+        equity.append(max(margin + position * (price - entry_price), 0.0) if position else balance)
+    return np.array(cash), np.array(quantity), np.array(equity)
+
+
+def _signals(n, seed=12):
+    rng = np.random.default_rng(seed)
+    return rng.choice([-1.0, 0.0, 0.0, 0.0, 1.0], size=n)
+
+
+class TestNumpyKernels(unittest.TestCase):
+    """numpy 백엔드가 기존 반복문과 같은 결과를 내는지 확인"""
+
+    def test_ema_matches_loop(self):
+        """EMA (중간 NaN 이후 NaN 전파 포함)"""
+        values = _prices()
+        for period in (1, 5, 50, 3000, 4000):
+            np.testing.assert_allclose(ema(values, period, backend='numpy'), _reference_ema(values, period),
+                                       rtol=1e-12, equal_nan=True)
+        values[1500] = np.nan
+        np.testing.assert_allclose(ema(values, 20, backend='numpy'), _reference_ema(values, 20),
+                                   rtol=1e-12, equal_nan=True)
+
+    def test_wilder_matches_rsi_loop(self):
+        """RSI 의 Wilder 평활"""
+        gain = np.maximum(np.diff(_prices(), prepend=np.nan), 0)
+        gain = np.nan_to_num(gain)
+        for period in (2, 14, 100):
+            np.testing.assert_allclose(wilder_smooth(gain, period, backend='numpy'),
+                                       _reference_wilder(gain, period), rtol=1e-10, atol=1e-12,
+                                       equal_nan=True)
+
+    def test_position_state_machine_matches_run_backtest(self):
+        """run_backtest 의 포지션 상태 전이와 동일 (중복 신호 무시, 미청산 거래 포함)"""
+        close = _prices(5000)
+        position_change = _signals(5000)
+        position_change[0] = 1.0  # 첫 캔들 신호는 무시됨
+        for leverage in (1, 5, 50):
+            state = position_state_machine(close, position_change, 10000, 0.001, leverage, backend='numpy')
+            cash, quantity, equity = _reference_positions(close, position_change, 10000, 0.001, leverage)
+            np.testing.assert_allclose(state['cash'], cash, rtol=1e-12)
+            np.testing.assert_allclose(state['quantity'], quantity, rtol=1e-12)
+            np.testing.assert_allclose(state['equity'], equity, rtol=1e-12)
+            self.assertEqual(state['entries'][0], np.flatnonzero(position_change[1:] > 0)[0] + 1)
+            self.assertTrue(np.all(state['exits'][:-1] > state['entries'][:-1]))
+            # 거래별 수익률은 진입 전 자산 대비 청산 후 자산 변화
+            closed = state['exits'] >= 0
+            np.testing.assert_allclose(state['trade_returns'],
+                                       (cash[state['exits'][closed]] / state['entry_balances'][closed] - 1) * 100)
+
+    def test_loop_sources_match_numpy(self):
+        """numba 가 컴파일하는 반복문 원본도 (컴파일 없이) 같은 결과"""
+        values = _prices(800)
+        np.testing.assert_allclose(kernels._ema_loop(values, 20), ema(values, 20, backend='numpy'),
+                                   rtol=1e-12, equal_nan=True)
+        np.testing.assert_allclose(kernels._wilder_loop(values, 14), wilder_smooth(values, 14, backend='numpy'),
+                                   rtol=1e-12, equal_nan=True)
+        position_change = _signals(800)
+        loop_state = kernels._positions_loop(values, position_change, 1000.0, 0.001, 2.0)
+        numpy_state = position_state_machine(values, position_change, 1000, 0.001, 2, backend='numpy')
+        for loop_value, key in zip(loop_state, ('cash', 'quantity', 'equity', 'entries', 'exits', 'entry_amounts',
+                                                'entry_balances')):
+            np.testing.assert_array_equal(loop_value, numpy_state[key])
+
+    def test_backend_selection(self):
+        """백엔드 선택과 잘못된 이름 처리"""
+        with self.assertRaises(ValueError):
+            kernels.set_backend('cuda')
+        previous = kernels.get_backend()
+        try:
+            applied = kernels.set_backend('numba')
+            self.assertEqual(applied, 'numba' if kernels.numba is not None else 'numpy')
+            self.assertIn(applied, kernels.available_backends())
+        finally:
+            kernels.set_backend(previous)
+
+
+@unittest.skipIf(kernels.numba is None, "numba 가 설치되어 있지 않음")
+class TestNumbaKernels(unittest.TestCase):
+    """numba 백엔드와 numpy 백엔드의 결과 비교"""
+
+    def test_backends_agree(self):
+        """모든 커널이 두 백엔드에서 같은 결과"""
+        values = _prices()
+        values[2000] = np.nan
+        np.testing.assert_allclose(ema(values, 30, backend='numba'), ema(values, 30, backend='numpy'),
+                                   rtol=1e-12, equal_nan=True)
+        gain = np.maximum(np.nan_to_num(np.diff(values, prepend=values[0])), 0)
+        np.testing.assert_allclose(wilder_smooth(gain, 14, backend='numba'),
+                                   wilder_smooth(gain, 14, backend='numpy'), rtol=1e-10, atol=1e-12,
+                                   equal_nan=True)
+        close = _prices(5000)
+        position_change = _signals(5000)
+        numba_state = position_state_machine(close, position_change, 10000, 0.001, 3, backend='numba')
+        numpy_state = position_state_machine(close, position_change, 10000, 0.001, 3, backend='numpy')
+        for key in numpy_state:
+            np.testing.assert_array_equal(numba_state[key], numpy_state[key])
+
+
+if __name__ == '__main__':
+    unittest.main()
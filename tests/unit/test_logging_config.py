@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 비동기 로깅 파이프라인 단위 테스트
+
+import os
+import sys
+import json
+import logging
+import threading
+import unittest
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.logging_config import (
+    CompactJSONFormatter, LogSamplingFilter, LazyQueueHandler,
+    log_trade, setup_async_logging, stop_async_logging, trade_logger
+)
+
+
+class _ListHandler(logging.Handler):
+    """기록된 메시지를 리스트에 모으는 테스트 핸들러"""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.emit_threads = set()
+
+    def emit(self, record):
+        self.records.append(self.format(record))
+        self.emit_threads.add(threading.get_ident())
+
+
+class TestLoggingPipeline(unittest.TestCase):
+    """로깅 파이프라인 테스트"""
+
+    def setUp(self):
+        self.logger = logging.getLogger('test_async_pipeline')
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+        self.handler = _ListHandler()
+        self.handler.setFormatter(logging.Formatter('%(message)s'))
+        self.logger.handlers = [self.handler]
+
+    def tearDown(self):
+        stop_async_logging()
+        self.logger.handlers = []
+
+    def _make_record(self, msg, args=(), level=logging.INFO, created=None):
+        record = self.logger.makeRecord(self.logger.name, level, __file__, 1, msg, args, None)
+        if created is not None:
+            record.created = created
+        return record
+
+    def test_sampling_filter_limits_repeats(self):
+        """창 내 burst 건까지만 통과하고 다음 창에 생략 건수 기록"""
+        sampling = LogSamplingFilter(interval=10, burst=2)
+        passed = [sampling.filter(self._make_record("tick %s", (i,), created=100 + i * 0.1))
+                  for i in range(10)]
+        self.assertEqual(passed.count(True), 2)
+
+        record = self._make_record("tick %s", (99,), created=200)
+        self.assertTrue(sampling.filter(record))
+        self.assertEqual(record.suppressed, 8)
+
+        # WARNING 이상은 항상 통과
+        for _ in range(5):
+            self.assertTrue(sampling.filter(self._make_record("warn", level=logging.WARNING, created=201)))
+
+    def test_compact_json_formatter(self):
+        """한 줄 JSON 출력"""
+        record = self._make_record("가격 %.2f", (1.5,))
+        record.data = {'symbol': 'BTC/USDT'}
+        line = CompactJSONFormatter().format(record)
+        self.assertNotIn('\n', line)
+        parsed = json.loads(line)
+        self.assertEqual(parsed['m'], "가격 1.50")
+        self.assertEqual(parsed['l'], 'INFO')
+        self.assertEqual(parsed['d'], {'symbol': 'BTC/USDT'})
+
+    def test_lazy_handler_snapshots_mutable_args(self):
+        """변경 가능한 인자는 호출 시점 값으로 포맷"""
+        handler = LazyQueueHandler(None, 'route')
+        state = {'qty': 1}
+        record = handler.prepare(self._make_record("state %s", (state,)))
+        state['qty'] = 2
+        self.assertEqual(record.getMessage(), "state {'qty': 1}")
+
+        record = handler.prepare(self._make_record("value %d", (3,)))
+        self.assertEqual(record.args, (3,))
+
+    def test_async_logging_writes_from_listener_thread(self):
+        """비동기 설정 후 원래 핸들러가 백그라운드 스레드에서 기록"""
+        setup_async_logging(logger_names=[self.logger.name], sample_interval=0)
+        self.assertIsInstance(self.logger.handlers[0], LazyQueueHandler)
+
+        for i in range(20):
+            self.logger.info("message %d", i)
+        stop_async_logging()
+
+        self.assertEqual(self.handler.records, [f"message {i}" for i in range(20)])
+        self.assertNotIn(threading.get_ident(), self.handler.emit_threads)
+        self.assertEqual(self.logger.handlers, [self.handler])
+
+    def test_trade_logs_are_not_sampled(self):
+        """샘플링이 켜져 있어도 거래 로그는 모두 기록되고, 일반 로거만 샘플링됨"""
+        trade_handler = _ListHandler()
+        saved = trade_logger.handlers[:], trade_logger.propagate
+        trade_logger.handlers, trade_logger.propagate = [trade_handler], False
+        try:
+            setup_async_logging(logger_names=[trade_logger.name, self.logger.name],
+                                sample_interval=60, sample_burst=5)
+            for i in range(30):
+                log_trade('BUY', {'n': i})
+                self.logger.info("tick %d", i)
+            stop_async_logging()
+        finally:
+            trade_logger.handlers, trade_logger.propagate = saved
+
+        self.assertEqual(len(trade_handler.records), 30)
+        self.assertEqual(len(self.handler.records), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
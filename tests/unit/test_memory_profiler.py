@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 메모리 할당 프로파일러 단위 테스트
+
+import os
+import sys
+import tracemalloc
+import unittest
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.memory_monitor import MemoryMonitor, _frame_module
+
+_retained = []
+
+
+def _grow(count):
+    """테스트 모듈에서 객체를 할당해 유지"""
+    _retained.extend(bytearray(1024) for _ in range(count))
+
+
+class TestAllocationProfiler(unittest.TestCase):
+    """tracemalloc 스냅샷 비교 테스트"""
+
+    def setUp(self):
+        self.monitor = MemoryMonitor(auto_cleanup=False)
+
+    def tearDown(self):
+        self.monitor.stop_allocation_profiling()
+        _retained.clear()
+
+    def test_growth_attributed_to_allocating_module(self):
+        """스냅샷 사이의 증가분이 할당한 모듈과 위치로 집계"""
+        self.assertTrue(self.monitor.start_allocation_profiling(frames=5, top_n=10))
+        _grow(500)
+        report = self.monitor.take_allocation_snapshot()
+
+        top = report['interval']['subsystems'][0]
+        self.assertEqual(top['name'], 'tests.unit.test_memory_profiler')
+        self.assertGreater(top['size_diff_kb'], 400)
+        self.assertIn('test_memory_profiler.py', report['interval']['top_sites'][0]['site'])
+        self.assertGreater(report['cumulative']['growth_kb'], 400)
+
+        # 추가 할당이 없으면 구간 증가는 작고 누적 증가는 유지
+        report = self.monitor.take_allocation_snapshot()
+        self.assertLess(abs(report['interval']['growth_kb']), 100)
+        self.assertGreater(report['cumulative']['growth_kb'], 400)
+
+        data = self.monitor.get_allocation_report(top_n=1)
+        self.assertTrue(data['profiling'])
+        self.assertEqual(len(data['report']['cumulative']['subsystems']), 1)
+
+    def test_stop_releases_tracing(self):
+        """직접 시작한 tracemalloc 은 중지 시 함께 종료"""
+        if tracemalloc.is_tracing():
+            self.skipTest('tracemalloc 이 이미 실행 중')
+        self.monitor.start_allocation_profiling()
+        self.assertTrue(tracemalloc.is_tracing())
+        self.assertIsNotNone(self.monitor.stop_allocation_profiling())
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertIsNone(self.monitor.take_allocation_snapshot())
+
+    def test_frame_module_names(self):
+        """프로젝트 파일은 모듈명, 설치 패키지는 최상위 패키지명"""
+        import src.event_manager as event_manager
+        self.assertEqual(_frame_module(event_manager.__file__), 'src.event_manager')
+        self.assertEqual(_frame_module('/usr/lib/python3/site-packages/pandas/core/frame.py'), 'pandas')
+        self.assertIsNone(_frame_module('/usr/lib/python3.11/json/decoder.py'))
+
+
+if __name__ == '__main__':
+    unittest.main()
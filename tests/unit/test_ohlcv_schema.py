@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - OHLCV 자료형 압축 단위 테스트
+
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.ohlcv_schema import compact_ohlcv, float32_safe_decimals
+from src.resource_manager import ResourceManager
+
+
+def _raw(rows=1000):
+    rng = np.random.default_rng(5)
+    close = 65000 + np.cumsum(rng.normal(0, 25, rows)).round(2)
+    return pd.DataFrame({
+        'timestamp': 1_700_000_000_000 + np.arange(rows, dtype=np.int64) * 60_000,
+        'open': close + 0.01, 'high': close + 12.34, 'low': close - 7.89, 'close': close,
+        'volume': rng.uniform(0, 500, rows).round(3),
+        'market_type': 'futures', 'leverage': 10,
+        'side': rng.choice(['buy', 'sell'], rows),
+    })
+
+
+class TestCompactOHLCV(unittest.TestCase):
+    """값 손실 없는 OHLCV 압축 테스트"""
+
+    def test_compaction_is_lossless(self):
+        """가격은 float64, 거래량은 복원 가능한 float32, 상수 열은 메타데이터로 이동"""
+        raw = _raw()
+        compacted = compact_ohlcv(raw)
+
+        self.assertNotIn('market_type', compacted.columns)
+        self.assertEqual((compacted.attrs['market_type'], compacted.attrs['leverage']), ('futures', 10))
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(compacted['timestamp']))
+        self.assertEqual(compacted['timestamp'].iloc[1] - compacted['timestamp'].iloc[0], pd.Timedelta(minutes=1))
+        self.assertIsInstance(compacted['side'].dtype, pd.CategoricalDtype)
+        for column in ('open', 'high', 'low', 'close'):
+            self.assertEqual(compacted[column].dtype, np.float64)
+            self.assertTrue(np.array_equal(compacted[column].to_numpy(), raw[column].to_numpy()))
+
+        self.assertEqual(compacted['volume'].dtype, np.float32)
+        decimals = compacted.attrs['float32_decimals']['volume']
+        restored = np.round(compacted['volume'].to_numpy(np.float64), decimals)
+        self.assertTrue(np.array_equal(restored, raw['volume'].to_numpy()))
+
+        # 원본은 그대로
+        self.assertIn('market_type', raw.columns)
+        self.assertEqual(raw['volume'].dtype, np.float64)
+
+    def test_float32_only_when_recoverable(self):
+        """정밀도가 높거나 값이 큰 열은 float64 유지"""
+        self.assertEqual(float32_safe_decimals(np.array([1.5, 2.25, np.nan])), 2)
+        self.assertIsNone(float32_safe_decimals(np.random.default_rng(1).random(100)))
+        self.assertIsNone(float32_safe_decimals(np.array([65000.123, 1.0])))
+
+        df = pd.DataFrame({'close': [65000.12, 65001.5], 'sma': [65000.123456789, 65000.987654321]})
+        optimized = ResourceManager().optimize_dataframe(df)
+        self.assertEqual(optimized['close'].dtype, np.float64)
+        self.assertEqual(optimized['sma'].dtype, np.float64)
+        self.assertTrue(optimized.equals(df))
+
+
+if __name__ == '__main__':
+    unittest.main()
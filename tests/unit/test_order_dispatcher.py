@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 일괄 주문 디스패처 단위 테스트
+
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.fake_exchange import FakeExchangeServer
+from src.order_dispatcher import (
+    BulkOrderDispatcher, DISPATCH_OK, DISPATCH_FAILED, DISPATCH_UNKNOWN, DISPATCH_SKIPPED
+)
+from utils.api import create_binance_client
+
+
+class FakeExchangeAPI:
+    """가상 거래소에 연결된 ccxt 클라이언트를 감싼 테스트용 ExchangeAPI"""
+
+    def __init__(self, url, market_type):
+        self.exchange_id = 'binance'
+        self.market_type = market_type
+        with mock.patch.dict(os.environ, {'FAKE_EXCHANGE_URL': url}):
+            self.exchange = create_binance_client('key', 'secret', is_future=market_type == 'futures')
+        self.exchange.load_markets()
+
+
+class TestBulkOrderDispatcher(unittest.TestCase):
+    """가상 거래소 대상 일괄 주문 테스트"""
+
+    def setUp(self):
+        self.server = FakeExchangeServer(latency_ms=150)
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_futures_batch_in_one_round_trip(self):
+        """선물 주문은 batchOrders 로 묶여 한 번의 왕복으로 처리되고, 거부된 주문은 개별 실패로 집계"""
+        api = FakeExchangeAPI(self.server.url, 'futures')
+        orders = [{'symbol': symbol, 'side': 'buy', 'amount': 0.01, 'ref': i}
+                  for i, symbol in enumerate(['BTC/USDT:USDT', 'ETH/USDT:USDT'])]
+        orders.append({'symbol': 'ETH/USDT:USDT', 'side': 'sell', 'amount': 0.01, 'ref': 'close',
+                       'params': {'reduceOnly': True}})
+        result = BulkOrderDispatcher(api).dispatch(orders)
+
+        self.assertTrue(result['success'])
+        self.assertEqual((result['total'], result['succeeded'], result['requests']), (3, 3, 2))
+        self.assertEqual(self.server.stats['routes'].get('/fapi/v1/batchOrders'), 1)
+        # 같은 심볼의 청산 주문은 진입 주문 다음 라운드에 전송되어 포지션이 0이 됨
+        self.assertEqual(self.server.engine.position('ETHUSDT')['amount'], 0.0)
+        self.assertEqual([r['ref'] for r in result['results']], [0, 1, 'close'])
+
+        rejected = BulkOrderDispatcher(api).dispatch([
+            {'symbol': 'BTC/USDT:USDT', 'side': 'buy', 'amount': 0.01},
+            {'symbol': 'ETH/USDT:USDT', 'side': 'buy', 'amount': 1e9},
+        ])
+        self.assertEqual([r['status'] for r in rejected['results']], [DISPATCH_OK, DISPATCH_FAILED])
+        self.assertIn('insufficient', rejected['results'][1]['error'])
+        self.assertLess(rejected['elapsed'], 0.9)
+
+    def test_spot_falls_back_to_single_orders(self):
+        """현물은 일괄 주문 미지원이므로 개별 주문으로 전환"""
+        api = FakeExchangeAPI(self.server.url, 'spot')
+        dispatcher = BulkOrderDispatcher(api)
+        orders = [{'symbol': symbol, 'side': 'buy', 'amount': 0.01} for symbol in ('BTC/USDT', 'ETH/USDT')]
+        self.assertTrue(dispatcher.dispatch(orders)['success'])
+        self.assertEqual(dispatcher._batch_supported, {False: False})
+        self.assertEqual(self.server.stats['routes']['/api/v3/order'], 2)
+
+    def test_deadline_marks_in_flight_and_unsent_orders(self):
+        """마감 시간 초과 시 응답 대기 중 주문은 미확인, 다음 라운드 주문은 미전송"""
+        api = FakeExchangeAPI(self.server.url, 'futures')
+        self.server.latency_ms = 1000
+        result = BulkOrderDispatcher(api).dispatch([
+            {'symbol': 'BTC/USDT:USDT', 'side': 'buy', 'amount': 0.01},
+            {'symbol': 'BTC/USDT:USDT', 'side': 'sell', 'amount': 0.01},
+        ], deadline=0.3)
+        self.assertFalse(result['success'])
+        self.assertEqual([r['status'] for r in result['results']], [DISPATCH_UNKNOWN, DISPATCH_SKIPPED])
+        self.assertLess(result['elapsed'], 0.9)
+
+    def test_deadline_cancels_queued_requests(self):
+        """작업자를 기다리던 요청은 마감 후 전송되지 않고 미전송으로 집계"""
+        api = FakeExchangeAPI(self.server.url, 'spot')
+        self.server.latency_ms = 500
+        result = BulkOrderDispatcher(api, max_workers=1, use_batch=False).dispatch([
+            {'symbol': 'BTC/USDT', 'side': 'buy', 'amount': 0.01},
+            {'symbol': 'ETH/USDT', 'side': 'buy', 'amount': 0.01},
+        ], deadline=0.2)
+        self.assertEqual([r['status'] for r in result['results']], [DISPATCH_UNKNOWN, DISPATCH_SKIPPED])
+        self.assertEqual(result['requests'], 1)
+        time.sleep(0.8)
+        self.assertEqual(self.server.stats['routes'].get('/api/v3/order'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
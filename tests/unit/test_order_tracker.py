@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 주문 상태 추적기 단위 테스트
+
+import os
+import shutil
+import sys
+import logging
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.db_manager import DatabaseManager
+from src.event_manager import EventType, EventManager
+from src.exchange_api import ExchangeAPI
+from src.fake_exchange import FakeExchangeServer, WebSocketClient
+from src import order_tracker
+from src.order_tracker import OrderTracker, get_order_tracker, parse_order_event
+from utils.api import create_binance_client
+
+SYMBOL = 'BTC/USDT:USDT'
+
+
+class FakeExchangeAPI:
+    """가상 거래소에 연결된 ccxt 클라이언트를 감싼 테스트용 ExchangeAPI"""
+
+    def __init__(self, url):
+        self.exchange_id = 'binance'
+        self.market_type = 'futures'
+        with mock.patch.dict(os.environ, {'FAKE_EXCHANGE_URL': url}):
+            self.exchange = create_binance_client('key', 'secret', is_future=True)
+        self.rest_calls = 0
+
+    def get_open_orders(self, symbol=None):
+        self.rest_calls += 1
+        return self.exchange.fetch_open_orders(SYMBOL)
+
+    def get_order_status(self, order_id, symbol=None, use_tracker=True):
+        self.rest_calls += 1
+        return self.exchange.fetch_order(order_id, SYMBOL)
+
+
+def _report(order_id, status, filled='0', order_type='LIMIT', event_time=1):
+    return {'e': 'executionReport', 'E': event_time, 's': 'BTCUSDT', 'c': f'c{order_id}', 'S': 'SELL',
+            'o': order_type, 'f': 'GTC', 'q': '1', 'p': '100', 'P': '95', 'x': 'TRADE', 'X': status,
+            'i': order_id, 'l': filled, 'z': filled, 'L': '95', 'n': '0', 'N': 'USDT', 'T': event_time,
+            'Z': str(float(filled) * 95)}
+
+
+class TestOrderEvents(unittest.TestCase):
+    """스트림 이벤트 반영 테스트"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db = DatabaseManager(db_path=os.path.join(self.temp_dir, 'test.db'))
+        self.events = EventManager()
+        self.published = []
+        for event_type in (EventType.ORDER_CREATED, EventType.ORDER_FILLED, EventType.ORDER_CANCELED):
+            self.events.subscribe(event_type, lambda data: self.published.append(data['event_type']))
+        exchange_api = type('ExchangeAPIStub', (), {'market_type': 'spot', 'exchange': None})()
+        self.tracker = OrderTracker(exchange_api, self.db, self.events, stream_url='ws://unused')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _rows(self, query):
+        conn, cursor = self.db._get_connection()
+        cursor.execute(query)
+        return [tuple(row) for row in cursor.fetchall()]
+
+    def test_parse_futures_order_update(self):
+        """선물 ORDER_TRADE_UPDATE 를 ccxt 형식으로 변환"""
+        order = parse_order_event({'e': 'ORDER_TRADE_UPDATE', 'E': 5, 'T': 5, 'o': {
+            's': 'BTCUSDT', 'c': 'abc', 'S': 'BUY', 'o': 'STOP_MARKET', 'q': '0.5', 'p': '0', 'ap': '101.5',
+            'sp': '101', 'x': 'TRADE', 'X': 'FILLED', 'i': 77, 'l': '0.5', 'z': '0.5', 'L': '101.5',
+            'N': 'USDT', 'n': '0.02', 'R': True}}, lambda market_id: 'BTC/USDT:USDT')
+        self.assertEqual(order['id'], '77')
+        self.assertEqual(order['symbol'], 'BTC/USDT:USDT')
+        self.assertEqual((order['status'], order['type'], order['side']), ('closed', 'stop_market', 'buy'))
+        self.assertEqual((order['filled'], order['remaining'], order['average']), (0.5, 0.0, 101.5))
+        self.assertTrue(order['reduceOnly'])
+        self.assertIsNone(parse_order_event({'e': 'ACCOUNT_UPDATE'}))
+
+    def test_transitions_persist_and_ignore_stale_events(self):
+        """상태가 바뀔 때만 기록하고, 늦게 도착한 이전 상태는 무시"""
+        self.assertEqual(self.tracker.apply_event(_report(1, 'NEW'))['status'], 'open')
+        self.assertIsNone(self.tracker.apply_event(_report(1, 'NEW')))
+        self.tracker.apply_event(_report(1, 'PARTIALLY_FILLED', '0.4', event_time=2))
+        self.assertEqual(self.tracker.apply_event(_report(1, 'FILLED', '1', event_time=3))['status'], 'closed')
+        self.assertIsNone(self.tracker.apply_event(_report(1, 'PARTIALLY_FILLED', '0.4', event_time=2)))
+
+        self.assertEqual(self.tracker.get_order(1)['filled'], 1.0)
+        self.assertEqual(self.tracker.get_open_orders(), [])
+        self.assertEqual(self._rows("SELECT order_id, status FROM orders"), [('1', 'closed')])
+        self.assertEqual(self.published, [EventType.ORDER_CREATED.name, EventType.ORDER_FILLED.name])
+        self.assertEqual(self.tracker.get_stats()['stale_events'], 1)
+
+    def test_stop_loss_order_status_updated(self):
+        """손절 주문이 체결/취소되면 stop_loss_orders 상태 갱신"""
+        for order_id, order_type in ((10, 'stop_loss'), (11, 'take_profit')):
+            self.db.save_stop_loss_order(1, {'order_id': str(order_id), 'symbol': 'BTC/USDT',
+                                             'order_type': order_type, 'trigger_price': 95.0, 'amount': 1.0,
+                                             'side': 'sell'})
+        self.tracker.apply_event(_report(10, 'FILLED', '1', order_type='STOP_LOSS'))
+        self.tracker.apply_event(_report(11, 'CANCELED', order_type='TAKE_PROFIT'))
+        self.assertEqual(self._rows("SELECT order_id, status FROM stop_loss_orders ORDER BY order_id"),
+                         [('10', 'triggered'), ('11', 'cancelled')])
+
+    def test_reconcile_covers_every_tracked_symbol(self):
+        """정합성 확인은 기본 심볼뿐 아니라 미체결 주문이 있는 모든 심볼을 조회"""
+        class MultiSymbolAPI:
+            symbol = 'BTC/USDT'
+            market_type = 'spot'
+            exchange = None
+
+            def __init__(self):
+                self.queried = []
+
+            def get_open_orders(self, symbol=None):
+                self.queried.append(symbol)
+                return [{'id': '1', 'symbol': 'BTC/USDT', 'status': 'open', 'filled': 0.0}] \
+                    if symbol == 'BTC/USDT' else []
+
+            def get_order_status(self, order_id, symbol=None, use_tracker=True):
+                return {'id': order_id, 'symbol': symbol, 'status': 'closed', 'filled': 1.0}
+
+        api = MultiSymbolAPI()
+        tracker = OrderTracker(api, event_manager=self.events, stream_url='ws://unused')
+        tracker.track({'id': '2', 'symbol': 'ETH/USDT', 'status': 'open', 'filled': 0.0})
+        tracker.reconcile()
+        self.assertEqual(sorted(api.queried), ['BTC/USDT', 'ETH/USDT'])
+        self.assertEqual(tracker.get_order('2')['status'], 'closed')
+        self.assertEqual([o['id'] for o in tracker.get_open_orders()], ['1'])
+
+    def test_open_orders_served_from_tracker_only_after_reconcile(self):
+        """스트림 연결 중에도 정합성 확인 전인 심볼은 REST 로 조회하고, 이후에는 메모리에서 응답"""
+        api = ExchangeAPI.__new__(ExchangeAPI)
+        api.exchange_id, api.market_type, api.symbol = 'binance', 'futures', 'BTC/USDT'
+        api.logger = logging.getLogger('test_order_tracker')
+        api.exchange = mock.Mock(markets={'ETHUSDT': {}})
+        api.exchange.safe_symbol.side_effect = lambda market_id, *args: {'ETHUSDT': 'ETH/USDT:USDT'}[market_id]
+        api.exchange.fetch_open_orders.return_value = [
+            {'id': '5', 'symbol': 'ETH/USDT:USDT', 'status': 'open', 'amount': 1.0, 'filled': 0.0}]
+        tracker = OrderTracker(api, event_manager=self.events, stream_url='ws://unused')
+        api.order_tracker = tracker
+        tracker._connected.set()
+
+        self.assertFalse(tracker.covers('ETH/USDT'))
+        self.assertEqual([o['id'] for o in api.get_open_orders('ETH/USDT')], ['5'])
+        self.assertEqual(api.exchange.fetch_open_orders.call_count, 1)
+
+        # 조회한 심볼은 이후 통합/거래소 형식 모두 메모리에서 응답
+        self.assertTrue(tracker.covers('ETH/USDT'))
+        self.assertEqual([o['id'] for o in api.get_open_orders('ETH/USDT')], ['5'])
+        self.assertEqual([o['id'] for o in tracker.get_open_orders('ETHUSDT')], ['5'])
+        self.assertEqual(api.exchange.fetch_open_orders.call_count, 1)
+
+    def test_registry_separates_accounts(self):
+        """API 키나 테스트넷 여부가 다르면 서로 다른 주문 추적기 사용"""
+        def api(key, url):
+            return SimpleNamespace(exchange_id='binance', market_type='futures',
+                                   exchange=SimpleNamespace(apiKey=key, urls={'api': url}))
+
+        saved = dict(order_tracker._trackers)
+        try:
+            live = get_order_tracker(api('key-a', 'https://live'))
+            self.assertIs(get_order_tracker(api('key-a', 'https://live')), live)
+            self.assertIsNot(get_order_tracker(api('key-b', 'https://live')), live)
+            self.assertIsNot(get_order_tracker(api('key-a', 'https://testnet')), live)
+        finally:
+            order_tracker._trackers.clear()
+            order_tracker._trackers.update(saved)
+
+    def test_start_without_websocket_client_falls_back(self):
+        """websocket-client 가 없으면 스트림을 시작하지 않음"""
+        with mock.patch('src.order_tracker.websocket', None):
+            self.assertFalse(self.tracker.start())
+        self.assertIsNone(self.tracker._thread)
+        self.assertFalse(self.tracker.connected)
+
+
+class TestOrderTrackerStream(unittest.TestCase):
+    """가상 거래소 사용자 데이터 스트림 연동 테스트"""
+
+    def setUp(self):
+        self.server = FakeExchangeServer(stream_interval=0.05)
+        self.server.start()
+        self.exchange_api = FakeExchangeAPI(self.server.url)
+        self.tracker = OrderTracker(self.exchange_api, event_manager=EventManager(),
+                                    connector=lambda url: WebSocketClient(url, timeout=0.2),
+                                    stream_url=f"{self.server.ws_url}/ws", reconnect_delay=0.1)
+
+    def tearDown(self):
+        self.tracker.stop()
+        self.server.stop()
+
+    def _wait_for(self, condition, timeout=5.0):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if condition():
+                return True
+            time.sleep(0.02)
+        return False
+
+    def test_stream_updates_and_reconcile_on_reconnect(self):
+        """연결 중에는 스트림으로 상태를 받고, 끊긴 동안의 변경은 재연결 시 REST로 확인"""
+        self.tracker.start()
+        self.assertTrue(self.tracker.wait_connected(5))
+        calls_after_connect = self.exchange_api.rest_calls
+
+        price = self.exchange_api.exchange.fetch_ticker(SYMBOL)['last']
+        resting = self.exchange_api.exchange.create_order(SYMBOL, 'limit', 'buy', 0.01, round(price * 0.5, 1))
+        filled = self.exchange_api.exchange.create_order(SYMBOL, 'market', 'buy', 0.01)
+        self.assertTrue(self._wait_for(lambda: (self.tracker.get_order(filled['id']) or {}).get('status') == 'closed'))
+        self.assertEqual([o['id'] for o in self.tracker.get_open_orders(SYMBOL)], [resting['id']])
+        self.assertEqual(self.exchange_api.rest_calls, calls_after_connect)
+
+        # 연결이 끊긴 동안 취소된 주문은 재연결 시 정합성 확인으로 반영
+        self.tracker.stop()
+        self.server.engine.cancel_order('future', 'BTCUSDT', int(resting['id']))
+        self.tracker.start()
+        self.assertTrue(self.tracker.wait_connected(5))
+        self.assertEqual(self.tracker.get_order(resting['id'])['status'], 'canceled')
+        self.assertEqual(self.tracker.get_stats()['connects'], 2)
+        self.assertEqual(self.tracker.get_open_orders(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 다종목 패널 전략 단위 테스트
+
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.kernels import ema, wilder_smooth, position_state_machine
+from src.panel_strategies import (
+    Panel, PanelMovingAverageCrossover, PanelRSIStrategy, PanelScanner, backtest_panel, rsi_2d, ema_2d
+)
+
+
+def _frames(n_symbols=6, n=1500, seed=31):
+    """상장 시점과 빠진 캔들이 서로 다른 종목별 OHLCV"""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-01', periods=n, freq='h')
+    frames = {}
+    for k in range(n_symbols):
+        close = 10 * (k + 1) * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        df = pd.DataFrame({'open': close, 'high': close * 1.002, 'low': close * 0.998, 'close': close,
+                           'volume': rng.uniform(1, 10, n)}, index=index)
+        frames[f"COIN{k}/USDT"] = df.iloc[k * 100:]
+    return frames
+
+
+def _reference_rsi(close, period):
+    """단일 종목 indicators.relative_strength_index 계산식"""
+    delta = pd.Series(close).diff()
+    gain = delta.where(delta > 0, 0).to_numpy()
+    loss = (-delta.where(delta < 0, 0)).to_numpy()
+    avg_gain = wilder_smooth(gain, period)
+    avg_loss = wilder_smooth(loss, period)
+    avg_loss = np.where(avg_loss == 0, 0.001, avg_loss)
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+def _reference_ma_signals(df, short_period, long_period):
+    """단일 종목 MovingAverageCrossover.generate_signals 신호 규칙"""
+    short_ma = df['close'].rolling(short_period).mean().to_numpy()
+    long_ma = df['close'].rolling(long_period).mean().to_numpy()
+    rsi = _reference_rsi(df['close'].to_numpy(), 14)
+    volume = df['volume'].to_numpy()
+    volume_ma = df['volume'].rolling(20).mean().to_numpy()
+    signals = np.zeros(len(df))
+    for i in range(1, len(df)):
+        prev_diff = short_ma[i - 1] - long_ma[i - 1]
+        curr_diff = short_ma[i] - long_ma[i]
+        if prev_diff <= 0 and curr_diff > 0:
+            signals[i] = 1 if rsi[i] < 70 and volume[i] > volume_ma[i] * 0.5 else 0
+        elif prev_diff >= 0 and curr_diff < 0:
+            signals[i] = -1 if rsi[i] > 30 and volume[i] > volume_ma[i] * 0.5 else 0
+        else:
+            signals[i] = signals[i - 1]
+    return signals
+
+
+def _reference_rsi_signals(close, period, overbought, oversold):
+    """단일 종목 RSIStrategy.generate_signals 신호 규칙"""
+    rsi = _reference_rsi(close, period)
+    signals = np.zeros(len(close))
+    for i in range(1, len(close)):
+        if rsi[i] < oversold and rsi[i - 1] >= oversold:
+            signals[i] = 1
+        elif rsi[i] > overbought and rsi[i - 1] <= overbought:
+            signals[i] = -1
+        else:
+            signals[i] = signals[i - 1]
+    return signals
+
+
+class FakeExchange:
+    """get_ohlcv 만 제공하는 테스트용 거래소"""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.calls = []
+
+    def get_ohlcv(self, symbol=None, timeframe=None, limit=100):
+        self.calls.append((symbol, timeframe, limit))
+        if symbol not in self.frames:
+            raise RuntimeError("unknown symbol")
+        return self.frames[symbol].tail(limit).reset_index(names='timestamp')
+
+
+class TestPanelStrategies(unittest.TestCase):
+    """패널 전략 테스트"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.frames = _frames()
+        cls.panel = Panel.from_frames(cls.frames)
+
+    def test_panel_alignment(self):
+        """상장 전 NaN, 빠진 캔들은 직전 종가와 거래량 0"""
+        frames = dict(self.frames)
+        frames['GAP/USDT'] = self.frames['COIN0/USDT'].drop(self.frames['COIN0/USDT'].index[500])
+        panel = Panel.from_frames(frames)
+        self.assertEqual(panel.shape, (1500, 7))
+        np.testing.assert_array_equal(panel.first_valid()[:3], [0, 100, 200])
+        self.assertTrue(np.isnan(panel.close[99, 1]))
+        gap = panel.symbols.index('GAP/USDT')
+        self.assertEqual(panel.close[500, gap], panel.close[499, gap])
+        self.assertEqual(panel.volume[500, gap], 0.0)
+        pd.testing.assert_frame_equal(panel.symbol_frame('COIN2/USDT'), self.frames['COIN2/USDT'],
+                                      check_freq=False)
+
+    def test_indicators_match_single_symbol(self):
+        """종목별 지표가 단일 종목 계산과 동일"""
+        rsi = rsi_2d(self.panel.close, 14)
+        ema_values = ema_2d(self.panel.close, 21)
+        for column, (symbol, df) in enumerate(self.frames.items()):
+            start = self.panel.first_valid()[column]
+            close = df['close'].to_numpy()
+            np.testing.assert_allclose(rsi[start:, column], _reference_rsi(close, 14), rtol=1e-9,
+                                       equal_nan=True)
+            np.testing.assert_allclose(ema_values[start:, column], ema(close, 21), rtol=1e-12,
+                                       equal_nan=True)
+            self.assertTrue(np.all(np.isnan(rsi[:start, column])))
+
+    def test_signals_match_single_symbol_strategies(self):
+        """패널 신호가 종목별 단일 전략 신호 규칙과 동일"""
+        ma_signals = PanelMovingAverageCrossover(short_period=10, long_period=30).generate_panel_signals(self.panel)
+        rsi_signals = PanelRSIStrategy(period=14, overbought=65, oversold=35).generate_panel_signals(self.panel)
+        for symbol, df in self.frames.items():
+            frame = ma_signals.symbol_frame(symbol)
+            np.testing.assert_array_equal(frame['signal'].to_numpy(), _reference_ma_signals(df, 10, 30))
+            np.testing.assert_array_equal(frame['position'].to_numpy(),
+                                          np.diff(frame['signal'].to_numpy(), prepend=0))
+            np.testing.assert_array_equal(rsi_signals.symbol_frame(symbol)['signal'].to_numpy(),
+                                          _reference_rsi_signals(df['close'].to_numpy(), 14, 65, 35))
+        self.assertGreater(np.abs(ma_signals.position).sum(), 0)
+
+    def test_backtest_panel(self):
+        """종목별 백테스트가 단일 종목 포지션 상태 전이와 같은 최종 자산"""
+        signals = PanelRSIStrategy(period=14, overbought=65, oversold=35).generate_panel_signals(self.panel)
+        summary = backtest_panel(signals, initial_balance=1000, commission=0.001)
+        self.assertEqual(set(summary.index), set(self.panel.symbols))
+        self.assertTrue(summary['percent_return'].is_monotonic_decreasing)
+        frame = signals.symbol_frame('COIN3/USDT')
+        state = position_state_machine(frame['close'].to_numpy(), frame['position'].to_numpy(), 1000, 0.001)
+        expected = state['cash'][-1] + state['quantity'][-1] * frame['close'].iloc[-1]
+        self.assertAlmostEqual(summary.loc['COIN3/USDT', 'final_balance'], expected)
+
+    def test_scanner(self):
+        """스캐너는 종목별 최근 캔들을 받아 최신 신호를 계산 (실패 종목 제외)"""
+        exchange = FakeExchange(self.frames)
+        strategy = PanelRSIStrategy()
+        scanner = PanelScanner(exchange, list(self.frames) + ['MISSING/USDT'], strategy, timeframe='1h', limit=300)
+        latest = scanner.scan()
+        self.assertEqual(set(latest.index), set(self.frames))
+        self.assertEqual(len(exchange.calls), len(self.frames) + 1)
+        expected = strategy.generate_panel_signals(Panel.from_frames(
+            {symbol: df.tail(300) for symbol, df in self.frames.items()})).latest()
+        pd.testing.assert_frame_equal(latest.sort_index(), expected.sort_index())
+
+
+if __name__ == '__main__':
+    unittest.main()
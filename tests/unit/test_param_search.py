@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 전략 파라미터 탐색 단위 테스트
+
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.param_search import (
+    ParamSpace, SearchBudget, SearchEvaluator, GridSearch, RandomSearch,
+    SuccessiveHalving, TPESearch, get_search_strategy
+)
+
+
+class SmaCross:
+    """테스트용 이동평균 교차 전략"""
+
+    def __init__(self, short_period=5, long_period=20):
+        if short_period >= long_period:
+            raise ValueError("short_period는 long_period보다 작아야 합니다")
+        self.short_period = short_period
+        self.long_period = long_period
+
+    def generate_signals(self, df):
+        df = df.copy()
+        short_ma = df['close'].rolling(self.short_period).mean()
+        long_ma = df['close'].rolling(self.long_period).mean()
+        df['signal'] = np.where(short_ma > long_ma, 1, 0)
+        df['position'] = df['signal'].diff().fillna(0)
+        return df
+
+
+def _ohlcv(n=6000, seed=21):
+    rng = np.random.default_rng(seed)
+    # 추세 구간이 섞인 가격 (교차 전략의 파라미터에 따라 성과가 달라지도록)
+    drift = np.repeat(rng.normal(0, 0.0005, n // 500 + 1), 500)[:n]
+    close = 100 * np.exp(np.cumsum(drift + rng.normal(0, 0.004, n)))
+    index = pd.date_range('2023-01-01', periods=n, freq='h')
+    return pd.DataFrame({'open': close, 'high': close, 'low': close, 'close': close, 'volume': 1.0},
+                        index=index)
+
+
+GRID = {'short_period': [3, 5, 8, 12, 16, 20, 25, 30], 'long_period': [20, 30, 40, 60, 80, 100, 150, 200]}
+
+
+class TestParamSearch(unittest.TestCase):
+    """파라미터 탐색 테스트"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.df = _ohlcv()
+        cls.grid_result = GridSearch().search(ParamSpace(GRID), SearchEvaluator(SmaCross, cls.df))
+        cls.grid_scores = np.sort([h['score'] for h in cls.grid_result.history if np.isfinite(h['score'])])
+
+    def _rank(self, score):
+        """그리드 전체 점수 중 상위 비율 (0이 최고)"""
+        return float((self.grid_scores > score).mean())
+
+    def test_param_space_sampling(self):
+        """조합 번호 변환과 중복 없는 추출"""
+        space = ParamSpace({'a': [1, 2, 3], 'b': ['x', 'y']})
+        self.assertEqual(space.size, 6)
+        self.assertEqual(space.params(space.decode(5)), {'a': 3, 'b': 'y'})
+        samples = space.sample(np.random.default_rng(0), 10)
+        self.assertEqual(len(samples), 6)
+        self.assertEqual(len(set(samples)), 6)
+
+    def test_evaluation_cache_is_shared(self):
+        """같은 평가기를 쓰는 탐색끼리 결과를 재사용"""
+        evaluator = SearchEvaluator(SmaCross, self.df)
+        RandomSearch(n_candidates=10, seed=1).search(ParamSpace(GRID), evaluator)
+        evaluations = evaluator.evaluations
+        result = RandomSearch(n_candidates=10, seed=1).search(ParamSpace(GRID), evaluator)
+        self.assertEqual(evaluator.evaluations, evaluations)
+        self.assertEqual(result.cache_hits, 10)
+
+    def test_budget_limits_cost(self):
+        """평가 예산을 넘지 않음"""
+        evaluator = SearchEvaluator(SmaCross, self.df)
+        result = get_search_strategy('random', seed=3).search(ParamSpace(GRID), evaluator,
+                                                              SearchBudget(max_evals=5))
+        self.assertEqual(len(result.history), 5)
+        self.assertLessEqual(result.cost, 5)
+
+    def test_invalid_params_score_negative_infinity(self):
+        """전략 생성이 실패한 조합은 -inf"""
+        evaluator = SearchEvaluator(SmaCross, self.df)
+        self.assertEqual(evaluator.evaluate({'short_period': 30, 'long_period': 20}), -np.inf)
+
+    def test_successive_halving_finds_good_params_cheaply(self):
+        """successive halving은 그리드 비용의 일부로 상위권 파라미터를 찾음"""
+        result = SuccessiveHalving(n_candidates=64, eta=3, min_fraction=1 / 9, seed=0).search(
+            ParamSpace(GRID), SearchEvaluator(SmaCross, self.df))
+        self.assertLess(result.cost, self.grid_result.cost * 0.5)
+        self.assertTrue(all(h['fraction'] >= 1 for h in result.history[-3:]))
+        self.assertLessEqual(self._rank(result.best_score), 0.25)
+
+    def test_tpe_finds_good_params_cheaply(self):
+        """TPE는 그리드의 절반 이하 평가로 상위권 파라미터를 찾음"""
+        result = TPESearch(n_trials=25, n_startup=8, seed=0).search(
+            ParamSpace(GRID), SearchEvaluator(SmaCross, self.df))
+        self.assertEqual(len(result.history), 25)
+        self.assertEqual(len({tuple(sorted(h['params'].items())) for h in result.history}), 25)
+        self.assertLessEqual(self._rank(result.best_score), 0.25)
+
+    def test_unknown_strategy(self):
+        """지원하지 않는 탐색 전략 이름"""
+        with self.assertRaises(ValueError):
+            get_search_strategy('anneal')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 성과 통계 증분 집계 단위 테스트
+
+import os
+import sys
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.db_manager import DatabaseManager
+
+
+def _trade(symbol, profit, timestamp, strategy='ma_crossover'):
+    return {'symbol': symbol, 'side': 'sell', 'order_type': 'market', 'amount': 0.1, 'price': 30000.0,
+            'cost': 3000.0, 'fee': 1.2, 'timestamp': timestamp,
+            'additional_info': {'profit': profit, 'strategy': strategy}}
+
+
+class TestPerformanceStats(unittest.TestCase):
+    """거래/청산 기록 시 성과 집계 갱신 테스트"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'test.db')
+        self.db = DatabaseManager(db_path=self.db_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _by_key(self, scope, source='trade'):
+        return {row['scope_key']: row for row in self.db.get_performance_stats(source=source, scope=scope)}
+
+    def test_trade_insert_updates_all_scopes(self):
+        """거래 저장 시 전체/심볼/전략/일별 집계와 누적 손익, 최대 낙폭이 갱신됨"""
+        # 누적 손익: 10 → 30 → 5 → -5 → 15 (최고 30, 최대 낙폭 35)
+        self.db.save_trade(_trade('BTC/USDT', 10, '2024-01-01T10:00:00'))
+        self.db.save_trade(_trade('BTC/USDT', 20, '2024-01-01T11:00:00'))
+        self.db.save_trade(_trade('ETH/USDT', -25, '2024-01-02T09:00:00', strategy='rsi'))
+        self.db.save_trade(_trade('ETH/USDT', -10, '2024-01-02T10:00:00', strategy='rsi'))
+        self.db.save_trade(_trade('BTC/USDT', 20, 1704240000000))  # 2024-01-03 (밀리초)
+
+        total = self._by_key('all')['']
+        self.assertEqual((total['trade_count'], total['win_count'], total['loss_count']), (5, 3, 2))
+        self.assertAlmostEqual(total['gross_profit'], 50)
+        self.assertAlmostEqual(total['gross_loss'], 35)
+        self.assertAlmostEqual(total['equity'], 15)
+        self.assertAlmostEqual(total['peak_equity'], 30)
+        self.assertAlmostEqual(total['max_drawdown'], 35)
+        self.assertAlmostEqual(total['win_rate'], 60)
+
+        symbols = self._by_key('symbol')
+        self.assertEqual(symbols['BTC/USDT']['trade_count'], 3)
+        self.assertAlmostEqual(symbols['ETH/USDT']['max_drawdown'], 35)
+        self.assertEqual(set(self._by_key('strategy')), {'ma_crossover', 'rsi'})
+        self.assertEqual(set(self._by_key('day')), {'2024-01-01', '2024-01-02', '2024-01-03'})
+
+        self.assertEqual(self.db.load_performance_stats(), {
+            'total_profit': '15.00', 'win_rate': '60.0%', 'avg_profit': '3.00',
+            'total_trades': 5, 'win_trades': 3, 'loss_trades': 2
+        })
+
+    def test_position_counted_once_when_closed(self):
+        """포지션은 청산으로 바뀔 때 한 번만 집계됨"""
+        position_id = self.db.save_position({'symbol': 'BTC/USDT', 'side': 'long', 'contracts': 1,
+                                             'entry_price': 30000, 'pnl': 0})
+        self.assertEqual(self._by_key('all', source='position'), {})
+
+        self.db.update_position(position_id, {'status': 'closed', 'pnl': 42.5,
+                                              'closed_at': '2024-02-01T00:00:00'})
+        self.db.update_position(position_id, {'status': 'closed', 'pnl': 42.5})
+        self.db.save_position({'symbol': 'ETH/USDT', 'side': 'short', 'contracts': 1, 'entry_price': 2000,
+                               'pnl': -7.5})
+        self.db.close_positions([('ETH/USDT', 'short')])
+
+        total = self._by_key('all', source='position')['']
+        self.assertEqual((total['trade_count'], total['win_count'], total['loss_count']), (2, 1, 1))
+        self.assertAlmostEqual(total['net_profit'], 35)
+        self.assertIn('2024-02-01', self._by_key('day', source='position'))
+        self.assertEqual(self.db.verify_performance_stats(), [])
+
+    def test_rebuild_matches_incremental_and_detects_drift(self):
+        """재계산 결과가 증분 집계와 같고, 직접 수정한 기록은 검증에서 드러남"""
+        for i, profit in enumerate([5, -3, 8, -12, 4]):
+            self.db.save_trade(_trade('BTC/USDT' if i % 2 else 'XRP/USDT', profit, f"2024-03-0{i + 1}T00:00:00"))
+        incremental = self._by_key('symbol')
+        self.assertEqual(self.db.verify_performance_stats(), [])
+
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("INSERT INTO trades (symbol, side, order_type, amount, price, cost, timestamp, additional_info) "
+                     "VALUES ('BTC/USDT', 'sell', 'market', 1, 1, 1, '2024-03-09', '{\"profit\": 100}')")
+        conn.commit()
+        conn.close()
+        mismatches = self.db.verify_performance_stats()
+        self.assertIn(('symbol', 'BTC/USDT', 'trade_count'),
+                      {(m['scope'], m['scope_key'], m['column']) for m in mismatches})
+
+        self.assertGreater(self.db.rebuild_performance_stats(), 0)
+        self.assertEqual(self.db.verify_performance_stats(), [])
+        rebuilt = self._by_key('symbol')
+        self.assertEqual(rebuilt['XRP/USDT']['trade_count'], incremental['XRP/USDT']['trade_count'])
+        self.assertAlmostEqual(rebuilt['XRP/USDT']['max_drawdown'], incremental['XRP/USDT']['max_drawdown'])
+        self.assertEqual(rebuilt['BTC/USDT']['trade_count'], 3)
+
+    def test_exchange_trades_saved_once_across_restarts(self):
+        """거래소 동기화 거래는 거래소 거래 ID 기준으로 한 번만 저장되고 집계됨 (재시작 후에도)"""
+        fills = [{'id': str(n), 'order_id': f'o{n}', 'symbol': 'BTC/USDT', 'side': 'buy', 'type': 'limit',
+                  'price': 30000.0, 'amount': 0.01, 'cost': 300.0, 'fee': {'cost': 0.3, 'currency': 'USDT'},
+                  'datetime': f'2024-05-0{n}T00:00:00', 'market_type': 'spot'} for n in (1, 2)]
+        self.assertEqual([self.db.save_exchange_trade(t) is not None for t in fills], [True, True])
+        self.assertIsNone(self.db.save_exchange_trade(fills[0]))
+
+        reopened = DatabaseManager(db_path=self.db_path)
+        self.assertEqual([reopened.save_exchange_trade(t) for t in fills], [None, None])
+        self.assertEqual(len(reopened.get_trades()), 2)
+        self.assertEqual(reopened.load_performance_stats()['total_trades'], 2)
+        self.assertEqual(reopened.verify_performance_stats(), [])
+
+    def test_existing_database_is_backfilled(self):
+        """집계 테이블이 없던 기존 DB 는 처음 열 때 기존 기록으로 채워짐"""
+        self.db.save_trade(_trade('BTC/USDT', 7, '2024-04-01T00:00:00'))
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("DROP TABLE performance_stats")
+        conn.commit()
+        conn.close()
+
+        reopened = DatabaseManager(db_path=self.db_path)
+        self.assertEqual(reopened.load_performance_stats()['total_trades'], 1)
+        self.assertEqual(reopened.verify_performance_stats(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
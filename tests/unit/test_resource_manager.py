@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 자원 관리자 데이터프레임 캐시 단위 테스트
+
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.resource_manager import ResourceManager
+
+
+def _ohlcv(rows):
+    return pd.DataFrame({column: np.arange(rows, dtype=np.float64)
+                         for column in ('open', 'high', 'low', 'close', 'volume')})
+
+
+class TestDataFrameCache(unittest.TestCase):
+    """메모리 예산 기반 데이터프레임 캐시 테스트"""
+
+    def test_cached_frames_are_shared_not_copied(self):
+        """조회 시 데이터를 복사하지 않으며, 반환된 프레임을 수정해도 캐시는 그대로"""
+        manager = ResourceManager()
+        df = _ohlcv(1000)
+        self.assertTrue(manager.cache_dataframe('BTC/USDT_1h', df))
+
+        first = manager.get_cached_dataframe('BTC/USDT_1h')
+        second = manager.get_cached_dataframe('BTC/USDT_1h')
+        self.assertTrue(np.shares_memory(first['close'].to_numpy(), second['close'].to_numpy()))
+
+        try:
+            first.loc[0, 'close'] = -1.0
+        except ValueError:
+            pass  # Copy-on-Write 가 없는 pandas 에서는 읽기 전용 배열 수정 오류
+        df.loc[1, 'close'] = -1.0
+        cached = manager.get_cached_dataframe('BTC/USDT_1h', copy=True)
+        self.assertEqual(cached['close'].iloc[:2].tolist(), [0.0, 1.0])
+        self.assertFalse(np.shares_memory(cached['close'].to_numpy(), second['close'].to_numpy()))
+
+    def test_evicts_least_recently_used_within_byte_budget(self):
+        """메모리 예산을 넘으면 가장 오래 전에 조회한 항목부터 제거"""
+        size = int(_ohlcv(1000).memory_usage(deep=True).sum())
+        manager = ResourceManager(max_dataframe_cache_bytes=size * 2 + size // 2)
+        manager.cache_dataframe('a', _ohlcv(1000))
+        manager.cache_dataframe('b', _ohlcv(1000))
+        manager.get_cached_dataframe('a')
+        manager.cache_dataframe('c', _ohlcv(1000))
+
+        self.assertIsNone(manager.get_cached_dataframe('b'))
+        stats = manager.get_resource_stats()['dataframe_cache']
+        self.assertEqual(stats['keys'], ['a', 'c'])
+        self.assertEqual(stats['bytes'], size * 2)
+        self.assertEqual((stats['hits'], stats['misses'], stats['evictions']), (1, 1, 1))
+        self.assertAlmostEqual(stats['hit_rate'], 0.5)
+
+        # 예산보다 큰 프레임은 저장하지 않음
+        self.assertFalse(manager.cache_dataframe('big', _ohlcv(3000)))
+        manager.remove_from_cache('a')
+        self.assertEqual(manager.get_resource_stats()['dataframe_cache']['bytes'], size)
+        self.assertEqual(manager.clear_cache(), 1)
+        self.assertEqual(manager.cache_bytes, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
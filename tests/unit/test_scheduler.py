@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 주기 작업 스케줄러 단위 테스트
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.scheduler import (MISSED_CATCH_UP, MISSED_RUN_ONCE, MISSED_SKIP, PeriodicScheduler,
+                           ScheduledJob)
+
+
+def _wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestMissedPolicy(unittest.TestCase):
+    """밀린 실행 정책별 다음 예약 시각 테스트 (스레드 없이 계산만 확인)"""
+
+    def _next_after_overrun(self, policy):
+        scheduler = PeriodicScheduler()
+        job = ScheduledJob(scheduler, 'slow', lambda: None, 10.0, 0.0, policy)
+        job.scheduled_at = 100.0
+        # 10초 간격 작업이 35초 걸려 끝남 → 110, 120, 130 세 번을 놓침
+        scheduler._schedule_next(job, now=135.0)
+        return job
+
+    def test_skip_keeps_phase(self):
+        """skip: 놓친 실행은 버리고 원래 위상의 다음 시각(140)에 실행"""
+        job = self._next_after_overrun(MISSED_SKIP)
+        self.assertEqual(job.scheduled_at, 140.0)
+        self.assertEqual(job.stats['missed'], 3)
+
+    def test_run_once_collapses_missed_runs(self):
+        """run_once: 한 번만 즉시 실행"""
+        job = self._next_after_overrun(MISSED_RUN_ONCE)
+        self.assertEqual(job.scheduled_at, 135.0)
+        self.assertEqual(job.stats['missed'], 2)
+
+    def test_catch_up_runs_every_missed_slot(self):
+        """catch_up: 놓친 첫 시각부터 차례로 실행"""
+        job = self._next_after_overrun(MISSED_CATCH_UP)
+        self.assertEqual(job.scheduled_at, 110.0)
+        self.assertEqual(job.stats['missed'], 0)
+        scheduler = job.scheduler
+        scheduler._schedule_next(job, now=135.1)
+        self.assertEqual(job.scheduled_at, 120.0)
+
+
+class TestPeriodicScheduler(unittest.TestCase):
+    """실행 스레드를 사용하는 스케줄러 테스트"""
+
+    def setUp(self):
+        self.scheduler = PeriodicScheduler(max_workers=2)
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+
+    def test_runs_periodically_with_stats(self):
+        """간격마다 실행되고 실패도 통계에 남음"""
+        calls = []
+
+        def tick():
+            calls.append(time.monotonic())
+            if len(calls) == 2:
+                raise RuntimeError('boom')
+
+        job = self.scheduler.add_job('tick', tick, 0.05)
+        self.assertTrue(_wait_until(lambda: job.stats['runs'] >= 4))
+        job.cancel(wait=1.0)
+
+        self.assertEqual(job.stats['failures'], 1)
+        self.assertEqual(job.stats['last_error'], 'boom')
+        gaps = [b - a for a, b in zip(calls, calls[1:])]
+        self.assertGreaterEqual(min(gaps), 0.04)
+        stats = self.scheduler.get_stats()
+        self.assertEqual(stats['jobs'], [])
+        snapshot = job.snapshot()
+        self.assertGreaterEqual(snapshot['avg_time'], 0.0)
+        self.assertIsNone(snapshot['next_run_in'])
+
+    def test_same_job_never_overlaps(self):
+        """실행 시간이 간격보다 길어도 같은 작업은 겹쳐 실행되지 않음"""
+        active = []
+        overlap = threading.Event()
+        lock = threading.Lock()
+
+        def slow():
+            with lock:
+                active.append(1)
+                if len(active) > 1:
+                    overlap.set()
+            time.sleep(0.08)
+            with lock:
+                active.pop()
+
+        job = self.scheduler.add_job('slow', slow, 0.01)
+        self.assertTrue(_wait_until(lambda: job.stats['runs'] >= 3))
+        job.cancel(wait=1.0)
+        self.assertFalse(overlap.is_set())
+        self.assertGreater(job.stats['missed'], 0)
+
+    def test_cancel_waits_for_running_job(self):
+        """cancel(wait) 는 실행 중인 작업이 끝날 때까지 기다리고 이후 다시 실행하지 않음"""
+        started = threading.Event()
+        finished = threading.Event()
+
+        def work():
+            started.set()
+            time.sleep(0.1)
+            finished.set()
+
+        job = self.scheduler.add_job('work', work, 0.02)
+        self.assertTrue(started.wait(1.0))
+        self.assertTrue(job.cancel(wait=1.0))
+        self.assertTrue(finished.is_set())
+        runs = job.stats['runs']
+        time.sleep(0.1)
+        self.assertEqual(job.stats['runs'], runs)
+
+    def test_interval_change_applies_to_next_run(self):
+        """작업 안에서 interval 을 바꾸면 다음 예약부터 반영 (적응형 간격)"""
+        calls = []
+
+        def tick():
+            calls.append(time.monotonic())
+            job.interval = 0.2
+
+        job = self.scheduler.add_job('adaptive', tick, 0.01)
+        self.assertTrue(_wait_until(lambda: len(calls) >= 2))
+        job.cancel(wait=1.0)
+        self.assertGreaterEqual(calls[1] - calls[0], 0.18)
+
+    def test_dedicated_job_is_not_delayed_by_blocking_jobs(self):
+        """공용 작업자가 모두 막혀 있어도 전용 작업자 작업은 제때 실행됨"""
+        release = threading.Event()
+        blockers = [self.scheduler.add_job(f'blocking-{i}', lambda: release.wait(2.0), 0.01) for i in range(4)]
+        try:
+            self.assertTrue(_wait_until(lambda: all(job.running for job in blockers)))
+            monitor = self.scheduler.add_job('monitor', lambda: None, 0.02, dedicated=True)
+            self.assertTrue(_wait_until(lambda: monitor.stats['runs'] >= 5, timeout=1.0))
+            self.assertLess(monitor.stats['max_lag'], 0.1)
+            self.assertEqual(self.scheduler.get_stats()['dedicated_workers'], 1)
+            self.assertTrue(monitor.cancel(wait=1.0))
+        finally:
+            release.set()
+            for job in blockers:
+                job.cancel(wait=1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 멀티 타임프레임 저장소 단위 테스트
+
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.timeframe_store import TimeframeStore, timeframe_to_ns
+
+
+def _minutes(n, start='2024-01-01 00:00', seed=1, drop_every=None):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, periods=n, freq='1min', name='timestamp').astype('datetime64[ns]')
+    close = 100 + np.cumsum(rng.normal(0, 0.1, n))
+    df = pd.DataFrame({'open': close + rng.normal(0, 0.05, n), 'high': close + 0.2, 'low': close - 0.2,
+                       'close': close, 'volume': rng.uniform(1, 5, n)}, index=index)
+    if drop_every:
+        df = df[np.arange(n) % drop_every != 0]
+    return df
+
+
+def _resample(df, rule):
+    return df.resample(rule).agg({'open': 'first', 'high': 'max', 'low': 'min',
+                                  'close': 'last', 'volume': 'sum'}).dropna()
+
+
+class TestTimeframeStore(unittest.TestCase):
+    """멀티 타임프레임 저장소 테스트"""
+
+    def test_matches_pandas_resample(self):
+        """집계 결과가 pandas resample 과 일치 (빠진 분봉 포함)"""
+        base = _minutes(3 * 24 * 60, drop_every=7)
+        store = TimeframeStore.from_ohlcv(base, ['5m', '1h', '4h'])
+        for timeframe, rule in (('5m', '5min'), ('15m', '15min'), ('1h', '1h'), ('4h', '4h'), ('1d', '1D')):
+            expected = _resample(base, rule)
+            actual = store.get(timeframe)
+            np.testing.assert_array_equal(actual.index.values, expected.index.values)
+            np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy())
+
+    def test_incremental_append_equals_full_build(self):
+        """나눠서 추가한 결과가 한 번에 만든 결과와 동일 (마지막 분봉 갱신 포함)"""
+        base = _minutes(2000)
+        full = TimeframeStore.from_ohlcv(base, ['15m', '1h'])
+
+        store = TimeframeStore.from_ohlcv(base.iloc[:700], ['15m', '1h'])
+        partial = base.iloc[[700]].copy()
+        partial['close'] = 0.0  # 진행 중인 분봉 - 이후 같은 시각으로 갱신됨
+        store.append(partial)
+        for start in range(700, 2000, 333):
+            store.append(base.iloc[start:start + 333])
+        store.append(base.iloc[:100])  # 과거 분봉은 무시
+
+        for timeframe in ('1m', '15m', '1h'):
+            pd.testing.assert_frame_equal(store.get(timeframe), full.get(timeframe))
+
+    def test_complete_only_and_range(self):
+        """진행 중인 마지막 구간 제외와 기간 조회"""
+        store = TimeframeStore.from_ohlcv(_minutes(90))
+        self.assertEqual(len(store.get('1h')), 2)
+        self.assertEqual(len(store.get('1h', complete_only=True)), 1)
+        store.append(_minutes(30, start='2024-01-01 01:30', seed=2))
+        self.assertEqual(len(store.get('1h', complete_only=True)), 2)
+        window = store.get('15m', start='2024-01-01 00:30', end='2024-01-01 01:00')
+        self.assertEqual(len(window), 3)
+
+    def test_weekly_bars_start_on_monday(self):
+        """주봉은 월요일 00:00 시작"""
+        store = TimeframeStore.from_ohlcv(_minutes(10 * 24 * 60, start='2024-01-03'))
+        self.assertTrue(all(ts.dayofweek == 0 for ts in store.get('1w').index[1:]))
+        self.assertEqual(timeframe_to_ns('4h'), 4 * 3600 * 10**9)
+        with self.assertRaises(ValueError):
+            store.get('30s')
+
+    def test_timestamp_column_input(self):
+        """timestamp 열 형식(DataManager 저장 형식) 입력"""
+        base = _minutes(120)
+        store = TimeframeStore.from_ohlcv(base.reset_index())
+        pd.testing.assert_frame_equal(store.get('1m'), base, check_freq=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 가격 정렬 청산 트리거 인덱스 단위 테스트
+
+import os
+import random
+import sys
+import time
+import unittest
+from unittest import mock
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.exit_evaluator import VectorizedExitEvaluator, EXIT_STOP_LOSS, EXIT_TRAILING_STOP
+from src.trigger_index import TriggerIndex
+from src.auto_position_manager import AutoPositionManager
+from src.event_manager import get_event_manager, EventType
+
+
+def _position(pid, side, entry, symbol='BTC/USDT', leverage=10):
+    return {'id': pid, 'symbol': symbol, 'side': side, 'entry_price': entry,
+            'leverage': leverage, 'status': 'open', 'size': 1.0}
+
+
+def _summary(signals):
+    return sorted((s['position_id'], s['exit_type'], s['exit_percentage'], s['exit_reason']) for s in signals)
+
+
+class TestTriggerIndex(unittest.TestCase):
+    """트리거 인덱스 테스트"""
+
+    def test_matches_vectorized_evaluator_on_random_paths(self):
+        """무작위 가격 경로/포지션 변경에서 전체 스캔 평가기와 같은 신호"""
+        rng = random.Random(11)
+        for partial, trailing in ((False, False), (False, True), (True, True)):
+            config = dict(sl_pct=0.05, tp_pct=0.08, partial_tp_enabled=partial, trailing_enabled=trailing,
+                          trailing_activation_pct=0.01, trailing_pct=0.02)
+            brute, index = VectorizedExitEvaluator(**config), TriggerIndex(**config)
+            prices = {'BTC/USDT': 100.0, 'ETH/USDT': 100.0}
+            positions, next_id = [], 1
+            for step in range(300):
+                if step % 30 == 0:
+                    positions = [p for p in positions if rng.random() < 0.8]
+                    for _ in range(40):
+                        positions.append(_position(next_id, rng.choice(['long', 'short']),
+                                                   round(rng.uniform(95, 105), 2), rng.choice(list(prices)),
+                                                   leverage=rng.choice([2, 20, 50])))
+                        next_id += 1
+                    brute.sync(positions)
+                    index.sync(positions)
+                if step == 150:
+                    for evaluator in (brute, index):
+                        evaluator.configure(sl_pct=0.04, tp_pct=0.06, tp_levels=[0.02, 0.04],
+                                            tp_percentages=[0.5, 0.5], trailing_pct=0.03)
+                for symbol in prices:
+                    prices[symbol] = round(prices[symbol] * (1 + rng.gauss(0, 0.004)), 3)
+
+                self.assertEqual(_summary(index.evaluate(dict(prices))), _summary(brute.evaluate(dict(prices))))
+                self.assertEqual(sorted(w['position_id'] for w in index.liquidation_warnings(prices)),
+                                 sorted(w['position_id'] for w in brute.liquidation_warnings(prices)))
+
+    def test_trailing_high_water_merges_incrementally(self):
+        """새 고점(숏은 저점)에서 낮은 고점 버킷이 하나로 합쳐지고 간격만큼 되돌리면 발동"""
+        index = TriggerIndex(sl_pct=0.1, tp_pct=0.5, trailing_enabled=True,
+                             trailing_activation_pct=0.01, trailing_pct=0.02)
+        index.sync([_position('a', 'long', 100.0), _position('b', 'long', 104.0),
+                    _position('s', 'short', 100.0)])
+        book = index._books[('BTC/USDT', 1)]
+
+        self.assertEqual(index.evaluate(102.0), [])
+        self.assertEqual(book.trail_buckets, {102.0: {0}})
+        self.assertEqual(index.evaluate(106.0), [])
+        self.assertEqual(book.trail_buckets, {106.0: {0, 1}})
+        self.assertEqual(book.activation, [])
+
+        signals = index.evaluate(103.8)
+        self.assertEqual({s['position_id']: s['exit_type'] for s in signals}, {'a': EXIT_TRAILING_STOP,
+                                                                            'b': EXIT_TRAILING_STOP})
+        self.assertIn('103.88', signals[0]['exit_reason'])
+
+        index.sync([_position('s', 'short', 100.0)])
+        self.assertEqual(index.evaluate(98.0), [])
+        self.assertEqual(index._books[('BTC/USDT', -1)].trail_buckets, {-98.0: {2}})
+        self.assertEqual([s['position_id'] for s in index.evaluate(100.0)], ['s'])
+
+    def test_sync_keeps_state_and_removes_closed_positions(self):
+        """sync 는 기존 포지션의 트레일링/부분 이익실현 상태를 유지하고 사라진 포지션만 제거"""
+        index = TriggerIndex(sl_pct=0.2, partial_tp_enabled=True, trailing_enabled=True,
+                             tp_levels=[0.05, 0.1], tp_percentages=[0.5, 0.5])
+        index.sync([_position('a', 'long', 100.0), _position('b', 'long', 100.0)])
+        self.assertEqual(len(index.evaluate(106.0)), 2)
+
+        index.sync([_position('a', 'long', 100.0)])
+        self.assertEqual(index.ids, ['a'])
+        self.assertEqual(index._books[('BTC/USDT', 1)].trail_buckets, {106.0: {0}})
+        self.assertEqual(index.evaluate(106.0), [])
+
+        # 진입가가 바뀌면 새 포지션으로 취급
+        index.sync([_position('a', 'long', 90.0)])
+        self.assertEqual(index.evaluate(70.0)[0]['exit_type'], EXIT_STOP_LOSS)
+        index.sync([])
+        self.assertEqual(index._books, {})
+
+    def test_upsert_and_remove_apply_single_position_deltas(self):
+        """upsert/remove 는 한 포지션만 반영하고 나머지 포지션의 상태는 유지"""
+        index = TriggerIndex(sl_pct=0.2, trailing_enabled=True)
+        index.sync([_position('a', 'long', 100.0)])
+        self.assertEqual(index.evaluate(106.0), [])
+
+        self.assertTrue(index.upsert(_position('b', 'short', 100.0)))
+        self.assertTrue(index.upsert(dict(_position('a', 'long', 100.0), size=0.5)))
+        self.assertFalse(index.upsert(_position('c', 'flat', 100.0)))
+        self.assertEqual(sorted(index.ids), ['a', 'b'])
+        self.assertEqual(index._states['a'].position['size'], 0.5)
+        self.assertEqual(index._books[('BTC/USDT', 1)].trail_buckets, {106.0: {0}})
+
+        self.assertTrue(index.remove('a'))
+        self.assertFalse(index.remove('a'))
+        self.assertEqual(index.ids, ['b'])
+        self.assertNotIn(('BTC/USDT', 1), index._books)
+
+    def test_quiet_ticks_do_not_scan_positions(self):
+        """트리거를 지나치지 않는 틱은 포지션 수와 무관하게 처리"""
+        positions = [_position(i + 1, 'long' if i % 2 else 'short', 99.5 + (i % 100) * 0.01)
+                     for i in range(20000)]
+        index = TriggerIndex(trailing_enabled=True, partial_tp_enabled=True)
+        index.sync(positions)
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            index.evaluate(99.95)
+        elapsed = (time.perf_counter() - start) / 1000
+        self.assertLess(elapsed, 0.001)
+
+
+class TestAutoPositionManagerDeltas(unittest.TestCase):
+    """포지션 이벤트 변경분 반영 테스트"""
+
+    def setUp(self):
+        self.positions = [_position(1, 'long', 100.0), _position(2, 'short', 100.0)]
+        self.algo = mock.Mock(symbol='BTC/USDT', market_type='spot', risk_management={}, exchange_api=None)
+        self.algo.get_positions.side_effect = lambda status='open': list(self.positions)
+        self.algo.get_current_price.return_value = 100.0
+        self.manager = AutoPositionManager(self.algo)
+        self.manager._subscribe_position_events()
+        self.events = get_event_manager()
+
+    def tearDown(self):
+        self.manager._unsubscribe_position_events()
+
+    def test_ticks_apply_event_deltas_without_full_sync(self):
+        """첫 검사만 전체 동기화하고, 이후에는 ID가 있는 이벤트 변경분만 반영"""
+        self.assertTrue(self.manager._check_and_manage_positions())
+        self.assertTrue(self.manager._check_and_manage_positions())
+        self.assertEqual(self.algo.get_positions.call_count, 1)
+
+        self.events.publish(EventType.POSITION_OPENED, {'position_id': 3,
+                                                        'position': _position(3, 'long', 101.0)})
+        self.events.publish(EventType.POSITION_CLOSED, {'position_id': 1})
+        self.events.publish(EventType.POSITION_OPENED, {'position_id': 4,
+                                                        'position': _position(4, 'long', 101.0, symbol='ETH/USDT')})
+        self.manager._check_and_manage_positions()
+        self.assertEqual(sorted(self.manager.exit_evaluator.ids), [2, 3])
+        self.assertEqual(self.algo.get_positions.call_count, 1)
+
+        # 포지션 목록 전체를 담은 스냅샷 이벤트는 다음 검사에서 전체 재동기화
+        self.events.publish(EventType.POSITION_UPDATED, {'positions': [], 'version': 2})
+        self.positions = [_position(2, 'short', 100.0)]
+        self.manager._check_and_manage_positions()
+        self.assertEqual(self.algo.get_positions.call_count, 2)
+        self.assertEqual(self.manager.exit_evaluator.ids, [2])
+
+
+if __name__ == '__main__':
+    unittest.main()
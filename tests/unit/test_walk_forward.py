@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# 암호화폐 자동 매매 봇 - 워크포워드 최적화 단위 테스트
+
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.walk_forward import WalkForwardOptimizer, generate_windows, simulate_equity, equity_metrics
+
+
+class SmaCross:
+    """테스트용 이동평균 교차 전략 (generate_signals 인터페이스만 구현)"""
+
+    calls = 0
+
+    def __init__(self, short_period=5, long_period=20):
+        self.name = f"SmaCross({short_period},{long_period})"
+        self.short_period = short_period
+        self.long_period = long_period
+
+    def generate_signals(self, df):
+        SmaCross.calls += 1
+        df = df.copy()
+        short_ma = df['close'].rolling(self.short_period).mean()
+        long_ma = df['close'].rolling(self.long_period).mean()
+        df['signal'] = np.where(short_ma > long_ma, 1, 0)
+        df['position'] = df['signal'].diff().fillna(0)
+        return df
+
+
+def _ohlcv(n, seed=3, freq='5min'):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    index = pd.date_range('2023-01-01', periods=n, freq=freq)
+    return pd.DataFrame({'open': close, 'high': close * 1.001, 'low': close * 0.999,
+                         'close': close, 'volume': 1.0}, index=index)
+
+
+def _reference_equity(close, position_change, balance, commission, leverage):
+    """Backtester.run_backtest 의 캔들 단위 반복 규칙 (증거금 + 레버리지 포지션 평가 손익)"""
+    position = margin = entry_price = 0.0
+    equity = []
+    for price, change in zip(close, position_change):
+        if change > 0 and position == 0 and balance > 0:
+            fee = balance * leverage * commission
+            position = (balance * leverage - fee) / price
+            margin, entry_price = balance - fee, price
+            balance = 0.0
+        elif change < 0 and position > 0:
+            value = max(margin + position * (price - entry_price), 0.0)
+            balance = value - min(position * price * commission, value)
+            position = 0.0
+        equity.append(max(margin + position * (price - entry_price), 0.0) if position else balance)
+    return np.array(equity)
+
+
+class TestWalkForward(unittest.TestCase):
+    """워크포워드 최적화 테스트"""
+
+    def test_generate_windows(self):
+        """rolling/anchored 구간 생성"""
+        self.assertEqual(generate_windows(100, 40, 20),
+                         [(0, 40, 40, 60), (20, 60, 60, 80), (40, 80, 80, 100)])
+        self.assertEqual([w[0] for w in generate_windows(100, 40, 20, anchored=True)], [0, 0, 0])
+        with self.assertRaises(ValueError):
+            generate_windows(50, 40, 20)
+
+    def test_simulate_equity_matches_loop(self):
+        """배열 기반 자산 계산이 캔들 단위 반복 결과와 일치"""
+        rng = np.random.default_rng(11)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 2000)))
+        position_change = rng.choice([-1, 0, 0, 0, 1], size=2000).astype(float)
+        for leverage in (1, 3):
+            equity, trade_returns = simulate_equity(close, position_change, 10000, 0.001, leverage)
+            expected = _reference_equity(close, position_change, 10000, 0.001, leverage)
+            np.testing.assert_allclose(equity, expected, rtol=1e-9)
+            self.assertGreater(len(trade_returns), 0)
+
+        # 마지막 캔들 강제 청산은 마지막에 매도 신호를 둔 것과 동일
+        position_change[-1] = 0
+        equity, _ = simulate_equity(close, position_change, 10000, close_at_end=True)
+        forced_exit = position_change.copy()
+        forced_exit[-1] = -1
+        np.testing.assert_allclose(equity, _reference_equity(close, forced_exit, 10000, 0.001, 1), rtol=1e-9)
+
+    def test_equity_metrics(self):
+        """수익률/낙폭 계산"""
+        index = pd.date_range('2023-01-01', periods=4, freq='D')
+        metrics = equity_metrics(np.array([100.0, 120.0, 90.0, 110.0]), index, np.array([5.0, -2.0]))
+        self.assertAlmostEqual(metrics['percent_return'], 10.0)
+        self.assertAlmostEqual(metrics['max_drawdown'], 25.0)
+        self.assertEqual((metrics['total_trades'], metrics['win_rate']), (2, 50.0))
+
+    def test_walk_forward_stitches_out_of_sample_equity(self):
+        """검증 구간 자산이 이어지고, 파라미터 조합별 신호는 한 번만 계산"""
+        df = _ohlcv(6000)
+        grid = {'short_period': [5, 10], 'long_period': [30, 60]}
+        SmaCross.calls = 0
+        result = WalkForwardOptimizer(SmaCross, grid, train_size=2000, test_size=1000, max_workers=1).run(df)
+
+        self.assertEqual(SmaCross.calls, 4)
+        self.assertEqual(len(result.windows), 4)
+        self.assertEqual(len(result.equity), 4000)
+        self.assertEqual(result.equity.index[0], df.index[2000])
+        self.assertTrue(result.equity.index.is_monotonic_increasing)
+        # 다음 구간은 이전 구간의 최종 자산에서 시작
+        first_end = result.windows[0]['test_metrics']['final_balance']
+        second_start = result.equity.iloc[1000]
+        self.assertLessEqual(abs(second_start / first_end - 1), 0.01)
+        self.assertAlmostEqual(result.metrics['final_balance'], result.equity.iloc[-1])
+        self.assertIn('param_short_period', result.to_dataframe().columns)
+
+    def test_parallel_matches_serial(self):
+        """프로세스 풀 실행 결과가 단일 프로세스 실행과 동일"""
+        df = _ohlcv(4000, seed=5)
+        grid = {'short_period': [3, 5, 8], 'long_period': [20, 40]}
+        serial = WalkForwardOptimizer(SmaCross, grid, '3D', '1D', anchored=True, max_workers=1).run(df)
+        parallel = WalkForwardOptimizer(SmaCross, grid, '3D', '1D', anchored=True, max_workers=2).run(df)
+        self.assertEqual([w['params'] for w in serial.windows], [w['params'] for w in parallel.windows])
+        pd.testing.assert_series_equal(serial.equity, parallel.equity)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -19,7 +19,7 @@ from typing import Dict, List, Any, Optional, Tuple
 import ccxt
 
 # config 모듈 가져오기
-from utils.config import is_testnet_enabled
+from utils.config import is_testnet_enabled, get_fake_exchange_url
 
 # Position 클래스 import
 import sys
@@ -93,6 +93,19 @@ def create_binance_client(api_key=None, api_secret=None, is_future=False, use_te
     # 바이낸스 객체 생성 (URL이 이미 config에 포함됨)
     binance = ccxt.binance(config)
     
+    # 가상 거래소 설정 (FAKE_EXCHANGE_URL): 모든 API URL의 호스트만 로컬 서버로 교체
+    fake_url = get_fake_exchange_url()
+    if fake_url:
+        for name, url in list(binance.urls['api'].items()):
+            if isinstance(url, str) and url.startswith('http'):
+                path = url.split('/', 3)[3] if url.count('/') >= 3 else ''
+                binance.urls['api'][name] = f"{fake_url}/{path}"
+        binance.options['fetchMarkets'] = dict(binance.options.get('fetchMarkets', {}), types=['spot', 'linear'])
+        binance.options['fetchMargins'] = False
+        binance.options['fetchCurrencies'] = False
+        binance.has['fetchCurrencies'] = False
+        logger.info(f"가상 거래소 사용: {fake_url}")
+    
     # 선물 거래의 경우 has 속성 활성화
     if is_future:
         binance.has['fetchPositions'] = True
@@ -130,7 +143,7 @@ def create_binance_client(api_key=None, api_secret=None, is_future=False, use_te
             logger.error(f"Markets 로드 실패: {str(e)}")
     
     # 추가 로그
-    logger.info(f"바이낸스 클라이언트 생성 완료: {'테스트넷' if use_testnet else '실제 API'} / {'선물' if is_future else '현물'} 모드")
+    logger.info(f"바이낸스 클라이언트 생성 완료: {'가상 거래소' if fake_url else '테스트넷' if use_testnet else '실제 API'} / {'선물' if is_future else '현물'} 모드")
     
     return binance
 
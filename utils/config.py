@@ -40,6 +40,16 @@ def is_testnet_enabled() -> bool:
     use_testnet_env = load_env_variable('USE_TESTNET', 'false').lower()
     return use_testnet_env in ('true', '1', 'yes')
 
+def get_fake_exchange_url() -> Optional[str]:
+    """
+    가상 거래소 서버 주소를 환경 변수에서 확인하는 함수
+    
+    Returns:
+        FAKE_EXCHANGE_URL 값 (예: http://127.0.0.1:8900), 설정되지 않았으면 None
+    """
+    url = load_env_variable('FAKE_EXCHANGE_URL', '').strip()
+    return url.rstrip('/') or None
+
 def get_api_credentials() -> Tuple[Optional[str], Optional[str]]:
     """
     바이낸스 API 키 정보를 가져오는 함수
@@ -45,7 +45,7 @@ from utils.config import validate_api_key, get_validated_api_credentials
 import utils.api as api
 from utils.api import get_positions, get_positions_with_objects, get_formatted_balances, get_spot_balance, get_future_balance, get_ticker, get_orderbook, set_stop_loss_take_profit
 from PyQt5.QtWidgets import QApplication
-from flask import Flask, jsonify, request, render_template, send_from_directory, redirect, url_for, flash, session
+from flask import Flask, jsonify, request, render_template, send_from_directory, redirect, url_for, flash, session, Response, stream_with_context
 from flask_cors import CORS
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -63,6 +63,13 @@ from web_app.models import User
 from src.db_manager import DatabaseManager
 from src.exchange_api import ExchangeAPI
 from src.config import DEFAULT_EXCHANGE, DEFAULT_SYMBOL, DEFAULT_TIMEFRAME
+from src.logging_config import setup_async_logging, stop_async_logging
+from src.event_manager import EventType, get_event_manager
+from src.event_stream import get_event_stream_broker
+from src.account_snapshot import get_account_snapshot_service, ACCOUNT_SPOT, ACCOUNT_FUTURE
+from src.order_tracker import get_order_tracker, stream_available as order_stream_available
+from src.memory_monitor import get_memory_monitor
+from src.scheduler import get_scheduler
 
 # 로깅 설정
 logging.basicConfig(
@@ -255,15 +262,34 @@ class BotAPIServer:
             logger.error(f"거래소 API 초기화 오류: {str(e)}")
             logger.exception("상세 오류 정보:")
         
-        # 데이터 동기화 스레드 시작
-        self.sync_thread = None
-        self.sync_running = False
+        # 대시보드 실시간 스트림 (EventManager 이벤트를 SSE로 전달)
+        self.event_manager = get_event_manager()
+        self.stream_broker = get_event_stream_broker()
+        self._publish_status()
+        
+        # 데이터 동기화 작업 (공용 스케줄러에 데이터 유형별로 등록)
+        self.sync_jobs = []
         
         # 차등화된 동기화 주기 설정 (AWS 환경 최적화)
         self.price_sync_interval = 3     # 가격 데이터 (초)
         self.order_sync_interval = 5     # 주문 상태 (초)
-        self.position_sync_interval = 15  # 포지션 정보 (초)
-        self.balance_sync_interval = 30   # 계좌 잔액 (초)
+        self.position_sync_interval = 15  # 포지션/잔액 계정 스냅샷 (초)
+        
+        # 계정 스냅샷 (포지션/잔액을 한 번에 조회하여 API와 봇이 공유)
+        self.account_snapshot = None
+        if self.exchange_api:
+            self.account_snapshot = get_account_snapshot_service(
+                self.exchange_api, self.db, accounts=[ACCOUNT_SPOT, ACCOUNT_FUTURE])
+            self.account_snapshot.refresh_interval = self.position_sync_interval
+        
+        # 주문 상태 추적기 (사용자 데이터 스트림으로 체결/취소를 받아 DB에 기록)
+        # websocket-client 가 없으면 시작하지 않고 주문 조회는 REST 를 사용
+        self.order_tracker = None
+        if self.exchange_api and self.exchange_api.exchange_id == 'binance' and order_stream_available():
+            tracker = get_order_tracker(self.exchange_api, self.db)
+            if tracker.start():
+                self.order_tracker = tracker
+                self.exchange_api.order_tracker = tracker
         
         self.start_data_sync()  # 차등화된 주기로 동기화
         
@@ -505,6 +531,23 @@ class BotAPIServer:
         def get_balance():
             """통합 잔액 조회 API - 현물/선물 잔액과 추가 정보 제공"""
             try:
+                # 계정 스냅샷이 있으면 메모리의 잔액으로 응답
+                if self.account_snapshot:
+                    snapshot = self.account_snapshot.get_snapshot(max_age=self.position_sync_interval)
+                    balance_data = self.account_snapshot.balance_summary()
+                    if hasattr(self, 'bot_gui') and self.bot_gui:
+                        self.bot_gui.balance_data = {
+                            'spot': balance_data['spot'],
+                            'future': balance_data['future']
+                        }
+                    success = balance_data['spot']['success'] or balance_data['future']['success']
+                    return jsonify({
+                        'success': success,
+                        'balance': balance_data,
+                        'version': snapshot['version'],
+                        'updated_at': snapshot['updated_at']
+                    }), 200 if success else 400
+                
                 # utils/config.py의 검증된 API 키 가져오기
                 from utils.config import get_validated_api_credentials
                 from utils.api import get_formatted_balances
@@ -543,6 +586,7 @@ class BotAPIServer:
                     # 하나라도 성공했으면 전체를 성공으로 처리
                     if spot_success or future_success:
                         balance_result['success'] = True
+                        self.event_manager.publish(EventType.BALANCE_CHANGED, {'balance': balance_data})
                     
                     return jsonify(balance_result)
                 else:
@@ -565,30 +609,9 @@ class BotAPIServer:
             """봇 상태 조회"""
             try:
                 # 현재 봇 상태 로깅
-                logger.info(f"봇 상태 조회 - is_running: {self.bot_status.get('is_running', False)}")
-                logger.info(f"봇 상태 상세: {self.bot_status}")
+                logger.debug("봇 상태 조회 - is_running: %s", self.bot_status.get('is_running', False))
                 
-                # symbol 형식을 UI에 맞게 변환
-                status_copy = self.bot_status.copy()
-                
-                # ui_symbol 추가: 마켓 타입에 따라 심볼 형식 변환
-                if status_copy.get('symbol') and status_copy.get('market_type'):
-                    market_type = status_copy.get('market_type', 'spot')
-                    original_symbol = status_copy.get('symbol', '')
-                    
-                    if market_type == 'futures':
-                        # 선물: 슬래시 제거 (BTC/USDT → BTCUSDT)
-                        ui_symbol = original_symbol.replace('/', '')
-                    else:
-                        # 현물: 슬래시 추가 (BTCUSDT → BTC/USDT)
-                        if '/' not in original_symbol and len(original_symbol) > 4:
-                            # USDT로 끝나는 경우
-                            if original_symbol.endswith('USDT'):
-                                ui_symbol = original_symbol[:-4] + '/' + original_symbol[-4:]
-                            else:
-                                ui_symbol = original_symbol
-                    
-                    status_copy['ui_symbol'] = ui_symbol
+                status_copy = self._status_payload()
                 
                 return jsonify({
                     'success': True,
@@ -601,6 +624,20 @@ class BotAPIServer:
                     'error': str(e)
                 }), 500
         
+        # 실시간 이벤트 스트림 API (Server-Sent Events)
+        @app.route('/api/stream', methods=['GET'])
+        @login_required
+        def event_stream():
+            """포지션/거래/잔액/봇 상태 변경분을 SSE로 전달"""
+            last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+            response = Response(
+                stream_with_context(self.stream_broker.stream(last_event_id)),
+                mimetype='text/event-stream'
+            )
+            response.headers['Cache-Control'] = 'no-cache'
+            response.headers['X-Accel-Buffering'] = 'no'  # 프록시 버퍼링 비활성화
+            return response
+        
         # 시장 데이터 조회 API 수정 - utils/api.py 활용
         @app.route('/api/market/<symbol>')
         @login_required
@@ -668,12 +705,36 @@ class BotAPIServer:
             except Exception as e:
                 return self._create_error_response(e, status_code=500, endpoint='get_trades')
 
+        # 성과 집계 조회 API (심볼/전략/일별)
+        @app.route('/api/performance', methods=['GET'])
+        @login_required
+        def get_performance():
+            try:
+                source = request.args.get('source', 'trade')
+                scope = request.args.get('scope', 'all')
+                return jsonify({
+                    'success': True,
+                    'data': self.db.get_performance_stats(source=source, scope=scope)
+                })
+            except Exception as e:
+                return self._create_error_response(e, status_code=500, endpoint='get_performance')
+
         # 포지션 정보 조회 API
         @app.route('/api/positions', methods=['GET'])
         @login_required
         def api_get_positions():
             """현재 열린 포지션 정보 가져오기"""
             try:
+                # 계정 스냅샷이 있으면 메모리의 포지션으로 응답 (DB 저장은 스냅샷 서비스가 변경분만 처리)
+                if self.account_snapshot:
+                    snapshot = self.account_snapshot.get_snapshot(max_age=self.position_sync_interval)
+                    return jsonify({
+                        'success': True,
+                        'data': snapshot['positions'],
+                        'version': snapshot['version'],
+                        'updated_at': snapshot['updated_at']
+                    })
+                
                 logger.info("포지션 정보 조회 시작")
                 
                 # API 키 가져오기
@@ -972,6 +1033,7 @@ class BotAPIServer:
                         'started_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                         'last_update': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                     })
+                    self._publish_status()
                     
                     # 반환값에서 비밀번호 필드 제거 (JSON 직렬화 문제 방지)
                     if 'api_key' in result:
@@ -1027,6 +1089,7 @@ class BotAPIServer:
                         'is_running': False,
                         'last_update': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                     })
+                    self._publish_status()
                 
                 # 봇을 중지할 때 상태 저장 (실행 중지 상태로 갱신)
                 try:
@@ -1052,85 +1115,93 @@ class BotAPIServer:
             except Exception as e:
                 return self._create_error_response(e, status_code=500, endpoint='stop_bot')
         
-        # 데이터 동기화 스레드 시작
+        # 메모리 할당 프로파일 API (GET: 최근 보고서, POST: 프로파일링 시작/중지)
+        @self.flask_app.route('/api/memory/allocations', methods=['GET', 'POST'])
+        @login_required
+        def memory_allocations():
+            try:
+                monitor = get_memory_monitor()
+                top_n = request.args.get('top', type=int)
+                
+                if request.method == 'POST':
+                    data = request.get_json(silent=True) or {}
+                    if data.get('enabled', True):
+                        if not monitor.start_allocation_profiling(frames=int(data.get('frames', 10)),
+                                                                  interval=data.get('interval'),
+                                                                  top_n=data.get('top_n')):
+                            return jsonify({'success': False, 'message': '할당 프로파일링 시작 실패'}), 500
+                    else:
+                        monitor.stop_allocation_profiling()
+                elif request.args.get('refresh', 'false').lower() == 'true':
+                    monitor.take_allocation_snapshot()
+                
+                return jsonify({'success': True, 'data': monitor.get_allocation_report(top_n)})
+            except Exception as e:
+                return self._create_error_response(e, status_code=500, endpoint='memory_allocations')
+
+        # 주기 작업 스케줄러 상태 API (작업별 실행 횟수/소요 시간/지연)
+        @self.flask_app.route('/api/scheduler/jobs', methods=['GET'])
+        @login_required
+        def scheduler_jobs():
+            try:
+                return jsonify({'success': True, 'data': get_scheduler().get_stats()})
+            except Exception as e:
+                return self._create_error_response(e, status_code=500, endpoint='scheduler_jobs')
+
+        # 데이터 동기화 작업 시작
     def start_data_sync(self):
         """
-        바이낸스에서 주기적으로 데이터를 가져와 DB에 동기화하는 스레드 시작
-        차등화된 주기로 각 데이터 유형별 동기화 수행
+        바이낸스에서 주기적으로 데이터를 가져와 DB에 동기화하는 작업 시작
+        데이터 유형별로 차등화된 주기의 작업을 공용 스케줄러에 등록
         """
-        if self.sync_thread is not None and self.sync_thread.is_alive():
-            logger.info("데이터 동기화 스레드가 이미 실행 중입니다.")
+        if self.sync_jobs:
+            logger.info("데이터 동기화 작업이 이미 실행 중입니다.")
             return
         
-        self.sync_running = True
-        self.sync_thread = threading.Thread(target=self._data_sync_worker, daemon=True)
-        self.sync_thread.start()
-        logger.info(f"차등화된 주기(가격:{self.price_sync_interval}초, 주문:{self.order_sync_interval}초, 포지션:{self.position_sync_interval}초, 잔액:{self.balance_sync_interval}초)로 데이터 동기화 스레드 시작")
+        scheduler = get_scheduler()
+        self.sync_jobs = [
+            # 가격 정보 동기화 (높은 빈도)
+            scheduler.add_job('data_sync.price', lambda: self._run_sync_step(self._sync_price_data),
+                              self.price_sync_interval),
+            # 주문 상태 동기화
+            scheduler.add_job('data_sync.orders', lambda: self._run_sync_step(self._sync_orders),
+                              self.order_sync_interval),
+            # 포지션/잔액 계정 스냅샷 및 거래 내역 동기화
+            scheduler.add_job('data_sync.account', lambda: self._run_sync_step(self._sync_account, self._sync_trades),
+                              self.position_sync_interval),
+        ]
+        logger.info(f"차등화된 주기(가격:{self.price_sync_interval}초, 주문:{self.order_sync_interval}초, 포지션/잔액:{self.position_sync_interval}초)로 데이터 동기화 작업 시작")
     
-    # 데이터 동기화 워커 함수
-    def _data_sync_worker(self):
+    # 데이터 동기화 작업 실행
+    def _run_sync_step(self, *steps):
         """
-        차등화된 주기로 바이낸스 데이터를 가져와 DB에 저장하는 워커 함수
-        데이터 유형별로 다른 동기화 주기 적용
+        데이터 동기화 함수들을 순서대로 실행 (공용 스케줄러 작업)
+        거래소 API가 없으면 이번 주기는 건너뛰고 다음 주기에 다시 시도
         """
-        last_price_sync = 0
-        last_order_sync = 0
-        last_position_sync = 0
-        last_balance_sync = 0
-        
-        while self.sync_running:
-            try:
-                # 거래소 API가 없는 경우 초기화 시도
-                if self.exchange_api is None:
-                    logger.warning("거래소 API가 초기화되지 않았습니다. 초기화를 시도합니다.")
-                    time.sleep(5)  # 5초 후 다시 시도
-                    continue
-                
-                current_time = time.time()
-                
-                # 가격 정보 동기화 (높은 빈도)
-                if current_time - last_price_sync >= self.price_sync_interval:
-                    self._sync_price_data()
-                    last_price_sync = current_time
-                
-                # 주문 상태 동기화
-                if current_time - last_order_sync >= self.order_sync_interval:
-                    self._sync_orders()
-                    last_order_sync = current_time
-                
-                # 포지션 정보 동기화
-                if current_time - last_position_sync >= self.position_sync_interval:
-                    self._sync_positions()
-                    last_position_sync = current_time
-                
-                # 잔액 정보 동기화 (낮은 빈도)
-                if current_time - last_balance_sync >= self.balance_sync_interval:
-                    self._sync_balance()
-                    last_balance_sync = current_time
-                
-                # 거래 내역 동기화 (포지션 동기화와 같은 주기)
-                if current_time - last_position_sync >= self.position_sync_interval:
-                    self._sync_trades()
-                
-            except requests.exceptions.RequestException as e:
-                # 네트워크 관련 오류 - 재시도 가능
-                logger.warning(f"데이터 동기화 중 네트워크 오류(재시도 예정): {str(e)}")
-                # 재시도 로직을 위해 짧은 대기 시간 설정
-                time.sleep(2)
-            except json.JSONDecodeError as e:
-                # JSON 파싱 오류 - 일시적인 API 응답 문제일 수 있음
-                logger.warning(f"데이터 동기화 중 JSON 파싱 오류(재시도 예정): {str(e)}")
-                time.sleep(2)
-            except Exception as e:
-                # 기타 모든 예외 처리
-                logger.error(f"데이터 동기화 중 오류: {str(e)}")
-                logger.error(traceback.format_exc())
-                # 심각한 오류 후 좀 더 긴 대기 시간 설정
-                time.sleep(5)
+        try:
+            if self.exchange_api is None:
+                logger.warning("거래소 API가 초기화되지 않았습니다. 다음 주기에 다시 시도합니다.")
+                return
             
-            # 최소 동기화 주기(가격 데이터)만큼 대기
-            time.sleep(1)  # 1초마다 체크하여 각 데이터 유형별 동기화 타이밍 확인
-        
+            for step in steps:
+                step()
+            
+        except requests.exceptions.RequestException as e:
+            # 네트워크 관련 오류 - 다음 주기에 재시도
+            logger.warning(f"데이터 동기화 중 네트워크 오류(재시도 예정): {str(e)}")
+        except json.JSONDecodeError as e:
+            # JSON 파싱 오류 - 일시적인 API 응답 문제일 수 있음
+            logger.warning(f"데이터 동기화 중 JSON 파싱 오류(재시도 예정): {str(e)}")
+        except Exception as e:
+            # 기타 모든 예외 처리
+            logger.error(f"데이터 동기화 중 오류: {str(e)}")
+            logger.error(traceback.format_exc())
+    
+    # 동기화 종료 시 포지션 정리
+    def _sync_final_positions(self):
+        """
+        동기화 중지 시 실제 포지션을 마지막으로 DB에 저장하고 테스트 포지션 보존
+        """
         # 시장 타입이 'futures'가 아닐 경우 실제 포지션 조회 스킵
         if not self.exchange_api or self.exchange_api.market_type != 'futures':
             logger.debug(f"현재 시장 타입이 {self.exchange_api.market_type if self.exchange_api else 'unknown'}이미로 실제 포지션 정보를 조회하지 않습니다.")
@@ -1283,6 +1354,10 @@ class BotAPIServer:
         try:
             if not self.exchange_api:
                 return
+            
+            # 사용자 데이터 스트림이 연결되어 있으면 주문 추적기가 상태 변경을 직접 기록
+            if self.order_tracker and self.order_tracker.connected:
+                return
                 
             # 현재 열린 주문 가져오기
             try:
@@ -1304,63 +1379,20 @@ class BotAPIServer:
         except Exception as e:
             logger.error(f"주문 상태 동기화 중 오류: {str(e)}")
     
-    # 계좌 잔액 동기화
-    def _sync_balance(self):
-        """
-        거래소에서 계정 잔고 정보를 가져와 DB에 저장
-        """
-        try:
-            if not self.exchange_api:
-                return
-                
-            # 현재 잔고 정보 가져오기
-            try:
-                # 거래소 API에서 계정 잔고 조회
-                balance = None
-                if hasattr(self.exchange_api, 'get_balance') and callable(self.exchange_api.get_balance):
-                    balance = self.exchange_api.get_balance()
-                elif hasattr(self.bot_gui, 'get_balance') and callable(self.bot_gui.get_balance):
-                    balance = self.bot_gui.get_balance()
-                
-                if balance and isinstance(balance, dict):
-                    # 잔고 데이터 DB에 저장
-                    self.db.save_balances(balance)
-                    logger.debug("계정 잔고 동기화 완료")
-                else:
-                    logger.debug("잔고 정보 없음")
-            except Exception as e:
-                logger.error(f"잔고 조회 중 오류: {str(e)}")
-        except Exception as e:
-            logger.error(f"계정 잔고 동기화 중 오류: {str(e)}")
-    
-    # 포지션 정보 동기화
-    def _sync_positions(self):
+    # 포지션/잔액 계정 스냅샷 동기화
+    def _sync_account(self):
         """
-        거래소에서 현재 포지션 정보를 가져와 DB에 저장
+        거래소에서 포지션과 잔고를 한 번에 조회하여 계정 스냅샷 갱신
+        (바뀐 행만 DB에 저장하고 변경 이벤트를 발행)
         """
         try:
-            # 시장 타입이 'futures'가 아닐 경우 실제 포지션 조회 스킵
-            if not self.exchange_api or self.exchange_api.market_type != 'futures':
-                logger.info("선물 포지션 정보를 조회할 수 없습니다.")
+            if not self.account_snapshot:
                 return
             
-            # 현재 포지션 조회
-            try:
-                positions = self.exchange_api.get_positions()
-                if positions and isinstance(positions, list):
-                    logger.debug(f"현재 포지션 조회 결과: {len(positions)}")
-                    
-                    # 새로운 포지션 정보로 DB 업데이트
-                    self.db.save_positions(positions)
-                else:
-                    logger.debug("포지션 정보 없음")
-                
-                logger.debug("포지션 동기화 완료")
-            except Exception as e:
-                logger.error(f"포지션 조회 중 오류: {str(e)}")
-                logger.debug("포지션 정보 업데이트 실패")
+            snapshot = self.account_snapshot.refresh()
+            logger.debug(f"계정 스냅샷 동기화 완료: 버전 {snapshot['version']}, 포지션 {len(snapshot['positions'])}개")
         except Exception as e:
-            logger.error(f"포지션 동기화 중 오류: {str(e)}")
+            logger.error(f"계정 스냅샷 동기화 중 오류: {str(e)}")
     
     # 거래 내역 동기화
     def _sync_trades(self):
@@ -1368,21 +1400,18 @@ class BotAPIServer:
         바이낸스에서 최근 거래 내역을 가져와 DB에 저장
         """
         try:
-            # 가장 최근 거래 ID 확인 (중복 방지)
-            recent_trades = self.db.load_trades(limit=1)
-            last_trade_id = recent_trades[0]['id'] if recent_trades else None
-            
             # 거래소에서 최근 거래 내역 가져오기
             trades = self.exchange_api.get_my_trades(since=None, limit=20)
             
             if trades:
                 new_trades = 0
                 for trade in trades:
-                    # 이미 DB에 있는 거래는 건너뛰기
-                    if last_trade_id and str(trade.get('id')) == str(last_trade_id):
+                    # 이미 저장된 거래는 건너뛰기 (DB의 거래소 거래 ID 기준, 재시작 후에도 유지)
+                    if not self.db.save_exchange_trade(trade):
                         continue
                     
-                    self.db.save_trade(trade)
+                    # 스트림에만 알림 (TRADE_EXECUTED 는 백업 등을 시작하므로 발행하지 않음)
+                    self.stream_broker.publish_trade(self._format_trade_data(trade))
                     new_trades += 1
                 
                 if new_trades > 0:
@@ -1396,12 +1425,16 @@ class BotAPIServer:
     # 동기화 중지
     def stop_data_sync(self):
         """
-        데이터 동기화 스레드 중지
+        데이터 동기화 작업 중지
         """
-        self.sync_running = False
-        if self.sync_thread and self.sync_thread.is_alive():
-            self.sync_thread.join(timeout=5.0)
-            logger.info("데이터 동기화 스레드 중지됨")
+        if self.sync_jobs:
+            jobs, self.sync_jobs = self.sync_jobs, []
+            for job in jobs:
+                job.cancel(wait=5.0)
+            self._sync_final_positions()
+            logger.info("데이터 동기화 작업 중지됨")
+        if self.order_tracker:
+            self.order_tracker.stop()
     
     # 데이터 변환 유틸리티 메서드
     def _format_trade_data(self, trade):
@@ -1479,6 +1512,36 @@ class BotAPIServer:
         except Exception as e:
             logger.error(f"save_positions 메서드 실행 중 오류: {str(e)}")
     
+    def _status_payload(self):
+        """
+        대시보드용 봇 상태 (UI 심볼 형식 포함)
+        
+        Returns:
+            dict: 봇 상태 사본
+        """
+        status_copy = self.bot_status.copy()
+        
+        # ui_symbol 추가: 마켓 타입에 따라 심볼 형식 변환
+        if status_copy.get('symbol') and status_copy.get('market_type'):
+            market_type = status_copy.get('market_type', 'spot')
+            original_symbol = status_copy.get('symbol', '')
+            ui_symbol = original_symbol
+            
+            if market_type == 'futures':
+                # 선물: 슬래시 제거 (BTC/USDT → BTCUSDT)
+                ui_symbol = original_symbol.replace('/', '')
+            elif '/' not in original_symbol and original_symbol.endswith('USDT') and len(original_symbol) > 4:
+                # 현물: 슬래시 추가 (BTCUSDT → BTC/USDT)
+                ui_symbol = original_symbol[:-4] + '/' + original_symbol[-4:]
+            
+            status_copy['ui_symbol'] = ui_symbol
+        
+        return status_copy
+    
+    def _publish_status(self):
+        """봇 상태 변경 이벤트 발행"""
+        self.event_manager.publish(EventType.BOT_STATUS_CHANGED, {'status': self._status_payload()})
+    
     # API 오류 응답 유틸리티 메서드
     def _create_error_response(self, error, status_code=500, endpoint=None):
         """
@@ -1682,6 +1745,10 @@ class BotAPIServer:
         else:
             logger.warning("SSL 인증서가 없어 HTTP 모드로 서버를 실행합니다. 프로덕션 환경에서는 HTTPS 사용을 권장합니다.")
         
+        # 로그 I/O가 거래/동기화 스레드를 막지 않도록 비동기 로깅 파이프라인 사용
+        if os.getenv('ASYNC_LOGGING', 'true').lower() == 'true':
+            setup_async_logging()
+        
         logger.info(f"API 서버 실행 준비 완료. 호스트: {self.host}, 포트: {self.port}")
         try:
             # SSL 인증서 설정 (있는 경우)
@@ -1711,6 +1778,7 @@ class BotAPIServer:
         finally:
             # 서버 종료 시 데이터 동기화 스레드 중지
             self.stop_data_sync()
+            stop_async_logging()
 
 
 if __name__ == '__main__':
@@ -5,8 +5,8 @@ document.addEventListener('DOMContentLoaded', function() {
     // 봇 상태 로드
     updateBotStatus();
     
-    // 5초마다 상태 업데이트
-    setInterval(updateBotStatus, 5000);
+    // 이후 상태 변경은 실시간 스트림으로 수신 (미지원 브라우저는 5초마다 조회)
+    subscribeStatusStream();
     
     // 이벤트 리스너 등록
     document.getElementById('start-bot-btn').addEventListener('click', startBot);
@@ -39,88 +39,145 @@ document.addEventListener('DOMContentLoaded', function() {
 // 폼 초기화 여부 추적
 let formInitialized = false;
 
+// 실시간 스트림의 봇 상태 (변경된 키만 수신하므로 누적 병합)
+let streamStatus = {};
+
+// 스트림이 끊긴 동안 사용하는 상태 조회 타이머
+let statusPollingTimer = null;
+
+function startStatusPolling() {
+    if (statusPollingTimer === null) {
+        statusPollingTimer = setInterval(updateBotStatus, 5000);
+    }
+}
+
+function stopStatusPolling() {
+    if (statusPollingTimer !== null) {
+        clearInterval(statusPollingTimer);
+        statusPollingTimer = null;
+    }
+}
+
+// 봇 상태 스트림 구독
+function subscribeStatusStream() {
+    if (!window.EventSource) {
+        startStatusPolling();
+        return;
+    }
+    
+    const source = new EventSource('/api/stream', { withCredentials: true });
+    source.addEventListener('open', () => {
+        stopStatusPolling();
+    });
+    source.addEventListener('snapshot', event => {
+        const snapshot = JSON.parse(event.data);
+        if (snapshot.status && Object.keys(snapshot.status).length > 0) {
+            streamStatus = Object.assign({}, snapshot.status);
+            renderBotStatus(streamStatus);
+        }
+    });
+    source.addEventListener('status', event => {
+        const delta = JSON.parse(event.data);
+        Object.assign(streamStatus, delta.set || {});
+        (delta.unset || []).forEach(key => delete streamStatus[key]);
+        renderBotStatus(streamStatus);
+    });
+    
+    // 연결 오류 시 재연결(또는 연결 종료) 동안 주기적 조회로 대체, 다시 연결되면 중지
+    source.addEventListener('error', () => {
+        if (statusPollingTimer === null) {
+            console.warn('실시간 스트림 연결 오류, 주기적 조회로 전환합니다.');
+            updateBotStatus();
+        }
+        startStatusPolling();
+    });
+}
+
 // 봇 상태 업데이트
 function updateBotStatus() {
     fetch('/api/status')
         .then(response => response.json())
-        .then(data => {
-            // 봇 상태 업데이트
-            const statusElement = document.getElementById('bot-status');
-            if (data.status === 'running') {
-                statusElement.textContent = '실행 중';
-                statusElement.className = 'badge bg-success';
-                document.getElementById('start-bot-btn').disabled = true;
-                document.getElementById('stop-bot-btn').disabled = false;
-            } else {
-                statusElement.textContent = '중지됨';
-                statusElement.className = 'badge bg-secondary';
-                document.getElementById('start-bot-btn').disabled = false;
-                document.getElementById('stop-bot-btn').disabled = true;
-            }
-            
-            // 기본 정보 업데이트
-            document.getElementById('exchange-name').textContent = data.exchange || '-';
-            document.getElementById('symbol-name').textContent = data.symbol || '-';
-            document.getElementById('strategy-name').textContent = data.strategy || '-';
-            document.getElementById('last-update').textContent = data.last_update || '-';
+        .then(data => renderBotStatus(data.data || data))
+        .catch(error => console.error('상태 업데이트 실패:', error));
+}
+
+// 봇 상태 표시
+function renderBotStatus(data) {
+    // 봇 상태 업데이트
+    const statusElement = document.getElementById('bot-status');
+    if (data.status === 'running' || data.is_running) {
+        statusElement.textContent = '실행 중';
+        statusElement.className = 'badge bg-success';
+        document.getElementById('start-bot-btn').disabled = true;
+        document.getElementById('stop-bot-btn').disabled = false;
+    } else {
+        statusElement.textContent = '중지됨';
+        statusElement.className = 'badge bg-secondary';
+        document.getElementById('start-bot-btn').disabled = false;
+        document.getElementById('stop-bot-btn').disabled = true;
+    }
+    
+    // 기본 정보 업데이트
+    document.getElementById('exchange-name').textContent = data.exchange || '-';
+    document.getElementById('symbol-name').textContent = data.symbol || '-';
+    document.getElementById('strategy-name').textContent = data.strategy || '-';
+    document.getElementById('last-update').textContent = data.last_update || '-';
+    
+    // 폼 값 설정 (최초 로드 시)
+    if (!formInitialized) {
+        document.getElementById('exchange').value = data.exchange || 'binance';
+        document.getElementById('symbol').value = data.symbol || 'BTC/USDT';
+        document.getElementById('timeframe').value = data.timeframe || '1h';
+        document.getElementById('strategy').value = data.strategy || 'ma_crossover';
+        document.getElementById('test-mode').checked = data.test_mode !== false;
+        
+        // 마켓 타입 및 레버리지 설정
+        if (data.market_type) {
+            document.getElementById('market-type').value = data.market_type;
             
-            // 폼 값 설정 (최초 로드 시)
-            if (!formInitialized) {
-                document.getElementById('exchange').value = data.exchange || 'binance';
-                document.getElementById('symbol').value = data.symbol || 'BTC/USDT';
-                document.getElementById('timeframe').value = data.timeframe || '1h';
-                document.getElementById('strategy').value = data.strategy || 'ma_crossover';
-                document.getElementById('test-mode').checked = data.test_mode !== false;
-                
-                // 마켓 타입 및 레버리지 설정
-                if (data.market_type) {
-                    document.getElementById('market-type').value = data.market_type;
-                    
-                    if (data.market_type === 'futures' && data.leverage) {
-                        document.getElementById('leverage').value = data.leverage;
-                        updateLeverageValue();
-                    }
-                    
-                    updateMarketTypeUI();
-                }
-                
-                // 위험 관리 설정
-                if (data.risk_management) {
-                    if (data.risk_management.stop_loss_pct) {
-                        document.getElementById('stop-loss').value = Math.round(data.risk_management.stop_loss_pct * 100);
-                        updateStopLossValue();
-                    }
-                    
-                    if (data.risk_management.take_profit_pct) {
-                        document.getElementById('take-profit').value = Math.round(data.risk_management.take_profit_pct * 100);
-                        updateTakeProfitValue();
-                    }
-                    
-                    if (data.risk_management.max_position_size) {
-                        document.getElementById('max-position').value = Math.round(data.risk_management.max_position_size * 100);
-                        updateMaxPositionValue();
-                    }
-                }
-                
-                formInitialized = true;
+            if (data.market_type === 'futures' && data.leverage) {
+                document.getElementById('leverage').value = data.leverage;
+                updateLeverageValue();
             }
             
-            // 지갑 잔액 업데이트
-            if (data.balance) {
-                updateWalletBalance(data.balance);
+            updateMarketTypeUI();
+        }
+        
+        // 위험 관리 설정
+        if (data.risk_management) {
+            if (data.risk_management.stop_loss_pct) {
+                document.getElementById('stop-loss').value = Math.round(data.risk_management.stop_loss_pct * 100);
+                updateStopLossValue();
             }
             
-            // 포지션 정보 업데이트
-            if (data.position) {
-                updatePositionInfo(data.position);
+            if (data.risk_management.take_profit_pct) {
+                document.getElementById('take-profit').value = Math.round(data.risk_management.take_profit_pct * 100);
+                updateTakeProfitValue();
             }
             
-            // 거래 내역 업데이트
-            if (data.trades && data.trades.length > 0) {
-                updateRecentTrades(data.trades);
+            if (data.risk_management.max_position_size) {
+                document.getElementById('max-position').value = Math.round(data.risk_management.max_position_size * 100);
+                updateMaxPositionValue();
             }
-        })
-        .catch(error => console.error('상태 업데이트 실패:', error));
+        }
+        
+        formInitialized = true;
+    }
+    
+    // 지갑 잔액 업데이트
+    if (data.balance) {
+        updateWalletBalance(data.balance);
+    }
+    
+    // 포지션 정보 업데이트
+    if (data.position) {
+        updatePositionInfo(data.position);
+    }
+    
+    // 거래 내역 업데이트
+    if (data.trades && data.trades.length > 0) {
+        updateRecentTrades(data.trades);
+    }
 }
 
 // 봇 시작
@@ -6,9 +6,18 @@ const API_URLS = {
     STOP_BOT: '/api/stop_bot',
     POSITIONS: '/api/positions',
     TRADES: '/api/trades',
-    SET_SL_TP: '/api/set_stop_loss_take_profit'
+    SET_SL_TP: '/api/set_stop_loss_take_profit',
+    STREAM: '/api/stream'
 };
 
+// 실시간 스트림으로 받은 현재 상태 (포지션 키 → 포지션)
+const streamState = {
+    positions: new Map(),
+    trades: []
+};
+let eventSource = null;
+let pollingTimer = null;
+
 // 모든 UI 요소 참조 저장
 const balanceAmountElem = document.getElementById('summary-balance-amount');
 const balanceCurrencyElem = document.getElementById('summary-balance-currency');
@@ -70,55 +79,7 @@ function updateStatus() {
         .then(response => response.json())
         .then(data => {
             if (data.success && data.data) {
-                const status = data.data;
-                const isRunning = status.is_running;
-                
-                // 버튼 상태 업데이트
-                if (botStartBtn && botStopBtn) {
-                    botStartBtn.disabled = isRunning;
-                    botStopBtn.disabled = !isRunning;
-                    
-                    // 버튼 스타일 업데이트
-                    if (isRunning) {
-                        botStartBtn.classList.add('disabled');
-                        botStopBtn.classList.remove('disabled');
-                    } else {
-                        botStartBtn.classList.remove('disabled');
-                        botStopBtn.classList.add('disabled');
-                    }
-                }
-                
-                // 설정 양식 비활성화
-                toggleSettingsAvailability(isRunning);
-                
-                // 봇 상태 배지 업데이트
-                const botStatusElem = document.getElementById('bot-status');
-                if (botStatusElem) {
-                    botStatusElem.className = isRunning ? 'badge bg-success' : 'badge bg-danger';
-                    botStatusElem.textContent = isRunning ? '실행 중' : '중지됨';
-                }
-                
-                // 거래소, 심볼, 전략 정보 업데이트
-                const exchangeElem = document.getElementById('exchange-name');
-                const symbolElem = document.getElementById('symbol-name');
-                const strategyElem = document.getElementById('strategy-name');
-                
-                if (exchangeElem) exchangeElem.textContent = status.exchange || '-';
-                if (symbolElem) symbolElem.textContent = status.ui_symbol || status.symbol || '-';
-                if (strategyElem) strategyElem.textContent = status.strategy || '-';
-                
-                // 상태 컨테이너 업데이트
-                if (statusContainer) {
-                    let marketTypeText = status.market_type === 'futures' ? '선물' : '현물';
-                    let modeText = status.test_mode ? '테스트 모드' : '실거래 모드';
-                    
-                    statusContainer.innerHTML = `
-                        <small class="text-muted ms-2">${marketTypeText} | ${modeText}</small>
-                        ${status.timeframe ? `<p class="mb-1">시간프레임: ${status.timeframe}</p>` : ''}
-                        ${status.leverage && status.leverage > 1 ? `<p>레버리지: ${status.leverage}x</p>` : ''}
-                        ${status.started_at ? `<p class="text-muted small">시작 시간: ${formatDate(status.started_at)}</p>` : ''}
-                    `;
-                }
+                renderStatus(data.data);
             }
         })
         .catch(error => {
@@ -129,6 +90,58 @@ function updateStatus() {
         });
 }
 
+// 봇 상태 표시
+function renderStatus(status) {
+    const isRunning = status.is_running;
+    
+    // 버튼 상태 업데이트
+    if (botStartBtn && botStopBtn) {
+        botStartBtn.disabled = isRunning;
+        botStopBtn.disabled = !isRunning;
+        
+        // 버튼 스타일 업데이트
+        if (isRunning) {
+            botStartBtn.classList.add('disabled');
+            botStopBtn.classList.remove('disabled');
+        } else {
+            botStartBtn.classList.remove('disabled');
+            botStopBtn.classList.add('disabled');
+        }
+    }
+    
+    // 설정 양식 비활성화
+    toggleSettingsAvailability(isRunning);
+    
+    // 봇 상태 배지 업데이트
+    const botStatusElem = document.getElementById('bot-status');
+    if (botStatusElem) {
+        botStatusElem.className = isRunning ? 'badge bg-success' : 'badge bg-danger';
+        botStatusElem.textContent = isRunning ? '실행 중' : '중지됨';
+    }
+    
+    // 거래소, 심볼, 전략 정보 업데이트
+    const exchangeElem = document.getElementById('exchange-name');
+    const symbolElem = document.getElementById('symbol-name');
+    const strategyElem = document.getElementById('strategy-name');
+    
+    if (exchangeElem) exchangeElem.textContent = status.exchange || '-';
+    if (symbolElem) symbolElem.textContent = status.ui_symbol || status.symbol || '-';
+    if (strategyElem) strategyElem.textContent = status.strategy || '-';
+    
+    // 상태 컨테이너 업데이트
+    if (statusContainer) {
+        let marketTypeText = status.market_type === 'futures' ? '선물' : '현물';
+        let modeText = status.test_mode ? '테스트 모드' : '실거래 모드';
+        
+        statusContainer.innerHTML = `
+            <small class="text-muted ms-2">${marketTypeText} | ${modeText}</small>
+            ${status.timeframe ? `<p class="mb-1">시간프레임: ${status.timeframe}</p>` : ''}
+            ${status.leverage && status.leverage > 1 ? `<p>레버리지: ${status.leverage}x</p>` : ''}
+            ${status.started_at ? `<p class="text-muted small">시작 시간: ${formatDate(status.started_at)}</p>` : ''}
+        `;
+    }
+}
+
 // 포지션 정보 업데이트 함수
 function updatePositions() {
     // 로딩 메시지 표시, 테이블 숨기기
@@ -151,28 +164,7 @@ function updatePositions() {
             if (positionsTable) positionsTable.classList.remove('d-none');
             
             if (data.success && data.data && positionsTableBody) {
-                if (data.data.length === 0) {
-                    positionsTableBody.innerHTML = '<tr><td colspan="7" class="text-center text-muted">열린 포지션이 없습니다.</td></tr>';
-                } else {
-                    let html = '';
-                    
-                    data.data.forEach(position => {
-                        const profitClass = position.unrealized_pnl >= 0 ? 'text-success' : 'text-danger';
-                        html += `
-                            <tr>
-                                <td>${position.symbol}</td>
-                                <td><span class="badge ${position.side === 'long' ? 'bg-success' : 'bg-danger'}">${position.side.toUpperCase()}</span></td>
-                                <td>${position.contracts}</td>
-                                <td>$${formatCurrency(position.entry_price)}</td>
-                                <td>$${formatCurrency(position.mark_price)}</td>
-                                <td class="${profitClass}">$${formatCurrency(position.unrealized_pnl)}</td>
-                                <td><button class="btn btn-sm btn-danger" onclick="closePosition('${position.symbol}')">종료</button></td>
-                            </tr>
-                        `;
-                    });
-                    
-                    positionsTableBody.innerHTML = html;
-                }
+                renderPositions(data.data);
             } else if (!data.success && positionsTableBody) {
                 positionsTableBody.innerHTML = `<tr><td colspan="7" class="text-center text-danger">오류: ${data.error || '포지션 데이터를 불러올 수 없습니다.'}</td></tr>`;
                 if (positionsTable) positionsTable.classList.remove('d-none');
@@ -188,6 +180,36 @@ function updatePositions() {
         });
 }
 
+// 포지션 테이블 표시
+function renderPositions(positions) {
+    if (!positionsTableBody) return;
+    if (positionsLoadingMessage) positionsLoadingMessage.classList.add('d-none');
+    if (positionsTable) positionsTable.classList.remove('d-none');
+
+    if (positions.length === 0) {
+        positionsTableBody.innerHTML = '<tr><td colspan="7" class="text-center text-muted">열린 포지션이 없습니다.</td></tr>';
+        return;
+    }
+
+    let html = '';
+    positions.forEach(position => {
+        const profitClass = position.unrealized_pnl >= 0 ? 'text-success' : 'text-danger';
+        const side = position.side || '';
+        html += `
+            <tr>
+                <td>${position.symbol}</td>
+                <td><span class="badge ${side === 'long' ? 'bg-success' : 'bg-danger'}">${side.toUpperCase()}</span></td>
+                <td>${position.contracts}</td>
+                <td>$${formatCurrency(position.entry_price)}</td>
+                <td>$${formatCurrency(position.mark_price)}</td>
+                <td class="${profitClass}">$${formatCurrency(position.unrealized_pnl)}</td>
+                <td><button class="btn btn-sm btn-danger" onclick="closePosition('${position.symbol}')">종료</button></td>
+            </tr>
+        `;
+    });
+    positionsTableBody.innerHTML = html;
+}
+
 // 거래 내역 업데이트 함수
 function updateTrades() {
     // 로딩 메시지 표시, 테이블 숨기기
@@ -210,26 +232,8 @@ function updateTrades() {
             if (tradesTable) tradesTable.classList.remove('d-none');
 
             if (data.success && data.data && tradesTableBody) {
-                if (data.data.length === 0) {
-                    tradesTableBody.innerHTML = '<tr><td colspan="7" class="text-center text-muted">거래 내역이 없습니다.</td></tr>';
-                } else {
-                    let html = '';
-                    data.data.forEach(trade => {
-                        const profitClass = trade.profit >= 0 ? 'text-success' : 'text-danger';
-                        html += `
-                            <tr>
-                                <td>${formatDate(trade.datetime)}</td>
-                                <td>${trade.symbol}</td>
-                                <td><span class="badge ${trade.type === 'buy' ? 'bg-success' : 'bg-danger'}">${trade.type.toUpperCase()}</span></td>
-                                <td>${trade.amount}</td>
-                                <td>$${formatCurrency(trade.price)}</td>
-                                <td>$${formatCurrency(trade.cost)}</td>
-                                <td class="${profitClass}">${trade.profit ? '$' + formatCurrency(trade.profit) : '-'}</td>
-                            </tr>
-                        `;
-                    });
-                    tradesTableBody.innerHTML = html;
-                }
+                streamState.trades = data.data.slice();
+                renderTrades(streamState.trades);
             } else if (!data.success && tradesTableBody) {
                 tradesTableBody.innerHTML = `<tr><td colspan="7" class="text-center text-danger">오류: ${data.error || '거래 데이터를 불러올 수 없습니다.'}</td></tr>`;
                 if (tradesTable) tradesTable.classList.remove('d-none');
@@ -245,6 +249,38 @@ function updateTrades() {
         });
 }
 
+// 거래 내역 테이블 표시
+function renderTrades(trades) {
+    if (!tradesTableBody) return;
+    if (tradesLoadingMessage) tradesLoadingMessage.classList.add('d-none');
+    if (tradesTable) tradesTable.classList.remove('d-none');
+
+    if (trades.length === 0) {
+        tradesTableBody.innerHTML = '<tr><td colspan="7" class="text-center text-muted">거래 내역이 없습니다.</td></tr>';
+        return;
+    }
+
+    let html = '';
+    trades.forEach(trade => {
+        const profitClass = trade.profit >= 0 ? 'text-success' : 'text-danger';
+        const type = trade.type || '';
+        const amount = trade.amount !== undefined ? trade.amount : trade.quantity;
+        const datetime = trade.datetime || trade.timestamp;
+        html += `
+            <tr>
+                <td>${formatDate(datetime)}</td>
+                <td>${trade.symbol}</td>
+                <td><span class="badge ${type === 'buy' ? 'bg-success' : 'bg-danger'}">${type.toUpperCase()}</span></td>
+                <td>${amount}</td>
+                <td>$${formatCurrency(trade.price)}</td>
+                <td>${trade.cost !== undefined ? '$' + formatCurrency(trade.cost) : '-'}</td>
+                <td class="${profitClass}">${trade.profit ? '$' + formatCurrency(trade.profit) : '-'}</td>
+            </tr>
+        `;
+    });
+    tradesTableBody.innerHTML = html;
+}
+
 // 봇 시작 함수
 function startBot() {
     console.log('startBot 함수 호출됨');
@@ -458,56 +494,7 @@ function updateBalance() {
             console.log('받은 데이터:', data);
             
             if (data && data.success && data.balance) {
-                // 현물과 선물 잔액 가져오기
-                const spotBalance = (data.balance.spot && data.balance.spot.balance) || 0;
-                const futureBalance = (data.balance.future && data.balance.future.balance) || 0;
-                const totalBalance = spotBalance + futureBalance;
-                
-                console.log('현물 잔액:', spotBalance);
-                console.log('선물 잔액:', futureBalance);
-                console.log('총 잔액:', totalBalance);
-                
-                // 메인 잔액 표시
-                if (balanceAmountElem) {
-                    balanceAmountElem.textContent = formatCurrency(totalBalance, 2, 8);
-                    console.log('잔액 요소 업데이트 완료');
-                } else {
-                    console.error('잔액 표시 요소를 찾을 수 없습니다');
-                }
-                
-                if (balanceCurrencyElem) {
-                    balanceCurrencyElem.textContent = 'USDT';
-                }
-                
-                // 상세 잔액 표시
-                if (balanceDetailsElem) {
-                    let detailsHtml = '';
-                    if (spotBalance > 0) {
-                        detailsHtml += `
-                            <div class="d-flex justify-content-between">
-                                <span class="text-muted">현물:</span>
-                                <span>${formatCurrency(spotBalance, 2, 8)} USDT</span>
-                            </div>
-                        `;
-                    }
-                    if (futureBalance > 0) {
-                        detailsHtml += `
-                            <div class="d-flex justify-content-between">
-                                <span class="text-muted">선물:</span>
-                                <span>${formatCurrency(futureBalance, 2, 8)} USDT</span>
-                            </div>
-                        `;
-                    }
-                    balanceDetailsElem.innerHTML = detailsHtml;
-                }
-                
-                // 로딩 메시지 숨기고 콘텐츠 표시
-                if (summaryLoadingMsg) {
-                    summaryLoadingMsg.classList.add('d-none');
-                }
-                if (summaryContent) {
-                    summaryContent.classList.remove('d-none');
-                }
+                renderBalance(data.balance);
             } else {
                 console.error('잔액 데이터 형식이 올바르지 않습니다:', data);
             }
@@ -520,6 +507,141 @@ function updateBalance() {
         });
 }
 
+// 잔액 요약 표시
+function renderBalance(balance) {
+    // 현물과 선물 잔액 가져오기
+    const spotBalance = (balance.spot && balance.spot.balance) || 0;
+    const futureBalance = (balance.future && balance.future.balance) || 0;
+    const totalBalance = spotBalance + futureBalance;
+    
+    // 메인 잔액 표시
+    if (balanceAmountElem) {
+        balanceAmountElem.textContent = formatCurrency(totalBalance, 2, 8);
+    } else {
+        console.error('잔액 표시 요소를 찾을 수 없습니다');
+    }
+    
+    if (balanceCurrencyElem) {
+        balanceCurrencyElem.textContent = 'USDT';
+    }
+    
+    // 상세 잔액 표시
+    if (balanceDetailsElem) {
+        let detailsHtml = '';
+        if (spotBalance > 0) {
+            detailsHtml += `
+                <div class="d-flex justify-content-between">
+                    <span class="text-muted">현물:</span>
+                    <span>${formatCurrency(spotBalance, 2, 8)} USDT</span>
+                </div>
+            `;
+        }
+        if (futureBalance > 0) {
+            detailsHtml += `
+                <div class="d-flex justify-content-between">
+                    <span class="text-muted">선물:</span>
+                    <span>${formatCurrency(futureBalance, 2, 8)} USDT</span>
+                </div>
+            `;
+        }
+        balanceDetailsElem.innerHTML = detailsHtml;
+    }
+    
+    // 로딩 메시지 숨기고 콘텐츠 표시
+    if (summaryLoadingMsg) {
+        summaryLoadingMsg.classList.add('d-none');
+    }
+    if (summaryContent) {
+        summaryContent.classList.remove('d-none');
+    }
+}
+
+// 스트림 변경분 적용 함수
+function applyStreamSnapshot(snapshot) {
+    streamState.positions = new Map((snapshot.positions || []).map(p => [p.key, p]));
+    if (snapshot.trades && snapshot.trades.length > 0) {
+        streamState.trades = snapshot.trades.slice();
+        renderTrades(streamState.trades);
+    }
+    if (snapshot.versions && snapshot.versions.positions > 0) {
+        renderPositions(Array.from(streamState.positions.values()));
+    }
+    if (snapshot.status && Object.keys(snapshot.status).length > 0) {
+        renderStatus(snapshot.status);
+    }
+    if (snapshot.balance && Object.keys(snapshot.balance).length > 0) {
+        renderBalance(snapshot.balance);
+    }
+}
+
+function applyPositionsDelta(delta) {
+    (delta.remove || []).forEach(key => streamState.positions.delete(key));
+    (delta.upsert || []).forEach(position => streamState.positions.set(position.key, position));
+    renderPositions(Array.from(streamState.positions.values()));
+}
+
+function applyTradeDelta(delta) {
+    if (!delta.trade) return;
+    streamState.trades.unshift(delta.trade);
+    streamState.trades = streamState.trades.slice(0, 10);
+    renderTrades(streamState.trades);
+}
+
+// 변경된 키만 받은 상태/잔액을 현재 값에 병합
+const streamMappings = { status: {}, balance: {} };
+
+function applyMappingDelta(topic, delta, render) {
+    const current = streamMappings[topic];
+    Object.assign(current, delta.set || {});
+    (delta.unset || []).forEach(key => delete current[key]);
+    render(current);
+}
+
+// 실시간 스트림 연결 (지원하지 않으면 주기적 조회로 대체)
+function connectEventStream() {
+    if (!window.EventSource) {
+        startPolling();
+        return;
+    }
+
+    eventSource = new EventSource(API_URLS.STREAM, { withCredentials: true });
+
+    eventSource.addEventListener('open', () => {
+        stopPolling();
+    });
+    eventSource.addEventListener('snapshot', event => {
+        const snapshot = JSON.parse(event.data);
+        streamMappings.status = Object.assign({}, snapshot.status || {});
+        streamMappings.balance = Object.assign({}, snapshot.balance || {});
+        applyStreamSnapshot(snapshot);
+    });
+    eventSource.addEventListener('positions', event => applyPositionsDelta(JSON.parse(event.data)));
+    eventSource.addEventListener('trades', event => applyTradeDelta(JSON.parse(event.data)));
+    eventSource.addEventListener('status', event => applyMappingDelta('status', JSON.parse(event.data), renderStatus));
+    eventSource.addEventListener('balance', event => applyMappingDelta('balance', JSON.parse(event.data), renderBalance));
+
+    // 연결이 끊기면 브라우저가 Last-Event-ID로 자동 재연결, 닫힌 경우에만 폴링으로 대체
+    eventSource.addEventListener('error', () => {
+        if (eventSource.readyState === EventSource.CLOSED) {
+            console.warn('실시간 스트림 연결 종료, 주기적 조회로 전환합니다.');
+            startPolling();
+        }
+    });
+}
+
+function startPolling() {
+    if (pollingTimer === null) {
+        pollingTimer = setInterval(updateAllData, 30000);
+    }
+}
+
+function stopPolling() {
+    if (pollingTimer !== null) {
+        clearInterval(pollingTimer);
+        pollingTimer = null;
+    }
+}
+
 // 요약 정보 업데이트 함수 (updateBalance 호출)
 function updateSummary() {
     updateBalance();
@@ -721,8 +843,8 @@ document.addEventListener('DOMContentLoaded', function() {
     // 초기 데이터 로드
     updateAllData();
     
-    // 주기적 업데이트 설정 (30초마다)
-    setInterval(updateAllData, 30000);
+    // 이후 변경분은 실시간 스트림으로 수신
+    connectEventStream();
 });
 
 // 디버깅을 위한 전역 함수 노출